@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Hydra Forecast Backtest
+
+Replays recorded series through the predictive maintenance forecasts. For
+every group, each origin in the recording fits only the preceding window
+and predicts the group's horizon ahead (24h for disk, 1h for VRAM and
+memory, 10m for temperature); errors are compared against the actual
+sample, for the least-squares line (what the old predict_linear rules
+computed), Holt's trend and the last observed value.
+
+Fixtures hold one grid per recording:
+    {"step": 120, "start": <unix ts>,
+     "groups": {"disk": [{"metric": {...}, "values": [62.1, null, ...]}]}}
+
+Usage:
+    python backtest-forecasts.py
+    python backtest-forecasts.py --fixture tests/fixtures/forecasting/cluster-36h.json
+    python backtest-forecasts.py --record http://192.168.1.244:9090 --hours 36 --output new.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.forecasting import backtest  # noqa: E402
+from hydra_tools.predictive_maintenance import FORECAST_GROUPS  # noqa: E402
+from hydra_tools.prometheus_query import PrometheusClient  # noqa: E402
+
+DEFAULT_FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "forecasting" / "cluster-36h.json"
+
+
+def load_fixture(path: Path):
+    """(step, {group: values[n_series, T]}) with missing samples as NaN."""
+    data = json.loads(path.read_text())
+    groups = {
+        name: np.array([[np.nan if v is None else v for v in s["values"]] for s in series], dtype=float)
+        for name, series in data["groups"].items()
+    }
+    return data["step"], groups
+
+
+async def record(url: str, hours: float, step: float, output: Path):
+    """Capture every forecast group's queries from a live Prometheus."""
+    end = time.time() // step * step
+    start = end - hours * 3600
+    width = int((end - start) // step) + 1
+    client = PrometheusClient(url, timeout=120.0)
+    groups = {}
+    try:
+        for group in FORECAST_GROUPS:
+            groups[group.name] = []
+            for query in group.queries:
+                for item in await client.query_range(query, start, end, step):
+                    values = [None] * width
+                    for ts, value in item["values"]:
+                        values[int(round((float(ts) - start) / step))] = round(float(value), 3)
+                    groups[group.name].append({"metric": item["metric"], "values": values})
+    finally:
+        await client.close()
+    output.write_text(json.dumps({"step": step, "start": start, "groups": groups}, separators=(",", ":")))
+    print(f"Recorded {sum(len(s) for s in groups.values())} series x {width} samples to {output}")
+
+
+def run(fixture: Path, stride: int):
+    step, groups = load_fixture(fixture)
+    print(f"{fixture.name}: step {step:g}s\n")
+    print(f"{'group':<10}{'horizon':>9}{'series':>8}{'origins':>9}   "
+          f"{'linear MAE':>11}{'holt MAE':>10}{'naive MAE':>11}   configured")
+    for group in FORECAST_GROUPS:
+        if not group.horizon_seconds or group.name not in groups:
+            continue
+        report = backtest(groups[group.name], step, group.window_seconds, group.horizon_seconds, stride=stride,
+                          season_seconds=group.season_seconds, beta=group.beta, damping=group.damping)
+        print(f"{group.name:<10}{group.horizon_seconds / 3600:>8.2f}h{report['series']:>8}{report['origins']:>9}   "
+              f"{report['linear']['mae']:>11.2f}{report['holt']['mae']:>10.2f}{report['naive']['mae']:>11.2f}"
+              f"   {group.method}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest predictive maintenance forecasts")
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE, help="Recorded series (JSON)")
+    parser.add_argument("--stride", type=int, default=5, help="Samples between forecast origins")
+    parser.add_argument("--record", metavar="URL", help="Record a new fixture from this Prometheus instead")
+    parser.add_argument("--hours", type=float, default=36.0, help="Hours to record")
+    parser.add_argument("--step", type=float, default=120.0, help="Recording resolution in seconds")
+    parser.add_argument("--output", type=Path, default=Path("forecast-recording.json"), help="Recording path")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.hours, args.step, args.output))
+    else:
+        run(args.fixture, args.stride)
+
+
+if __name__ == "__main__":
+    main()
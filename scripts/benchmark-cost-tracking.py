@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Hydra Cost Tracking Benchmark
+
+Times recording usage and reading summaries with the batched, rollup-backed
+CostTracker against the previous implementation (one connection and commit
+per record, summaries aggregated from raw rows), on a temporary database.
+
+Usage:
+    python benchmark-cost-tracking.py                    # 20k records, 200k history
+    python benchmark-cost-tracking.py --records 5000 --history 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.cost_tracking import CostTracker  # noqa: E402
+
+MODELS = ["claude-sonnet-4", "gpt-4o-mini", "tabby", "qwen2.5-7b", "midnight-miqu-70b"]
+AGENTS = [None, "research", "coder", "creative"]
+
+
+def legacy_store(db_path, row):
+    """The write path before batching."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO token_usage
+        (timestamp, model, provider, input_tokens, output_tokens, cost_usd, agent, task_type, request_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, row)
+    conn.commit()
+    conn.close()
+
+
+def legacy_summary(db_path, start, end):
+    """The four raw-row aggregations get_summary ran before rollups."""
+    conn = sqlite3.connect(db_path)
+    bounds = (start.isoformat(), end.isoformat())
+    conn.execute("SELECT SUM(cost_usd), SUM(input_tokens), SUM(output_tokens), COUNT(*) FROM token_usage "
+                 "WHERE timestamp >= ? AND timestamp < ?", bounds).fetchone()
+    for column in ("model", "provider", "agent"):
+        conn.execute(f"SELECT {column}, SUM(cost_usd) FROM token_usage WHERE timestamp >= ? AND timestamp < ? "
+                     f"GROUP BY {column}", bounds).fetchall()
+    conn.close()
+
+
+def time_calls(fn, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cost tracking ingestion and summaries")
+    parser.add_argument("--records", type=int, default=20000, help="Records to time recording")
+    parser.add_argument("--legacy-records", type=int, default=2000, help="Records for the per-commit baseline")
+    parser.add_argument("--history", type=int, default=200000, help="Records of history spread over 30 days")
+    parser.add_argument("--runs", type=int, default=20, help="Summary calls to time")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    month_start = now - timedelta(days=30)
+
+    with tempfile.TemporaryDirectory(prefix="hydra-cost-bench-") as tmp:
+        tracker = CostTracker(db_path=f"{tmp}/costs.db")
+
+        # History, written through the batched path
+        start = time.perf_counter()
+        for _ in range(args.history):
+            tracker.record_usage(rng.choice(MODELS), rng.randrange(10, 5000), rng.randrange(10, 2000),
+                                 agent=rng.choice(AGENTS),
+                                 timestamp=month_start + timedelta(seconds=rng.uniform(0, 30 * 86400)))
+        tracker.flush()
+        history_s = time.perf_counter() - start
+
+        # Ingestion inside an event loop, background flusher running
+        async def ingest():
+            start = time.perf_counter()
+            for _ in range(args.records):
+                tracker.record_usage(rng.choice(MODELS), 1000, 500, agent=rng.choice(AGENTS))
+            recorded = time.perf_counter() - start
+            await tracker.close()
+            return recorded, time.perf_counter() - start
+
+        recorded_s, durable_s = asyncio.run(ingest())
+
+        tracker = CostTracker(db_path=f"{tmp}/costs.db")
+        legacy_db = f"{tmp}/costs.db"
+        row = (now.isoformat(), "tabby", "local", 1000, 500, 0.000001, "coder", None, None)
+        start = time.perf_counter()
+        for _ in range(args.legacy_records):
+            legacy_store(legacy_db, row)
+        legacy_s = time.perf_counter() - start
+
+        periods = {"day": now - timedelta(days=1), "week": now - timedelta(days=7), "month": month_start}
+        print(f"History: {args.history} records over 30 days (written in {history_s:.1f}s)")
+        print(f"\n{'ingestion':<36}{'records':>9}{'per record us':>15}")
+        print(f"{'per-record commit (before)':<36}{args.legacy_records:>9}{legacy_s / args.legacy_records * 1e6:>15.1f}")
+        print(f"{'batched, record_usage call':<36}{args.records:>9}{recorded_s / args.records * 1e6:>15.1f}")
+        print(f"{'batched, until flushed to disk':<36}{args.records:>9}{durable_s / args.records * 1e6:>15.1f}")
+
+        print(f"\n{'summary p50 ms':<16}{'raw rows':>12}{'rollups':>12}")
+        for period, start_date in periods.items():
+            legacy_ms = time_calls(lambda: legacy_summary(legacy_db, start_date, now), args.runs)
+            rollup_ms = time_calls(lambda: tracker._aggregate(start_date, now), args.runs)
+            print(f"{period:<16}{legacy_ms:>12.2f}{rollup_ms:>12.2f}")
+        tracker._conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Hydra Discovery Archive Search Benchmark
+
+Builds a synthetic archive and times DiscoveryArchive.find_relevant against
+the indexed search, next to the previous implementation (parse every file,
+pure-Python cosine similarity) on a smaller archive. Query embeddings come
+from a local stub, so Ollama latency is not included.
+
+Discovery files for the indexed run are written without their embeddings
+to keep 100k files small; the embeddings only go into the index, which is
+all the indexed search reads.
+
+Usage:
+    python benchmark-discovery-archive.py                     # 100k indexed, 5k baseline
+    python benchmark-discovery-archive.py --count 20000 --dim 384
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.discovery_archive import (  # noqa: E402
+    Discovery,
+    DiscoveryArchive,
+    DiscoveryType,
+)
+
+WORDS = ["inference", "tabbyapi", "cache", "latency", "gpu", "memory", "router",
+         "queue", "vllm", "context", "embedding", "scheduler", "docker", "qdrant"]
+TYPES = [DiscoveryType.IMPROVEMENT, DiscoveryType.PATTERN, DiscoveryType.FAILURE]
+
+
+class StubEmbedder:
+    """Returns a fixed random vector per query."""
+
+    def __init__(self, dim, seed=1):
+        self.rng = np.random.default_rng(seed)
+        self.dim = dim
+
+    async def embed(self, text):
+        return self.rng.standard_normal(self.dim).tolist()
+
+    def cosine_similarity(self, a, b):
+        if not a or not b or len(a) != len(b):
+            return 0.0
+        dot = sum(x * y for x, y in zip(a, b))
+        norm_a = sum(x * x for x in a) ** 0.5
+        norm_b = sum(x * x for x in b) ** 0.5
+        if norm_a == 0 or norm_b == 0:
+            return 0.0
+        return dot / (norm_a * norm_b)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def synthetic(i, rng, dim):
+    words = rng.choice(WORDS, 4, replace=False)
+    return Discovery(
+        id=f"{i:08x}",
+        type=TYPES[i % len(TYPES)],
+        title=f"{words[0].title()} {words[1]} fix {i}",
+        description=f"Changed {words[2]} handling to reduce {words[3]} under load",
+        created_at=f"2026-01-01T00:00:{i % 60:02d}.{i:06d}Z",
+        tags=[str(w) for w in words[:2]],
+        embedding=rng.standard_normal(dim).astype(np.float32).tolist(),
+    )
+
+
+def write_file(base, discovery, with_embedding):
+    data = discovery.to_dict()
+    data["type"] = discovery.type.value
+    if not with_embedding:
+        data.pop("embedding")
+    (base / discovery.type.value / f"{discovery.id}.json").write_text(json.dumps(data))
+
+
+async def legacy_find_relevant(archive, context, limit=5):
+    """The search as implemented before the index."""
+    query_embedding = await archive.embedder.embed(context)
+    results = []
+    query_lower = context.lower()
+    for discovery in archive.list_all():
+        score = 0.0
+        if query_lower in discovery.title.lower():
+            score += 0.5
+        if query_lower in discovery.description.lower():
+            score += 0.3
+        if any(query_lower in tag.lower() for tag in discovery.tags):
+            score += 0.2
+        if query_embedding and discovery.embedding:
+            score += archive.embedder.cosine_similarity(query_embedding, discovery.embedding) * 0.5
+        if score > 0.1:
+            result = discovery.to_dict()
+            result["score"] = round(score, 3)
+            results.append(result)
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results[:limit]
+
+
+async def time_queries(find, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await find(query, 5)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, count, latencies):
+    print(f"{label:<22}{count:>9}{len(latencies):>9}{statistics.median(latencies):>11.2f}"
+          f"{percentile(latencies, 95):>11.2f}{max(latencies):>11.2f}")
+
+
+async def run(args):
+    rng = np.random.default_rng(0)
+    queries = [f"working on {w} performance" for w in WORDS] + list(WORDS)
+    queries = (queries * (args.queries // len(queries) + 1))[:args.queries]
+    root = Path(tempfile.mkdtemp(prefix="hydra-discovery-bench-"))
+    try:
+        # Indexed archive
+        base = root / "indexed"
+        archive = DiscoveryArchive(str(base))
+        archive.embedder = StubEmbedder(args.dim)
+        start = time.perf_counter()
+        index = archive.index
+        for i in range(args.count):
+            discovery = synthetic(i, rng, args.dim)
+            write_file(base, discovery, with_embedding=False)
+            index.add(discovery)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reloaded = DiscoveryArchive(str(base))
+        reloaded.embedder = StubEmbedder(args.dim)
+        reloaded.index
+        load = time.perf_counter() - start
+        indexed = await time_queries(reloaded.find_relevant, queries)
+        status = reloaded.index.status()
+
+        # Previous implementation on a smaller archive
+        legacy_base = root / "legacy"
+        legacy = DiscoveryArchive(str(legacy_base))
+        legacy.embedder = StubEmbedder(args.dim)
+        for i in range(args.baseline_count):
+            write_file(legacy_base, synthetic(i, rng, args.dim), with_embedding=True)
+        baseline = await time_queries(
+            lambda q, limit: legacy_find_relevant(legacy, q, limit), queries[:args.baseline_queries]
+        )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"Index: {status['discoveries']} discoveries, dim {status['embedding_dim']}, "
+          f"matrix {status['matrix_mb']} MB; built in {build:.1f}s, loaded in {load * 1000:.0f} ms")
+    print(f"{'find_relevant':<22}{'archive':>9}{'queries':>9}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}")
+    report("file scan (before)", args.baseline_count, baseline)
+    report("indexed", args.count, indexed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark discovery archive search")
+    parser.add_argument("--count", type=int, default=100000, help="Discoveries in the indexed archive")
+    parser.add_argument("--baseline-count", type=int, default=5000, help="Discoveries for the file-scan baseline")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension (nomic-embed-text: 768)")
+    parser.add_argument("--queries", type=int, default=200, help="Indexed queries to time")
+    parser.add_argument("--baseline-queries", type=int, default=5, help="Baseline queries to time")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
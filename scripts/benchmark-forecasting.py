@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hydra Forecasting Benchmark
+
+Measures the predictive maintenance path at cluster scale, with every
+forecast group holding ``--series`` series of random-walk history:
+
+- ingest: writing one refresh's range results (the late-sample overlap plus
+  the new slot) into the ring buffers
+- fit: refitting the linear and Holt trends for all groups
+- rebuild: turning the fits into predictions
+- report: get_full_health_report(), which is what a /predictive request runs
+
+Ingest, fit and rebuild run once per refresh interval in the background;
+only the report is on the request path.
+
+Usage:
+    python benchmark-forecasting.py
+    python benchmark-forecasting.py --series 5000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.forecasting import LATE_SAMPLES  # noqa: E402
+from hydra_tools.predictive_maintenance import PredictiveMaintenanceEngine  # noqa: E402
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def fill(engine, series, rng):
+    """Backfill every group's window; returns the timestamp of the newest slot."""
+    step = engine.forecaster.step
+    now = time.time() // step * step
+    for name, buffer in engine.forecaster.buffers.items():
+        times = now - step * np.arange(buffer.capacity - 1, -1, -1)
+        values = 50 + rng.normal(0, 0.5, (series, buffer.capacity)).cumsum(axis=1)
+        buffer.extend(
+            ((0, (("instance", f"node{i // 8}"), ("gpu", str(i % 8)))), {"instance": f"node{i // 8}", "gpu": str(i % 8)},
+             times, values[i])
+            for i in range(series)
+        )
+    return now
+
+
+async def run(args):
+    engine = PredictiveMaintenanceEngine(prometheus_url="http://127.0.0.1:9")
+    rng = np.random.default_rng(0)
+    now = fill(engine, args.series, rng)
+    step = engine.forecaster.step
+    groups = len(engine.forecaster.buffers)
+
+    def ingest():
+        nonlocal now
+        now += step
+        stamps = [now - step * i for i in range(LATE_SAMPLES, -1, -1)]
+        result = [
+            {"metric": {"instance": f"node{i // 8}", "gpu": str(i % 8)},
+             "values": [[t, f"{50 + rng.normal():.2f}"] for t in stamps]}
+            for i in range(args.series)
+        ]
+        for buffer in engine.forecaster.buffers.values():
+            buffer.extend_matrix(result, tag=0)
+
+    results = {
+        "ingest": timed(ingest, args.rounds),
+        "fit": timed(engine.forecaster.fit, args.rounds),
+        "rebuild": timed(engine.rebuild, args.rounds),
+    }
+    engine._last_refresh = time.monotonic()
+    engine._ready.set()
+    report_ms = []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        report = await engine.get_full_health_report()
+        report_ms.append((time.perf_counter() - start) * 1000)
+    results["report"] = report_ms
+    await engine.close()
+
+    predictions = sum(len(getattr(report, f"{k}_predictions")) for k in ("disk", "vram", "thermal", "memory"))
+    memory = sum(b.nbytes for b in engine.forecaster.buffers.values())
+    print(f"{args.series} series x {groups} groups ({predictions} predictions), "
+          f"{memory / 1024 / 1024:.1f} MiB of ring buffers, {args.rounds} rounds\n")
+    print(f"{'':<10}{'p50 ms':>10}{'max ms':>10}")
+    for name, samples in results.items():
+        print(f"{name:<10}{statistics.median(samples):>10.3f}{max(samples):>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-process forecasting")
+    parser.add_argument("--series", type=int, default=2000, help="Series per forecast group")
+    parser.add_argument("--rounds", type=int, default=10, help="Repetitions per stage")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
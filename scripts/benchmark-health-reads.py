@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Hydra Health Read-Path Benchmark
+
+Drives the health aggregator's read endpoints at a fixed request rate while
+the background prober runs against simulated services, and reports request
+latency percentiles. Probes are simulated (with configurable latency) so the
+benchmark measures the in-memory read path, not the network. Requests are
+issued as raw ASGI calls, so the numbers are server-side handling time
+without HTTP client overhead.
+
+Load is open-loop: each request is launched as its own task at its scheduled
+time whether or not earlier requests have finished. Latency is measured from
+the moment the request is launched, so time spent queued behind concurrent
+requests is included. How late the dispatcher launched requests relative to
+the schedule is reported separately as dispatch lag.
+
+Usage:
+    python benchmark-health-reads.py                  # 1000 rps for 10s
+    python benchmark-health-reads.py --rps 2000       # Higher target rate
+    python benchmark-health-reads.py --probe-ms 800   # Slow simulated probes
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_health import server  # noqa: E402
+from hydra_health.checks import CheckResult, CheckStatus  # noqa: E402
+from hydra_health.prober import HealthProber, ProbePolicy  # noqa: E402
+
+ENDPOINTS = ["/health/summary", "/health/nodes", "/health/categories", "/health"]
+
+
+async def asgi_get(app, path):
+    """Issue a GET as a raw ASGI call and return (status, body)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return status, body
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+async def run(args):
+    async def fake_probe(service, client):
+        await asyncio.sleep(args.probe_ms / 1000 * random.uniform(0.5, 1.5))
+        status = CheckStatus.HEALTHY if random.random() > args.flap_rate else CheckStatus.UNHEALTHY
+        return CheckResult(service=service.name, status=status, latency_ms=args.probe_ms)
+
+    aggregator = server.aggregator
+    aggregator.prober = HealthProber(
+        services=aggregator.services,
+        policy=ProbePolicy(base_interval=2.0, min_interval=0.5, max_interval=5.0),
+        on_result=aggregator.record_result,
+        probe=fake_probe,
+    )
+    await aggregator.start_background()
+    await aggregator.prober.refresh_all()
+
+    latencies = {endpoint: [] for endpoint in ENDPOINTS}
+    errors = []
+    dispatch_lag = []
+
+    async def issue(endpoint, launched):
+        status, _ = await asgi_get(server.app, endpoint)
+        latencies[endpoint].append((time.perf_counter() - launched) * 1000)
+        if status != 200:
+            errors.append((endpoint, status))
+
+    interval = 1.0 / args.rps
+    total = int(args.rps * args.duration)
+    tasks = []
+    start = time.perf_counter()
+    sent = 0
+    while sent < total:
+        now = time.perf_counter()
+        # Launch every request whose scheduled time has passed
+        while sent < total and start + sent * interval <= now:
+            endpoint = ENDPOINTS[sent % len(ENDPOINTS)]
+            launched = time.perf_counter()
+            dispatch_lag.append((launched - (start + sent * interval)) * 1000)
+            tasks.append(asyncio.create_task(issue(endpoint, launched)))
+            sent += 1
+        await asyncio.sleep(max(0.0, start + sent * interval - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    direct = []
+    for _ in range(10000):
+        t0 = time.perf_counter()
+        await aggregator.get_health()
+        direct.append((time.perf_counter() - t0) * 1000)
+
+    probes = aggregator.prober.total_probes
+    await aggregator.stop_background()
+
+    if errors:
+        print(f"Errors: {len(errors)} (first: {errors[0]})")
+    print(f"Requests: {total} in {elapsed:.2f}s ({total / elapsed:.0f} rps), background probes: {probes}")
+    combined = [v for values in latencies.values() for v in values]
+    print(f"{'endpoint':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print(f"{'all endpoints':<22}{statistics.median(combined):>10.3f}{percentile(combined, 95):>10.3f}"
+          f"{percentile(combined, 99):>10.3f}{max(combined):>10.3f}")
+    for endpoint, values in latencies.items():
+        print(f"{endpoint:<22}{statistics.median(values):>10.3f}{percentile(values, 95):>10.3f}"
+              f"{percentile(values, 99):>10.3f}{max(values):>10.3f}")
+    print(f"{'dispatch lag':<22}{statistics.median(dispatch_lag):>10.3f}{percentile(dispatch_lag, 95):>10.3f}"
+          f"{percentile(dispatch_lag, 99):>10.3f}{max(dispatch_lag):>10.3f}")
+    print(f"{'get_health() direct':<22}{statistics.median(direct):>10.4f}{percentile(direct, 95):>10.4f}"
+          f"{percentile(direct, 99):>10.4f}{max(direct):>10.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark health aggregator reads")
+    parser.add_argument("--rps", type=int, default=1000, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--probe-ms", type=float, default=200.0, help="Simulated probe latency")
+    parser.add_argument("--flap-rate", type=float, default=0.05, help="Chance a probe reports unhealthy")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Hydra Logging Burst Benchmark
+
+Logs a burst of structured messages from a coroutine at a fixed rate (default
+50k msg/s) while a monitor task measures event-loop lag, i.e. how late a 1 ms
+sleep wakes up. Output goes through hydra_tools.logging_config.setup_logging
+into a file, so the numbers include real write() calls. ``--flush-ms`` adds
+a delay to every flush to stand in for a slow consumer on the other end of
+stdout (a container log driver, a pipe to a busy shipper).
+
+Usage:
+    python benchmark-logging.py                       # 50k msg/s for 3s
+    python benchmark-logging.py --rate 100000 --duration 5
+    python benchmark-logging.py --text                # standard formatter
+    python benchmark-logging.py --flush-ms 0.05       # slow log consumer
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools import logging_config  # noqa: E402
+
+
+class SlowFlushStream:
+    """File wrapper whose flush() takes ``delay`` seconds, like a backed-up pipe."""
+
+    def __init__(self, f, delay):
+        self.f = f
+        self.delay = delay
+
+    def write(self, text):
+        return self.f.write(text)
+
+    def flush(self):
+        if self.delay:
+            time.sleep(self.delay)
+        self.f.flush()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+async def monitor_lag(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+
+async def burst(logger, rate, duration):
+    """Log ``rate`` messages per second in 1 ms slices; returns messages sent."""
+    per_tick = max(1, rate // 1000)
+    start = time.perf_counter()
+    sent = 0
+    while time.perf_counter() - start < duration:
+        for _ in range(per_tick):
+            logger.info("Processed item %d", sent, extra={"queue": "research", "attempt": 1})
+            sent += 1
+        # Sleep until this tick's slot so the rate holds when logging is cheap
+        await asyncio.sleep(max(0.0, start + sent / rate - time.perf_counter()))
+    return sent, time.perf_counter() - start
+
+
+async def run(args, logger, out):
+    lags = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(lags, stop))
+    await asyncio.sleep(0.2)
+    baseline = list(lags)
+    lags.clear()
+
+    sent, elapsed = await burst(logger, args.rate, args.duration)
+    stop.set()
+    await monitor
+
+    print(f"Sent {sent} messages in {elapsed:.2f}s ({sent / elapsed:,.0f} msg/s, target {args.rate:,})", file=out)
+    print(f"{'loop lag':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}", file=out)
+    for label, values in (("idle", baseline), ("during burst", lags)):
+        print(f"{label:<16}{statistics.median(values):>10.3f}{percentile(values, 95):>10.3f}"
+              f"{percentile(values, 99):>10.3f}{max(values):>10.3f}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure event-loop lag during a logging burst")
+    parser.add_argument("--rate", type=int, default=50000, help="Messages per second")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of burst")
+    parser.add_argument("--text", action="store_true", help="Use the text formatter instead of JSON")
+    parser.add_argument("--flush-ms", type=float, default=0.0, help="Added latency per stream flush")
+    args = parser.parse_args()
+
+    output = tempfile.NamedTemporaryFile("w", prefix="hydra-log-bench-", suffix=".log", delete=False)
+    # Log output goes to the file; results go to the real stdout
+    real_stdout = sys.stdout
+    sys.stdout = SlowFlushStream(output, args.flush_ms / 1000)
+    try:
+        logging_config.setup_logging(json_format=not args.text)
+        logger = logging.getLogger("hydra_tools.benchmark")
+        asyncio.run(run(args, logger, real_stdout))
+
+        drain_start = time.perf_counter()
+        stats = logging_config.get_log_stats()
+        if hasattr(logging_config, "shutdown_logging"):
+            logging_config.shutdown_logging()
+        drain = time.perf_counter() - drain_start
+    finally:
+        sys.stdout = real_stdout
+        output.close()
+
+    lines = sum(1 for _ in open(output.name))
+    os.unlink(output.name)
+    print(f"Lines written: {lines}, flush after burst: {drain * 1000:.0f} ms")
+    if stats:
+        print(f"Pipeline: dropped {stats['dropped']}, batches {stats['batches']}, "
+              f"policy {stats['drop_policy']}, capacity {stats['capacity']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Hydra News Trend Benchmark
+
+Measures topic extraction per entry (every n-gram scanned against every tech
+indicator, as before, against one automaton match per word) and end-to-end
+analyze_news_entries throughput on a stream of synthetic feed entries, with
+the number of tracked topics to show memory stays bounded.
+
+State files are written to a temporary directory, not HYDRA_DATA_DIR.
+
+Usage:
+    python benchmark-news-trends.py
+    python benchmark-news-trends.py --entries 50000 --batch 1000
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools import news_intelligence  # noqa: E402
+from hydra_tools.news_intelligence import TECH_INDICATORS, NewsIntelligenceEngine  # noqa: E402
+
+WORDS = ["nvidia", "ships", "new", "gpu", "for", "local", "inference", "market", "open", "weights",
+         "model", "speculative", "decoding", "weather", "report", "startup", "raises", "funding",
+         "quantization", "benchmark", "results", "agent", "framework", "release", "city", "council"]
+
+
+def naive_topics(text):
+    words = re.findall(r'\b[a-z]{3,}\b', text.lower())
+    bigrams = [f"{words[i]} {words[i+1]}" for i in range(len(words) - 1)]
+    trigrams = [f"{words[i]} {words[i+1]} {words[i+2]}" for i in range(len(words) - 2)]
+    return [p for p in bigrams + trigrams if any(ind in p for ind in TECH_INDICATORS)]
+
+
+def make_entries(count, seed=3):
+    rng = random.Random(seed)
+    vocabulary = WORDS + [f"term{i}" for i in range(2000)]
+    for i in range(count):
+        yield {
+            "id": i,
+            "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 10))),
+            "content_preview": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(20, 40))),
+            "feed_title": f"Feed {i % 25}",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark news trend detection")
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=500, help="Entries per analyze call")
+    args = parser.parse_args()
+
+    entries = list(make_entries(args.entries))
+    texts = [f"{e['title']} {e['content_preview']}" for e in entries[:2000]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        news_intelligence.TREND_SNAPSHOT_FILE = Path(tmp) / "trend_snapshot.json.gz"
+        news_intelligence.TRENDING_FILE = Path(tmp) / "trending_topics.json"
+        news_intelligence.SUGGESTIONS_FILE = Path(tmp) / "research_suggestions.json"
+        engine = NewsIntelligenceEngine()
+
+        start = time.perf_counter()
+        for text in texts:
+            naive_topics(text)
+        naive_us = (time.perf_counter() - start) / len(texts) * 1e6
+        start = time.perf_counter()
+        for text in texts:
+            engine._extract_topics(text)
+        automaton_us = (time.perf_counter() - start) / len(texts) * 1e6
+        print(f"extract topics per entry: substring scans {naive_us:.1f} us, automaton {automaton_us:.1f} us")
+
+        async def stream():
+            for i in range(0, len(entries), args.batch):
+                await engine.analyze_news_entries(entries[i:i + args.batch])
+
+        start = time.perf_counter()
+        asyncio.run(stream())
+        elapsed = time.perf_counter() - start
+        engine.save_snapshot(force=True)
+
+        print(f"analyze_news_entries: {args.entries} entries in {elapsed:.2f}s "
+              f"({args.entries / elapsed * 60:,.0f} entries/minute)")
+        print(f"tracked topics: {len(engine._tracked)} (capacity {engine.trends.capacity}), "
+              f"trending: {len(engine.trending_topics)}, "
+              f"snapshot: {news_intelligence.TREND_SNAPSHOT_FILE.stat().st_size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Hydra Perceive-Phase Benchmark
+
+Measures how long a control loop takes to gather the state it reads every
+cycle (container health, inference diagnosis, GPUs, benchmarks, resources)
+three ways:
+
+- sequential loopback: one HTTP request back to the API after another, as
+  the perceive phases used to do
+- concurrent loopback: the same requests issued together
+- concurrent in-process: the service bus awaiting the handlers directly
+
+The handlers are stubs served by a local uvicorn instance, each sleeping
+``--handler-ms`` to stand in for real work and returning a payload of about
+``--payload-kb``, so the numbers isolate the transport and ordering cost.
+
+Usage:
+    python benchmark-perceive.py                     # 5 ms handlers, 200 rounds
+    python benchmark-perceive.py --handler-ms 50     # Slower sources
+    python benchmark-perceive.py --handler-ms 0      # Pure transport overhead
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.service_bus import ServiceBus  # noqa: E402
+
+PATHS = [
+    "/container-health/",
+    "/diagnosis/inference",
+    "/hardware/gpus",
+    "/self-improvement/benchmarks/latest",
+    "/autonomous/resources",
+]
+
+
+class NoLazyRouters:
+    """Registry stand-in: every stub router is already mounted."""
+
+    def pending_for(self, path):
+        return []
+
+
+def build_app(handler_ms: float, payload_kb: int):
+    app = FastAPI()
+    handlers = {}
+    payload = [{"name": f"item-{i}", "status": "healthy", "value": i * 0.5} for i in range(payload_kb * 16)]
+
+    for path in PATHS:
+        async def handler():
+            await asyncio.sleep(handler_ms / 1000)
+            return {"items": payload, "count": len(payload)}
+        app.get(path)(handler)
+        handlers[path] = handler
+    return app, handlers
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def sequential(bus, base_url):
+    return [await bus.query(path, base_url=base_url) for path in PATHS]
+
+
+async def concurrent(bus, base_url):
+    return await asyncio.gather(*(bus.query(path, base_url=base_url) for path in PATHS))
+
+
+async def measure(gather, bus, base_url, rounds):
+    await gather(bus, base_url)  # warm up connections
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await gather(bus, base_url)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+async def run(args):
+    app, handlers = build_app(args.handler_ms, args.payload_kb)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}"
+    bus = ServiceBus(base_url=base_url)
+    for path, handler in handlers.items():
+        bus.register(path, handler)
+
+    results = {}
+    try:
+        results["sequential loopback"] = await measure(sequential, bus, base_url, args.rounds)
+        results["concurrent loopback"] = await measure(concurrent, bus, base_url, args.rounds)
+        bus.attach(NoLazyRouters())
+        results["concurrent in-process"] = await measure(concurrent, bus, base_url, args.rounds)
+    finally:
+        await bus.close()
+        server.should_exit = True
+        await serve_task
+
+    print(f"{len(PATHS)} sources, {args.handler_ms:g} ms handlers, ~{args.payload_kb} KB payloads, "
+          f"{args.rounds} rounds\n")
+    print(f"{'':<24}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}")
+    for name, latencies in results.items():
+        print(f"{name:<24}{statistics.median(latencies):>9.2f}{percentile(latencies, 95):>9.2f}"
+              f"{statistics.mean(latencies):>9.2f}")
+    print(f"\nCalls by transport: {bus.get_stats()['totals']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark perceive-phase state gathering")
+    parser.add_argument("--handler-ms", type=float, default=5.0, help="Simulated work per handler")
+    parser.add_argument("--payload-kb", type=int, default=4, help="Approximate response size")
+    parser.add_argument("--rounds", type=int, default=200, help="Perceive rounds per mode")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Hydra Prometheus Query Benchmark
+
+Measures one refresh of the three consumers that read GPU state from
+Prometheus at the same moment (the dashboard's 10 GPU queries, the work
+queue's 20 per-GPU queries and predictive maintenance's 8 recording rules):
+
+- independent: each consumer queries one at a time with a new HTTP client
+  per query, as they used to
+- shared: every consumer goes through one PrometheusClient, so identical
+  queries are coalesced and distinct ones batched into one request. The
+  cache is cleared between rounds so each round pays for a fresh scrape
+  interval; within an interval later rounds would be free.
+
+The Prometheus side is a stub served by a local uvicorn instance that
+answers every selector with one series after ``--latency-ms``, so the
+numbers isolate request count and connection cost.
+
+Usage:
+    python benchmark-prometheus-queries.py
+    python benchmark-prometheus-queries.py --latency-ms 20 --rounds 50
+"""
+
+import argparse
+import asyncio
+import re
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.autonomous_queue import CLUSTER_NODES  # noqa: E402
+from hydra_tools.prometheus_query import BATCH_LABEL, PrometheusClient  # noqa: E402
+
+DASHBOARD = [
+    "nvidia_gpu_memory_used_bytes", "nvidia_gpu_memory_total_bytes", "nvidia_gpu_utilization_percent",
+    "nvidia_gpu_temperature_celsius", "nvidia_gpu_power_draw_watts", "DCGM_FI_DEV_FB_USED",
+    "DCGM_FI_DEV_FB_FREE", "DCGM_FI_DEV_GPU_UTIL", "DCGM_FI_DEV_GPU_TEMP", "DCGM_FI_DEV_POWER_USAGE",
+]
+SCHEDULER = [
+    f'{metric}{{instance="{node["prometheus_instance"]}",gpu="{gpu["index"]}"}}'
+    for node in CLUSTER_NODES.values() if node["metrics_type"] != "none"
+    for gpu in node["gpus"]
+    for metric in (
+        ("DCGM_FI_DEV_GPU_UTIL", "DCGM_FI_DEV_FB_USED", "DCGM_FI_DEV_FB_FREE", "DCGM_FI_DEV_GPU_TEMP",
+         "DCGM_FI_DEV_POWER_USAGE") if node["metrics_type"] == "dcgm" else
+        ("nvidia_gpu_utilization_percent", "nvidia_gpu_memory_used_bytes", "nvidia_gpu_memory_total_bytes",
+         "nvidia_gpu_temperature_celsius", "nvidia_gpu_power_draw_watts")
+    )
+]
+MAINTENANCE = [
+    "disk:predicted_usage_24h:percent", "disk:time_to_full:hours", "gpu:predicted_vram_1h:percent",
+    "gpu:predicted_vram_1h_dcgm:percent", "gpu:predicted_temp_10m:celsius",
+    "gpu:predicted_temp_10m_dcgm:celsius", "node:predicted_memory_usage_1h:percent",
+    "cluster:health_score:percent",
+]
+CONSUMERS = {"dashboard": DASHBOARD, "scheduler": SCHEDULER, "maintenance": MAINTENANCE}
+_TAGGED = re.compile(r'label_replace\((.*?), "' + BATCH_LABEL + r'", "(\d+)", "", ""\)')
+
+
+def build_app(latency_ms: float, counter: dict):
+    app = FastAPI()
+
+    @app.api_route("/api/v1/query", methods=["GET", "POST"])
+    async def query(request: Request):
+        params = dict(request.query_params)
+        if request.method == "POST":
+            params.update(dict(await request.form()))
+        counter["requests"] += 1
+        await asyncio.sleep(latency_ms / 1000)
+        tagged = _TAGGED.findall(params["query"]) or [(params["query"], None)]
+        result = [
+            {"metric": {"__name__": selector.split("{")[0], **({BATCH_LABEL: index} if index else {})},
+             "value": [time.time(), "42"]}
+            for selector, index in tagged
+        ]
+        return {"status": "success", "data": {"resultType": "vector", "result": result}}
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def independent(base_url, _client):
+    async def consumer(queries):
+        for promql in queries:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                (await client.get(f"{base_url}/api/v1/query", params={"query": promql})).json()
+    await asyncio.gather(*(consumer(q) for q in CONSUMERS.values()))
+
+
+async def shared(_base_url, client):
+    client.invalidate()
+    await asyncio.gather(*(client.query_many({q: q for q in queries}) for queries in CONSUMERS.values()))
+
+
+async def measure(refresh, base_url, client, counter, rounds):
+    await refresh(base_url, client)  # warm up
+    counter["requests"] = 0
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await refresh(base_url, client)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, counter["requests"] / rounds
+
+
+async def run(args):
+    counter = {"requests": 0}
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(build_app(args.latency_ms, counter), host="127.0.0.1", port=port,
+                                           log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}"
+    client = PrometheusClient(base_url)
+    results = {}
+    try:
+        results["independent"] = await measure(independent, base_url, client, counter, args.rounds)
+        results["shared"] = await measure(shared, base_url, client, counter, args.rounds)
+    finally:
+        await client.close()
+        server.should_exit = True
+        await serve_task
+
+    asked = sum(len(q) for q in CONSUMERS.values())
+    distinct = len({q for queries in CONSUMERS.values() for q in queries})
+    print(f"{asked} queries per refresh ({distinct} distinct), {args.latency_ms:g} ms Prometheus latency, "
+          f"{args.rounds} rounds\n")
+    print(f"{'':<14}{'requests':>10}{'p50 ms':>9}{'mean ms':>9}")
+    for name, (latencies, requests) in results.items():
+        print(f"{name:<14}{requests:>10.1f}{statistics.median(latencies):>9.2f}{statistics.mean(latencies):>9.2f}")
+    print(f"\nShared client: {client.get_stats()['by_kind']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared Prometheus querying")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated Prometheus latency")
+    parser.add_argument("--rounds", type=int, default=30, help="Refreshes per mode")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
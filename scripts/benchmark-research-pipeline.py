@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Hydra Research Pipeline Benchmark
+
+Runs the same autonomous research job twice against local stub sources -
+once the way execute_job used to (each source collected, then each item
+analyzed, one request at a time) and once through the stage DAG - and
+reports wall-clock time per job. Then it fails a DAG run at report time and
+reruns it to show how much a resumed job redoes.
+
+The stubs answer through httpx.MockTransport with per-service latencies
+modeled on a LAN SearXNG, arXiv, GitHub and a 7B model behind LiteLLM,
+multiplied by ``--scale``.
+
+Usage:
+    python benchmark-research-pipeline.py                 # 5 sources, scale 0.1
+    python benchmark-research-pipeline.py --scale 1       # Realistic latencies
+    python benchmark-research-pipeline.py --analyze-concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.autonomous_research import (  # noqa: E402
+    MAX_ANALYZED_ITEMS,
+    AutonomousResearchPipeline,
+)
+
+LATENCY = {  # seconds at --scale 1
+    "search": 0.4,
+    "arxiv": 1.2,
+    "github": 0.6,
+    "analyze": 1.5,
+    "synthesize": 4.0,
+}
+
+SOURCES = [
+    {"source_type": "web_search", "query": "speculative decoding", "max_results": 10},
+    {"source_type": "web_search", "query": "kv cache quantization", "max_results": 10},
+    {"source_type": "web_search", "query": "exllamav2 tensor parallel", "max_results": 10},
+    {"source_type": "arxiv", "query": "speculative decoding", "max_results": 5},
+    {"source_type": "github", "query": "llm inference server", "max_results": 5},
+]
+
+
+class StubServices:
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.calls = {kind: 0 for kind in LATENCY}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        kind, response = self._route(request)
+        self.calls[kind] += 1
+        await asyncio.sleep(LATENCY[kind] * self.scale)
+        return response
+
+    def _route(self, request):
+        if request.url.path == "/search":
+            query = request.url.params["q"]
+            results = [{"title": f"{query} {i}", "url": f"http://web.test/{i}", "content": f"{query} {i}"}
+                       for i in range(10)]
+            return "search", httpx.Response(200, json={"results": results})
+        if request.url.host == "export.arxiv.org":
+            entries = "".join(f"<entry><id>http://arxiv.org/{i}</id><title>paper {i}</title>"
+                              f"<summary>abstract {i}</summary></entry>" for i in range(5))
+            return "arxiv", httpx.Response(200, text=f"<feed>{entries}</feed>")
+        if request.url.host == "api.github.com":
+            items = [{"full_name": f"org/repo{i}", "html_url": f"http://gh.test/{i}", "description": f"repo {i}"}
+                     for i in range(5)]
+            return "github", httpx.Response(200, json={"items": items})
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        if prompt.startswith("Synthesize"):
+            content = {"key_insights": ["insight"], "action_items": ["action"]}
+            return "synthesize", completion(content)
+        return "analyze", completion({"relevance_score": 0.7, "key_points": ["point"]})
+
+
+def completion(content):
+    return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(content)}}]})
+
+
+def make_pipeline(storage, stubs, args):
+    pipeline = AutonomousResearchPipeline(
+        storage_path=storage,
+        llm_url="http://llm.test",
+        searxng_url="http://searxng.test",
+        analyze_concurrency=args.analyze_concurrency,
+        per_host_concurrency=args.per_host_concurrency,
+    )
+    pipeline._http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(stubs.handler))
+    return pipeline
+
+
+async def run_sequential(pipeline, job):
+    """The collect-then-analyze loop execute_job ran before the stage DAG."""
+    async with pipeline._http_client() as client:
+        items = []
+        for source in job.sources:
+            items.extend(await pipeline._collect_from_source(client, source, job.topic))
+        job.findings = [await pipeline._analyze_item(client, item, job.topic) for item in items[:MAX_ANALYZED_ITEMS]]
+        await pipeline._synthesize_findings(client, job)
+        await pipeline._generate_report(job)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark research job execution")
+    parser.add_argument("--scale", type=float, default=0.1, help="Multiplier for stub latencies")
+    parser.add_argument("--analyze-concurrency", type=int, default=4)
+    parser.add_argument("--per-host-concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as storage:
+        stubs = StubServices(args.scale)
+        pipeline = make_pipeline(storage, stubs, args)
+        job = pipeline.create_job(name="bench", topic="llm inference", sources=SOURCES)
+
+        start = time.perf_counter()
+        await run_sequential(pipeline, job)
+        sequential_s = time.perf_counter() - start
+        sequential_calls = dict(stubs.calls)
+
+        stubs.calls = {kind: 0 for kind in LATENCY}
+        start = time.perf_counter()
+        await pipeline.execute_job(job.job_id)
+        dag_s = time.perf_counter() - start
+
+        # Interrupted run: fail at report time, then resume in a fresh pipeline
+        original_report = pipeline._generate_report
+
+        async def broken_report(job):
+            raise OSError("simulated crash")
+
+        pipeline._generate_report = broken_report
+        stubs.calls = {kind: 0 for kind in LATENCY}
+        await pipeline.execute_job(job.job_id)
+        pipeline._generate_report = original_report
+        stubs.calls = {kind: 0 for kind in LATENCY}
+        resumed_pipeline = make_pipeline(storage, stubs, args)
+        start = time.perf_counter()
+        resumed = await resumed_pipeline.execute_job(job.job_id)
+        resumed_s = time.perf_counter() - start
+
+    print(f"{len(SOURCES)} sources, {MAX_ANALYZED_ITEMS} items analyzed, latency scale {args.scale:g}")
+    print(f"Requests per run: {sequential_calls}\n")
+    print(f"{'sequential (previous)':<26}{sequential_s:>8.2f}s")
+    print(f"{'stage DAG':<26}{dag_s:>8.2f}s  ({sequential_s / dag_s:.1f}x)")
+    print(f"{'resumed after failure':<26}{resumed_s:>8.2f}s  "
+          f"({resumed.resumed_steps} steps from checkpoint, requests: {stubs.calls})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
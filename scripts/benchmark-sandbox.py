@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Hydra Sandbox Latency Benchmark
+
+Runs a hello-world snippet through SandboxManager.execute_async repeatedly,
+first with a one-shot container per run and then through the warm container
+pool, and reports p50/p95 end-to-end latency for each.
+
+Uses the local Docker daemon when its socket is reachable. With ``--fake``
+(or no daemon) it runs against the in-process fake Engine API from the test
+suite, with per-operation delays standing in for the daemon; those delays
+are inputs, so only the relative cost of the two paths is meaningful there.
+
+Usage:
+    python benchmark-sandbox.py                    # 50 runs per mode
+    python benchmark-sandbox.py --runs 200 --concurrency 4
+    python benchmark-sandbox.py --fake --create-ms 120 --start-ms 350
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hydra_tools.sandbox import ExecutionStatus, SandboxManager  # noqa: E402
+from hydra_tools.sandbox_pool import AsyncDockerClient  # noqa: E402
+
+HELLO_WORLD = "print('Hello from sandbox!')"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def make_manager(args, pooled):
+    data_dir = tempfile.mkdtemp(prefix="hydra-sandbox-bench-")
+    # Bind sources are local paths unless the benchmark itself runs in a container
+    manager = SandboxManager(data_dir=data_dir, host_data_dir=args.host_data_dir or data_dir)
+    manager._get_enforcer = lambda: None
+    manager.pool_enabled = pooled
+    if args.fake:
+        from tests.fake_docker import FakeDocker
+
+        fake = FakeDocker(images=list(SandboxManager.IMAGES.values()), latency={
+            "create": args.create_ms / 1000,
+            "start": args.start_ms / 1000,
+            "remove": args.remove_ms / 1000,
+            "exec_create": args.exec_ms / 1000,
+            "exec_start": args.exec_ms / 1000,
+            "wait": args.exec_ms / 1000,
+        })
+        manager._docker = AsyncDockerClient(transport=fake.transport())
+    return manager
+
+
+async def measure(manager, runs, concurrency):
+    latencies, failures = [], 0
+    remaining = runs
+
+    async def worker():
+        nonlocal remaining, failures
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            result = await manager.execute_async(HELLO_WORLD)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result.status != ExecutionStatus.SUCCESS:
+                failures += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures
+
+
+async def run_mode(args, pooled):
+    manager = make_manager(args, pooled)
+    try:
+        if pooled:
+            # Let the pool warm up before timing, as it would in a running API
+            manager.get_pool().start()
+            await asyncio.sleep(args.warmup)
+        return await measure(manager, args.runs, args.concurrency)
+    finally:
+        await manager.close()
+
+
+async def run(args):
+    print(f"{'mode':<10}{'runs':>8}{'p50 ms':>12}{'p95 ms':>12}{'max ms':>12}{'failed':>8}")
+    for label, pooled in (("cold", False), ("pooled", True)):
+        latencies, failures = await run_mode(args, pooled)
+        print(f"{label:<10}{len(latencies):>8}{statistics.median(latencies):>12.1f}"
+              f"{percentile(latencies, 95):>12.1f}{max(latencies):>12.1f}{failures:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sandbox latency with and without the warm pool")
+    parser.add_argument("--runs", type=int, default=50, help="Executions per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent callers")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds to let the pool warm up")
+    parser.add_argument("--host-data-dir", default=None, help="Host path of the data dir (when run in a container)")
+    parser.add_argument("--fake", action="store_true", help="Use the in-process fake Docker API")
+    parser.add_argument("--create-ms", type=float, default=100.0, help="Fake container create latency")
+    parser.add_argument("--start-ms", type=float, default=300.0, help="Fake container start latency")
+    parser.add_argument("--remove-ms", type=float, default=50.0, help="Fake container remove latency")
+    parser.add_argument("--exec-ms", type=float, default=2.0, help="Fake exec/wait call latency")
+    args = parser.parse_args()
+
+    docker_host = os.getenv("DOCKER_HOST", "unix:///var/run/docker.sock")
+    if not args.fake and docker_host.startswith("unix://") and not os.path.exists(docker_host[len("unix://"):]):
+        print(f"No Docker daemon at {docker_host}; using the fake Engine API")
+        args.fake = True
+    logging.disable(logging.WARNING)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
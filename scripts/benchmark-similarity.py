@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Hydra Similarity Benchmark
+
+Times cosine top-k scoring through hydra_tools.similarity against the
+per-pair Python loop the call sites used before, at two sizes:
+
+- 1 x 10k: one query against 10,000 vectors (a rerank or an archive search)
+- 100 x 100k: 100 queries against 100,000 vectors (a batch over a large
+  in-memory set); the Python loop is timed on a slice and extrapolated
+
+For the VectorStore rows, the store is built before timing, so only scoring
+and top-k selection are measured. Recall@k compares each quantized store's
+top-k with the exact float32 top-k.
+
+Usage:
+    python benchmark-similarity.py
+    python benchmark-similarity.py --dim 384 --k 20 --rounds 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.similarity import VectorStore, cosine_many, top_k  # noqa: E402
+
+
+def loop_cosine(a, b):
+    """The per-pair loop previously copied into reranker, asset_quality, discovery_archive and memory."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(x * x for x in b) ** 0.5
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def recall(rows, exact_rows):
+    k = exact_rows.shape[1]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(rows.tolist(), exact_rows.tolist())]))
+
+
+def scenario(queries, count, args, rng):
+    matrix = rng.standard_normal((count, args.dim), dtype=np.float32)
+    query_matrix = rng.standard_normal((queries, args.dim), dtype=np.float32)
+    print(f"\n{queries} x {count:,} (dim {args.dim}, top {args.k})")
+    print(f"{'':<28}{'ms':>12}{'MiB':>10}{'recall':>9}")
+
+    # The old way: Python lists, one pair at a time, then a full sort
+    sample = min(count, args.loop_sample)
+    list_rows = matrix[:sample].tolist()
+    list_query = query_matrix[0].tolist()
+
+    def loop():
+        scores = [loop_cosine(list_query, row) for row in list_rows]
+        return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:args.k]
+
+    ms, _ = timed(loop, 1)
+    estimate = ms * (count / sample) * queries
+    label = "python loop" + (" (extrapolated)" if sample < count or queries > 1 else "")
+    print(f"{label:<28}{estimate:>12.1f}{'':>10}{'':>9}")
+
+    if queries == 1:
+        ms, _ = timed(lambda: top_k(cosine_many(list_query, list_rows), args.k), args.rounds)
+        print(f"{'cosine_many from lists':<28}{ms * (count / sample):>12.1f}{'':>10}{'':>9}")
+
+    exact_rows = None
+    for dtype in VectorStore.DTYPES:
+        store = VectorStore(args.dim, dtype=dtype, capacity=count)
+        store.add(matrix)
+        ms, (rows, _) = timed(lambda: store.search(query_matrix, args.k), args.rounds)
+        if exact_rows is None:
+            exact_rows = rows
+        print(f"{'VectorStore ' + dtype:<28}{ms:>12.1f}{store.nbytes / 2**20:>10.1f}"
+              f"{recall(rows, exact_rows):>9.3f}")
+        del store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared similarity kernel")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension (nomic-embed-text: 768)")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--rounds", type=int, default=3, help="Repetitions per measurement")
+    parser.add_argument("--loop-sample", type=int, default=2000, help="Vectors scored by the Python loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    scenario(1, 10_000, args, rng)
+    scenario(100, 100_000, args, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Hydra Trigger Rule Benchmark
+
+Measures one decide cycle's rule evaluation as the number of rules grows:
+every compiled condition evaluated against the full facts (what a cycle
+costs without the dependency index), against the rule engine, which only
+re-runs rules whose facts changed since the previous cycle.
+
+Each rule reads one of ``--facts`` metrics; each cycle ``--changed`` of them
+move, the way a few GPU/latency readings change between perceive cycles while
+most of the state stays put.
+
+Usage:
+    python benchmark-trigger-rules.py
+    python benchmark-trigger-rules.py --rules 10 100 1000 10000 --changed 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.rule_engine import RuleEngine, compile_condition  # noqa: E402
+
+
+@dataclass
+class Rule:
+    id: str
+    condition: str
+    message: str = ""
+
+
+def make_rules(count: int, facts: int):
+    templates = [
+        "metric_{f} > {t}",
+        "metric_{f} > {t} and pending_task_count < 50",
+        "len(unhealthy_containers) > 0 or metric_{f} >= {t}",
+        "metrics.metric_{f} < {t} - 5",
+    ]
+    return [
+        Rule(f"rule-{i}", templates[i % len(templates)].format(f=i % facts, t=50 + i % 40))
+        for i in range(count)
+    ]
+
+
+def cycles(facts: int, changed: int, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    current = {f"metric_{i}": rng.uniform(0, 100) for i in range(facts)}
+    current.update(pending_task_count=3, unhealthy_containers=[])
+    for _ in range(count):
+        current = dict(current)
+        for i in rng.sample(range(facts), changed):
+            current[f"metric_{i}"] = rng.uniform(0, 100)
+        current["metrics"] = {k: v for k, v in current.items() if k.startswith("metric_")}
+        yield current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trigger rule evaluation per cycle")
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--facts", type=int, default=200, help="Distinct metrics rules read")
+    parser.add_argument("--changed", type=int, default=3, help="Metrics that change per cycle")
+    parser.add_argument("--cycles", type=int, default=200)
+    args = parser.parse_args()
+
+    states = list(cycles(args.facts, args.changed, args.cycles))
+    print(f"{args.facts} metrics, {args.changed} changing per cycle, {args.cycles} cycles\n")
+    print(f"{'rules':>8}{'all rules (us)':>18}{'incremental (us)':>20}{'evaluated/cycle':>18}")
+
+    for count in args.rules:
+        rules = make_rules(count, args.facts)
+
+        compiled = [compile_condition(r.condition) for r in rules]
+        start = time.perf_counter()
+        for facts in states:
+            [condition(facts) for condition in compiled]
+        full_us = (time.perf_counter() - start) / len(states) * 1e6
+
+        engine = RuleEngine()
+        engine.compile(rules)
+        engine.evaluate(rules, states[0])
+        evaluated = engine.stats["evaluated"]
+        start = time.perf_counter()
+        for facts in states[1:]:
+            engine.evaluate(rules, facts)
+        incremental_us = (time.perf_counter() - start) / (len(states) - 1) * 1e6
+        per_cycle = (engine.stats["evaluated"] - evaluated) / (len(states) - 1)
+
+        print(f"{count:>8}{full_us:>18.1f}{incremental_us:>20.1f}{per_cycle:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
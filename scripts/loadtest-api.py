@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Hydra Tools API Load Test
+
+Runs hydra_tools.api:app in-process against stub backends (Qdrant, Ollama,
+Prometheus, Meilisearch) and drives a mix of hot endpoints, reporting
+throughput, p50/p95/p99 latency and event-loop lag. Runs can be saved as
+baselines and later runs diffed against them.
+
+Usage:
+    python loadtest-api.py                                # default mix, 10s, 32 workers
+    python loadtest-api.py --mix read-heavy --duration 30
+    python loadtest-api.py --mix cache_lookup=3,events_stream=1
+    python loadtest-api.py --rps 500                      # open-loop at a fixed rate
+    python loadtest-api.py --save-baseline main
+    python loadtest-api.py --compare main                 # exit 1 on regression
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Hydra Tools API in-process")
+    parser.add_argument("--mix", default="default", help="Mix name or name=weight,... spec")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to record")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unrecorded seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=32, help="Closed-loop workers")
+    parser.add_argument("--rps", type=float, default=None, help="Open-loop arrival rate instead of workers")
+    parser.add_argument("--backend-latency-ms", type=float, default=0.0, help="Added latency per stub backend call")
+    parser.add_argument("--lifespan", action="store_true", help="Also run app startup/shutdown (schedulers)")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Save this run as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Diff this run against a named baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression fraction")
+    parser.add_argument("--baseline-dir", type=Path, default=None, help="Baseline directory (default $HYDRA_DATA_DIR/loadtest)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # Resolve the baseline directory before HYDRA_DATA_DIR is redirected below
+    baseline_dir = args.baseline_dir or Path(os.environ.get("HYDRA_DATA_DIR", "/data")) / "loadtest"
+
+    # Keep the app's databases and state files out of the real data directory;
+    # must happen before hydra_tools modules read HYDRA_DATA_DIR at import.
+    os.environ["HYDRA_DATA_DIR"] = tempfile.mkdtemp(prefix="hydra-loadtest-")
+    os.environ.setdefault("HYDRA_LOG_JSON", "false")
+    os.environ.pop("HYDRA_API_KEY", None)
+    os.environ.pop("HYDRA_API_KEYS", None)
+    logging.disable(logging.WARNING)
+
+    from hydra_tools.load_testing import (
+        compare_reports,
+        load_baseline,
+        parse_mix,
+        run_api_load_test,
+        save_baseline,
+    )
+
+    baseline = load_baseline(args.compare, baseline_dir) if args.compare else None
+    report = asyncio.run(run_api_load_test(
+        parse_mix(args.mix),
+        duration=args.duration,
+        concurrency=args.concurrency,
+        rps=args.rps,
+        warmup=args.warmup,
+        backend_latency_ms=args.backend_latency_ms,
+        lifespan=args.lifespan,
+    ))
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.format_table())
+        print(f"Backend calls: {report.backend_requests}")
+
+    if args.save_baseline:
+        path = save_baseline(report, args.save_baseline, baseline_dir)
+        print(f"Saved baseline to {path}")
+
+    if baseline is not None:
+        rows = compare_reports(baseline, report, tolerance=args.tolerance)
+        regressions = [row for row in rows if row["regressed"]]
+        print(f"\nCompared with baseline '{args.compare}' ({baseline.started_at}):")
+        for row in rows:
+            change = f"{row['change_pct']:+.1f}%" if row["change_pct"] is not None else "n/a"
+            flag = "  REGRESSION" if row["regressed"] else ""
+            print(f"  {row['scope']:<18}{row['metric']:<16}{row['baseline']:>10}{row['current']:>10}{change:>9}{flag}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
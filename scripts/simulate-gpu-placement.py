@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Hydra GPU Placement Simulator
+
+Replays a synthetic autonomous workload against the cluster's GPUs under two
+scheduling policies and reports utilization and queue wait:
+
+- legacy: the previous scheduler, one start per tick, taking the first task
+  in a 20-row priority window whose node has any GPU that looks available
+- placement: PlacementEngine, packing as many tasks per tick as fit onto
+  individual GPUs with reservations, priority aging and starvation holds
+
+Work arrives as a Poisson process with the work-type and priority mix below.
+Each task uses a random fraction of the VRAM and utilization it claims
+(occasionally a little more), and its usage only shows up in the metrics
+after ``--lag`` seconds, like the Prometheus scrape and cache delay. The
+hydra-ai 5090 carries a resident TabbyAPI model whose load drifts.
+
+Both policies see the same arrivals, durations and actual usage. A GPU whose
+actual usage exceeds its VRAM fails the most recently started task on it
+(counted as an OOM); the task goes back to the queue, as a retry would.
+Queue wait is measured from submission to the start that completed.
+
+Usage:
+    python simulate-gpu-placement.py
+    python simulate-gpu-placement.py --rate 40 --hours 24 --max-concurrent 6
+"""
+
+import argparse
+import math
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools.autonomous_queue import (  # noqa: E402
+    CLUSTER_NODES,
+    RESOURCE_THRESHOLDS,
+    AutonomousScheduler,
+    ClusterResources,
+    GPUStatus,
+    NodeStatus,
+)
+from hydra_tools.gpu_placement import PlacementEngine, TaskDemand  # noqa: E402
+
+# work_type: (share of arrivals, mean duration seconds)
+WORK_MIX = {
+    "chapter_generation": (0.10, 900),
+    "research": (0.20, 420),
+    "asset_generation": (0.25, 300),
+    "quality_scoring": (0.20, 90),
+    "inference": (0.15, 180),
+    "maintenance": (0.10, 120),
+}
+PRIORITY_MIX = {"urgent": 0.05, "high": 0.20, "normal": 0.50, "low": 0.25}
+PRIORITY_ORDER = {"urgent": 1, "high": 2, "normal": 3, "low": 4}
+TICK = RESOURCE_THRESHOLDS["check_interval_seconds"]
+
+# Resident load outside the queue: (used_gb, util) per GPU
+BACKGROUND = {
+    ("hydra-ai", 0): (22.0, 20.0),
+    ("hydra-ai", 1): (4.0, 5.0),
+    ("hydra-compute", 0): (2.0, 0.0),
+    ("hydra-compute", 1): (2.0, 0.0),
+}
+
+
+@dataclass
+class SimTask:
+    demand: TaskDemand
+    duration: float
+    vram_fraction: float
+    util_fraction: float
+    started_at: Optional[float] = None
+    gpu: Optional[Tuple[str, int]] = None
+
+
+def workload(rate_per_hour: float, hours: float, seed: int) -> List[SimTask]:
+    rng = random.Random(seed)
+    requirements = AutonomousScheduler()._get_task_requirements
+    types, weights = zip(*((t, share) for t, (share, _) in WORK_MIX.items()))
+    priorities, priority_weights = zip(*PRIORITY_MIX.items())
+
+    tasks, t = [], 0.0
+    while True:
+        t += rng.expovariate(rate_per_hour / 3600)
+        if t >= hours * 3600:
+            return tasks
+        work_type = rng.choices(types, weights)[0]
+        reqs = requirements(work_type)
+        tasks.append(SimTask(
+            demand=TaskDemand(
+                task_id=len(tasks) + 1, work_type=work_type,
+                priority=rng.choices(priorities, priority_weights)[0], submitted_at=t,
+                requires_gpu=reqs["requires_gpu"], vram_gb=reqs["min_vram_gb"],
+                util_percent=reqs["util_percent"], node_affinity=reqs["node_affinity"],
+            ),
+            duration=rng.expovariate(1 / WORK_MIX[work_type][1]),
+            vram_fraction=rng.uniform(0.5, 1.15),
+            util_fraction=rng.uniform(0.5, 1.3),
+        ))
+
+
+class Cluster:
+    """True GPU usage over time, and the lagged view the scheduler sees."""
+
+    def __init__(self, lag: float, seed: int):
+        self.lag = lag
+        self.rng = random.Random(seed)
+        self.gpus = {
+            (node, gpu["index"]): gpu["vram_gb"]
+            for node, config in CLUSTER_NODES.items() for gpu in config["gpus"]
+        }
+        self.background = dict(BACKGROUND)
+        self.running: Dict[int, SimTask] = {}
+
+    def drift_background(self):
+        used, util = self.background[("hydra-ai", 0)]
+        self.background[("hydra-ai", 0)] = (
+            min(28.0, max(18.0, used + self.rng.gauss(0, 0.5))),
+            min(90.0, max(0.0, util + self.rng.gauss(0, 8))),
+        )
+
+    def usage(self, now: float, visible_only: bool = False) -> Dict[Tuple[str, int], Tuple[float, float]]:
+        usage = {key: self.background[key] for key in self.gpus}
+        for task in self.running.values():
+            if task.gpu is None or (visible_only and now - task.started_at < self.lag):
+                continue
+            used, util = usage[task.gpu]
+            usage[task.gpu] = (
+                used + task.demand.vram_gb * task.vram_fraction,
+                min(100.0, util + task.demand.util_percent * task.util_fraction),
+            )
+        return usage
+
+    def snapshot(self, now: float) -> ClusterResources:
+        usage = self.usage(now, visible_only=True)
+        nodes = []
+        for name, config in CLUSTER_NODES.items():
+            gpus = []
+            for gpu in config["gpus"]:
+                total = gpu["vram_gb"]
+                used, util = usage[(name, gpu["index"])]
+                free = max(0.0, total - used)
+                gpus.append(GPUStatus(
+                    node=name, gpu_index=gpu["index"], gpu_name=gpu["name"], utilization_percent=util,
+                    vram_used_gb=used, vram_total_gb=total, vram_free_gb=free, temperature_f=140,
+                    power_watts=200, available_for_work=(
+                        util < RESOURCE_THRESHOLDS["gpu_util_max"]
+                        and free >= RESOURCE_THRESHOLDS["vram_free_min_gb"]
+                    ),
+                ))
+            nodes.append(NodeStatus(
+                name=name, ip=config["ip"], online=True, capabilities=config["capabilities"], gpus=gpus,
+                total_vram_gb=0, free_vram_gb=0, avg_gpu_util=0,
+            ))
+        return ClusterResources(
+            timestamp="", total_gpus=len(self.gpus), available_gpus=0, total_vram_gb=0, free_vram_gb=0,
+            cluster_gpu_util=0, can_accept_inference=True, can_accept_image_gen=True, nodes=nodes,
+        )
+
+
+def legacy_pick(pending: List[SimTask], resources: ClusterResources) -> Optional[Tuple[SimTask, Optional[Tuple[str, int]]]]:
+    """The previous _pick_next_task/_can_run_task: first runnable in a 20-row window."""
+    window = sorted(pending, key=lambda t: (PRIORITY_ORDER[t.demand.priority], t.demand.submitted_at))[:20]
+    for task in window:
+        demand = task.demand
+        if not demand.requires_gpu:
+            return task, None
+        for node in resources.nodes:
+            if node.name in demand.node_affinity or not demand.node_affinity:
+                for gpu in node.gpus:
+                    if gpu.available_for_work and gpu.vram_free_gb >= demand.vram_gb:
+                        # The service picks up the work wherever it runs; model it as this GPU
+                        return task, (node.name, gpu.gpu_index)
+    return None
+
+
+def simulate(policy: str, tasks: List[SimTask], args) -> Dict[str, float]:
+    tasks = [SimTask(t.demand, t.duration, t.vram_fraction, t.util_fraction) for t in tasks]
+    cluster = Cluster(args.lag, args.seed)
+    engine = PlacementEngine(RESOURCE_THRESHOLDS, clock=lambda: now)
+    max_concurrent = args.max_concurrent
+    end = args.hours * 3600
+
+    pending: List[SimTask] = []
+    arrivals = iter(tasks)
+    upcoming = next(arrivals, None)
+    waits: Dict[str, List[float]] = {p: [] for p in PRIORITY_MIX}
+    completed = ooms = 0
+    gpu_ticks = busy_ticks = 0
+    vram_used = vram_total = 0.0
+    queue_lengths = []
+
+    now = 0.0
+    while now < end or cluster.running:
+        # Completions since the last tick
+        for task_id, task in list(cluster.running.items()):
+            if task.started_at + task.duration <= now:
+                del cluster.running[task_id]
+                engine.release(task_id)
+                waits[task.demand.priority].append(task.started_at - task.demand.submitted_at)
+                completed += 1
+
+        while upcoming is not None and upcoming.demand.submitted_at <= now:
+            pending.append(upcoming)
+            upcoming = next(arrivals, None)
+
+        cluster.drift_background()
+        resources = cluster.snapshot(now)
+        slots = max_concurrent - len(cluster.running)
+        started: List[Tuple[SimTask, Optional[Tuple[str, int]]]] = []
+        if slots > 0 and now < end:
+            if policy == "legacy":
+                picked = legacy_pick(pending, resources)
+                started = [picked] if picked else []
+            else:
+                engine.observe(resources)
+                by_id = {t.demand.task_id: t for t in pending}
+                for placement in engine.place([t.demand for t in pending], slots, now):
+                    reservation = placement.reservation
+                    gpu = (reservation.node, reservation.gpu_index) if reservation.gpu_index is not None else None
+                    started.append((by_id[placement.task.task_id], gpu))
+
+        for task, gpu in started:
+            pending.remove(task)
+            task.started_at, task.gpu = now, gpu
+            cluster.running[task.demand.task_id] = task
+
+        # Actual usage: an over-full GPU kills its newest task
+        for key, (used, _) in cluster.usage(now).items():
+            total = cluster.gpus[key]
+            while used > total:
+                victims = [t for t in cluster.running.values() if t.gpu == key]
+                if not victims:
+                    break
+                victim = max(victims, key=lambda t: t.started_at)
+                del cluster.running[victim.demand.task_id]
+                engine.release(victim.demand.task_id)
+                pending.append(victim)
+                ooms += 1
+                used -= victim.demand.vram_gb * victim.vram_fraction
+
+        if now < end:
+            queue_lengths.append(len(pending))
+            ours = {key: 0.0 for key in cluster.gpus}
+            for task in cluster.running.values():
+                if task.gpu is not None:
+                    ours[task.gpu] += task.demand.vram_gb * task.vram_fraction
+            for key, total in cluster.gpus.items():
+                gpu_ticks += 1
+                busy_ticks += ours[key] > 0
+                vram_used += ours[key]
+                vram_total += total
+        now += TICK
+
+    all_waits = sorted(w for ws in waits.values() for w in ws)
+
+    def pct(values, q):
+        return values[min(len(values) - 1, int(q * len(values)))] / 60 if values else math.nan
+
+    return {
+        "completed": completed,
+        "throughput_per_hour": completed / args.hours,
+        "never_started": len(pending),
+        "ooms": ooms,
+        "busy_gpu_pct": 100 * busy_ticks / gpu_ticks,
+        "queue_vram_pct": 100 * vram_used / vram_total,
+        "mean_queue": statistics.fmean(queue_lengths),
+        "wait_mean_min": statistics.fmean(all_waits) / 60 if all_waits else math.nan,
+        "wait_p50_min": pct(all_waits, 0.50),
+        "wait_p95_min": pct(all_waits, 0.95),
+        **{f"wait_p95_{p}_min": pct(sorted(ws), 0.95) for p, ws in waits.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate autonomous GPU placement policies")
+    parser.add_argument("--rate", type=float, default=20, help="Task arrivals per hour")
+    parser.add_argument("--hours", type=float, default=24, help="Simulated hours of arrivals")
+    parser.add_argument("--max-concurrent", type=int, default=RESOURCE_THRESHOLDS["max_concurrent_tasks"])
+    parser.add_argument("--lag", type=float, default=60, help="Seconds before usage shows in metrics")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tasks = workload(args.rate, args.hours, args.seed)
+    results = {policy: simulate(policy, tasks, args) for policy in ("legacy", "placement")}
+
+    print(f"{len(tasks)} tasks over {args.hours:g}h ({args.rate:g}/h), "
+          f"max {args.max_concurrent} concurrent, {args.lag:g}s metrics lag\n")
+    print(f"{'':<22}{'legacy':>12}{'placement':>12}")
+    for key in results["legacy"]:
+        print(f"{key:<22}{results['legacy'][key]:>12.1f}{results['placement'][key]:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
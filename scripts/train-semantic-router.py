@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Hydra Semantic Router Training
+
+Trains the nearest-centroid tier classifier used by the semantic router from
+rated generations in the human_feedback database and (optionally) exported
+preference_learning interactions, reports routing accuracy on a held-out
+split next to the heuristic RouteClassifier, then writes the model trained
+on all examples. A running API picks it up with POST /routing/semantic/reload.
+
+Usage:
+    python train-semantic-router.py                          # /data/human_feedback.db
+    python train-semantic-router.py --interactions interactions.jsonl --holdout 0.3
+    python train-semantic-router.py --dry-run                # evaluate only
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hydra_tools import human_feedback  # noqa: E402
+from hydra_tools.routellm import RouteClassifier  # noqa: E402
+from hydra_tools.semantic_router import (  # noqa: E402
+    MODEL_PATH,
+    PromptEmbedder,
+    evaluate,
+    load_feedback_examples,
+    load_interaction_examples,
+    train_centroids,
+)
+
+
+def split(examples, holdout, seed):
+    """Hold out a fraction of distinct prompts, so a prompt never lands on both sides."""
+    prompts = sorted({e.prompt for e in examples})
+    random.Random(seed).shuffle(prompts)
+    test_prompts = set(prompts[:int(len(prompts) * holdout)])
+    train = [i for i, e in enumerate(examples) if e.prompt not in test_prompts]
+    test = [i for i, e in enumerate(examples) if e.prompt in test_prompts]
+    return train, test
+
+
+def decision_latency_us(model, vectors, runs=2000):
+    """Median time for one learned decision on an already-embedded prompt."""
+    latencies = []
+    for i in range(runs):
+        vector = vectors[i % len(vectors)]
+        start = time.perf_counter()
+        model.predict(vector)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Train and evaluate the semantic router")
+    parser.add_argument("--feedback-db", type=Path, default=human_feedback.DB_PATH, help="human_feedback database")
+    parser.add_argument("--interactions", type=Path, help="preference_learning interactions (JSONL)")
+    parser.add_argument("--output", type=Path, default=MODEL_PATH, help="Model file to write")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of prompts held out for evaluation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate without writing the model")
+    args = parser.parse_args()
+
+    examples = []
+    if args.feedback_db.exists():
+        examples += load_feedback_examples(args.feedback_db)
+    if args.interactions:
+        examples += load_interaction_examples(args.interactions)
+    if not examples:
+        print("No usable training examples (rated prompts served by a local tier)")
+        return 1
+
+    embedder = PromptEmbedder()
+    try:
+        start = time.perf_counter()
+        vectors = np.vstack(await embedder.embed_many([e.prompt for e in examples]))
+        embed_s = time.perf_counter() - start
+    finally:
+        await embedder.close()
+
+    tiers = [e.tier for e in examples]
+    weights = [e.weight for e in examples]
+    by_source = {}
+    for e in examples:
+        by_source[e.source] = by_source.get(e.source, 0) + 1
+    print(f"Examples: {len(examples)} {by_source}, embedded in {embed_s:.1f}s ({vectors.shape[1]} dims)")
+
+    metrics = {}
+    train, test = split(examples, args.holdout, args.seed)
+    if test and train:
+        model = train_centroids(vectors[train], [tiers[i] for i in train], [weights[i] for i in train])
+        heuristic = RouteClassifier()
+        baseline = [heuristic.route(examples[i].prompt).tier.value for i in test]
+        metrics = evaluate(model, vectors[test], [examples[i] for i in test], baseline)
+        print(f"\nHeld-out evaluation ({len(test)} examples, {len(train)} for training)")
+        print(f"{'':<28}{'learned':>10}{'heuristic':>11}")
+        print(f"{'accuracy (good outcomes)':<28}{metrics['accuracy']:>10.1%}{metrics['baseline_accuracy']:>11.1%}")
+        print(f"{'accuracy (all outcomes)':<28}{metrics['outcome_accuracy']:>10.1%}"
+              f"{metrics['baseline_outcome_accuracy']:>11.1%}")
+    else:
+        print("Too few distinct prompts for a held-out split; skipping evaluation")
+
+    model = train_centroids(vectors, tiers, weights, metrics=metrics)
+    print(f"\nDecision latency on cached embeddings: {decision_latency_us(model, vectors):.1f} us")
+    print(f"Tiers: {model.labels}, samples: {model.samples}")
+
+    if not args.dry_run:
+        model.save(args.output)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
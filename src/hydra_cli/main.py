@@ -3,7 +3,7 @@
 Hydra CLI - Cluster Management Tool
 
 Usage:
-    hydra status          - Show cluster health status
+    hydra status          - Show cluster health status (--watch to keep refreshing)
     hydra nodes           - List cluster nodes
     hydra services        - List services by node/category
     hydra models          - Manage LLM models
@@ -12,20 +12,30 @@ Usage:
     hydra ssh             - SSH to cluster nodes
     hydra backup          - Backup operations
     hydra config          - View/edit configurations
+
+SSH commands share one multiplexed control connection per node (OpenSSH
+ControlMaster), so only the first command to a node pays for the
+handshake. The masters are closed when the CLI exits unless
+``--ssh-persist DURATION`` (or HYDRA_SSH_PERSIST) keeps them for later runs.
 """
 
 import argparse
+import atexit
 import json
+import os
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import httpx
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import box
 
 console = Console()
@@ -59,6 +69,56 @@ def get_node_ip(node: str) -> str:
     return node
 
 
+class SSHMultiplexer:
+    """
+    Persistent SSH control connection per node.
+
+    Every ssh invocation gets ControlMaster=auto and a shared ControlPath:
+    the first one to a node becomes the master and stays up in the
+    background (ControlPersist), later ones ride its connection. By default
+    the masters used in this run are closed at exit; with ``persist`` set
+    they outlive the run for that long and later runs reuse them.
+    """
+
+    WITHIN_RUN_PERSIST = "120"  # seconds; a backstop if the CLI is killed
+
+    def __init__(self, control_dir: Optional[str] = None, persist: Optional[str] = None):
+        self.control_dir = control_dir or os.path.join(tempfile.gettempdir(), f"hydra-ssh-{os.getuid()}")
+        self.persist = persist
+        self.used: Dict[str, str] = {}  # node -> destination
+
+    def options(self, node: str) -> List[str]:
+        """ssh options that route a command to ``node``'s control connection."""
+        os.makedirs(self.control_dir, mode=0o700, exist_ok=True)
+        node_info = NODES[node]
+        self.used[node] = f"{node_info['user']}@{node_info['ip']}"
+        return [
+            "-o", "ControlMaster=auto",
+            # %C hashes host, port and user, keeping the socket path short
+            "-o", f"ControlPath={os.path.join(self.control_dir, '%C')}",
+            "-o", f"ControlPersist={self.persist or self.WITHIN_RUN_PERSIST}",
+        ]
+
+    def close(self):
+        """Stop the masters this run used, unless they should persist."""
+        if self.persist:
+            return
+        control_path = os.path.join(self.control_dir, "%C")
+        for destination in self.used.values():
+            try:
+                subprocess.run(
+                    ["ssh", "-O", "exit", "-o", f"ControlPath={control_path}", destination],
+                    capture_output=True, timeout=5,
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self.used.clear()
+
+
+ssh_mux = SSHMultiplexer(persist=os.getenv("HYDRA_SSH_PERSIST") or None)
+atexit.register(ssh_mux.close)
+
+
 def ssh_command(node: str, command: str, capture: bool = True) -> Optional[str]:
     """Execute command on remote node via SSH."""
     node_info = NODES.get(node)
@@ -66,7 +126,10 @@ def ssh_command(node: str, command: str, capture: bool = True) -> Optional[str]:
         console.print(f"[red]Unknown node: {node}[/red]")
         return None
 
-    ssh_cmd = ["ssh", "-o", "ConnectTimeout=5", f"{node_info['user']}@{node_info['ip']}", command]
+    ssh_cmd = [
+        "ssh", "-o", "ConnectTimeout=5", *ssh_mux.options(node),
+        f"{node_info['user']}@{node_info['ip']}", command,
+    ]
 
     try:
         if capture:
@@ -83,8 +146,12 @@ def ssh_command(node: str, command: str, capture: bool = True) -> Optional[str]:
         return None
 
 
-def check_service_health(service: str, timeout: float = 5.0) -> tuple[bool, str, float]:
-    """Check if a service is healthy."""
+def check_service_health(
+    service: str,
+    timeout: float = 5.0,
+    client: Optional[httpx.Client] = None,
+) -> tuple[bool, str, float]:
+    """Check if a service is healthy, reusing ``client``'s connections if given."""
     svc = SERVICES.get(service)
     if not svc:
         return False, "Unknown service", 0
@@ -113,12 +180,15 @@ def check_service_health(service: str, timeout: float = 5.0) -> tuple[bool, str,
     url = f"http://{node_ip}:{port}{health_endpoint}"
     try:
         start = datetime.now()
-        with httpx.Client(timeout=timeout) as client:
-            response = client.get(url)
-            latency = (datetime.now() - start).total_seconds() * 1000
-            if response.status_code < 400:
-                return True, f"HTTP {response.status_code}", latency
-            return False, f"HTTP {response.status_code}", latency
+        if client is None:
+            with httpx.Client(timeout=timeout) as own_client:
+                response = own_client.get(url)
+        else:
+            response = client.get(url, timeout=timeout)
+        latency = (datetime.now() - start).total_seconds() * 1000
+        if response.status_code < 400:
+            return True, f"HTTP {response.status_code}", latency
+        return False, f"HTTP {response.status_code}", latency
     except httpx.TimeoutException:
         return False, "Timeout", timeout * 1000
     except httpx.ConnectError:
@@ -127,62 +197,124 @@ def check_service_health(service: str, timeout: float = 5.0) -> tuple[bool, str,
         return False, str(e), 0
 
 
+# === CONCURRENT PROBES ===
+
+def probe_client() -> httpx.Client:
+    """HTTP client shared by all health checks in a run."""
+    return httpx.Client(timeout=5.0, limits=httpx.Limits(max_connections=len(SERVICES)))
+
+
+def check_node(node: str) -> bool:
+    """Whether a node answers over SSH."""
+    result = ssh_command(node, "echo ok")
+    return bool(result and "ok" in result)
+
+
+def run_concurrently(calls: Dict[Any, tuple]) -> Iterator[tuple[Any, Any]]:
+    """
+    Run ``{key: (func, *args)}`` in parallel threads, yielding
+    (key, result) as each finishes.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, len(calls))) as executor:
+        futures = {executor.submit(call[0], *call[1:]): key for key, call in calls.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def service_status(healthy: bool, message: str) -> str:
+    return f"[green]● {message}[/green]" if healthy else f"[red]● {message}[/red]"
+
+
 # === STATUS COMMAND ===
 
-def cmd_status(args):
-    """Show cluster health status."""
-    console.print(Panel.fit("[bold blue]Hydra Cluster Status[/bold blue]"))
+class StatusBoard:
+    """Latest node and service results; rows fill in as probes finish."""
 
-    # Check nodes
-    table = Table(title="Nodes", box=box.ROUNDED)
-    table.add_column("Node", style="cyan")
-    table.add_column("IP", style="dim")
-    table.add_column("Status")
-    table.add_column("Role")
+    PENDING = "[dim]… checking[/dim]"
 
-    for node, info in NODES.items():
-        # Quick SSH check
-        result = ssh_command(node, "echo ok")
-        if result and "ok" in result:
-            status = "[green]● Online[/green]"
+    def __init__(self):
+        self.nodes: Dict[str, bool] = {}
+        self.services: Dict[str, tuple[bool, str, float]] = {}
+        self.rounds = 0
+        self.last_round_seconds: Optional[float] = None
+
+    def update(self, key: tuple[str, str], result):
+        kind, name = key
+        if kind == "node":
+            self.nodes[name] = result
         else:
-            status = "[red]● Offline[/red]"
-        table.add_row(node, info["ip"], status, info["role"])
+            self.services[name] = result
+
+    def render(self, watch: bool = False) -> Group:
+        nodes = Table(title="Nodes", box=box.ROUNDED)
+        nodes.add_column("Node", style="cyan")
+        nodes.add_column("IP", style="dim")
+        nodes.add_column("Status")
+        nodes.add_column("Role")
+        for node, info in NODES.items():
+            if node not in self.nodes:
+                status = self.PENDING
+            elif self.nodes[node]:
+                status = "[green]● Online[/green]"
+            else:
+                status = "[red]● Offline[/red]"
+            nodes.add_row(node, info["ip"], status, info["role"])
+
+        services = Table(title="Services", box=box.ROUNDED)
+        services.add_column("Service", style="cyan")
+        services.add_column("Node")
+        services.add_column("Port")
+        services.add_column("Status")
+        services.add_column("Latency")
+        for service, info in SERVICES.items():
+            if service in self.services:
+                healthy, message, latency = self.services[service]
+                status = service_status(healthy, message)
+                latency_str = f"{latency:.1f}ms" if latency > 0 else "-"
+            else:
+                status, latency_str = self.PENDING, ""
+            services.add_row(service, info["node"], str(info["port"]), status, latency_str)
 
-    console.print(table)
-    console.print()
+        parts = [nodes, "", services]
+        if watch:
+            footer = f"[dim]Refreshed {self.rounds}x"
+            if self.last_round_seconds is not None:
+                footer += f", last round took {self.last_round_seconds:.1f}s"
+            parts.append(footer + " — Ctrl+C to stop[/dim]")
+        return Group(*parts)
 
-    # Check services
-    table = Table(title="Services", box=box.ROUNDED)
-    table.add_column("Service", style="cyan")
-    table.add_column("Node")
-    table.add_column("Port")
-    table.add_column("Status")
-    table.add_column("Latency")
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-        transient=True,
-    ) as progress:
-        task = progress.add_task("Checking services...", total=len(SERVICES))
+def status_probes(client: httpx.Client) -> Dict[tuple[str, str], tuple]:
+    """One probe per node (SSH) and per service (HTTP/TCP)."""
+    probes = {("node", node): (check_node, node) for node in NODES}
+    probes.update({("service", service): (check_service_health, service, 5.0, client) for service in SERVICES})
+    return probes
 
-        for service, info in SERVICES.items():
-            progress.update(task, description=f"Checking {service}...")
-            healthy, message, latency = check_service_health(service)
 
-            if healthy:
-                status = f"[green]● {message}[/green]"
-            else:
-                status = f"[red]● {message}[/red]"
+def run_status_round(board: StatusBoard, client: httpx.Client, live: Live, watch: bool = False):
+    started = time.perf_counter()
+    for key, result in run_concurrently(status_probes(client)):
+        board.update(key, result)
+        live.update(board.render(watch))
+    board.last_round_seconds = time.perf_counter() - started
+    board.rounds += 1
+    live.update(board.render(watch))
 
-            latency_str = f"{latency:.1f}ms" if latency > 0 else "-"
 
-            table.add_row(service, info["node"], str(info["port"]), status, latency_str)
-            progress.advance(task)
+def cmd_status(args):
+    """Show cluster health status."""
+    console.print(Panel.fit("[bold blue]Hydra Cluster Status[/bold blue]"))
 
-    console.print(table)
+    watch = getattr(args, "watch", False)
+    board = StatusBoard()
+    with probe_client() as client, Live(board.render(watch), console=console, refresh_per_second=8) as live:
+        run_status_round(board, client, live, watch)
+        try:
+            while watch:
+                time.sleep(args.interval)
+                run_status_round(board, client, live, watch)
+        except KeyboardInterrupt:
+            pass
 
 
 # === NODES COMMAND ===
@@ -197,9 +329,11 @@ def cmd_nodes(args):
     table.add_column("Status")
     table.add_column("Uptime")
 
+    uptimes = dict(run_concurrently({
+        node: (ssh_command, node, "uptime -p 2>/dev/null || uptime") for node in NODES
+    }))
     for node, info in NODES.items():
-        # Get uptime
-        uptime = ssh_command(node, "uptime -p 2>/dev/null || uptime")
+        uptime = uptimes.get(node)
         if uptime:
             uptime = uptime.strip()[:30]
             status = "[green]● Online[/green]"
@@ -226,11 +360,17 @@ def cmd_services(args):
     table.add_column("Status")
     table.add_column("URL")
 
-    for service, info in sorted(SERVICES.items()):
-        if node_filter and info["node"] != node_filter:
-            continue
-
-        healthy, message, _ = check_service_health(service)
+    selected = {
+        service: info for service, info in sorted(SERVICES.items())
+        if not node_filter or info["node"] == node_filter
+    }
+    with probe_client() as client:
+        results = dict(run_concurrently({
+            service: (check_service_health, service, 5.0, client) for service in selected
+        }))
+
+    for service, info in selected.items():
+        healthy, message, _ = results[service]
         status = "[green]●[/green]" if healthy else "[red]●[/red]"
         node_ip = get_node_ip(info["node"])
         url = f"http://{node_ip}:{info['port']}"
@@ -246,13 +386,14 @@ def cmd_gpu(args):
     """Show GPU status across cluster."""
     console.print(Panel.fit("[bold blue]GPU Status[/bold blue]"))
 
-    for node in ["hydra-ai", "hydra-compute"]:
+    gpu_nodes = ["hydra-ai", "hydra-compute"]
+    query = "nvidia-smi --query-gpu=index,name,memory.used,memory.total,power.draw,temperature.gpu --format=csv,noheader"
+    outputs = dict(run_concurrently({node: (ssh_command, node, query) for node in gpu_nodes}))
+
+    for node in gpu_nodes:
         console.print(f"\n[bold cyan]{node}[/bold cyan]")
 
-        output = ssh_command(
-            node,
-            "nvidia-smi --query-gpu=index,name,memory.used,memory.total,power.draw,temperature.gpu --format=csv,noheader"
-        )
+        output = outputs.get(node)
 
         if not output:
             console.print("[red]  Cannot retrieve GPU info[/red]")
@@ -405,7 +546,7 @@ def cmd_ssh(args):
     info = NODES[node]
     console.print(f"[cyan]Connecting to {node} ({info['ip']})...[/cyan]")
 
-    subprocess.run(["ssh", f"{info['user']}@{info['ip']}"])
+    subprocess.run(["ssh", *ssh_mux.options(node), f"{info['user']}@{info['ip']}"])
 
 
 # === BACKUP COMMAND ===
@@ -467,11 +608,17 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument("--version", action="version", version="hydra-cli 1.0.0")
+    parser.add_argument(
+        "--ssh-persist", metavar="DURATION",
+        help="Keep SSH control connections open after exit for reuse by later runs (e.g. 10m)",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # status
     p_status = subparsers.add_parser("status", help="Show cluster health status")
+    p_status.add_argument("--watch", "-w", action="store_true", help="Keep refreshing until Ctrl+C")
+    p_status.add_argument("--interval", type=float, default=5.0, help="Seconds between refreshes in --watch")
     p_status.set_defaults(func=cmd_status)
 
     # nodes
@@ -527,6 +674,8 @@ def main():
     p_config.set_defaults(func=cmd_config)
 
     args = parser.parse_args()
+    if args.ssh_persist:
+        ssh_mux.persist = args.ssh_persist
 
     if not args.command:
         # Default to status
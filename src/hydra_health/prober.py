@@ -0,0 +1,231 @@
+"""
+Background Health Prober
+
+Continuously probes every service on its own adaptive cadence and keeps the
+latest result per service in memory, so health reads never wait on a probe.
+
+- Stable services back off towards ``max_interval``; a status change drops
+  the service straight to ``min_interval`` until it settles again.
+- Each due service is probed in its own task, so one slow service never
+  delays the others.
+- Refreshes are single-flight per service: concurrent requests for the same
+  service share one in-flight probe.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+from .checks import SERVICES, CheckResult, CheckStatus, ServiceCheck, check_service
+
+logger = logging.getLogger(__name__)
+
+ProbeFunc = Callable[[ServiceCheck, httpx.AsyncClient], Awaitable[CheckResult]]
+
+
+@dataclass
+class ProbePolicy:
+    """Adaptive probe interval settings (seconds)."""
+    base_interval: float = 30.0
+    min_interval: float = 5.0
+    max_interval: float = 120.0
+    backoff_factor: float = 1.5
+    stable_checks_before_backoff: int = 3
+    flap_window: float = 300.0
+
+    def next_interval(self, state: "ProbeState", status_changed: bool) -> float:
+        """Compute the next interval after a probe."""
+        if status_changed:
+            return self.min_interval
+        if state.result is None:
+            return self.base_interval
+        if state.recent_flaps(self.flap_window) > 0 and state.stable_checks < self.stable_checks_before_backoff:
+            return self.min_interval
+        if state.stable_checks < self.stable_checks_before_backoff:
+            return min(state.interval, self.base_interval)
+        return min(self.max_interval, max(state.interval, self.min_interval) * self.backoff_factor)
+
+
+@dataclass
+class ProbeState:
+    """Latest probe result and scheduling state for one service."""
+    service: ServiceCheck
+    interval: float
+    result: Optional[CheckResult] = None
+    checked_at: Optional[float] = None  # monotonic
+    next_due: float = 0.0  # monotonic
+    stable_checks: int = 0
+    probes: int = 0
+    flaps: Deque[float] = field(default_factory=lambda: deque(maxlen=32))
+
+    def recent_flaps(self, window: float) -> int:
+        cutoff = time.monotonic() - window
+        return sum(1 for t in self.flaps if t >= cutoff)
+
+    def age_seconds(self) -> Optional[float]:
+        if self.checked_at is None:
+            return None
+        return time.monotonic() - self.checked_at
+
+
+class HealthProber:
+    """Schedules per-service probes and publishes results to a listener."""
+
+    def __init__(
+        self,
+        services: Optional[List[ServiceCheck]] = None,
+        policy: Optional[ProbePolicy] = None,
+        on_result: Optional[Callable[[ServiceCheck, CheckResult, ProbeState], None]] = None,
+        probe: Optional[ProbeFunc] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.services = list(services or SERVICES)
+        self.policy = policy or ProbePolicy()
+        self.on_result = on_result
+        self._probe = probe or check_service
+        self._client = client
+        self._owns_client = client is None
+        self.states: Dict[str, ProbeState] = {
+            svc.name: ProbeState(service=svc, interval=self.policy.base_interval)
+            for svc in self.services
+        }
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.total_probes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background scheduler. The first round probes everything."""
+        if self.running:
+            return
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Health prober started for {len(self.services)} services")
+
+    async def stop(self) -> None:
+        # The flag ends the loop even if a wakeup swallows the cancellation
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        inflight = list(self._inflight.values())
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+        self._inflight.clear()
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            now = time.monotonic()
+            for name, state in self.states.items():
+                if state.next_due <= now and name not in self._inflight:
+                    self._start_probe(name)
+
+            pending = [s.next_due for n, s in self.states.items() if n not in self._inflight]
+            delay = max(0.05, min(pending) - time.monotonic()) if pending else self.policy.min_interval
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=delay)
+            finally:
+                waiter.cancel()
+
+    def _start_probe(self, name: str) -> asyncio.Task:
+        task = asyncio.create_task(self._probe_service(name))
+        self._inflight[name] = task
+        return task
+
+    async def _probe_service(self, name: str) -> CheckResult:
+        state = self.states[name]
+        service = state.service
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        try:
+            try:
+                result = await self._probe(service, self._client)
+            except Exception as e:
+                result = CheckResult(
+                    service=service.name,
+                    status=CheckStatus.UNKNOWN,
+                    latency_ms=0,
+                    message=str(e),
+                )
+            self._record(state, result)
+            return result
+        finally:
+            self._inflight.pop(name, None)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def _record(self, state: ProbeState, result: CheckResult) -> None:
+        previous = state.result
+        status_changed = previous is not None and previous.status != result.status
+        now = time.monotonic()
+
+        if status_changed:
+            state.flaps.append(now)
+            state.stable_checks = 0
+        else:
+            state.stable_checks += 1
+
+        state.interval = self.policy.next_interval(state, status_changed)
+        state.result = result
+        state.checked_at = now
+        state.next_due = now + state.interval
+        state.probes += 1
+        self.total_probes += 1
+
+        if self.on_result is not None:
+            self.on_result(state.service, result, state)
+
+    async def refresh(self, name: str) -> CheckResult:
+        """Probe one service now, joining an in-flight probe if there is one."""
+        if name not in self.states:
+            raise KeyError(name)
+        task = self._inflight.get(name) or self._start_probe(name)
+        return await asyncio.shield(task)
+
+    async def refresh_all(self) -> List[CheckResult]:
+        """Probe every service now (single-flight per service)."""
+        return await asyncio.gather(*(self.refresh(name) for name in self.states))
+
+    def get_probe_stats(self) -> List[Dict]:
+        stats = []
+        for name, state in self.states.items():
+            age = state.age_seconds()
+            stats.append({
+                "service": name,
+                "status": state.result.status if state.result else CheckStatus.UNKNOWN,
+                "interval_seconds": round(state.interval, 2),
+                "age_seconds": round(age, 2) if age is not None else None,
+                "next_check_in": round(max(0.0, state.next_due - time.monotonic()), 2),
+                "probes": state.probes,
+                "recent_flaps": state.recent_flaps(self.policy.flap_window),
+                "in_flight": name in self._inflight,
+                "last_checked": state.result.timestamp.isoformat() if state.result else None,
+            })
+        return stats
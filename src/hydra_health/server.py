@@ -5,10 +5,14 @@ FastAPI server providing unified health endpoints for the cluster.
 """
 
 import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, Query, HTTPException
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -22,6 +26,10 @@ from .checks import (
     get_services_by_category,
     get_services_by_node,
 )
+from .prober import HealthProber, ProbePolicy, ProbeState
+
+BACKGROUND_PROBING = os.environ.get("HEALTH_BACKGROUND_PROBING", "true").lower() == "true"
+
 
 # API Models
 class HealthSummary(BaseModel):
@@ -34,6 +42,7 @@ class HealthSummary(BaseModel):
     total: int
     critical_down: List[str]
     timestamp: datetime
+    oldest_check: Optional[datetime] = None
 
 
 class ServiceHealth(BaseModel):
@@ -46,6 +55,7 @@ class ServiceHealth(BaseModel):
     category: str
     critical: bool
     timestamp: datetime
+    interval_seconds: Optional[float] = None
 
 
 class ClusterHealth(BaseModel):
@@ -57,114 +67,220 @@ class ClusterHealth(BaseModel):
 
 
 class HealthAggregator:
-    """Manages cluster health checking with caching."""
-
-    def __init__(self, cache_ttl: int = 30):
+    """Serves cluster health from an in-memory per-service result store.
+
+    When the background prober is running, every service is probed on its
+    own adaptive cadence and reads are pure in-memory views. Without it, the
+    aggregator falls back to stale-while-revalidate: an expired view is
+    returned immediately while a single shared refresh runs in the background.
+    """
+
+    def __init__(
+        self,
+        cache_ttl: int = 30,
+        services: Optional[List[ServiceCheck]] = None,
+        policy: Optional[ProbePolicy] = None,
+    ):
         self.cache_ttl = cache_ttl
+        self.services = list(services or SERVICES)
+        self.policy = policy
+        self._service_map = {s.name: s for s in self.services}
+        # Every service is present from the start; unprobed ones are UNKNOWN
+        self._results: Dict[str, ServiceHealth] = {
+            svc.name: self._to_service_health(CheckResult(
+                service=svc.name,
+                status=CheckStatus.UNKNOWN,
+                latency_ms=0,
+                message="Not yet checked",
+            ))
+            for svc in self.services
+        }
+        self._by_name: Dict[str, ServiceHealth] = {}
+        self._views: Dict[str, bytes] = {}
         self._cache: Optional[ClusterHealth] = None
         self._cache_time: Optional[datetime] = None
-        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.prober: Optional[HealthProber] = None
+
+    def _to_service_health(
+        self, result: CheckResult, interval: Optional[float] = None
+    ) -> ServiceHealth:
+        svc_def = self._service_map.get(result.service)
+        return ServiceHealth(
+            service=result.service,
+            status=result.status,
+            latency_ms=result.latency_ms,
+            message=result.message,
+            node=svc_def.node if svc_def else "unknown",
+            category=svc_def.category if svc_def else "unknown",
+            critical=svc_def.critical if svc_def else False,
+            timestamp=result.timestamp,
+            interval_seconds=interval,
+        )
+
+    def record_result(
+        self, service: ServiceCheck, result: CheckResult, state: Optional[ProbeState] = None
+    ) -> None:
+        """Store one probe result and rebuild the precomputed view."""
+        interval = round(state.interval, 2) if state is not None else None
+        self._results[service.name] = self._to_service_health(result, interval)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Precompute the cluster view so reads are O(1)."""
+        now = datetime.utcnow()
+        order = {s.name: i for i, s in enumerate(self.services)}
+        services = sorted(self._results.values(), key=lambda s: order.get(s.service, len(order)))
+
+        # Calculate counts
+        healthy = sum(1 for s in services if s.status == CheckStatus.HEALTHY)
+        unhealthy = sum(1 for s in services if s.status == CheckStatus.UNHEALTHY)
+        degraded = sum(1 for s in services if s.status == CheckStatus.DEGRADED)
+        unknown = sum(1 for s in services if s.status == CheckStatus.UNKNOWN)
+
+        # Find critical services that are down
+        critical_down = [
+            s.service for s in services
+            if s.status == CheckStatus.UNHEALTHY and s.critical
+        ]
+
+        # Determine overall status
+        if critical_down:
+            overall_status = CheckStatus.UNHEALTHY
+        elif unhealthy > 0 or degraded > 0:
+            overall_status = CheckStatus.DEGRADED
+        elif unknown > 0:
+            overall_status = CheckStatus.UNKNOWN
+        else:
+            overall_status = CheckStatus.HEALTHY
+
+        # Group by node
+        nodes: Dict[str, Dict[str, int]] = {}
+        for svc in services:
+            if svc.node not in nodes:
+                nodes[svc.node] = {"healthy": 0, "unhealthy": 0, "total": 0}
+            nodes[svc.node]["total"] += 1
+            if svc.status == CheckStatus.HEALTHY:
+                nodes[svc.node]["healthy"] += 1
+            else:
+                nodes[svc.node]["unhealthy"] += 1
+
+        # Group by category
+        categories: Dict[str, Dict[str, int]] = {}
+        for svc in services:
+            if svc.category not in categories:
+                categories[svc.category] = {"healthy": 0, "unhealthy": 0, "total": 0}
+            categories[svc.category]["total"] += 1
+            if svc.status == CheckStatus.HEALTHY:
+                categories[svc.category]["healthy"] += 1
+            else:
+                categories[svc.category]["unhealthy"] += 1
+
+        self._cache = ClusterHealth(
+            summary=HealthSummary(
+                status=overall_status,
+                healthy=healthy,
+                unhealthy=unhealthy,
+                degraded=degraded,
+                unknown=unknown,
+                total=len(services),
+                critical_down=critical_down,
+                timestamp=now,
+                oldest_check=min((s.timestamp for s in services), default=None),
+            ),
+            services=services,
+            nodes=nodes,
+            categories=categories,
+        )
+        self._by_name = {s.service.lower(): s for s in services}
+        # Pre-serialized views: read endpoints return these bytes directly
+        self._views = {
+            "health": self._cache.model_dump_json().encode(),
+            "summary": self._cache.summary.model_dump_json().encode(),
+            "nodes": json.dumps(nodes).encode(),
+            "categories": json.dumps(categories).encode(),
+        }
+        self._cache_time = now
+
+    async def _run_checks(self) -> None:
+        results = await check_all_services(self.services)
+        self._results.update({r.service: self._to_service_health(r) for r in results})
+        self._rebuild()
+
+    async def _refresh(self) -> None:
+        """Refresh every service once; concurrent callers share the refresh."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._run_checks())
+        await asyncio.shield(self._refresh_task)
+
+    def _is_stale(self) -> bool:
+        return (
+            self._cache_time is None
+            or (datetime.utcnow() - self._cache_time).total_seconds() >= self.cache_ttl
+        )
 
     async def get_health(self, force_refresh: bool = False) -> ClusterHealth:
-        """Get cluster health, using cache if available."""
-        async with self._lock:
-            now = datetime.utcnow()
-
-            # Check cache validity
-            if (
-                not force_refresh
-                and self._cache is not None
-                and self._cache_time is not None
-                and (now - self._cache_time).total_seconds() < self.cache_ttl
-            ):
-                return self._cache
-
-            # Perform health checks
-            results = await check_all_services()
-
-            # Build service health list
-            service_map = {s.name: s for s in SERVICES}
-            services = []
-            for result in results:
-                svc_def = service_map.get(result.service)
-                services.append(ServiceHealth(
-                    service=result.service,
-                    status=result.status,
-                    latency_ms=result.latency_ms,
-                    message=result.message,
-                    node=svc_def.node if svc_def else "unknown",
-                    category=svc_def.category if svc_def else "unknown",
-                    critical=svc_def.critical if svc_def else False,
-                    timestamp=result.timestamp,
-                ))
-
-            # Calculate counts
-            healthy = sum(1 for r in results if r.status == CheckStatus.HEALTHY)
-            unhealthy = sum(1 for r in results if r.status == CheckStatus.UNHEALTHY)
-            degraded = sum(1 for r in results if r.status == CheckStatus.DEGRADED)
-            unknown = sum(1 for r in results if r.status == CheckStatus.UNKNOWN)
-
-            # Find critical services that are down
-            critical_down = [
-                r.service for r in results
-                if r.status == CheckStatus.UNHEALTHY
-                and service_map.get(r.service, ServiceCheck("", "", "", critical=False)).critical
-            ]
-
-            # Determine overall status
-            if critical_down:
-                overall_status = CheckStatus.UNHEALTHY
-            elif unhealthy > 0 or degraded > 0:
-                overall_status = CheckStatus.DEGRADED
-            elif unknown > 0:
-                overall_status = CheckStatus.UNKNOWN
-            else:
-                overall_status = CheckStatus.HEALTHY
-
-            # Group by node
-            nodes: Dict[str, Dict[str, int]] = {}
-            for svc in services:
-                if svc.node not in nodes:
-                    nodes[svc.node] = {"healthy": 0, "unhealthy": 0, "total": 0}
-                nodes[svc.node]["total"] += 1
-                if svc.status == CheckStatus.HEALTHY:
-                    nodes[svc.node]["healthy"] += 1
-                else:
-                    nodes[svc.node]["unhealthy"] += 1
-
-            # Group by category
-            categories: Dict[str, Dict[str, int]] = {}
-            for svc in services:
-                if svc.category not in categories:
-                    categories[svc.category] = {"healthy": 0, "unhealthy": 0, "total": 0}
-                categories[svc.category]["total"] += 1
-                if svc.status == CheckStatus.HEALTHY:
-                    categories[svc.category]["healthy"] += 1
-                else:
-                    categories[svc.category]["unhealthy"] += 1
-
-            # Build response
-            health = ClusterHealth(
-                summary=HealthSummary(
-                    status=overall_status,
-                    healthy=healthy,
-                    unhealthy=unhealthy,
-                    degraded=degraded,
-                    unknown=unknown,
-                    total=len(results),
-                    critical_down=critical_down,
-                    timestamp=now,
-                ),
-                services=services,
-                nodes=nodes,
-                categories=categories,
+        """Get cluster health from memory, refreshing only when required."""
+        if self.prober is not None and self.prober.running:
+            if force_refresh or self._cache is None:
+                await self.prober.refresh_all()
+            return self._cache
+
+        if force_refresh or self._cache is None:
+            await self._refresh()
+        elif self._is_stale() and (self._refresh_task is None or self._refresh_task.done()):
+            # Stale-while-revalidate: serve the current view, refresh behind it
+            self._refresh_task = asyncio.create_task(self._run_checks())
+        return self._cache
+
+    async def get_view(self, view: str, force_refresh: bool = False) -> bytes:
+        """Get a pre-serialized JSON view ("health", "summary", "nodes", "categories")."""
+        await self.get_health(force_refresh=force_refresh)
+        return self._views[view]
+
+    async def get_service(self, name: str, force_refresh: bool = False) -> Optional[ServiceHealth]:
+        """Get one service's health by case-insensitive name."""
+        if force_refresh and self.prober is not None and self.prober.running:
+            svc_def = next((s for s in self.services if s.name.lower() == name.lower()), None)
+            if svc_def is not None:
+                await self.prober.refresh(svc_def.name)
+        else:
+            await self.get_health(force_refresh=force_refresh)
+        return self._by_name.get(name.lower())
+
+    async def start_background(self) -> None:
+        """Start continuous background probing."""
+        if self.prober is None:
+            self.prober = HealthProber(
+                services=self.services,
+                policy=self.policy,
+                on_result=self.record_result,
             )
+        if self._cache is None:
+            self._rebuild()
+        await self.prober.start()
 
-            # Update cache
-            self._cache = health
-            self._cache_time = now
+    async def stop_background(self) -> None:
+        if self.prober is not None:
+            await self.prober.stop()
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+    def get_probe_stats(self) -> List[Dict]:
+        return self.prober.get_probe_stats() if self.prober is not None else []
+
+
+# Global aggregator
+aggregator = HealthAggregator(cache_ttl=30)
 
-            return health
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background prober for the lifetime of the server."""
+    if BACKGROUND_PROBING:
+        await aggregator.start_background()
+    yield
+    await aggregator.stop_background()
 
 
 # Create FastAPI app
@@ -172,6 +288,7 @@ app = FastAPI(
     title="Hydra Health Aggregator",
     description="Unified health monitoring API for Hydra cluster",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -183,8 +300,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global aggregator
-aggregator = HealthAggregator(cache_ttl=30)
+def json_view(content: bytes) -> Response:
+    """Return a pre-serialized view without re-validating it."""
+    return Response(content=content, media_type="application/json")
 
 
 @app.get("/")
@@ -198,7 +316,7 @@ async def get_cluster_health(
     refresh: bool = Query(False, description="Force refresh cache"),
 ):
     """Get complete cluster health status."""
-    return await aggregator.get_health(force_refresh=refresh)
+    return json_view(await aggregator.get_view("health", force_refresh=refresh))
 
 
 @app.get("/health/summary", response_model=HealthSummary)
@@ -206,8 +324,7 @@ async def get_health_summary(
     refresh: bool = Query(False, description="Force refresh cache"),
 ):
     """Get health summary only."""
-    health = await aggregator.get_health(force_refresh=refresh)
-    return health.summary
+    return json_view(await aggregator.get_view("summary", force_refresh=refresh))
 
 
 @app.get("/health/services", response_model=List[ServiceHealth])
@@ -237,11 +354,9 @@ async def get_service_health(
     refresh: bool = Query(False, description="Force refresh cache"),
 ):
     """Get health for a specific service."""
-    health = await aggregator.get_health(force_refresh=refresh)
-
-    for svc in health.services:
-        if svc.service.lower() == name.lower():
-            return svc
+    svc = await aggregator.get_service(name, force_refresh=refresh)
+    if svc is not None:
+        return svc
 
     raise HTTPException(status_code=404, detail=f"Service not found: {name}")
 
@@ -251,8 +366,7 @@ async def get_nodes_health(
     refresh: bool = Query(False, description="Force refresh cache"),
 ):
     """Get health grouped by node."""
-    health = await aggregator.get_health(force_refresh=refresh)
-    return health.nodes
+    return json_view(await aggregator.get_view("nodes", force_refresh=refresh))
 
 
 @app.get("/health/categories", response_model=Dict[str, Dict[str, int]])
@@ -260,8 +374,13 @@ async def get_categories_health(
     refresh: bool = Query(False, description="Force refresh cache"),
 ):
     """Get health grouped by category."""
-    health = await aggregator.get_health(force_refresh=refresh)
-    return health.categories
+    return json_view(await aggregator.get_view("categories", force_refresh=refresh))
+
+
+@app.get("/health/probes")
+async def get_probe_stats() -> List[Dict[str, Any]]:
+    """Per-service probe cadence, freshness and flap counts."""
+    return aggregator.get_probe_stats()
 
 
 @app.get("/ready")
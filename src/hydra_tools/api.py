@@ -23,6 +23,7 @@ from datetime import datetime
 import os
 import secrets
 import hashlib
+import sys
 import time
 from typing import Optional
 
@@ -30,7 +31,7 @@ from fastapi import FastAPI, Request, HTTPException, Security, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader, APIKeyQuery
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import QueryParams
 
 # Prometheus metrics
 from hydra_tools.auth_metrics import (
@@ -40,6 +41,7 @@ from hydra_tools.auth_metrics import (
     record_http_request,
     metrics_endpoint,
     HTTP_REQUESTS_IN_PROGRESS,
+    _get_path_prefix,
     start_inference_metrics_updater,
 )
 
@@ -57,101 +59,126 @@ from hydra_tools.logging_config import (
 _use_json = os.environ.get("HYDRA_LOG_JSON", "true").lower() == "true"
 setup_logging(json_format=_use_json)
 
-# Import router creators
-from hydra_tools.self_diagnosis import create_diagnosis_router
-from hydra_tools.resource_optimization import create_optimization_router
-from hydra_tools.knowledge_optimization import create_knowledge_router
-from hydra_tools.capability_expansion import create_capability_api as create_capabilities_router
-from hydra_tools.activity import create_activity_router, create_control_router
-from hydra_tools.hardware_discovery import create_hardware_router
-from hydra_tools.scheduler import create_scheduler_router, get_scheduler
-from hydra_tools.letta_bridge import create_letta_bridge_router
-from hydra_tools.search_api import create_search_router, create_ingest_router, create_research_router
-from hydra_tools.crews_api import create_crews_router
-from hydra_tools.story_crew import create_story_crew_router
-from hydra_tools.alerts_api import create_alerts_router
-from hydra_tools.health_api import create_health_router
-from hydra_tools.voice_api import create_voice_router
-from hydra_tools.reconcile_api import create_reconcile_router
-from hydra_tools.constitution import create_constitution_router, get_enforcer
-from hydra_tools.self_improvement import create_self_improvement_router
-from hydra_tools.sandbox import create_sandbox_router
-from hydra_tools.memory_architecture import create_memory_router
-from hydra_tools.predictive_maintenance import create_predictive_router
-from hydra_tools.preference_collector import create_preference_collector_router
-from hydra_tools.container_health import create_container_health_router
-from hydra_tools.benchmark_suite import create_benchmark_router
-from hydra_tools.presence_automation import create_presence_router
-from hydra_tools.calendar_intelligence import create_calendar_router
-from hydra_tools.discord_bot import create_discord_router
-from hydra_tools.agent_scheduler import create_scheduler_router as create_agent_scheduler_router, get_scheduler as get_agent_scheduler
-from hydra_tools.wake_word import create_wake_word_router
-from hydra_tools.discovery_archive import create_discovery_router
-from hydra_tools.character_consistency import create_character_router
-from hydra_tools.game_library import create_game_library_router
-from hydra_tools.agent_orchestrator import create_agent_orchestrator_router
-from hydra_tools.comfyui_client import create_comfyui_router
-from hydra_tools.scene_backgrounds import create_scene_backgrounds_router
-from hydra_tools.model_hotswap import create_model_hotswap_router
-from hydra_tools.human_feedback import create_human_feedback_router
-from hydra_tools.daily_digest import create_daily_digest_router
-from hydra_tools.dashboard_api import create_dashboard_router, get_dashboard_state
-from hydra_tools.home_automation import (
-    create_home_automation_router,
-    get_entity_tracker,
-    start_entity_tracker,
-    stop_entity_tracker,
+# Feature routers are declared here and imported on first use (see
+# router_registry.py). Names are what HYDRA_ROUTERS_ENABLED / _DISABLED /
+# _PRELOAD refer to.
+from hydra_tools.router_registry import (
+    LazyRouterMiddleware,
+    LazyRouterRegistry,
+    ProfileEntry,
+    RouterSpec,
+    StartupProfile,
 )
-from hydra_tools.presence_automation import get_trigger_engine
-from hydra_tools.logs_api import create_logs_router
-from hydra_tools.autonomous_controller import create_autonomous_router, get_controller
-from hydra_tools.autonomous_queue import router as autonomous_queue_router, scheduler as work_queue_scheduler
-from hydra_tools.cognitive_core import create_cognitive_router, get_cognitive_core
-from hydra_tools.hybrid_memory import create_hybrid_memory_router, get_hybrid_memory
-from hydra_tools.routers.unraid import router as unraid_router
-from hydra_tools.routers.events import router as events_router
-from hydra_tools.routers.services import create_services_router
-from hydra_tools.clients.unraid_client import close_unraid_client
-from hydra_tools.asset_quality import create_quality_router
-from hydra_tools.semantic_cache import create_semantic_cache_router
-from hydra_tools.face_detection import create_face_detection_router
-from hydra_tools.graphiti_memory import create_graphiti_router
-from hydra_tools.reranker import create_reranker_router
-from hydra_tools.conversation_cache import create_conversation_cache_router
-from hydra_tools.agentic_rag import create_agentic_rag_router
-from hydra_tools.vision import create_vision_router
-from hydra_tools.research_queue import create_research_queue_router, get_research_queue
-from hydra_tools.unified_ingest import create_ingest_router, get_ingest_pipeline
-from hydra_tools.mcp_registry import create_mcp_registry_router
-from hydra_tools.skill_learning import create_skill_learning_router
-from hydra_tools.speculative_decoding import create_speculative_router
-from hydra_tools.routellm import create_routing_router
-from hydra_tools.openhands_integration import create_openhands_router
-from hydra_tools.multi_agent_memory import create_multi_agent_memory_router
-from hydra_tools.autonomous_research import create_autonomous_research_router
-from hydra_tools.feedback_integration_loop import create_feedback_loop_router
-from hydra_tools.test_automation import create_test_automation_router
-from hydra_tools.disaster_recovery import create_disaster_recovery_router
-from hydra_tools.dgm_engine import create_dgm_router, get_dgm_engine
-from hydra_tools.comprehensive_benchmark import create_comprehensive_benchmark_router, get_benchmark_engine
-from hydra_tools.google_calendar import create_google_calendar_router
-from hydra_tools.gmail_integration import create_gmail_router
-from hydra_tools.morning_briefing import create_morning_briefing_router
-from hydra_tools.news_integration import create_news_router
-from hydra_tools.news_intelligence import create_news_intelligence_router
-from hydra_tools.financial_awareness import create_financial_router
-from hydra_tools.user_data import create_user_data_router
-from hydra_tools.intelligent_model_selector import create_model_intelligence_router, get_model_selector
-from hydra_tools.model_task_queue import create_task_queue_router, get_task_queue
-from hydra_tools.aider_agent import create_aider_router
-from hydra_tools.cost_tracking import create_cost_tracking_router
-from hydra_tools.unified_search import create_unified_search_router
-from hydra_tools.character_generation_agent import create_character_generation_router
-from hydra_tools.a2a_protocol import create_a2a_router
-
-# Import core classes for direct endpoints
-from hydra_tools.routellm import RouteClassifier, ModelTier
-from hydra_tools.preference_learning import PreferenceLearner, FeedbackType, TaskType
+from hydra_tools.prometheus_query import close_prometheus_client, get_prometheus_stats
+from hydra_tools.service_bus import close_service_bus, get_service_bus, provides
+
+ROUTERS = [
+    # Phase 11 self-improvement
+    RouterSpec("diagnosis", "self_diagnosis", "create_diagnosis_router", ("/diagnosis",)),
+    RouterSpec("optimization", "resource_optimization", "create_optimization_router", ("/optimization",)),
+    RouterSpec("knowledge", "knowledge_optimization", "create_knowledge_router", ("/knowledge",)),
+    RouterSpec("capabilities", "capability_expansion", "create_capability_api", ("/capabilities",)),
+    # Transparency Framework
+    RouterSpec("activity", "activity", "create_activity_router", ("/activity",)),
+    RouterSpec("control", "activity", "create_control_router", ("/control",)),
+    RouterSpec("hardware", "hardware_discovery", "create_hardware_router", ("/hardware",)),
+    RouterSpec("scheduler", "scheduler", "create_scheduler_router", ("/scheduler",)),
+    RouterSpec("letta-bridge", "letta_bridge", "create_letta_bridge_router", ("/letta-bridge",)),
+    # Search, ingest and research
+    RouterSpec("search", "search_api", "create_search_router", ("/search",)),
+    RouterSpec("ingest", "unified_ingest", "create_ingest_router", ("/ingest",)),
+    RouterSpec("research", "search_api", "create_research_router", ("/research",)),
+    RouterSpec("crews", "crews_api", "create_crews_router", ("/crews",)),
+    RouterSpec("story", "story_crew", "create_story_crew_router", ("/story",)),
+    RouterSpec("alerts", "alerts_api", "create_alerts_router", ("/alerts",)),
+    RouterSpec("cluster-health", "health_api", "create_health_router", ("/health",)),
+    RouterSpec("voice", "voice_api", "create_voice_router", ("/voice",)),
+    RouterSpec("reconcile", "reconcile_api", "create_reconcile_router", ("/reconcile",)),
+    RouterSpec("constitution", "constitution", "create_constitution_router", ("/constitution",)),
+    RouterSpec("self-improvement", "self_improvement", "create_self_improvement_router", ("/self-improvement",)),
+    RouterSpec("sandbox", "sandbox", "create_sandbox_router", ("/sandbox",)),
+    RouterSpec("memory", "memory_architecture", "create_memory_router", ("/memory",)),
+    RouterSpec("predictive", "predictive_maintenance", "create_predictive_router", ("/predictive",)),
+    RouterSpec("preference-collector", "preference_collector", "create_preference_collector_router",
+               ("/preference-collector",)),
+    RouterSpec("container-health", "container_health", "create_container_health_router", ("/container-health",),
+               startup="init_audit_db"),
+    RouterSpec("benchmark", "benchmark_suite", "create_benchmark_router", ("/benchmark",),
+               startup="init_benchmark_db"),
+    RouterSpec("presence", "presence_automation", "create_presence_router", ("/presence",)),
+    RouterSpec("calendar", "calendar_intelligence", "create_calendar_router", ("/calendar",)),
+    RouterSpec("discord", "discord_bot", "create_discord_router", ("/discord",)),
+    RouterSpec("agent-scheduler", "agent_scheduler", "create_scheduler_router", ("/agent-scheduler",)),
+    RouterSpec("wake-word", "wake_word", "create_wake_word_router", ("/voice/wake",)),
+    RouterSpec("discoveries", "discovery_archive", "create_discovery_router", ("/discoveries",)),
+    # Phase 12 creative pipeline
+    RouterSpec("characters", "character_consistency", "create_character_router", ("/characters",)),
+    RouterSpec("games", "game_library", "create_game_library_router", ("/games",)),
+    RouterSpec("comfyui", "comfyui_client", "create_comfyui_router", ("/comfyui",)),
+    RouterSpec("scenes", "scene_backgrounds", "create_scene_backgrounds_router", ("/scenes",)),
+    RouterSpec("models", "model_hotswap", "create_model_hotswap_router", ("/models",)),
+    RouterSpec("feedback", "human_feedback", "create_human_feedback_router", ("/feedback",), startup="init_db"),
+    RouterSpec("digest", "daily_digest", "create_daily_digest_router", ("/digest",)),
+    # Command Center backend
+    RouterSpec("dashboard", "dashboard_api", "create_dashboard_router", ("/dashboard",)),
+    RouterSpec("home", "home_automation", "create_home_automation_router", ("/home",)),
+    RouterSpec("logs", "logs_api", "create_logs_router", ("/logs",)),
+    RouterSpec("autonomous", "autonomous_controller", "create_autonomous_router", ("/autonomous",)),
+    RouterSpec("autonomous-queue", "autonomous_queue", "router", ("/autonomous",), startup="init_db"),
+    RouterSpec("agents", "agent_orchestrator", "create_agent_orchestrator_router", ("/agents",)),
+    RouterSpec("cognitive", "cognitive_core", "create_cognitive_router", ("/cognitive",)),
+    RouterSpec("hybrid-memory", "hybrid_memory", "create_hybrid_memory_router", ("/hybrid-memory",)),
+    # Unified Control Plane
+    RouterSpec("unraid", "routers.unraid", "router", ("/api/v1/unraid",)),
+    RouterSpec("events", "routers.events", "router", ("/api/v1/events",)),
+    RouterSpec("quality", "asset_quality", "create_quality_router", ("/quality",)),
+    RouterSpec("services", "routers.services", "create_services_router", ("/services",)),
+    # Retrieval, caching and multi-modal
+    RouterSpec("cache", "semantic_cache", "create_semantic_cache_router", ("/cache",)),
+    RouterSpec("faces", "face_detection", "create_face_detection_router", ("/faces",)),
+    RouterSpec("graphiti", "graphiti_memory", "create_graphiti_router", ("/graphiti",)),
+    RouterSpec("rerank", "reranker", "create_reranker_router", ("/rerank",)),
+    RouterSpec("conversation-cache", "conversation_cache", "create_conversation_cache_router",
+               ("/conversation-cache",)),
+    RouterSpec("agentic-rag", "agentic_rag", "create_agentic_rag_router", ("/agentic-rag",)),
+    RouterSpec("vision", "vision", "create_vision_router", ("/vision",)),
+    RouterSpec("research-queue", "research_queue", "create_research_queue_router", ("/research",)),
+    RouterSpec("mcp-registry", "mcp_registry", "create_mcp_registry_router", ("/mcp-registry",), startup="init_db"),
+    RouterSpec("skills", "skill_learning", "create_skill_learning_router", ("/skills",)),
+    RouterSpec("speculative", "speculative_decoding", "create_speculative_router", ("/speculative",)),
+    RouterSpec("routing", "routellm", "create_routing_router", ("/routing",)),
+    # Phase 13 autonomy
+    RouterSpec("openhands", "openhands_integration", "create_openhands_router", ("/openhands",)),
+    RouterSpec("multi-memory", "multi_agent_memory", "create_multi_agent_memory_router", ("/multi-memory",)),
+    RouterSpec("autonomous-research", "autonomous_research", "create_autonomous_research_router",
+               ("/autonomous-research",)),
+    RouterSpec("feedback-loop", "feedback_integration_loop", "create_feedback_loop_router", ("/feedback-loop",)),
+    RouterSpec("tests", "test_automation", "create_test_automation_router", ("/tests",)),
+    RouterSpec("disaster-recovery", "disaster_recovery", "create_disaster_recovery_router", ("/disaster-recovery",)),
+    RouterSpec("dgm", "dgm_engine", "create_dgm_router", ("/dgm",)),
+    RouterSpec("comprehensive-benchmark", "comprehensive_benchmark", "create_comprehensive_benchmark_router",
+               ("/benchmarks/comprehensive",)),
+    # Phase 14 external intelligence and user data
+    RouterSpec("google", "google_calendar", "create_google_calendar_router", ("/google",)),
+    RouterSpec("gmail", "gmail_integration", "create_gmail_router", ("/gmail",)),
+    RouterSpec("briefing", "morning_briefing", "create_morning_briefing_router", ("/briefing",)),
+    RouterSpec("news", "news_integration", "create_news_router", ("/news",)),
+    RouterSpec("news-intelligence", "news_intelligence", "create_news_intelligence_router", ("/news/intelligence",)),
+    RouterSpec("financial", "financial_awareness", "create_financial_router", ("/financial",)),
+    RouterSpec("user-data", "user_data", "create_user_data_router", ("/user-data", "/credentials")),
+    RouterSpec("model-intelligence", "intelligent_model_selector", "create_model_intelligence_router",
+               ("/model-intelligence",)),
+    RouterSpec("task-queue", "model_task_queue", "create_task_queue_router", ("/task-queue",)),
+    RouterSpec("aider", "aider_agent", "create_aider_router", ("/aider",)),
+    RouterSpec("costs", "cost_tracking", "create_cost_tracking_router", ("/costs",)),
+    RouterSpec("unified-search", "unified_search", "create_unified_search_router", ("/search",)),
+    RouterSpec("character-gen", "character_generation_agent", "create_character_generation_router",
+               ("/character-gen",)),
+    RouterSpec("a2a", "a2a_protocol", "create_a2a_router", ("/.well-known", "/a2a")),
+]
+
+startup_profile = StartupProfile()
+router_registry = LazyRouterRegistry(ROUTERS, profile=startup_profile)
 
 
 # =============================================================================
@@ -229,107 +256,170 @@ def get_api_keys() -> set:
     return keys
 
 
+_key_digest_cache: tuple = (None, frozenset())
+
+
+def _hash_key(key: str) -> bytes:
+    return hashlib.sha256(key.encode()).digest()
+
+
+def get_api_key_digests() -> frozenset:
+    """SHA-256 digests of the valid API keys, recomputed only when the environment changes."""
+    global _key_digest_cache
+    env = (os.environ.get("HYDRA_API_KEY", ""), os.environ.get("HYDRA_API_KEYS", ""))
+    if _key_digest_cache[0] != env:
+        _key_digest_cache = (env, frozenset(_hash_key(key) for key in get_api_keys()))
+    return _key_digest_cache[1]
+
+
+def is_valid_api_key(api_key: str) -> bool:
+    """
+    Check a presented key against the configured keys.
+
+    Only the SHA-256 digest of the presented key is looked up, so lookup time
+    does not depend on how much of a real key the caller has guessed.
+    """
+    return _hash_key(api_key) in get_api_key_digests()
+
+
 def is_auth_enabled() -> bool:
     """Check if authentication is enabled."""
     # Auth is enabled if any API keys are configured
-    return bool(get_api_keys())
+    return bool(get_api_key_digests())
 
 
-class APIKeyAuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to validate API key authentication."""
+def _get_header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
-    async def dispatch(self, request: Request, call_next):
-        auth_start = time.perf_counter()
-        path = request.url.path
 
-        # Skip auth if not enabled
-        if not is_auth_enabled():
-            record_auth_result("disabled", path)
-            record_auth_latency(time.perf_counter() - auth_start)
-            return await call_next(request)
+class APIKeyAuthMiddleware:
+    """ASGI middleware to validate API key authentication."""
 
-        # Check if path is exempt
-        if path in EXEMPT_PATHS:
-            record_auth_result("exempt", path)
-            record_auth_latency(time.perf_counter() - auth_start)
-            return await call_next(request)
-
-        # Check if path starts with exempt prefix
-        for prefix in EXEMPT_PREFIXES:
-            if path.startswith(prefix):
-                record_auth_result("exempt", path)
-                record_auth_latency(time.perf_counter() - auth_start)
-                return await call_next(request)
+    def __init__(self, app):
+        self.app = app
 
-        # Get API key from header or query parameter
-        api_key = request.headers.get("X-API-Key") or request.query_params.get("api_key")
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        if not api_key:
-            record_auth_result("missing_key", path)
-            record_auth_latency(time.perf_counter() - auth_start)
-            return JSONResponse(
+        auth_start = time.perf_counter()
+        path = scope["path"]
+        result = self._check(scope, path)
+        record_auth_result(result, path)
+        record_auth_latency(time.perf_counter() - auth_start)
+
+        if result == "missing_key":
+            response = JSONResponse(
                 status_code=401,
                 content={
                     "error": "Missing API key",
                     "detail": "Provide API key via X-API-Key header or api_key query parameter",
                 },
             )
-
-        # Validate API key
-        valid_keys = get_api_keys()
-        if api_key not in valid_keys:
-            record_auth_result("invalid_key", path)
-            record_auth_latency(time.perf_counter() - auth_start)
-            return JSONResponse(
+        elif result == "invalid_key":
+            response = JSONResponse(
                 status_code=403,
                 content={
                     "error": "Invalid API key",
                     "detail": "The provided API key is not valid",
                 },
             )
+        else:
+            await self.app(scope, receive, send)
+            return
+        await response(scope, receive, send)
 
-        # Key is valid, proceed
-        record_auth_result("success", path)
-        record_auth_latency(time.perf_counter() - auth_start)
-        return await call_next(request)
+    @staticmethod
+    def _check(scope, path: str) -> str:
+        # Skip auth if not enabled
+        if not is_auth_enabled():
+            return "disabled"
+
+        # Check if path is exempt
+        if path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+            return "exempt"
+
+        # Get API key from header or query parameter
+        api_key = _get_header(scope, b"x-api-key")
+        if not api_key and scope.get("query_string"):
+            api_key = QueryParams(scope["query_string"]).get("api_key")
+
+        if not api_key:
+            return "missing_key"
+        if not is_valid_api_key(api_key):
+            return "invalid_key"
+        return "success"
+
+
+def _endpoint_label(scope) -> str:
+    """Metric label for a request: the matched route template, e.g. /characters/{character_id}."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or route.path
+    if "endpoint" in scope:
+        # Routed, but the framework does not expose the matched route
+        return _get_path_prefix(scope["path"])
+    # No route matched; one label keeps 404 scans from creating series
+    return "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware to track request metrics (latency, count, status codes).
+
+    Latency runs to the last body message, so streaming responses (SSE,
+    ingest progress) are timed to their final byte rather than their headers.
+    """
 
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_logger("hydra_tools.api")
 
-class RequestMetricsMiddleware(BaseHTTPMiddleware):
-    """Middleware to track request metrics (latency, count, status codes)."""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
-        method = request.method
-        path = request.url.path
+        method = scope["method"]
+        path = scope["path"]
 
         # Generate and set request ID for tracing
         request_id = generate_request_id()
         set_request_id(request_id)
+        request_id_header = (b"x-request-id", request_id.encode())
+
+        status_code = 500
+        finished_at = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, finished_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished_at = time.perf_counter()
 
         # Track in-progress requests
         HTTP_REQUESTS_IN_PROGRESS.labels(method=method).inc()
         request_start = time.perf_counter()
 
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-        except Exception as e:
-            status_code = 500
-            raise
+            await self.app(scope, receive, send_wrapper)
         finally:
-            # Record metrics
-            duration = time.perf_counter() - request_start
-            duration_ms = duration * 1000
-            record_http_request(method, path, status_code, duration)
+            # Record metrics; a disconnected stream is timed to when it stopped
+            duration = (finished_at or time.perf_counter()) - request_start
+            record_http_request(method, _endpoint_label(scope), status_code, duration)
             HTTP_REQUESTS_IN_PROGRESS.labels(method=method).dec()
 
             # Log request (skip noisy endpoints)
             if path not in ("/health", "/metrics"):
-                logger = get_logger("hydra_tools.api")
-                log_request(logger, method, path, status_code, duration_ms)
-
-        return response
+                log_request(self.logger, method, path, status_code, duration * 1000)
 
 
 # =============================================================================
@@ -409,11 +499,45 @@ async def lifespan(app: FastAPI):
         "data_dir": os.environ.get('HYDRA_DATA_DIR', '/mnt/user/appdata/hydra-stack/data'),
     })
 
+    startup_started = time.perf_counter()
+
+    # Modules in this process query each other through the service bus
+    # instead of HTTP requests back to this API
+    get_service_bus().attach(router_registry)
+
+    # Load saved API keys into the environment before anything reads them
+    with startup_profile.measure("user_data"):
+        from hydra_tools.user_data import load_saved_credentials
+        load_saved_credentials()
+
     # Initialize auth status metrics
     auth_keys = get_api_keys()
     update_auth_status(bool(auth_keys), len(auth_keys))
     print(f"  Auth enabled: {bool(auth_keys)}, Keys configured: {len(auth_keys)}")
 
+    # Modules with background services are imported here rather than at
+    # module load, so their cost shows up in the startup profile
+    with startup_profile.measure("routellm"):
+        from hydra_tools.routellm import RouteClassifier
+    with startup_profile.measure("preference_learning"):
+        from hydra_tools.preference_learning import PreferenceLearner
+    with startup_profile.measure("scheduler"):
+        from hydra_tools.scheduler import get_scheduler
+    with startup_profile.measure("agent_scheduler"):
+        from hydra_tools.agent_scheduler import get_scheduler as get_agent_scheduler
+    with startup_profile.measure("autonomous_controller"):
+        from hydra_tools.autonomous_controller import get_controller
+    with startup_profile.measure("autonomous_queue"):
+        from hydra_tools.autonomous_queue import init_db as init_work_queue_db, scheduler as work_queue_scheduler
+        init_work_queue_db()
+    with startup_profile.measure("container_health"):
+        from hydra_tools.container_health import _monitor, init_audit_db
+        init_audit_db()
+    with startup_profile.measure("home_automation"):
+        from hydra_tools.home_automation import get_entity_tracker, start_entity_tracker, stop_entity_tracker
+        from hydra_tools.presence_automation import get_trigger_engine
+    from hydra_tools.clients.unraid_client import close_unraid_client
+
     # Initialize shared instances
     app.state.route_classifier = RouteClassifier()
     app.state.preference_learner = PreferenceLearner(user_id="hydra-default")
@@ -435,11 +559,11 @@ async def lifespan(app: FastAPI):
     print(f"[{datetime.utcnow().isoformat()}] Inference metrics updater started")
 
     # Register agent handlers
-    from hydra_tools.character_consistency import CharacterManager
-
     async def character_generation_handler(task):
         """Handle character generation agent tasks."""
         import httpx
+        from hydra_tools.character_consistency import CharacterManager
+
         manager = CharacterManager()
         action = task.payload.get("action", "generate_portrait")
         results = []
@@ -484,7 +608,6 @@ async def lifespan(app: FastAPI):
 
     # Start background container health checker
     import asyncio
-    from hydra_tools.container_health import _monitor
 
     async def container_health_background_task():
         """Background task to periodically check container health."""
@@ -527,6 +650,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"[{datetime.utcnow().isoformat()}] HA integration setup failed: {e}")
 
+    # Routers listed in HYDRA_ROUTERS_PRELOAD load now instead of on first request
+    await router_registry.preload()
+    startup_profile.record(ProfileEntry(
+        name="lifespan_startup",
+        kind="phase",
+        trigger="startup",
+        duration_ms=(time.perf_counter() - startup_started) * 1000,
+        rss_delta_mb=None,
+        modules_imported=0,
+    ))
+    print(f"[{datetime.utcnow().isoformat()}] Startup complete, routers loaded: "
+          f"{len(router_registry.status()['loaded'])}/{len(ROUTERS)}")
+
     yield
 
     # Shutdown
@@ -542,6 +678,22 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
     await close_unraid_client()
+    # Only if a request loaded the sandbox router; removes warm sandbox containers
+    if "hydra_tools.sandbox" in sys.modules:
+        await sys.modules["hydra_tools.sandbox"].close_sandbox_manager()
+    # Writes usage records still buffered for the next batch
+    if "hydra_tools.cost_tracking" in sys.modules:
+        await sys.modules["hydra_tools.cost_tracking"].close_cost_tracker()
+    if "hydra_tools.semantic_router" in sys.modules:
+        await sys.modules["hydra_tools.semantic_router"].close_semantic_router()
+    # Trend counts since the last periodic snapshot
+    if "hydra_tools.news_intelligence" in sys.modules:
+        sys.modules["hydra_tools.news_intelligence"].close_intelligence_engine()
+    # Forecast refresh loop reads through the shared Prometheus client
+    if "hydra_tools.predictive_maintenance" in sys.modules:
+        await sys.modules["hydra_tools.predictive_maintenance"].close_predictive_engine()
+    await close_prometheus_client()
+    await close_service_bus()
     print(f"[{datetime.utcnow().isoformat()}] All schedulers, autonomous systems, and clients stopped")
 
 
@@ -555,6 +707,11 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Feature routers mount lazily. Added first so it runs innermost, after auth
+# has rejected unauthenticated requests.
+router_registry.mount(app)
+app.add_middleware(LazyRouterMiddleware, registry=router_registry, openapi_url=app.openapi_url)
+
 # CORS middleware for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -581,243 +738,6 @@ app.add_middleware(APIKeyAuthMiddleware)
 app.add_middleware(RequestMetricsMiddleware)
 
 
-# Include Phase 11 routers
-app.include_router(create_diagnosis_router())
-app.include_router(create_optimization_router())
-app.include_router(create_knowledge_router())
-app.include_router(create_capabilities_router())
-
-# Include Transparency Framework routers
-app.include_router(create_activity_router())
-app.include_router(create_control_router())
-
-# Include Hardware Discovery router
-app.include_router(create_hardware_router())
-
-# Include Scheduler router
-app.include_router(create_scheduler_router())
-
-# Include Letta-OpenAI Bridge router
-app.include_router(create_letta_bridge_router())
-
-# Include Search, Ingest, and Research routers
-app.include_router(create_search_router())
-app.include_router(create_ingest_router())
-app.include_router(create_research_router())
-
-# Include Crews API router (CrewAI multi-agent orchestration)
-app.include_router(create_crews_router())
-
-# Include Story Crew router (story generation)
-app.include_router(create_story_crew_router())
-
-# Include Alerts API router (notification routing)
-app.include_router(create_alerts_router())
-
-# Include Health API router (cluster health aggregation)
-app.include_router(create_health_router())
-
-# Include Voice API router (voice interaction pipeline)
-app.include_router(create_voice_router())
-
-# Include Reconcile API router (state management)
-app.include_router(create_reconcile_router())
-
-# Include Constitution router (safety constraints and audit)
-app.include_router(create_constitution_router())
-
-# Include Self-Improvement router (DGM-inspired self-modification)
-app.include_router(create_self_improvement_router())
-
-# Include Sandbox router (secure code execution)
-app.include_router(create_sandbox_router())
-
-# Include Memory Architecture router (MIRIX 6-tier memory)
-app.include_router(create_memory_router())
-
-# Include Predictive Maintenance router (trend analysis, failure prediction)
-app.include_router(create_predictive_router())
-
-# Include Preference Collector router (LiteLLM callback, feedback collection)
-app.include_router(create_preference_collector_router())
-
-# Include Container Health router (external healthchecks for containers)
-app.include_router(create_container_health_router())
-
-# Include Benchmark Suite router (DGM-inspired capability metrics)
-app.include_router(create_benchmark_router())
-
-# Include Presence Automation router (Home Assistant integration)
-app.include_router(create_presence_router())
-
-# Include Calendar Intelligence router (schedule-aware operations)
-app.include_router(create_calendar_router())
-
-# Include Discord Bot router (system control via Discord)
-app.include_router(create_discord_router())
-
-# Include Agent Scheduler router (AIOS-style agent orchestration)
-app.include_router(create_agent_scheduler_router())
-
-# Include Wake Word router (voice activation)
-app.include_router(create_wake_word_router())
-
-# Include Discovery Archive router (cross-session learning)
-app.include_router(create_discovery_router())
-
-# Include Character Consistency router (Phase 12: Empire of Broken Queens)
-app.include_router(create_character_router())
-
-# Include Game Library router (adult game collection management)
-app.include_router(create_game_library_router())
-
-# Include ComfyUI router (Phase 12: image generation orchestration)
-app.include_router(create_comfyui_router())
-
-# Include Scene Backgrounds router (Phase 12: visual novel backgrounds)
-app.include_router(create_scene_backgrounds_router())
-app.include_router(create_model_hotswap_router())
-app.include_router(create_human_feedback_router())
-app.include_router(create_daily_digest_router())
-
-# Include Dashboard router (Command Center UI backend)
-app.include_router(create_dashboard_router())
-
-# Include Home Automation router (Home Assistant integration for Command Center)
-app.include_router(create_home_automation_router())
-
-# Include Logs router (Loki integration for cluster logs)
-app.include_router(create_logs_router())
-
-# Include Autonomous Controller router (proactive task spawning)
-app.include_router(create_autonomous_router())
-
-# Include Autonomous Queue router (24/7 resource-aware work queue)
-app.include_router(autonomous_queue_router)
-
-# Include Agent Orchestrator router (multi-agent system - Aider, OpenHands, local LLMs)
-app.include_router(create_agent_orchestrator_router())
-
-# Include Cognitive Core router (LLM-powered autonomous reasoning)
-app.include_router(create_cognitive_router())
-
-# Include Hybrid Memory router (Qdrant + Neo4j + Meilisearch fusion)
-app.include_router(create_hybrid_memory_router())
-
-# Include Unraid router (Unified Control Plane - storage management)
-app.include_router(unraid_router)
-
-# Include SSE Events router (Unified Control Plane - real-time streaming)
-app.include_router(events_router)
-
-# Include Asset Quality router (Phase 12: automated quality scoring for generated assets)
-app.include_router(create_quality_router())
-
-# Include Unified Services router (Homepage integration - single pane of glass)
-app.include_router(create_services_router())
-
-# Include Semantic Cache router (LLM response caching with semantic similarity)
-app.include_router(create_semantic_cache_router())
-
-# Include Face Detection router (Phase 12: face analysis for quality scoring)
-app.include_router(create_face_detection_router())
-
-# Include Graphiti Memory router (Hybrid graph + vector + keyword search)
-app.include_router(create_graphiti_router())
-
-# Include Reranker router (Cross-encoder reranking for improved relevance)
-app.include_router(create_reranker_router())
-
-# Include Conversation Cache router (High-performance context caching)
-app.include_router(create_conversation_cache_router())
-
-# Include Agentic RAG router (Self-reflective retrieval augmented generation)
-app.include_router(create_agentic_rag_router())
-
-# Include Vision router (Multi-modal image understanding)
-app.include_router(create_vision_router())
-
-# Include Research Queue router (External research ingestion pipeline)
-app.include_router(create_research_queue_router())
-
-# Include Unified Ingest router (Drag & drop, clipboard, file upload)
-app.include_router(create_ingest_router())
-
-# Include MCP Registry router (MCP server and tool discovery)
-app.include_router(create_mcp_registry_router())
-
-# Include Skill Learning router (Agent Files, skill library, skill sharing)
-app.include_router(create_skill_learning_router())
-
-# Include Speculative Decoding router (Performance optimization)
-app.include_router(create_speculative_router())
-
-# Include Enhanced Routing router (Queue-aware routing, cost tracking)
-app.include_router(create_routing_router())
-
-# OpenHands Coding Autonomy (4.1)
-app.include_router(create_openhands_router())
-
-# Multi-Agent Memory Sharing (4.2 - MIRIX 6-tier)
-app.include_router(create_multi_agent_memory_router())
-
-# Autonomous Research Pipeline (4.3)
-app.include_router(create_autonomous_research_router())
-
-# Human Feedback Integration Loop (5.1)
-app.include_router(create_feedback_loop_router())
-
-# Test Automation (5.2)
-app.include_router(create_test_automation_router())
-
-# Disaster Recovery (5.3)
-app.include_router(create_disaster_recovery_router())
-
-# Darwin Gödel Machine Self-Improvement
-app.include_router(create_dgm_router())
-
-# Comprehensive Benchmark Suite
-app.include_router(create_comprehensive_benchmark_router())
-
-# Google Calendar Integration (Phase 14: External Intelligence)
-app.include_router(create_google_calendar_router())
-
-# Gmail Integration (Phase 14: External Intelligence)
-app.include_router(create_gmail_router())
-
-# Morning Briefing (Phase 14: External Intelligence)
-app.include_router(create_morning_briefing_router())
-
-# News Integration (Phase 14: External Intelligence - Week 24)
-app.include_router(create_news_router())
-app.include_router(create_news_intelligence_router())
-
-# Financial Awareness (Phase 14: External Intelligence - Week 23)
-app.include_router(create_financial_router())
-
-# User Data Management (Phase 14: User Data Architecture)
-app.include_router(create_user_data_router())
-
-# Model Intelligence - Proactive model selection
-app.include_router(create_model_intelligence_router())
-
-# Task Queue - Batch tasks by optimal model
-app.include_router(create_task_queue_router())
-
-# Aider Autonomous Coding Agent
-app.include_router(create_aider_router())
-
-# Cost Tracking Dashboard
-app.include_router(create_cost_tracking_router())
-
-# Unified Search Engine
-app.include_router(create_unified_search_router())
-
-# Agent-Based Character Generation
-app.include_router(create_character_generation_router())
-
-# A2A Protocol for Agent Collaboration
-app.include_router(create_a2a_router())
 
 
 # Root endpoints
@@ -887,6 +807,7 @@ async def root():
 
 
 @app.get("/health", tags=["info"])
+@provides("/health")
 async def health_check():
     """Health check endpoint for container orchestration."""
     return {
@@ -917,6 +838,33 @@ async def circuit_breaker_status():
     }
 
 
+@app.get("/startup/profile", tags=["info"])
+async def startup_profile_report():
+    """
+    Get the startup profile: time and RSS growth per imported feature module,
+    startup phases, and which routers are loaded, pending or disabled.
+    """
+    return router_registry.report()
+
+
+@app.get("/service-bus/stats", tags=["info"])
+async def service_bus_stats():
+    """
+    Get in-process service bus usage: registered providers and query counts
+    per path served locally, over loopback HTTP, or by a remote API.
+    """
+    return get_service_bus().get_stats()
+
+
+@app.get("/prometheus/stats", tags=["info"])
+async def prometheus_query_stats():
+    """
+    Get shared Prometheus client usage: queries answered from cache, coalesced
+    into an in-flight request or sent, requests per endpoint and batching.
+    """
+    return get_prometheus_stats()
+
+
 @app.post("/inference/route", tags=["inference"])
 async def intelligent_route(request: Request):
     """
@@ -1014,8 +962,7 @@ async def auth_status(request: Request):
             "message": "No API key provided",
         }
 
-    valid_keys = get_api_keys()
-    is_valid = api_key in valid_keys
+    is_valid = is_valid_api_key(api_key)
 
     return {
         "auth_enabled": True,
@@ -1073,11 +1020,13 @@ async def classify_prompt(
     """
     Classify a prompt and recommend optimal model.
 
-    Returns model recommendation based on complexity analysis.
+    Returns model recommendation based on complexity analysis, or from the
+    learned semantic router when it is in active mode. In shadow mode the
+    semantic router's decision is only compared, see /routing/semantic/stats.
     """
-    classifier: RouteClassifier = app.state.route_classifier
+    from hydra_tools.semantic_router import get_semantic_router
 
-    result = classifier.route(
+    result = await get_semantic_router().route(
         prompt=prompt,
         system_prompt=system_prompt,
         prefer_quality=prefer_quality,
@@ -1095,6 +1044,8 @@ async def classify_prompt(
 @app.get("/routing/tiers", tags=["routing"])
 async def get_model_tiers():
     """Get available model tiers and their characteristics."""
+    from hydra_tools.routellm import ModelTier
+
     return {
         "tiers": {
             ModelTier.FAST.value: {
@@ -1136,7 +1087,9 @@ async def record_interaction(
 
     Feedback can be: positive, negative, regenerate, or null.
     """
-    learner: PreferenceLearner = app.state.preference_learner
+    from hydra_tools.preference_learning import FeedbackType
+
+    learner = app.state.preference_learner
 
     feedback_type = None
     if feedback:
@@ -1170,7 +1123,9 @@ async def get_recommendation(
 
     Either provide a prompt (for auto-detection) or task_type.
     """
-    learner: PreferenceLearner = app.state.preference_learner
+    from hydra_tools.preference_learning import TaskType
+
+    learner = app.state.preference_learner
 
     tt = None
     if task_type:
@@ -1193,7 +1148,7 @@ async def get_recommendation(
 @app.get("/preferences/stats", tags=["preferences"])
 async def get_preference_stats():
     """Get current preference statistics."""
-    learner: PreferenceLearner = app.state.preference_learner
+    learner = app.state.preference_learner
     prefs = learner.export_preferences()
 
     return {
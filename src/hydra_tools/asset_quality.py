@@ -25,6 +25,8 @@ import httpx
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from pydantic import BaseModel, Field
 
+from hydra_tools.similarity import cosine
+
 # PIL for image info extraction (optional but improves scoring)
 try:
     from PIL import Image
@@ -371,7 +373,7 @@ class AssetQualityScorer:
         if reference_embedding and image_info.get("embedding"):
             # Calculate cosine similarity
             img_emb = image_info["embedding"]
-            similarity = self._cosine_similarity(img_emb, reference_embedding)
+            similarity = cosine(img_emb, reference_embedding)
             details["style_similarity"] = round(similarity, 3)
 
             if similarity > 0.9:
@@ -430,7 +432,7 @@ class AssetQualityScorer:
         # Character identity check
         if character_embedding and image_info.get("face_embedding"):
             face_emb = image_info["face_embedding"]
-            identity_similarity = self._cosine_similarity(face_emb, character_embedding)
+            identity_similarity = cosine(face_emb, character_embedding)
             details["identity_similarity"] = round(identity_similarity, 3)
 
             if identity_similarity > 0.85:
@@ -471,20 +473,6 @@ class AssetQualityScorer:
             suggestions=suggestions,
         )
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        if len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = sum(a * a for a in vec1) ** 0.5
-        norm2 = sum(b * b for b in vec2) ** 0.5
-
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-
-        return dot_product / (norm1 * norm2)
-
     def _determine_tier(self, score: float) -> QualityTier:
         """Determine quality tier from overall score."""
         if score >= 90:
@@ -144,17 +144,17 @@ def update_auth_status(enabled: bool, num_keys: int):
     AUTH_KEYS_CONFIGURED.set(num_keys)
 
 
-def record_http_request(method: str, path: str, status_code: int, duration_seconds: float):
+def record_http_request(method: str, endpoint: str, status_code: int, duration_seconds: float):
     """
     Record an HTTP request.
 
     Args:
         method: HTTP method (GET, POST, etc.)
-        path: Request path
+        endpoint: Matched route template (e.g. /characters/{character_id}),
+            or a fixed label for unmatched requests
         status_code: Response status code
-        duration_seconds: Request duration
+        duration_seconds: Request duration, to the last response byte
     """
-    endpoint = _get_path_prefix(path)
     HTTP_REQUESTS_TOTAL.labels(method=method, endpoint=endpoint, status_code=str(status_code)).inc()
     HTTP_REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration_seconds)
 
@@ -20,14 +20,14 @@ import asyncio
 import json
 import logging
 import os
-from dataclasses import dataclass, field, asdict
+import time
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional
 import yaml
 
-import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -39,9 +39,17 @@ from hydra_tools.agent_scheduler import (
 )
 from hydra_tools.constitution import get_enforcer
 from hydra_tools.memory_architecture import get_memory_manager, MemoryTier
+from hydra_tools.prometheus_query import get_prometheus_client
+from hydra_tools.rule_engine import RuleEngine, RuleSyntaxError, compile_condition
+from hydra_tools.service_bus import PERCEIVE_LATENCY, get_service_bus
 
 logger = logging.getLogger(__name__)
 
+PROMETHEUS_URL = os.getenv("PROMETHEUS_URL", "http://192.168.1.244:9090")
+
+# An unhealthy container with at least this many consecutive failed probes needs a restart
+RESTART_AFTER_FAILURES = int(os.getenv("HYDRA_RESTART_AFTER_FAILURES", "3"))
+
 
 # =============================================================================
 # Data Classes
@@ -59,7 +67,13 @@ class TriggerType(str, Enum):
 
 @dataclass
 class TriggerRule:
-    """A rule that triggers autonomous action when conditions are met."""
+    """
+    A rule that triggers autonomous action when conditions are met.
+
+    ``condition`` is a rule_engine expression over the facts from
+    SystemState.facts(); ``message`` is the reason recorded when it fires and
+    may reference facts as ``{field}``.
+    """
     id: str
     name: str
     trigger_type: TriggerType
@@ -71,6 +85,7 @@ class TriggerRule:
     enabled: bool = True
     last_triggered: Optional[datetime] = None
     trigger_count: int = 0
+    message: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -78,6 +93,7 @@ class TriggerRule:
             "name": self.name,
             "trigger_type": self.trigger_type.value,
             "condition": self.condition,
+            "message": self.message,
             "action_type": self.action_type,
             "action_description": self.action_description,
             "priority": self.priority.name,
@@ -112,6 +128,32 @@ class SystemState:
             "recent_events_count": len(self.recent_events),
         }
 
+    def facts(self) -> Dict[str, Any]:
+        """Named values trigger rule conditions are evaluated against."""
+        containers = self.containers.get("containers", [])
+        latest_benchmark = self.benchmarks.get("latest") or {}
+        return {
+            **self.metrics,
+            "metrics": self.metrics,
+            "unhealthy_containers": sorted(
+                c.get("name") for c in containers if c.get("status") == "unhealthy"
+            ),
+            "restart_needed_containers": sorted(
+                c.get("name") for c in containers
+                if c.get("status") == "unhealthy" and c.get("consecutive_failures", 0) >= RESTART_AFTER_FAILURES
+            ),
+            "targets_down": sorted(self.prometheus_targets.get("down", [])),
+            "benchmark_score": latest_benchmark.get("overall_score"),
+            "pending_task_count": len(self.pending_tasks),
+            "clock": {
+                "minute": self.timestamp.minute,
+                "hour": self.timestamp.hour,
+                "day": self.timestamp.day,
+                "month": self.timestamp.month,
+                "weekday": (self.timestamp.weekday() + 1) % 7,  # cron numbering, Sunday = 0
+            },
+        }
+
 
 @dataclass
 class AutonomousAction:
@@ -135,7 +177,8 @@ DEFAULT_TRIGGER_RULES = [
         id="health-001",
         name="Unhealthy Container",
         trigger_type=TriggerType.HEALTH,
-        condition="container.status == 'unhealthy' for > 5 minutes",
+        condition="len(unhealthy_containers) > 0",
+        message="Containers unhealthy: {unhealthy_containers}",
         action_type="maintenance",
         action_description="Diagnose and attempt to fix unhealthy container",
         priority=AgentPriority.HIGH,
@@ -145,7 +188,8 @@ DEFAULT_TRIGGER_RULES = [
         id="health-002",
         name="Service Down",
         trigger_type=TriggerType.HEALTH,
-        condition="prometheus_target.up == 0",
+        condition="len(targets_down) > 0",
+        message="Services down: {targets_down}",
         action_type="monitoring",
         action_description="Investigate down service",
         priority=AgentPriority.CRITICAL,
@@ -155,7 +199,8 @@ DEFAULT_TRIGGER_RULES = [
         id="health-003",
         name="Container Restart Required",
         trigger_type=TriggerType.HEALTH,
-        condition="container.restart_needed == true",
+        condition="len(restart_needed_containers) > 0",
+        message="Containers failing repeatedly: {restart_needed_containers}",
         action_type="maintenance",
         action_description="Restart container with constitutional protection",
         priority=AgentPriority.HIGH,
@@ -168,6 +213,7 @@ DEFAULT_TRIGGER_RULES = [
         name="High Disk Usage",
         trigger_type=TriggerType.METRIC,
         condition="disk_usage_percent > 85",
+        message="Disk usage {disk_usage_percent}% exceeds threshold",
         action_type="maintenance",
         action_description="Run disk cleanup to free space",
         priority=AgentPriority.HIGH,
@@ -178,6 +224,7 @@ DEFAULT_TRIGGER_RULES = [
         name="Slow Inference",
         trigger_type=TriggerType.METRIC,
         condition="avg_inference_latency_ms > 3000",
+        message="Inference latency {avg_inference_latency_ms}ms exceeds threshold",
         action_type="research",
         action_description="Research inference optimization options",
         priority=AgentPriority.NORMAL,
@@ -188,6 +235,7 @@ DEFAULT_TRIGGER_RULES = [
         name="High GPU Temperature",
         trigger_type=TriggerType.METRIC,
         condition="gpu_temp_celsius > 80",
+        message="GPU temperature {gpu_temp_celsius}C exceeds threshold",
         action_type="monitoring",
         action_description="Monitor GPU temperature and alert if sustained",
         priority=AgentPriority.HIGH,
@@ -199,7 +247,8 @@ DEFAULT_TRIGGER_RULES = [
         id="bench-001",
         name="Benchmark Regression",
         trigger_type=TriggerType.BENCHMARK,
-        condition="benchmark_score < previous_score - 5",
+        condition="benchmark_score < previous_benchmark_score - 5",
+        message="Benchmark score fell from {previous_benchmark_score}% to {benchmark_score}%",
         action_type="llm",
         action_description="Analyze benchmark regression and propose fixes",
         priority=AgentPriority.HIGH,
@@ -210,6 +259,7 @@ DEFAULT_TRIGGER_RULES = [
         name="Low Benchmark Score",
         trigger_type=TriggerType.BENCHMARK,
         condition="benchmark_score < 80",
+        message="Benchmark score {benchmark_score}% below threshold",
         action_type="llm",
         action_description="Generate improvement proposals for low-scoring areas",
         priority=AgentPriority.NORMAL,
@@ -232,6 +282,7 @@ DEFAULT_TRIGGER_RULES = [
         name="Memory Consolidation",
         trigger_type=TriggerType.SCHEDULE,
         condition="cron: 0 4 * * *",  # 4 AM daily
+        message="Scheduled trigger at 04:00",
         action_type="maintenance",
         action_description="Consolidate and archive old memories",
         priority=AgentPriority.LOW,
@@ -244,6 +295,7 @@ DEFAULT_TRIGGER_RULES = [
         name="Daily Knowledge Refresh",
         trigger_type=TriggerType.SCHEDULE,
         condition="cron: 0 2 * * *",  # 2 AM daily
+        message="Scheduled trigger at 02:00",
         action_type="deep_research",
         action_description="Research latest developments in AI and infrastructure",
         priority=AgentPriority.LOW,
@@ -254,6 +306,7 @@ DEFAULT_TRIGGER_RULES = [
         name="Weekly Self-Improvement",
         trigger_type=TriggerType.SCHEDULE,
         condition="cron: 0 3 * * 0",  # 3 AM Sunday
+        message="Scheduled trigger at 03:00 Sunday",
         action_type="llm",
         action_description="Run benchmarks and generate improvement proposals",
         priority=AgentPriority.LOW,
@@ -289,8 +342,14 @@ class AutonomousController:
         self.check_interval = check_interval_seconds
         self.rules_file = rules_file or "/data/autonomous/trigger_rules.yaml"
 
-        # Load trigger rules
+        # Load trigger rules, compiling their conditions
+        self.engine = RuleEngine()
         self.rules: List[TriggerRule] = self._load_rules()
+        self.engine.compile(self.rules)
+
+        # Benchmark score history for regression rules
+        self._benchmark_score: Optional[float] = None
+        self._previous_benchmark_score: Optional[float] = None
 
         # Get references to other systems
         self._scheduler = None
@@ -313,6 +372,7 @@ class AutonomousController:
             "actions_spawned": 0,
             "actions_blocked": 0,
             "errors": 0,
+            "last_perceive_ms": None,
         }
 
         logger.info(f"AutonomousController initialized with {len(self.rules)} rules")
@@ -338,6 +398,7 @@ class AutonomousController:
     def _load_rules(self) -> List[TriggerRule]:
         """Load trigger rules from file or use defaults."""
         rules = []
+        defaults = {r.id: r for r in DEFAULT_TRIGGER_RULES}
 
         # Try to load from file
         if os.path.exists(self.rules_file):
@@ -350,6 +411,7 @@ class AutonomousController:
                             name=rule_data["name"],
                             trigger_type=TriggerType(rule_data["trigger_type"]),
                             condition=rule_data["condition"],
+                            message=rule_data.get("message") or getattr(defaults.get(rule_data["id"]), "message", ""),
                             action_type=rule_data["action_type"],
                             action_description=rule_data["action_description"],
                             priority=AgentPriority[rule_data.get("priority", "NORMAL")],
@@ -362,13 +424,14 @@ class AutonomousController:
 
         # Use defaults if no file rules
         if not rules:
-            rules = DEFAULT_TRIGGER_RULES.copy()
+            rules = [replace(r) for r in DEFAULT_TRIGGER_RULES]
             self._save_rules(rules)
 
         return rules
 
     def _save_rules(self, rules: List[TriggerRule]):
-        """Save trigger rules to file."""
+        """Compile changed rule conditions and save trigger rules to file."""
+        self.engine.compile(rules)
         Path(self.rules_file).parent.mkdir(parents=True, exist_ok=True)
 
         data = {
@@ -384,91 +447,105 @@ class AutonomousController:
     # =========================================================================
 
     async def perceive(self) -> SystemState:
-        """Gather current system state from all sensors."""
+        """Gather current system state from all sensors, querying them concurrently."""
         now = datetime.utcnow()
+        started = time.perf_counter()
+        bus = get_service_bus()
+
+        async def query(path: str):
+            return await bus.query(path, base_url=self.api_base_url)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Get container health
+        async def get_containers():
             try:
-                resp = await client.get(f"{self.api_base_url}/container-health/")
-                containers = resp.json() if resp.status_code == 200 else {}
+                return await query("/container-health/")
             except Exception as e:
                 logger.warning(f"Error getting container health: {e}")
-                containers = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Get Prometheus targets
+        async def get_prometheus_targets():
             try:
-                resp = await client.get("http://192.168.1.244:9090/api/v1/targets")
-                prom_data = resp.json() if resp.status_code == 200 else {}
-                targets = prom_data.get("data", {}).get("activeTargets", [])
-                prometheus_targets = {
+                targets = await self._prometheus_targets()
+                return {
                     "total": len(targets),
                     "up": sum(1 for t in targets if t.get("health") == "up"),
                     "down": [t.get("labels", {}).get("job") for t in targets if t.get("health") != "up"],
                 }
             except Exception as e:
                 logger.warning(f"Error getting Prometheus targets: {e}")
-                prometheus_targets = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Get key metrics
-            metrics = {}
+        async def get_inference_metrics():
             try:
-                # Inference latency
-                resp = await client.get(f"{self.api_base_url}/diagnosis/inference")
-                if resp.status_code == 200:
-                    inference = resp.json()
-                    if inference.get("latency_ms"):
-                        metrics["avg_inference_latency_ms"] = inference["latency_ms"]
-                    if inference.get("tokens_per_second"):
-                        metrics["tokens_per_second"] = inference["tokens_per_second"]
+                inference = await query("/diagnosis/inference")
             except Exception:
-                pass
+                return {}
+            metrics = {}
+            if inference.get("latency_ms"):
+                metrics["avg_inference_latency_ms"] = inference["latency_ms"]
+            if inference.get("tokens_per_second"):
+                metrics["tokens_per_second"] = inference["tokens_per_second"]
+            return metrics
 
+        async def get_gpu_metrics():
             try:
-                # GPU metrics
-                resp = await client.get(f"{self.api_base_url}/hardware/gpus")
-                if resp.status_code == 200:
-                    gpus = resp.json().get("gpus", [])
-                    if gpus:
-                        metrics["gpu_temp_celsius"] = max(g.get("temp_celsius", 0) for g in gpus)
-                        metrics["gpu_vram_used_gb"] = sum(g.get("vram_used_gb", 0) for g in gpus)
+                gpus = (await query("/hardware/gpus")).get("gpus", [])
             except Exception:
-                pass
-
-            # Get latest benchmarks
+                return {}
+            if not gpus:
+                return {}
+            return {
+                "gpu_temp_celsius": max(g.get("temp_celsius", 0) for g in gpus),
+                "gpu_vram_used_gb": sum(g.get("vram_used_gb", 0) for g in gpus),
+            }
+
+        async def get_benchmarks():
             try:
-                resp = await client.get(f"{self.api_base_url}/self-improvement/benchmarks/latest")
-                benchmarks = resp.json() if resp.status_code == 200 else {}
+                return await query("/self-improvement/benchmarks/latest")
             except Exception as e:
-                benchmarks = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Get memory stats
+        async def get_memory_stats():
             try:
-                memory_stats = await self.memory.get_stats()
+                return await self.memory.get_stats()
             except Exception as e:
-                memory_stats = {"error": str(e)}
-
-            # Get pending tasks
-            pending_tasks = self.scheduler.get_queue()
+                return {"error": str(e)}
 
-            # Get recent events from episodic memory
+        async def get_recent_events():
             try:
-                recent_events = await self.memory.get_recent_episodes(limit=10)
-                recent_events = [e.to_dict() for e in recent_events]
+                return [e.to_dict() for e in await self.memory.get_recent_episodes(limit=10)]
             except Exception:
-                recent_events = []
+                return []
+
+        (
+            containers, prometheus_targets, inference_metrics, gpu_metrics,
+            benchmarks, memory_stats, recent_events,
+        ) = await asyncio.gather(
+            get_containers(), get_prometheus_targets(), get_inference_metrics(), get_gpu_metrics(),
+            get_benchmarks(), get_memory_stats(), get_recent_events(),
+        )
+
+        # Get pending tasks
+        pending_tasks = self.scheduler.get_queue()
+
+        elapsed = time.perf_counter() - started
+        PERCEIVE_LATENCY.labels(loop="autonomous").observe(elapsed)
+        self._stats["last_perceive_ms"] = round(elapsed * 1000, 1)
 
         return SystemState(
             timestamp=now,
             containers=containers,
             prometheus_targets=prometheus_targets,
-            metrics=metrics,
+            metrics={**inference_metrics, **gpu_metrics},
             benchmarks=benchmarks,
             memory_stats=memory_stats,
             pending_tasks=pending_tasks,
             recent_events=recent_events,
         )
 
+    async def _prometheus_targets(self) -> List[Dict[str, Any]]:
+        """Active scrape targets from Prometheus (shared client, cached per scrape interval)."""
+        return await get_prometheus_client(PROMETHEUS_URL).targets()
+
     # =========================================================================
     # Decide - Evaluate Trigger Rules
     # =========================================================================
@@ -476,19 +553,19 @@ class AutonomousController:
     async def decide(self, state: SystemState) -> List[AutonomousAction]:
         """Evaluate trigger rules and return actions to take."""
         actions = []
+        now = datetime.utcnow()
 
-        for rule in self.rules:
-            if not rule.enabled:
-                continue
-
-            # Check cooldown
-            if rule.last_triggered:
-                cooldown_end = rule.last_triggered + timedelta(minutes=rule.cooldown_minutes)
-                if datetime.utcnow() < cooldown_end:
-                    continue
+        # Rules that are disabled or cooling down are not evaluated
+        candidates = [
+            rule for rule in self.rules
+            if rule.enabled and not (
+                rule.last_triggered and now < rule.last_triggered + timedelta(minutes=rule.cooldown_minutes)
+            )
+        ]
+        results = self.engine.evaluate(candidates, self._facts(state))
 
-            # Evaluate the rule
-            triggered, reason = self._evaluate_rule(rule, state)
+        for rule in candidates:
+            triggered, reason = results.get(rule.id, (False, ""))
 
             if triggered:
                 # Check for duplicate pending action
@@ -507,65 +584,15 @@ class AutonomousController:
 
         return actions
 
-    def _evaluate_rule(self, rule: TriggerRule, state: SystemState) -> Tuple[bool, str]:
-        """Evaluate a single rule against current state."""
-
-        # Health-based triggers
-        if rule.trigger_type == TriggerType.HEALTH:
-            if "unhealthy" in rule.condition.lower():
-                # Check for unhealthy containers
-                containers = state.containers.get("containers", [])
-                for c in containers:
-                    if c.get("health") == "unhealthy":
-                        return True, f"Container {c.get('name')} is unhealthy"
-
-            if "prometheus_target" in rule.condition.lower():
-                # Check for down Prometheus targets
-                down = state.prometheus_targets.get("down", [])
-                if down:
-                    return True, f"Services down: {', '.join(down)}"
-
-        # Metric-based triggers
-        elif rule.trigger_type == TriggerType.METRIC:
-            if "disk_usage_percent" in rule.condition:
-                # Would need to add disk metrics to perceive
-                pass
-
-            if "avg_inference_latency_ms" in rule.condition:
-                latency = state.metrics.get("avg_inference_latency_ms", 0)
-                if latency > 3000:
-                    return True, f"Inference latency {latency}ms exceeds threshold"
-
-            if "gpu_temp_celsius" in rule.condition:
-                temp = state.metrics.get("gpu_temp_celsius", 0)
-                if temp > 80:
-                    return True, f"GPU temperature {temp}C exceeds threshold"
-
-        # Benchmark-based triggers
-        elif rule.trigger_type == TriggerType.BENCHMARK:
-            score = state.benchmarks.get("overall_score", 100)
-
-            if "benchmark_score < 80" in rule.condition:
-                if score < 80:
-                    return True, f"Benchmark score {score}% below threshold"
-
-            if "regression" in rule.condition.lower():
-                # Would need to track previous scores
-                pass
-
-        # Schedule-based triggers (simple implementation)
-        elif rule.trigger_type == TriggerType.SCHEDULE:
-            # Parse cron-like condition
-            if "cron:" in rule.condition:
-                # Simplified: check if we're in the right hour
-                cron_parts = rule.condition.replace("cron:", "").strip().split()
-                if len(cron_parts) >= 2:
-                    minute, hour = int(cron_parts[0]), int(cron_parts[1])
-                    now = datetime.utcnow()
-                    if now.hour == hour and now.minute == minute:
-                        return True, f"Scheduled trigger at {hour:02d}:{minute:02d}"
-
-        return False, ""
+    def _facts(self, state: SystemState) -> Dict[str, Any]:
+        """State facts plus the benchmark score before the latest one."""
+        facts = state.facts()
+        score = facts["benchmark_score"]
+        if score is not None and score != self._benchmark_score:
+            self._previous_benchmark_score = self._benchmark_score
+            self._benchmark_score = score
+        facts["previous_benchmark_score"] = self._previous_benchmark_score
+        return facts
 
     def _is_duplicate_action(self, rule: TriggerRule, pending_actions: List[AutonomousAction]) -> bool:
         """Check if this action is already pending."""
@@ -779,13 +806,23 @@ class AutonomousController:
             "stats": self._stats,
             "rules_count": len(self.rules),
             "rules_enabled": sum(1 for r in self.rules if r.enabled),
+            "rule_engine": self.engine.get_stats(),
             "check_interval_seconds": self.check_interval,
             "last_state": self._last_state.to_dict() if self._last_state else None,
         }
 
     def get_rules(self) -> List[Dict[str, Any]]:
-        """Get all trigger rules."""
-        return [r.to_dict() for r in self.rules]
+        """Get all trigger rules with their dependencies and evaluation timing."""
+        rules = []
+        for r in self.rules:
+            timing = self.engine.timings.get(r.id)
+            rules.append({
+                **r.to_dict(),
+                "depends_on": self.engine.dependencies(r.id),
+                "compile_error": self.engine.errors.get(r.id),
+                "evaluation": timing.to_dict() if timing else None,
+            })
+        return rules
 
     def get_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get action history."""
@@ -800,6 +837,28 @@ class AutonomousController:
                 return True
         return False
 
+    def update_rule(self, rule_id: str, changes: Dict[str, Any]) -> Optional[TriggerRule]:
+        """
+        Update a rule's condition, message, cooldown or priority. The new
+        condition is compiled first; RuleSyntaxError (or KeyError for an
+        unknown priority) leaves the rule as it was.
+        """
+        rule = next((r for r in self.rules if r.id == rule_id), None)
+        if rule is None:
+            return None
+        if changes.get("condition") is not None:
+            compile_condition(changes["condition"])
+        priority = AgentPriority[changes["priority"].upper()] if changes.get("priority") else rule.priority
+
+        rule.condition = changes.get("condition") or rule.condition
+        rule.priority = priority
+        if changes.get("message") is not None:
+            rule.message = changes["message"]
+        if changes.get("cooldown_minutes") is not None:
+            rule.cooldown_minutes = changes["cooldown_minutes"]
+        self._save_rules(self.rules)
+        return rule
+
     def disable_rule(self, rule_id: str) -> bool:
         """Disable a trigger rule."""
         for rule in self.rules:
@@ -838,6 +897,14 @@ class SpawnTaskRequest(BaseModel):
     priority: str = "normal"
 
 
+class RuleUpdateRequest(BaseModel):
+    """Changes to a trigger rule; omitted fields are left as they are."""
+    condition: Optional[str] = None
+    message: Optional[str] = None
+    cooldown_minutes: Optional[int] = None
+    priority: Optional[str] = None
+
+
 def create_autonomous_router() -> APIRouter:
     """Create FastAPI router for autonomous controller endpoints."""
     router = APIRouter(prefix="/autonomous", tags=["autonomous"])
@@ -868,6 +935,20 @@ def create_autonomous_router() -> APIRouter:
         controller = get_controller()
         return {"rules": controller.get_rules()}
 
+    @router.put("/rules/{rule_id}")
+    async def update_rule(rule_id: str, request: RuleUpdateRequest):
+        """Update a trigger rule; the condition is compiled before it is saved."""
+        controller = get_controller()
+        try:
+            rule = controller.update_rule(rule_id, request.model_dump())
+        except RuleSyntaxError as e:
+            raise HTTPException(400, str(e))
+        except KeyError:
+            raise HTTPException(400, f"Unknown priority: {request.priority}")
+        if rule is None:
+            raise HTTPException(404, f"Rule {rule_id} not found")
+        return rule.to_dict()
+
     @router.post("/rules/{rule_id}/enable")
     async def enable_rule(rule_id: str):
         """Enable a trigger rule."""
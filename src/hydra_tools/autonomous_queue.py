@@ -12,7 +12,9 @@ Key Features:
 - Prometheus-based resource monitoring across hydra-ai, hydra-compute, hydra-storage
 - Resource-aware scheduling: only runs tasks when GPU utilization is low
 - Node affinity: routes inference to hydra-ai, images to hydra-compute
-- Priority queue with dynamic scheduling
+- Per-GPU placement with reservations (see gpu_placement): several tasks can
+  start per tick, packed best-fit onto individual GPUs
+- Priority queue with aging
 - Automatic retry with exponential backoff
 
 Usage:
@@ -41,6 +43,10 @@ from contextlib import asynccontextmanager
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 
+from hydra_tools.gpu_placement import Placement, PlacementEngine, TaskDemand
+from hydra_tools.prometheus_query import get_prometheus_client
+from hydra_tools.service_bus import provides
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("autonomous_queue")
@@ -95,6 +101,9 @@ RESOURCE_THRESHOLDS = {
     "max_concurrent_tasks": 3,  # Max tasks running at once
 }
 
+# Pending items considered for placement per tick
+PLACEMENT_WINDOW = int(os.environ.get("HYDRA_PLACEMENT_WINDOW", "200"))
+
 # =============================================================================
 # CLUSTER RESOURCE MONITOR
 # =============================================================================
@@ -146,102 +155,94 @@ class ClusterResourceMonitor:
         self._cache_ttl = timedelta(seconds=10)
 
     async def query_prometheus(self, query: str) -> List[Dict[str, Any]]:
-        """Execute a Prometheus query and return results."""
+        """Execute a Prometheus query (shared, cached client) and return results."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.prometheus_url}/api/v1/query",
-                    params={"query": query}
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data", {}).get("result", [])
+            return await get_prometheus_client(self.prometheus_url).query(query)
         except Exception as e:
             logger.warning(f"Prometheus query failed: {query} - {e}")
         return []
 
     async def get_gpu_metrics(self, node_name: str, node_config: Dict) -> List[GPUStatus]:
-        """Get GPU metrics for a specific node."""
-        gpus = []
+        """Get GPU metrics for a specific node (all GPUs queried together)."""
+        if node_config["metrics_type"] == "none":
+            return []
+        return list(await asyncio.gather(*(
+            self._get_gpu_status(node_name, node_config, gpu_info) for gpu_info in node_config["gpus"]
+        )))
+
+    async def _get_gpu_status(self, node_name: str, node_config: Dict, gpu_info: Dict) -> GPUStatus:
         instance = node_config["prometheus_instance"]
         metrics_type = node_config["metrics_type"]
+        gpu_idx = gpu_info["index"]
+
+        if metrics_type == "dcgm":
+            # Query DCGM metrics for hydra-ai
+            util_query = f'DCGM_FI_DEV_GPU_UTIL{{instance="{instance}",gpu="{gpu_idx}"}}'
+            vram_used_query = f'DCGM_FI_DEV_FB_USED{{instance="{instance}",gpu="{gpu_idx}"}}'
+            vram_free_query = f'DCGM_FI_DEV_FB_FREE{{instance="{instance}",gpu="{gpu_idx}"}}'
+            temp_query = f'DCGM_FI_DEV_GPU_TEMP{{instance="{instance}",gpu="{gpu_idx}"}}'
+            power_query = f'DCGM_FI_DEV_POWER_USAGE{{instance="{instance}",gpu="{gpu_idx}"}}'
+
+            (
+                util_result, vram_used_result, vram_free_result, temp_result, power_result,
+            ) = await asyncio.gather(*(self.query_prometheus(q) for q in (
+                util_query, vram_used_query, vram_free_query, temp_query, power_query,
+            )))
+
+            util = float(util_result[0]["value"][1]) if util_result else 0
+            vram_used_mb = float(vram_used_result[0]["value"][1]) if vram_used_result else 0
+            vram_free_mb = float(vram_free_result[0]["value"][1]) if vram_free_result else 0
+            temp_c = float(temp_result[0]["value"][1]) if temp_result else 0
+            power = float(power_result[0]["value"][1]) if power_result else 0
+
+            vram_used_gb = vram_used_mb / 1024
+            vram_free_gb = vram_free_mb / 1024
+            vram_total_gb = vram_used_gb + vram_free_gb
+
+        else:  # nvidia metrics
+            util_query = f'nvidia_gpu_utilization_percent{{instance="{instance}",gpu="{gpu_idx}"}}'
+            vram_used_query = f'nvidia_gpu_memory_used_bytes{{instance="{instance}",gpu="{gpu_idx}"}}'
+            vram_total_query = f'nvidia_gpu_memory_total_bytes{{instance="{instance}",gpu="{gpu_idx}"}}'
+            temp_query = f'nvidia_gpu_temperature_celsius{{instance="{instance}",gpu="{gpu_idx}"}}'
+            power_query = f'nvidia_gpu_power_draw_watts{{instance="{instance}",gpu="{gpu_idx}"}}'
+
+            (
+                util_result, vram_used_result, vram_total_result, temp_result, power_result,
+            ) = await asyncio.gather(*(self.query_prometheus(q) for q in (
+                util_query, vram_used_query, vram_total_query, temp_query, power_query,
+            )))
+
+            util = float(util_result[0]["value"][1]) if util_result else 0
+            vram_used_bytes = float(vram_used_result[0]["value"][1]) if vram_used_result else 0
+            vram_total_bytes = float(vram_total_result[0]["value"][1]) if vram_total_result else 0
+            temp_c = float(temp_result[0]["value"][1]) if temp_result else 0
+            power = float(power_result[0]["value"][1]) if power_result else 0
+
+            vram_used_gb = vram_used_bytes / (1024 ** 3)
+            vram_total_gb = vram_total_bytes / (1024 ** 3)
+            vram_free_gb = vram_total_gb - vram_used_gb
+
+        # Convert temp to Fahrenheit
+        temp_f = (temp_c * 9 / 5) + 32
+
+        # Determine if GPU is available for work
+        available = (
+            util < RESOURCE_THRESHOLDS["gpu_util_max"] and
+            vram_free_gb >= RESOURCE_THRESHOLDS["vram_free_min_gb"]
+        )
 
-        if metrics_type == "none":
-            return gpus
-
-        for gpu_info in node_config["gpus"]:
-            gpu_idx = gpu_info["index"]
-
-            if metrics_type == "dcgm":
-                # Query DCGM metrics for hydra-ai
-                util_query = f'DCGM_FI_DEV_GPU_UTIL{{instance="{instance}",gpu="{gpu_idx}"}}'
-                vram_used_query = f'DCGM_FI_DEV_FB_USED{{instance="{instance}",gpu="{gpu_idx}"}}'
-                vram_free_query = f'DCGM_FI_DEV_FB_FREE{{instance="{instance}",gpu="{gpu_idx}"}}'
-                temp_query = f'DCGM_FI_DEV_GPU_TEMP{{instance="{instance}",gpu="{gpu_idx}"}}'
-                power_query = f'DCGM_FI_DEV_POWER_USAGE{{instance="{instance}",gpu="{gpu_idx}"}}'
-
-                util_result = await self.query_prometheus(util_query)
-                vram_used_result = await self.query_prometheus(vram_used_query)
-                vram_free_result = await self.query_prometheus(vram_free_query)
-                temp_result = await self.query_prometheus(temp_query)
-                power_result = await self.query_prometheus(power_query)
-
-                util = float(util_result[0]["value"][1]) if util_result else 0
-                vram_used_mb = float(vram_used_result[0]["value"][1]) if vram_used_result else 0
-                vram_free_mb = float(vram_free_result[0]["value"][1]) if vram_free_result else 0
-                temp_c = float(temp_result[0]["value"][1]) if temp_result else 0
-                power = float(power_result[0]["value"][1]) if power_result else 0
-
-                vram_used_gb = vram_used_mb / 1024
-                vram_free_gb = vram_free_mb / 1024
-                vram_total_gb = vram_used_gb + vram_free_gb
-
-            else:  # nvidia metrics
-                util_query = f'nvidia_gpu_utilization_percent{{instance="{instance}",gpu="{gpu_idx}"}}'
-                vram_used_query = f'nvidia_gpu_memory_used_bytes{{instance="{instance}",gpu="{gpu_idx}"}}'
-                vram_total_query = f'nvidia_gpu_memory_total_bytes{{instance="{instance}",gpu="{gpu_idx}"}}'
-                temp_query = f'nvidia_gpu_temperature_celsius{{instance="{instance}",gpu="{gpu_idx}"}}'
-                power_query = f'nvidia_gpu_power_draw_watts{{instance="{instance}",gpu="{gpu_idx}"}}'
-
-                util_result = await self.query_prometheus(util_query)
-                vram_used_result = await self.query_prometheus(vram_used_query)
-                vram_total_result = await self.query_prometheus(vram_total_query)
-                temp_result = await self.query_prometheus(temp_query)
-                power_result = await self.query_prometheus(power_query)
-
-                util = float(util_result[0]["value"][1]) if util_result else 0
-                vram_used_bytes = float(vram_used_result[0]["value"][1]) if vram_used_result else 0
-                vram_total_bytes = float(vram_total_result[0]["value"][1]) if vram_total_result else 0
-                temp_c = float(temp_result[0]["value"][1]) if temp_result else 0
-                power = float(power_result[0]["value"][1]) if power_result else 0
-
-                vram_used_gb = vram_used_bytes / (1024 ** 3)
-                vram_total_gb = vram_total_bytes / (1024 ** 3)
-                vram_free_gb = vram_total_gb - vram_used_gb
-
-            # Convert temp to Fahrenheit
-            temp_f = (temp_c * 9 / 5) + 32
-
-            # Determine if GPU is available for work
-            available = (
-                util < RESOURCE_THRESHOLDS["gpu_util_max"] and
-                vram_free_gb >= RESOURCE_THRESHOLDS["vram_free_min_gb"]
-            )
-
-            gpus.append(GPUStatus(
-                node=node_name,
-                gpu_index=gpu_idx,
-                gpu_name=gpu_info["name"],
-                utilization_percent=util,
-                vram_used_gb=round(vram_used_gb, 2),
-                vram_total_gb=round(vram_total_gb or gpu_info["vram_gb"], 2),
-                vram_free_gb=round(vram_free_gb, 2),
-                temperature_f=round(temp_f, 1),
-                power_watts=round(power, 1),
-                available_for_work=available
-            ))
-
-        return gpus
+        return GPUStatus(
+            node=node_name,
+            gpu_index=gpu_idx,
+            gpu_name=gpu_info["name"],
+            utilization_percent=util,
+            vram_used_gb=round(vram_used_gb, 2),
+            vram_total_gb=round(vram_total_gb or gpu_info["vram_gb"], 2),
+            vram_free_gb=round(vram_free_gb, 2),
+            temperature_f=round(temp_f, 1),
+            power_watts=round(power, 1),
+            available_for_work=available
+        )
 
     async def get_cluster_resources(self, force_refresh: bool = False) -> ClusterResources:
         """Get current resource status across all cluster nodes."""
@@ -258,8 +259,12 @@ class ClusterResourceMonitor:
         total_vram = 0.0
         free_vram = 0.0
 
-        for node_name, node_config in CLUSTER_NODES.items():
-            gpus = await self.get_gpu_metrics(node_name, node_config)
+        # Every node's queries go out together (one batched Prometheus request)
+        node_gpus = await asyncio.gather(*(
+            self.get_gpu_metrics(node_name, node_config)
+            for node_name, node_config in CLUSTER_NODES.items()
+        ))
+        for (node_name, node_config), gpus in zip(CLUSTER_NODES.items(), node_gpus):
 
             node_total_vram = sum(g.vram_total_gb for g in gpus)
             node_free_vram = sum(g.vram_free_gb for g in gpus)
@@ -324,7 +329,8 @@ class AutonomousScheduler:
 
     The scheduler:
     1. Monitors cluster resources every 30 seconds
-    2. When resources are available, picks the highest priority pending task
+    2. Packs pending tasks onto GPUs by priority and age (PlacementEngine),
+       reserving each task's VRAM until it completes
     3. Routes tasks to appropriate nodes based on type
     4. Respects concurrent task limits
     5. Handles failures with exponential backoff
@@ -338,6 +344,7 @@ class AutonomousScheduler:
         self._tasks_processed: int = 0
         self._tasks_failed: int = 0
         self._started_at: Optional[datetime] = None
+        self.placement = PlacementEngine(RESOURCE_THRESHOLDS)
 
     @property
     def is_running(self) -> bool:
@@ -354,79 +361,94 @@ class AutonomousScheduler:
             "tasks_failed": self._tasks_failed,
             "check_interval_seconds": RESOURCE_THRESHOLDS["check_interval_seconds"],
             "max_concurrent": RESOURCE_THRESHOLDS["max_concurrent_tasks"],
+            "placements": {
+                tid: r.target for tid, r in self.placement.reservations.items()
+            },
         }
 
     def _get_task_requirements(self, work_type: str) -> Dict[str, Any]:
-        """Get resource requirements for a work type."""
+        """
+        Get resource requirements for a work type.
+
+        ``min_vram_gb`` and ``util_percent`` are reserved on the chosen GPU
+        while the task runs.
+        """
         requirements = {
             "chapter_generation": {
                 "requires_gpu": True,
                 "node_affinity": ["hydra-compute"],  # Uses Ollama + ComfyUI on hydra-compute
                 "capability_needed": ["image_generation", "ollama"],
                 "min_vram_gb": 8,
+                "util_percent": 40,
             },
             "research": {
                 "requires_gpu": True,
                 "node_affinity": ["hydra-compute"],  # CrewAI uses Ollama on hydra-compute
                 "capability_needed": ["ollama"],
                 "min_vram_gb": 4,
+                "util_percent": 25,
             },
             "asset_generation": {
                 "requires_gpu": True,
                 "node_affinity": ["hydra-compute"],  # ComfyUI on hydra-compute
                 "capability_needed": ["image_generation"],
                 "min_vram_gb": 8,
+                "util_percent": 40,
             },
             "quality_scoring": {
                 "requires_gpu": True,
                 "node_affinity": ["hydra-compute"],  # CLIP scoring on hydra-compute
                 "capability_needed": ["image_generation"],
                 "min_vram_gb": 4,
+                "util_percent": 15,
             },
             "inference": {
                 "requires_gpu": True,
                 "node_affinity": ["hydra-ai"],  # Large LLM inference (TabbyAPI)
                 "capability_needed": ["inference", "llm"],
                 "min_vram_gb": 8,
+                "util_percent": 30,
             },
             "maintenance": {
                 "requires_gpu": False,
                 "node_affinity": ["hydra-storage"],
                 "capability_needed": [],
                 "min_vram_gb": 0,
+                "util_percent": 0,
             },
             "custom": {
                 "requires_gpu": False,
                 "node_affinity": [],
                 "capability_needed": [],
                 "min_vram_gb": 0,
+                "util_percent": 0,
             },
         }
         return requirements.get(work_type, requirements["custom"])
 
-    async def _can_run_task(self, work_type: str, resources: ClusterResources) -> bool:
-        """Check if a task can run given current resources."""
-        reqs = self._get_task_requirements(work_type)
-
-        if not reqs["requires_gpu"]:
-            return True  # Non-GPU tasks can always run
-
-        # Check if required nodes have available GPUs
-        for node in resources.nodes:
-            if node.name in reqs["node_affinity"] or not reqs["node_affinity"]:
-                if any(g.available_for_work and g.vram_free_gb >= reqs["min_vram_gb"] for g in node.gpus):
-                    return True
-
-        return False
+    def _task_demand(self, row: Dict[str, Any]) -> TaskDemand:
+        """Describe a pending row's resource needs for placement."""
+        reqs = self._get_task_requirements(row["work_type"])
+        return TaskDemand(
+            task_id=row["id"],
+            work_type=row["work_type"],
+            priority=row["priority"],
+            submitted_at=datetime.fromisoformat(row["created_at"]).timestamp(),
+            requires_gpu=reqs["requires_gpu"],
+            vram_gb=reqs["min_vram_gb"],
+            util_percent=reqs["util_percent"],
+            node_affinity=reqs["node_affinity"],
+        )
 
-    async def _pick_next_task(self) -> Optional[Dict[str, Any]]:
-        """Pick the next task to run based on priority and resources."""
+    async def _pick_tasks(self, slots: int) -> List[Tuple[Dict[str, Any], Placement]]:
+        """Place as many pending tasks as resources and ``slots`` allow."""
         resources = await resource_monitor.get_cluster_resources(force_refresh=True)
+        self.placement.observe(resources)
 
         conn = get_db()
         now = datetime.now(timezone.utc).isoformat()
 
-        # Get pending tasks ordered by priority
+        # Pending window; the placement engine ranks it by priority and age
         rows = conn.execute(
             """
             SELECT * FROM work_queue
@@ -440,19 +462,15 @@ class AutonomousScheduler:
                     WHEN 'low' THEN 4
                 END,
                 created_at ASC
-            LIMIT 20
+            LIMIT ?
             """,
-            (now,)
+            (now, PLACEMENT_WINDOW)
         ).fetchall()
         conn.close()
 
-        # Find first task that can run with current resources
-        for row in rows:
-            work_type = row["work_type"]
-            if await self._can_run_task(work_type, resources):
-                return dict(row)
-
-        return None
+        rows = {row["id"]: dict(row) for row in rows if row["id"] not in self._current_tasks}
+        placements = self.placement.place([self._task_demand(row) for row in rows.values()], slots)
+        return [(rows[p.task.task_id], p) for p in placements]
 
     async def _run_scheduler_loop(self):
         """Main scheduler loop - runs continuously."""
@@ -474,16 +492,20 @@ class AutonomousScheduler:
                     await asyncio.sleep(RESOURCE_THRESHOLDS["check_interval_seconds"])
                     continue
 
-                # Try to pick and run a task
-                task_data = await self._pick_next_task()
-                if task_data:
+                # Place and start as many tasks as fit
+                slots = RESOURCE_THRESHOLDS["max_concurrent_tasks"] - len(self._current_tasks)
+                started = await self._pick_tasks(slots)
+                for task_data, placement in started:
                     task_id = task_data["id"]
-                    logger.info(f"[Scheduler] Starting task {task_id}: {task_data['title']}")
+                    logger.info(
+                        f"[Scheduler] Starting task {task_id}: {task_data['title']} "
+                        f"on {placement.reservation.target} (waited {placement.wait_seconds:.0f}s)"
+                    )
 
                     # Create async task to process
                     async_task = asyncio.create_task(self._process_task_safely(task_id))
                     self._current_tasks[task_id] = async_task
-                else:
+                if not started:
                     logger.debug("[Scheduler] No tasks ready to run")
 
                 # Wait before next check
@@ -504,6 +526,8 @@ class AutonomousScheduler:
         except Exception as e:
             self._tasks_failed += 1
             logger.error(f"[Scheduler] Task {task_id} failed: {e}")
+        finally:
+            self.placement.release(task_id)
 
     def start(self) -> bool:
         """Start the 24/7 scheduler."""
@@ -620,8 +644,6 @@ def init_db():
     conn.commit()
     conn.close()
 
-init_db()
-
 def get_db():
     """Get database connection."""
     conn = sqlite3.connect(str(DB_PATH))
@@ -1016,6 +1038,7 @@ async def add_to_queue(item: WorkItemCreate):
     )
 
 @router.get("/queue", response_model=List[WorkItemResponse])
+@provides("/autonomous/queue")
 async def list_queue(status: Optional[str] = None, limit: int = 50):
     """List items in the work queue."""
     conn = get_db()
@@ -1316,6 +1339,7 @@ async def queue_overnight_batch(
 # =============================================================================
 
 @router.get("/resources")
+@provides("/autonomous/resources")
 async def get_cluster_resources(force_refresh: bool = False):
     """Get current resource status across all cluster nodes."""
     resources = await resource_monitor.get_cluster_resources(force_refresh)
@@ -1402,6 +1426,12 @@ async def get_scheduler_status():
     }
 
 
+@router.get("/scheduler/placement")
+async def get_scheduler_placement():
+    """Get per-GPU placement state: effective free VRAM, reservations and drift."""
+    return scheduler.placement.get_stats()
+
+
 @router.post("/scheduler/start")
 async def start_scheduler():
     """Start the 24/7 autonomous scheduler."""
@@ -1495,6 +1525,3 @@ def auto_start_scheduler():
             # No event loop yet, will start on first request
             pass
 
-
-# Try to auto-start on import
-auto_start_scheduler()
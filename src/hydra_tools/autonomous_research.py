@@ -8,6 +8,12 @@ Extends the research queue with autonomous overnight research capabilities:
 - Integration with agent scheduler for resource management
 - Progress tracking and notifications
 
+Jobs run as a streaming stage DAG (collect -> fetch -> analyze -> synthesize
+-> report). Each stage has its own worker pool and hands items downstream as
+soon as they are ready, so analysis starts with the first collected results.
+External requests share a per-host limiter, and finished steps are
+checkpointed so an interrupted or failed job resumes where it stopped.
+
 Author: Hydra Autonomous System
 Created: 2025-12-18
 """
@@ -16,18 +22,29 @@ import asyncio
 import json
 import logging
 import os
+import time
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import hashlib
 import uuid
 
 from prometheus_client import Counter, Gauge
 
+from hydra_tools.research_queue import HostLimiter
+
 logger = logging.getLogger(__name__)
 
+COLLECT_CONCURRENCY = int(os.environ.get("HYDRA_RESEARCH_COLLECT_CONCURRENCY", "4"))
+FETCH_CONCURRENCY = int(os.environ.get("HYDRA_RESEARCH_FETCH_CONCURRENCY", "8"))
+ANALYZE_CONCURRENCY = int(os.environ.get("HYDRA_RESEARCH_ANALYZE_CONCURRENCY", "4"))
+PER_HOST_CONCURRENCY = int(os.environ.get("HYDRA_RESEARCH_PER_HOST_CONCURRENCY", "2"))
+PER_HOST_INTERVAL = float(os.environ.get("HYDRA_RESEARCH_PER_HOST_INTERVAL", "0.0"))
+MAX_ANALYZED_ITEMS = 20
+PROGRESS_SAVE_INTERVAL = 1.0  # Seconds between jobs.json writes for progress updates
+
 # =============================================================================
 # Prometheus Metrics
 # =============================================================================
@@ -127,6 +144,7 @@ class ResearchJob:
     current_phase: str = ""
     sources_processed: int = 0
     items_found: int = 0
+    resumed_steps: int = 0
 
     # Results
     findings: List[Dict[str, Any]] = field(default_factory=list)
@@ -139,6 +157,7 @@ class ResearchJob:
     max_duration_minutes: int = 60
     min_relevance_score: float = 0.5
     auto_store_findings: bool = True
+    fetch_full_content: bool = False  # Fetch pages behind search results before analysis
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -171,6 +190,8 @@ class ResearchJob:
             "current_phase": self.current_phase,
             "sources_processed": self.sources_processed,
             "items_found": self.items_found,
+            "resumed_steps": self.resumed_steps,
+            "fetch_full_content": self.fetch_full_content,
             "findings_count": len(self.findings),
             "key_insights": self.key_insights,
             "action_items": self.action_items,
@@ -202,6 +223,95 @@ class ResearchReport:
     duration_minutes: float = 0
 
 
+# =============================================================================
+# Stage DAG
+# =============================================================================
+
+@dataclass
+class Stage:
+    """One step of a job DAG; ``worker`` maps an input to zero or more outputs."""
+    name: str
+    worker: Callable[[Any], Awaitable[List[Any]]]
+    concurrency: int = 1
+
+
+async def run_stages(stages: List[Stage], inputs: List[Any]) -> List[Any]:
+    """
+    Stream ``inputs`` through ``stages`` and return the last stage's outputs.
+
+    Each stage runs ``concurrency`` workers on its own queue, and every output
+    is handed to the next stage as soon as it is produced, so downstream work
+    starts while upstream stages are still running. A worker that raises drops
+    that input, as the sequential loops did.
+    """
+    done = object()
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in stages]
+    results: List[Any] = []
+
+    async def work(index: int, stage: Stage):
+        while True:
+            value = await queues[index].get()
+            if value is done:
+                return
+            try:
+                outputs = await stage.worker(value)
+            except Exception as e:
+                logger.error(f"Stage {stage.name} failed: {e}")
+                continue
+            for output in outputs:
+                if index + 1 < len(stages):
+                    queues[index + 1].put_nowait(output)
+                else:
+                    results.append(output)
+
+    async def run(index: int, stage: Stage):
+        await asyncio.gather(*(work(index, stage) for _ in range(stage.concurrency)))
+        # Upstream finished: release the next stage's workers once its queue drains
+        if index + 1 < len(stages):
+            for _ in range(stages[index + 1].concurrency):
+                queues[index + 1].put_nowait(done)
+
+    for value in inputs:
+        queues[0].put_nowait(value)
+    for _ in range(stages[0].concurrency):
+        queues[0].put_nowait(done)
+    await asyncio.gather(*(run(index, stage) for index, stage in enumerate(stages)))
+    return results
+
+
+class StageCheckpoint:
+    """Append-only record (JSONL) of the stage steps a job run has finished."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._steps: Dict[Tuple[str, str], Any] = {}
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from an interrupted run; that step reruns
+                        continue
+                    self._steps[(record["stage"], record["key"])] = record["value"]
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        return self._steps.get((stage, key))
+
+    def put(self, stage: str, key: str, value: Any):
+        self._steps[(stage, key)] = value
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"stage": stage, "key": key, "value": value}, default=str) + "\n")
+
+    def clear(self):
+        self._steps.clear()
+        self.path.unlink(missing_ok=True)
+
+
 # =============================================================================
 # Autonomous Research Pipeline
 # =============================================================================
@@ -223,6 +333,11 @@ class AutonomousResearchPipeline:
         storage_path: str = "/data/research/autonomous",
         llm_url: str = "http://192.168.1.244:4000",
         searxng_url: str = "http://192.168.1.244:8888",
+        collect_concurrency: int = COLLECT_CONCURRENCY,
+        fetch_concurrency: int = FETCH_CONCURRENCY,
+        analyze_concurrency: int = ANALYZE_CONCURRENCY,
+        per_host_concurrency: int = PER_HOST_CONCURRENCY,
+        per_host_interval: float = PER_HOST_INTERVAL,
     ):
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
@@ -230,6 +345,13 @@ class AutonomousResearchPipeline:
         self.llm_url = llm_url
         self.searxng_url = searxng_url
 
+        # Stage worker pools; external requests (not the LLM) share a per-host limiter
+        self.collect_concurrency = collect_concurrency
+        self.fetch_concurrency = fetch_concurrency
+        self.analyze_concurrency = analyze_concurrency
+        self.hosts = HostLimiter(per_host_concurrency, per_host_interval)
+        self._last_progress_save = 0.0
+
         # Job storage
         self.jobs: Dict[str, ResearchJob] = {}
         self.reports: Dict[str, ResearchReport] = {}
@@ -269,6 +391,10 @@ class AutonomousResearchPipeline:
                     job_data.pop("findings_count", None)
 
                     job = ResearchJob(**job_data)
+                    if job.status == JobStatus.RUNNING:
+                        # Interrupted by a restart; running it again resumes from its checkpoint
+                        job.status = JobStatus.PAUSED
+                        job.current_phase = "Interrupted"
                     self.jobs[job.job_id] = job
 
                 logger.info(f"Loaded {len(self.jobs)} research jobs")
@@ -299,6 +425,7 @@ class AutonomousResearchPipeline:
         run_once: bool = True,
         priority: JobPriority = JobPriority.NORMAL,
         max_duration_minutes: int = 60,
+        fetch_full_content: bool = False,
     ) -> ResearchJob:
         """Create a new research job."""
         job_id = str(uuid.uuid4())[:8]
@@ -323,6 +450,7 @@ class AutonomousResearchPipeline:
             run_once=run_once,
             priority=priority,
             max_duration_minutes=max_duration_minutes,
+            fetch_full_content=fetch_full_content,
         )
 
         self.jobs[job_id] = job
@@ -398,17 +526,46 @@ class AutonomousResearchPipeline:
     # Research Execution
     # =========================================================================
 
-    async def execute_job(self, job_id: str) -> ResearchJob:
-        """Execute a research job."""
+    def _http_client(self) -> "httpx.AsyncClient":
         import httpx
+        return httpx.AsyncClient(timeout=120.0)
+
+    def _checkpoint_path(self, job_id: str) -> Path:
+        return self.storage_path / "checkpoints" / f"{job_id}.jsonl"
+
+    @staticmethod
+    def _step_key(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def _save_progress(self, job: ResearchJob) -> None:
+        """Persist progress, at most once per PROGRESS_SAVE_INTERVAL."""
+        now = time.monotonic()
+        if now - self._last_progress_save >= PROGRESS_SAVE_INTERVAL:
+            self._last_progress_save = now
+            self._save_jobs()
 
+    async def execute_job(self, job_id: str) -> ResearchJob:
+        """
+        Execute a research job.
+
+        Sources are collected, fetched and analyzed as a streaming DAG: the
+        first items collected are analyzed while other sources are still
+        being searched. The first MAX_ANALYZED_ITEMS items to arrive are
+        analyzed, and findings are kept in source order. Every finished
+        collect/fetch/analyze/synthesize step is checkpointed until the job
+        completes, so running a failed or interrupted job again resumes it.
+        """
         job = self.jobs.get(job_id)
         if not job:
             raise ValueError(f"Job {job_id} not found")
 
+        checkpoint = StageCheckpoint(self._checkpoint_path(job_id))
         job.status = JobStatus.RUNNING
         job.started_at = datetime.utcnow()
         job.progress_percent = 0
+        job.sources_processed = 0
+        job.items_found = 0
+        job.resumed_steps = len(checkpoint)
         job.findings = []
         job.error = None
         self._save_jobs()
@@ -416,47 +573,90 @@ class AutonomousResearchPipeline:
         ACTIVE_RESEARCH_JOBS.inc()
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                # Phase 1: Source Collection
-                job.current_phase = "Collecting sources"
+            async with self._http_client() as client:
+                # Phases 1-3: Collection, fetching and analysis, streamed
+                job.current_phase = "Collecting and analyzing"
                 job.progress_percent = 10
                 self._save_jobs()
 
-                all_items = []
-                for i, source in enumerate(job.sources):
-                    items = await self._collect_from_source(client, source, job.topic)
-                    all_items.extend(items)
-                    job.sources_processed = i + 1
-                    job.progress_percent = 10 + int(30 * (i + 1) / len(job.sources))
-                    self._save_jobs()
-
-                job.items_found = len(all_items)
-
-                # Phase 2: Analysis
-                job.current_phase = "Analyzing content"
-                job.progress_percent = 45
-                self._save_jobs()
-
-                analyzed = []
-                for i, item in enumerate(all_items[:20]):  # Limit to 20 items
-                    analysis = await self._analyze_item(client, item, job.topic)
-                    if analysis:
-                        analyzed.append(analysis)
-                    job.progress_percent = 45 + int(35 * (i + 1) / min(len(all_items), 20))
-                    self._save_jobs()
-
-                job.findings = analyzed
-
-                # Phase 3: Synthesis
+                admitted = 0
+                analyzed = 0
+
+                def update_progress():
+                    collected = job.sources_processed / len(job.sources) if job.sources else 1
+                    job.progress_percent = 10 + int(30 * collected) + int(45 * analyzed / max(admitted, 1))
+                    self._save_progress(job)
+
+                async def collect(entry):
+                    nonlocal admitted
+                    index, source = entry
+                    key = f"{index}:{self._step_key(source.__dict__)}"
+                    items = checkpoint.get("collect", key)
+                    if items is None:
+                        items = await self._collect_from_source(client, source, job.topic)
+                        # Empty results are not recorded: a failed search is retried on resume
+                        if items:
+                            checkpoint.put("collect", key, items)
+                    job.sources_processed += 1
+                    job.items_found += len(items)
+                    outputs = []
+                    for position, item in enumerate(items):
+                        if admitted < MAX_ANALYZED_ITEMS:
+                            admitted += 1
+                            outputs.append(((index, position), item))
+                    update_progress()
+                    return outputs
+
+                async def fetch(entry):
+                    order, item = entry
+                    if not job.fetch_full_content or item.get("content") or not item.get("url"):
+                        return [entry]
+                    content = checkpoint.get("fetch", item["url"])
+                    if content is None:
+                        content = await self._fetch_url(client, item["url"])
+                        if content:
+                            checkpoint.put("fetch", item["url"], content)
+                    return [(order, {**item, "content": content} if content else item)]
+
+                async def analyze(entry):
+                    nonlocal analyzed
+                    order, item = entry
+                    key = self._step_key(item)
+                    analysis = checkpoint.get("analyze", key)
+                    if analysis is None:
+                        analysis = await self._analyze_item(client, dict(item), job.topic)
+                        # Only successful LLM analyses are recorded
+                        if analysis and "relevance_score" in analysis:
+                            checkpoint.put("analyze", key, analysis)
+                    analyzed += 1
+                    update_progress()
+                    return [(order, analysis)] if analysis else []
+
+                results = await run_stages(
+                    [
+                        Stage("collect", collect, self.collect_concurrency),
+                        Stage("fetch", fetch, self.fetch_concurrency),
+                        Stage("analyze", analyze, self.analyze_concurrency),
+                    ],
+                    list(enumerate(job.sources)),
+                )
+                job.findings = [analysis for _, analysis in sorted(results, key=lambda r: r[0])]
+
+                # Phase 4: Synthesis
                 job.current_phase = "Synthesizing insights"
                 job.progress_percent = 85
                 self._save_jobs()
 
-                synthesis = await self._synthesize_findings(client, job)
+                synthesis_key = self._step_key(job.findings)
+                synthesis = checkpoint.get("synthesize", synthesis_key)
+                if synthesis is None:
+                    synthesis = await self._synthesize_findings(client, job)
+                    if synthesis.get("key_insights"):
+                        checkpoint.put("synthesize", synthesis_key, synthesis)
                 job.key_insights = synthesis.get("key_insights", [])
                 job.action_items = synthesis.get("action_items", [])
 
-                # Phase 4: Report Generation
+                # Phase 5: Report Generation
                 job.current_phase = "Generating report"
                 job.progress_percent = 95
                 self._save_jobs()
@@ -471,9 +671,14 @@ class AutonomousResearchPipeline:
                 job.current_phase = "Complete"
                 job.run_count += 1
                 job.last_run = job.completed_at
+                checkpoint.clear()
 
                 RESEARCH_JOBS.labels(status="completed").inc()
-                logger.info(f"Research job {job_id} completed with {len(job.findings)} findings")
+                logger.info(
+                    f"Research job {job_id} completed with {len(job.findings)} findings in "
+                    f"{(job.completed_at - job.started_at).total_seconds():.1f}s "
+                    f"({job.resumed_steps} steps resumed from checkpoint)"
+                )
 
         except Exception as e:
             job.status = JobStatus.FAILED
@@ -527,14 +732,15 @@ class AutonomousResearchPipeline:
     ) -> List[Dict[str, Any]]:
         """Search the web using SearXNG."""
         try:
-            response = await client.get(
-                f"{self.searxng_url}/search",
-                params={
-                    "q": query,
-                    "format": "json",
-                    "categories": "general",
-                },
-            )
+            async with self.hosts.slot(self.searxng_url):
+                response = await client.get(
+                    f"{self.searxng_url}/search",
+                    params={
+                        "q": query,
+                        "format": "json",
+                        "categories": "general",
+                    },
+                )
 
             if response.status_code == 200:
                 data = response.json()
@@ -563,16 +769,17 @@ class AutonomousResearchPipeline:
         import re
 
         try:
-            response = await client.get(
-                "http://export.arxiv.org/api/query",
-                params={
-                    "search_query": f"all:{query}",
-                    "start": 0,
-                    "max_results": max_results,
-                    "sortBy": "lastUpdatedDate",
-                    "sortOrder": "descending",
-                },
-            )
+            async with self.hosts.slot("http://export.arxiv.org"):
+                response = await client.get(
+                    "http://export.arxiv.org/api/query",
+                    params={
+                        "search_query": f"all:{query}",
+                        "start": 0,
+                        "max_results": max_results,
+                        "sortBy": "lastUpdatedDate",
+                        "sortOrder": "descending",
+                    },
+                )
 
             if response.status_code == 200:
                 content = response.text
@@ -608,15 +815,16 @@ class AutonomousResearchPipeline:
     ) -> List[Dict[str, Any]]:
         """Search GitHub for repositories."""
         try:
-            response = await client.get(
-                "https://api.github.com/search/repositories",
-                params={
-                    "q": query,
-                    "sort": "updated",
-                    "per_page": max_results,
-                },
-                headers={"Accept": "application/vnd.github.v3+json"},
-            )
+            async with self.hosts.slot("https://api.github.com"):
+                response = await client.get(
+                    "https://api.github.com/search/repositories",
+                    params={
+                        "q": query,
+                        "sort": "updated",
+                        "per_page": max_results,
+                    },
+                    headers={"Accept": "application/vnd.github.v3+json"},
+                )
 
             if response.status_code == 200:
                 data = response.json()
@@ -646,7 +854,8 @@ class AutonomousResearchPipeline:
         import re
 
         try:
-            response = await client.get(url, follow_redirects=True)
+            async with self.hosts.slot(url):
+                response = await client.get(url, follow_redirects=True)
             if response.status_code == 200:
                 content = response.text
                 # Strip HTML
@@ -896,6 +1105,7 @@ def create_autonomous_research_router():
         run_once: bool = True
         priority: int = 1
         max_duration_minutes: int = 60
+        fetch_full_content: bool = False
 
     @router.get("/status")
     async def pipeline_status():
@@ -928,6 +1138,7 @@ def create_autonomous_research_router():
             run_once=request.run_once,
             priority=priority,
             max_duration_minutes=request.max_duration_minutes,
+            fetch_full_content=request.fetch_full_content,
         )
 
         return {
@@ -114,9 +114,6 @@ def get_latest_benchmark_results(limit: int = 10) -> List[Dict[str, Any]]:
         conn.close()
 
 
-# Initialize database on module load
-init_benchmark_db()
-
 
 class BenchmarkCategory(str, Enum):
     """Benchmark categories."""
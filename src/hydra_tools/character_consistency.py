@@ -27,6 +27,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 from .config import get_config
+from .similarity import cosine
 
 logger = logging.getLogger(__name__)
 
@@ -1419,60 +1420,44 @@ def create_character_router():
                         "status": "queued"
                     })
 
-        # Generate TTS for all dialogue lines
+        # Generate TTS for all dialogue lines (cached, deduplicated, concurrent)
         tts_results = []
         if request.generate_tts and tts_requests:
-            import aiohttp
-            import os
+            from .tts_synthesis import get_tts_service
 
-            kokoro_url = "http://192.168.1.244:8880/v1/audio/speech"
+            speed_map = {
+                "neutral": 1.0, "happy": 1.1, "sad": 0.9,
+                "angry": 1.2, "fearful": 1.15, "surprised": 1.1,
+                "pensive": 0.95, "determined": 1.0, "loving": 0.9
+            }
+            lines = [
+                {
+                    "text": dialogue["text"],
+                    "voice_id": dialogue.get("voice_id") or "af_sarah",
+                    "speed": speed_map.get(dialogue.get("emotion", "neutral"), 1.0),
+                    "model": "kokoro",
+                    "response_format": "wav",
+                    "output_path": dialogue["output_path"],
+                }
+                for dialogue in tts_requests
+            ]
+            batch = await get_tts_service().synthesize_batch(lines)
 
-            async with aiohttp.ClientSession() as session:
-                for dialogue in tts_requests:
-                    try:
-                        emotion = dialogue.get("emotion", "neutral")
-                        speed_map = {
-                            "neutral": 1.0, "happy": 1.1, "sad": 0.9,
-                            "angry": 1.2, "fearful": 1.15, "surprised": 1.1,
-                            "pensive": 0.95, "determined": 1.0, "loving": 0.9
-                        }
-                        speed = speed_map.get(emotion, 1.0)
-
-                        payload = {
-                            "model": "kokoro",
-                            "input": dialogue.get("text", ""),
-                            "voice": dialogue.get("voice_id", "af_sarah"),
-                            "speed": speed,
-                            "response_format": "wav"
-                        }
-
-                        async with session.post(kokoro_url, json=payload) as resp:
-                            if resp.status == 200:
-                                output_path = dialogue.get("output_path")
-                                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                                audio_data = await resp.read()
-                                with open(output_path, "wb") as f:
-                                    f.write(audio_data)
-
-                                tts_results.append({
-                                    "scene_id": dialogue.get("scene_id"),
-                                    "character": dialogue.get("character"),
-                                    "output_path": output_path,
-                                    "status": "completed"
-                                })
-                            else:
-                                tts_results.append({
-                                    "character": dialogue.get("character"),
-                                    "status": "failed",
-                                    "error": f"HTTP {resp.status}"
-                                })
-                    except Exception as e:
-                        tts_results.append({
-                            "character": dialogue.get("character"),
-                            "status": "failed",
-                            "error": str(e)
-                        })
+            for dialogue, result in zip(tts_requests, batch):
+                if result["status"] == "failed":
+                    tts_results.append({
+                        "character": dialogue.get("character"),
+                        "status": "failed",
+                        "error": result.get("error", "Synthesis failed")
+                    })
+                else:
+                    tts_results.append({
+                        "scene_id": dialogue.get("scene_id"),
+                        "character": dialogue.get("character"),
+                        "output_path": result["output_path"],
+                        "status": "completed",
+                        "cache": result["status"]
+                    })
 
         tts_successful = len([r for r in tts_results if r.get("status") == "completed"])
         tts_failed = len([r for r in tts_results if r.get("status") == "failed"])
@@ -1498,62 +1483,46 @@ def create_character_router():
         Generate TTS for a batch of dialogue lines.
 
         Each dialogue should have: character, text, emotion, voice_id, output_path
+
+        Identical lines are synthesized once and unchanged lines are served
+        from the TTS audio cache.
         """
-        import aiohttp
-        import asyncio
+        from .tts_synthesis import get_tts_service
+
+        speed_map = {
+            "neutral": 1.0, "happy": 1.1, "sad": 0.9,
+            "angry": 1.2, "fearful": 1.15, "surprised": 1.1,
+            "seductive": 0.85, "mysterious": 0.95
+        }
+        lines = [
+            {
+                "text": dialogue.get("text", ""),
+                "voice_id": dialogue.get("voice_id") or "af_sarah",
+                "speed": speed_map.get(dialogue.get("emotion", "neutral"), 1.0),
+                "model": "kokoro",
+                "response_format": "wav",
+                "output_path": dialogue.get("output_path", f"/tmp/tts_{i}.wav"),
+            }
+            for i, dialogue in enumerate(dialogues)
+        ]
+        batch = await get_tts_service().synthesize_batch(lines)
 
         results = []
-        kokoro_url = "http://192.168.1.244:8880/v1/audio/speech"
-
-        async with aiohttp.ClientSession() as session:
-            for dialogue in dialogues:
-                try:
-                    # Map emotion to speed adjustment
-                    emotion = dialogue.get("emotion", "neutral")
-                    speed_map = {
-                        "neutral": 1.0, "happy": 1.1, "sad": 0.9,
-                        "angry": 1.2, "fearful": 1.15, "surprised": 1.1,
-                        "seductive": 0.85, "mysterious": 0.95
-                    }
-                    speed = speed_map.get(emotion, 1.0)
-
-                    payload = {
-                        "model": "kokoro",
-                        "input": dialogue.get("text", ""),
-                        "voice": dialogue.get("voice_id", "af_sarah"),
-                        "speed": speed,
-                        "response_format": "wav"
-                    }
-
-                    async with session.post(kokoro_url, json=payload) as resp:
-                        if resp.status == 200:
-                            # Save audio to output path
-                            output_path = dialogue.get("output_path", f"/tmp/tts_{len(results)}.wav")
-                            import os
-                            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                            audio_data = await resp.read()
-                            with open(output_path, "wb") as f:
-                                f.write(audio_data)
-
-                            results.append({
-                                "character": dialogue.get("character"),
-                                "text": dialogue.get("text", "")[:50] + "...",
-                                "output_path": output_path,
-                                "status": "completed"
-                            })
-                        else:
-                            results.append({
-                                "character": dialogue.get("character"),
-                                "status": "failed",
-                                "error": f"HTTP {resp.status}"
-                            })
-                except Exception as e:
-                    results.append({
-                        "character": dialogue.get("character"),
-                        "status": "failed",
-                        "error": str(e)
-                    })
+        for dialogue, result in zip(dialogues, batch):
+            if result["status"] == "failed":
+                results.append({
+                    "character": dialogue.get("character"),
+                    "status": "failed",
+                    "error": result.get("error", "Synthesis failed")
+                })
+            else:
+                results.append({
+                    "character": dialogue.get("character"),
+                    "text": dialogue.get("text", "")[:50] + "...",
+                    "output_path": result["output_path"],
+                    "status": "completed",
+                    "cache": result["status"]
+                })
 
         return {
             "status": "completed",
@@ -1635,11 +1604,7 @@ def create_character_router():
                 hist1 = color_histogram(img_resized)
                 hist2 = color_histogram(ref_resized)
 
-                # Cosine similarity
-                dot = sum(a * b for a, b in zip(hist1, hist2))
-                norm1 = sum(a * a for a in hist1) ** 0.5
-                norm2 = sum(b * b for b in hist2) ** 0.5
-                consistency = dot / (norm1 * norm2) if norm1 * norm2 > 0 else 0
+                consistency = cosine(hist1, hist2)
 
                 results["consistency_score"] = round(consistency, 3)
 
@@ -3672,43 +3637,57 @@ init python:
             if not request.tts_enabled or not dialogue_items:
                 return {"skipped": True, "reason": "TTS disabled or no dialogue"}
 
-            from .tts_synthesis import TTSSynthesizer
-            synthesizer = TTSSynthesizer()
+            from .tts_synthesis import get_tts_service
+            service = get_tts_service()
 
             audio_dir = Path(chapter_dir) / "audio" / "dialogue"
             audio_dir.mkdir(parents=True, exist_ok=True)
+            manifest_path = Path(chapter_dir) / "metadata" / "tts_manifest.json"
 
-            success_count = 0
-            failed_count = 0
-
-            for i, item in enumerate(dialogue_items):
+            # Previous manifest records the cache key each file was written
+            # with, so unchanged lines are skipped without any synthesis.
+            previous_keys = {}
+            if request.skip_existing and manifest_path.exists():
                 try:
-                    filename = f"{i:04d}_{item['character']}_{item['emotion']}.wav"
-                    output_path = str(audio_dir / filename)
-
-                    # Check if exists
-                    if request.skip_existing and Path(output_path).exists():
-                        tts_results.append({"index": i, "status": "cached", "path": output_path})
-                        success_count += 1
-                        continue
-
-                    audio = synthesizer.synthesize(
-                        text=item["text"],
-                        character_name=item["character"],
-                        emotion=item["emotion"],
-                        output_path=output_path
-                    )
+                    with open(manifest_path) as f:
+                        previous = json.load(f)
+                    previous_keys = {
+                        r["path"]: r["cache_key"]
+                        for r in previous.get("results", [])
+                        if r.get("path") and r.get("cache_key")
+                    }
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable TTS manifest: {e}")
 
-                    if audio:
-                        tts_results.append({"index": i, "status": "generated", "path": output_path})
-                        success_count += 1
-                    else:
-                        tts_results.append({"index": i, "status": "failed", "error": "Synthesis returned None"})
-                        failed_count += 1
+            lines = [
+                {
+                    "text": item["text"],
+                    "character": item["character"],
+                    "emotion": item["emotion"],
+                    "output_path": str(audio_dir / f"{i:04d}_{item['character']}_{item['emotion']}.wav"),
+                }
+                for i, item in enumerate(dialogue_items)
+            ]
+            batch = await service.synthesize_batch(lines, previous_keys=previous_keys)
 
-                except Exception as e:
-                    tts_results.append({"index": i, "status": "failed", "error": str(e)})
+            success_count = 0
+            failed_count = 0
+            for result in batch:
+                if result["status"] == "failed":
+                    tts_results.append({
+                        "index": result["index"],
+                        "status": "failed",
+                        "error": result.get("error", "Synthesis returned None")
+                    })
                     failed_count += 1
+                else:
+                    tts_results.append({
+                        "index": result["index"],
+                        "status": result["status"],
+                        "path": result["output_path"],
+                        "cache_key": result["cache_key"]
+                    })
+                    success_count += 1
 
             # Save TTS manifest
             tts_manifest = {
@@ -3718,13 +3697,16 @@ init python:
                 "failed": failed_count,
                 "results": tts_results
             }
-            with open(Path(chapter_dir) / "metadata" / "tts_manifest.json", 'w') as f:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(manifest_path, 'w') as f:
                 json.dump(tts_manifest, f, indent=2)
 
             return {
                 "total_lines": len(dialogue_items),
                 "success": success_count,
                 "failed": failed_count,
+                "synthesized": len([r for r in batch if r["status"] == "generated"]),
+                "unchanged": len([r for r in batch if r["status"] == "unchanged"]),
                 "output_dir": str(audio_dir)
             }
 
@@ -3892,7 +3874,8 @@ init python:
             "chapter_number": request.chapter_number,
             "scenes_generated": len(parsed_scenes),
             "dialogue_lines": len(dialogue_items),
-            "tts_generated": len([r for r in tts_results if r.get("status") in ["generated", "cached"]]),
+            "tts_generated": len([r for r in tts_results if r.get("status") in ["generated", "cached", "unchanged"]]),
+            "tts_synthesized": len([r for r in tts_results if r.get("status") == "generated"]),
             "assets_queued": len(asset_results.get("character_assets_needed", [])) if asset_results else 0,
             "quality_passed": len([q for q in quality_scores if q.get("passed")]),
             "packaged": package_path is not None
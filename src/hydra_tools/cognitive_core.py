@@ -26,6 +26,7 @@ import json
 import logging
 import os
 import hashlib
+import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from enum import Enum
@@ -37,6 +38,9 @@ import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from hydra_tools.observation_diff import ChangeDetector
+from hydra_tools.service_bus import PERCEIVE_LATENCY, get_service_bus
+
 logger = logging.getLogger(__name__)
 
 
@@ -1001,6 +1005,7 @@ class CognitiveCore:
         self.memory = HybridMemoryInterface(api_base)
         self.executor = ActionExecutor(api_base)
         self.checkpoints = CheckpointManager()
+        self.change_detector = ChangeDetector()
 
         # State
         self._running = False
@@ -1027,6 +1032,7 @@ class CognitiveCore:
             "errors": 0,
             "last_cycle_at": None,
             "last_action_at": None,
+            "last_perceive_ms": None,
         }
 
         # History
@@ -1072,22 +1078,24 @@ class CognitiveCore:
     # =========================================================================
 
     async def perceive(self) -> SystemObservation:
-        """Gather comprehensive system state."""
+        """Gather comprehensive system state, querying every source concurrently."""
         self._state = CognitiveState.PERCEIVING
+        started = time.perf_counter()
+        bus = get_service_bus()
+
+        async def query(path: str, **params):
+            return await bus.query(path, base_url=self.api_base, **params)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Cluster health
+        async def get_cluster_health():
             try:
-                resp = await client.get(f"{self.api_base}/health")
-                cluster_health = resp.json() if resp.status_code == 200 else {"error": "unavailable"}
+                return await query("/health")
             except Exception as e:
-                cluster_health = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Container health
+        async def get_container_health():
             try:
-                resp = await client.get(f"{self.api_base}/container-health/")
-                container_data = resp.json() if resp.status_code == 200 else {}
-                container_health = {
+                container_data = await query("/container-health/")
+                return {
                     "total": container_data.get("summary", {}).get("total", 0),
                     "healthy": container_data.get("summary", {}).get("healthy", 0),
                     "unhealthy": [
@@ -1096,40 +1104,42 @@ class CognitiveCore:
                     ],
                 }
             except Exception as e:
-                container_health = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Inference health
+        async def get_inference_health():
             try:
-                resp = await client.get(f"{self.api_base}/diagnosis/inference")
-                inference_health = resp.json() if resp.status_code == 200 else {}
+                return await query("/diagnosis/inference")
             except Exception as e:
-                inference_health = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Resources
+        async def get_resource_status():
             try:
-                resp = await client.get(f"{self.api_base}/autonomous/resources")
-                resource_status = resp.json() if resp.status_code == 200 else {}
+                return await query("/autonomous/resources")
             except Exception as e:
-                resource_status = {"error": str(e)}
+                return {"error": str(e)}
 
-            # Recent events from memory
+        async def get_recent_events():
             try:
-                resp = await client.get(f"{self.api_base}/memory/recent?limit=10")
-                recent_events = resp.json().get("memories", []) if resp.status_code == 200 else []
+                return (await query("/memory/recent", limit=10)).get("memories", [])
             except Exception:
-                recent_events = []
+                return []
 
-            # Pending tasks
+        async def get_pending_tasks():
             try:
-                resp = await client.get(f"{self.api_base}/autonomous/queue")
-                queue_data = resp.json() if resp.status_code == 200 else {}
-                pending_tasks = queue_data.get("pending", [])
+                return await query("/autonomous/queue", status="pending")
             except Exception:
-                pending_tasks = []
+                return []
 
         # Retrieve relevant memory context
         context_query = "What are the most important things to know about current system state and recent issues?"
-        memory_context = await self.memory.retrieve_context(context_query, limit=5)
+
+        (
+            cluster_health, container_health, inference_health, resource_status,
+            recent_events, pending_tasks, memory_context,
+        ) = await asyncio.gather(
+            get_cluster_health(), get_container_health(), get_inference_health(), get_resource_status(),
+            get_recent_events(), get_pending_tasks(), self.memory.retrieve_context(context_query, limit=5),
+        )
 
         observation = SystemObservation(
             timestamp=datetime.utcnow(),
@@ -1144,22 +1154,52 @@ class CognitiveCore:
         )
 
         self._current_observation = observation
+        elapsed = time.perf_counter() - started
+        PERCEIVE_LATENCY.labels(loop="cognitive").observe(elapsed)
+        self._stats["last_perceive_ms"] = round(elapsed * 1000, 1)
         return observation
 
     # =========================================================================
     # Reason
     # =========================================================================
 
-    async def reason(self, observation: SystemObservation) -> Dict[str, Any]:
-        """Use LLM to analyze state and decide actions."""
+    async def reason(self, observation: SystemObservation, force: bool = False) -> Dict[str, Any]:
+        """
+        Use LLM to analyze state and decide actions.
+
+        Observations are diffed against the last one reasoned about: without a
+        significant change the LLM call is skipped, answered from the decision
+        cache, or made with the cheap fallback model (see observation_diff).
+        """
         self._state = CognitiveState.REASONING
 
-        decision = await self.llm.reason(observation, model=self.model)
+        assessment = self.change_detector.assess(observation, force=force)
+        if assessment.outcome == "skip":
+            decision = {
+                "analysis": "No significant change since the last reasoned observation",
+                "priority": "low",
+                "action_needed": False,
+                "reasoning": assessment.reason,
+                "actions": [],
+                "learning": "",
+                "skipped": True,
+            }
+            self.change_detector.record_avoided(assessment, self.model)
+        elif assessment.outcome == "cached":
+            # The learning was stored when the decision was first made
+            decision = {**self.change_detector.cached_decision(assessment), "learning": "", "cached": True}
+            self.change_detector.record_avoided(assessment, self.model)
+        else:
+            model = self.model if assessment.outcome == "full" else self.llm.fallback_model
+            started = time.perf_counter()
+            decision = await self.llm.reason(observation, model=model)
+            self.change_detector.record(assessment, decision, model, time.perf_counter() - started, self.model)
 
         # Store decision in history
         self._decision_history.append({
             "timestamp": datetime.utcnow().isoformat(),
             "decision": decision,
+            "change_detection": assessment.to_dict(),
         })
 
         # Trim history
@@ -1389,6 +1429,7 @@ class CognitiveCore:
             "model": self.model,
             "loop_interval_seconds": self.loop_interval,
             "stats": self._stats,
+            "change_detection": self.change_detector.get_stats(),
             "current_observation_age_seconds": (
                 (datetime.utcnow() - self._current_observation.timestamp).total_seconds()
                 if self._current_observation else None
@@ -1408,7 +1449,7 @@ class CognitiveCore:
         try:
             self._step_number += 1
             observation = await self.perceive()
-            decision = await self.reason(observation)
+            decision = await self.reason(observation, force=True)
             plan = await self.plan(decision)
 
             results = []
@@ -1524,6 +1565,25 @@ def create_cognitive_router() -> APIRouter:
             "checkpoints": [cp.to_dict() for cp in checkpoints[-limit:]],
         }
 
+    @router.get("/change-detection")
+    async def get_change_detection():
+        """Get reasoning outcomes (full, cheap, cached, skipped), GPU time saved and thresholds."""
+        core = get_cognitive_core()
+        return core.change_detector.get_stats()
+
+    @router.put("/change-detection")
+    async def update_change_detection(thresholds: Dict[str, Any]):
+        """Update significance thresholds, e.g. {"queue_depth_delta": 10} or {"enabled": false}."""
+        core = get_cognitive_core()
+        thresholds = dict(thresholds)
+        if "enabled" in thresholds:
+            core.change_detector.enabled = bool(thresholds.pop("enabled"))
+        try:
+            core.change_detector.thresholds.update(thresholds)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return core.change_detector.get_stats()
+
     @router.post("/config")
     async def update_config(model: Optional[str] = None, loop_interval: Optional[int] = None):
         """Update cognitive core configuration."""
@@ -9,19 +9,26 @@ autonomous operation. It provides:
 - Self-improvement guardrails
 
 The constitution is loaded from CONSTITUTION.yaml and cannot be modified
-by any autonomous process.
+by any autonomous process. On load it is compiled into a decision table
+indexed by operation type, so a check only looks at the constraints that
+can apply to that operation. Edits to the file are picked up without a
+restart, and audit entries are written by a background thread.
 """
 
 import yaml
 import os
 import json
 import logging
+import threading
+import time
+import atexit
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable, Deque, FrozenSet
 from enum import Enum
 from dataclasses import dataclass, field, asdict
-from functools import wraps
+from functools import lru_cache, wraps
 import hashlib
 
 # Configure logging
@@ -52,15 +59,308 @@ class AuditEntry:
     rollback_available: bool = False
     details: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(frozen=True)
 class ConstitutionalCheck:
-    """Result of a constitutional constraint check"""
+    """Result of a constitutional constraint check (shared between calls, so read-only)"""
     allowed: bool
     enforcement_level: EnforcementLevel
     constraint_id: Optional[str] = None
     constraint_rule: Optional[str] = None
     message: str = ""
 
+# =============================================================================
+# Compiled Constitution
+# =============================================================================
+
+@dataclass(frozen=True)
+class ConstraintMatcher:
+    """
+    How a constraint ID is recognised in an operation.
+
+    ``target`` predicates only look at the target resource, so their
+    decisions can be cached; ``details`` predicates need the operation
+    details and run on every check.
+    """
+    operation_types: FrozenSet[str]
+    target: Optional[Callable[[str], bool]] = None
+    details: Optional[Callable[[Optional[Dict[str, Any]]], bool]] = None
+
+
+# Constraint IDs the enforcer knows how to match. A constraint in the
+# constitution without an entry here can never block anything.
+CONSTRAINT_MATCHERS: Dict[str, ConstraintMatcher] = {
+    "DATA-001": ConstraintMatcher(frozenset({"database_delete"}), target=lambda t: "database" in t.lower()),
+    "DATA-002": ConstraintMatcher(frozenset({"table_drop", "collection_drop"})),
+    "DATA-003": ConstraintMatcher(
+        frozenset({"database_delete", "table_drop"}),
+        details=lambda d: not (d or {}).get("backup_created"),
+    ),
+    "SEC-001": ConstraintMatcher(frozenset({"auth_disable"})),
+    "SEC-002": ConstraintMatcher(frozenset({"secret_expose"})),
+    "SEC-003": ConstraintMatcher(frozenset({"firewall_modify"}), details=lambda d: "allow_all" in str(d)),
+    "INFRA-001": ConstraintMatcher(frozenset({"network_modify"})),
+    "INFRA-002": ConstraintMatcher(frozenset({"nixos_delete"})),
+    "AUTO-001": ConstraintMatcher(
+        frozenset({"file_modify", "file_delete"}),
+        target=lambda t: t == "CONSTITUTION.yaml",
+    ),
+    "GIT-001": ConstraintMatcher(frozenset({"git_force_push"})),
+    "GIT-002": ConstraintMatcher(frozenset({"git_commit"}), details=lambda d: "secret" in str(d).lower()),
+}
+
+DEFAULT_ALLOWED = ConstitutionalCheck(
+    allowed=True,
+    enforcement_level=EnforcementLevel.AUDIT_ONLY,
+    message="Operation allowed (not explicitly constrained)"
+)
+
+
+@dataclass(frozen=True)
+class _CompiledConstraint:
+    constraint_id: str
+    matcher: ConstraintMatcher
+    decision: ConstitutionalCheck
+
+
+class CompiledConstitution:
+    """
+    Decision table built from a constitution.
+
+    Immutable constraints are indexed by the operation types their matcher
+    covers, in file order (first match wins). Supervised and autonomous
+    operations are folded into a per-operation fallthrough decision.
+    Operations whose constraints only look at the target resource are
+    answered from an LRU cache.
+    """
+
+    def __init__(self, constitution: Dict[str, Any], cache_size: int = 4096):
+        self.issues: List[str] = []
+        self.table: Dict[str, Tuple[_CompiledConstraint, ...]] = {}
+        self.fallthrough: Dict[str, ConstitutionalCheck] = {}
+        self._compile_constraints(constitution.get("immutable_constraints") or {})
+        self._compile_fallthrough(constitution)
+        self._compile_self_improvement(constitution.get("self_improvement") or {})
+        self._detail_free = {
+            op for op, entries in self.table.items()
+            if all(entry.matcher.details is None for entry in entries)
+        }
+        self._decide_cached = lru_cache(maxsize=cache_size)(self._scan_target)
+
+    def _compile_constraints(self, immutable: Dict[str, Any]) -> None:
+        table: Dict[str, List[_CompiledConstraint]] = {}
+        seen = set()
+        for category, constraints in immutable.items():
+            if not isinstance(constraints, list):
+                self.issues.append(f"Category {category!r} is not a list of constraints; ignored")
+                continue
+            for constraint in constraints:
+                constraint_id = constraint.get("id") if isinstance(constraint, dict) else None
+                if not constraint_id:
+                    self.issues.append(f"Constraint without an id in {category!r}; ignored")
+                    continue
+                if constraint_id in seen:
+                    self.issues.append(f"Duplicate constraint id {constraint_id}; later entry ignored")
+                    continue
+                seen.add(constraint_id)
+
+                try:
+                    enforcement = EnforcementLevel(constraint.get("enforcement", "hard_block"))
+                except ValueError:
+                    self.issues.append(
+                        f"{constraint_id}: unknown enforcement {constraint.get('enforcement')!r}; using hard_block"
+                    )
+                    enforcement = EnforcementLevel.HARD_BLOCK
+
+                matcher = CONSTRAINT_MATCHERS.get(constraint_id)
+                if matcher is None:
+                    self.issues.append(
+                        f"{constraint_id}: no matcher for this constraint, so it can never match "
+                        f"({constraint.get('rule', '')})"
+                    )
+                    continue
+
+                entry = _CompiledConstraint(
+                    constraint_id=constraint_id,
+                    matcher=matcher,
+                    decision=ConstitutionalCheck(
+                        allowed=(enforcement == EnforcementLevel.AUDIT_ONLY),
+                        enforcement_level=enforcement,
+                        constraint_id=constraint_id,
+                        constraint_rule=constraint.get("rule"),
+                        message=f"Blocked by constraint {constraint_id}: {constraint.get('rule')}"
+                    ),
+                )
+                for operation_type in matcher.operation_types:
+                    table.setdefault(operation_type, []).append(entry)
+        self.table = {op: tuple(entries) for op, entries in table.items()}
+
+    def _compile_fallthrough(self, constitution: Dict[str, Any]) -> None:
+        autonomous = constitution.get("autonomous_operations") or {}
+        for operation_type in autonomous.get("allowed") or []:
+            self.fallthrough[operation_type] = ConstitutionalCheck(
+                allowed=True,
+                enforcement_level=EnforcementLevel.AUDIT_ONLY,
+                message="Autonomous operation allowed"
+            )
+        # Supervised entries take precedence over the autonomous list; the
+        # first entry for an operation wins
+        for op in reversed(constitution.get("supervised_operations") or []):
+            if not isinstance(op, dict) or not op.get("operation"):
+                self.issues.append(f"Supervised operation without an operation name: {op!r}")
+                continue
+            self.fallthrough[op["operation"]] = ConstitutionalCheck(
+                allowed=True,
+                enforcement_level=EnforcementLevel.AUDIT_ONLY,
+                message=f"Supervised operation: {op.get('requires', 'audit_log')}"
+            )
+
+    def _compile_self_improvement(self, self_improvement: Dict[str, Any]) -> None:
+        self.forbidden_paths = [
+            (pattern, pattern.replace("*", ""))
+            for pattern in self_improvement.get("forbidden_modifications") or []
+        ]
+        self.allowed_path_bases = [
+            pattern.replace("**", "").replace("*", "")
+            for pattern in self_improvement.get("allowed_modifications") or []
+        ]
+        self.sandbox_required = self_improvement.get("sandbox_required", True)
+
+    def _scan_target(self, operation_type: str, target_resource: str) -> ConstitutionalCheck:
+        return self._scan(operation_type, target_resource, None)
+
+    def _scan(
+        self,
+        operation_type: str,
+        target_resource: str,
+        details: Optional[Dict[str, Any]],
+    ) -> ConstitutionalCheck:
+        for entry in self.table[operation_type]:
+            matcher = entry.matcher
+            if matcher.target is not None and not matcher.target(target_resource):
+                continue
+            if matcher.details is not None and not matcher.details(details):
+                continue
+            return entry.decision
+        return self.fallthrough.get(operation_type, DEFAULT_ALLOWED)
+
+    def decide(
+        self,
+        operation_type: str,
+        target_resource: str,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> ConstitutionalCheck:
+        if operation_type not in self.table:
+            return self.fallthrough.get(operation_type, DEFAULT_ALLOWED)
+        if operation_type in self._detail_free:
+            return self._decide_cached(operation_type, target_resource)
+        return self._scan(operation_type, target_resource, details)
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self._decide_cached.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+# =============================================================================
+# Audit Writer
+# =============================================================================
+
+class AuditLogWriter:
+    """
+    Append-only audit log written by a background thread.
+
+    log_action queues a serialized entry and returns. The writer takes
+    everything queued (waiting ``group_window`` seconds for stragglers),
+    writes it, and flushes and fsyncs once per batch, so a burst of entries
+    shares one fsync. Entries are never dropped: when ``capacity`` entries
+    are waiting, callers block until the writer catches up.
+    """
+
+    def __init__(self, path: Path, group_window: float = 0.005,
+                 max_batch: int = 1024, capacity: int = 10000):
+        self.path = path
+        self.group_window = group_window
+        self.max_batch = max_batch
+        self.capacity = capacity
+        self._pending: Deque[str] = deque()
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.errors = 0
+
+    def submit(self, line: str) -> None:
+        with self._cond:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="hydra-audit-writer", daemon=True)
+                self._thread.start()
+            while len(self._pending) >= self.capacity and not self._closed:
+                self._cond.wait(0.1)
+            self._pending.append(line)
+            self._submitted += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every entry submitted so far is on disk."""
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "written": self._written,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+    def _run(self) -> None:
+        f = None
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending and self._closed:
+                    break
+            if self.group_window and len(self._pending) < self.max_batch:
+                # Let concurrent writers join this batch's fsync
+                time.sleep(self.group_window)
+            with self._cond:
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch))]
+
+            try:
+                if f is None:
+                    f = open(self.path, "a", encoding="utf-8")
+                f.write("".join(batch))
+                f.flush()
+                os.fsync(f.fileno())
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Failed to write audit log: {e}")
+                if f is not None:
+                    try:
+                        f.close()
+                    except OSError:
+                        pass
+                    f = None
+
+            with self._cond:
+                self._written += len(batch)
+                self.batches += 1
+                self._cond.notify_all()
+
+        if f is not None:
+            f.close()
+
+
 class ConstitutionalEnforcer:
     """
     Enforces Hydra's constitutional constraints.
@@ -89,30 +389,92 @@ class ConstitutionalEnforcer:
 
         self.constitution_path = constitution_path
         self.constitution: Dict[str, Any] = {}
+        self.compiled: CompiledConstitution = CompiledConstitution({})
         self.audit_log: List[AuditEntry] = []
         self.audit_file: Optional[Path] = None
+        self.audit_writer: Optional[AuditLogWriter] = None
         self._constitution_hash: Optional[str] = None
         self._emergency_stop = False
 
+        # Hot reload: the file's (mtime, size) is checked at most this often
+        self.reload_interval = float(os.getenv("HYDRA_CONSTITUTION_RELOAD_SECONDS", "5"))
+        self._file_signature: Optional[Tuple[int, int]] = None
+        self._next_reload_check = 0.0
+        self._reload_lock = threading.Lock()
+        self.reloads = 0
+
         self._load_constitution()
         self._setup_audit_log()
 
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.constitution_path)
+            return (st.st_mtime_ns, st.st_size)
+        except (OSError, TypeError):
+            return None
+
+    def _read_constitution(self) -> Tuple[Dict[str, Any], str]:
+        with open(self.constitution_path, 'r') as f:
+            content = f.read()
+        constitution = yaml.safe_load(content)
+        if not isinstance(constitution, dict):
+            raise ValueError("constitution is not a mapping")
+        return constitution, hashlib.sha256(content.encode()).hexdigest()
+
+    def _apply(self, constitution: Dict[str, Any], content_hash: Optional[str]) -> None:
+        compiled = CompiledConstitution(constitution)
+        for issue in compiled.issues:
+            logger.warning(f"Constitution: {issue}")
+        # Swap both at once; checks in flight keep using the old table
+        self.constitution, self.compiled = constitution, compiled
+        self._constitution_hash = content_hash
+
     def _load_constitution(self) -> None:
         """Load constitution from YAML file"""
-        if not self.constitution_path or not os.path.exists(self.constitution_path):
+        self._file_signature = self._file_stat()
+        if not self.constitution_path or self._file_signature is None:
             logger.warning(f"Constitution file not found at {self.constitution_path}")
-            self.constitution = self._default_constitution()
+            self._apply(self._default_constitution(), None)
             return
 
         try:
-            with open(self.constitution_path, 'r') as f:
-                content = f.read()
-                self._constitution_hash = hashlib.sha256(content.encode()).hexdigest()
-                self.constitution = yaml.safe_load(content)
+            self._apply(*self._read_constitution())
             logger.info(f"Loaded constitution from {self.constitution_path}")
         except Exception as e:
             logger.error(f"Failed to load constitution: {e}")
-            self.constitution = self._default_constitution()
+            self._apply(self._default_constitution(), None)
+
+    def reload(self) -> bool:
+        """
+        Reload the constitution if the file changed since it was loaded.
+
+        A file that fails to parse leaves the current constitution in force.
+        Returns True if a new constitution was applied.
+        """
+        with self._reload_lock:
+            signature = self._file_stat()
+            if signature is None or signature == self._file_signature:
+                return False
+            self._file_signature = signature
+            old_hash = self._constitution_hash
+            try:
+                constitution, content_hash = self._read_constitution()
+            except Exception as e:
+                logger.error(f"Constitution changed but failed to load, keeping current: {e}")
+                return False
+            if content_hash == old_hash:
+                return False
+            self._apply(constitution, content_hash)
+            self.reloads += 1
+
+        logger.warning(f"Constitution reloaded from {self.constitution_path} ({old_hash} -> {content_hash})")
+        self.log_action(
+            operation_type="constitution_reload",
+            target_resource=str(self.constitution_path),
+            actor="system",
+            details={"previous_hash": old_hash, "hash": content_hash},
+        )
+        return True
 
     def _default_constitution(self) -> Dict[str, Any]:
         """Return minimal default constitution if file not found"""
@@ -138,6 +500,7 @@ class ConstitutionalEnforcer:
 
         self.audit_file = Path(log_location)
         self.audit_file.parent.mkdir(parents=True, exist_ok=True)
+        self.audit_writer = AuditLogWriter(self.audit_file)
 
     def check_operation(
         self,
@@ -163,78 +526,13 @@ class ConstitutionalEnforcer:
                 message="Emergency stop is active. All autonomous operations halted."
             )
 
-        # Check immutable constraints
-        immutable = self.constitution.get("immutable_constraints", {})
+        now = time.monotonic()
+        if now >= self._next_reload_check and self.constitution_path:
+            self._next_reload_check = now + self.reload_interval
+            self.reload()
 
-        for category, constraints in immutable.items():
-            if not isinstance(constraints, list):
-                continue
-            for constraint in constraints:
-                if self._constraint_matches(constraint, operation_type, target_resource, details):
-                    enforcement = EnforcementLevel(constraint.get("enforcement", "hard_block"))
-                    return ConstitutionalCheck(
-                        allowed=(enforcement == EnforcementLevel.AUDIT_ONLY),
-                        enforcement_level=enforcement,
-                        constraint_id=constraint.get("id"),
-                        constraint_rule=constraint.get("rule"),
-                        message=f"Blocked by constraint {constraint.get('id')}: {constraint.get('rule')}"
-                    )
-
-        # Check if operation is in supervised list
-        supervised = self.constitution.get("supervised_operations", [])
-        for op in supervised:
-            if op.get("operation") == operation_type:
-                return ConstitutionalCheck(
-                    allowed=True,
-                    enforcement_level=EnforcementLevel.AUDIT_ONLY,
-                    message=f"Supervised operation: {op.get('requires', 'audit_log')}"
-                )
-
-        # Check if operation is in autonomous allowed list
-        autonomous = self.constitution.get("autonomous_operations", {})
-        allowed_ops = autonomous.get("allowed", [])
-
-        if operation_type in allowed_ops:
-            return ConstitutionalCheck(
-                allowed=True,
-                enforcement_level=EnforcementLevel.AUDIT_ONLY,
-                message="Autonomous operation allowed"
-            )
-
-        # Default: allow with audit
-        return ConstitutionalCheck(
-            allowed=True,
-            enforcement_level=EnforcementLevel.AUDIT_ONLY,
-            message="Operation allowed (not explicitly constrained)"
-        )
-
-    def _constraint_matches(
-        self,
-        constraint: Dict[str, Any],
-        operation_type: str,
-        target_resource: str,
-        details: Optional[Dict[str, Any]]
-    ) -> bool:
-        """Check if a constraint matches the operation"""
-        rule = constraint.get("rule", "").lower()
-        constraint_id = constraint.get("id", "")
-
-        # Pattern matching for common constraint types
-        patterns = {
-            "DATA-001": operation_type == "database_delete" and "database" in target_resource.lower(),
-            "DATA-002": operation_type in ["table_drop", "collection_drop"],
-            "DATA-003": operation_type in ["database_delete", "table_drop"] and not (details or {}).get("backup_created"),
-            "SEC-001": operation_type == "auth_disable",
-            "SEC-002": operation_type == "secret_expose",
-            "SEC-003": operation_type == "firewall_modify" and "allow_all" in str(details),
-            "INFRA-001": operation_type == "network_modify",
-            "INFRA-002": operation_type == "nixos_delete",
-            "AUTO-001": target_resource == "CONSTITUTION.yaml" and operation_type in ["file_modify", "file_delete"],
-            "GIT-001": operation_type == "git_force_push",
-            "GIT-002": operation_type == "git_commit" and "secret" in str(details).lower(),
-        }
-
-        return patterns.get(constraint_id, False)
+        # Immutable constraints first, then supervised, then autonomous
+        return self.compiled.decide(operation_type, target_resource, details)
 
     def log_action(
         self,
@@ -277,13 +575,13 @@ class ConstitutionalEnforcer:
 
         self.audit_log.append(entry)
 
-        # Persist to file
-        if self.audit_file:
+        # Persist to file (serialized now, written by the audit writer thread)
+        if self.audit_writer:
             try:
-                with open(self.audit_file, 'a') as f:
-                    f.write(json.dumps(asdict(entry)) + "\n")
+                # Fields are flat apart from details, so skip asdict()'s deep copy
+                self.audit_writer.submit(json.dumps(entry.__dict__, default=str) + "\n")
             except Exception as e:
-                logger.error(f"Failed to write audit log: {e}")
+                logger.error(f"Failed to queue audit log entry: {e}")
 
         # Check if we should alert
         if result == "blocked":
@@ -364,12 +662,11 @@ class ConstitutionalEnforcer:
         Returns:
             ConstitutionalCheck result
         """
-        self_improvement = self.constitution.get("self_improvement", {})
+        compiled = self.compiled
 
         # Check forbidden paths
-        forbidden = self_improvement.get("forbidden_modifications", [])
-        for pattern in forbidden:
-            if pattern.replace("*", "") in file_path:
+        for pattern, pattern_base in compiled.forbidden_paths:
+            if pattern_base in file_path:
                 return ConstitutionalCheck(
                     allowed=False,
                     enforcement_level=EnforcementLevel.HARD_BLOCK,
@@ -379,13 +676,8 @@ class ConstitutionalEnforcer:
                 )
 
         # Check allowed paths
-        allowed = self_improvement.get("allowed_modifications", [])
-        is_allowed = False
-        for pattern in allowed:
-            pattern_base = pattern.replace("**", "").replace("*", "")
-            if pattern_base in file_path:
-                is_allowed = True
-                break
+        allowed = compiled.allowed_path_bases
+        is_allowed = any(pattern_base in file_path for pattern_base in allowed)
 
         if not is_allowed and allowed:  # Only enforce if allowed list exists
             return ConstitutionalCheck(
@@ -397,7 +689,7 @@ class ConstitutionalEnforcer:
             )
 
         # Check if sandbox is required
-        if self_improvement.get("sandbox_required", True):
+        if compiled.sandbox_required:
             return ConstitutionalCheck(
                 allowed=True,
                 enforcement_level=EnforcementLevel.AUDIT_ONLY,
@@ -419,6 +711,7 @@ def get_enforcer() -> ConstitutionalEnforcer:
     global _enforcer
     if _enforcer is None:
         _enforcer = ConstitutionalEnforcer()
+        atexit.register(_enforcer.audit_writer.close)
     return _enforcer
 
 def constitutional_check(operation_type: str):
@@ -499,7 +792,11 @@ def create_constitution_router():
             "hash": enforcer.get_constitution_hash(),
             "integrity_valid": enforcer.verify_constitution_integrity(),
             "emergency_stop_active": enforcer._emergency_stop,
-            "audit_entries": len(enforcer.audit_log)
+            "audit_entries": len(enforcer.audit_log),
+            "audit_writer": enforcer.audit_writer.stats() if enforcer.audit_writer else None,
+            "reloads": enforcer.reloads,
+            "validation_issues": enforcer.compiled.issues,
+            "decision_cache": enforcer.compiled.cache_info(),
         }
 
     @router.post("/check")
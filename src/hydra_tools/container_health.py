@@ -27,6 +27,8 @@ from pydantic import BaseModel, Field
 from prometheus_client import Gauge, Counter, generate_latest, CONTENT_TYPE_LATEST
 from fastapi.responses import Response
 
+from hydra_tools.service_bus import provides
+
 logger = logging.getLogger("container_health")
 
 # =============================================================================
@@ -179,9 +181,6 @@ def get_remediation_stats() -> dict:
     }
 
 
-# Initialize audit database on module load
-init_audit_db()
-
 
 class HealthStatus(str, Enum):
     HEALTHY = "healthy"
@@ -423,6 +422,7 @@ def create_container_health_router() -> APIRouter:
 
     @router.get("")
     @router.get("/")
+    @provides("/container-health/")
     async def container_health_summary():
         """Get container health summary (same as /check-all)."""
         results = await _monitor.check_all()
@@ -16,6 +16,8 @@ import asyncio
 import json
 import logging
 import os
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -111,19 +113,97 @@ class CostSummary:
     avg_cost_per_request: float
 
 
+# =============================================================================
+# Ingestion and Rollup Settings
+# =============================================================================
+
+# Seconds between background flushes of buffered usage records
+FLUSH_INTERVAL = float(os.getenv("HYDRA_COST_FLUSH_INTERVAL", "1.0"))
+
+# Buffered records that trigger an early flush
+FLUSH_BATCH = int(os.getenv("HYDRA_COST_FLUSH_BATCH", "500"))
+
+# Buffered records at which record_usage flushes inline instead of waiting
+BUFFER_MAX = int(os.getenv("HYDRA_COST_BUFFER_MAX", "20000"))
+
+# Raw rows and minute rollups older than this are compacted away; hour and
+# day rollups are kept
+RAW_RETENTION_DAYS = int(os.getenv("HYDRA_COST_RAW_RETENTION_DAYS", "30"))
+MINUTE_RETENTION_DAYS = int(os.getenv("HYDRA_COST_MINUTE_RETENTION_DAYS", "90"))
+
+# Seconds between retention passes of the flush loop
+COMPACT_INTERVAL = 3600
+
+# Rollup table, bucket width and ISO timestamp prefix length naming the bucket,
+# coarsest first. Buckets are UTC, like the raw timestamps.
+ROLLUPS = (
+    ("usage_day", timedelta(days=1), 10),      # 2025-12-19
+    ("usage_hour", timedelta(hours=1), 13),    # 2025-12-19T10
+    ("usage_minute", timedelta(minutes=1), 16),  # 2025-12-19T10:42
+)
+
+
+def _floor(moment: datetime, width: timedelta) -> datetime:
+    return datetime.min + ((moment - datetime.min) // width) * width
+
+
+def _ceil(moment: datetime, width: timedelta) -> datetime:
+    floor = _floor(moment, width)
+    return floor if floor == moment else floor + width
+
+
+def _plan_range(start: datetime, end: datetime, levels=ROLLUPS) -> List[tuple]:
+    """
+    Split [start, end) into (table, prefix length, start, end) segments,
+    using the coarsest rollup each part is aligned to and raw rows for
+    whatever is left at sub-minute edges.
+    """
+    if start >= end:
+        return []
+    if not levels:
+        return [("token_usage", None, start, end)]
+    table, width, prefix = levels[0]
+    aligned_start, aligned_end = _ceil(start, width), _floor(end, width)
+    if aligned_start >= aligned_end:
+        return _plan_range(start, end, levels[1:])
+    return (
+        _plan_range(start, aligned_start, levels[1:])
+        + [(table, prefix, aligned_start, aligned_end)]
+        + _plan_range(aligned_end, end, levels[1:])
+    )
+
+
 class CostTracker:
     """
     Tracks and analyzes inference costs across the Hydra system.
+
+    record_usage only buffers the record. A background task (started on
+    first use inside an event loop) writes buffered records in one
+    transaction per flush over a single WAL-mode connection, and folds
+    them into minute/hour/day rollup tables that summaries read from.
+    Reads flush first, so they always include everything recorded; the
+    API endpoints run them in a worker thread, off the event loop.
     """
 
     def __init__(self, db_path: str = "/mnt/user/appdata/hydra-dev/data/cost_tracking.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._buffer: List[TokenUsage] = []
+        self._buffer_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_wanted: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_compaction = 0.0
+        self.stats = {"flushes": 0, "flushed": 0, "inline_flushes": 0, "compacted": 0}
         self._init_db()
 
     def _init_db(self):
         """Initialize SQLite database for cost tracking."""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -149,8 +229,42 @@ class CostTracker:
             CREATE INDEX IF NOT EXISTS idx_model ON token_usage(model)
         """)
 
+        # agent is '' rather than NULL in rollups so it can be part of the key
+        for table, _, _ in ROLLUPS:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    bucket TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    agent TEXT NOT NULL,
+                    requests INTEGER NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    cost_usd REAL NOT NULL,
+                    PRIMARY KEY (bucket, model, provider, agent)
+                ) WITHOUT ROWID
+            """)
+
         conn.commit()
-        conn.close()
+        self._backfill_rollups()
+
+    def _backfill_rollups(self):
+        """Build rollups from raw rows written before rollups existed."""
+        conn = self._conn
+        if conn.execute("SELECT 1 FROM usage_day LIMIT 1").fetchone():
+            return
+        if not conn.execute("SELECT 1 FROM token_usage LIMIT 1").fetchone():
+            return
+        with conn:
+            for table, _, prefix in ROLLUPS:
+                conn.execute(f"""
+                    INSERT INTO {table}
+                    SELECT substr(timestamp, 1, {prefix}), model, provider, COALESCE(agent, ''),
+                           COUNT(*), SUM(input_tokens), SUM(output_tokens), SUM(cost_usd)
+                    FROM token_usage
+                    GROUP BY 1, 2, 3, 4
+                """)
+        logger.info("Built cost rollups from existing usage records")
 
     def calculate_cost(
         self,
@@ -179,8 +293,9 @@ class CostTracker:
         agent: Optional[str] = None,
         task_type: Optional[str] = None,
         request_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
     ) -> TokenUsage:
-        """Record token usage for a request."""
+        """Record token usage for a request (UTC ``timestamp``, default now)."""
         # Determine provider
         model_lower = model.lower().replace("/", "-").replace("_", "-")
         pricing = MODEL_PRICING.get(model_lower, MODEL_PRICING["default"])
@@ -199,8 +314,10 @@ class CostTracker:
             task_type=task_type,
             request_id=request_id,
         )
+        if timestamp is not None:
+            usage.timestamp = timestamp
 
-        # Store in database
+        # Buffer for the next flush
         self._store_usage(usage)
 
         # Update Prometheus metrics
@@ -211,28 +328,176 @@ class CostTracker:
         return usage
 
     def _store_usage(self, usage: TokenUsage):
-        """Store usage record in database."""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO token_usage
-            (timestamp, model, provider, input_tokens, output_tokens, cost_usd, agent, task_type, request_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            usage.timestamp.isoformat(),
-            usage.model,
-            usage.provider,
-            usage.input_tokens,
-            usage.output_tokens,
-            usage.cost_usd,
-            usage.agent,
-            usage.task_type,
-            usage.request_id,
-        ))
-
-        conn.commit()
-        conn.close()
+        """Buffer a usage record, waking or starting the flusher as needed."""
+        with self._buffer_lock:
+            self._buffer.append(usage)
+            pending = len(self._buffer)
+
+        if pending >= BUFFER_MAX:
+            # The flusher is not keeping up (or not running): write inline
+            self.stats["inline_flushes"] += 1
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # flush() keeps the batch buffered; recording must not fail the caller
+                logger.error(f"Cost tracking inline flush failed: {e}")
+            return
+        self._ensure_flusher()
+        if pending >= FLUSH_BATCH and self._flush_wanted is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._flush_wanted.set)
+            except RuntimeError:
+                pass  # Loop closed; the next read or close() flushes
+
+    # -------------------------------------------------------------------------
+    # Background flushing
+    # -------------------------------------------------------------------------
+
+    def _ensure_flusher(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (scripts, threads): reads and close() flush
+        if self._flush_task is not None and not self._flush_task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._flush_wanted = asyncio.Event()
+        self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wanted.wait(), timeout=FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wanted.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+                if time.monotonic() - self._last_compaction >= COMPACT_INTERVAL:
+                    await asyncio.to_thread(self.compact)
+            except Exception as e:
+                logger.error(f"Cost tracking flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write buffered records and their rollups in one transaction."""
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+
+        rollups: Dict[tuple, List[float]] = {}
+        for usage in batch:
+            stamp = usage.timestamp.isoformat()
+            for table, _, prefix in ROLLUPS:
+                key = (table, stamp[:prefix], usage.model, usage.provider, usage.agent or "")
+                totals = rollups.setdefault(key, [0, 0, 0, 0.0])
+                totals[0] += 1
+                totals[1] += usage.input_tokens
+                totals[2] += usage.output_tokens
+                totals[3] += usage.cost_usd
+
+        try:
+            with self._db_lock, self._conn:
+                self._conn.executemany("""
+                    INSERT INTO token_usage
+                    (timestamp, model, provider, input_tokens, output_tokens, cost_usd, agent, task_type, request_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (
+                        usage.timestamp.isoformat(),
+                        usage.model,
+                        usage.provider,
+                        usage.input_tokens,
+                        usage.output_tokens,
+                        usage.cost_usd,
+                        usage.agent,
+                        usage.task_type,
+                        usage.request_id,
+                    )
+                    for usage in batch
+                ])
+                for table, _, _ in ROLLUPS:
+                    self._conn.executemany(f"""
+                        INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (bucket, model, provider, agent) DO UPDATE SET
+                            requests = requests + excluded.requests,
+                            input_tokens = input_tokens + excluded.input_tokens,
+                            output_tokens = output_tokens + excluded.output_tokens,
+                            cost_usd = cost_usd + excluded.cost_usd
+                    """, [key[1:] + tuple(totals) for key, totals in rollups.items() if key[0] == table])
+        except sqlite3.Error:
+            # Keep the records for the next attempt, ahead of newer ones
+            with self._buffer_lock:
+                self._buffer[:0] = batch
+            raise
+
+        self.stats["flushes"] += 1
+        self.stats["flushed"] += len(batch)
+        return len(batch)
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        """Delete raw rows and minute rollups past retention; returns rows removed."""
+        now = now or datetime.utcnow()
+        raw_cutoff = (now - timedelta(days=RAW_RETENTION_DAYS)).isoformat()
+        minute_cutoff = (now - timedelta(days=MINUTE_RETENTION_DAYS)).isoformat()[:16]
+        with self._db_lock, self._conn:
+            removed = self._conn.execute("DELETE FROM token_usage WHERE timestamp < ?", (raw_cutoff,)).rowcount
+            removed += self._conn.execute("DELETE FROM usage_minute WHERE bucket < ?", (minute_cutoff,)).rowcount
+        self._last_compaction = time.monotonic()
+        self.stats["compacted"] += removed
+        return removed
+
+    async def close(self):
+        """Stop the flusher, write whatever is still buffered and close the database."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+        with self._db_lock:
+            self._conn.close()
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Cost tracking flush before read failed: {e}")
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _aggregate(self, start: datetime, end: datetime) -> List[tuple]:
+        """(model, provider, agent, requests, input, output, cost) over [start, end)."""
+        parts, params = [], []
+        for table, prefix, lo, hi in _plan_range(start, end):
+            if table == "token_usage":
+                parts.append("""
+                    SELECT model, provider, COALESCE(agent, '') AS agent, COUNT(*) AS requests,
+                           SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens,
+                           SUM(cost_usd) AS cost_usd
+                    FROM token_usage WHERE timestamp >= ? AND timestamp < ?
+                    GROUP BY 1, 2, 3
+                """)
+                params += [lo.isoformat(), hi.isoformat()]
+            else:
+                parts.append(f"""
+                    SELECT model, provider, agent, requests, input_tokens, output_tokens, cost_usd
+                    FROM {table} WHERE bucket >= ? AND bucket < ?
+                """)
+                params += [lo.isoformat()[:prefix], hi.isoformat()[:prefix]]
+        if not parts:
+            return []
+        return self._query(f"""
+            SELECT model, provider, agent, SUM(requests), SUM(input_tokens), SUM(output_tokens), SUM(cost_usd)
+            FROM ({" UNION ALL ".join(parts)})
+            GROUP BY model, provider, agent
+        """, tuple(params))
 
     def get_summary(
         self,
@@ -255,67 +520,32 @@ class CostTracker:
             if start_date is None:
                 start_date = datetime(now.year, now.month, 1)
             # First day of next month
-            if now.month == 12:
-                end_date = datetime(now.year + 1, 1, 1)
+            if start_date.month == 12:
+                end_date = datetime(start_date.year + 1, 1, 1)
             else:
-                end_date = datetime(now.year, now.month + 1, 1)
+                end_date = datetime(start_date.year, start_date.month + 1, 1)
         else:
             raise ValueError(f"Invalid period: {period}")
 
-        # Query database
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                SUM(cost_usd) as total_cost,
-                SUM(input_tokens) as total_input,
-                SUM(output_tokens) as total_output,
-                COUNT(*) as request_count
-            FROM token_usage
-            WHERE timestamp >= ? AND timestamp < ?
-        """, (start_date.isoformat(), end_date.isoformat()))
-
-        row = cursor.fetchone()
-        total_cost = row[0] or 0
-        total_input = row[1] or 0
-        total_output = row[2] or 0
-        request_count = row[3] or 0
-
-        # By model
-        cursor.execute("""
-            SELECT model, SUM(cost_usd) as cost
-            FROM token_usage
-            WHERE timestamp >= ? AND timestamp < ?
-            GROUP BY model
-            ORDER BY cost DESC
-        """, (start_date.isoformat(), end_date.isoformat()))
-
-        by_model = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # By provider
-        cursor.execute("""
-            SELECT provider, SUM(cost_usd) as cost
-            FROM token_usage
-            WHERE timestamp >= ? AND timestamp < ?
-            GROUP BY provider
-            ORDER BY cost DESC
-        """, (start_date.isoformat(), end_date.isoformat()))
-
-        by_provider = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # By agent
-        cursor.execute("""
-            SELECT agent, SUM(cost_usd) as cost
-            FROM token_usage
-            WHERE timestamp >= ? AND timestamp < ? AND agent IS NOT NULL
-            GROUP BY agent
-            ORDER BY cost DESC
-        """, (start_date.isoformat(), end_date.isoformat()))
-
-        by_agent = {row[0]: row[1] for row in cursor.fetchall()}
-
-        conn.close()
+        # Pre-aggregated rows for the range, one per model/provider/agent
+        rows = self._aggregate(start_date, end_date)
+
+        by_model: Dict[str, float] = {}
+        by_provider: Dict[str, float] = {}
+        by_agent: Dict[str, float] = {}
+        total_cost = total_input = total_output = request_count = 0
+        for model, provider, agent, requests, input_tokens, output_tokens, cost in rows:
+            total_cost += cost
+            total_input += input_tokens
+            total_output += output_tokens
+            request_count += requests
+            by_model[model] = by_model.get(model, 0) + cost
+            by_provider[provider] = by_provider.get(provider, 0) + cost
+            if agent:
+                by_agent[agent] = by_agent.get(agent, 0) + cost
+
+        def by_cost(totals: Dict[str, float]) -> Dict[str, float]:
+            return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
 
         return CostSummary(
             period=period,
@@ -324,9 +554,9 @@ class CostTracker:
             total_cost_usd=total_cost,
             total_input_tokens=total_input,
             total_output_tokens=total_output,
-            by_model=by_model,
-            by_provider=by_provider,
-            by_agent=by_agent,
+            by_model=by_cost(by_model),
+            by_provider=by_cost(by_provider),
+            by_agent=by_cost(by_agent),
             request_count=request_count,
             avg_cost_per_request=total_cost / request_count if request_count > 0 else 0,
         )
@@ -384,17 +614,14 @@ class CostTracker:
 
     def get_recent_usage(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent usage records."""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cursor.execute("""
+        rows = self._query("""
             SELECT timestamp, model, provider, input_tokens, output_tokens, cost_usd, agent, task_type
             FROM token_usage
             ORDER BY timestamp DESC
             LIMIT ?
         """, (limit,))
 
-        results = [
+        return [
             {
                 "timestamp": row[0],
                 "model": row[1],
@@ -405,12 +632,9 @@ class CostTracker:
                 "agent": row[6],
                 "task_type": row[7],
             }
-            for row in cursor.fetchall()
+            for row in rows
         ]
 
-        conn.close()
-        return results
-
 
 # =============================================================================
 # Global Instance
@@ -427,6 +651,14 @@ def get_cost_tracker() -> CostTracker:
     return _cost_tracker
 
 
+async def close_cost_tracker():
+    """Flush buffered usage and stop the global tracker's flusher."""
+    global _cost_tracker
+    if _cost_tracker is not None:
+        await _cost_tracker.close()
+        _cost_tracker = None
+
+
 # =============================================================================
 # FastAPI Router
 # =============================================================================
@@ -450,7 +682,7 @@ def create_cost_tracking_router():
     async def get_cost_summary(period: str = "day"):
         """Get cost summary for a period (day/week/month)."""
         tracker = get_cost_tracker()
-        summary = tracker.get_summary(period)
+        summary = await asyncio.to_thread(tracker.get_summary, period)
 
         return {
             "period": summary.period,
@@ -471,13 +703,13 @@ def create_cost_tracking_router():
     async def get_recent_usage(limit: int = 50):
         """Get recent usage records."""
         tracker = get_cost_tracker()
-        return {"usage": tracker.get_recent_usage(limit)}
+        return {"usage": await asyncio.to_thread(tracker.get_recent_usage, limit)}
 
     @router.get("/suggestions")
     async def get_optimization_suggestions():
         """Get cost optimization suggestions."""
         tracker = get_cost_tracker()
-        return {"suggestions": tracker.get_optimization_suggestions()}
+        return {"suggestions": await asyncio.to_thread(tracker.get_optimization_suggestions)}
 
     @router.post("/record")
     async def record_usage(request: RecordUsageRequest):
@@ -509,10 +741,15 @@ def create_cost_tracking_router():
         """Get dashboard data combining all cost metrics."""
         tracker = get_cost_tracker()
 
-        day_summary = tracker.get_summary("day")
-        week_summary = tracker.get_summary("week")
-        month_summary = tracker.get_summary("month")
-        suggestions = tracker.get_optimization_suggestions()
+        def read_all():
+            return (
+                tracker.get_summary("day"),
+                tracker.get_summary("week"),
+                tracker.get_summary("month"),
+                tracker.get_optimization_suggestions(),
+            )
+
+        day_summary, week_summary, month_summary, suggestions = await asyncio.to_thread(read_all)
 
         return {
             "today": {
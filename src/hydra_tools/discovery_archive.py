@@ -24,26 +24,33 @@ Usage:
     }
 
     # Search discoveries
-    GET /discoveries/search?query=tabbyapi&type=improvement
+    POST /discoveries/search
+    {"query": "tabbyapi", "type": "improvement", "tags": ["inference"]}
 
     # Get relevant discoveries for current context
     POST /discoveries/relevant
     {"context": "I'm working on improving inference speed"}
 """
 
+import heapq
 import json
+import logging
 import os
 import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import numpy as np
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from hydra_tools.similarity import cosine, normalize, top_k
+
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 # Configuration
@@ -114,6 +121,7 @@ class SearchRequest(BaseModel):
     """Request to search discoveries."""
     query: str
     type: Optional[str] = None
+    tags: Optional[List[str]] = None
     limit: int = 10
 
 
@@ -151,14 +159,356 @@ class DiscoveryEmbedding:
 
     def cosine_similarity(self, a: List[float], b: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+        return cosine(a, b)
+
+
+# =============================================================================
+# Search Index
+# =============================================================================
+
+class _Column:
+    """Append-only numpy column with amortized O(1) appends."""
+
+    def __init__(self, dtype, fill=0):
+        self.fill = fill
+        self._data = np.full(64, fill, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self._data):
+            grown = np.full(len(self._data) * 2, self.fill, dtype=self._data.dtype)
+            grown[:self.size] = self._data
+            self._data = grown
+        self._data[self.size] = value
+        self.size += 1
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of the filled part; writes go through to the column."""
+        return self._data[:self.size]
+
+
+class _TextColumn:
+    """
+    Lowercased values of one text field in a single NUL-separated UTF-8
+    buffer, so substring matching is a few vectorized passes rather than a
+    Python loop over every discovery.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.starts = _Column(np.int64)
+        self.byte_counts = np.zeros(256, dtype=np.int64)
+
+    def append(self, value: str):
+        data = value.lower().encode("utf-8")
+        self.starts.append(len(self.buffer))
+        self.buffer += data + b"\0"
+        self.byte_counts += np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+
+    def contains(self, needle: str) -> np.ndarray:
+        """Boolean mask of the values containing ``needle`` (already lowercased)."""
+        hits = np.zeros(self.starts.size, dtype=bool)
+        pattern = np.frombuffer(needle.encode("utf-8"), dtype=np.uint8)
+        if not len(pattern):
+            hits[:] = True
+            return hits
+        text = np.frombuffer(self.buffer, dtype=np.uint8)
+        # Anchor on the needle's rarest byte so the first pass keeps the fewest candidates
+        anchor = int(np.argmin(self.byte_counts[pattern]))
+        candidates = np.flatnonzero(text == pattern[anchor]) - anchor
+        candidates = candidates[(candidates >= 0) & (candidates <= len(text) - len(pattern))]
+        for offset, byte in enumerate(pattern):
+            if offset != anchor and len(candidates):
+                candidates = candidates[text[candidates + offset] == byte]
+        # The view must go before the buffer can grow again
+        del text
+        # A match cannot span the NUL separator, so its start identifies the value
+        hits[np.searchsorted(self.starts.values, candidates, side="right") - 1] = True
+        return hits
+
+
+class DiscoveryIndex:
+    """
+    Search index kept next to the archive in ``<base>/.index``.
+
+    - manifest.jsonl: one line per discovery with the fields search scores
+      on (id, type, title, description, tags, created_at) and its row in the
+      embedding matrix, or -1 if it has no usable embedding
+    - embeddings.f32: contiguous float32 matrix of unit-length embeddings,
+      memory-mapped and scored with one matrix-vector product
+    - meta.json: format version and embedding dimension
+
+    Loaded once, reconciled against the JSON files on disk, then appended to
+    by DiscoveryArchive.archive(). A search reads only the files of its hits.
+    """
+
+    VERSION = 1
+    TYPES = list(DiscoveryType)
+    TYPE_CODES = {dt: code for code, dt in enumerate(TYPES)}
+
+    def __init__(self, base_path: Path):
+        self.base_path = base_path
+        self.path = base_path / ".index"
+        self.manifest_file = self.path / "manifest.jsonl"
+        self.matrix_file = self.path / "embeddings.f32"
+        self.meta_file = self.path / "meta.json"
+        self.loaded = False
+        self._reset()
+
+    def _reset(self):
+        self.dim: Optional[int] = None
+        self.rows = 0
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self._text = {"title": _TextColumn(), "description": _TextColumn()}
+        self.created: List[str] = []
+        self.tag_postings: Dict[str, List[int]] = {}
+        self._types = _Column(np.int8)
+        self._alive = _Column(bool, False)
+        self._row_positions = _Column(np.int64, -1)
+        self._matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self._alive.values.sum())
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def load(self):
+        """Load the index, rebuilding or catching up with the files on disk."""
+        self._reset()
+        try:
+            meta = json.loads(self.meta_file.read_text())
+        except (OSError, ValueError):
+            meta = None
+        if not meta or meta.get("version") != self.VERSION:
+            self.rebuild()
+            return
+
+        self.dim = meta.get("dim")
+        if self.dim and self.matrix_file.exists():
+            row_bytes = self.dim * 4
+            size = self.matrix_file.stat().st_size
+            if size % row_bytes:
+                # A row was cut short by a crash mid-append
+                with open(self.matrix_file, "r+b") as f:
+                    f.truncate(size - size % row_bytes)
+            self.rows = size // row_bytes
+        for _ in range(self.rows):
+            self._row_positions.append(-1)
+
+        entries = []
+        if self.manifest_file.exists():
+            with open(self.manifest_file) as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # truncated last line
+        for entry in entries:
+            self._add_entry(entry)
+
+        self.loaded = True
+        self._reconcile()
+
+    def _reconcile(self):
+        """Drop entries whose files are gone and index files the manifest lacks."""
+        on_disk = set()
+        for dt in DiscoveryType:
+            type_dir = self.base_path / dt.value
+            if not type_dir.exists():
+                continue
+            with os.scandir(type_dir) as it:
+                on_disk.update((dt.value, e.name[:-5]) for e in it if e.name.endswith(".json"))
+
+        for discovery_id, position in list(self.positions.items()):
+            dt = DiscoveryType(self.type_of(position))
+            if (dt.value, discovery_id) not in on_disk:
+                self._alive.values[position] = False
+                del self.positions[discovery_id]
+
+        added = 0
+        for type_value, discovery_id in sorted(on_disk):
+            if discovery_id in self.positions:
+                continue
+            discovery = _read_discovery(self.base_path / type_value / f"{discovery_id}.json")
+            if discovery is not None:
+                self.add(discovery)
+                added += 1
+        if added:
+            logger.info(f"Discovery index: indexed {added} discoveries missing from the manifest")
+
+    def rebuild(self):
+        """Recreate the index from the JSON files."""
+        self._reset()
+        self.path.mkdir(parents=True, exist_ok=True)
+        for f in (self.manifest_file, self.matrix_file, self.meta_file):
+            f.unlink(missing_ok=True)
+        self._write_meta()
+        self.loaded = True
+        self._reconcile()
+
+    def _write_meta(self):
+        self.meta_file.write_text(json.dumps({"version": self.VERSION, "dim": self.dim}))
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def add(self, discovery: Discovery):
+        """Append a discovery to the manifest and its embedding to the matrix."""
+        row = -1
+        embedding = discovery.embedding
+        if embedding:
+            if self.dim is None:
+                self.dim = len(embedding)
+                self._write_meta()
+            if len(embedding) == self.dim:
+                vector = normalize(embedding)
+                with open(self.matrix_file, "ab") as f:
+                    f.write(vector.tobytes())
+                row = self.rows
+                self.rows += 1
+                self._row_positions.append(-1)
+                self._matrix = None
+            else:
+                logger.warning(
+                    f"Discovery {discovery.id}: embedding has {len(embedding)} dims, index has {self.dim}; "
+                    f"it will only match on keywords"
+                )
+
+        entry = {
+            "id": discovery.id,
+            "type": DiscoveryType(discovery.type).value,
+            "title": discovery.title,
+            "description": discovery.description,
+            "tags": discovery.tags,
+            "created_at": discovery.created_at,
+            "row": row,
+        }
+        with open(self.manifest_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._add_entry(entry)
+
+    def _add_entry(self, entry: Dict[str, Any]):
+        discovery_id = entry["id"]
+        if discovery_id in self.positions:
+            self._alive.values[self.positions[discovery_id]] = False
+        position = len(self.ids)
+        self.ids.append(discovery_id)
+        self.positions[discovery_id] = position
+        self.titles.append(entry["title"])
+        for field_name, column in self._text.items():
+            column.append(entry[field_name])
+        self.created.append(entry["created_at"])
+        for tag in {t.lower() for t in entry.get("tags") or []}:
+            self.tag_postings.setdefault(tag, []).append(position)
+        self._types.append(self.TYPE_CODES[DiscoveryType(entry["type"])])
+        self._alive.append(True)
+        row = entry.get("row", -1)
+        if 0 <= row < self.rows:
+            self._row_positions.values[row] = position
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def type_of(self, position: int) -> str:
+        return self.TYPES[self._types.values[position]].value
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The embedding matrix, mapped on first use after a change."""
+        if self._matrix is None:
+            if self.rows and self.dim:
+                self._matrix = np.memmap(self.matrix_file, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+            else:
+                self._matrix = np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._matrix
+
+    def score(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]] = None,
+        discovery_type: Optional[DiscoveryType] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Score every discovery like DiscoveryArchive.search always has:
+        0.5 title / 0.3 description / 0.2 tag substring match plus 0.5 x cosine
+        similarity, keeping scores above 0.1.
+
+        Returns (id, type, score) for the best ``limit``, newest first on ties.
+        """
+        count = len(self.ids)
+        if not count:
+            return []
+        scores = np.zeros(count, dtype=np.float64)
+        query_lower = query.lower()
+
+        scores += 0.5 * self._text["title"].contains(query_lower)
+        scores += 0.3 * self._text["description"].contains(query_lower)
+        tagged = [self.tag_postings[t] for t in self.tag_postings if query_lower in t]
+        if tagged:
+            scores[np.unique(np.concatenate(tagged))] += 0.2
+
+        if query_embedding and self.dim and len(query_embedding) == self.dim and self.rows:
+            similarities = self.matrix @ normalize(query_embedding)
+            row_positions = self._row_positions.values
+            has_row = row_positions >= 0
+            scores[row_positions[has_row]] += 0.5 * similarities[has_row]
+
+        mask = self._alive.values & (scores > 0.1)
+        if discovery_type is not None:
+            mask &= self._types.values == self.TYPE_CODES[discovery_type]
+        for tag in tags or []:
+            tag_mask = np.zeros(count, dtype=bool)
+            tag_mask[self.tag_postings.get(tag.lower(), [])] = True
+            mask &= tag_mask
+
+        candidates = np.flatnonzero(mask)
+        created = np.array([self.created[p] for p in candidates.tolist()], dtype=str)
+        best, best_scores = top_k(scores[candidates], limit, tiebreak=created)
+        return [
+            (self.ids[p], self.type_of(p), score)
+            for p, score in zip(candidates[best].tolist(), best_scores.tolist())
+        ]
+
+    def counts_by_type(self) -> Dict[str, int]:
+        counts = np.bincount(self._types.values[self._alive.values], minlength=len(self.TYPES))
+        return {dt.value: int(counts[code]) for dt, code in self.TYPE_CODES.items()}
+
+    def recent(self, limit: int = 5) -> List[Tuple[str, str]]:
+        """(id, type) of the newest discoveries."""
+        alive = np.flatnonzero(self._alive.values).tolist()
+        newest = heapq.nlargest(limit, alive, key=lambda p: self.created[p])
+        return [(self.ids[p], self.type_of(p)) for p in newest]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "discoveries": len(self),
+            "manifest_entries": len(self.ids),
+            "embedding_rows": self.rows,
+            "embedding_dim": self.dim,
+            "tags": len(self.tag_postings),
+            "matrix_mb": round(self.rows * (self.dim or 0) * 4 / 1e6, 1),
+        }
+
+
+def _read_discovery(path: Path) -> Optional[Discovery]:
+    """Parse a discovery file, or None if it is unreadable."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data.get("type"), str):
+            data["type"] = DiscoveryType(data["type"])
+        return Discovery(**data)
+    except Exception:
+        return None
 
 
 # =============================================================================
@@ -172,6 +522,14 @@ class DiscoveryArchive:
         self.base_path = Path(base_path)
         self.embedder = DiscoveryEmbedding()
         self._ensure_directories()
+        self._index = DiscoveryIndex(self.base_path)
+
+    @property
+    def index(self) -> DiscoveryIndex:
+        """Search index, loaded on first use."""
+        if not self._index.loaded:
+            self._index.load()
+        return self._index
 
     def _ensure_directories(self):
         """Ensure archive directories exist."""
@@ -216,10 +574,12 @@ class DiscoveryArchive:
             embedding=embedding,
         )
 
-        # Save to file
+        # Save to file; load the index first so reconciling does not pick the file up too
+        index = self.index
         path = self._get_path(disc_type, discovery_id)
         with open(path, "w") as f:
             json.dump(discovery.to_dict(), f, indent=2)
+        index.add(discovery)
 
         return discovery
 
@@ -233,57 +593,36 @@ class DiscoveryArchive:
             type_dir = self.base_path / dt.value
             if type_dir.exists():
                 for file in type_dir.glob("*.json"):
-                    try:
-                        with open(file) as f:
-                            data = json.load(f)
-                            # Convert type string back to enum
-                            if isinstance(data.get("type"), str):
-                                data["type"] = DiscoveryType(data["type"])
-                            discoveries.append(Discovery(**data))
-                    except Exception:
-                        continue
+                    discovery = _read_discovery(file)
+                    if discovery is not None:
+                        discoveries.append(discovery)
 
         # Sort by created_at descending
         discoveries.sort(key=lambda d: d.created_at, reverse=True)
         return discoveries
 
-    async def search(self, query: str, discovery_type: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search discoveries by query."""
-        # Get all discoveries
+    async def search(
+        self,
+        query: str,
+        discovery_type: Optional[str] = None,
+        limit: int = 10,
+        tags: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search discoveries by query, optionally restricted to a type and to discoveries with all ``tags``."""
         dt = DiscoveryType(discovery_type) if discovery_type else None
-        all_discoveries = self.list_all(dt)
 
         # Generate query embedding
         query_embedding = await self.embedder.embed(query)
 
         results = []
-        for discovery in all_discoveries:
-            score = 0.0
-
-            # Keyword match
-            query_lower = query.lower()
-            if query_lower in discovery.title.lower():
-                score += 0.5
-            if query_lower in discovery.description.lower():
-                score += 0.3
-            if any(query_lower in tag.lower() for tag in discovery.tags):
-                score += 0.2
-
-            # Semantic match
-            if query_embedding and discovery.embedding:
-                semantic_score = self.embedder.cosine_similarity(
-                    query_embedding, discovery.embedding
-                )
-                score += semantic_score * 0.5
-
-            if score > 0.1:
-                result = discovery.to_dict()
-                result["score"] = round(score, 3)
-                results.append(result)
-
-        # Sort by score
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:limit]
+        for discovery_id, type_value, score in self.index.score(query, query_embedding, dt, tags, limit):
+            discovery = _read_discovery(self._get_path(DiscoveryType(type_value), discovery_id))
+            if discovery is None:
+                continue
+            result = discovery.to_dict()
+            result["score"] = round(score, 3)
+            results.append(result)
+        return results
 
     async def find_relevant(self, context: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Find discoveries relevant to current context."""
@@ -297,24 +636,31 @@ class DiscoveryArchive:
             "recent": [],
         }
 
-        for dt in DiscoveryType:
-            type_dir = self.base_path / dt.value
-            if type_dir.exists():
-                count = len(list(type_dir.glob("*.json")))
-                stats["by_type"][dt.value] = count
-                stats["total"] += count
+        index = self.index
+        stats["by_type"] = index.counts_by_type()
+        stats["total"] = sum(stats["by_type"].values())
 
         # Get 5 most recent
-        all_discoveries = self.list_all()
-        stats["recent"] = [
-            {"id": d.id, "type": d.type.value, "title": d.title, "created_at": d.created_at}
-            for d in all_discoveries[:5]
-        ]
+        for discovery_id, type_value in index.recent(5):
+            position = index.positions[discovery_id]
+            stats["recent"].append({
+                "id": discovery_id,
+                "type": type_value,
+                "title": index.titles[position],
+                "created_at": index.created[position],
+            })
 
         return stats
 
     def get_discovery(self, discovery_id: str) -> Optional[Discovery]:
         """Get a specific discovery by ID."""
+        position = self.index.positions.get(discovery_id)
+        if position is not None:
+            discovery = _read_discovery(
+                self._get_path(DiscoveryType(self.index.type_of(position)), discovery_id)
+            )
+            if discovery is not None:
+                return discovery
         for dt in DiscoveryType:
             path = self._get_path(dt, discovery_id)
             if path.exists():
@@ -355,8 +701,16 @@ def create_discovery_router() -> APIRouter:
             "status": "operational",
             "base_path": str(archive.base_path),
             "stats": archive.get_stats(),
+            "index": archive.index.status(),
         }
 
+    @router.post("/reindex")
+    async def reindex():
+        """Rebuild the search index from the discovery files."""
+        archive = get_archive()
+        archive.index.rebuild()
+        return {"status": "rebuilt", "index": archive.index.status()}
+
     @router.post("/archive")
     async def archive_discovery(request: ArchiveRequest):
         """Archive a new discovery."""
@@ -399,7 +753,8 @@ def create_discovery_router() -> APIRouter:
         results = await archive.search(
             query=request.query,
             discovery_type=request.type,
-            limit=request.limit
+            limit=request.limit,
+            tags=request.tags,
         )
         return {
             "query": request.query,
@@ -0,0 +1,507 @@
+"""
+Hydra Forecasting - Vectorized trend forecasts over many time series
+
+Predictive maintenance used to ask Prometheus recording rules for one
+predict_linear() value per series on every request. This module keeps the
+history in process instead and fits every series of a group at once:
+
+- SeriesBuffer: per-group ring buffer, one NumPy row per series on a fixed
+  sample grid (``step`` seconds). Range query results are written in place;
+  only samples newer than the last ingest are fetched after the first fill.
+- fit_linear: least-squares slope and level for every row (what
+  predict_linear computes), NaN-aware.
+- fit_holt: Holt's linear trend, with additive seasonality (Holt-Winters)
+  when a season length is given. One pass over the window, vectorized
+  across rows. One-step-ahead residuals give each series an anomaly score.
+- SeriesForecast: predictions at any horizon, time until a threshold is
+  crossed, a rate over the most recent samples (what deriv() computes over a
+  shorter range), and anomaly scores, served from the fitted arrays.
+- ForecastEngine: ingests every group's queries through the shared
+  Prometheus client once per interval and refits.
+- backtest: rolling-origin evaluation of the fits on recorded series.
+"""
+
+import asyncio
+import logging
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from prometheus_client import Gauge, Histogram
+
+from hydra_tools.prometheus_query import get_prometheus_client
+
+logger = logging.getLogger(__name__)
+
+LATE_SAMPLES = 2
+MIN_ANOMALY_SAMPLES = 10  # one-step residuals needed before a series gets anomaly scores
+
+FORECAST_REFRESH = Histogram(
+    "hydra_forecast_refresh_seconds",
+    "Duration of a forecast refresh (range queries, ingest and fit)",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+
+FORECAST_SERIES = Gauge(
+    "hydra_forecast_series",
+    "Series held in forecast ring buffers",
+    ["group"],
+)
+
+
+# =============================================================================
+# Ring Buffers
+# =============================================================================
+
+class SeriesBuffer:
+    """
+    Ring buffer of ``capacity`` samples for a growing set of series that
+    share one sample grid: slot ``k`` holds the sample nearest ``k * step``.
+    Samples are stored as float32 and widened to float64 for fitting.
+    """
+
+    def __init__(self, capacity: int, step: float, initial_rows: int = 16):
+        self.capacity = capacity
+        self.step = step
+        self._values = np.full((initial_rows, capacity), np.nan, dtype=np.float32)
+        self._rows: Dict[Hashable, int] = {}
+        self.keys: List[Hashable] = []
+        self.labels: List[Dict[str, str]] = []
+        self.latest_slot: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _row(self, key: Hashable, labels: Dict[str, str]) -> int:
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self.keys)
+            self.keys.append(key)
+            self.labels.append(labels)
+            if row == len(self._values):
+                grown = np.full((2 * len(self._values), self.capacity), np.nan, dtype=np.float32)
+                grown[:row] = self._values
+                self._values = grown
+        return row
+
+    def _advance(self, slot: int):
+        """Move the head to ``slot``, clearing the columns it passes over."""
+        if self.latest_slot is None or slot - self.latest_slot >= self.capacity:
+            self._values[:] = np.nan
+        elif slot > self.latest_slot:
+            cleared = np.arange(self.latest_slot + 1, slot + 1) % self.capacity
+            self._values[:, cleared] = np.nan
+        else:
+            return
+        self.latest_slot = slot
+
+    def extend(self, series: Iterable[Tuple[Hashable, Dict[str, str], Sequence[float], Sequence[float]]]):
+        """Write ``(key, labels, timestamps, values)`` for any number of series."""
+        rows, times, values = [], [], []
+        for key, labels, ts, vs in series:
+            if len(ts):
+                rows.append((self._row(key, labels), len(ts)))
+                times.append(ts)
+                values.append(vs)
+        if not rows:
+            return
+        # One scatter for the whole batch
+        slots = np.rint(np.concatenate(times).astype(float) / self.step).astype(np.int64)
+        values = np.concatenate(values).astype(np.float32)
+        row_index = np.repeat([row for row, _ in rows], [count for _, count in rows])
+        self._advance(int(slots.max()))
+        keep = slots > self.latest_slot - self.capacity
+        self._values[row_index[keep], slots[keep] % self.capacity] = values[keep]
+
+    def extend_matrix(self, result: List[Dict[str, Any]], tag: Hashable = None):
+        """Write a Prometheus range query result (``resultType: matrix``)."""
+        def rows():
+            for item in result:
+                metric = item.get("metric", {})
+                samples = np.array(item.get("values", []), dtype=float).reshape(-1, 2)
+                yield (tag, tuple(sorted(metric.items()))), metric, samples[:, 0], samples[:, 1]
+        self.extend(rows())
+
+    def window(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values[n_series, capacity]) in chronological order."""
+        latest = self.capacity - 1 if self.latest_slot is None else self.latest_slot
+        slots = np.arange(latest - self.capacity + 1, latest + 1)
+        return slots * self.step, self._values[:len(self.keys), slots % self.capacity].astype(float)
+
+    def compact(self) -> int:
+        """Drop series with no samples left in the window; returns how many."""
+        if not self.keys:
+            return 0
+        alive = ~np.isnan(self._values[:len(self.keys)]).all(axis=1)
+        dropped = int((~alive).sum())
+        if dropped:
+            rows = np.flatnonzero(alive)
+            values = np.full((max(16, len(rows)), self.capacity), np.nan, dtype=np.float32)
+            values[:len(rows)] = self._values[rows]
+            self._values = values
+            self.keys = [self.keys[i] for i in rows]
+            self.labels = [self.labels[i] for i in rows]
+            self._rows = {key: i for i, key in enumerate(self.keys)}
+        return dropped
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.nbytes
+
+
+# =============================================================================
+# Fits
+# =============================================================================
+
+@dataclass
+class LinearFit:
+    """Least-squares line per series, with x measured from the latest slot."""
+    slope: np.ndarray  # per second
+    level: np.ndarray  # fitted value at the latest slot
+    count: np.ndarray
+
+
+def fit_linear(times: np.ndarray, values: np.ndarray) -> LinearFit:
+    mask = ~np.isnan(values)
+    x = times - times[-1] if len(times) else times
+    filled = np.where(mask, values, 0.0)
+    n = mask.sum(axis=1).astype(float)
+    sx = mask @ x
+    sy = filled.sum(axis=1)
+    sxx = mask @ (x * x)
+    sxy = filled @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denominator = n * sxx - sx * sx
+        slope = np.where(denominator > 0, (n * sxy - sx * sy) / denominator, 0.0)
+        level = np.where(n > 0, (sy - slope * sx) / n, np.nan)
+    return LinearFit(slope=slope, level=level, count=n)
+
+
+@dataclass
+class HoltFit:
+    """Holt(-Winters) state per series after the last sample."""
+    level: np.ndarray
+    trend: np.ndarray  # per step
+    damping: float  # trend multiplier per step (1.0 = undamped)
+    seasonal: Optional[np.ndarray]  # [n_series, season] additive, or None
+    season_phase: int  # index into seasonal of the next slot
+    scale: np.ndarray  # EW std of one-step-ahead residuals, before the last sample
+    last_residual: np.ndarray  # residual of the last sample (NaN if missing)
+
+
+def fit_holt(
+    values: np.ndarray,
+    alpha: float = 0.3,
+    beta: float = 0.05,
+    damping: float = 1.0,
+    season: Optional[int] = None,
+    gamma: float = 0.1,
+    residual_alpha: float = 0.1,
+) -> HoltFit:
+    """
+    Double (or, with ``season``, triple) exponential smoothing across all
+    rows at once. ``damping`` < 1 flattens the trend with distance (Gardner's
+    damped trend), so a step change is not extrapolated indefinitely.
+    Missing samples advance the level by the trend.
+    """
+    n, width = values.shape
+    seasonal = None
+    if season:
+        # Start from the first season's deviations from its own mean
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            first = values[:, :season]
+            seasonal = np.nan_to_num(first - np.nanmean(first, axis=1, keepdims=True))
+
+    # Level and trend start from a line through the first part of the window;
+    # rows with no samples there start at their first sample with no trend
+    k = max(2, min(width, season or width // 4))
+    start = values[:, :k] - (seasonal[:, :k] if season else 0.0)
+    init = fit_linear(np.arange(k, dtype=float), start)
+    level = init.level - init.slope * k
+    trend = np.where(np.isnan(level), 0.0, init.slope)
+    variance = np.zeros(n)
+    updates = np.zeros(n)
+    prior_variance, prior_updates = variance, updates
+    residual = np.full(n, np.nan)
+
+    for t in range(width):
+        y = values[:, t]
+        valid = ~np.isnan(y)
+        s = seasonal[:, t % season] if season else 0.0
+        fresh = valid & np.isnan(level)
+        level[fresh] = y[fresh] - (s[fresh] if season else 0.0)
+
+        trend = trend * damping
+        forecast = level + trend + s
+        error = y - forecast
+        update = valid & ~fresh
+        residual = np.where(valid, np.where(fresh, 0.0, error), np.nan)
+        prior_variance, prior_updates = variance, updates
+        variance = np.where(update, (1 - residual_alpha) * variance + residual_alpha * error * error, variance)
+        updates = updates + update
+
+        new_level = np.where(update, alpha * (y - s) + (1 - alpha) * (level + trend), level + trend)
+        new_level = np.where(fresh, level, new_level)
+        trend = np.where(update, beta * (new_level - level) + (1 - beta) * trend, trend)
+        if season:
+            seasonal[:, t % season] = np.where(update, gamma * (y - new_level) + (1 - gamma) * s, s)
+        level = new_level
+
+    # Bias-correct the EW variance for the zero it started from
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scale = np.sqrt(prior_variance / (1 - (1 - residual_alpha) ** prior_updates))
+    scale = np.where(prior_updates >= MIN_ANOMALY_SAMPLES, scale, 0.0)
+
+    return HoltFit(
+        level=level,
+        trend=trend,
+        damping=damping,
+        seasonal=seasonal,
+        season_phase=width % season if season else 0,
+        scale=scale,
+        last_residual=residual,
+    )
+
+
+def _damped_steps(damping: float, steps: float) -> float:
+    """Total trend multiplier over ``steps``: damping + damping^2 + ... + damping^steps."""
+    if damping >= 1.0:
+        return steps
+    return damping * (1 - damping ** steps) / (1 - damping)
+
+
+@dataclass
+class SeriesForecast:
+    """Fitted forecasts for every series of a group."""
+    keys: List[Hashable]
+    labels: List[Dict[str, str]]
+    step: float
+    latest: np.ndarray  # last observed value (NaN if none in the window)
+    latest_time: float
+    linear: LinearFit
+    holt: HoltFit
+    method: str = "holt"
+    rate: Optional[np.ndarray] = None  # least-squares slope per second over the group's rate window
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def slope(self, method: Optional[str] = None) -> np.ndarray:
+        """Trend in units per second."""
+        if (method or self.method) == "linear":
+            return self.linear.slope
+        return self.holt.trend / self.step
+
+    def predict(self, horizon_seconds: float, method: Optional[str] = None) -> np.ndarray:
+        if (method or self.method) == "linear":
+            return self.linear.level + self.linear.slope * horizon_seconds
+        steps = horizon_seconds / self.step
+        forecast = self.holt.level + self.holt.trend * _damped_steps(self.holt.damping, steps)
+        if self.holt.seasonal is not None:
+            season = self.holt.seasonal.shape[1]
+            phase = (self.holt.season_phase + int(round(steps)) - 1) % season
+            forecast = forecast + self.holt.seasonal[:, phase]
+        return forecast
+
+    def time_to(self, threshold: float, method: Optional[str] = None) -> np.ndarray:
+        """Seconds until the trend reaches ``threshold`` (inf if it is not heading there)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if (method or self.method) == "linear":
+                slope = self.linear.slope
+                seconds = (threshold - self.linear.level) / slope
+            else:
+                slope = self.holt.trend
+                steps = (threshold - self.holt.level) / slope
+                damping = self.holt.damping
+                if damping < 1.0:
+                    # A damped trend only ever adds trend * d / (1 - d) in total
+                    remaining = 1 - steps * (1 - damping) / damping
+                    steps = np.where(remaining > 0, np.log(np.maximum(remaining, 1e-300)) / np.log(damping), np.inf)
+                seconds = steps * self.step
+        return np.where((seconds >= 0) & np.isfinite(seconds) & (slope != 0), seconds, np.inf)
+
+    @property
+    def anomaly(self) -> np.ndarray:
+        """Last sample's one-step-ahead error in residual standard deviations."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = np.abs(self.holt.last_residual) / np.maximum(self.holt.scale, 1e-9)
+        return np.where(np.isfinite(score) & (self.holt.scale > 0), score, 0.0)
+
+
+def fit_forecast(buffer: SeriesBuffer, method: str = "holt", season_seconds: Optional[float] = None,
+                 alpha: float = 0.3, beta: float = 0.05, damping: float = 1.0,
+                 rate_seconds: Optional[float] = None) -> SeriesForecast:
+    times, values = buffer.window()
+    rate = None
+    if rate_seconds:
+        recent = max(2, int(rate_seconds // buffer.step))
+        rate = fit_linear(times[-recent:], values[:, -recent:]).slope
+    season = int(round(season_seconds / buffer.step)) if season_seconds else None
+    if season and values.shape[1] < 2 * season:
+        season = None
+    latest = np.full(len(values), np.nan)
+    if values.size:
+        # Last non-NaN value per row
+        valid = ~np.isnan(values)
+        last = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        latest = np.where(valid.any(axis=1), values[np.arange(len(values)), last], np.nan)
+    return SeriesForecast(
+        keys=list(buffer.keys),
+        labels=list(buffer.labels),
+        step=buffer.step,
+        latest=latest,
+        latest_time=float(times[-1]) if len(times) else 0.0,
+        linear=fit_linear(times, values),
+        holt=fit_holt(values, alpha=alpha, beta=beta, damping=damping, season=season),
+        method=method,
+        rate=rate,
+    )
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+@dataclass(frozen=True)
+class ForecastGroup:
+    """Series ingested and fitted together: one or more range queries."""
+    name: str
+    queries: Tuple[str, ...]
+    window_seconds: float
+    horizon_seconds: float = 0.0
+    method: str = "holt"
+    beta: float = 0.05
+    damping: float = 1.0
+    season_seconds: Optional[float] = None
+    rate_seconds: Optional[float] = None
+
+
+class ForecastEngine:
+    """Ingests each group's range queries once per refresh and refits."""
+
+    def __init__(self, groups: Sequence[ForecastGroup], step: float = 60.0, prometheus_url: Optional[str] = None):
+        self.groups = {group.name: group for group in groups}
+        self.step = step
+        self.prometheus_url = prometheus_url
+        self.buffers = {
+            group.name: SeriesBuffer(max(2, int(group.window_seconds // step)), step) for group in groups
+        }
+        self.forecasts: Dict[str, SeriesForecast] = {}
+        self.refreshed_at: Optional[float] = None
+        self.errors: Dict[str, str] = {}
+        self.stats = {"refreshes": 0, "last_refresh_ms": 0.0, "last_fit_ms": 0.0}
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, now: Optional[float] = None):
+        """Fetch samples newer than each buffer's head, then refit every group."""
+        async with self._lock:
+            started = time.perf_counter()
+            now = time.time() if now is None else now
+            end = now // self.step * self.step  # keep samples on the buffer grid
+            prometheus = get_prometheus_client(self.prometheus_url)
+
+            async def fetch(group: ForecastGroup, index: int, query: str):
+                buffer = self.buffers[group.name]
+                start = end - (buffer.capacity - 1) * self.step
+                if buffer.latest_slot is not None:
+                    # Re-read the last few slots: scrapes can land after the previous refresh
+                    start = max(start, (buffer.latest_slot + 1 - LATE_SAMPLES) * self.step)
+                if start > end:
+                    return
+                try:
+                    result = await prometheus.query_range(query, start, end, self.step, ttl=self.step)
+                except Exception as e:
+                    self.errors[f"{group.name}:{index}"] = str(e)
+                    logger.warning(f"Forecast ingest failed for {group.name}: {query} - {e}")
+                    return
+                self.errors.pop(f"{group.name}:{index}", None)
+                buffer.extend_matrix(result, tag=index)
+
+            await asyncio.gather(*(
+                fetch(group, index, query)
+                for group in self.groups.values()
+                for index, query in enumerate(group.queries)
+            ))
+            self.fit()
+            self.refreshed_at = now
+            self.stats["refreshes"] += 1
+            elapsed = time.perf_counter() - started
+            self.stats["last_refresh_ms"] = round(elapsed * 1000, 2)
+            FORECAST_REFRESH.observe(elapsed)
+
+    def fit(self):
+        """Refit every group from its buffer."""
+        started = time.perf_counter()
+        for name, group in self.groups.items():
+            buffer = self.buffers[name]
+            buffer.compact()
+            self.forecasts[name] = fit_forecast(buffer, group.method, group.season_seconds,
+                                                beta=group.beta, damping=group.damping,
+                                                rate_seconds=group.rate_seconds)
+            FORECAST_SERIES.labels(group=name).set(len(buffer))
+        self.stats["last_fit_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "refreshed_at": self.refreshed_at,
+            "step_seconds": self.step,
+            "groups": {
+                name: {
+                    "series": len(self.buffers[name]),
+                    "window_samples": self.buffers[name].capacity,
+                    "method": group.method,
+                    "buffer_bytes": self.buffers[name].nbytes,
+                }
+                for name, group in self.groups.items()
+            },
+            "errors": dict(self.errors),
+        }
+
+
+# =============================================================================
+# Backtesting
+# =============================================================================
+
+def backtest(
+    values: np.ndarray,
+    step: float,
+    window_seconds: float,
+    horizon_seconds: float,
+    stride: int = 5,
+    season_seconds: Optional[float] = None,
+    beta: float = 0.05,
+    damping: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Rolling-origin backtest over recorded series (``values[n_series, T]`` on
+    one grid). At each origin the fits see only the preceding window and
+    predict ``horizon_seconds`` ahead; errors are averaged over every series
+    and origin. "naive" predicts the last observed value.
+    """
+    window = max(2, int(window_seconds // step))
+    horizon = max(1, int(round(horizon_seconds / step)))
+    errors: Dict[str, List[np.ndarray]] = {"linear": [], "holt": [], "naive": []}
+    for origin in range(window, values.shape[1] - horizon + 1, stride):
+        buffer = SeriesBuffer(window, step)
+        times = np.arange(origin - window, origin) * step
+        buffer.extend(
+            (row, {}, times, values[row, origin - window:origin]) for row in range(len(values))
+        )
+        forecast = fit_forecast(buffer, season_seconds=season_seconds, beta=beta, damping=damping)
+        actual = values[:, origin + horizon - 1]
+        for method in ("linear", "holt"):
+            errors[method].append(np.abs(forecast.predict(horizon_seconds, method) - actual))
+        errors["naive"].append(np.abs(forecast.latest - actual))
+
+    report: Dict[str, Any] = {"origins": len(errors["naive"]), "series": len(values)}
+    for method, samples in errors.items():
+        stacked = np.concatenate(samples) if samples else np.array([np.nan])
+        report[method] = {
+            "mae": float(np.nanmean(stacked)),
+            "p90": float(np.nanpercentile(stacked, 90)),
+        }
+    return report
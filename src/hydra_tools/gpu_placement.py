@@ -0,0 +1,318 @@
+"""
+Hydra GPU Placement - Packs autonomous work onto individual cluster GPUs
+
+The autonomous scheduler used to admit one task per tick if any GPU on the
+task's node looked idle, without recording where the work went. The
+placement engine keeps a model of every GPU instead:
+
+- observed free VRAM and utilization, from ClusterResourceMonitor
+- reservations for tasks it has placed, held until the task completes
+- effective free VRAM = min(observed free, total - baseline - reserved),
+  where the baseline is the usage observed while the GPU had no
+  reservations. A task whose memory has not shown up in the metrics yet is
+  still counted; one using more than it claimed shows up in the observed
+  value, and the difference is reported as drift.
+
+Each tick the pending window is ranked by priority plus age (one priority
+level per ``aging_seconds`` waited, up to ``high`` so aged work never
+overtakes urgent work) and packed best-fit decreasing: larger
+tasks first within a priority level, each onto the GPU it leaves the least
+VRAM free on. Several tasks can start per tick, on different GPUs or
+sharing one. The highest-ranked GPU task that has waited longer than
+``starvation_seconds`` and does not fit holds the GPU it would fit on best
+once drained, so smaller work stops backfilling it (one hold at a time, as
+in EASY backfilling, so a backlog cannot drain the whole cluster).
+"""
+
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+if TYPE_CHECKING:
+    from hydra_tools.autonomous_queue import ClusterResources
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {"urgent": 4, "high": 3, "normal": 2, "low": 1}
+AGING_SECONDS = float(os.getenv("HYDRA_PLACEMENT_AGING_SECONDS", "1800"))
+STARVATION_SECONDS = float(os.getenv("HYDRA_PLACEMENT_STARVATION_SECONDS", "3600"))
+
+PLACEMENTS = Counter(
+    "hydra_placement_tasks_total",
+    "Autonomous tasks placed, by work type and target",
+    ["work_type", "target"],
+)
+
+PLACEMENT_WAIT = Histogram(
+    "hydra_placement_wait_seconds",
+    "Time autonomous tasks waited in the queue before placement",
+    buckets=[30, 60, 300, 900, 1800, 3600, 7200, 21600],
+)
+
+
+@dataclass
+class TaskDemand:
+    """What a pending task needs from the cluster."""
+    task_id: int
+    work_type: str
+    priority: str
+    submitted_at: float  # unix timestamp
+    requires_gpu: bool = True
+    vram_gb: float = 0.0
+    util_percent: float = 0.0
+    node_affinity: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Reservation:
+    """Resources claimed by a placed task until it completes."""
+    task_id: int
+    work_type: str
+    node: Optional[str]
+    gpu_index: Optional[int]
+    vram_gb: float
+    util_percent: float
+    placed_at: float
+
+    @property
+    def target(self) -> str:
+        if self.gpu_index is None:
+            return self.node or "any"
+        return f"{self.node}/gpu{self.gpu_index}"
+
+
+@dataclass
+class GPUState:
+    """One GPU: last observation, baseline and reservations."""
+    node: str
+    gpu_index: int
+    name: str
+    vram_total_gb: float
+    observed_free_gb: float = 0.0
+    observed_util: float = 0.0
+    baseline_used_gb: float = 0.0
+    baseline_util: float = 0.0
+    online: bool = True
+    reservations: Dict[int, Reservation] = field(default_factory=dict)
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return self.node, self.gpu_index
+
+    @property
+    def reserved_vram_gb(self) -> float:
+        return sum(r.vram_gb for r in self.reservations.values())
+
+    @property
+    def reserved_util(self) -> float:
+        return sum(r.util_percent for r in self.reservations.values())
+
+    @property
+    def effective_free_gb(self) -> float:
+        accounted = self.vram_total_gb - self.baseline_used_gb - self.reserved_vram_gb
+        return min(self.observed_free_gb, accounted)
+
+    @property
+    def effective_util(self) -> float:
+        return max(self.observed_util, self.baseline_util + self.reserved_util)
+
+    @property
+    def drift_gb(self) -> float:
+        """Observed usage beyond baseline plus reservations (negative: claims not yet in use)."""
+        observed_used = self.vram_total_gb - self.observed_free_gb
+        return observed_used - self.baseline_used_gb - self.reserved_vram_gb
+
+    def observe(self, free_gb: float, util: float, total_gb: float):
+        self.vram_total_gb = total_gb
+        self.observed_free_gb = free_gb
+        self.observed_util = util
+        used = total_gb - free_gb
+        if not self.reservations:
+            self.baseline_used_gb, self.baseline_util = used, util
+        else:
+            # Background load can only be known to have shrunk while our tasks run
+            self.baseline_used_gb = min(self.baseline_used_gb, used)
+            self.baseline_util = min(self.baseline_util, util)
+
+
+@dataclass
+class Placement:
+    """A pending task matched to a target."""
+    task: TaskDemand
+    reservation: Reservation
+    wait_seconds: float
+
+
+class PlacementEngine:
+    """
+    Per-GPU placement for autonomous work.
+
+    ``thresholds`` is read on every placement, so runtime updates to the
+    scheduler's ``gpu_util_max`` and ``vram_free_min_gb`` apply immediately.
+    """
+
+    def __init__(
+        self,
+        thresholds: Dict[str, Any],
+        aging_seconds: float = AGING_SECONDS,
+        starvation_seconds: float = STARVATION_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.thresholds = thresholds
+        self.aging_seconds = aging_seconds
+        self.starvation_seconds = starvation_seconds
+        self._clock = clock
+        self.gpus: Dict[Tuple[str, int], GPUState] = {}
+        self.reservations: Dict[int, Reservation] = {}
+        self.held: List[str] = []
+        self.stats = {"placed": 0, "released": 0, "observations": 0}
+
+    # =========================================================================
+    # State
+    # =========================================================================
+
+    def observe(self, resources: "ClusterResources"):
+        """Refresh every GPU from a monitor snapshot."""
+        seen = set()
+        for node in resources.nodes:
+            for gpu in node.gpus:
+                key = (node.name, gpu.gpu_index)
+                state = self.gpus.get(key)
+                if state is None:
+                    state = self.gpus[key] = GPUState(node.name, gpu.gpu_index, gpu.gpu_name, gpu.vram_total_gb)
+                state.observe(gpu.vram_free_gb, gpu.utilization_percent, gpu.vram_total_gb)
+                state.online = node.online
+                seen.add(key)
+        # A GPU missing from this snapshot keeps its reservations but takes no new work
+        for key, state in self.gpus.items():
+            if key not in seen:
+                state.online = False
+        self.stats["observations"] += 1
+
+    def release(self, task_id: int) -> Optional[Reservation]:
+        """Free a completed task's reservation."""
+        reservation = self.reservations.pop(task_id, None)
+        if reservation is None:
+            return None
+        if reservation.gpu_index is not None:
+            state = self.gpus.get((reservation.node, reservation.gpu_index))
+            if state:
+                state.reservations.pop(task_id, None)
+        self.stats["released"] += 1
+        return reservation
+
+    # =========================================================================
+    # Placement
+    # =========================================================================
+
+    def effective_priority(self, task: TaskDemand, now: float) -> float:
+        """Priority rank plus one level per ``aging_seconds`` waited, up to ``high``."""
+        rank = PRIORITY_RANK.get(task.priority, PRIORITY_RANK["normal"])
+        if rank >= PRIORITY_RANK["high"]:
+            return rank
+        waited = max(0.0, now - task.submitted_at)
+        return min(rank + waited / self.aging_seconds, PRIORITY_RANK["high"])
+
+    def _fits(self, state: GPUState, task: TaskDemand) -> bool:
+        # Same admission rule as before, applied to the GPU with its reservations counted
+        return (
+            state.online
+            and state.effective_util < self.thresholds["gpu_util_max"]
+            and state.effective_free_gb >= max(self.thresholds["vram_free_min_gb"], task.vram_gb)
+        )
+
+    def _candidates(self, task: TaskDemand) -> List[GPUState]:
+        return [
+            state for state in self.gpus.values()
+            if not task.node_affinity or state.node in task.node_affinity
+        ]
+
+    def place(self, pending: List[TaskDemand], slots: int, now: Optional[float] = None) -> List[Placement]:
+        """
+        Place up to ``slots`` pending tasks and reserve their resources.
+
+        Returns placements in start order; tasks that do not fit stay pending.
+        """
+        now = self._clock() if now is None else now
+        ranked = sorted(
+            (task for task in pending if task.task_id not in self.reservations),
+            key=lambda task: (
+                -math.floor(self.effective_priority(task, now)),
+                -task.vram_gb,
+                task.submitted_at,
+            ),
+        )
+        placements: List[Placement] = []
+        held: set = set()
+
+        for task in ranked:
+            if len(placements) >= slots:
+                break
+
+            if not task.requires_gpu:
+                node = task.node_affinity[0] if task.node_affinity else None
+                placements.append(self._reserve(task, node, None, now))
+                continue
+
+            candidates = [s for s in self._candidates(task) if s.key not in held]
+            fitting = [s for s in candidates if self._fits(s, task)]
+            if fitting:
+                # Best fit: least VRAM left over, then least busy
+                best = min(fitting, key=lambda s: (s.effective_free_gb - task.vram_gb, s.effective_util))
+                placements.append(self._reserve(task, best.node, best.gpu_index, now))
+            elif not held and now - task.submitted_at >= self.starvation_seconds:
+                # Keep the GPU this task fits best once drained free of backfill
+                drainable = [s for s in candidates if s.online and s.vram_total_gb >= task.vram_gb]
+                if drainable:
+                    hold = min(drainable, key=lambda s: (s.vram_total_gb - task.vram_gb, -s.effective_free_gb))
+                    held.add(hold.key)
+
+        self.held = [f"{node}/gpu{index}" for node, index in sorted(held)]
+        return placements
+
+    def _reserve(self, task: TaskDemand, node: Optional[str], gpu_index: Optional[int], now: float) -> Placement:
+        reservation = Reservation(
+            task_id=task.task_id,
+            work_type=task.work_type,
+            node=node,
+            gpu_index=gpu_index,
+            vram_gb=task.vram_gb if gpu_index is not None else 0.0,
+            util_percent=task.util_percent if gpu_index is not None else 0.0,
+            placed_at=now,
+        )
+        self.reservations[task.task_id] = reservation
+        if gpu_index is not None:
+            self.gpus[(node, gpu_index)].reservations[task.task_id] = reservation
+        wait = max(0.0, now - task.submitted_at)
+        self.stats["placed"] += 1
+        PLACEMENTS.labels(work_type=task.work_type, target="gpu" if gpu_index is not None else "cpu").inc()
+        PLACEMENT_WAIT.observe(wait)
+        return Placement(task=task, reservation=reservation, wait_seconds=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "active_reservations": len(self.reservations),
+            "held_gpus": list(self.held),
+            "gpus": [
+                {
+                    "node": s.node,
+                    "gpu_index": s.gpu_index,
+                    "name": s.name,
+                    "online": s.online,
+                    "vram_total_gb": round(s.vram_total_gb, 2),
+                    "observed_free_gb": round(s.observed_free_gb, 2),
+                    "effective_free_gb": round(s.effective_free_gb, 2),
+                    "effective_util": round(s.effective_util, 1),
+                    "reserved_vram_gb": round(s.reserved_vram_gb, 2),
+                    "drift_gb": round(s.drift_gb, 2),
+                    "tasks": sorted(s.reservations),
+                }
+                for s in self.gpus.values()
+            ],
+        }
@@ -453,6 +453,8 @@ def create_hardware_router():
     """Create FastAPI router for hardware discovery endpoints."""
     from fastapi import APIRouter, Query
 
+    from hydra_tools.service_bus import provides
+
     router = APIRouter(prefix="/hardware", tags=["hardware"])
     discovery = HardwareDiscovery()
 
@@ -470,6 +472,7 @@ def create_hardware_router():
         return discovery.to_dict(inventory)
 
     @router.get("/gpus")
+    @provides("/hardware/gpus")
     async def get_gpu_status(
         refresh: bool = Query(False, description="Force refresh (bypass cache)")
     ):
@@ -13,7 +13,7 @@ import json
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import logging
 
 import httpx
@@ -24,6 +24,25 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Client broadcasts: changes within this window are coalesced per entity
+HA_BROADCAST_COALESCE_MS = int(os.getenv("HA_BROADCAST_COALESCE_MS", "50"))
+# A client that cannot take one message within this time is disconnected
+HA_CLIENT_SEND_TIMEOUT = float(os.getenv("HA_CLIENT_SEND_TIMEOUT", "5"))
+HA_RECONNECT_MAX_SECONDS = float(os.getenv("HA_RECONNECT_MAX_SECONDS", "60"))
+
+# Rooms guessed from entity names when HA has no area for an entity
+DEFAULT_ROOMS = {
+    "living_room": "Living Room",
+    "bedroom": "Bedroom",
+    "office": "Office",
+    "kitchen": "Kitchen",
+    "bathroom": "Bathroom",
+    "garage": "Garage",
+    "entryway": "Entryway",
+}
+
+CONTROLLABLE_DOMAINS = ["light", "switch", "fan", "cover", "climate", "lock"]
+
 
 # =============================================================================
 # Data Models
@@ -162,149 +181,23 @@ class HomeAssistantClient:
             logger.error(f"Failed to call HA service {domain}.{service}: {e}")
             return False
 
+    async def snapshot(self) -> "HomeStateMirror":
+        """One-off mirror of the current states, for reads when the tracker is not running."""
+        mirror = HomeStateMirror()
+        mirror.seed(await self.get_states())
+        return mirror
+
     async def get_rooms(self) -> List[RoomState]:
         """Get rooms with their states."""
-        states = await self.get_states()
-
-        # Group entities by area/room
-        room_map: Dict[str, Dict[str, Any]] = {}
-
-        # Default rooms based on common naming
-        default_rooms = {
-            "living_room": "Living Room",
-            "bedroom": "Bedroom",
-            "office": "Office",
-            "kitchen": "Kitchen",
-            "bathroom": "Bathroom",
-            "garage": "Garage",
-            "entryway": "Entryway",
-        }
-
-        for entity in states:
-            entity_id = entity.get("entity_id", "")
-            state = entity.get("state", "")
-            attrs = entity.get("attributes", {})
-
-            # Try to determine room from entity name
-            friendly_name = attrs.get("friendly_name", "").lower()
-            room_key = None
-
-            for key, name in default_rooms.items():
-                if key.replace("_", " ") in friendly_name or key in entity_id:
-                    room_key = key
-                    break
-
-            if not room_key:
-                continue
-
-            if room_key not in room_map:
-                room_map[room_key] = {
-                    "id": room_key,
-                    "name": default_rooms[room_key],
-                    "temp": None,
-                    "humidity": None,
-                    "devices": 0,
-                    "lights_on": False,
-                    "active": False,
-                }
-
-            room_map[room_key]["devices"] += 1
-
-            # Track light states
-            if entity_id.startswith("light."):
-                if state == "on":
-                    room_map[room_key]["lights_on"] = True
-                    room_map[room_key]["active"] = True
-
-            # Track temperature
-            if entity_id.startswith("sensor.") and "temperature" in entity_id:
-                try:
-                    room_map[room_key]["temp"] = float(state)
-                except (ValueError, TypeError):
-                    pass
-
-            # Track climate
-            if entity_id.startswith("climate."):
-                try:
-                    room_map[room_key]["temp"] = float(attrs.get("current_temperature", 0))
-                except (ValueError, TypeError):
-                    pass
-
-        # Create room states
-        rooms = []
-        for room_data in room_map.values():
-            rooms.append(RoomState(**room_data))
-
-        # If no rooms found from HA, return mock rooms
-        if not rooms:
-            rooms = [
-                RoomState(id="living_room", name="Living Room", temp=72, devices=4, lights_on=True, active=True),
-                RoomState(id="office", name="Office", temp=70, devices=3, lights_on=True, active=True),
-                RoomState(id="bedroom", name="Bedroom", temp=68, devices=2, lights_on=False, active=False),
-                RoomState(id="kitchen", name="Kitchen", temp=71, devices=5, lights_on=True, active=True),
-                RoomState(id="entryway", name="Entryway", temp=69, devices=1, lights_on=False, active=False),
-            ]
-
-        return rooms
+        return (await self.snapshot()).rooms()
 
     async def get_devices(self, room_id: Optional[str] = None) -> List[DeviceState]:
         """Get all controllable devices."""
-        states = await self.get_states()
-        devices = []
-
-        controllable_domains = ["light", "switch", "fan", "cover", "climate", "lock"]
-
-        for entity in states:
-            entity_id = entity.get("entity_id", "")
-            domain = entity_id.split(".")[0] if "." in entity_id else ""
-
-            if domain not in controllable_domains:
-                continue
-
-            attrs = entity.get("attributes", {})
-
-            device = DeviceState(
-                id=entity_id.replace(".", "_"),
-                name=attrs.get("friendly_name", entity_id),
-                entity_id=entity_id,
-                device_type=domain,
-                state=entity.get("state", "unknown"),
-                attributes=attrs,
-            )
-            devices.append(device)
-
-        return devices
+        return (await self.snapshot()).devices(room_id)
 
     async def get_scenes(self) -> List[SceneState]:
         """Get all scenes."""
-        states = await self.get_states()
-        scenes = []
-
-        for entity in states:
-            entity_id = entity.get("entity_id", "")
-            if not entity_id.startswith("scene."):
-                continue
-
-            attrs = entity.get("attributes", {})
-
-            scene = SceneState(
-                id=entity_id.replace(".", "_"),
-                name=attrs.get("friendly_name", entity_id.replace("scene.", "").replace("_", " ").title()),
-                entity_id=entity_id,
-                icon=attrs.get("icon"),
-            )
-            scenes.append(scene)
-
-        # If no scenes found, return default scenes
-        if not scenes:
-            scenes = [
-                SceneState(id="morning_rise", name="Morning Rise", entity_id="scene.morning_rise"),
-                SceneState(id="night_mode", name="Night Mode", entity_id="scene.night_mode"),
-                SceneState(id="movie_time", name="Movie Time", entity_id="scene.movie_time"),
-                SceneState(id="lockdown", name="Lockdown", entity_id="scene.lockdown"),
-            ]
-
-        return scenes
+        return (await self.snapshot()).scenes()
 
     async def control_light(self, request: LightControlRequest) -> bool:
         """Control a light entity."""
@@ -361,6 +254,257 @@ class HomeAssistantClient:
             }
 
 
+# =============================================================================
+# Home State Mirror
+# =============================================================================
+
+def _entity_record(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "entity_id": state.get("entity_id"),
+        "state": state.get("state"),
+        "attributes": state.get("attributes", {}),
+        "last_changed": state.get("last_changed"),
+        "last_updated": state.get("last_updated"),
+    }
+
+
+def _guess_room(entity_id: str, attributes: Dict[str, Any]) -> Optional[str]:
+    friendly_name = str(attributes.get("friendly_name", "")).lower()
+    for key in DEFAULT_ROOMS:
+        if key.replace("_", " ") in friendly_name or key in entity_id:
+            return key
+    return None
+
+
+class HomeStateMirror:
+    """
+    In-memory copy of Home Assistant entity states, indexed by area, domain
+    and device.
+
+    seed() loads a full snapshot and returns what differs from the states
+    already held, so a resync after a reconnect only touches entities that
+    changed while disconnected. apply() applies one state_changed event. Areas
+    and devices come from HA's registries; entities without an area fall back
+    to the room guessed from their name.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._by_area: Dict[str, Set[str]] = {}
+        self._by_domain: Dict[str, Set[str]] = {}
+        self._by_device: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {}
+        self._area_names: Dict[str, str] = {}
+        self._device_areas: Dict[str, Optional[str]] = {}
+        self._registry: Dict[str, Dict[str, Any]] = {}
+        self.seeded = False
+        self.version = 0
+        self.last_update: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def load_registries(
+        self,
+        areas: List[Dict[str, Any]],
+        devices: List[Dict[str, Any]],
+        entities: List[Dict[str, Any]],
+    ):
+        """Set area, device and entity registry entries and reindex."""
+        self._area_names = {a["area_id"]: a.get("name") or a["area_id"] for a in areas}
+        self._device_areas = {d["id"]: d.get("area_id") for d in devices}
+        self._registry = {e["entity_id"]: e for e in entities}
+        for entity_id in self._states:
+            self._index(entity_id)
+
+    def seed(self, states: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """Replace the mirror with a snapshot; returns (changed, removed) entity ids."""
+        snapshot = {s["entity_id"]: _entity_record(s) for s in states if s.get("entity_id")}
+        changed = [eid for eid, record in snapshot.items() if self._states.get(eid) != record]
+        removed = [eid for eid in self._states if eid not in snapshot]
+        for entity_id in removed:
+            self._remove(entity_id)
+        for entity_id in changed:
+            self._states[entity_id] = snapshot[entity_id]
+            self._index(entity_id)
+        self.seeded = True
+        if changed or removed:
+            self._touch()
+        return changed, removed
+
+    def apply(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Apply a state_changed event's data. Returns "changed", "removed", or
+        None when the event changed nothing or is older than the held state.
+        """
+        entity_id = data.get("entity_id")
+        new_state = data.get("new_state")
+        if not entity_id:
+            return None
+        if new_state is None:
+            if entity_id not in self._states:
+                return None
+            self._remove(entity_id)
+            self._touch()
+            return "removed"
+
+        record = _entity_record({**new_state, "entity_id": entity_id})
+        current = self._states.get(entity_id)
+        if current == record:
+            return None
+        if current and (record["last_updated"] or "") < (current["last_updated"] or ""):
+            return None
+        self._states[entity_id] = record
+        self._index(entity_id)
+        self._touch()
+        return "changed"
+
+    def _touch(self):
+        self.version += 1
+        self.last_update = datetime.utcnow()
+
+    def _index(self, entity_id: str):
+        self._unindex(entity_id)
+        registry = self._registry.get(entity_id, {})
+        device_id = registry.get("device_id")
+        area_id = (
+            registry.get("area_id")
+            or self._device_areas.get(device_id)
+            or _guess_room(entity_id, self._states[entity_id]["attributes"])
+        )
+        domain = entity_id.split(".", 1)[0]
+        self._keys[entity_id] = (domain, area_id, device_id)
+        for index, key in ((self._by_domain, domain), (self._by_area, area_id), (self._by_device, device_id)):
+            if key is not None:
+                index.setdefault(key, set()).add(entity_id)
+
+    def _unindex(self, entity_id: str):
+        keys = self._keys.pop(entity_id, None)
+        if keys is None:
+            return
+        for index, key in zip((self._by_domain, self._by_area, self._by_device), keys):
+            if key in index:
+                index[key].discard(entity_id)
+                if not index[key]:
+                    del index[key]
+
+    def _remove(self, entity_id: str):
+        self._unindex(entity_id)
+        self._states.pop(entity_id, None)
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def get_state(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        return self._states.get(entity_id)
+
+    def get_all_states(self) -> Dict[str, Dict[str, Any]]:
+        return self._states.copy()
+
+    def entities(self, area_id: Optional[str] = None, domain: Optional[str] = None,
+                 device_id: Optional[str] = None) -> List[str]:
+        """Entity ids matching all the given index keys, sorted."""
+        selected: Optional[Set[str]] = None
+        for index, key in ((self._by_area, area_id), (self._by_domain, domain), (self._by_device, device_id)):
+            if key is None:
+                continue
+            ids = index.get(key, set())
+            selected = ids if selected is None else selected & ids
+        return sorted(self._states if selected is None else selected)
+
+    def area_name(self, area_id: str) -> str:
+        return self._area_names.get(area_id) or DEFAULT_ROOMS.get(area_id) or area_id.replace("_", " ").title()
+
+    def rooms(self) -> List[RoomState]:
+        """Rooms with aggregate state, from the area index."""
+        rooms = []
+        for area_id in sorted(self._by_area):
+            room = RoomState(id=area_id, name=self.area_name(area_id), area_id=area_id)
+            for entity_id in sorted(self._by_area[area_id]):
+                entity = self._states[entity_id]
+                state, attrs = entity["state"], entity["attributes"]
+                room.devices += 1
+                if entity_id.startswith("light.") and state == "on":
+                    room.lights_on = room.active = True
+                elif entity_id.startswith("sensor.") and "temperature" in entity_id and room.temp is None:
+                    room.temp = _as_float(state)
+                elif entity_id.startswith("sensor.") and "humidity" in entity_id:
+                    room.humidity = _as_float(state)
+                elif entity_id.startswith("climate."):
+                    room.temp = _as_float(attrs.get("current_temperature")) or room.temp
+            rooms.append(room)
+
+        # If no rooms found from HA, return mock rooms
+        if not rooms:
+            rooms = [
+                RoomState(id="living_room", name="Living Room", temp=72, devices=4, lights_on=True, active=True),
+                RoomState(id="office", name="Office", temp=70, devices=3, lights_on=True, active=True),
+                RoomState(id="bedroom", name="Bedroom", temp=68, devices=2, lights_on=False, active=False),
+                RoomState(id="kitchen", name="Kitchen", temp=71, devices=5, lights_on=True, active=True),
+                RoomState(id="entryway", name="Entryway", temp=69, devices=1, lights_on=False, active=False),
+            ]
+        return rooms
+
+    def devices(self, room_id: Optional[str] = None) -> List[DeviceState]:
+        """Controllable devices, optionally only those in one room."""
+        devices = []
+        for domain in CONTROLLABLE_DOMAINS:
+            for entity_id in self.entities(area_id=room_id, domain=domain):
+                entity = self._states[entity_id]
+                devices.append(DeviceState(
+                    id=entity_id.replace(".", "_"),
+                    name=entity["attributes"].get("friendly_name", entity_id),
+                    entity_id=entity_id,
+                    device_type=domain,
+                    state=entity["state"] or "unknown",
+                    room_id=self._keys[entity_id][1],
+                    attributes=entity["attributes"],
+                ))
+        return devices
+
+    def scenes(self) -> List[SceneState]:
+        """Scenes, from the domain index."""
+        scenes = [
+            SceneState(
+                id=entity_id.replace(".", "_"),
+                name=self._states[entity_id]["attributes"].get(
+                    "friendly_name", entity_id.replace("scene.", "").replace("_", " ").title()
+                ),
+                entity_id=entity_id,
+                icon=self._states[entity_id]["attributes"].get("icon"),
+            )
+            for entity_id in self.entities(domain="scene")
+        ]
+
+        # If no scenes found, return default scenes
+        if not scenes:
+            scenes = [
+                SceneState(id="morning_rise", name="Morning Rise", entity_id="scene.morning_rise"),
+                SceneState(id="night_mode", name="Night Mode", entity_id="scene.night_mode"),
+                SceneState(id="movie_time", name="Movie Time", entity_id="scene.movie_time"),
+                SceneState(id="lockdown", name="Lockdown", entity_id="scene.lockdown"),
+            ]
+        return scenes
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "seeded": self.seeded,
+            "entities": len(self._states),
+            "areas": len(self._by_area),
+            "domains": len(self._by_domain),
+            "devices": len(self._by_device),
+            "version": self.version,
+        }
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
 # =============================================================================
 # Home Assistant WebSocket Client (Real-time Events)
 # =============================================================================
@@ -379,6 +523,7 @@ class HAWebSocketClient:
         self._ws = None
         self._message_id = 1
         self._subscribers: Dict[str, List[Callable]] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
         self._running = False
         self._task = None
 
@@ -393,6 +538,7 @@ class HAWebSocketClient:
 
         try:
             self._ws = await websockets.connect(self.ws_url)
+            self._message_id = 1  # Ids are per connection
 
             # Receive auth_required message
             msg = await self._ws.recv()
@@ -432,6 +578,28 @@ class HAWebSocketClient:
             await self._ws.close()
             self._ws = None
 
+    async def call(self, msg_type: str, timeout: float = 30, **payload) -> Any:
+        """
+        Send a command and wait for its result; listen() must be running to
+        receive it. Raises RuntimeError if HA reports failure.
+        """
+        if not self._ws:
+            raise ConnectionError("HA WebSocket not connected")
+
+        msg_id = self._message_id
+        self._message_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        try:
+            await self._ws.send(json.dumps({"id": msg_id, "type": msg_type, **payload}))
+            data = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(msg_id, None)
+
+        if not data.get("success", True):
+            raise RuntimeError(f"HA {msg_type} failed: {data.get('error')}")
+        return data.get("result")
+
     async def subscribe_events(self, event_type: str = None) -> int:
         """Subscribe to Home Assistant events."""
         if not self._ws:
@@ -491,7 +659,12 @@ class HAWebSocketClient:
             data = json.loads(msg)
             msg_type = data.get("type", "")
 
-            if msg_type == "event":
+            if msg_type == "result":
+                future = self._pending.get(data.get("id"))
+                if future and not future.done():
+                    future.set_result(data)
+
+            elif msg_type == "event":
                 event = data.get("event", {})
                 event_type = event.get("event_type", "")
 
@@ -536,6 +709,10 @@ class HAWebSocketClient:
                 logger.error(f"HA WebSocket error: {e}")
                 self._running = False
 
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("HA WebSocket connection closed"))
+
     async def start_listening(self):
         """Start listening in background."""
         if self._task is not None:
@@ -556,96 +733,244 @@ class HAWebSocketClient:
 # Entity State Tracker
 # =============================================================================
 
-class EntityStateTracker:
-    """Tracks entity states in real-time via WebSocket."""
+class ClientChannel:
+    """
+    Outgoing entity updates for one WebSocket client.
 
-    def __init__(self):
-        self._states: Dict[str, Dict[str, Any]] = {}
+    Updates are coalesced per entity - a burst of changes sends only each
+    entity's latest state - and flushed by a task of the channel's own, so a
+    slow client holds at most one pending update per entity and never delays
+    the others. A client that cannot take a message within the send timeout
+    is dropped.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        initial: Optional[Dict[str, Any]] = None,
+        on_drop: Optional[Callable[["ClientChannel"], None]] = None,
+        coalesce_seconds: float = HA_BROADCAST_COALESCE_MS / 1000,
+        send_timeout: float = HA_CLIENT_SEND_TIMEOUT,
+    ):
+        self.websocket = websocket
+        self.coalesce_seconds = coalesce_seconds
+        self.send_timeout = send_timeout
+        self._on_drop = on_drop
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._wakeup = asyncio.Event()
+        self.stats = {"sent": 0, "coalesced": 0}
+        self._task = asyncio.create_task(self._run(initial))
+
+    def push(self, entity_id: str, state: Optional[Dict[str, Any]]):
+        """Queue an entity's new state (None when it was removed)."""
+        if entity_id in self._pending:
+            self.stats["coalesced"] += 1
+        self._pending[entity_id] = state
+        self._wakeup.set()
+
+    async def _send(self, message: Dict[str, Any]):
+        await asyncio.wait_for(self.websocket.send_text(json.dumps(message)), self.send_timeout)
+        self.stats["sent"] += 1
+
+    async def _run(self, initial: Optional[Dict[str, Any]]):
+        try:
+            if initial is not None:
+                await self._send(initial)
+            while True:
+                await self._wakeup.wait()
+                await asyncio.sleep(self.coalesce_seconds)
+                self._wakeup.clear()
+                pending, self._pending = self._pending, {}
+                for entity_id, state in pending.items():
+                    timestamp = datetime.utcnow().isoformat() + "Z"
+                    if state is None:
+                        await self._send({"type": "state_removed", "entity_id": entity_id, "timestamp": timestamp})
+                    else:
+                        await self._send({
+                            "type": "state_changed",
+                            "entity_id": entity_id,
+                            "state": state,
+                            "timestamp": timestamp,
+                        })
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Dropping entity update client: {type(e).__name__} {e}")
+            if self._on_drop:
+                self._on_drop(self)
+
+    def cancel(self):
+        self._task.cancel()
+
+    async def close(self):
+        self.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+class EntityStateTracker:
+    """
+    Mirrors Home Assistant entity states in real-time via WebSocket.
+
+    On connect the tracker subscribes to state changes, then seeds its
+    HomeStateMirror from one get_states snapshot (events arriving meanwhile
+    are applied after it). After a dropped connection it reconnects with
+    backoff and resyncs from a fresh snapshot, broadcasting only what changed
+    while it was away.
+    """
+
+    def __init__(self, url: str = None, token: str = None):
+        self.mirror = HomeStateMirror()
+        self._url = url
+        self._token = token
         self._ws_client: Optional[HAWebSocketClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._buffer: Optional[List[Dict[str, Any]]] = None
         self._last_update = datetime.utcnow()
-        self._connected_clients: List[WebSocket] = []
+        self._channels: Dict[WebSocket, ClientChannel] = {}
+        self._stats = {"events": 0, "ignored_events": 0, "resyncs": 0, "reconnects": 0, "clients_dropped": 0}
 
     async def start(self):
         """Start the entity state tracker."""
-        self._ws_client = HAWebSocketClient()
+        if self._task is not None:
+            return True
+        self._ws_client = HAWebSocketClient(url=self._url, token=self._token)
 
         # Add state change handler
         self._ws_client.add_subscriber("state_changed", self._on_state_change)
 
-        # Start WebSocket listener
-        if await self._ws_client.start_listening():
+        if await self._sync():
+            self._task = asyncio.create_task(self._run())
             logger.info("Entity state tracker started")
             return True
         return False
 
     async def stop(self):
         """Stop the tracker."""
+        for task in (self._task, self._listener):
+            if task:
+                task.cancel()
+        self._task = self._listener = None
         if self._ws_client:
             await self._ws_client.disconnect()
+        for channel in list(self._channels.values()):
+            await channel.close()
+        self._channels.clear()
+
+    async def _registry(self, kind: str) -> List[Dict[str, Any]]:
+        try:
+            return await self._ws_client.call(f"config/{kind}_registry/list") or []
+        except Exception as e:
+            logger.warning(f"HA {kind} registry unavailable: {e}")
+            return []
+
+    async def _sync(self) -> bool:
+        """Connect, subscribe and seed or resync the mirror from a snapshot."""
+        client = self._ws_client
+        if not await client.connect():
+            return False
+
+        self._buffer = []
+        self._listener = asyncio.create_task(client.listen())
+        try:
+            await client.call("subscribe_events", event_type="state_changed")
+            states, areas, devices, entities = await asyncio.gather(
+                client.call("get_states"), self._registry("area"), self._registry("device"), self._registry("entity"),
+            )
+        except Exception as e:
+            logger.error(f"HA state sync failed: {e}")
+            self._buffer = None
+            self._listener.cancel()
+            await client.disconnect()
+            return False
+
+        resync = self.mirror.seeded
+        self.mirror.load_registries(areas, devices, entities)
+        changed, removed = self.mirror.seed(states or [])
+        if resync:
+            self._stats["resyncs"] += 1
+            for entity_id in changed:
+                self._broadcast_state_change(entity_id, self.mirror.get_state(entity_id))
+            for entity_id in removed:
+                self._broadcast_state_change(entity_id, None)
+            logger.info(f"HA resync: {len(changed)} changed, {len(removed)} removed")
+
+        buffered, self._buffer = self._buffer, None
+        for data in buffered:
+            self._apply(data)
+        return True
+
+    async def _run(self):
+        """Reconnect and resync whenever the listener exits."""
+        while True:
+            await self._listener
+            self._stats["reconnects"] += 1
+            logger.warning("HA WebSocket lost, reconnecting")
+            delay = 1.0
+            while not await self._sync():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, HA_RECONNECT_MAX_SECONDS)
 
     async def _on_state_change(self, event: Dict[str, Any]):
         """Handle state change event."""
         data = event.get("data", {})
-        entity_id = data.get("entity_id", "")
-        new_state = data.get("new_state", {})
-
-        if entity_id and new_state:
-            self._states[entity_id] = {
-                "entity_id": entity_id,
-                "state": new_state.get("state"),
-                "attributes": new_state.get("attributes", {}),
-                "last_changed": new_state.get("last_changed"),
-                "last_updated": new_state.get("last_updated"),
-            }
-            self._last_update = datetime.utcnow()
-
-            # Broadcast to connected WebSocket clients
-            await self._broadcast_state_change(entity_id, self._states[entity_id])
+        if self._buffer is not None:
+            self._buffer.append(data)
+        else:
+            self._apply(data)
 
-    async def _broadcast_state_change(self, entity_id: str, state: Dict[str, Any]):
-        """Broadcast state change to connected clients."""
-        message = json.dumps({
-            "type": "state_changed",
-            "entity_id": entity_id,
-            "state": state,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        })
+    def _apply(self, data: Dict[str, Any]):
+        self._stats["events"] += 1
+        change = self.mirror.apply(data)
+        if change is None:
+            self._stats["ignored_events"] += 1
+            return
+        self._last_update = datetime.utcnow()
+        entity_id = data["entity_id"]
+        self._broadcast_state_change(entity_id, self.mirror.get_state(entity_id))
 
-        disconnected = []
-        for client in self._connected_clients:
-            try:
-                await client.send_text(message)
-            except:
-                disconnected.append(client)
+    def _broadcast_state_change(self, entity_id: str, state: Optional[Dict[str, Any]]):
+        """Queue a state change (None for a removal) for every connected client."""
+        for channel in self._channels.values():
+            channel.push(entity_id, state)
 
-        # Remove disconnected clients
-        for client in disconnected:
-            self._connected_clients.remove(client)
+    def _drop_channel(self, channel: ClientChannel):
+        if self._channels.get(channel.websocket) is channel:
+            del self._channels[channel.websocket]
+            self._stats["clients_dropped"] += 1
 
-    def add_client(self, websocket: WebSocket):
-        """Add a WebSocket client to receive updates."""
-        self._connected_clients.append(websocket)
+    def add_client(self, websocket: WebSocket, initial: Optional[Dict[str, Any]] = None) -> ClientChannel:
+        """Add a WebSocket client to receive updates, sending ``initial`` first."""
+        channel = ClientChannel(websocket, initial=initial, on_drop=self._drop_channel)
+        self._channels[websocket] = channel
+        return channel
 
     def remove_client(self, websocket: WebSocket):
         """Remove a WebSocket client."""
-        if websocket in self._connected_clients:
-            self._connected_clients.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel:
+            channel.cancel()
 
     def get_state(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get cached state for an entity."""
-        return self._states.get(entity_id)
+        return self.mirror.get_state(entity_id)
 
     def get_all_states(self) -> Dict[str, Dict[str, Any]]:
         """Get all cached states."""
-        return self._states.copy()
+        return self.mirror.get_all_states()
 
     def get_status(self) -> Dict[str, Any]:
         """Get tracker status."""
         return {
             "connected": self._ws_client is not None and self._ws_client._running,
-            "entities_tracked": len(self._states),
+            "entities_tracked": len(self.mirror),
             "last_update": self._last_update.isoformat() + "Z",
-            "connected_clients": len(self._connected_clients),
+            "connected_clients": len(self._channels),
+            "mirror": self.mirror.get_stats(),
+            **self._stats,
         }
 
 
@@ -695,6 +1020,14 @@ async def stop_entity_tracker():
 # FastAPI Router
 # =============================================================================
 
+async def get_home_view() -> HomeStateMirror:
+    """The tracker's live mirror once seeded, else a one-off REST snapshot."""
+    tracker = get_entity_tracker()
+    if tracker.mirror.seeded:
+        return tracker.mirror
+    return await get_ha_client().snapshot()
+
+
 def create_home_automation_router() -> APIRouter:
     """Create FastAPI router for home automation endpoints."""
     router = APIRouter(prefix="/home", tags=["home-automation"])
@@ -703,27 +1036,34 @@ def create_home_automation_router() -> APIRouter:
     async def get_status():
         """Get Home Assistant connection status."""
         client = get_ha_client()
+        tracker_status = get_entity_tracker().get_status()
+        if tracker_status["connected"]:
+            return {
+                "connected": True,
+                "configured": True,
+                "url": client.url,
+                "source": "websocket",
+                "entities": tracker_status["entities_tracked"],
+                "last_update": tracker_status["last_update"],
+            }
         return await client.get_status()
 
     @router.get("/rooms")
     async def get_rooms():
         """Get all rooms with their states."""
-        client = get_ha_client()
-        rooms = await client.get_rooms()
+        rooms = (await get_home_view()).rooms()
         return {"rooms": [r.dict() for r in rooms]}
 
     @router.get("/devices")
     async def get_devices(room_id: Optional[str] = None):
         """Get all controllable devices."""
-        client = get_ha_client()
-        devices = await client.get_devices(room_id)
+        devices = (await get_home_view()).devices(room_id)
         return {"devices": [d.dict() for d in devices]}
 
     @router.get("/scenes")
     async def get_scenes():
         """Get all scenes."""
-        client = get_ha_client()
-        scenes = await client.get_scenes()
+        scenes = (await get_home_view()).scenes()
         return {"scenes": [s.dict() for s in scenes]}
 
     @router.post("/light/control")
@@ -747,21 +1087,15 @@ def create_home_automation_router() -> APIRouter:
             raise HTTPException(status_code=400, detail="Invalid action. Use: on, off, toggle")
 
         client = get_ha_client()
-        states = await client.get_states()
+        view = await get_home_view()
 
-        # Find lights matching the room
+        # Lights in the room, from the area and domain indexes
         controlled = []
-        for entity in states:
-            entity_id = entity.get("entity_id", "")
-            if not entity_id.startswith("light."):
-                continue
-
-            # Check if light belongs to room
-            if room_id.replace("_", " ") in entity_id or room_id in entity_id:
-                success = await client.control_light(
-                    LightControlRequest(entity_id=entity_id, action=action)
-                )
-                controlled.append({"entity_id": entity_id, "success": success})
+        for entity_id in view.entities(area_id=room_id, domain="light"):
+            success = await client.control_light(
+                LightControlRequest(entity_id=entity_id, action=action)
+            )
+            controlled.append({"entity_id": entity_id, "success": success})
 
         return {"room_id": room_id, "action": action, "controlled": controlled}
 
@@ -805,8 +1139,10 @@ def create_home_automation_router() -> APIRouter:
         state = tracker.get_state(entity_id)
         if state:
             return state
+        if tracker.mirror.seeded:
+            raise HTTPException(status_code=404, detail=f"Entity {entity_id} not found")
 
-        # Fallback to REST API if not in cache
+        # Fallback to REST API if the mirror is not seeded
         client = get_ha_client()
         states = await client.get_states()
         for entity in states:
@@ -831,20 +1167,16 @@ def create_home_automation_router() -> APIRouter:
         """WebSocket endpoint for real-time entity state updates."""
         await websocket.accept()
 
+        # The initial state dump goes out first on the client's channel, so
+        # no update between the snapshot and the subscription is lost
         tracker = get_entity_tracker()
-        tracker.add_client(websocket)
-
-        # Send initial state dump
-        try:
-            initial_states = tracker.get_all_states()
-            await websocket.send_json({
-                "type": "initial_state",
-                "entities": list(initial_states.values()),
-                "count": len(initial_states),
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            })
-        except Exception as e:
-            logger.error(f"Failed to send initial state: {e}")
+        initial_states = tracker.get_all_states()
+        tracker.add_client(websocket, initial={
+            "type": "initial_state",
+            "entities": list(initial_states.values()),
+            "count": len(initial_states),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        })
 
         try:
             # Keep connection alive and listen for client messages
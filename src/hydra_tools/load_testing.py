@@ -0,0 +1,689 @@
+"""
+Hydra Load Testing - Sustained Throughput Harness for the Tools API
+
+Drives ``hydra_tools.api:app`` in-process with a configurable mix of hot
+endpoints and reports throughput, latency percentiles and event-loop lag.
+Complements the benchmark suites, which measure model quality and
+single-request speed rather than how the API behaves under concurrent load.
+
+Features:
+- In-memory Qdrant, Ollama, Prometheus and Meilisearch stand-ins, wired in by
+  giving every ``httpx.AsyncClient`` a stub transport (backends are matched
+  by port, so hard-coded cluster addresses resolve too)
+- Requests issued as raw ASGI calls, so numbers are server-side handling time
+- Closed-loop (fixed concurrency) or open-loop (fixed arrival rate) load
+- Event-loop lag sampled throughout the run
+- JSON baselines that later runs can be diffed against
+
+Usage:
+    python scripts/loadtest-api.py --mix default --duration 30
+    python scripts/loadtest-api.py --save-baseline main
+    python scripts/loadtest-api.py --compare main
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from hydra_tools.similarity import cosine_many
+
+logger = logging.getLogger(__name__)
+
+LOADTEST_DIR = Path(os.environ.get("HYDRA_DATA_DIR", "/data")) / "loadtest"
+
+EMBEDDING_DIM = 768  # nomic-embed-text, matches the semantic cache default
+
+# Prompts cycled through by the default endpoint mix. Repeats are deliberate
+# so semantic cache lookups see a realistic hit rate.
+SAMPLE_QUERIES = [
+    "How much VRAM does the 70B model need?",
+    "Restart the ComfyUI container",
+    "What is the current GPU temperature on hydra-ai?",
+    "Summarize yesterday's research queue results",
+    "Which models are loaded in TabbyAPI?",
+    "Find notes about the Qdrant migration",
+    "Show me the Empire of Broken Queens chapter outline",
+    "Why did the nightly backup fail?",
+]
+
+
+# =============================================================================
+# Stub Backends
+# =============================================================================
+
+def fake_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Deterministic bag-of-words embedding; shared words raise cosine similarity."""
+    vector = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        digest = hashlib.md5(word.encode()).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class StubBackends:
+    """
+    In-memory stand-ins for the services the hot endpoints call.
+
+    Requests are routed by port: 6333 Qdrant, 11434 Ollama, 9090 Prometheus,
+    7700 Meilisearch. Requests to ``loopback_port`` go back into
+    ``loopback_app`` (the API calling itself); anything else gets a fast 503,
+    like a backend that is down.
+    """
+
+    PORTS = {6333: "qdrant", 11434: "ollama", 9090: "prometheus", 7700: "meilisearch"}
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        loopback_app: Any = None,
+        loopback_port: int = 8700,
+    ):
+        self.latency_ms = latency_ms
+        self.loopback_port = loopback_port
+        self._loopback = httpx.ASGITransport(app=loopback_app) if loopback_app is not None else None
+        self.points: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self.documents: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.requests: Counter = Counter()
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        port = request.url.port
+        if port == self.loopback_port and self._loopback is not None:
+            self.requests["loopback"] += 1
+            return await self._loopback.handle_async_request(request)
+
+        backend = self.PORTS.get(port)
+        self.requests[backend or "unreachable"] += 1
+        if backend is None:
+            return httpx.Response(503, json={"error": "backend not stubbed"})
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        body = json.loads(request.content) if request.content else {}
+        parts = [p for p in request.url.path.split("/") if p]
+        return getattr(self, f"_{backend}")(request.method, parts, body, request)
+
+    def _qdrant(self, method: str, parts: List[str], body: Dict, request) -> httpx.Response:
+        if len(parts) < 2 or parts[0] != "collections":
+            return httpx.Response(200, json={"result": {"collections": []}, "status": "ok"})
+        collection = parts[1]
+        points = self.points.setdefault(collection, {})
+        action = "/".join(parts[2:])
+
+        if action == "":
+            return httpx.Response(200, json={
+                "result": {"status": "green", "points_count": len(points), "vectors_count": len(points)},
+                "status": "ok",
+            })
+        if action == "points" and method == "PUT":
+            for point in body.get("points", []):
+                points[point["id"]] = {"vector": point.get("vector"), "payload": point.get("payload", {})}
+            return httpx.Response(200, json={"result": {"status": "completed"}, "status": "ok"})
+        if action == "points/search":
+            vector = body.get("vector")
+            if not isinstance(vector, list):
+                return httpx.Response(400, json={"status": {"error": "vector is required"}})
+            threshold = body.get("score_threshold") or 0.0
+            scores = cosine_many(vector, [point["vector"] for point in points.values()])
+            hits = [
+                {"id": point_id, "score": float(score), "payload": point["payload"]}
+                for (point_id, point), score in zip(points.items(), scores)
+                if score >= threshold
+            ]
+            hits.sort(key=lambda h: h["score"], reverse=True)
+            return httpx.Response(200, json={"result": hits[: body.get("limit", 10)], "status": "ok"})
+        if action == "points/scroll":
+            listed = [{"id": pid, "payload": p["payload"]} for pid, p in points.items()]
+            return httpx.Response(200, json={
+                "result": {"points": listed[: body.get("limit", 10)], "next_page_offset": None},
+                "status": "ok",
+            })
+        if action == "points/payload":
+            for point_id in body.get("points", []):
+                if point_id in points:
+                    points[point_id]["payload"].update(body.get("payload", {}))
+            return httpx.Response(200, json={"result": {"status": "completed"}, "status": "ok"})
+        return httpx.Response(200, json={"result": True, "status": "ok"})
+
+    def _ollama(self, method: str, parts: List[str], body: Dict, request) -> httpx.Response:
+        path = "/".join(parts)
+        if path == "api/embeddings":
+            return httpx.Response(200, json={"embedding": fake_embedding(body.get("prompt", ""))})
+        if path == "api/embed":
+            inputs = body.get("input", "")
+            inputs = inputs if isinstance(inputs, list) else [inputs]
+            return httpx.Response(200, json={"embeddings": [fake_embedding(text) for text in inputs]})
+        if path in ("api/generate", "api/chat"):
+            return httpx.Response(200, json={"response": "ok", "message": {"content": "ok"}, "done": True})
+        if path == "api/tags":
+            return httpx.Response(200, json={"models": [{"name": "nomic-embed-text:latest"}]})
+        return httpx.Response(404, json={"error": "not found"})
+
+    def _prometheus(self, method: str, parts: List[str], body: Dict, request) -> httpx.Response:
+        return httpx.Response(200, json={"status": "success", "data": {"resultType": "vector", "result": []}})
+
+    def _meilisearch(self, method: str, parts: List[str], body: Dict, request) -> httpx.Response:
+        if not parts or parts[0] != "indexes":
+            return httpx.Response(200, json={"status": "available"})
+        if len(parts) == 1:
+            self.documents.setdefault(body.get("uid", "default"), {})
+            return httpx.Response(202, json={"taskUid": 0, "status": "enqueued"})
+        index = self.documents.setdefault(parts[1], {})
+        action = "/".join(parts[2:])
+
+        if action == "documents" and method in ("POST", "PUT"):
+            for doc in body if isinstance(body, list) else [body]:
+                index[str(doc.get("id"))] = doc
+            return httpx.Response(202, json={"taskUid": 0, "status": "enqueued"})
+        if action == "search":
+            words = set(re.findall(r"\w+", body.get("q", "").lower()))
+            hits = [
+                doc for doc in index.values()
+                if words & set(re.findall(r"\w+", str(doc.get("content", "")).lower()))
+            ]
+            limit = body.get("limit", 20)
+            return httpx.Response(200, json={
+                "hits": hits[:limit], "estimatedTotalHits": len(hits), "query": body.get("q", ""),
+            })
+        if action == "stats":
+            return httpx.Response(200, json={"numberOfDocuments": len(index), "isIndexing": False})
+        return httpx.Response(200, json={"uid": parts[1]})
+
+
+@contextmanager
+def stub_transport_installed(backends: StubBackends) -> Iterator[StubBackends]:
+    """Give every ``httpx.AsyncClient`` created inside the block the stub transport.
+
+    Clients built with an explicit transport or mounts are left alone.
+    """
+    transport = backends.transport()
+    original_init = httpx.AsyncClient.__init__
+
+    def patched_init(client, *args, **kwargs):
+        if kwargs.get("transport") is None and not kwargs.get("mounts"):
+            kwargs["transport"] = transport
+        original_init(client, *args, **kwargs)
+
+    httpx.AsyncClient.__init__ = patched_init
+    try:
+        yield backends
+    finally:
+        httpx.AsyncClient.__init__ = original_init
+
+
+# =============================================================================
+# Endpoint Mixes
+# =============================================================================
+
+@dataclass
+class LoadEndpoint:
+    """One endpoint in a load mix. ``body``/``params`` build request n's payload."""
+    name: str
+    method: str
+    path: str
+    body: Optional[Callable[[int], Any]] = None
+    params: Optional[Callable[[int], Dict[str, Any]]] = None
+    stream: bool = False  # SSE: measured to the first event, then disconnected
+
+
+def _query(n: int) -> str:
+    return SAMPLE_QUERIES[n % len(SAMPLE_QUERIES)]
+
+
+ENDPOINTS: Dict[str, LoadEndpoint] = {
+    endpoint.name: endpoint for endpoint in [
+        LoadEndpoint(
+            "cache_lookup", "POST", "/cache/lookup",
+            body=lambda n: {"query": _query(n), "model": "qwen2.5-7b"},
+        ),
+        LoadEndpoint(
+            "unified_search", "POST", "/search/",
+            body=lambda n: {"query": _query(n), "limit": 10},
+        ),
+        LoadEndpoint(
+            "memory_store", "POST", "/hybrid-memory/store",
+            body=lambda n: {"content": f"{_query(n)} (observation {n})", "tier": "episodic", "tags": ["loadtest"]},
+        ),
+        LoadEndpoint(
+            "memory_search", "GET", "/hybrid-memory/search",
+            params=lambda n: {"q": _query(n), "limit": 10, "backends": "vector,keyword"},
+        ),
+        LoadEndpoint(
+            "scheduler_enqueue", "POST", "/agent-scheduler/schedule",
+            body=lambda n: {"agent_type": "research", "description": f"loadtest task {n}", "priority": "low"},
+        ),
+        LoadEndpoint(
+            "events_stream", "GET", "/api/v1/events/stream",
+            params=lambda n: {"client_id": f"loadtest-{n}", "events": "heartbeat"},
+            stream=True,
+        ),
+    ]
+}
+
+# Relative weights per named mix
+MIXES: Dict[str, Dict[str, float]] = {
+    "default": {
+        "cache_lookup": 4, "unified_search": 2, "memory_search": 2,
+        "memory_store": 1, "scheduler_enqueue": 1, "events_stream": 0.2,
+    },
+    "read-heavy": {"cache_lookup": 6, "unified_search": 3, "memory_search": 3, "events_stream": 0.5},
+    "write-heavy": {"memory_store": 4, "scheduler_enqueue": 4, "cache_lookup": 1},
+    "search": {"unified_search": 1, "memory_search": 1},
+    "sse": {"events_stream": 1},
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Resolve a mix name or an inline ``name=weight,...`` spec."""
+    if spec in MIXES:
+        return dict(MIXES[spec])
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+# =============================================================================
+# Reports and Baselines
+# =============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+@dataclass
+class EndpointStats:
+    """Latency and outcome summary for one endpoint."""
+    name: str
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    status_codes: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_samples(cls, name: str, latencies: List[float], statuses: List[int], elapsed: float) -> "EndpointStats":
+        errors = sum(1 for s in statuses if s == 0 or s >= 500)
+        return cls(
+            name=name,
+            requests=len(latencies),
+            errors=errors,
+            throughput_rps=round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            p50_ms=round(percentile(latencies, 50), 3),
+            p95_ms=round(percentile(latencies, 95), 3),
+            p99_ms=round(percentile(latencies, 99), 3),
+            max_ms=round(max(latencies, default=0.0), 3),
+            status_codes={str(code): count for code, count in sorted(Counter(statuses).items())},
+        )
+
+
+@dataclass
+class LoadTestReport:
+    """Results of one load test run."""
+    mix: Dict[str, float]
+    mode: str
+    concurrency: int
+    target_rps: Optional[float]
+    duration_s: float
+    total: EndpointStats
+    endpoints: Dict[str, EndpointStats]
+    loop_lag_ms: Dict[str, float]
+    started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    backend_requests: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def error_rate(self) -> float:
+        return self.total.errors / self.total.requests if self.total.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadTestReport":
+        data = dict(data)
+        data["total"] = EndpointStats(**data["total"])
+        data["endpoints"] = {name: EndpointStats(**stats) for name, stats in data["endpoints"].items()}
+        return cls(**data)
+
+    def format_table(self) -> str:
+        rate = f", target {self.target_rps:.0f} rps" if self.target_rps else ""
+        lines = [
+            f"Mode: {self.mode} (concurrency {self.concurrency}{rate}), {self.duration_s:.1f}s",
+            f"{'endpoint':<20}{'reqs':>8}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+        ]
+        for stats in [self.total, *self.endpoints.values()]:
+            lines.append(
+                f"{stats.name:<20}{stats.requests:>8}{stats.errors:>6}{stats.throughput_rps:>9.1f}"
+                f"{stats.p50_ms:>10.2f}{stats.p95_ms:>10.2f}{stats.p99_ms:>10.2f}{stats.max_ms:>10.2f}"
+            )
+        lag = self.loop_lag_ms
+        lines.append(
+            f"{'event loop lag':<43}{lag.get('p50_ms', 0):>10.2f}{lag.get('p95_ms', 0):>10.2f}"
+            f"{lag.get('p99_ms', 0):>10.2f}{lag.get('max_ms', 0):>10.2f}"
+        )
+        return "\n".join(lines)
+
+
+def _baseline_path(name: str, directory: Optional[Path] = None) -> Path:
+    if not re.fullmatch(r"[\w.-]+", name):
+        raise ValueError(f"Invalid baseline name: {name}")
+    return (directory or LOADTEST_DIR) / f"{name}.json"
+
+
+def save_baseline(report: LoadTestReport, name: str, directory: Optional[Path] = None) -> Path:
+    """Write a report as a named baseline."""
+    path = _baseline_path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report.to_dict(), indent=2))
+    return path
+
+
+def load_baseline(name: str, directory: Optional[Path] = None) -> LoadTestReport:
+    """Load a named baseline; raises FileNotFoundError if it does not exist."""
+    return LoadTestReport.from_dict(json.loads(_baseline_path(name, directory).read_text()))
+
+
+def compare_reports(
+    baseline: LoadTestReport,
+    current: LoadTestReport,
+    tolerance: float = 0.10,
+    noise_floor_ms: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """
+    Diff a run against a baseline.
+
+    Latency rows regress when they grow by more than ``tolerance`` and by more
+    than ``noise_floor_ms``; throughput regresses when it drops by more than
+    ``tolerance``. Returns one row per compared metric.
+    """
+    rows = []
+
+    def add(scope: str, metric: str, before: float, after: float, higher_is_worse: bool):
+        change = (after - before) / before if before else (0.0 if after == before else math.inf)
+        if higher_is_worse:
+            regressed = change > tolerance and after - before > noise_floor_ms
+        else:
+            regressed = change < -tolerance
+        rows.append({
+            "scope": scope,
+            "metric": metric,
+            "baseline": before,
+            "current": after,
+            "change_pct": round(change * 100, 1) if math.isfinite(change) else None,
+            "regressed": regressed,
+        })
+
+    pairs = [(baseline.total, current.total)] + [
+        (baseline.endpoints[name], stats)
+        for name, stats in current.endpoints.items()
+        if name in baseline.endpoints
+    ]
+    for before, after in pairs:
+        scope = "overall" if before is baseline.total else before.name
+        add(scope, "throughput_rps", before.throughput_rps, after.throughput_rps, higher_is_worse=False)
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            add(scope, metric, getattr(before, metric), getattr(after, metric), higher_is_worse=True)
+
+    for metric in ("p99_ms", "max_ms"):
+        add("event_loop", f"lag_{metric}", baseline.loop_lag_ms.get(metric, 0.0),
+            current.loop_lag_ms.get(metric, 0.0), higher_is_worse=True)
+
+    rows.append({
+        "scope": "overall",
+        "metric": "error_rate",
+        "baseline": round(baseline.error_rate, 4),
+        "current": round(current.error_rate, 4),
+        "change_pct": None,
+        "regressed": current.error_rate > baseline.error_rate + 0.01,
+    })
+    return rows
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+class LoadTestRunner:
+    """
+    Drives an ASGI app with a weighted endpoint mix.
+
+    Closed-loop by default: ``concurrency`` workers each issue the next request
+    as soon as the previous one finishes, which finds maximum sustained
+    throughput. With ``rps`` set the run is open-loop instead: requests start
+    on a fixed schedule whether or not earlier ones have finished, and latency
+    includes any time spent queued behind them.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        mix: Dict[str, float],
+        duration: float = 10.0,
+        concurrency: int = 32,
+        rps: Optional[float] = None,
+        warmup: float = 1.0,
+        endpoints: Optional[Dict[str, LoadEndpoint]] = None,
+        lag_interval: float = 0.01,
+        seed: int = 0,
+    ):
+        self.app = app
+        self.endpoints = endpoints or ENDPOINTS
+        unknown = set(mix) - set(self.endpoints)
+        if unknown:
+            raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+        self.mix = {name: weight for name, weight in mix.items() if weight > 0}
+        if not self.mix:
+            raise ValueError("Load mix has no endpoints with positive weight")
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rps = rps
+        self.warmup = warmup
+        self.lag_interval = lag_interval
+        self._random = random.Random(seed)
+        self._sequence = 0
+        self._recording = False
+        self._latencies: Dict[str, List[float]] = {}
+        self._statuses: Dict[str, List[int]] = {}
+        self._lag: List[float] = []
+
+    def _next_endpoint(self) -> LoadEndpoint:
+        names = list(self.mix)
+        name = self._random.choices(names, weights=[self.mix[n] for n in names])[0]
+        return self.endpoints[name]
+
+    async def call(self, endpoint: LoadEndpoint, n: int) -> int:
+        """Issue one request as a raw ASGI call and return its status code."""
+        query = urlencode(endpoint.params(n)) if endpoint.params else ""
+        body = json.dumps(endpoint.body(n)).encode() if endpoint.body else b""
+        headers = [(b"host", b"loadtest"), (b"accept", b"*/*")]
+        if endpoint.body:
+            headers.append((b"content-type", b"application/json"))
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": endpoint.method, "scheme": "http", "path": endpoint.path,
+            "raw_path": endpoint.path.encode(), "query_string": query.encode(),
+            "root_path": "", "headers": headers,
+            "client": ("127.0.0.1", 50000), "server": ("loadtest", 80),
+        }
+        status = 0
+        first_event = asyncio.Event()
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Streaming clients hang up after the first event; others never reach here
+            await first_event.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and message.get("body") and endpoint.stream:
+                first_event.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception as e:
+            logger.debug(f"{endpoint.name} raised: {e}")
+            return 0
+        return status
+
+    async def _issue(self, endpoint: LoadEndpoint, launched: float) -> None:
+        n = self._sequence
+        self._sequence += 1
+        status = await self.call(endpoint, n)
+        if self._recording:
+            self._latencies[endpoint.name].append((time.perf_counter() - launched) * 1000)
+            self._statuses[endpoint.name].append(status)
+
+    async def _monitor_loop_lag(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            if self._recording:
+                self._lag.append(max(0.0, (time.perf_counter() - start - self.lag_interval) * 1000))
+
+    async def _closed_loop(self, deadline: float) -> None:
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self._issue(self._next_endpoint(), time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _open_loop(self, start: float, deadline: float) -> None:
+        interval = 1.0 / self.rps
+        tasks = set()
+        sent = 0
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            while start + sent * interval <= now:
+                task = asyncio.create_task(self._issue(self._next_endpoint(), time.perf_counter()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                sent += 1
+            await asyncio.sleep(max(0.0, start + sent * interval - time.perf_counter()))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self) -> LoadTestReport:
+        self._latencies = {name: [] for name in self.mix}
+        self._statuses = {name: [] for name in self.mix}
+        self._lag = []
+        stop = asyncio.Event()
+        monitor = asyncio.create_task(self._monitor_loop_lag(stop))
+
+        try:
+            if self.warmup > 0:
+                self._recording = False
+                await self._closed_loop(time.perf_counter() + self.warmup)
+
+            self._recording = True
+            start = time.perf_counter()
+            deadline = start + self.duration
+            if self.rps:
+                await self._open_loop(start, deadline)
+            else:
+                await self._closed_loop(deadline)
+            elapsed = time.perf_counter() - start
+            self._recording = False
+        finally:
+            stop.set()
+            await monitor
+
+        endpoints = {
+            name: EndpointStats.from_samples(name, self._latencies[name], self._statuses[name], elapsed)
+            for name in self.mix
+        }
+        total = EndpointStats.from_samples(
+            "all endpoints",
+            [v for values in self._latencies.values() for v in values],
+            [s for values in self._statuses.values() for s in values],
+            elapsed,
+        )
+        return LoadTestReport(
+            mix=self.mix,
+            mode="open-loop" if self.rps else "closed-loop",
+            concurrency=self.concurrency,
+            target_rps=self.rps,
+            duration_s=round(elapsed, 3),
+            total=total,
+            endpoints=endpoints,
+            loop_lag_ms={
+                "p50_ms": round(percentile(self._lag, 50), 3),
+                "p95_ms": round(percentile(self._lag, 95), 3),
+                "p99_ms": round(percentile(self._lag, 99), 3),
+                "max_ms": round(max(self._lag, default=0.0), 3),
+            },
+        )
+
+
+async def run_api_load_test(
+    mix: Dict[str, float],
+    duration: float = 10.0,
+    concurrency: int = 32,
+    rps: Optional[float] = None,
+    warmup: float = 1.0,
+    backend_latency_ms: float = 0.0,
+    lifespan: bool = False,
+) -> LoadTestReport:
+    """
+    Load test ``hydra_tools.api:app`` in-process against stub backends.
+
+    The semantic cache is seeded with half of the sample queries so lookups
+    see both hits and misses. ``lifespan`` also runs the app's startup and
+    shutdown (schedulers, background monitors) for the duration of the run.
+    """
+    from hydra_tools.api import app
+    from hydra_tools.semantic_cache import get_cache
+
+    backends = StubBackends(latency_ms=backend_latency_ms, loopback_app=app)
+    with stub_transport_installed(backends):
+        cache = get_cache()
+        # Drop any client created before the stub transport was installed
+        cache._initialized = False
+        for query in SAMPLE_QUERIES[::2]:
+            await cache.store(query, f"cached answer: {query}", "qwen2.5-7b", tokens_used=100)
+
+        runner = LoadTestRunner(app, mix, duration=duration, concurrency=concurrency, rps=rps, warmup=warmup)
+        if lifespan:
+            async with app.router.lifespan_context(app):
+                report = await runner.run()
+        else:
+            report = await runner.run()
+
+    report.backend_requests = dict(backends.requests)
+    return report
@@ -6,20 +6,37 @@ Provides:
 - Request ID tracking across log entries
 - Automatic context injection (method, path, duration)
 - Log level filtering via environment variable
+- Non-blocking output: records are queued and written in batches by a
+  background thread, with a bounded buffer and an explicit drop policy
+- Per-logger sampling of high-volume debug messages
 """
 
+import atexit
+import itertools
 import json
 import logging
+import os
 import sys
+import threading
 import time
 import uuid
+from collections import deque
 from contextvars import ContextVar
-from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Deque, Dict, List, Mapping, Optional, Sequence, TextIO
 
 # Context variable for request ID tracking
 request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
+# Extra fields added to every record logged in the current context (see LogContext)
+log_context_ctx: ContextVar[Mapping[str, Any]] = ContextVar("log_context", default={})
+
+# Attributes every LogRecord has; anything else on a record is an extra field
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "request_id", "taskName"}
+
+DROP_POLICIES = ("drop_newest", "drop_oldest", "block")
+
 
 class JSONFormatter(logging.Formatter):
     """
@@ -34,69 +51,416 @@ class JSONFormatter(logging.Formatter):
         "request_id": "abc-123",
         "extra": { ... }
     }
+
+    The timestamp is when the record was created, not when it was formatted,
+    since formatting happens later on the log writer thread.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encode = json.JSONEncoder(default=str).encode
+        # (second, "YYYY-MM-DDTHH:MM:SS") for the last second formatted
+        self._second_prefix = (None, "")
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        cached_second, prefix = self._second_prefix
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_prefix = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1_000_000):06d}Z"
+
     def format(self, record: logging.LogRecord) -> str:
         log_obj = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
-        # Add request ID if available
-        request_id = request_id_ctx.get()
+        # Add request ID, captured when the record was queued
+        request_id = record.__dict__.get("request_id") or request_id_ctx.get()
         if request_id:
             log_obj["request_id"] = request_id
 
         # Add extra fields from record
-        extra_fields = {}
-        for key, value in record.__dict__.items():
-            if key not in (
-                "name", "msg", "args", "created", "filename", "funcName",
-                "levelname", "levelno", "lineno", "module", "msecs",
-                "pathname", "process", "processName", "relativeCreated",
-                "stack_info", "exc_info", "exc_text", "thread", "threadName",
-                "message", "taskName"
-            ):
-                extra_fields[key] = value
-
+        extra_fields = {
+            key: value for key, value in record.__dict__.items()
+            if key not in _RESERVED_ATTRS
+        }
         if extra_fields:
             log_obj["extra"] = extra_fields
 
         # Add exception info if present
         if record.exc_info:
             log_obj["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_obj["exception"] = record.exc_text
+
+        return self._encode(log_obj)
+
+
+class LogSampler:
+    """
+    Keeps one in every N low-level records per logger.
+
+    Rates apply to a logger and its children (most specific name wins) and
+    only to records at or below ``max_level``, so warnings and errors are
+    never sampled away.
+    """
+
+    def __init__(self, rates: Optional[Mapping[str, float]] = None, max_level: int = logging.DEBUG):
+        self.max_level = max_level
+        self._every: Dict[str, int] = {}
+        self._resolved: Dict[str, int] = {}
+        self._counters: Dict[str, itertools.count] = {}
+        for name, rate in (rates or {}).items():
+            self.set_rate(name, rate)
+
+    def set_rate(self, logger_name: str, rate: float) -> None:
+        if not 0 < rate <= 1:
+            raise ValueError(f"Sampling rate must be in (0, 1], got {rate}")
+        self._every[logger_name] = max(1, round(1 / rate))
+        self._resolved.clear()
+
+    def _resolve(self, name: str) -> int:
+        every = self._resolved.get(name)
+        if every is None:
+            every, candidate = 1, name
+            while candidate:
+                if candidate in self._every:
+                    every = self._every[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = every
+        return every
+
+    def keep(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or not self._every:
+            return True
+        every = self._resolve(record.name)
+        if every == 1:
+            return True
+        counter = self._counters.get(record.name)
+        if counter is None:
+            counter = self._counters.setdefault(record.name, itertools.count())
+        return next(counter) % every == 0
+
+    @classmethod
+    def from_env(cls, value: str) -> "LogSampler":
+        """Parse ``logger=rate,...`` (e.g. ``hydra_tools.dashboard_api=0.01``)."""
+        rates = {}
+        for item in value.split(","):
+            name, sep, rate = item.strip().partition("=")
+            if sep:
+                rates[name.strip()] = float(rate)
+        return cls(rates)
+
+
+class _PipelineStats:
+    def __init__(self):
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = {}
+        self.sampled_out = 0
+        self.write_errors = 0
+        self.reported_dropped = 0
+        self.lock = threading.Lock()
+
+    def record_drop(self, record: logging.LogRecord) -> None:
+        with self.lock:
+            self.dropped += 1
+            self.dropped_by_level[record.levelname] = self.dropped_by_level.get(record.levelname, 0) + 1
+
+
+class ContextQueueHandler(logging.Handler):
+    """
+    Buffers records for the writer thread without doing any I/O.
+
+    Request ID and LogContext fields are copied onto a copy of the record
+    here, in the caller's context, and the message is rendered so later
+    changes to its arguments do not show up. Formatting happens on the
+    writer thread. The buffer is a deque, whose append and popleft are
+    thread-safe, so no handler lock is taken.
+    """
+
+    def __init__(self, stats: _PipelineStats, capacity: int = 10000,
+                 drop_policy: str = "drop_newest", sampler: Optional[LogSampler] = None,
+                 wake_threshold: int = 512):
+        super().__init__()
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy {drop_policy!r}, expected one of {DROP_POLICIES}")
+        self.buffer: Deque[logging.LogRecord] = deque()
+        self.capacity = capacity
+        self.stats = stats
+        self.drop_policy = drop_policy
+        self.sampler = sampler
+        self.wake_threshold = min(wake_threshold, capacity)
+        self.wakeup = threading.Event()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.sampler is not None and not self.sampler.keep(record):
+            self.stats.sampled_out += 1
+            return
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        # Shallow copy; other handlers (pytest's caplog, for one) still see the original
+        copied = logging.LogRecord.__new__(logging.LogRecord)
+        copied.__dict__ = record.__dict__.copy()
+        copied.message = copied.msg = message
+        copied.args = None
+
+        request_id = request_id_ctx.get()
+        if request_id:
+            copied.request_id = request_id
+        context = log_context_ctx.get()
+        if context:
+            # Explicit extra= fields win over context fields
+            for key, value in context.items():
+                copied.__dict__.setdefault(key, value)
+        return copied
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        buffer = self.buffer
+        if len(buffer) >= self.capacity:
+            if self.drop_policy == "drop_newest":
+                self.stats.record_drop(record)
+                return
+            if self.drop_policy == "drop_oldest":
+                try:
+                    self.stats.record_drop(buffer.popleft())
+                except IndexError:
+                    pass
+            else:
+                # block: wait for the writer to make room
+                self.wakeup.set()
+                while len(buffer) >= self.capacity:
+                    time.sleep(0.001)
+        buffer.append(record)
+        if len(buffer) >= self.wake_threshold:
+            self.wakeup.set()
+
+
+class BatchingLogWriter:
+    """
+    Writer thread that drains the log buffer in batches.
+
+    The thread wakes when the buffer passes the handler's wake threshold or
+    every ``flush_interval`` seconds. Each batch is formatted and written
+    with one write and one flush per stream. Drops since the last batch are
+    reported as a warning line.
+    """
+
+    def __init__(self, handler: ContextQueueHandler, formatter: logging.Formatter,
+                 streams: List[TextIO], stats: _PipelineStats,
+                 batch_size: int = 512, flush_interval: float = 0.05):
+        self.handler = handler
+        self.formatter = formatter
+        self.streams = streams
+        self.stats = stats
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="hydra-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything already buffered, then stop the thread."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self.handler.wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        buffer = self.handler.buffer
+        wakeup = self.handler.wakeup
+        while True:
+            if not buffer:
+                if self._stopping:
+                    self._write([])
+                    return
+                wakeup.wait(self.flush_interval)
+                wakeup.clear()
+                continue
+            batch = []
+            while buffer and len(batch) < self.batch_size:
+                batch.append(buffer.popleft())
+            self._write(batch)
+
+    def _drop_notice(self) -> Optional[logging.LogRecord]:
+        dropped = self.stats.dropped
+        if dropped == self.stats.reported_dropped:
+            return None
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            "Log buffer full (%s), dropped %d records (%d total)",
+            (self.handler.drop_policy, dropped - self.stats.reported_dropped, dropped), None,
+        )
+        self.stats.reported_dropped = dropped
+        return record
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        notice = self._drop_notice()
+        if notice is not None:
+            records.append(notice)
+        if not records:
+            return
+
+        lines = []
+        for i, record in enumerate(records, 1):
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self.stats.write_errors += 1
+            if i % 256 == 0:
+                # Hand the GIL back so the event loop thread is not kept
+                # waiting for a whole batch to format
+                time.sleep(0)
+        text = "\n".join(lines) + "\n"
+        for stream in self.streams:
+            try:
+                stream.write(text)
+                stream.flush()
+            except Exception:
+                self.stats.write_errors += 1
+        self.stats.written += len(lines)
+        self.stats.batches += 1
+
+
+class LogPipeline:
+    """Buffering handler and writer thread for the root logger."""
+
+    def __init__(self, formatter: logging.Formatter, streams: List[TextIO],
+                 queue_size: int = 10000, drop_policy: str = "drop_newest",
+                 sampler: Optional[LogSampler] = None, batch_size: int = 512,
+                 owned_files: Sequence[TextIO] = ()):
+        self.stats = _PipelineStats()
+        self.handler = ContextQueueHandler(self.stats, queue_size, drop_policy, sampler, batch_size)
+        self.writer = BatchingLogWriter(self.handler, formatter, streams, self.stats, batch_size)
+        # Files opened for this pipeline, closed when it stops
+        self._files = list(owned_files)
+
+    def start(self) -> None:
+        self.writer.start()
+
+    def stop(self) -> None:
+        self.writer.stop()
+        for f in self._files:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self.handler.buffer),
+            "capacity": self.handler.capacity,
+            "drop_policy": self.handler.drop_policy,
+            "written": self.stats.written,
+            "batches": self.stats.batches,
+            "dropped": self.stats.dropped,
+            "dropped_by_level": dict(self.stats.dropped_by_level),
+            "sampled_out": self.stats.sampled_out,
+            "write_errors": self.stats.write_errors,
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    """The active logging pipeline, if setup_logging has run."""
+    return _pipeline
+
+
+def get_log_stats() -> Dict[str, Any]:
+    """Queue depth, write, drop and sampling counters for the logging pipeline."""
+    return _pipeline.get_stats() if _pipeline is not None else {}
+
+
+def set_log_sampling(logger_name: str, rate: float) -> None:
+    """Keep only ``rate`` of DEBUG records from ``logger_name`` and its children."""
+    if _pipeline is None:
+        raise RuntimeError("Logging is not set up; call setup_logging() first")
+    if _pipeline.handler.sampler is None:
+        _pipeline.handler.sampler = LogSampler()
+    _pipeline.handler.sampler.set_rate(logger_name, rate)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _pipeline
+    if _pipeline is not None:
+        logging.getLogger().removeHandler(_pipeline.handler)
+        _pipeline.stop()
+        _pipeline = None
 
-        return json.dumps(log_obj, default=str)
+
+atexit.register(shutdown_logging)
 
 
 def setup_logging(
     level: str = "INFO",
     json_format: bool = True,
-    log_to_file: Optional[str] = None
+    log_to_file: Optional[str] = None,
+    queue_size: int = 10000,
+    drop_policy: str = "drop_newest",
 ) -> logging.Logger:
     """
     Configure structured logging for the application.
 
+    Records are handed to a bounded queue and written in batches by a
+    background thread, so logging never does I/O on the caller's thread.
+    When the queue is full, ``drop_policy`` decides what happens:
+    ``drop_newest`` discards the incoming record, ``drop_oldest`` evicts the
+    oldest queued record, and ``block`` waits for space. Drops are counted
+    (see get_log_stats) and reported in the log.
+
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_format: Use JSON formatting (True) or standard format (False)
         log_to_file: Optional file path for log output
+        queue_size: Maximum number of records waiting to be written
+        drop_policy: What to do when the queue is full
+
+    Environment overrides: HYDRA_LOG_LEVEL, HYDRA_LOG_JSON, HYDRA_LOG_QUEUE_SIZE,
+    HYDRA_LOG_DROP_POLICY, HYDRA_LOG_SAMPLING (``logger=rate,...``).
 
     Returns:
         Configured root logger
     """
-    import os
+    global _pipeline
 
     # Allow environment override
     level = os.environ.get("HYDRA_LOG_LEVEL", level).upper()
     json_format = os.environ.get("HYDRA_LOG_JSON", str(json_format)).lower() == "true"
+    queue_size = int(os.environ.get("HYDRA_LOG_QUEUE_SIZE", queue_size))
+    drop_policy = os.environ.get("HYDRA_LOG_DROP_POLICY", drop_policy).lower()
+    sampling = os.environ.get("HYDRA_LOG_SAMPLING", "")
 
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level, logging.INFO))
 
-    # Remove existing handlers
+    # Remove existing handlers, flushing a previous pipeline
+    shutdown_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
@@ -109,29 +473,32 @@ def setup_logging(
             datefmt="%Y-%m-%d %H:%M:%S"
         )
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-
-    # File handler if specified
+    # Console output, plus a file if specified
+    streams: List[TextIO] = [sys.stdout]
+    files: List[TextIO] = []
     if log_to_file:
-        file_handler = logging.FileHandler(log_to_file)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        files.append(open(log_to_file, "a", encoding="utf-8"))
+
+    _pipeline = LogPipeline(
+        formatter,
+        streams + files,
+        queue_size=queue_size,
+        drop_policy=drop_policy,
+        sampler=LogSampler.from_env(sampling) if sampling else None,
+        owned_files=files,
+    )
+    _pipeline.start()
+    root_logger.addHandler(_pipeline.handler)
 
     # Reduce noise from third-party libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
 
-    # Configure uvicorn loggers to use our formatter
+    # uvicorn logs go through the root pipeline like everything else
     for uvicorn_logger_name in ("uvicorn", "uvicorn.error"):
         uvicorn_logger = logging.getLogger(uvicorn_logger_name)
         uvicorn_logger.handlers = []  # Remove default handlers
-        if json_format:
-            uvicorn_handler = logging.StreamHandler(sys.stdout)
-            uvicorn_handler.setFormatter(formatter)
-            uvicorn_logger.addHandler(uvicorn_handler)
+        uvicorn_logger.propagate = True
 
     # Suppress uvicorn access logs entirely (we use our middleware instead)
     uvicorn_access = logging.getLogger("uvicorn.access")
@@ -147,44 +514,17 @@ def get_uvicorn_log_config(json_format: bool = True) -> dict:
     Get uvicorn logging configuration compatible with our setup.
 
     Pass this to uvicorn.run(log_config=...) to ensure consistent logging.
+    uvicorn's loggers propagate to the root logger configured by
+    setup_logging, so they share its formatter and writer thread;
+    ``json_format`` is accepted for compatibility.
     """
-    if not json_format:
-        # Standard format - just disable access logs
-        return {
-            "version": 1,
-            "disable_existing_loggers": False,
-            "handlers": {
-                "default": {
-                    "class": "logging.StreamHandler",
-                    "stream": "ext://sys.stdout",
-                },
-            },
-            "loggers": {
-                "uvicorn": {"handlers": ["default"], "level": "INFO", "propagate": False},
-                "uvicorn.error": {"handlers": ["default"], "level": "INFO", "propagate": False},
-                "uvicorn.access": {"handlers": [], "level": "CRITICAL", "propagate": False},
-            },
-        }
-
-    # JSON format with disabled access logs (we use middleware instead)
+    # Access logs disabled (we use middleware instead)
     return {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {
-            "json": {
-                "()": "hydra_tools.logging_config.JSONFormatter",
-            },
-        },
-        "handlers": {
-            "default": {
-                "formatter": "json",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stdout",
-            },
-        },
         "loggers": {
-            "uvicorn": {"handlers": ["default"], "level": "INFO", "propagate": False},
-            "uvicorn.error": {"handlers": ["default"], "level": "INFO", "propagate": False},
+            "uvicorn": {"handlers": [], "level": "INFO", "propagate": True},
+            "uvicorn.error": {"handlers": [], "level": "INFO", "propagate": True},
             "uvicorn.access": {"handlers": [], "level": "CRITICAL", "propagate": False},
         },
     }
@@ -199,6 +539,9 @@ class LogContext:
     """
     Context manager for adding temporary context to logs.
 
+    Fields live in a context variable, so concurrent requests each see only
+    their own context, and nested contexts add to the outer one.
+
     Usage:
         with LogContext(user_id="123", action="login"):
             logger.info("User action")  # Will include user_id and action
@@ -206,23 +549,14 @@ class LogContext:
 
     def __init__(self, **kwargs):
         self.context = kwargs
-        self.old_factory = None
+        self._token = None
 
     def __enter__(self):
-        self.old_factory = logging.getLogRecordFactory()
-        context = self.context
-
-        def record_factory(*args, **kwargs):
-            record = self.old_factory(*args, **kwargs)
-            for key, value in context.items():
-                setattr(record, key, value)
-            return record
-
-        logging.setLogRecordFactory(record_factory)
+        self._token = log_context_ctx.set({**log_context_ctx.get(), **self.context})
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        logging.setLogRecordFactory(self.old_factory)
+        log_context_ctx.reset(self._token)
 
 
 def generate_request_id() -> str:
@@ -4,18 +4,33 @@ Cluster Logs API for Hydra Command Center
 Provides REST API endpoints for querying logs from Loki.
 Supports filtering by service, level, time range, and text search.
 
+Queries page backwards through the time range with an opaque cursor,
+asking Loki for one time window at a time (starting small and doubling),
+so a busy cluster answers from the most recent minutes without scanning
+the whole range. Loki returns each stream already sorted; streams are
+k-way merged rather than re-sorted. ``/logs/tail`` follows new lines over
+Loki's tail API as SSE or NDJSON.
+
 Author: Hydra Autonomous System
 Created: 2025-12-16
 """
 
+import asyncio
+import heapq
+import json
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 import logging
 import re
 
 import httpx
-from fastapi import APIRouter, Query
+import websockets
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 
@@ -28,6 +43,20 @@ logger = logging.getLogger(__name__)
 
 LOKI_URL = os.getenv("LOKI_URL", "http://192.168.1.244:3100")
 
+# Seconds label and service lists are served from memory
+LABEL_CACHE_TTL = float(os.getenv("HYDRA_LOGS_LABEL_TTL", "30"))
+
+# Span of the first window a query asks Loki for; each further window doubles
+FIRST_WINDOW_SECONDS = float(os.getenv("HYDRA_LOGS_FIRST_WINDOW", "900"))
+
+# SSE comment sent when a tail has been quiet this long
+TAIL_KEEPALIVE_SECONDS = 15.0
+
+MAX_MESSAGE_CHARS = 500
+
+# Loki's default max_entries_limit_per_query
+MAX_ENTRIES_PER_TIMESTAMP = 5000
+
 
 # =============================================================================
 # Data Models
@@ -46,6 +75,133 @@ class LogQueryResponse(BaseModel):
     total: int
     query: str
     time_range: Dict[str, str]
+    next_cursor: Optional[str] = None
+
+
+# =============================================================================
+# Level Parsing
+# =============================================================================
+
+_LEVEL_NAMES = {
+    "error": "ERROR", "err": "ERROR", "fatal": "ERROR", "panic": "ERROR", "critical": "ERROR", "crit": "ERROR",
+    "warn": "WARN", "warning": "WARN",
+    "debug": "DEBUG", "trace": "DEBUG",
+    "info": "INFO",
+}
+
+_LEVEL_PATTERN = re.compile(r"\b(" + "|".join(_LEVEL_NAMES) + r")\b", re.IGNORECASE)
+
+
+def parse_log_level(message: str) -> str:
+    """
+    Level of a log line: the first level word in it (``ERROR``, ``level=warn``,
+    ``"level":"debug"``...), or INFO if there is none.
+    """
+    match = _LEVEL_PATTERN.search(message)
+    return _LEVEL_NAMES[match.group(1).lower()] if match else "INFO"
+
+
+def _level_regex(level: str) -> str:
+    """Line filter regex for a level, matching the words parse_log_level maps to it."""
+    words = [word for word, name in _LEVEL_NAMES.items() if name == level.upper()]
+    if not words:
+        return f"(?i){level}"
+    return r"(?i)\b(" + "|".join(words) + r")\b"
+
+
+def _logql_string(value: str) -> str:
+    """Quote a value as a LogQL string literal."""
+    return json.dumps(value)
+
+
+# =============================================================================
+# Stream Merging and Paging
+# =============================================================================
+
+# (timestamp ns, stream key, line, stream labels)
+RawEntry = Tuple[int, str, str, Dict[str, str]]
+
+
+def _stream_entries(stream: Dict[str, Any]) -> Iterator[RawEntry]:
+    labels = stream.get("stream", {})
+    key = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    for timestamp_ns, line in stream.get("values", []):
+        yield int(timestamp_ns), key, line, labels
+
+
+def merge_streams(streams: List[Dict[str, Any]], newest_first: bool = True) -> Iterator[RawEntry]:
+    """
+    Lazily merge Loki result streams, each already in timestamp order, into
+    one sequence. Entries with the same timestamp are ordered by stream
+    labels, then by their order within the stream, so a query repeated over
+    the same data merges identically.
+    """
+    iterators = [_stream_entries(s) for s in sorted(streams, key=lambda s: sorted(s.get("stream", {}).items()))]
+    return heapq.merge(*iterators, key=lambda entry: (entry[0], entry[1]), reverse=newest_first)
+
+
+@dataclass
+class LogCursor:
+    """
+    Position in a backward query: the range still to read is
+    [start_ns, end_ns), minus the first ``skip`` entries at end_ns - 1,
+    which an earlier page already returned.
+    """
+
+    start_ns: int
+    end_ns: int
+    skip: int = 0
+
+    def encode(self) -> str:
+        return f"{self.start_ns}.{self.end_ns}.{self.skip}"
+
+    @classmethod
+    def decode(cls, value: str) -> "LogCursor":
+        try:
+            start_ns, end_ns, skip = (int(part) for part in value.split("."))
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {value!r}") from None
+        if start_ns >= end_ns or skip < 0:
+            raise ValueError(f"Invalid cursor: {value!r}")
+        return cls(start_ns, end_ns, skip)
+
+
+def _iso_utc(timestamp_ns: int) -> str:
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+# =============================================================================
+# Label Cache
+# =============================================================================
+
+class _TTLCache:
+    """Values that expire after ``ttl`` seconds; concurrent misses share one fetch."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._values.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._fill(key, fetch))
+        # One caller going away must not cancel the fetch for the others
+        return await asyncio.shield(pending)
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            self._values[key] = (time.monotonic() + self.ttl, value)
+            return value
+        finally:
+            self._pending.pop(key, None)
+
+    def clear(self):
+        self._values.clear()
 
 
 # =============================================================================
@@ -55,9 +211,10 @@ class LogQueryResponse(BaseModel):
 class LokiClient:
     """Client for querying Loki logs."""
 
-    def __init__(self, url: str = None):
+    def __init__(self, url: str = None, label_ttl: float = None):
         self.url = url or LOKI_URL
         self._client: Optional[httpx.AsyncClient] = None
+        self._labels = _TTLCache(LABEL_CACHE_TTL if label_ttl is None else label_ttl)
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -70,13 +227,15 @@ class LokiClient:
             await self._client.aclose()
             self._client = None
 
+    async def _get_data(self, path: str) -> List[str]:
+        response = await self.client.get(f"{self.url}{path}")
+        response.raise_for_status()
+        return response.json().get("data", [])
+
     async def get_labels(self) -> List[str]:
         """Get available log labels."""
         try:
-            response = await self.client.get(f"{self.url}/loki/api/v1/labels")
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", [])
+            return await self._labels.get("labels", lambda: self._get_data("/loki/api/v1/labels"))
         except Exception as e:
             logger.error(f"Failed to get labels: {e}")
             return []
@@ -84,127 +243,181 @@ class LokiClient:
     async def get_label_values(self, label: str) -> List[str]:
         """Get values for a specific label."""
         try:
-            response = await self.client.get(f"{self.url}/loki/api/v1/label/{label}/values")
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", [])
+            return await self._labels.get(
+                f"values:{label}", lambda: self._get_data(f"/loki/api/v1/label/{label}/values")
+            )
         except Exception as e:
             logger.error(f"Failed to get label values: {e}")
             return []
 
     def _parse_log_level(self, message: str) -> str:
         """Extract log level from message."""
-        message_lower = message.lower()
-        if "error" in message_lower or "err" in message_lower:
-            return "ERROR"
-        if "warn" in message_lower:
-            return "WARN"
-        if "debug" in message_lower:
-            return "DEBUG"
-        if "info" in message_lower:
-            return "INFO"
-        return "INFO"
+        return parse_log_level(message)
 
-    async def query_logs(
+    def build_query(
         self,
         service: Optional[str] = None,
         level: Optional[str] = None,
         search: Optional[str] = None,
-        hours: int = 1,
-        limit: int = 100,
-    ) -> LogQueryResponse:
-        """Query logs from Loki."""
-        # Build LogQL query
-        label_selectors = []
+    ) -> str:
+        """LogQL for the given filters."""
         if service:
             # Match service in various label fields
-            label_selectors.append(f'container=~".*{service}.*"')
-
-        if label_selectors:
-            label_query = ",".join(label_selectors)
-            query = f"{{{label_query}}}"
+            query = f"{{container=~{_logql_string(f'.*{service}.*')}}}"
         else:
             query = '{job=~".+"}'
 
-        # Add line filters
         line_filters = []
         if level:
-            line_filters.append(f"|~ \"(?i){level}\"")
+            line_filters.append(f"|~ {_logql_string(_level_regex(level))}")
         if search:
-            line_filters.append(f"|~ \"(?i){search}\"")
+            line_filters.append(f"|~ {_logql_string(f'(?i){search}')}")
 
         if line_filters:
             query += " " + " ".join(line_filters)
+        return query
+
+    def _entry(self, raw: RawEntry) -> LogEntry:
+        timestamp_ns, _, message, labels = raw
+        return LogEntry(
+            timestamp=datetime.fromtimestamp(timestamp_ns / 1e9).isoformat(),
+            level=parse_log_level(message),
+            service=labels.get("container", labels.get("service", labels.get("job", "unknown"))),
+            message=message[:MAX_MESSAGE_CHARS],  # Truncate long messages
+            labels=labels,
+        )
 
-        # Calculate time range
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(hours=hours)
+    async def _query_range(self, query: str, start_ns: int, end_ns: int, limit: int) -> List[Dict[str, Any]]:
+        response = await self.client.get(
+            f"{self.url}/loki/api/v1/query_range",
+            params={
+                "query": query,
+                "start": str(start_ns),
+                "end": str(end_ns),
+                "limit": limit,
+                "direction": "backward",  # Most recent first
+            },
+        )
+        response.raise_for_status()
+        return response.json().get("data", {}).get("result", [])
+
+    async def _read_page(self, query: str, cursor: LogCursor, limit: int) -> Tuple[List[RawEntry], Optional[LogCursor]]:
+        """
+        Up to ``limit`` entries before the cursor, newest first, and the
+        cursor for the rest (None when the range is exhausted).
+        """
+        page: List[RawEntry] = []
+        end_ns, skip = cursor.end_ns, cursor.skip
+        window_ns = int(FIRST_WINDOW_SECONDS * 1e9)
+
+        while len(page) < limit and end_ns > cursor.start_ns:
+            window_start = max(cursor.start_ns, end_ns - window_ns)
+            wanted = limit - len(page) + skip
+            # One extra entry tells whether the window holds more than wanted
+            entries = list(merge_streams(await self._query_range(query, window_start, end_ns, wanted + 1)))
+            exhausted = len(entries) <= wanted
+            if not exhausted:
+                # Loki may have cut the oldest timestamp short, in its own order.
+                # Drop it, or fetch all of it if the page reaches that far, so
+                # paging never depends on which of its entries Loki kept.
+                oldest = entries[-1][0]
+                entries = [entry for entry in entries if entry[0] != oldest]
+                if len(entries) < wanted:
+                    same = await self._query_range(query, oldest, oldest + 1, MAX_ENTRIES_PER_TIMESTAMP)
+                    entries.extend(merge_streams(same))
+
+            for entry in entries:
+                if skip and entry[0] == end_ns - 1:
+                    skip -= 1
+                    continue
+                page.append(entry)
+            if exhausted:
+                # Window exhausted: move to the next, twice as long
+                end_ns, skip = window_start, 0
+                window_ns *= 2
+
+        if len(page) < limit:
+            return page, None
+
+        page = page[:limit]
+        last_ns = page[-1][0]
+        seen = 0
+        for entry in reversed(page):
+            if entry[0] != last_ns:
+                break
+            seen += 1
+        if last_ns == cursor.end_ns - 1:
+            seen += cursor.skip
+        return page, LogCursor(cursor.start_ns, last_ns + 1, seen)
 
-        start_ns = int(start_time.timestamp() * 1e9)
-        end_ns = int(end_time.timestamp() * 1e9)
+    async def query_logs(
+        self,
+        service: Optional[str] = None,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+        hours: int = 1,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> LogQueryResponse:
+        """
+        Query logs from Loki, newest first. Pass ``next_cursor`` from the
+        response back as ``cursor`` for the next older page of the same range.
+        """
+        query = self.build_query(service, level, search)
+        if cursor:
+            position = LogCursor.decode(cursor)
+        else:
+            end_ns = time.time_ns()
+            position = LogCursor(end_ns - hours * 3600 * 10**9, end_ns)
+        time_range = {"start": _iso_utc(position.start_ns), "end": _iso_utc(position.end_ns)}
 
         try:
-            response = await self.client.get(
-                f"{self.url}/loki/api/v1/query_range",
-                params={
-                    "query": query,
-                    "start": str(start_ns),
-                    "end": str(end_ns),
-                    "limit": limit,
-                    "direction": "backward",  # Most recent first
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            logs = []
-            results = data.get("data", {}).get("result", [])
-
-            for stream in results:
-                labels = stream.get("stream", {})
-                service_name = labels.get("container", labels.get("service", labels.get("job", "unknown")))
-
-                for value in stream.get("values", []):
-                    timestamp_ns, message = value
-                    timestamp = datetime.fromtimestamp(int(timestamp_ns) / 1e9)
-
-                    logs.append(LogEntry(
-                        timestamp=timestamp.isoformat(),
-                        level=self._parse_log_level(message),
-                        service=service_name,
-                        message=message[:500],  # Truncate long messages
-                        labels=labels,
-                    ))
-
-            # Sort by timestamp descending
-            logs.sort(key=lambda x: x.timestamp, reverse=True)
-
-            return LogQueryResponse(
-                logs=logs[:limit],
-                total=len(logs),
-                query=query,
-                time_range={
-                    "start": start_time.isoformat() + "Z",
-                    "end": end_time.isoformat() + "Z",
-                },
-            )
-
+            page, next_position = await self._read_page(query, position, limit)
         except Exception as e:
             logger.error(f"Failed to query logs: {e}")
-            return LogQueryResponse(
-                logs=[],
-                total=0,
-                query=query,
-                time_range={
-                    "start": start_time.isoformat() + "Z",
-                    "end": end_time.isoformat() + "Z",
-                },
-            )
+            return LogQueryResponse(logs=[], total=0, query=query, time_range=time_range)
+
+        logs = [self._entry(raw) for raw in page]
+        return LogQueryResponse(
+            logs=logs,
+            total=len(logs),
+            query=query,
+            time_range=time_range,
+            next_cursor=next_position.encode() if next_position else None,
+        )
+
+    async def tail(
+        self,
+        service: Optional[str] = None,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+        since_seconds: float = 0,
+        limit: int = 100,
+    ) -> AsyncIterator[LogEntry]:
+        """
+        Follow new log lines via Loki's tail API, oldest first. Lines from
+        the last ``since_seconds`` (at most ``limit`` of them) come first.
+        """
+        params = {
+            "query": self.build_query(service, level, search),
+            "start": str(time.time_ns() - int(since_seconds * 1e9)),
+            "limit": limit,
+        }
+        ws_url = re.sub(r"^http", "ws", self.url) + "/loki/api/v1/tail?" + urlencode(params)
+        async with websockets.connect(ws_url) as ws:
+            async for message in ws:
+                data = json.loads(message)
+                if data.get("dropped_entries"):
+                    logger.warning(f"Loki dropped {len(data['dropped_entries'])} tailed entries")
+                for raw in merge_streams(data.get("streams") or [], newest_first=False):
+                    yield self._entry(raw)
 
     async def get_services(self) -> List[str]:
         """Get list of services with logs."""
-        containers = await self.get_label_values("container")
-        services = await self.get_label_values("service")
+        containers, services = await asyncio.gather(
+            self.get_label_values("container"),
+            self.get_label_values("service"),
+        )
         # Combine and deduplicate
         all_services = list(set(containers + services))
         return sorted(all_services)
@@ -227,6 +440,56 @@ class LokiClient:
             }
 
 
+# =============================================================================
+# Tail Streaming
+# =============================================================================
+
+_TAIL_END = object()
+
+
+async def tail_stream(
+    client: LokiClient,
+    fmt: str = "sse",
+    keepalive: float = TAIL_KEEPALIVE_SECONDS,
+    **filters: Any,
+) -> AsyncIterator[str]:
+    """
+    Format a tail as SSE events (``event: log``) or NDJSON lines. The tail
+    runs in its own task so quiet periods can send SSE keepalives.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+
+    async def pump():
+        result: Any = _TAIL_END
+        try:
+            async for entry in client.tail(**filters):
+                await queue.put(entry)
+        except Exception as e:
+            logger.error(f"Log tail failed: {e}")
+            result = e
+        await queue.put(result)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                if fmt == "sse":
+                    yield ": keepalive\n\n"
+                continue
+            if item is _TAIL_END:
+                break
+            if isinstance(item, Exception):
+                error = json.dumps({"error": str(item)})
+                yield f"event: error\ndata: {error}\n\n" if fmt == "sse" else error + "\n"
+                break
+            data = item.model_dump_json()
+            yield f"event: log\ndata: {data}\n\n" if fmt == "sse" else data + "\n"
+    finally:
+        task.cancel()
+
+
 # =============================================================================
 # Global Instance
 # =============================================================================
@@ -270,15 +533,42 @@ def create_logs_router() -> APIRouter:
         search: Optional[str] = Query(None, description="Text search in log messages"),
         hours: int = Query(1, ge=1, le=168, description="Hours of logs to fetch (1-168)"),
         limit: int = Query(100, ge=10, le=1000, description="Maximum number of logs to return"),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     ):
         """Query logs from Loki."""
         client = get_loki_client()
-        return await client.query_logs(
-            service=service,
-            level=level,
-            search=search,
-            hours=hours,
-            limit=limit,
+        try:
+            return await client.query_logs(
+                service=service,
+                level=level,
+                search=search,
+                hours=hours,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.get("/tail")
+    async def tail_logs(
+        service: Optional[str] = Query(None, description="Filter by service/container name"),
+        level: Optional[str] = Query(None, description="Filter by log level (INFO, WARN, ERROR, DEBUG)"),
+        search: Optional[str] = Query(None, description="Text search in log messages"),
+        since: float = Query(0, ge=0, le=3600, description="Seconds of history to send first"),
+        format: str = Query("sse", pattern="^(sse|ndjson)$", description="sse or ndjson"),
+    ):
+        """Stream new log lines as they arrive."""
+        client = get_loki_client()
+        stream = tail_stream(
+            client, format, service=service, level=level, search=search, since_seconds=since,
+        )
+        return StreamingResponse(
+            stream,
+            media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",  # Disable nginx buffering
+            },
         )
 
     @router.get("/labels")
@@ -274,9 +274,6 @@ def init_db():
     conn.close()
 
 
-init_db()
-
-
 def get_db():
     """Get database connection."""
     conn = sqlite3.connect(str(DB_PATH))
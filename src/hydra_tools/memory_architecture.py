@@ -33,6 +33,8 @@ from pydantic import BaseModel
 
 from fastapi import APIRouter, HTTPException
 
+from hydra_tools.similarity import cosine
+
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -139,12 +141,7 @@ class MemoryEntry:
         # Semantic similarity (if embeddings available)
         similarity = 0.5
         if query_embedding and self.embedding:
-            # Cosine similarity
-            dot = sum(a * b for a, b in zip(query_embedding, self.embedding))
-            norm_q = sum(a * a for a in query_embedding) ** 0.5
-            norm_e = sum(a * a for a in self.embedding) ** 0.5
-            if norm_q > 0 and norm_e > 0:
-                similarity = (dot / (norm_q * norm_e) + 1) / 2  # Normalize to 0-1
+            similarity = (cosine(query_embedding, self.embedding) + 1) / 2  # Normalize to 0-1
 
         # Weighted combination
         return (
@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, field
 
+from hydra_tools.prometheus_query import get_prometheus_client
+
 
 @dataclass
 class MetricResult:
@@ -67,23 +69,15 @@ class PrometheusQueryTool:
         """
         results = []
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/api/v1/query",
-                    params={"query": promql}
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    if data.get("status") == "success":
-                        for result in data.get("data", {}).get("result", []):
-                            metric = result.get("metric", {})
-                            value = result.get("value", [0, "0"])
-                            results.append(MetricResult(
-                                metric_name=metric.get("__name__", ""),
-                                value=float(value[1]),
-                                labels=metric,
-                                timestamp=datetime.fromtimestamp(float(value[0]))
-                            ))
+            for result in await get_prometheus_client(self.base_url).query(promql):
+                metric = result.get("metric", {})
+                value = result.get("value", [0, "0"])
+                results.append(MetricResult(
+                    metric_name=metric.get("__name__", ""),
+                    value=float(value[1]),
+                    labels=metric,
+                    timestamp=datetime.fromtimestamp(float(value[0]))
+                ))
         except Exception as e:
             print(f"Prometheus query error: {e}")
         return results
@@ -109,20 +103,7 @@ class PrometheusQueryTool:
         """
         results = []
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/api/v1/query_range",
-                    params={
-                        "query": promql,
-                        "start": start.isoformat() + "Z",
-                        "end": end.isoformat() + "Z",
-                        "step": step
-                    }
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    if data.get("status") == "success":
-                        results = data.get("data", {}).get("result", [])
+            results = await get_prometheus_client(self.base_url).query_range(promql, start, end, step)
         except Exception as e:
             print(f"Prometheus range query error: {e}")
         return results
@@ -13,11 +13,13 @@ Created: 2025-12-18
 """
 
 import asyncio
+import gzip
 import json
 import os
 import re
-from collections import Counter
-from dataclasses import dataclass, field
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -27,6 +29,8 @@ import httpx
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
 from pydantic import BaseModel
 
+from hydra_tools.trend_engine import DecayingHeavyHitters, KeywordAutomaton
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,9 +42,22 @@ DATA_DIR = Path(os.getenv("HYDRA_DATA_DIR", "/data"))
 INTELLIGENCE_DIR = DATA_DIR / "research"
 INTELLIGENCE_DIR.mkdir(parents=True, exist_ok=True)
 
-TRENDING_FILE = INTELLIGENCE_DIR / "trending_topics.json"
+TRENDING_FILE = INTELLIGENCE_DIR / "trending_topics.json"  # Pre-snapshot format, read once to migrate
+TREND_SNAPSHOT_FILE = INTELLIGENCE_DIR / "trend_snapshot.json.gz"
 SUGGESTIONS_FILE = INTELLIGENCE_DIR / "research_suggestions.json"
 
+# Trend counting: n-gram counts halve every half-life; the top-k are tracked
+TREND_TOP_K = int(os.getenv("HYDRA_TREND_TOP_K", "200"))
+TREND_SKETCH_WIDTH = int(os.getenv("HYDRA_TREND_SKETCH_WIDTH", "4096"))
+TREND_SKETCH_DEPTH = int(os.getenv("HYDRA_TREND_SKETCH_DEPTH", "4"))
+TREND_HALF_LIFE_HOURS = float(os.getenv("HYDRA_TREND_HALF_LIFE_HOURS", "12"))
+TREND_SNAPSHOT_SECONDS = float(os.getenv("HYDRA_TREND_SNAPSHOT_SECONDS", "60"))
+# Decayed mentions before a tracked topic counts as trending. Thresholds sit
+# half a mention below whole counts so "two recent mentions" still qualifies
+# once decay has shaved a little off.
+MIN_TREND_SCORE = float(os.getenv("HYDRA_TREND_MIN_SCORE", "1.5"))
+SEEN_ENTRIES_MAX = 20000  # Entry ids remembered so re-fetched entries are not recounted
+
 # LLM endpoint for analysis
 LITELLM_URL = os.getenv("LITELLM_URL", "http://192.168.1.244:4000")
 RESEARCH_QUEUE_INTERNAL = "http://localhost:8700"
@@ -64,6 +81,21 @@ HYDRA_FOCUS_AREAS = [
     "computer vision",
 ]
 
+# Substrings marking an n-gram as a potential tech/AI topic
+TECH_INDICATORS = [
+    "ai", "model", "llm", "gpt", "claude", "gemini", "agent",
+    "inference", "gpu", "nvidia", "amd", "memory", "rag",
+    "vector", "embedding", "transformer", "attention", "token",
+    "api", "cloud", "edge", "local", "open", "source", "weight",
+    "quantization", "fine", "tune", "training", "benchmark",
+    "performance", "speed", "latency", "throughput", "context",
+    "reasoning", "chain", "thought", "multimodal", "vision",
+    "voice", "speech", "synthesis", "tts", "stt", "assistant",
+    "autonomous", "automation", "workflow", "pipeline", "mcp",
+]
+
+WORD_CACHE_MAX = 50000
+
 
 # =============================================================================
 # Data Classes
@@ -79,11 +111,13 @@ class TrendingTopic:
     sources: List[str]
     relevance_score: float  # 0-1, how relevant to Hydra
     sample_headlines: List[str]
+    score: float = 0.0  # Time-decayed mentions
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "topic": self.topic,
             "mentions": self.mentions,
+            "trend_score": round(self.score, 2),
             "first_seen": self.first_seen.isoformat(),
             "last_seen": self.last_seen.isoformat(),
             "sources": self.sources[:5],
@@ -127,17 +161,68 @@ class ResearchSuggestion:
 # =============================================================================
 
 class NewsIntelligenceEngine:
-    """Analyzes news for trends and research opportunities."""
+    """
+    Analyzes news for trends and research opportunities.
+
+    Entries are analyzed incrementally: each entry is counted once (re-fetched
+    entries are skipped by id), its candidate n-grams go into a time-decayed
+    heavy-hitters sketch, and only the top TREND_TOP_K topics keep metadata.
+    Memory stays constant however many entries stream through. Trend state is
+    persisted as a compact snapshot at most every TREND_SNAPSHOT_SECONDS.
+    """
 
     def __init__(self):
-        self.trending_topics: Dict[str, TrendingTopic] = {}
+        self.trends = DecayingHeavyHitters(
+            capacity=TREND_TOP_K,
+            width=TREND_SKETCH_WIDTH,
+            depth=TREND_SKETCH_DEPTH,
+            half_life_seconds=TREND_HALF_LIFE_HOURS * 3600,
+            now=time.time(),
+        )
+        self._tracked: Dict[str, TrendingTopic] = {}
         self.suggestions: Dict[str, ResearchSuggestion] = {}
+        self._seen_order: deque = deque()
+        self._seen: Set[str] = set()
+        self._indicators = KeywordAutomaton(TECH_INDICATORS)
+        self._word_flags: Dict[str, bool] = {}
+        self._focus_areas: Tuple[str, ...] = ()
+        self._focus_matcher: Optional[KeywordAutomaton] = None
+        self._snapshot_at = 0.0
+        self._dirty = False
         self._load_state()
 
+    @property
+    def trending_topics(self) -> Dict[str, TrendingTopic]:
+        """Tracked topics whose decayed mentions reach MIN_TREND_SCORE."""
+        now = time.time()
+        trending = {}
+        for topic, data in self._tracked.items():
+            data.score = self.trends.estimate(topic, now)
+            if data.score >= MIN_TREND_SCORE:
+                trending[topic] = data
+        return trending
+
     def _load_state(self):
         """Load persisted state."""
-        if TRENDING_FILE.exists():
+        if TREND_SNAPSHOT_FILE.exists():
+            try:
+                snapshot = json.loads(gzip.decompress(TREND_SNAPSHOT_FILE.read_bytes()))
+                self.trends = DecayingHeavyHitters.from_state(snapshot["sketch"])
+                for topic_data in snapshot.get("topics", []):
+                    topic = TrendingTopic(**{
+                        **topic_data,
+                        "first_seen": datetime.fromisoformat(topic_data["first_seen"]),
+                        "last_seen": datetime.fromisoformat(topic_data["last_seen"]),
+                    })
+                    if topic.topic in self.trends:
+                        self._tracked[topic.topic] = topic
+                for entry_key in snapshot.get("seen", []):
+                    self._remember(entry_key)
+            except Exception as e:
+                logger.warning(f"Failed to load trend snapshot: {e}")
+        elif TRENDING_FILE.exists():
             try:
+                now = time.time()
                 data = json.loads(TRENDING_FILE.read_text())
                 for topic_data in data.get("topics", []):
                     topic = TrendingTopic(
@@ -149,7 +234,10 @@ class NewsIntelligenceEngine:
                         relevance_score=topic_data.get("relevance_score", 0),
                         sample_headlines=topic_data.get("sample_headlines", []),
                     )
-                    self.trending_topics[topic.topic] = topic
+                    self.trends.add(topic.topic, topic.mentions, now)
+                    self._tracked[topic.topic] = topic
+                self._tracked = {t: v for t, v in self._tracked.items() if t in self.trends}
+                self._dirty = True
             except Exception as e:
                 logger.warning(f"Failed to load trending topics: {e}")
 
@@ -174,140 +262,169 @@ class NewsIntelligenceEngine:
                 logger.warning(f"Failed to load suggestions: {e}")
 
     def _save_state(self):
-        """Persist state to files."""
+        """Persist suggestions and the trend snapshot."""
         try:
-            TRENDING_FILE.write_text(json.dumps({
-                "topics": [t.to_dict() for t in self.trending_topics.values()],
-                "updated_at": datetime.utcnow().isoformat(),
-            }, indent=2))
-
             SUGGESTIONS_FILE.write_text(json.dumps({
                 "suggestions": [s.to_dict() for s in self.suggestions.values()],
                 "updated_at": datetime.utcnow().isoformat(),
             }, indent=2))
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
+        self.save_snapshot(force=True)
+
+    def save_snapshot(self, force: bool = False):
+        """Write the trend snapshot if it changed, at most every TREND_SNAPSHOT_SECONDS unless forced."""
+        now = time.time()
+        if not self._dirty or (not force and now - self._snapshot_at < TREND_SNAPSHOT_SECONDS):
+            return
+        snapshot = {
+            "version": 1,
+            "saved_at": datetime.utcnow().isoformat(),
+            "sketch": self.trends.to_state(),
+            "topics": [
+                {**asdict(t), "first_seen": t.first_seen.isoformat(), "last_seen": t.last_seen.isoformat()}
+                for t in self._tracked.values()
+            ],
+            "seen": list(self._seen_order),
+        }
+        try:
+            tmp = TREND_SNAPSHOT_FILE.with_suffix(".tmp")
+            tmp.write_bytes(gzip.compress(json.dumps(snapshot, separators=(",", ":")).encode()))
+            os.replace(tmp, TREND_SNAPSHOT_FILE)
+            self._snapshot_at = now
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Failed to save trend snapshot: {e}")
+
+    def _remember(self, entry_key: str):
+        self._seen.add(entry_key)
+        self._seen_order.append(entry_key)
+        if len(self._seen_order) > SEEN_ENTRIES_MAX:
+            self._seen.discard(self._seen_order.popleft())
+
+    @staticmethod
+    def _entry_key(entry: Dict[str, Any]) -> str:
+        if entry.get("id") is not None:
+            return f"id:{entry['id']}"
+        return f"url:{entry.get('url') or entry.get('feed_title', '')}|{entry.get('title', '')}"
+
+    def _is_indicator_word(self, word: str) -> bool:
+        flag = self._word_flags.get(word)
+        if flag is None:
+            if len(self._word_flags) >= WORD_CACHE_MAX:
+                self._word_flags.clear()
+            flag = self._word_flags[word] = self._indicators.contains_any(word)
+        return flag
 
     def _extract_topics(self, text: str) -> List[str]:
-        """Extract potential topics from text."""
-        # Normalize
-        text = text.lower()
-
-        # Extract n-grams that might be topics
-        words = re.findall(r'\b[a-z]{3,}\b', text)
-
-        # Bigrams and trigrams
-        bigrams = [f"{words[i]} {words[i+1]}" for i in range(len(words)-1)]
-        trigrams = [f"{words[i]} {words[i+1]} {words[i+2]}" for i in range(len(words)-2)]
-
-        # Filter for potential tech/AI topics
-        tech_indicators = [
-            "ai", "model", "llm", "gpt", "claude", "gemini", "agent",
-            "inference", "gpu", "nvidia", "amd", "memory", "rag",
-            "vector", "embedding", "transformer", "attention", "token",
-            "api", "cloud", "edge", "local", "open", "source", "weight",
-            "quantization", "fine", "tune", "training", "benchmark",
-            "performance", "speed", "latency", "throughput", "context",
-            "reasoning", "chain", "thought", "multimodal", "vision",
-            "voice", "speech", "synthesis", "tts", "stt", "assistant",
-            "autonomous", "automation", "workflow", "pipeline", "mcp",
+        """
+        Extract potential topics from text: bigrams and trigrams with a word
+        containing a tech indicator. Indicators have no spaces, so a phrase
+        contains one exactly when one of its words does, and each word is
+        matched once against the compiled automaton.
+        """
+        words = re.findall(r'\b[a-z]{3,}\b', text.lower())
+        flags = [self._is_indicator_word(word) for word in words]
+
+        bigrams = [
+            f"{words[i]} {words[i+1]}" for i in range(len(words) - 1)
+            if flags[i] or flags[i+1]
         ]
-
-        potential_topics = []
-        for phrase in bigrams + trigrams:
-            if any(ind in phrase for ind in tech_indicators):
-                potential_topics.append(phrase)
-
-        return potential_topics
+        trigrams = [
+            f"{words[i]} {words[i+1]} {words[i+2]}" for i in range(len(words) - 2)
+            if flags[i] or flags[i+1] or flags[i+2]
+        ]
+        return bigrams + trigrams
 
     def _calculate_relevance(self, topic: str) -> float:
         """Calculate relevance score for Hydra."""
+        focus_areas = tuple(HYDRA_FOCUS_AREAS)
+        if focus_areas != self._focus_areas:
+            self._focus_areas = focus_areas
+            self._focus_matcher = KeywordAutomaton(
+                [focus for focus in focus_areas] + [word for focus in focus_areas for word in focus.split()]
+            )
+
         topic_lower = topic.lower()
+        found = self._focus_matcher.matches(topic_lower)
         score = 0.0
 
-        for focus in HYDRA_FOCUS_AREAS:
-            if focus in topic_lower or topic_lower in focus:
+        for focus in focus_areas:
+            if focus in found or topic_lower in focus:
                 score += 0.3
-            elif any(word in topic_lower for word in focus.split()):
+            elif any(word in found for word in focus.split()):
                 score += 0.1
 
         return min(score, 1.0)
 
     async def analyze_news_entries(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze news entries for trends and opportunities."""
+        """Analyze news entries for trends and opportunities, counting each entry once."""
         now = datetime.utcnow()
+        clock = time.time()
 
-        # Extract topics from all entries
-        topic_counter: Counter = Counter()
-        topic_sources: Dict[str, Set[str]] = {}
-        topic_headlines: Dict[str, List[str]] = {}
+        new_trending = 0
+        analyzed = 0
+        topics_detected: Set[str] = set()
 
         for entry in entries:
+            entry_key = self._entry_key(entry)
+            if entry_key in self._seen:
+                continue
+            self._remember(entry_key)
+            analyzed += 1
+
             title = entry.get("title", "")
             content = entry.get("content_preview", "")
             source = entry.get("feed_title", "Unknown")
 
-            text = f"{title} {content}"
-            topics = self._extract_topics(text)
-
-            for topic in topics:
-                topic_counter[topic] += 1
-                if topic not in topic_sources:
-                    topic_sources[topic] = set()
-                    topic_headlines[topic] = []
-                topic_sources[topic].add(source)
-                if title and title not in topic_headlines[topic]:
-                    topic_headlines[topic].append(title)
-
-        # Update trending topics (minimum 2 mentions)
-        new_trending = 0
-        for topic, count in topic_counter.most_common(50):
-            if count < 2:
-                continue
-
-            relevance = self._calculate_relevance(topic)
-
-            if topic in self.trending_topics:
-                # Update existing
-                existing = self.trending_topics[topic]
-                existing.mentions += count
-                existing.last_seen = now
-                existing.sources = list(set(existing.sources) | topic_sources[topic])[:10]
-                existing.sample_headlines = list(set(existing.sample_headlines) | set(topic_headlines[topic]))[:5]
-            else:
-                # New trending topic
-                self.trending_topics[topic] = TrendingTopic(
-                    topic=topic,
-                    mentions=count,
-                    first_seen=now,
-                    last_seen=now,
-                    sources=list(topic_sources[topic])[:10],
-                    relevance_score=relevance,
-                    sample_headlines=topic_headlines[topic][:5],
-                )
-                new_trending += 1
+            for topic, count in Counter(self._extract_topics(f"{title} {content}")).items():
+                topics_detected.add(topic)
+                before, after, evicted = self.trends.add(topic, count, clock)
+                if evicted:
+                    self._tracked.pop(evicted, None)
+                if topic not in self.trends:
+                    continue
+
+                tracked = self._tracked.get(topic)
+                if tracked is None:
+                    tracked = self._tracked[topic] = TrendingTopic(
+                        topic=topic,
+                        mentions=0,
+                        first_seen=now,
+                        last_seen=now,
+                        sources=[],
+                        relevance_score=self._calculate_relevance(topic),
+                        sample_headlines=[],
+                    )
+                tracked.mentions += count
+                tracked.last_seen = now
+                tracked.score = after
+                if source not in tracked.sources and len(tracked.sources) < 10:
+                    tracked.sources.append(source)
+                if title and title not in tracked.sample_headlines and len(tracked.sample_headlines) < 5:
+                    tracked.sample_headlines.append(title)
+                if before < MIN_TREND_SCORE <= after:
+                    new_trending += 1
 
         # Prune old topics (>48 hours without update)
         cutoff = now - timedelta(hours=48)
-        self.trending_topics = {
-            k: v for k, v in self.trending_topics.items()
-            if v.last_seen > cutoff
-        }
+        for topic in [t for t, v in self._tracked.items() if v.last_seen <= cutoff]:
+            del self._tracked[topic]
+            self.trends.discard(topic)
 
-        self._save_state()
+        if analyzed:
+            self._dirty = True
+            self.save_snapshot()
 
+        trending = self.trending_topics
         return {
-            "analyzed_entries": len(entries),
-            "topics_detected": len(topic_counter),
-            "trending_topics": len(self.trending_topics),
+            "analyzed_entries": analyzed,
+            "skipped_entries": len(entries) - analyzed,
+            "topics_detected": len(topics_detected),
+            "trending_topics": len(trending),
             "new_trending": new_trending,
             "top_topics": [
-                self.trending_topics[t].to_dict()
-                for t in sorted(
-                    self.trending_topics.keys(),
-                    key=lambda x: self.trending_topics[x].mentions,
-                    reverse=True
-                )[:10]
+                t.to_dict() for t in sorted(trending.values(), key=lambda t: t.score, reverse=True)[:10]
             ],
         }
 
@@ -318,12 +435,12 @@ class NewsIntelligenceEngine:
         # Get high-relevance trending topics
         relevant_topics = [
             t for t in self.trending_topics.values()
-            if t.relevance_score >= 0.3 and t.mentions >= 3
+            if t.relevance_score >= 0.3 and t.score >= 2.5
         ]
 
-        # Sort by relevance * mentions (impact score)
+        # Sort by relevance * decayed mentions (impact score)
         relevant_topics.sort(
-            key=lambda t: t.relevance_score * t.mentions,
+            key=lambda t: t.relevance_score * t.score,
             reverse=True
         )
 
@@ -337,7 +454,7 @@ class NewsIntelligenceEngine:
             suggestion_id = f"sugg_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{hash(topic.topic) % 10000}"
 
             # Determine priority based on relevance and mentions
-            if topic.relevance_score >= 0.6 and topic.mentions >= 5:
+            if topic.relevance_score >= 0.6 and topic.score >= 4.5:
                 priority = "high"
             elif topic.relevance_score >= 0.4:
                 priority = "normal"
@@ -421,7 +538,7 @@ class NewsIntelligenceEngine:
     def get_trending_summary(self) -> Dict[str, Any]:
         """Get summary of trending topics."""
         topics = list(self.trending_topics.values())
-        topics.sort(key=lambda t: t.mentions, reverse=True)
+        topics.sort(key=lambda t: t.score, reverse=True)
 
         high_relevance = [t for t in topics if t.relevance_score >= 0.5]
         medium_relevance = [t for t in topics if 0.2 <= t.relevance_score < 0.5]
@@ -433,6 +550,9 @@ class NewsIntelligenceEngine:
             "top_10": [t.to_dict() for t in topics[:10]],
             "high_relevance": [t.to_dict() for t in high_relevance[:5]],
             "pending_suggestions": len([s for s in self.suggestions.values() if s.status == "pending"]),
+            "tracked_topics": len(self._tracked),
+            "entries_remembered": len(self._seen),
+            "half_life_hours": TREND_HALF_LIFE_HOURS,
         }
 
     def get_suggestions(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -459,6 +579,14 @@ def get_intelligence_engine() -> NewsIntelligenceEngine:
     return _intelligence_engine
 
 
+def close_intelligence_engine():
+    """Flush the trend snapshot on shutdown."""
+    global _intelligence_engine
+    if _intelligence_engine is not None:
+        _intelligence_engine.save_snapshot(force=True)
+        _intelligence_engine = None
+
+
 # =============================================================================
 # Pydantic Models
 # =============================================================================
@@ -494,7 +622,7 @@ def create_news_intelligence_router() -> APIRouter:
         engine = get_intelligence_engine()
         topics = list(engine.trending_topics.values())
         topics = [t for t in topics if t.relevance_score >= min_relevance]
-        topics.sort(key=lambda t: t.mentions * t.relevance_score, reverse=True)
+        topics.sort(key=lambda t: t.score * t.relevance_score, reverse=True)
         return {
             "count": len(topics),
             "topics": [t.to_dict() for t in topics[:limit]],
@@ -0,0 +1,364 @@
+"""
+Hydra Observation Diffing - Change detection for the cognitive loop
+
+The cognitive core perceives the cluster every cycle and used to send every
+observation to the 70B model, even when nothing had changed. This module
+decides how much reasoning an observation deserves:
+
+- Observations are canonicalized: volatile keys (timestamps, uptimes) are
+  dropped, floats rounded to two significant figures, lists of names turned
+  into sets and the pending queue reduced to its depth. The canonical form
+  is hashed.
+- The canonical form is diffed field by field against the last observation
+  that was actually reasoned about, and every change is graded ``ignore``,
+  ``minor`` or ``significant`` by ``SignificanceThresholds``: status changes,
+  newly unhealthy containers, new sensor errors and goal changes are
+  significant, queue depth moves by at least ``queue_depth_delta``, numbers
+  only when they move by ``numeric_relative_change`` and
+  ``numeric_absolute_floor``. ``field_levels`` overrides the grade for any
+  field prefix.
+- A significant change gets full reasoning, minor changes only get the
+  cheap fallback model, and no material change skips the LLM entirely. An
+  observation whose hash was reasoned about within
+  ``max_decision_age_seconds`` reuses that decision. Full reasoning is
+  forced after ``max_skipped_cycles`` cycles or ``max_decision_age_seconds``
+  without it.
+
+Because small changes are compared against the last *reasoned* baseline,
+slow drift still adds up until it crosses a threshold.
+
+GPU time saved is estimated from the running average wall-clock duration of
+reasoning calls per model, so it is an upper bound on what the GPUs spent.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+CHANGE_DETECTION_ENABLED = os.environ.get("COGNITIVE_CHANGE_DETECTION", "true").lower() == "true"
+
+VOLATILE_KEYS = {
+    "timestamp", "time", "last_check", "last_checked", "uptime", "uptime_seconds",
+    "age_seconds", "duration_ms", "response_time_ms", "cache_age_seconds",
+}
+STATUS_KEYS = {"status", "state", "health", "healthy"}
+LEVELS = ("ignore", "minor", "significant")
+
+REASONING_CYCLES = Counter(
+    "hydra_cognitive_reasoning_total",
+    "Cognitive cycles by reasoning outcome (full, cheap, cached, skipped)",
+    ["outcome"],
+)
+
+GPU_SECONDS_SAVED = Counter(
+    "hydra_cognitive_gpu_seconds_saved_total",
+    "Estimated reasoning time avoided by skipped, cached and downgraded cycles",
+)
+
+
+@dataclass
+class SignificanceThresholds:
+    """How large a change must be before it is worth reasoning about."""
+    queue_depth_delta: int = 5
+    numeric_relative_change: float = 0.5
+    numeric_absolute_floor: float = 1.0
+    max_skipped_cycles: int = 10
+    max_decision_age_seconds: float = 1800.0
+    # Field prefix -> level, overriding the built-in rules
+    field_levels: Dict[str, str] = field(default_factory=lambda: {
+        "recent_events": "minor",
+        "container_health.total": "minor",
+        "container_health.healthy": "minor",
+    })
+
+    def update(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            if not hasattr(self, key):
+                raise ValueError(f"Unknown threshold: {key}")
+            if key == "field_levels":
+                invalid = {level for level in value.values() if level not in LEVELS}
+                if invalid:
+                    raise ValueError(f"Invalid levels {sorted(invalid)}, expected one of {LEVELS}")
+            setattr(self, key, value)
+
+
+@dataclass
+class Change:
+    """One field that differs between two canonical observations."""
+    path: str
+    old: Any
+    new: Any
+    level: str = "minor"
+
+
+@dataclass
+class Assessment:
+    """How an observation should be reasoned about."""
+    outcome: str  # "full", "cheap", "cached" or "skip"
+    observation_hash: str
+    canonical: Dict[str, Any]
+    changes: List[Change]
+    reason: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "outcome": self.outcome,
+            "observation_hash": self.observation_hash,
+            "reason": self.reason,
+            "changes": [asdict(c) for c in self.changes if c.level != "ignore"],
+        }
+
+
+# =============================================================================
+# Canonical form and structural diff
+# =============================================================================
+
+def _round(value: float) -> float:
+    if value == 0 or not math.isfinite(value):
+        return value
+    return round(value, 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def _canonical_value(value: Any, drop_volatile: bool = True) -> Any:
+    if isinstance(value, dict):
+        return {
+            str(k): _canonical_value(v, drop_volatile)
+            for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))
+            if not drop_volatile or (k not in VOLATILE_KEYS and not str(k).endswith("_at"))
+        }
+    if isinstance(value, (list, tuple)):
+        items = [_canonical_value(v, drop_volatile) for v in value]
+        if all(isinstance(v, (str, int, float, bool)) or v is None for v in items):
+            return sorted(set(items), key=repr)
+        return items
+    if isinstance(value, float):
+        return _round(value)
+    return value
+
+
+def canonicalize(observation) -> Dict[str, Any]:
+    """The parts of a SystemObservation that matter for reasoning, in a stable form."""
+    return {
+        "cluster_health": _canonical_value(observation.cluster_health),
+        "container_health": _canonical_value(observation.container_health),
+        "inference_health": _canonical_value(observation.inference_health),
+        "resource_status": _canonical_value(observation.resource_status),
+        "recent_events": _canonical_value(observation.recent_events[:10]),
+        "pending_tasks": {"depth": len(observation.pending_tasks)},
+        # Goals are written by people; every key in them counts
+        "goals": _canonical_value(observation.goals, drop_volatile=False),
+    }
+
+
+def observation_hash(canonical: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _item_key(item: Any) -> str:
+    if isinstance(item, dict):
+        for key in ("id", "name", "container", "node"):
+            if key in item:
+                return str(item[key])
+    return observation_hash(item) if isinstance(item, (dict, list)) else repr(item)
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Change]:
+    """Structural diff of two canonical values; lists of records are matched by id/name."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in sorted(set(old) | set(new)):
+            child = f"{path}.{key}" if path else key
+            if key not in old:
+                changes.append(Change(child, None, new[key]))
+            elif key not in new:
+                changes.append(Change(child, old[key], None))
+            else:
+                changes.extend(diff(old[key], new[key], child))
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and any(isinstance(v, dict) for v in old + new):
+        return diff(
+            {_item_key(v): v for v in old},
+            {_item_key(v): v for v in new},
+            path,
+        )
+    if old != new:
+        return [Change(path, old, new)]
+    return []
+
+
+# =============================================================================
+# Significance
+# =============================================================================
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def grade(change: Change, thresholds: SignificanceThresholds) -> str:
+    """Level of a single change under ``thresholds``."""
+    override = max(
+        (prefix for prefix in thresholds.field_levels
+         if change.path == prefix or change.path.startswith(prefix + ".")),
+        key=len, default=None,
+    )
+    if override is not None:
+        return thresholds.field_levels[override]
+
+    leaf = change.path.rsplit(".", 1)[-1]
+    if change.path == "goals" or change.path.startswith("goals."):
+        return "significant"
+    if leaf == "error":
+        # A sensor starting to fail matters; one recovering is routine
+        return "significant" if change.new is not None else "minor"
+    if change.path == "container_health.unhealthy":
+        newly_unhealthy = set(change.new or []) - set(change.old or [])
+        return "significant" if newly_unhealthy else "minor"
+    if change.path == "pending_tasks.depth":
+        delta = abs((change.new or 0) - (change.old or 0))
+        return "significant" if delta >= thresholds.queue_depth_delta else "ignore"
+    if leaf in STATUS_KEYS:
+        return "significant"
+    if _is_number(change.old) and _is_number(change.new):
+        delta = abs(change.new - change.old)
+        if delta < thresholds.numeric_absolute_floor:
+            return "ignore"
+        if change.old and delta / abs(change.old) < thresholds.numeric_relative_change:
+            return "ignore"
+    return "minor"
+
+
+# =============================================================================
+# Change detector
+# =============================================================================
+
+class ChangeDetector:
+    """Tracks the last reasoned observation and caches decisions by observation hash."""
+
+    def __init__(
+        self,
+        thresholds: Optional[SignificanceThresholds] = None,
+        cache_size: int = 128,
+        enabled: bool = CHANGE_DETECTION_ENABLED,
+    ):
+        self.thresholds = thresholds or SignificanceThresholds()
+        self.cache_size = cache_size
+        self.enabled = enabled
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._baseline: Optional[Dict[str, Any]] = None
+        self._baseline_hash: Optional[str] = None
+        self._baseline_at = 0.0
+        self._cycles_since_full = 0
+        self._avg_seconds: Dict[str, float] = {}
+        self.stats = {
+            "full": 0,
+            "cheap": 0,
+            "cached": 0,
+            "skipped": 0,
+            "gpu_seconds_saved": 0.0,
+        }
+
+    def assess(self, observation, force: bool = False) -> Assessment:
+        canonical = canonicalize(observation)
+        digest = observation_hash(canonical)
+
+        if force or not self.enabled or self._baseline is None:
+            reason = "forced" if force else "change detection disabled" if not self.enabled else "first observation"
+            return Assessment("full", digest, canonical, [], reason)
+
+        changes = diff(self._baseline, canonical)
+        for change in changes:
+            change.level = grade(change, self.thresholds)
+        significant = [c for c in changes if c.level == "significant"]
+        minor = [c for c in changes if c.level == "minor"]
+
+        if (
+            self._cycles_since_full >= self.thresholds.max_skipped_cycles
+            or time.monotonic() - self._baseline_at >= self.thresholds.max_decision_age_seconds
+        ):
+            return Assessment("full", digest, canonical, changes, "last full reasoning too old")
+        if digest != self._baseline_hash and self._fresh_decision(digest) is not None:
+            return Assessment("cached", digest, canonical, changes, "observation reasoned about before")
+        if significant:
+            return Assessment("full", digest, canonical, changes, f"significant: {_paths(significant)}")
+        if minor:
+            return Assessment("cheap", digest, canonical, changes, f"minor: {_paths(minor)}")
+        return Assessment("skip", digest, canonical, changes, "no material change since last reasoning")
+
+    def _fresh_decision(self, digest: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(digest)
+        if entry is None or time.monotonic() - entry[0] >= self.thresholds.max_decision_age_seconds:
+            return None
+        return entry[1]
+
+    def cached_decision(self, assessment: Assessment) -> Optional[Dict[str, Any]]:
+        decision = self._fresh_decision(assessment.observation_hash)
+        if decision is not None:
+            self._cache.move_to_end(assessment.observation_hash)
+        return decision
+
+    def record(self, assessment: Assessment, decision: Dict[str, Any], model: str, seconds: float,
+               primary_model: str):
+        """Record an LLM decision; failed reasoning leaves the baseline alone so it is retried."""
+        previous = self._avg_seconds.get(model)
+        self._avg_seconds[model] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+        if assessment.outcome == "cheap":
+            self._save(max(0.0, self._avg_seconds.get(primary_model, seconds) - seconds))
+        self._count(assessment.outcome)
+
+        if "error" in decision:
+            return
+        self._baseline = assessment.canonical
+        self._baseline_hash = assessment.observation_hash
+        if assessment.outcome == "full":
+            self._baseline_at = time.monotonic()
+            self._cycles_since_full = 0
+        else:
+            self._cycles_since_full += 1
+        self._cache[assessment.observation_hash] = (time.monotonic(), decision)
+        self._cache.move_to_end(assessment.observation_hash)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def record_avoided(self, assessment: Assessment, primary_model: str):
+        """Record a cycle answered without calling the LLM."""
+        self._cycles_since_full += 1
+        if assessment.outcome == "cached":
+            # Later observations are compared with the state that decision was for
+            self._baseline = assessment.canonical
+            self._baseline_hash = assessment.observation_hash
+        self._save(self._avg_seconds.get(primary_model, 0.0))
+        self._count("skipped" if assessment.outcome == "skip" else assessment.outcome)
+
+    def _save(self, seconds: float):
+        self.stats["gpu_seconds_saved"] += seconds
+        GPU_SECONDS_SAVED.inc(seconds)
+
+    def _count(self, outcome: str):
+        self.stats[outcome] += 1
+        REASONING_CYCLES.labels(outcome=outcome).inc()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            **self.stats,
+            "gpu_seconds_saved": round(self.stats["gpu_seconds_saved"], 1),
+            "cycles_since_full": self._cycles_since_full,
+            "cached_decisions": len(self._cache),
+            "avg_reasoning_seconds": {m: round(s, 2) for m, s in self._avg_seconds.items()},
+            "thresholds": asdict(self.thresholds),
+        }
+
+
+def _paths(changes: List[Change], limit: int = 5) -> str:
+    paths = [c.path for c in changes]
+    return ", ".join(paths[:limit]) + (f" (+{len(paths) - limit} more)" if len(paths) > limit else "")
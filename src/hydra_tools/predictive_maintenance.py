@@ -8,18 +8,28 @@ Provides trend analysis and failure prediction capabilities:
 - Memory pressure prediction
 - Cluster health aggregation
 
-Uses Prometheus recording rules for real-time predictions.
+Forecasts are fitted in process (see hydra_tools.forecasting): range data is
+ingested once per interval and every request is answered from memory.
 """
 
 import asyncio
+import logging
 import math
+import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional
 import httpx
+import numpy as np
 from fastapi import APIRouter, HTTPException
 
+from hydra_tools.forecasting import ForecastEngine, ForecastGroup, SeriesForecast
+from hydra_tools.prometheus_query import get_prometheus_client
+
+logger = logging.getLogger(__name__)
+
 
 def sanitize_float(value: float) -> float:
     """Convert NaN/Inf to safe values for JSON serialization."""
@@ -32,6 +42,40 @@ def sanitize_float(value: float) -> float:
 
 # Configuration
 PROMETHEUS_URL = "http://192.168.1.244:9090"
+FORECAST_INTERVAL = float(os.getenv("HYDRA_FORECAST_INTERVAL", "60"))
+ANOMALY_THRESHOLD = float(os.getenv("HYDRA_FORECAST_ANOMALY_THRESHOLD", "4.0"))
+
+# Windows and horizons match the recording rules these forecasts replace
+# (disk:predicted_usage_24h, gpu:predicted_vram_1h, gpu:predicted_temp_10m,
+# node:predicted_memory_usage_1h). VRAM and temperature move in steps (model
+# loads, workload changes), which a damped trend extrapolates far less than a
+# line; temperature keeps a faster trend so a runaway still shows within 10
+# minutes. scripts/backtest-forecasts.py compares the methods per group.
+FORECAST_GROUPS = (
+    ForecastGroup(
+        "disk",
+        ('100 * (1 - node_filesystem_avail_bytes{fstype!~"tmpfs|overlay"} / node_filesystem_size_bytes)',),
+        window_seconds=6 * 3600, horizon_seconds=24 * 3600, method="linear",
+    ),
+    ForecastGroup(
+        "vram",
+        ("100 * nvidia_gpu_memory_used_bytes / nvidia_gpu_memory_total_bytes",
+         "100 * DCGM_FI_DEV_FB_USED / DCGM_FI_DEV_FB_TOTAL"),
+        window_seconds=3600, horizon_seconds=3600, method="holt", damping=0.9,
+    ),
+    ForecastGroup(
+        "thermal",
+        ("nvidia_gpu_temp_c", "DCGM_FI_DEV_GPU_TEMP"),
+        window_seconds=1800, horizon_seconds=600, method="holt", beta=0.3, damping=0.95,
+        rate_seconds=600,
+    ),
+    ForecastGroup(
+        "memory",
+        ("100 * (1 - node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes)",),
+        window_seconds=3600, horizon_seconds=3600, method="linear",
+    ),
+    ForecastGroup("score", ("cluster:health_score:percent",), window_seconds=600),
+)
 
 
 class PredictionSeverity(str, Enum):
@@ -52,6 +96,7 @@ class Prediction:
     message: str
     action: Optional[str] = None
     labels: dict = field(default_factory=dict)
+    anomaly_score: float = 0.0  # last sample's deviation from forecast, in residual std devs
 
 
 @dataclass
@@ -96,16 +141,43 @@ class ClusterHealthReport:
     recommendations: list[str]
 
 
+def _series(forecast: SeriesForecast, group: ForecastGroup, clip: Optional[tuple] = None):
+    """(labels, current, predicted, anomaly, index) for each series with data."""
+    predicted = forecast.predict(group.horizon_seconds)
+    if clip:
+        predicted = np.clip(predicted, *clip)
+    current, anomaly = forecast.latest.tolist(), forecast.anomaly.tolist()
+    for i, value in enumerate(predicted.tolist()):
+        if math.isnan(current[i]) or math.isnan(value):
+            continue
+        yield forecast.labels[i], round(current[i], 2), round(value, 2), round(anomaly[i], 2), i
+
+
+def _gpu_label(labels: dict) -> str:
+    return labels.get('gpu', labels.get('GPU_I_ID', 'unknown'))
+
+
 class PredictiveMaintenanceEngine:
     """
     Engine for predictive maintenance analysis.
 
-    Queries Prometheus for trend data and generates predictions.
+    A background task ingests every forecast group from Prometheus once per
+    ``interval`` and rebuilds the predictions; requests read the last build.
     """
 
-    def __init__(self, prometheus_url: str = PROMETHEUS_URL):
+    def __init__(self, prometheus_url: str = PROMETHEUS_URL, interval: float = FORECAST_INTERVAL):
         self.prometheus_url = prometheus_url
+        self.interval = interval
+        self.forecaster = ForecastEngine(FORECAST_GROUPS, step=interval, prometheus_url=prometheus_url)
+        self.active_alerts = 0
+        self._predictions: dict[str, list] = {"disk": [], "vram": [], "thermal": [], "memory": []}
+        self._score = 100.0
+        self._status = PredictionSeverity.HEALTHY
+        self._recommendations: list[str] = []
         self._client = None
+        self._refresher: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._last_refresh = float("-inf")  # monotonic
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -114,23 +186,21 @@ class PredictiveMaintenanceEngine:
         return self._client
 
     async def close(self):
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
         if self._client:
             await self._client.aclose()
             self._client = None
 
     async def _query_prometheus(self, query: str) -> list[dict]:
-        """Execute a Prometheus instant query."""
+        """Execute a Prometheus instant query (shared, cached client)."""
         try:
-            response = await self.client.get(
-                f"{self.prometheus_url}/api/v1/query",
-                params={"query": query}
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") == "success":
-                return data.get("data", {}).get("result", [])
-            return []
+            return await get_prometheus_client(self.prometheus_url).query(query)
         except Exception as e:
             print(f"Prometheus query error: {e}")
             return []
@@ -142,55 +212,89 @@ class PredictiveMaintenanceEngine:
         end: datetime,
         step: str = "5m"
     ) -> list[dict]:
-        """Execute a Prometheus range query."""
+        """Execute a Prometheus range query (shared, cached client)."""
         try:
-            response = await self.client.get(
-                f"{self.prometheus_url}/api/v1/query_range",
-                params={
-                    "query": query,
-                    "start": start.isoformat() + "Z",
-                    "end": end.isoformat() + "Z",
-                    "step": step
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") == "success":
-                return data.get("data", {}).get("result", [])
-            return []
+            return await get_prometheus_client(self.prometheus_url).query_range(query, start, end, step)
         except Exception as e:
             print(f"Prometheus range query error: {e}")
             return []
 
-    async def get_disk_predictions(self) -> list[DiskPrediction]:
-        """Get disk space predictions for all mountpoints."""
-        predictions = []
+    # =========================================================================
+    # Refresh
+    # =========================================================================
 
-        # Query predicted usage in 24h
-        results = await self._query_prometheus('disk:predicted_usage_24h:percent')
-        time_to_full = await self._query_prometheus('disk:time_to_full:hours')
+    async def refresh(self, now: Optional[float] = None):
+        """Ingest new samples, refit and rebuild every prediction."""
+        _, self.active_alerts = await asyncio.gather(
+            self.forecaster.refresh(now), self.get_active_alerts_count()
+        )
+        self.rebuild()
+        self._last_refresh = time.monotonic()
+        self._ready.set()
+
+    def rebuild(self):
+        """Rebuild predictions from the forecaster's current fits."""
+        forecasts, groups = self.forecaster.forecasts, self.forecaster.groups
+        builders = {
+            "disk": self._build_disk, "vram": self._build_vram,
+            "thermal": self._build_thermal, "memory": self._build_memory,
+        }
+        for name, build in builders.items():
+            if name in forecasts:
+                self._predictions[name] = build(forecasts[name], groups[name])
+        score = forecasts.get("score")
+        if score is not None and len(score):
+            self._score = sanitize_float(float(score.latest[0]))
 
-        # Create lookup for time_to_full
-        ttf_map = {}
-        for r in time_to_full:
-            key = (r['metric'].get('instance', ''), r['metric'].get('mountpoint', ''))
-            try:
-                ttf_map[key] = sanitize_float(float(r['value'][1]))
-            except (IndexError, ValueError):
-                pass
+        # Determine overall status
+        all_predictions = [p for predictions in self._predictions.values() for p in predictions]
+        all_severities = {p.severity for p in all_predictions}
 
-        for result in results:
-            metric = result.get('metric', {})
-            instance = metric.get('instance', 'unknown')
-            mountpoint = metric.get('mountpoint', '/')
+        if PredictionSeverity.CRITICAL in all_severities:
+            self._status = PredictionSeverity.CRITICAL
+        elif PredictionSeverity.WARNING in all_severities:
+            self._status = PredictionSeverity.WARNING
+        elif PredictionSeverity.WATCH in all_severities:
+            self._status = PredictionSeverity.WATCH
+        else:
+            self._status = PredictionSeverity.HEALTHY
 
+        # Generate recommendations
+        recommendations = []
+        for p in all_predictions:
+            if p.action and p.severity in (PredictionSeverity.WARNING, PredictionSeverity.CRITICAL):
+                recommendations.append(f"[{p.severity.value.upper()}] {p.action}")
+        self._recommendations = list(set(recommendations))  # Dedupe
+
+    async def _refresh_loop(self):
+        while True:
+            wait = self._last_refresh + self.interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
             try:
-                predicted = sanitize_float(float(result['value'][1]))
-            except (IndexError, ValueError):
-                continue
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Forecast refresh failed: {e}")
+                self._last_refresh = time.monotonic()
+                self._ready.set()  # serve the previous predictions
+
+    async def _ensure_fresh(self):
+        """Start the refresh loop on first use and wait for its first pass."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop())
+        await self._ready.wait()
+
+    # =========================================================================
+    # Prediction Builders
+    # =========================================================================
+
+    def _build_disk(self, forecast: SeriesForecast, group: ForecastGroup) -> list[DiskPrediction]:
+        predictions = []
+        time_to_full = (forecast.time_to(100.0) / 3600).tolist()
 
-            if predicted <= 0:
+        for metric, current, predicted, anomaly, i in _series(forecast, group, clip=(0.0, 100.0)):
+            mountpoint = metric.get('mountpoint', '/')
+            if current <= 0:
                 continue  # Skip invalid values
 
             # Determine severity
@@ -211,43 +315,31 @@ class PredictiveMaintenanceEngine:
                 message = f"Disk {mountpoint} healthy at {predicted:.1f}% predicted"
                 action = None
 
-            ttf = ttf_map.get((instance, mountpoint))
+            ttf = time_to_full[i]
 
             predictions.append(DiskPrediction(
                 metric="disk:predicted_usage_24h:percent",
-                current_value=predicted - 5,  # Approximate current
+                current_value=current,
                 predicted_value=predicted,
                 prediction_horizon="24h",
                 severity=severity,
                 message=message,
                 action=action,
                 labels=metric,
+                anomaly_score=anomaly,
                 mountpoint=mountpoint,
-                time_to_full_hours=ttf
+                time_to_full_hours=round(ttf, 1) if math.isfinite(ttf) else None
             ))
 
         return predictions
 
-    async def get_vram_predictions(self) -> list[VRAMPrediction]:
-        """Get GPU VRAM predictions."""
+    def _build_vram(self, forecast: SeriesForecast, group: ForecastGroup) -> list[VRAMPrediction]:
         predictions = []
 
-        # Query both nvidia-smi and DCGM formats
-        results = await self._query_prometheus('gpu:predicted_vram_1h:percent')
-        results_dcgm = await self._query_prometheus('gpu:predicted_vram_1h_dcgm:percent')
-
-        all_results = results + results_dcgm
-
-        for result in all_results:
-            metric = result.get('metric', {})
-            gpu = metric.get('gpu', metric.get('GPU_I_ID', 'unknown'))
+        for metric, current, predicted, anomaly, _ in _series(forecast, group, clip=(0.0, 100.0)):
+            gpu = _gpu_label(metric)
             instance = metric.get('instance', 'unknown')
 
-            try:
-                predicted = sanitize_float(float(result['value'][1]))
-            except (IndexError, ValueError):
-                continue
-
             if predicted > 95:
                 severity = PredictionSeverity.CRITICAL
                 message = f"GPU {gpu} VRAM predicted to exceed 95% in 1 hour"
@@ -267,53 +359,29 @@ class PredictiveMaintenanceEngine:
 
             predictions.append(VRAMPrediction(
                 metric="gpu:predicted_vram_1h:percent",
-                current_value=predicted - 2,
+                current_value=current,
                 predicted_value=predicted,
                 prediction_horizon="1h",
                 severity=severity,
                 message=message,
                 action=action,
                 labels=metric,
+                anomaly_score=anomaly,
                 gpu_name=gpu,
                 node=instance
             ))
 
         return predictions
 
-    async def get_thermal_predictions(self) -> list[ThermalPrediction]:
-        """Get GPU thermal predictions."""
+    def _build_thermal(self, forecast: SeriesForecast, group: ForecastGroup) -> list[ThermalPrediction]:
         predictions = []
+        # Least-squares slope over the last 10 minutes, as deriv(...[10m]) * 60 gave the old rule
+        change_rates = (forecast.rate * 60).tolist()
 
-        # Query predicted temperatures
-        results = await self._query_prometheus('gpu:predicted_temp_10m:celsius')
-        results_dcgm = await self._query_prometheus('gpu:predicted_temp_10m_dcgm:celsius')
-
-        # Query change rates
-        change_rates = await self._query_prometheus('gpu:temp_change_rate:per_minute')
-        change_rates_dcgm = await self._query_prometheus('gpu:temp_change_rate_dcgm:per_minute')
-
-        # Build change rate map
-        rate_map = {}
-        for r in change_rates + change_rates_dcgm:
-            key = r['metric'].get('gpu', r['metric'].get('GPU_I_ID', 'unknown'))
-            try:
-                rate_map[key] = sanitize_float(float(r['value'][1]))
-            except (IndexError, ValueError):
-                pass
-
-        all_results = results + results_dcgm
-
-        for result in all_results:
-            metric = result.get('metric', {})
-            gpu = metric.get('gpu', metric.get('GPU_I_ID', 'unknown'))
+        for metric, current, predicted, anomaly, i in _series(forecast, group):
+            gpu = _gpu_label(metric)
             instance = metric.get('instance', 'unknown')
-
-            try:
-                predicted = sanitize_float(float(result['value'][1]))
-            except (IndexError, ValueError):
-                continue
-
-            change_rate = rate_map.get(gpu, 0.0)
+            change_rate = round(sanitize_float(change_rates[i]), 2)
 
             if predicted > 85:
                 severity = PredictionSeverity.CRITICAL
@@ -334,13 +402,14 @@ class PredictiveMaintenanceEngine:
 
             predictions.append(ThermalPrediction(
                 metric="gpu:predicted_temp_10m:celsius",
-                current_value=predicted - (change_rate * 10),
+                current_value=current,
                 predicted_value=predicted,
                 prediction_horizon="10m",
                 severity=severity,
                 message=message,
                 action=action,
                 labels=metric,
+                anomaly_score=anomaly,
                 gpu_name=gpu,
                 node=instance,
                 temp_change_rate=change_rate
@@ -348,21 +417,12 @@ class PredictiveMaintenanceEngine:
 
         return predictions
 
-    async def get_memory_predictions(self) -> list[MemoryPrediction]:
-        """Get system memory predictions."""
+    def _build_memory(self, forecast: SeriesForecast, group: ForecastGroup) -> list[MemoryPrediction]:
         predictions = []
 
-        results = await self._query_prometheus('node:predicted_memory_usage_1h:percent')
-
-        for result in results:
-            metric = result.get('metric', {})
+        for metric, current, predicted, anomaly, _ in _series(forecast, group, clip=(0.0, 100.0)):
             instance = metric.get('instance', 'unknown')
 
-            try:
-                predicted = sanitize_float(float(result['value'][1]))
-            except (IndexError, ValueError):
-                continue
-
             if predicted > 95:
                 severity = PredictionSeverity.CRITICAL
                 message = f"Memory exhaustion imminent on {instance}"
@@ -382,29 +442,54 @@ class PredictiveMaintenanceEngine:
 
             predictions.append(MemoryPrediction(
                 metric="node:predicted_memory_usage_1h:percent",
-                current_value=predicted - 5,
+                current_value=current,
                 predicted_value=predicted,
                 prediction_horizon="1h",
                 severity=severity,
                 message=message,
                 action=action,
                 labels=metric,
+                anomaly_score=anomaly,
                 node=instance
             ))
 
         return predictions
 
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    async def get_disk_predictions(self) -> list[DiskPrediction]:
+        """Get disk space predictions for all mountpoints."""
+        await self._ensure_fresh()
+        return self._predictions["disk"]
+
+    async def get_vram_predictions(self) -> list[VRAMPrediction]:
+        """Get GPU VRAM predictions."""
+        await self._ensure_fresh()
+        return self._predictions["vram"]
+
+    async def get_thermal_predictions(self) -> list[ThermalPrediction]:
+        """Get GPU thermal predictions."""
+        await self._ensure_fresh()
+        return self._predictions["thermal"]
+
+    async def get_memory_predictions(self) -> list[MemoryPrediction]:
+        """Get system memory predictions."""
+        await self._ensure_fresh()
+        return self._predictions["memory"]
+
     async def get_cluster_health_score(self) -> float:
         """Get the aggregate cluster health score (0-100)."""
-        results = await self._query_prometheus('cluster:health_score:percent')
-
-        if results:
-            try:
-                return sanitize_float(float(results[0]['value'][1]))
-            except (IndexError, ValueError):
-                pass
+        await self._ensure_fresh()
+        return self._score
 
-        return 100.0  # Default healthy
+    async def get_anomalies(self, threshold: float = ANOMALY_THRESHOLD) -> list[Prediction]:
+        """Predictions whose latest sample deviates sharply from its forecast."""
+        await self._ensure_fresh()
+        anomalies = [p for predictions in self._predictions.values() for p in predictions
+                     if p.anomaly_score >= threshold]
+        return sorted(anomalies, key=lambda p: p.anomaly_score, reverse=True)
 
     async def get_active_alerts_count(self) -> int:
         """Get count of currently firing alerts."""
@@ -424,61 +509,48 @@ class PredictiveMaintenanceEngine:
 
     async def get_full_health_report(self) -> ClusterHealthReport:
         """Generate a comprehensive health report with all predictions."""
-        # Gather all predictions concurrently
-        disk_task = self.get_disk_predictions()
-        vram_task = self.get_vram_predictions()
-        thermal_task = self.get_thermal_predictions()
-        memory_task = self.get_memory_predictions()
-        score_task = self.get_cluster_health_score()
-        alerts_task = self.get_active_alerts_count()
-
-        (disk_preds, vram_preds, thermal_preds, memory_preds,
-         score, alerts) = await asyncio.gather(
-            disk_task, vram_task, thermal_task, memory_task,
-            score_task, alerts_task
+        await self._ensure_fresh()
+        return ClusterHealthReport(
+            timestamp=datetime.utcnow().isoformat() + "Z",
+            overall_score=self._score,
+            status=self._status,
+            disk_predictions=self._predictions["disk"],
+            vram_predictions=self._predictions["vram"],
+            thermal_predictions=self._predictions["thermal"],
+            memory_predictions=self._predictions["memory"],
+            active_alerts=self.active_alerts,
+            recommendations=self._recommendations
         )
 
-        # Determine overall status
-        all_severities = (
-            [p.severity for p in disk_preds] +
-            [p.severity for p in vram_preds] +
-            [p.severity for p in thermal_preds] +
-            [p.severity for p in memory_preds]
-        )
 
-        if PredictionSeverity.CRITICAL in all_severities:
-            status = PredictionSeverity.CRITICAL
-        elif PredictionSeverity.WARNING in all_severities:
-            status = PredictionSeverity.WARNING
-        elif PredictionSeverity.WATCH in all_severities:
-            status = PredictionSeverity.WATCH
-        else:
-            status = PredictionSeverity.HEALTHY
+# =============================================================================
+# Global Instance
+# =============================================================================
 
-        # Generate recommendations
-        recommendations = []
-        for p in disk_preds + vram_preds + thermal_preds + memory_preds:
-            if p.action and p.severity in (PredictionSeverity.WARNING, PredictionSeverity.CRITICAL):
-                recommendations.append(f"[{p.severity.value.upper()}] {p.action}")
+_predictive_engine: Optional[PredictiveMaintenanceEngine] = None
+
+
+def get_predictive_engine() -> PredictiveMaintenanceEngine:
+    """Get or create the global predictive maintenance engine."""
+    global _predictive_engine
+    if _predictive_engine is None:
+        _predictive_engine = PredictiveMaintenanceEngine()
+    return _predictive_engine
 
-        return ClusterHealthReport(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            overall_score=score,
-            status=status,
-            disk_predictions=disk_preds,
-            vram_predictions=vram_preds,
-            thermal_predictions=thermal_preds,
-            memory_predictions=memory_preds,
-            active_alerts=alerts,
-            recommendations=list(set(recommendations))  # Dedupe
-        )
+
+async def close_predictive_engine():
+    """Stop the forecast refresh loop and close the alerts client."""
+    global _predictive_engine
+    if _predictive_engine is not None:
+        await _predictive_engine.close()
+        _predictive_engine = None
 
 
 # FastAPI Router
 def create_predictive_router() -> APIRouter:
     """Create the predictive maintenance API router."""
     router = APIRouter(prefix="/predictive", tags=["predictive-maintenance"])
-    engine = PredictiveMaintenanceEngine()
+    engine = get_predictive_engine()
 
     @router.get("/health")
     async def get_health_report():
@@ -515,7 +587,8 @@ def create_predictive_router() -> APIRouter:
                     "severity": p.severity.value,
                     "message": p.message,
                     "action": p.action,
-                    "labels": p.labels
+                    "labels": p.labels,
+                    "anomaly_score": p.anomaly_score
                 }
                 for p in predictions
             ]
@@ -533,7 +606,8 @@ def create_predictive_router() -> APIRouter:
                     "predicted_usage_1h": p.predicted_value,
                     "severity": p.severity.value,
                     "message": p.message,
-                    "action": p.action
+                    "action": p.action,
+                    "anomaly_score": p.anomaly_score
                 }
                 for p in predictions
             ]
@@ -552,7 +626,8 @@ def create_predictive_router() -> APIRouter:
                     "temp_change_rate_per_min": p.temp_change_rate,
                     "severity": p.severity.value,
                     "message": p.message,
-                    "action": p.action
+                    "action": p.action,
+                    "anomaly_score": p.anomaly_score
                 }
                 for p in predictions
             ]
@@ -569,7 +644,8 @@ def create_predictive_router() -> APIRouter:
                     "predicted_usage_1h": p.predicted_value,
                     "severity": p.severity.value,
                     "message": p.message,
-                    "action": p.action
+                    "action": p.action,
+                    "anomaly_score": p.anomaly_score
                 }
                 for p in predictions
             ]
@@ -595,6 +671,29 @@ def create_predictive_router() -> APIRouter:
             "timestamp": datetime.utcnow().isoformat() + "Z"
         }
 
+    @router.get("/anomalies")
+    async def get_anomalies(threshold: float = ANOMALY_THRESHOLD):
+        """Get series whose latest sample breaks from their forecast."""
+        anomalies = await engine.get_anomalies(threshold)
+        return {
+            "threshold": threshold,
+            "anomalies": [
+                {
+                    "metric": p.metric,
+                    "current_value": p.current_value,
+                    "anomaly_score": p.anomaly_score,
+                    "severity": p.severity.value,
+                    "labels": p.labels
+                }
+                for p in anomalies
+            ]
+        }
+
+    @router.get("/forecast/stats")
+    async def get_forecast_stats():
+        """Get forecaster ingest and fit statistics."""
+        return engine.forecaster.get_stats()
+
     @router.get("/alerts/predictive")
     async def get_predictive_alerts():
         """Get currently firing predictive alerts."""
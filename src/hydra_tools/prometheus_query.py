@@ -0,0 +1,409 @@
+"""
+Hydra Prometheus Query Layer - Shared, cached and coalesced PromQL queries
+
+Dashboards, the work queue scheduler, predictive maintenance and the
+autonomous controller all read the same handful of series, often within the
+same second. They go through one client per Prometheus server instead of a
+new HTTP connection per query:
+
+    prom = get_prometheus_client()
+    series = await prom.query('DCGM_FI_DEV_GPU_TEMP{gpu="0"}')
+
+- Results are cached per query for the scrape interval
+  (HYDRA_PROMETHEUS_SCRAPE_INTERVAL): Prometheus has no newer samples to
+  return before the next scrape. A call's ``ttl`` is the oldest cached
+  result it accepts (0 always asks Prometheus).
+- Identical queries already in flight are coalesced (single flight): later
+  callers await the first request instead of sending their own.
+- Instant queries issued within HYDRA_PROMETHEUS_BATCH_WINDOW_MS of each other
+  are sent as one request. Each is tagged with label_replace and joined with
+  ``or``, and the combined vector is split back per query. Queries that do
+  not evaluate to an instant vector (scalars, strings) cannot be joined; a
+  batch that fails falls back to one request per query, and queries seen to
+  return a non-vector are sent alone from then on.
+- Requests reuse one pooled httpx.AsyncClient.
+
+Query counts by how they were answered (cache, coalesced, request) and the
+cache hit rate are exported as Prometheus metrics and at /prometheus/stats.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter as TallyCounter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple, Union
+
+import httpx
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_URL = os.getenv("PROMETHEUS_URL", "http://192.168.1.244:9090")
+SCRAPE_INTERVAL = float(os.getenv("HYDRA_PROMETHEUS_SCRAPE_INTERVAL", "15"))
+BATCH_WINDOW_MS = float(os.getenv("HYDRA_PROMETHEUS_BATCH_WINDOW_MS", "5"))
+BATCH_MAX_QUERIES = int(os.getenv("HYDRA_PROMETHEUS_BATCH_MAX", "25"))
+CACHE_MAX_ENTRIES = 4096
+
+# Label tagging each query's series inside a combined request
+BATCH_LABEL = "hydra_batch_query"
+
+QUERIES = Counter(
+    "hydra_prometheus_queries_total",
+    "PromQL queries asked of the shared client, by how they were answered",
+    ["kind", "source"],
+)
+
+REQUESTS = Counter(
+    "hydra_prometheus_requests_total",
+    "HTTP requests sent to Prometheus by the shared client",
+    ["endpoint"],
+)
+
+CACHE_HIT_RATIO = Gauge(
+    "hydra_prometheus_cache_hit_ratio",
+    "Share of PromQL queries answered from the shared client's cache",
+)
+
+TimeLike = Union[datetime, float, int]
+
+
+class PrometheusQueryError(Exception):
+    """Prometheus could not be reached or rejected the query."""
+
+    def __init__(self, message: str, error_type: Optional[str] = None):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+def _timestamp(value: TimeLike) -> float:
+    if isinstance(value, datetime):
+        # Callers pass naive datetime.utcnow() values
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _step_seconds(step: Union[str, float, int]) -> float:
+    if isinstance(step, (int, float)):
+        return float(step)
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800, "y": 31536000}
+    for suffix in ("ms", "s", "m", "h", "d", "w", "y"):
+        if step.endswith(suffix) and step[:-len(suffix)].replace(".", "", 1).isdigit():
+            return float(step[:-len(suffix)]) * units[suffix]
+    return float(step)
+
+
+def _consume(future: asyncio.Future):
+    # Nobody may be left waiting on a failed request; don't log it as unretrieved
+    if not future.cancelled():
+        future.exception()
+
+
+class PrometheusClient:
+    """Cached, coalescing and batching client for one Prometheus server."""
+
+    def __init__(
+        self,
+        base_url: str = PROMETHEUS_URL,
+        ttl: float = SCRAPE_INTERVAL,
+        batch_window: float = BATCH_WINDOW_MS / 1000,
+        batch_max: int = BATCH_MAX_QUERIES,
+        timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.batch_window = batch_window
+        self.batch_max = batch_max
+        self.timeout = timeout
+        self._clock = clock
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}  # key -> (fetched at, result)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._unbatchable: set = set()
+
+        self.queries: TallyCounter = TallyCounter()  # (kind, source) -> count
+        self.requests: TallyCounter = TallyCounter()  # endpoint -> count
+        self.batched_queries = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    async def query(self, promql: str, ttl: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Instant query at the current time. Returns the result list
+        (``[{"metric": {...}, "value": [ts, "v"]}, ...]`` for vectors).
+        """
+        return await self._get("query", ("query", promql), ttl, lambda future: self._enqueue(promql, future))
+
+    async def query_many(self, queries: Mapping[str, str], ttl: Optional[float] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run several instant queries together (one request where PromQL allows).
+        A query that fails maps to an empty list.
+        """
+        names = list(queries)
+        results = await asyncio.gather(*(self.query(queries[name], ttl) for name in names), return_exceptions=True)
+        combined = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Prometheus query failed: {queries[name]} - {result}")
+                result = []
+            combined[name] = result
+        return combined
+
+    async def query_range(
+        self,
+        promql: str,
+        start: TimeLike,
+        end: TimeLike,
+        step: Union[str, float, int] = "1m",
+        ttl: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Range query. The window is moved back to a multiple of the cache TTL
+        so callers asking for "the last hour" within one scrape interval
+        share a request; it is never more than one interval stale.
+        """
+        start_ts, end_ts = _timestamp(start), _timestamp(end)
+        align = ttl if ttl is not None else self.ttl
+        if align > 0:
+            shift = end_ts % align
+            start_ts, end_ts = start_ts - shift, end_ts - shift
+        step_s = _step_seconds(step)
+        params = {"query": promql, "start": f"{start_ts:.3f}", "end": f"{end_ts:.3f}", "step": f"{step_s:g}"}
+
+        async def fetch(future: asyncio.Future):
+            future.set_result((await self._request("query_range", params)).get("result", []))
+
+        return await self._get("range", ("range", promql, params["start"], params["end"], step_s), ttl,
+                               lambda future: self._run(fetch, future))
+
+    async def targets(self, ttl: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Active scrape targets (/api/v1/targets)."""
+        async def fetch(future: asyncio.Future):
+            data = await self._request("targets", {"state": "active"}, method="GET")
+            future.set_result(data.get("activeTargets", []))
+
+        return await self._get("targets", ("targets",), ttl, lambda future: self._run(fetch, future))
+
+    # =========================================================================
+    # Cache and single flight
+    # =========================================================================
+
+    async def _get(self, kind: str, key: Hashable, ttl: Optional[float], start: Callable[[asyncio.Future], None]):
+        max_age = self.ttl if ttl is None else ttl
+        cached = self._cache.get(key)
+        if cached is not None and self._clock() - cached[0] < max_age:
+            self._count(kind, "cache")
+            return cached[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count(kind, "coalesced")
+            return await asyncio.shield(future)
+
+        self._count(kind, "request")
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume)
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._settle(key, done))
+        start(future)
+        return await asyncio.shield(future)
+
+    def _settle(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        now = self._clock()
+        if len(self._cache) >= CACHE_MAX_ENTRIES:
+            self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.ttl}
+            while len(self._cache) >= CACHE_MAX_ENTRIES:
+                del self._cache[next(iter(self._cache))]
+        self._cache.pop(key, None)  # re-insert at the end: oldest entries first
+        self._cache[key] = (now, future.result())
+
+    def _run(self, fetch: Callable[[asyncio.Future], Any], future: asyncio.Future):
+        async def runner():
+            try:
+                await fetch(future)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+        asyncio.get_running_loop().create_task(runner())
+
+    def invalidate(self):
+        """Drop cached results (in-flight requests still complete)."""
+        self._cache.clear()
+
+    # =========================================================================
+    # Batching
+    # =========================================================================
+
+    def _enqueue(self, promql: str, future: asyncio.Future):
+        if promql in self._unbatchable or self.batch_max <= 1:
+            self._run(lambda f: self._query_one(promql, f), future)
+            return
+        self._pending.append((promql, future))
+        if len(self._pending) >= self.batch_max:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.batch_window)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self):
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+        pending, self._pending = self._pending, []
+        if len(pending) == 1:
+            promql, future = pending[0]
+            self._run(lambda f: self._query_one(promql, f), future)
+        elif pending:
+            asyncio.get_running_loop().create_task(self._query_batch(pending))
+
+    async def _query_one(self, promql: str, future: asyncio.Future):
+        data = await self._request("query", {"query": promql})
+        if data.get("resultType") != "vector":
+            self._unbatchable.add(promql)
+        future.set_result(data.get("result", []))
+
+    async def _query_batch(self, pending: List[Tuple[str, asyncio.Future]]):
+        expr = " or ".join(
+            f'label_replace({promql}, "{BATCH_LABEL}", "{index}", "", "")'
+            for index, (promql, _) in enumerate(pending)
+        )
+        try:
+            data = await self._request("query_batch", {"query": expr})
+        except PrometheusQueryError as e:
+            if e.error_type is None:
+                # Prometheus unreachable: separate requests would fail the same way
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            data = {"resultType": None, "error": str(e)}
+        if data.get("resultType") != "vector":
+            # Some query is not an instant vector (or is invalid): ask each alone
+            logger.debug(f"Batched Prometheus query rejected, querying separately: {data.get('error')}")
+            for promql, future in pending:
+                self._run(lambda f, q=promql: self._query_one(q, f), future)
+            return
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in pending]
+        for series in data.get("result", []):
+            metric = dict(series.get("metric", {}))
+            index = metric.pop(BATCH_LABEL, None)
+            if index is not None and index.isdigit() and int(index) < len(pending):
+                results[int(index)].append({**series, "metric": metric})
+        self.batched_queries += len(pending)
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    # =========================================================================
+    # HTTP
+    # =========================================================================
+
+    async def _request(self, endpoint: str, params: Dict[str, Any], method: str = "POST") -> Dict[str, Any]:
+        path = {"query": "query", "query_batch": "query", "query_range": "query_range", "targets": "targets"}[endpoint]
+        self.requests[endpoint] += 1
+        REQUESTS.labels(endpoint=endpoint).inc()
+        try:
+            if method == "GET":
+                response = await self.client.get(f"/api/v1/{path}", params=params)
+            else:
+                response = await self.client.post(f"/api/v1/{path}", data=params)
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise PrometheusQueryError(f"Prometheus request failed: {e}") from e
+        if response.status_code != 200 or body.get("status") != "success":
+            raise PrometheusQueryError(
+                f"Prometheus {path} returned {response.status_code}: {body.get('error', 'unknown error')}",
+                body.get("errorType"),
+            )
+        return body.get("data", {})
+
+    def _count(self, kind: str, source: str):
+        self.queries[(kind, source)] += 1
+        QUERIES.labels(kind=kind, source=source).inc()
+        total = sum(self.queries.values())
+        CACHE_HIT_RATIO.set(self._source_total("cache") / total)
+
+    def _source_total(self, source: str) -> int:
+        return sum(count for (_, counted), count in self.queries.items() if counted == source)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = sum(self.queries.values())
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for (kind, source), count in sorted(self.queries.items()):
+            by_kind.setdefault(kind, {})[source] = count
+        return {
+            "base_url": self.base_url,
+            "ttl_seconds": self.ttl,
+            "queries": total,
+            "by_kind": by_kind,
+            "requests": dict(self.requests),
+            "cache_hit_rate": round(self._source_total("cache") / total, 4) if total else 0.0,
+            "coalesced_rate": round(self._source_total("coalesced") / total, 4) if total else 0.0,
+            "batched_queries": self.batched_queries,
+            "unbatchable_queries": len(self._unbatchable),
+            "cache_entries": len(self._cache),
+            "in_flight": len(self._inflight),
+        }
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_prometheus_clients: Dict[str, PrometheusClient] = {}
+
+
+def get_prometheus_client(base_url: Optional[str] = None) -> PrometheusClient:
+    """Get or create the shared client for a Prometheus server (default PROMETHEUS_URL)."""
+    url = (base_url or PROMETHEUS_URL).rstrip("/")
+    if url not in _prometheus_clients:
+        _prometheus_clients[url] = PrometheusClient(url)
+    return _prometheus_clients[url]
+
+
+def get_prometheus_stats() -> Dict[str, Any]:
+    return {"clients": [client.get_stats() for client in _prometheus_clients.values()]}
+
+
+async def close_prometheus_client():
+    """Close every shared Prometheus client."""
+    clients = list(_prometheus_clients.values())
+    _prometheus_clients.clear()
+    for client in clients:
+        await client.close()
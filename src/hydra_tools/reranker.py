@@ -19,6 +19,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import httpx
 from prometheus_client import Counter, Histogram
 
+from hydra_tools.similarity import cosine_many
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -213,10 +215,11 @@ Relevance score (0-10):"""
             logger.error(f"Failed to get query embedding: {e}")
             return documents[:top_k]
 
-        # Score each document
-        scored_docs = []
+        # Embed each document; one that fails to embed scores 0
+        candidates = documents[:self.config.max_candidates]
+        doc_embeddings = []
 
-        for doc in documents[:self.config.max_candidates]:
+        for doc in candidates:
             content = doc.get("content", doc.get("text", str(doc)))[:1000]
 
             try:
@@ -224,19 +227,17 @@ Relevance score (0-10):"""
                     self.config.embedding_url,
                     json={"model": self.config.embedding_model, "prompt": content}
                 )
-                doc_embedding = doc_response.json().get("embedding", [])
-
-                # Compute cosine similarity
-                score = self._cosine_similarity(query_embedding, doc_embedding)
+                doc_embeddings.append(doc_response.json().get("embedding", []))
             except Exception as e:
                 logger.warning(f"Failed to embed document: {e}")
-                score = 0.0
+                doc_embeddings.append(None)
 
-            scored_docs.append({
-                **doc,
-                "rerank_score": score,
-                "rerank_method": "embedding"
-            })
+        # Score all candidates at once
+        scores = cosine_many(query_embedding, doc_embeddings)
+        scored_docs = [
+            {**doc, "rerank_score": float(score), "rerank_method": "embedding"}
+            for doc, score in zip(candidates, scores)
+        ]
 
         # Sort by score
         scored_docs.sort(key=lambda x: x.get("rerank_score", 0), reverse=True)
@@ -249,21 +250,6 @@ Relevance score (0-10):"""
         logger.info(f"Embedding reranking: {len(documents)} -> {len(result)} docs in {time.time()-start:.2f}s")
         return result
 
-    @staticmethod
-    def _cosine_similarity(a: List[float], b: List[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        if not a or not b or len(a) != len(b):
-            return 0.0
-
-        dot_product = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-
-        return dot_product / (norm_a * norm_b)
-
     async def rerank(
         self,
         query: str,
@@ -4,6 +4,13 @@ Hydra Research Queue
 Ingestion pipeline for external research - URLs, documents, papers.
 Fetches content, analyzes with LLM, extracts key insights, stores to knowledge base.
 
+Processing is incremental: fetches are conditional (ETag/Last-Modified)
+against an on-disk response cache, and analysis is skipped when the
+fetched content hashes to something already analyzed, so re-queueing a
+batch of unchanged sources costs requests but no LLM calls. Items are
+processed concurrently with per-host politeness limits, and the queue is
+persisted as an append-only journal.
+
 Endpoints:
 - POST /research/queue - Submit URL/document for analysis
 - GET /research/queue - List queued items
@@ -24,11 +31,13 @@ import os
 import re
 import time
 import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from urllib.parse import urlsplit
 
 import httpx
 from prometheus_client import Counter, Histogram, Gauge
@@ -62,6 +71,17 @@ RESEARCH_QUEUE_SIZE = Gauge(
     "Current research queue size"
 )
 
+RESEARCH_REUSE = Counter(
+    "hydra_research_reuse_total",
+    "Fetches answered by the response cache and analyses reused by content hash",
+    ["kind"]
+)
+
+# Rewrite the journal once it holds this many times more records than live
+# items (and at least JOURNAL_COMPACT_MIN records)
+JOURNAL_COMPACT_RATIO = 4
+JOURNAL_COMPACT_MIN = 1000
+
 # =============================================================================
 # Enums and Types
 # =============================================================================
@@ -124,6 +144,10 @@ class ResearchItem:
     stored_to_knowledge: bool = False
     knowledge_id: Optional[str] = None
 
+    # Hash of the analyzed content; items sharing it share one analysis
+    content_hash: Optional[str] = None
+    analysis_reused: bool = False
+
 
 @dataclass
 class ResearchQueueConfig:
@@ -137,6 +161,9 @@ class ResearchQueueConfig:
     max_content_length: int = 50000  # Max chars to analyze
     auto_process: bool = True
     process_interval: int = 60  # Seconds between batch processing
+    max_concurrent: int = 4  # Items fetched/analyzed at once
+    per_host_concurrency: int = 2  # Requests in flight per host
+    per_host_interval: float = 1.0  # Seconds between request starts per host
 
     # Storage
     data_dir: str = "/data/research"
@@ -149,6 +176,78 @@ class ResearchQueueConfig:
     embedding_model: str = "nomic-embed-text"
 
 
+# =============================================================================
+# Fetch Politeness and Caching
+# =============================================================================
+
+class HostLimiter:
+    """Caps concurrent requests per host and spaces out their start times."""
+
+    def __init__(self, concurrency: int, interval: float):
+        self.concurrency = concurrency
+        self.interval = interval
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class ResponseCache:
+    """
+    On-disk bodies of successful GETs keyed by URL, with the validators
+    needed to revalidate them (one JSON file per URL).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a cached URL."""
+        entry = self.get(url)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, response: httpx.Response):
+        """Cache a 200 response that carries a validator."""
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        path = self._path(url)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "url": url, "etag": etag, "last_modified": last_modified,
+                "content_type": response.headers.get("content-type"),
+                "body": response.text, "fetched_at": datetime.utcnow().isoformat() + "Z",
+            }, f)
+        os.replace(tmp, path)
+
+
 # =============================================================================
 # Research Queue Implementation
 # =============================================================================
@@ -170,10 +269,22 @@ class ResearchQueue:
         self._running = False
 
         # Ensure data directory exists
-        Path(self.config.data_dir).mkdir(parents=True, exist_ok=True)
-
-        # Load existing queue from disk
+        data_dir = Path(self.config.data_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        self._journal_path = data_dir / "queue.jsonl"
+        self._journal_records = 0
+        self._analyses_path = data_dir / "analyses.jsonl"
+
+        self.responses = ResponseCache(data_dir / "http_cache")
+        self.hosts = HostLimiter(self.config.per_host_concurrency, self.config.per_host_interval)
+        self._slots = asyncio.Semaphore(self.config.max_concurrent)
+        self._analyses: Dict[str, Dict[str, Any]] = {}  # content hash -> analysis and knowledge id
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"fetches": 0, "not_modified": 0, "analyses": 0, "analyses_reused": 0}
+
+        # Load existing queue and analyses from disk
         self._load_queue()
+        self._load_analyses()
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -204,7 +315,7 @@ class ResearchQueue:
         )
 
         self.queue[item_id] = item
-        self._save_queue()
+        self._journal(item)
 
         RESEARCH_QUEUED.labels(
             source_type=source_type.value,
@@ -245,7 +356,7 @@ class ResearchQueue:
         """Remove item from queue."""
         if item_id in self.queue:
             del self.queue[item_id]
-            self._save_queue()
+            self._append({"op": "delete", "id": item_id})
             RESEARCH_QUEUE_SIZE.set(len([i for i in self.queue.values() if i.status == ResearchStatus.QUEUED]))
             return True
         return False
@@ -254,6 +365,33 @@ class ResearchQueue:
     # Content Fetching
     # =========================================================================
 
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Conditional GET through the response cache and the host limiter.
+        A 304 is answered with the cached body as a 200.
+        """
+        base_headers = kwargs.pop("headers", {})
+        headers = {**base_headers, **self.responses.validators(url)}
+        async with self.hosts.slot(url):
+            response = await self.client.get(url, headers=headers, **kwargs)
+        self.stats["fetches"] += 1
+
+        if response.status_code == 304:
+            cached = self.responses.get(url)
+            if cached is not None:
+                self.stats["not_modified"] += 1
+                RESEARCH_REUSE.labels(kind="not_modified").inc()
+                return httpx.Response(
+                    200, text=cached["body"], request=response.request,
+                    headers={"content-type": cached.get("content_type") or "text/plain"},
+                )
+            # Cache entry vanished between reading validators and now
+            async with self.hosts.slot(url):
+                response = await self.client.get(url, headers=base_headers, **kwargs)
+
+        self.responses.put(url, response)
+        return response
+
     async def _fetch_url(self, url: str) -> tuple[str, Dict[str, Any]]:
         """Fetch content from URL."""
         metadata = {}
@@ -266,7 +404,7 @@ class ResearchQueue:
                 return await self._fetch_github(url)
 
             # Generic URL fetch
-            response = await self.client.get(
+            response = await self._get(
                 url,
                 follow_redirects=True,
                 headers={
@@ -308,7 +446,7 @@ class ResearchQueue:
         paper_id = arxiv_id.group(1)
         api_url = f"http://export.arxiv.org/api/query?id_list={paper_id}"
 
-        response = await self.client.get(api_url)
+        response = await self._get(api_url)
         content = response.text
 
         # Parse basic metadata from XML
@@ -339,7 +477,7 @@ class ResearchQueue:
                 url = f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md"
                 metadata["title"] = f"{owner}/{repo} README"
 
-        response = await self.client.get(url)
+        response = await self._get(url)
         return response.text, metadata
 
     # =========================================================================
@@ -420,72 +558,116 @@ Focus on practical insights for AI infrastructure, agent frameworks, LLM optimiz
         if not item:
             raise ValueError(f"Item {item_id} not found")
 
-        start_time = time.time()
-        item.started_at = datetime.utcnow().isoformat() + "Z"
-        item.status = ResearchStatus.FETCHING
-        self._save_queue()
-
-        try:
-            # Fetch content
-            if item.source_type == SourceType.URL:
-                content, metadata = await self._fetch_url(item.source)
-                item.raw_content = content
-                item.content_length = len(content)
-                item.title = metadata.get("title", item.title)
-            elif item.source_type == SourceType.TEXT:
-                item.raw_content = item.source
-                item.content_length = len(item.source)
-            elif item.source_type == SourceType.ARXIV:
-                content, metadata = await self._fetch_arxiv(item.source)
-                item.raw_content = content
-                item.content_length = len(content)
-                item.title = metadata.get("title", item.title)
-            elif item.source_type == SourceType.GITHUB:
-                content, metadata = await self._fetch_github(item.source)
-                item.raw_content = content
-                item.content_length = len(content)
-                item.title = metadata.get("title", item.title)
-
-            # Analyze with LLM
-            item.status = ResearchStatus.ANALYZING
-            self._save_queue()
+        async with self._slots:
+            start_time = time.time()
+            item.started_at = datetime.utcnow().isoformat() + "Z"
+            item.status = ResearchStatus.FETCHING
+            self._journal(item, "status", "started_at")
 
-            analysis = await self._analyze_content(item)
+            try:
+                # Fetch content
+                if item.source_type == SourceType.URL:
+                    content, metadata = await self._fetch_url(item.source)
+                    item.raw_content = content
+                    item.content_length = len(content)
+                    item.title = metadata.get("title", item.title)
+                elif item.source_type == SourceType.TEXT:
+                    item.raw_content = item.source
+                    item.content_length = len(item.source)
+                elif item.source_type == SourceType.ARXIV:
+                    content, metadata = await self._fetch_arxiv(item.source)
+                    item.raw_content = content
+                    item.content_length = len(content)
+                    item.title = metadata.get("title", item.title)
+                elif item.source_type == SourceType.GITHUB:
+                    content, metadata = await self._fetch_github(item.source)
+                    item.raw_content = content
+                    item.content_length = len(content)
+                    item.title = metadata.get("title", item.title)
+
+                # Analyze with LLM, unless this content was analyzed before
+                item.status = ResearchStatus.ANALYZING
+                self._journal(item, "status")
+
+                await self._analyze_once(item)
+
+                item.status = ResearchStatus.COMPLETED
+                item.completed_at = datetime.utcnow().isoformat() + "Z"
+
+                RESEARCH_PROCESSED.labels(status="success").inc()
+                RESEARCH_LATENCY.observe(time.time() - start_time)
+
+                logger.info(f"Processed research item {item_id}: {item.title}")
 
-            # Apply analysis results
-            item.title = analysis.get("title", item.title)
-            item.summary = analysis.get("summary")
-            item.key_insights = analysis.get("key_insights", [])
-            item.entities = analysis.get("entities", [])
-            item.relevance_to_hydra = analysis.get("relevance_to_hydra")
-            item.action_items = analysis.get("action_items", [])
-            item.tags = analysis.get("tags", [])
-            item.author = analysis.get("author")
-            item.publish_date = analysis.get("publish_date")
+            except Exception as e:
+                item.status = ResearchStatus.FAILED
+                item.error = str(e)
+                item.completed_at = datetime.utcnow().isoformat() + "Z"
+                RESEARCH_PROCESSED.labels(status="failed").inc()
+                logger.error(f"Failed to process item {item_id}: {e}")
 
-            # Store to knowledge base if enabled
-            if self.config.auto_store_to_knowledge:
-                await self._store_to_knowledge(item)
+            self._journal(item)
+        RESEARCH_QUEUE_SIZE.set(len([i for i in self.queue.values() if i.status == ResearchStatus.QUEUED]))
 
-            item.status = ResearchStatus.COMPLETED
-            item.completed_at = datetime.utcnow().isoformat() + "Z"
+        return item
 
-            RESEARCH_PROCESSED.labels(status="success").inc()
-            RESEARCH_LATENCY.observe(time.time() - start_time)
+    def _content_key(self, item: ResearchItem) -> str:
+        """Hash of everything the analysis prompt depends on."""
+        content = (item.raw_content or "")[:self.config.max_content_length]
+        key = "\0".join([self.config.llm_model, item.topic or "", content])
+        return hashlib.sha256(key.encode()).hexdigest()
 
-            logger.info(f"Processed research item {item_id}: {item.title}")
+    async def _analyze_once(self, item: ResearchItem):
+        """
+        Apply the analysis for the item's content, running the LLM (and the
+        knowledge store) only for content not analyzed before. Items with the
+        same content processed concurrently wait for the first one.
+        """
+        key = item.content_hash = self._content_key(item)
+        entry = self._analyses.get(key)
+        if entry is None and key in self._inflight:
+            entry = await asyncio.shield(self._inflight[key])
+
+        if entry is not None:
+            item.analysis_reused = True
+            self.stats["analyses_reused"] += 1
+            RESEARCH_REUSE.labels(kind="analysis").inc()
+            self._apply_analysis(item, entry["analysis"])
+            item.knowledge_id = entry.get("knowledge_id")
+            item.stored_to_knowledge = item.knowledge_id is not None
+            return
 
-        except Exception as e:
-            item.status = ResearchStatus.FAILED
-            item.error = str(e)
-            item.completed_at = datetime.utcnow().isoformat() + "Z"
-            RESEARCH_PROCESSED.labels(status="failed").inc()
-            logger.error(f"Failed to process item {item_id}: {e}")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            analysis = await self._analyze_content(item)
+            self.stats["analyses"] += 1
+            self._apply_analysis(item, analysis)
 
-        self._save_queue()
-        RESEARCH_QUEUE_SIZE.set(len([i for i in self.queue.values() if i.status == ResearchStatus.QUEUED]))
+            # Store to knowledge base if enabled
+            if self.config.auto_store_to_knowledge:
+                await self._store_to_knowledge(item)
 
-        return item
+            entry = {"analysis": analysis, "knowledge_id": item.knowledge_id}
+            self._remember_analysis(key, entry)
+            future.set_result(entry)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters see it; don't warn when there are none
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _apply_analysis(self, item: ResearchItem, analysis: Dict[str, Any]):
+        item.title = analysis.get("title", item.title)
+        item.summary = analysis.get("summary")
+        item.key_insights = analysis.get("key_insights", [])
+        item.entities = analysis.get("entities", [])
+        item.relevance_to_hydra = analysis.get("relevance_to_hydra")
+        item.action_items = analysis.get("action_items", [])
+        item.tags = analysis.get("tags", [])
+        item.author = analysis.get("author")
+        item.publish_date = analysis.get("publish_date")
 
     async def _store_to_knowledge(self, item: ResearchItem):
         """Store processed research to Qdrant knowledge base."""
@@ -547,14 +729,14 @@ Focus on practical insights for AI infrastructure, agent frameworks, LLM optimiz
             logger.error(f"Failed to store to knowledge base: {e}")
 
     async def process_queue(self):
-        """Process all queued items by priority."""
-        queued = self.list_items(status=ResearchStatus.QUEUED)
+        """Process all queued items, highest priority first, up to max_concurrent at a time."""
+        await self._process_many(self.list_items(status=ResearchStatus.QUEUED, limit=len(self.queue)))
 
-        for item in queued:
-            try:
-                await self.process_item(item.id)
-            except Exception as e:
-                logger.error(f"Error processing {item.id}: {e}")
+    async def _process_many(self, items: List[ResearchItem]):
+        results = await asyncio.gather(*(self.process_item(item.id) for item in items), return_exceptions=True)
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing {item.id}: {result}")
 
     # =========================================================================
     # Background Processing
@@ -576,8 +758,7 @@ Focus on practical insights for AI infrastructure, agent frameworks, LLM optimiz
                         if i.status == ResearchStatus.QUEUED
                         and i.priority == ResearchPriority.CRITICAL
                     ]
-                    for item in critical:
-                        await self.process_item(item.id)
+                    await self._process_many(critical)
 
                     # Process high priority items
                     high = [
@@ -585,8 +766,7 @@ Focus on practical insights for AI infrastructure, agent frameworks, LLM optimiz
                         if i.status == ResearchStatus.QUEUED
                         and i.priority == ResearchPriority.HIGH
                     ]
-                    for item in high:
-                        await self.process_item(item.id)
+                    await self._process_many(high)
 
                 except Exception as e:
                     logger.error(f"Background processing error: {e}")
@@ -610,41 +790,101 @@ Focus on practical insights for AI infrastructure, agent frameworks, LLM optimiz
     # Persistence
     # =========================================================================
 
-    def _save_queue(self):
-        """Save queue to disk."""
-        data = {
-            item_id: asdict(item)
-            for item_id, item in self.queue.items()
-        }
-
-        queue_file = Path(self.config.data_dir) / "queue.json"
-        with open(queue_file, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+    def _journal(self, item: ResearchItem, *fields: str):
+        """Append the item (or only ``fields`` of it) to the queue journal."""
+        if fields:
+            self._append({"op": "update", "id": item.id, "fields": {name: getattr(item, name) for name in fields}})
+        else:
+            self._append({"op": "put", "item": asdict(item)})
+
+    def _append(self, record: Dict[str, Any]):
+        with open(self._journal_path, "a") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+        self._journal_records += 1
+        if self._journal_records >= max(JOURNAL_COMPACT_MIN, JOURNAL_COMPACT_RATIO * len(self.queue)):
+            self._compact_journal()
+
+    def _compact_journal(self):
+        """Rewrite the journal as one record per live item."""
+        tmp = self._journal_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            for item in self.queue.values():
+                f.write(json.dumps({"op": "put", "item": asdict(item)}, default=str) + "\n")
+        os.replace(tmp, self._journal_path)
+        self._journal_records = len(self.queue)
+
+    @staticmethod
+    def _decode(item_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert enum fields of a stored item (or partial item) back to enums."""
+        for name, enum in (("source_type", SourceType), ("priority", ResearchPriority), ("status", ResearchStatus)):
+            if name in item_data:
+                item_data[name] = enum(item_data[name])
+        return item_data
 
     def _load_queue(self):
-        """Load queue from disk."""
-        queue_file = Path(self.config.data_dir) / "queue.json"
+        """Replay the queue journal, migrating a legacy queue.json snapshot."""
+        legacy_file = Path(self.config.data_dir) / "queue.json"
 
-        if not queue_file.exists():
+        if not self._journal_path.exists():
+            if legacy_file.exists():
+                try:
+                    with open(legacy_file, "r") as f:
+                        for item_id, item_data in json.load(f).items():
+                            self.queue[item_id] = ResearchItem(**self._decode(item_data))
+                    self._compact_journal()
+                    logger.info(f"Migrated {len(self.queue)} items from {legacy_file} to {self._journal_path}")
+                except Exception as e:
+                    logger.error(f"Failed to load queue: {e}")
             return
 
-        try:
-            with open(queue_file, "r") as f:
-                data = json.load(f)
+        with open(self._journal_path, "r") as f:
+            for line in f:
+                self._journal_records += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping unreadable queue journal record: {line[:80]!r}")
+                    continue
+                try:
+                    self._replay(record)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipping malformed queue journal record ({e!r}): {line[:80]!r}")
 
-            for item_id, item_data in data.items():
-                # Convert enums
-                item_data["source_type"] = SourceType(item_data.get("source_type", "url"))
-                item_data["priority"] = ResearchPriority(item_data.get("priority", "normal"))
-                item_data["status"] = ResearchStatus(item_data.get("status", "queued"))
+        # Items interrupted mid-processing go back in the queue
+        for item in self.queue.values():
+            if item.status in (ResearchStatus.FETCHING, ResearchStatus.ANALYZING):
+                item.status = ResearchStatus.QUEUED
+                self._journal(item, "status")
 
-                self.queue[item_id] = ResearchItem(**item_data)
+        logger.info(f"Loaded {len(self.queue)} items from research queue")
+        RESEARCH_QUEUE_SIZE.set(len([i for i in self.queue.values() if i.status == ResearchStatus.QUEUED]))
 
-            logger.info(f"Loaded {len(self.queue)} items from research queue")
-            RESEARCH_QUEUE_SIZE.set(len([i for i in self.queue.values() if i.status == ResearchStatus.QUEUED]))
+    def _replay(self, record: Dict[str, Any]):
+        """Apply one journal record to the in-memory queue."""
+        if record["op"] == "put":
+            self.queue[record["item"]["id"]] = ResearchItem(**self._decode(record["item"]))
+        elif record["op"] == "update" and record["id"] in self.queue:
+            for name, value in self._decode(record["fields"]).items():
+                setattr(self.queue[record["id"]], name, value)
+        elif record["op"] == "delete":
+            self.queue.pop(record["id"], None)
+
+    def _load_analyses(self):
+        """Analyses by content hash, kept after their items are removed."""
+        if not self._analyses_path.exists():
+            return
+        with open(self._analyses_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self._analyses[record.pop("hash")] = record
 
-        except Exception as e:
-            logger.error(f"Failed to load queue: {e}")
+    def _remember_analysis(self, key: str, entry: Dict[str, Any]):
+        self._analyses[key] = entry
+        with open(self._analyses_path, "a") as f:
+            f.write(json.dumps({"hash": key, **entry}, default=str) + "\n")
 
     async def close(self):
         """Close resources."""
@@ -802,6 +1042,8 @@ def create_research_queue_router():
             "by_priority": by_priority,
             "auto_process_enabled": queue.config.auto_process,
             "process_interval_seconds": queue.config.process_interval,
+            "processing": queue.stats,
+            "analyses_cached": len(queue._analyses),
         }
 
     @router.get("/queue/results/completed", response_model=List[QueueItemResponse])
@@ -858,10 +1100,8 @@ def create_research_queue_router():
     async def process_all_queued(background_tasks: BackgroundTasks):
         """Trigger processing of all queued items."""
         queue = get_research_queue()
-        queued = queue.list_items(status=ResearchStatus.QUEUED)
-
-        for item in queued:
-            background_tasks.add_task(queue.process_item, item.id)
+        queued = queue.list_items(status=ResearchStatus.QUEUED, limit=len(queue.queue))
+        background_tasks.add_task(queue.process_queue)
 
         return {
             "status": "processing",
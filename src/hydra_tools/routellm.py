@@ -575,7 +575,7 @@ def get_enhanced_manager() -> EnhancedRoutingManager:
 
 def create_routing_router():
     """Create FastAPI router for enhanced routing."""
-    from fastapi import APIRouter
+    from fastapi import APIRouter, HTTPException
     from pydantic import BaseModel
 
     router = APIRouter(prefix="/routing", tags=["routing"])
@@ -594,6 +594,15 @@ def create_routing_router():
         output_tokens: int
         latency_ms: float
 
+    class SemanticRouteRequest(BaseModel):
+        prompt: str
+        system_prompt: str | None = None
+        prefer_quality: bool = False
+        prefer_speed: bool = False
+
+    class SemanticModeRequest(BaseModel):
+        mode: str
+
     @router.post("/route")
     async def route_prompt(request: RouteRequest):
         """Route a prompt to optimal model with queue awareness."""
@@ -693,6 +702,58 @@ def create_routing_router():
             }
         }
 
+    @router.post("/semantic/route")
+    async def semantic_route(request: SemanticRouteRequest):
+        """Route with the embedding-based router (heuristic decision unless active)."""
+        from hydra_tools.semantic_router import get_semantic_router
+
+        semantic = get_semantic_router()
+        decision = await semantic.route(
+            request.prompt,
+            system_prompt=request.system_prompt,
+            prefer_quality=request.prefer_quality,
+            prefer_speed=request.prefer_speed,
+        )
+        return {
+            "model": decision.model,
+            "tier": decision.tier.value,
+            "confidence": decision.confidence,
+            "reason": decision.reason,
+            "mode": semantic.mode,
+        }
+
+    @router.get("/semantic/stats")
+    async def semantic_stats():
+        """Loaded model, shadow agreement with the heuristic router and recent disagreements."""
+        from hydra_tools.semantic_router import get_semantic_router
+
+        return get_semantic_router().get_stats()
+
+    @router.post("/semantic/reload")
+    async def semantic_reload():
+        """Swap in the model file written by the offline trainer."""
+        from hydra_tools.semantic_router import get_semantic_router
+
+        semantic = get_semantic_router()
+        try:
+            model = semantic.reload()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"No model at {semantic.model_path}")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"status": "reloaded", "labels": model.labels, "trained_at": model.trained_at}
+
+    @router.put("/semantic/mode")
+    async def semantic_mode(request: SemanticModeRequest):
+        """Switch between off, shadow and active."""
+        from hydra_tools.semantic_router import get_semantic_router
+
+        try:
+            get_semantic_router().set_mode(request.mode)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"mode": request.mode}
+
     @router.get("/stats")
     async def get_routing_stats():
         """Get routing statistics."""
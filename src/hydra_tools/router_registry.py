@@ -0,0 +1,307 @@
+"""
+Hydra Lazy Router Registry
+
+Declares the API's feature routers by path prefix and imports each one the
+first time a request needs it, instead of importing every feature module when
+the API starts. Unused features then cost no boot time and no memory.
+
+- A request whose path falls under a declared prefix loads the matching
+  routers before it is routed. ``/openapi.json`` loads every enabled router so
+  the docs stay complete.
+- Routers are inserted in declaration order, so route precedence is the same
+  as including them all eagerly.
+- ``HYDRA_ROUTERS_ENABLED`` (allowlist) and ``HYDRA_ROUTERS_DISABLED``
+  (denylist) restrict which routers can ever load; ``HYDRA_ROUTERS_PRELOAD``
+  (names or ``all``) loads routers during startup instead of on first request.
+- Every import is timed and its RSS growth recorded in a startup profile.
+  Shared dependencies are charged to whichever module imports them first.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _env_names(var: str) -> Optional[Set[str]]:
+    value = os.environ.get(var, "").strip()
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux), else None."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# =============================================================================
+# Startup Profile
+# =============================================================================
+
+@dataclass
+class ProfileEntry:
+    """Time and memory spent on one import or startup phase."""
+    name: str
+    kind: str  # "phase", "module" or "router"
+    trigger: str
+    duration_ms: float
+    rss_delta_mb: Optional[float]
+    modules_imported: int
+    at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trigger": self.trigger,
+            "duration_ms": round(self.duration_ms, 2),
+            "rss_delta_mb": round(self.rss_delta_mb, 2) if self.rss_delta_mb is not None else None,
+            "modules_imported": self.modules_imported,
+            "at": self.at,
+        }
+
+
+class StartupProfile:
+    """Collects per-module import time and RSS growth."""
+
+    def __init__(self):
+        self.entries: List[ProfileEntry] = []
+        self.process_started = time.perf_counter()
+
+    @contextmanager
+    def measure(self, name: str, kind: str = "module", trigger: str = "startup") -> Iterator[None]:
+        modules_before = len(sys.modules)
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            rss_after = current_rss_mb()
+            self.entries.append(ProfileEntry(
+                name=name,
+                kind=kind,
+                trigger=trigger,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                rss_delta_mb=rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+                modules_imported=len(sys.modules) - modules_before,
+            ))
+
+    def record(self, entry: ProfileEntry) -> None:
+        self.entries.append(entry)
+
+    def report(self) -> Dict[str, Any]:
+        entries = sorted(self.entries, key=lambda e: e.duration_ms, reverse=True)
+        return {
+            "rss_mb": round(current_rss_mb() or 0.0, 2),
+            "peak_rss_mb": round(peak_rss_mb(), 2),
+            "modules_loaded": len(sys.modules),
+            "phases": [e.to_dict() for e in self.entries if e.kind == "phase"],
+            "imports": [e.to_dict() for e in entries if e.kind != "phase"],
+        }
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """
+    A feature router declared by prefix.
+
+    ``factory`` names a module attribute that is either a function returning
+    an ``APIRouter`` or the router itself. ``startup`` names an optional
+    zero-argument module function run once after import (database setup and
+    similar work that used to happen at import time).
+    """
+    name: str
+    module: str
+    factory: str
+    prefixes: Tuple[str, ...]
+    startup: Optional[str] = None
+
+    def matches(self, path: str) -> bool:
+        return any(path == p or path.startswith(p.rstrip("/") + "/") for p in self.prefixes)
+
+
+class LazyRouterRegistry:
+    """Imports and mounts declared routers on demand."""
+
+    def __init__(
+        self,
+        specs: Sequence[RouterSpec],
+        enabled: Optional[Set[str]] = None,
+        disabled: Optional[Set[str]] = None,
+        profile: Optional[StartupProfile] = None,
+    ):
+        names = [spec.name for spec in specs]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate router names: {', '.join(sorted(duplicates))}")
+        self.specs = list(specs)
+        self._order = {spec.name: i for i, spec in enumerate(self.specs)}
+        enabled = enabled if enabled is not None else _env_names("HYDRA_ROUTERS_ENABLED")
+        disabled = disabled if disabled is not None else (_env_names("HYDRA_ROUTERS_DISABLED") or set())
+        self.enabled = {
+            spec.name for spec in self.specs
+            if (enabled is None or spec.name in enabled) and spec.name not in disabled
+        }
+        self.profile = profile or StartupProfile()
+        self.app = None
+        self._insert_at = 0
+        self._mounted: Dict[str, int] = {}  # name -> number of app routes added
+        self._started_modules: Set[str] = set()
+        self._lock: Optional[asyncio.Lock] = None
+        self._refresh_pending_prefixes()
+
+    def mount(self, app) -> None:
+        """Attach to ``app``; lazily loaded routes go where eager includes would."""
+        self.app = app
+        self._insert_at = len(app.router.routes)
+
+    def get(self, name: str) -> RouterSpec:
+        for spec in self.specs:
+            if spec.name == name:
+                return spec
+        raise KeyError(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._mounted
+
+    def _refresh_pending_prefixes(self) -> None:
+        # Prefilter for pending_for, which runs on every request
+        self._pending_prefixes = tuple({
+            prefix.rstrip("/") for spec in self.pending_all() for prefix in spec.prefixes
+        })
+
+    def pending_for(self, path: str) -> List[RouterSpec]:
+        """Enabled, not-yet-loaded routers that serve ``path``."""
+        if not path.startswith(self._pending_prefixes):
+            return []
+        return [
+            spec for spec in self.specs
+            if spec.name in self.enabled and spec.name not in self._mounted and spec.matches(path)
+        ]
+
+    def pending_all(self) -> List[RouterSpec]:
+        return [spec for spec in self.specs if spec.name in self.enabled and spec.name not in self._mounted]
+
+    def _import(self, spec: RouterSpec, trigger: str):
+        with self.profile.measure(spec.module, kind="module", trigger=trigger):
+            return importlib.import_module(f"hydra_tools.{spec.module}")
+
+    def _build_and_mount(self, spec: RouterSpec, module, trigger: str) -> None:
+        with self.profile.measure(spec.name, kind="router", trigger=trigger):
+            if spec.startup and spec.module not in self._started_modules:
+                getattr(module, spec.startup)()
+                self._started_modules.add(spec.module)
+            target = getattr(module, spec.factory)
+            router = target() if callable(target) and not hasattr(target, "routes") else target
+
+            routes = self.app.router.routes
+            before = len(routes)
+            self.app.include_router(router)
+            added = routes[before:]
+            del routes[before:]
+            position = self._insert_at + sum(
+                count for name, count in self._mounted.items()
+                if self._order[name] < self._order[spec.name]
+            )
+            routes[position:position] = added
+            self._mounted[spec.name] = len(added)
+            self._refresh_pending_prefixes()
+
+        mark_changed = getattr(self.app.router, "_mark_routes_changed", None)
+        if mark_changed is not None:
+            mark_changed()
+        # Regenerate the OpenAPI schema on next request
+        self.app.openapi_schema = None
+        logger.info(f"Loaded router {spec.name} ({trigger})")
+
+    def load(self, names: Sequence[str], trigger: str = "startup") -> None:
+        """Synchronously load routers by name (import on the calling thread)."""
+        for name in sorted(names, key=lambda n: self._order[n]):
+            spec = self.get(name)
+            if spec.name in self._mounted or spec.name not in self.enabled:
+                continue
+            self._build_and_mount(spec, self._import(spec, trigger), trigger)
+
+    async def ensure_loaded(self, specs: Sequence[RouterSpec], trigger: str) -> None:
+        """Load routers from a request; imports run in a worker thread."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            for spec in sorted(specs, key=lambda s: self._order[s.name]):
+                if spec.name in self._mounted:
+                    continue
+                try:
+                    module = await asyncio.to_thread(self._import, spec, trigger)
+                    self._build_and_mount(spec, module, trigger)
+                except Exception as e:
+                    # Leave it unloaded; the request falls through to a 404
+                    logger.error(f"Failed to load router {spec.name}: {e}")
+
+    async def preload(self, names: Optional[Set[str]] = None) -> None:
+        """Load ``names`` (or ``HYDRA_ROUTERS_PRELOAD``) during startup."""
+        names = names if names is not None else (_env_names("HYDRA_ROUTERS_PRELOAD") or set())
+        if "all" in names:
+            specs = self.pending_all()
+        else:
+            unknown = names - {spec.name for spec in self.specs}
+            if unknown:
+                logger.warning(f"Unknown routers in preload list: {', '.join(sorted(unknown))}")
+            specs = [spec for spec in self.pending_all() if spec.name in names]
+        if specs:
+            await self.ensure_loaded(specs, trigger="preload")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded": [spec.name for spec in self.specs if spec.name in self._mounted],
+            "pending": [spec.name for spec in self.pending_all()],
+            "disabled": [spec.name for spec in self.specs if spec.name not in self.enabled],
+        }
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.profile.report(), "routers": self.status()}
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that loads the routers a request needs before routing."""
+
+    def __init__(self, app, registry: LazyRouterRegistry, openapi_url: Optional[str] = "/openapi.json"):
+        self.app = app
+        self.registry = registry
+        self.openapi_url = openapi_url
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.openapi_url:
+                pending = self.registry.pending_all()
+            else:
+                pending = self.registry.pending_for(path)
+            if pending:
+                await self.registry.ensure_loaded(pending, trigger=f"request {path}")
+        await self.app(scope, receive, send)
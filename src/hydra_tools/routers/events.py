@@ -30,6 +30,8 @@ import httpx
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import StreamingResponse
 
+from hydra_tools.service_bus import get_service_bus
+
 logger = logging.getLogger(__name__)
 
 # API configuration for internal calls
@@ -251,54 +253,49 @@ async def collect_container_status() -> Dict[str, Any]:
 
 async def collect_gpu_metrics() -> Dict[str, Any]:
     """
-    Collect GPU metrics from all nodes via /autonomous/resources API.
+    Collect GPU metrics from all nodes via /autonomous/resources (in-process
+    through the service bus when running inside the API).
 
-    Integrated with ClusterResourceMonitor (Prometheus-based):
+    Integrated with ClusterResourceMonitor (Prometheus-based, through the
+    shared cached Prometheus client):
     - DCGM metrics for hydra-ai (RTX 5090, RTX 4090)
     - nvidia-exporter metrics for hydra-compute (2x RTX 5070 Ti)
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{API_BASE_URL}/autonomous/resources",
-                headers={"X-API-Key": API_KEY}
-            )
+        data = await get_service_bus().query("/autonomous/resources", base_url=API_BASE_URL)
+        gpus = []
+        total_power = 0
+        total_vram_used = 0
+        total_vram_total = 0
+
+        for node in data.get("nodes", []):
+            node_name = node.get("name", "unknown")
+            for gpu_data in node.get("gpus", []):
+                vram_used_mb = int(gpu_data.get("vram_used_gb", 0) * 1024)
+                vram_total_mb = int(gpu_data.get("vram_total_gb", 0) * 1024)
+                power = gpu_data.get("power_watts", 0)
+
+                gpus.append({
+                    "node": node_name,
+                    "name": gpu_data.get("name", "Unknown GPU"),
+                    "utilization": gpu_data.get("utilization_percent", 0),
+                    "memory_used": vram_used_mb,
+                    "memory_total": vram_total_mb,
+                    "temperature": gpu_data.get("temperature_f", 0),  # Already in F
+                    "power": power
+                })
 
-            if response.status_code == 200:
-                data = response.json()
-                gpus = []
-                total_power = 0
-                total_vram_used = 0
-                total_vram_total = 0
-
-                for node in data.get("nodes", []):
-                    node_name = node.get("name", "unknown")
-                    for gpu_data in node.get("gpus", []):
-                        vram_used_mb = int(gpu_data.get("vram_used_gb", 0) * 1024)
-                        vram_total_mb = int(gpu_data.get("vram_total_gb", 0) * 1024)
-                        power = gpu_data.get("power_watts", 0)
-
-                        gpus.append({
-                            "node": node_name,
-                            "name": gpu_data.get("name", "Unknown GPU"),
-                            "utilization": gpu_data.get("utilization_percent", 0),
-                            "memory_used": vram_used_mb,
-                            "memory_total": vram_total_mb,
-                            "temperature": gpu_data.get("temperature_f", 0),  # Already in F
-                            "power": power
-                        })
-
-                        total_power += power
-                        total_vram_used += vram_used_mb
-                        total_vram_total += vram_total_mb
+                total_power += power
+                total_vram_used += vram_used_mb
+                total_vram_total += vram_total_mb
 
-                return {
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "gpus": gpus,
-                    "total_power": total_power,
-                    "total_vram_used": total_vram_used,
-                    "total_vram_total": total_vram_total
-                }
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "gpus": gpus,
+            "total_power": total_power,
+            "total_vram_used": total_vram_used,
+            "total_vram_total": total_vram_total
+        }
     except Exception as e:
         logger.warning(f"Failed to collect GPU metrics: {e}")
 
@@ -0,0 +1,441 @@
+"""
+Hydra Rule Engine - Compiled trigger conditions with incremental evaluation
+
+Trigger rule conditions are small expressions over named facts derived from
+the perceived system state:
+
+    gpu_temp_celsius > 80
+    len(unhealthy_containers) > 0 and pending_task_count < 10
+    metrics.tokens_per_second < 20 or benchmark_score < 80
+    cron: 0 4 * * *
+
+Supported: numbers, strings, true/false/null, lists, dotted field access,
+arithmetic (+ - * / %), comparisons (including chained ones, ``in`` and
+``not in``), ``and``/``or``/``not`` and the functions len, min, max, abs,
+any and all. A missing fact is null, and any comparison involving null is
+false, so a rule never fires on data that was not perceived. ``cron:``
+conditions take the usual five fields (``*``, numbers, lists, ranges and
+``*/step``) and depend on the ``clock`` fact.
+
+Conditions are compiled once, when rules are loaded or changed, into
+closures - nothing is parsed or ``eval``-ed per cycle. Each compiled
+condition knows which fact paths it reads (``gpu_temp_celsius``,
+``metrics.tokens_per_second``), and the engine indexes rules by those paths:
+a cycle only re-evaluates rules whose inputs changed since they last ran and
+reuses the last result for the rest.
+
+Rule messages may reference facts as ``{field.path}``.
+"""
+
+import ast
+import logging
+import operator
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+RULE_EVAL_SECONDS = Histogram(
+    "hydra_trigger_rule_eval_seconds",
+    "Time to evaluate one compiled trigger rule",
+    ["rule_id"],
+    buckets=[1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 1e-2],
+)
+
+RULE_EVALUATIONS = Counter(
+    "hydra_trigger_rule_evaluations_total",
+    "Trigger rule evaluations, by whether the rule ran or reused its last result",
+    ["result"],
+)
+
+CONSTANTS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+
+FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "len": lambda value: len(value) if value is not None else 0,
+    "min": lambda *values: min(v for v in values if v is not None) if any(v is not None for v in values) else None,
+    "max": lambda *values: max(v for v in values if v is not None) if any(v is not None for v in values) else None,
+    "abs": lambda value: abs(value) if value is not None else None,
+    "any": lambda value: any(value or []),
+    "all": lambda value: all(value or []),
+}
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+}
+
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: b is not None and a in b,
+    ast.NotIn: lambda a, b: b is not None and a not in b,
+}
+
+# Conditions written before the expression language, as saved in existing
+# rules files. Those that were never evaluated (no such fact) keep not firing.
+LEGACY_CONDITIONS = {
+    "container.status == 'unhealthy' for > 5 minutes": "len(unhealthy_containers) > 0",
+    "prometheus_target.up == 0": "len(targets_down) > 0",
+    "container.restart_needed == true": "len(restart_needed_containers) > 0",
+    "benchmark_score < previous_score - 5": "benchmark_score < previous_benchmark_score - 5",
+}
+
+Facts = Dict[str, Any]
+Evaluator = Callable[[Facts], Any]
+
+
+class RuleSyntaxError(ValueError):
+    """A condition that cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A condition compiled to a closure over facts, with the fact paths it reads."""
+    source: str
+    evaluate: Evaluator
+    dependencies: FrozenSet[str]
+
+    def __call__(self, facts: Facts) -> bool:
+        return bool(self.evaluate(facts))
+
+
+# =============================================================================
+# Compiler
+# =============================================================================
+
+def compile_condition(condition: str) -> CompiledCondition:
+    """Compile a condition string; raises RuleSyntaxError if it is not valid."""
+    source = LEGACY_CONDITIONS.get(condition.strip(), condition.strip())
+    if source.startswith("cron:"):
+        return _compile_cron(source)
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise RuleSyntaxError(f"Invalid condition {condition!r}: {e.msg}") from None
+    dependencies: Set[str] = set()
+    evaluate = _compile_node(tree.body, dependencies, condition)
+    return CompiledCondition(source, evaluate, frozenset(dependencies))
+
+
+def _compile_node(node: ast.AST, dependencies: Set[str], condition: str) -> Evaluator:
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda facts: value
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return lambda facts: value
+        name = node.id
+        dependencies.add(name)
+        return lambda facts: facts.get(name)
+
+    if isinstance(node, ast.Attribute):
+        if node.attr.startswith("_"):
+            raise RuleSyntaxError(f"Private field {node.attr!r} in {condition!r}")
+        path = _dotted_path(node)
+        if path is not None:
+            dependencies.add(path)
+            parts = path.split(".")
+            return lambda facts: resolve(facts, parts)
+        parent = _compile_node(node.value, dependencies, condition)
+        attr = node.attr
+
+        def attribute(facts):
+            value = parent(facts)
+            return value.get(attr) if isinstance(value, dict) else None
+        return attribute
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_compile_node(element, dependencies, condition) for element in node.elts]
+        return lambda facts: [item(facts) for item in items]
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(value, dependencies, condition) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda facts: all(operand(facts) for operand in operands)
+        return lambda facts: any(operand(facts) for operand in operands)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        operand = _compile_node(node.operand, dependencies, condition)
+        if isinstance(node.op, ast.Not):
+            return lambda facts: not operand(facts)
+
+        def negate(facts):
+            value = operand(facts)
+            return -value if _is_number(value) else None
+        return negate
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        left = _compile_node(node.left, dependencies, condition)
+        right = _compile_node(node.right, dependencies, condition)
+        op = BINARY_OPERATORS[type(node.op)]
+
+        def binary(facts):
+            a, b = left(facts), right(facts)
+            if a is None or b is None:
+                return None
+            try:
+                return op(a, b)
+            except (TypeError, ZeroDivisionError):
+                return None
+        return binary
+
+    if isinstance(node, ast.Compare) and all(type(op) in COMPARISONS for op in node.ops):
+        operands = [_compile_node(node.left, dependencies, condition)] + [
+            _compile_node(comparator, dependencies, condition) for comparator in node.comparators
+        ]
+        ops = [COMPARISONS[type(op)] for op in node.ops]
+
+        def compare(facts):
+            values = [operand(facts) for operand in operands]
+            for op, a, b in zip(ops, values, values[1:]):
+                if a is None and b is None:
+                    return False
+                if (a is None or b is None) and op not in (operator.eq, operator.ne):
+                    return False
+                try:
+                    if not op(a, b):
+                        return False
+                except TypeError:
+                    return False
+            return True
+        return compare
+
+    if (
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS and not node.keywords
+    ):
+        function = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg, dependencies, condition) for arg in node.args]
+
+        def call(facts):
+            try:
+                return function(*(arg(facts) for arg in args))
+            except (TypeError, ValueError):
+                return None
+        return call
+
+    raise RuleSyntaxError(f"Unsupported expression in {condition!r}: {ast.unparse(node)}")
+
+
+def _dotted_path(node: ast.AST) -> Optional[str]:
+    """``a.b.c`` for a chain of attributes on a fact name, else None."""
+    if isinstance(node, ast.Name):
+        return None if node.id in CONSTANTS else node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_path(node.value)
+        return f"{parent}.{node.attr}" if parent else None
+    return None
+
+
+def resolve(facts: Facts, parts: List[str]) -> Any:
+    """Value at a fact path, or None if any step is missing."""
+    value: Any = facts
+    for part in parts:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 6))
+
+
+def _cron_values(field: str, low: int, high: int, condition: str) -> Optional[FrozenSet[int]]:
+    """Allowed values of one cron field, or None for ``*``."""
+    if field == "*":
+        return None
+    values: Set[int] = set()
+    for part in field.split(","):
+        match = re.fullmatch(r"(\*|\d+)(?:-(\d+))?(?:/(\d+))?", part)
+        if not match:
+            raise RuleSyntaxError(f"Invalid cron field {part!r} in {condition!r}")
+        start, end, step = match.groups()
+        first = low if start == "*" else int(start)
+        last = high if start == "*" else int(end) if end else first if not step else high
+        values.update(range(first, last + 1, int(step or 1)))
+    if not values or min(values) < low or max(values) > high:
+        raise RuleSyntaxError(f"Cron field {field!r} out of range {low}-{high} in {condition!r}")
+    return frozenset(values)
+
+
+def _compile_cron(condition: str) -> CompiledCondition:
+    fields = condition[len("cron:"):].split()
+    if len(fields) != 5:
+        raise RuleSyntaxError(f"Cron condition needs 5 fields: {condition!r}")
+    allowed = [(name, _cron_values(value, low, high, condition)) for value, (name, low, high) in zip(fields, CRON_FIELDS)]
+
+    def evaluate(facts):
+        clock = facts.get("clock") or {}
+        return all(values is None or clock.get(name) in values for name, values in allowed)
+    return CompiledCondition(condition, evaluate, frozenset({"clock"}))
+
+
+def render_message(template: str, facts: Facts) -> str:
+    """Fill ``{field.path}`` placeholders from facts; lists are comma-joined."""
+    def value(match):
+        current = resolve(facts, match.group(1).split("."))
+        if isinstance(current, (list, tuple, set)):
+            return ", ".join(str(v) for v in current)
+        return str(current)
+    return re.sub(r"\{([A-Za-z_][\w.]*)\}", value, template)
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+@dataclass
+class RuleTiming:
+    evaluations: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "evaluations": self.evaluations,
+            "avg_us": round(self.total_seconds / self.evaluations * 1e6, 2) if self.evaluations else None,
+            "last_us": round(self.last_seconds * 1e6, 2),
+        }
+
+
+class RuleEngine:
+    """
+    Compiled conditions for a set of rules (anything with ``id``,
+    ``condition`` and ``message``), indexed by the fact paths they read.
+    """
+
+    def __init__(self):
+        self._compiled: Dict[str, CompiledCondition] = {}
+        self._sources: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self._by_path: Dict[str, Set[str]] = {}
+        self._paths_by_root: Dict[str, Set[str]] = {}
+        self._observers: Dict[str, Any] = {}
+        self._previous: Facts = {}
+        self._dirty: Set[str] = set()
+        self._results: Dict[str, bool] = {}
+        self.timings: Dict[str, RuleTiming] = {}
+        self.stats = {"cycles": 0, "evaluated": 0, "reused": 0}
+
+    def compile(self, rules: Iterable[Any]):
+        """(Re)compile conditions that are new or changed; drop rules that are gone."""
+        rules = list(rules)
+        ids = {rule.id for rule in rules}
+        for rule_id in list(self._compiled):
+            if rule_id not in ids:
+                self._forget(rule_id)
+        for rule in rules:
+            if self._sources.get(rule.id) == rule.condition and (rule.id in self._compiled or rule.id in self.errors):
+                continue
+            self._forget(rule.id)
+            self._sources[rule.id] = rule.condition
+            try:
+                compiled = compile_condition(rule.condition)
+            except RuleSyntaxError as e:
+                logger.error(f"Trigger rule {rule.id} disabled: {e}")
+                self.errors[rule.id] = str(e)
+                continue
+            self._compiled[rule.id] = compiled
+            self._observers[rule.id] = RULE_EVAL_SECONDS.labels(rule_id=rule.id)
+            for path in compiled.dependencies:
+                self._by_path.setdefault(path, set()).add(rule.id)
+                self._paths_by_root.setdefault(path.split(".", 1)[0], set()).add(path)
+
+    def _forget(self, rule_id: str):
+        compiled = self._compiled.pop(rule_id, None)
+        if compiled is not None:
+            for path in compiled.dependencies:
+                readers = self._by_path.get(path, set())
+                readers.discard(rule_id)
+                if readers:
+                    continue
+                # No rule reads this path any more: stop diffing it
+                self._by_path.pop(path, None)
+                root = path.split(".", 1)[0]
+                paths = self._paths_by_root.get(root, set())
+                paths.discard(path)
+                if not paths:
+                    self._paths_by_root.pop(root, None)
+        self._observers.pop(rule_id, None)
+        self._sources.pop(rule_id, None)
+        self.errors.pop(rule_id, None)
+        self._results.pop(rule_id, None)
+        self._dirty.discard(rule_id)
+
+    def dependencies(self, rule_id: str) -> List[str]:
+        compiled = self._compiled.get(rule_id)
+        return sorted(compiled.dependencies) if compiled else []
+
+    def evaluate(self, rules: Iterable[Any], facts: Facts) -> Dict[str, Tuple[bool, str]]:
+        """
+        Evaluate ``rules`` against ``facts``: rules whose facts changed since
+        they last ran (or that have no result yet) run, the rest reuse their
+        last result. Rules left out of a call - disabled or cooling down -
+        stay stale until they are passed again. Returns rule id ->
+        (triggered, reason).
+        """
+        for root in facts.keys() | self._previous.keys():
+            if facts.get(root) == self._previous.get(root):
+                continue
+            for path in self._paths_by_root.get(root, ()):
+                parts = path.split(".")
+                if path == root or resolve(facts, parts) != resolve(self._previous, parts):
+                    self._dirty.update(self._by_path[path])
+        self._previous = facts
+        self.stats["cycles"] += 1
+
+        results = {}
+        evaluated = reused = 0
+        for rule in rules:
+            compiled = self._compiled.get(rule.id)
+            if compiled is None:
+                continue
+            if rule.id in self._dirty or rule.id not in self._results:
+                self._dirty.discard(rule.id)
+                start = time.perf_counter()
+                self._results[rule.id] = compiled(facts)
+                elapsed = time.perf_counter() - start
+                timing = self.timings.setdefault(rule.id, RuleTiming())
+                timing.evaluations += 1
+                timing.total_seconds += elapsed
+                timing.last_seconds = elapsed
+                self._observers[rule.id].observe(elapsed)
+                evaluated += 1
+            else:
+                reused += 1
+            if self._results[rule.id]:
+                message = getattr(rule, "message", "") or f"Condition met: {compiled.source}"
+                results[rule.id] = (True, render_message(message, facts))
+            else:
+                results[rule.id] = (False, "")
+
+        self.stats["evaluated"] += evaluated
+        self.stats["reused"] += reused
+        RULE_EVALUATIONS.labels(result="evaluated").inc(evaluated)
+        RULE_EVALUATIONS.labels(result="reused").inc(reused)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "compiled": len(self._compiled),
+            "errors": dict(self.errors),
+            "facts_indexed": sorted(path for path, ids in self._by_path.items() if ids),
+        }
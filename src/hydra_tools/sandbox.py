@@ -13,7 +13,9 @@ Security model:
 - Dropped capabilities
 - Constitutional constraint integration
 
-Uses Docker Python SDK for container management.
+Async executions go through an httpx Docker Engine API client and, by
+default, a warm container pool (see sandbox_pool). The synchronous
+execute() path uses the Docker Python SDK.
 
 Author: Hydra Autonomous System
 Created: 2025-12-16
@@ -23,6 +25,7 @@ import asyncio
 import hashlib
 import json
 import os
+import shutil
 import tempfile
 import uuid
 from dataclasses import dataclass, field, asdict
@@ -34,10 +37,23 @@ import logging
 
 import docker
 from docker.errors import ContainerError, ImageNotFound, APIError
+from docker.utils import parse_bytes
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from hydra_tools.sandbox_pool import (
+    IDLE_COMMAND,
+    AsyncDockerClient,
+    DockerAPIError,
+    LanguagePool,
+    PoolSettings,
+    RunOutcome,
+    SandboxPool,
+    run_container,
+    write_sandbox_files,
+)
+
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -123,6 +139,26 @@ class SandboxManager:
         SandboxLanguage.JAVASCRIPT: ["node", "/sandbox/code"],
     }
 
+    # Patterns that are logged (and retire a pooled container) but not blocked
+    DANGEROUS_PATTERNS = {
+        SandboxLanguage.PYTHON: [
+            "os.system",
+            "subprocess.call",
+            "__import__('os')",
+            "import socket",
+        ],
+        SandboxLanguage.BASH: [
+            "rm -rf /",
+            "dd if=",
+            "mkfs",
+            "> /dev/",
+        ],
+        SandboxLanguage.JAVASCRIPT: [
+            "child_process",
+            "require('fs')",
+        ],
+    }
+
     def __init__(
         self,
         config: Optional[SandboxConfig] = None,
@@ -143,8 +179,11 @@ class SandboxManager:
             # /mnt/user/appdata/hydra-tools/sandbox is mounted at same path in container
             self.host_data_dir = Path("/mnt/user/appdata/hydra-tools/sandbox")
 
-        # Docker client
+        # Docker clients: SDK for the sync path, async Engine API client for the pool
         self._client = None
+        self._docker: Optional[AsyncDockerClient] = None
+        self._pool: Optional[SandboxPool] = None
+        self.pool_enabled = os.getenv("HYDRA_SANDBOX_POOL", "true").lower() == "true"
 
         # Execution history
         self.history_file = self.data_dir / "execution_history.json"
@@ -163,6 +202,13 @@ class SandboxManager:
             self._client = docker.from_env()
         return self._client
 
+    @property
+    def docker(self) -> AsyncDockerClient:
+        """Lazy-load async Docker Engine API client."""
+        if self._docker is None:
+            self._docker = AsyncDockerClient.from_env()
+        return self._docker
+
     def _load_history(self) -> List[Dict[str, Any]]:
         """Load execution history from disk."""
         if self.history_file.exists():
@@ -212,35 +258,18 @@ class SandboxManager:
         )
 
         if not result.allowed:
-            return False, result.reason
+            return False, result.message
 
         # Additional code-level checks - log but don't block (sandbox handles security)
-        dangerous_patterns = {
-            SandboxLanguage.PYTHON: [
-                "os.system",
-                "subprocess.call",
-                "__import__('os')",
-                "import socket",
-            ],
-            SandboxLanguage.BASH: [
-                "rm -rf /",
-                "dd if=",
-                "mkfs",
-                "> /dev/",
-            ],
-            SandboxLanguage.JAVASCRIPT: [
-                "child_process",
-                "require('fs')",
-            ],
-        }
-
-        patterns = dangerous_patterns.get(language, [])
-        for pattern in patterns:
-            if pattern in code:
-                logger.warning(f"Potentially dangerous pattern detected: {pattern}")
+        for pattern in self._dangerous_patterns(code, language):
+            logger.warning(f"Potentially dangerous pattern detected: {pattern}")
 
         return True, "Allowed"
 
+    def _dangerous_patterns(self, code: str, language: SandboxLanguage) -> List[str]:
+        """Dangerous patterns present in the code."""
+        return [p for p in self.DANGEROUS_PATTERNS.get(language, []) if p in code]
+
     def _pull_image_if_needed(self, image: str):
         """Pull Docker image if not available locally."""
         try:
@@ -292,7 +321,6 @@ class SandboxManager:
         sandbox_temp_base = self.data_dir / "temp"
         sandbox_temp_base.mkdir(parents=True, exist_ok=True)
         temp_dir = tempfile.mkdtemp(prefix="sandbox-", dir=str(sandbox_temp_base))
-        code_file = os.path.join(temp_dir, "code")
 
         # Calculate the host path for Docker volume mount
         # temp_dir is like /data/sandbox/temp/sandbox-xxxx
@@ -301,20 +329,9 @@ class SandboxManager:
         host_temp_dir = str(self.host_data_dir / relative_path)
 
         try:
-            # Write code to file with world-readable permissions
+            # Write code and extra files world-readable
             # (sandbox runs as 'nobody' which needs read access)
-            with open(code_file, "w") as f:
-                f.write(code)
-            os.chmod(code_file, 0o644)
-            os.chmod(temp_dir, 0o755)  # Directory also needs to be accessible
-
-            # Write additional files if provided
-            if files:
-                for filename, content in files.items():
-                    file_path = os.path.join(temp_dir, filename)
-                    with open(file_path, "w") as f:
-                        f.write(content)
-                    os.chmod(file_path, 0o644)
+            write_sandbox_files(Path(temp_dir), code, files)
 
             # Get image for language
             image = self.IMAGES.get(language)
@@ -451,19 +468,204 @@ class SandboxManager:
         self.history.append(asdict(result))
         self._save_history()
 
+    def _container_body(
+        self,
+        image: str,
+        command: List[str],
+        config: SandboxConfig,
+        host_dir: str,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Docker Engine API create body with the sandbox security settings."""
+        security_opt = ["no-new-privileges:true"] if config.no_new_privileges else []
+        return {
+            "Image": image,
+            "Cmd": command,
+            "User": config.user,
+            "WorkingDir": config.working_dir,
+            "NetworkDisabled": not config.network_enabled,
+            "Labels": labels or {},
+            "HostConfig": {
+                "Binds": [f"{host_dir}:{config.working_dir}:ro"],
+                "Memory": parse_bytes(config.memory_limit),
+                "NanoCpus": int(config.cpu_limit * 1e9),
+                "NetworkMode": "bridge" if config.network_enabled else "none",
+                "ReadonlyRootfs": config.read_only_root,
+                "Tmpfs": {"/tmp": "rw,noexec,nosuid,size=64m"} if config.read_only_root else {},
+                "SecurityOpt": security_opt,
+                "CapDrop": ["ALL"] if config.drop_capabilities else [],
+            },
+        }
+
+    def get_pool(self) -> SandboxPool:
+        """Lazy-create the warm container pool (containers start on first use)."""
+        if self._pool is None:
+            settings = PoolSettings.from_env()
+            pools = {}
+            for language in SandboxLanguage:
+                image = self.IMAGES[language]
+                pools[language.value] = LanguagePool(
+                    language=language.value,
+                    image=image,
+                    command=self.COMMANDS[language],
+                    user=self.config.user,
+                    make_body=lambda host_dir, image=image: self._container_body(
+                        image, IDLE_COMMAND, self.config, host_dir, labels={"hydra.sandbox.pool": "warm"},
+                    ),
+                    client=self.docker,
+                    settings=settings,
+                    data_dir=self.data_dir / "pool",
+                    host_data_dir=self.host_data_dir / "pool",
+                )
+            self._pool = SandboxPool(pools, settings)
+        return self._pool
+
+    def _pool_compatible(self, config: SandboxConfig) -> bool:
+        """Warm containers are created with the default config; only per-run limits may differ."""
+        default = self.config
+        return (
+            not config.network_enabled
+            and config.memory_limit == default.memory_limit
+            and config.cpu_limit == default.cpu_limit
+            and config.read_only_root == default.read_only_root
+            and config.drop_capabilities == default.drop_capabilities
+            and config.no_new_privileges == default.no_new_privileges
+            and config.user == default.user
+            and config.working_dir == default.working_dir
+        )
+
+    async def _run_cold_async(
+        self,
+        execution_id: str,
+        code: str,
+        language: SandboxLanguage,
+        config: SandboxConfig,
+        files: Optional[Dict[str, str]],
+    ) -> RunOutcome:
+        """Run code in a fresh container that is removed afterwards."""
+        sandbox_temp_base = self.data_dir / "temp"
+        sandbox_temp_base.mkdir(parents=True, exist_ok=True)
+        temp_dir = Path(tempfile.mkdtemp(prefix="sandbox-", dir=str(sandbox_temp_base)))
+        try:
+            write_sandbox_files(temp_dir, code, files)
+            host_temp_dir = str(self.host_data_dir / temp_dir.relative_to(self.data_dir))
+            image = self.IMAGES[language]
+            return await run_container(
+                self.docker,
+                name=f"{self.container_prefix}{execution_id}",
+                image=image,
+                body=self._container_body(image, self.COMMANDS[language], config, host_temp_dir),
+                timeout=config.timeout_seconds,
+                max_output_bytes=config.max_output_bytes,
+            )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     async def execute_async(
         self,
         code: str,
         language: SandboxLanguage = SandboxLanguage.PYTHON,
         config: Optional[SandboxConfig] = None,
+        files: Optional[Dict[str, str]] = None,
     ) -> ExecutionResult:
-        """Async wrapper for execute."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.execute(code, language, config)
+        """
+        Execute code in a sandboxed container without blocking the event loop.
+
+        Uses a warm pooled container when the pool is enabled and the config
+        only changes per-run limits (timeout, output size); otherwise starts
+        a fresh container. Code with dangerous patterns still runs, but its
+        pooled container is retired afterwards.
+        """
+        execution_id = str(uuid.uuid4())[:8]
+        config = config or self.config
+        started_at = datetime.utcnow()
+
+        allowed, reason = self._check_constitutional_constraints(code, language)
+        if not allowed:
+            result = ExecutionResult(
+                execution_id=execution_id,
+                status=ExecutionStatus.ERROR,
+                error_message=f"Constitutional constraint violation: {reason}",
+                started_at=started_at.isoformat() + "Z",
+                finished_at=datetime.utcnow().isoformat() + "Z",
+            )
+            self._record_execution(result)
+            return result
+
+        logger.info(f"Executing sandbox: {execution_id}, language={language.value}")
+        try:
+            if self.pool_enabled and self._pool_compatible(config):
+                outcome = await self.get_pool().run(
+                    language.value, code, files,
+                    timeout=config.timeout_seconds,
+                    max_output_bytes=config.max_output_bytes,
+                    tainted=bool(self._dangerous_patterns(code, language)),
+                )
+            else:
+                outcome = await self._run_cold_async(execution_id, code, language, config, files)
+            result = self._result_from_outcome(execution_id, outcome, config, started_at)
+        except (DockerAPIError, ValueError, OSError) as e:
+            result = ExecutionResult(
+                execution_id=execution_id,
+                status=ExecutionStatus.ERROR,
+                error_message=str(e),
+                started_at=started_at.isoformat() + "Z",
+                finished_at=datetime.utcnow().isoformat() + "Z",
+            )
+
+        self._record_execution(result)
+        return result
+
+    def _result_from_outcome(
+        self,
+        execution_id: str,
+        outcome: RunOutcome,
+        config: SandboxConfig,
+        started_at: datetime,
+    ) -> ExecutionResult:
+        """Convert a container run into an ExecutionResult."""
+        finished_at = datetime.utcnow()
+        if outcome.timed_out:
+            status = ExecutionStatus.TIMEOUT
+            error_message = f"Execution exceeded {config.timeout_seconds}s timeout"
+        elif outcome.output_truncated:
+            status = ExecutionStatus.KILLED
+            error_message = f"Output exceeded {config.max_output_bytes} bytes"
+        elif outcome.exit_code == 0:
+            status = ExecutionStatus.SUCCESS
+            error_message = None
+        else:
+            status = ExecutionStatus.FAILED
+            error_message = None
+
+        return ExecutionResult(
+            execution_id=execution_id,
+            status=status,
+            exit_code=outcome.exit_code,
+            stdout=outcome.stdout.decode("utf-8", errors="replace"),
+            stderr=outcome.stderr.decode("utf-8", errors="replace"),
+            duration_ms=int((finished_at - started_at).total_seconds() * 1000),
+            started_at=started_at.isoformat() + "Z",
+            finished_at=finished_at.isoformat() + "Z",
+            error_message=error_message,
+            resource_usage={
+                "memory_limit": config.memory_limit,
+                "cpu_limit": config.cpu_limit,
+                "timeout_seconds": config.timeout_seconds,
+                "pooled": outcome.pooled,
+                "container": outcome.container,
+            },
         )
 
+    async def close(self):
+        """Remove warm containers and close the async Docker client."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._docker is not None:
+            await self._docker.close()
+            self._docker = None
+
     def get_execution_history(
         self,
         limit: int = 50,
@@ -603,6 +805,8 @@ else:
             "supported_languages": [lang.value for lang in SandboxLanguage],
             "images": {k.value: v for k, v in self.IMAGES.items()},
             "docker_connected": self._client is not None or True,  # Will connect on first use
+            "pool_enabled": self.pool_enabled,
+            "pool": self._pool.status() if self._pool is not None else None,
         }
 
 
@@ -619,6 +823,12 @@ def get_sandbox_manager() -> SandboxManager:
     return _sandbox_manager
 
 
+async def close_sandbox_manager():
+    """Remove warm containers at shutdown."""
+    if _sandbox_manager is not None:
+        await _sandbox_manager.close()
+
+
 # ============================================================================
 # FastAPI Router
 # ============================================================================
@@ -697,6 +907,14 @@ def create_sandbox_router() -> APIRouter:
             error_message=result.error_message,
         )
 
+    @router.get("/pool")
+    async def get_pool_status():
+        """Get warm container pool sizes, demand and recycle counts."""
+        manager = get_sandbox_manager()
+        if not manager.pool_enabled:
+            return {"enabled": False}
+        return {"enabled": True, **manager.get_pool().status()}
+
     @router.get("/history")
     async def get_history(limit: int = 50, status: Optional[str] = None):
         """Get recent execution history."""
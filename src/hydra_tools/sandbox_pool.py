@@ -0,0 +1,676 @@
+"""
+Hydra Sandbox Pool - Warm containers for sandboxed execution
+
+Starting a fresh container for every snippet costs far more than running
+the snippet itself. This module keeps a small pool of pre-created,
+network-isolated containers per language and runs code in them with
+`docker exec`:
+
+- Each warm container idles on a shell loop with the same limits a one-shot
+  sandbox gets (read-only root, no network, dropped capabilities, memory and
+  CPU caps) and a private code directory bind-mounted read-only at /sandbox.
+- Between runs the code directory is emptied on the host and a reset exec
+  kills leftover processes and wipes the /tmp tmpfs.
+- A container is retired after ``max_uses`` runs, or immediately after a
+  policy violation (timeout, output limit, killed process, flagged code).
+- Pool size follows demand: a maintenance task tracks peak concurrency per
+  interval, keeps an EWMA of it, and grows or shrinks the idle set between
+  ``min_size`` and ``max_size``.
+
+All Docker calls go through AsyncDockerClient, a thin httpx client for the
+Docker Engine API, so executions never block the event loop. Tests pass a
+transport pointing at a fake Engine API instead of the real socket.
+
+Environment:
+    HYDRA_SANDBOX_POOL_MIN       Idle containers kept per language (default 1)
+    HYDRA_SANDBOX_POOL_MAX       Containers per language, idle + busy (default 4)
+    HYDRA_SANDBOX_POOL_MAX_USES  Runs before a container is recycled (default 50)
+    HYDRA_SANDBOX_POOL_INTERVAL  Seconds between resize passes (default 5)
+    HYDRA_SANDBOX_POOL_IDLE_SECONDS  Idle time before surplus containers are removed (default 120)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import shutil
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DOCKER_API_VERSION = "v1.41"
+
+# Keeps PID 1 alive without doing anything; available in every sandbox image
+IDLE_COMMAND = ["sh", "-c", "while :; do sleep 3600; done"]
+
+# Kill everything but PID 1 (kill -1 skips init and the caller), then wipe
+# the writable tmpfs mounts. Runs as the sandbox user.
+RESET_COMMAND = [
+    "sh", "-c",
+    "kill -9 -1 2>/dev/null; "
+    "rm -rf /tmp/* /tmp/.[!.]* /tmp/..?* /dev/shm/* 2>/dev/null; "
+    "exit 0",
+]
+
+# Exit status of a process killed by SIGKILL (OOM killer, docker kill)
+KILLED_EXIT_CODE = 137
+
+
+class DockerAPIError(Exception):
+    """Docker Engine API request failed."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Docker API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+@dataclass
+class StreamOutput:
+    """Demultiplexed stdout/stderr from an attach, exec or logs stream."""
+    stdout: bytes = b""
+    stderr: bytes = b""
+    truncated: bool = False
+
+
+class AsyncDockerClient:
+    """
+    Minimal async client for the Docker Engine API.
+
+    Covers only what the sandbox needs: images, container lifecycle, exec
+    and logs. Talks to the daemon over its unix socket (or tcp://) with a
+    pooled httpx connection.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "unix:///var/run/docker.sock",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = 60.0,
+    ):
+        if base_url.startswith("unix://"):
+            transport = transport or httpx.AsyncHTTPTransport(uds=base_url[len("unix://"):])
+            base_url = "http://docker"
+        else:
+            base_url = base_url.replace("tcp://", "http://", 1)
+        self._http = httpx.AsyncClient(
+            base_url=f"{base_url.rstrip('/')}/{DOCKER_API_VERSION}",
+            transport=transport,
+            timeout=timeout,
+        )
+        self._known_images: set = set()
+
+    @classmethod
+    def from_env(cls) -> "AsyncDockerClient":
+        """Client for DOCKER_HOST, like docker.from_env()."""
+        return cls(os.getenv("DOCKER_HOST", "unix:///var/run/docker.sock"))
+
+    async def close(self):
+        await self._http.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        try:
+            response = await self._http.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            raise DockerAPIError(0, f"{method} {path}: {e}") from e
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise DockerAPIError(response.status_code, message)
+        return response
+
+    async def _read_stream(self, method: str, path: str, max_bytes: int, **kwargs) -> StreamOutput:
+        """Read a multiplexed stream, stopping once ``max_bytes`` have arrived."""
+        try:
+            async with self._http.stream(method, path, **kwargs) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise DockerAPIError(response.status_code, response.text)
+                demuxer = StreamDemuxer(max_bytes)
+                async for chunk in response.aiter_bytes():
+                    if not demuxer.feed(chunk):
+                        break
+                return demuxer.output()
+        except httpx.HTTPError as e:
+            raise DockerAPIError(0, f"{method} {path}: {e}") from e
+
+    async def ensure_image(self, image: str):
+        """Pull ``image`` unless the daemon already has it."""
+        if image in self._known_images:
+            return
+        try:
+            await self._request("GET", f"/images/{image}/json")
+        except DockerAPIError as e:
+            if e.status_code != 404:
+                raise
+            name, _, tag = image.partition(":")
+            logger.info(f"Pulling image {image}...")
+            # The pull progress stream has to be consumed for the pull to finish
+            await self._request("POST", "/images/create", params={"fromImage": name, "tag": tag or "latest"},
+                                timeout=None)
+        self._known_images.add(image)
+
+    async def create_container(self, name: str, body: Dict[str, Any]) -> str:
+        response = await self._request("POST", "/containers/create", params={"name": name}, json=body)
+        return response.json()["Id"]
+
+    async def start_container(self, container_id: str):
+        await self._request("POST", f"/containers/{container_id}/start")
+
+    async def wait_container(self, container_id: str) -> int:
+        response = await self._request("POST", f"/containers/{container_id}/wait", timeout=None)
+        return response.json().get("StatusCode", -1)
+
+    async def container_logs(self, container_id: str, max_bytes: int) -> StreamOutput:
+        return await self._read_stream(
+            "GET", f"/containers/{container_id}/logs", max_bytes,
+            params={"stdout": "1", "stderr": "1"},
+        )
+
+    async def remove_container(self, container_id: str):
+        try:
+            await self._request("DELETE", f"/containers/{container_id}", params={"force": "1", "v": "1"})
+        except DockerAPIError as e:
+            if e.status_code != 404:
+                raise
+
+    async def exec_run(
+        self,
+        container_id: str,
+        cmd: List[str],
+        user: Optional[str] = None,
+        max_bytes: int = 1024 * 1024,
+    ) -> Tuple[int, StreamOutput]:
+        """Run ``cmd`` in a running container; returns (exit code, output)."""
+        body: Dict[str, Any] = {"Cmd": cmd, "AttachStdout": True, "AttachStderr": True}
+        if user:
+            body["User"] = user
+        response = await self._request("POST", f"/containers/{container_id}/exec", json=body)
+        exec_id = response.json()["Id"]
+        output = await self._read_stream(
+            "POST", f"/exec/{exec_id}/start", max_bytes,
+            json={"Detach": False, "Tty": False}, timeout=None,
+        )
+        if output.truncated:
+            return -1, output
+        info = await self._request("GET", f"/exec/{exec_id}/json")
+        exit_code = info.json().get("ExitCode")
+        return (exit_code if exit_code is not None else -1), output
+
+
+class StreamDemuxer:
+    """
+    Splits Docker's multiplexed stream into stdout and stderr.
+
+    Each frame is an 8-byte header (stream type, 3 padding bytes, big-endian
+    payload length) followed by the payload.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._streams = {1: bytearray(), 2: bytearray()}
+        self._total = 0
+        self.truncated = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk; returns False once the output limit is hit."""
+        self._buffer += chunk
+        while len(self._buffer) >= 8:
+            size = int.from_bytes(self._buffer[4:8], "big")
+            if len(self._buffer) < 8 + size:
+                break
+            stream = self._buffer[0]
+            payload = bytes(self._buffer[8:8 + size])
+            del self._buffer[:8 + size]
+            room = self.max_bytes - self._total
+            if size > room:
+                payload = payload[:room]
+                self.truncated = True
+            self._streams.get(stream, self._streams[1]).extend(payload)
+            self._total += len(payload)
+            if self.truncated:
+                return False
+        return True
+
+    def output(self) -> StreamOutput:
+        return StreamOutput(bytes(self._streams[1]), bytes(self._streams[2]), self.truncated)
+
+
+def write_sandbox_files(directory: Path, code: str, files: Optional[Dict[str, str]] = None):
+    """Write the code (as ``code``) and extra files readable by the sandbox user."""
+    for filename, content in [("code", code)] + list((files or {}).items()):
+        if not filename or "/" in filename or filename in (".", ".."):
+            raise ValueError(f"Invalid sandbox filename: {filename!r}")
+        path = directory / filename
+        path.write_text(content)
+        os.chmod(path, 0o644)
+    os.chmod(directory, 0o755)
+
+
+def clear_directory(directory: Path):
+    """Remove everything inside ``directory`` but keep the directory."""
+    for entry in directory.iterdir():
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+
+
+@dataclass
+class RunOutcome:
+    """Raw result of running code in a container."""
+    exit_code: Optional[int]
+    stdout: bytes = b""
+    stderr: bytes = b""
+    timed_out: bool = False
+    output_truncated: bool = False
+    pooled: bool = False
+    container: Optional[str] = None
+
+
+@dataclass
+class WarmContainer:
+    """A pooled container and its bind-mounted code directory."""
+    id: str
+    name: str
+    code_dir: Path
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    idle_since: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class PoolSettings:
+    """Sizing and recycling policy for a language pool."""
+    min_size: int = 1
+    max_size: int = 4
+    max_uses: int = 50
+    interval_seconds: float = 5.0
+    idle_seconds: float = 120.0
+    smoothing: float = 0.3  # EWMA weight of the latest peak
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            min_size=int(os.getenv("HYDRA_SANDBOX_POOL_MIN", "1")),
+            max_size=int(os.getenv("HYDRA_SANDBOX_POOL_MAX", "4")),
+            max_uses=int(os.getenv("HYDRA_SANDBOX_POOL_MAX_USES", "50")),
+            interval_seconds=float(os.getenv("HYDRA_SANDBOX_POOL_INTERVAL", "5")),
+            idle_seconds=float(os.getenv("HYDRA_SANDBOX_POOL_IDLE_SECONDS", "120")),
+        )
+
+
+class LanguagePool:
+    """
+    Warm containers for one language.
+
+    ``make_body(host_dir)`` returns the Engine API create body for a
+    container whose /sandbox is bound to ``host_dir``; the pool owns naming,
+    lifecycle and the code directories.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        image: str,
+        command: List[str],
+        user: str,
+        make_body: Callable[[str], Dict[str, Any]],
+        client: AsyncDockerClient,
+        settings: PoolSettings,
+        data_dir: Path,
+        host_data_dir: Path,
+    ):
+        self.language = language
+        self.image = image
+        self.command = command
+        self.user = user
+        self.make_body = make_body
+        self.client = client
+        self.settings = settings
+        self.data_dir = data_dir
+        self.host_data_dir = host_data_dir
+
+        self.idle: Deque[WarmContainer] = deque()
+        self.busy = 0
+        self.pending = 0  # being created or reset
+        self.waiting = 0
+        self._available = asyncio.Condition()
+        self._background: set = set()
+        self._closed = False
+
+        self.target = settings.min_size
+        self._demand = float(settings.min_size)
+        self._peak = 0
+
+        self.stats: Dict[str, Any] = {
+            "runs": 0, "hits": 0, "misses": 0, "waits": 0,
+            "created": 0, "removed": 0, "resets": 0, "create_failures": 0,
+            "recycled": {},
+        }
+
+    @property
+    def size(self) -> int:
+        return len(self.idle) + self.busy + self.pending
+
+    # ----------------------------------------------------------------------
+    # Container lifecycle
+    # ----------------------------------------------------------------------
+
+    async def _create(self) -> WarmContainer:
+        name = f"hydra-warm-{self.language}-{uuid.uuid4().hex[:8]}"
+        code_dir = self.data_dir / name
+        code_dir.mkdir(parents=True, exist_ok=True)
+        os.chmod(code_dir, 0o755)
+        try:
+            await self.client.ensure_image(self.image)
+            container_id = await self.client.create_container(
+                name, self.make_body(str(self.host_data_dir / name))
+            )
+            try:
+                await self.client.start_container(container_id)
+            except DockerAPIError:
+                await self.client.remove_container(container_id)
+                raise
+        except Exception:
+            self.stats["create_failures"] += 1
+            shutil.rmtree(code_dir, ignore_errors=True)
+            raise
+        self.stats["created"] += 1
+        return WarmContainer(id=container_id, name=name, code_dir=code_dir)
+
+    async def _remove(self, container: WarmContainer, reason: str):
+        recycled = self.stats["recycled"]
+        recycled[reason] = recycled.get(reason, 0) + 1
+        self.stats["removed"] += 1
+        try:
+            await self.client.remove_container(container.id)
+        except DockerAPIError as e:
+            logger.warning(f"Failed to remove sandbox container {container.name}: {e}")
+        shutil.rmtree(container.code_dir, ignore_errors=True)
+
+    async def _reset(self, container: WarmContainer) -> bool:
+        clear_directory(container.code_dir)
+        exit_code, _ = await self.client.exec_run(container.id, RESET_COMMAND, user=self.user, max_bytes=4096)
+        self.stats["resets"] += 1
+        return exit_code == 0
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _add_idle(self, container: WarmContainer):
+        container.idle_since = time.monotonic()
+        async with self._available:
+            self.idle.append(container)
+            self._available.notify()
+
+    async def _grow_one(self):
+        """Create a container in the background and make it idle."""
+        try:
+            container = await self._create()
+        except Exception as e:
+            logger.warning(f"Sandbox pool {self.language}: failed to create container: {e}")
+            container = None
+        finally:
+            self.pending -= 1
+        if container is None:
+            async with self._available:
+                self._available.notify()
+            return
+        if self._closed:
+            await self._remove(container, "closed")
+            return
+        await self._add_idle(container)
+
+    def _replenish(self):
+        """Start creating containers until the pool reaches its target size."""
+        while not self._closed and self.size < self.target:
+            self.pending += 1
+            self._spawn(self._grow_one())
+
+    async def _recycle(self, container: WarmContainer, violation: Optional[str]):
+        """Reset a container after a run and return it to the idle set, or retire it."""
+        reason = violation
+        if reason is None and container.uses >= self.settings.max_uses:
+            reason = "max_uses"
+        if reason is None and self.size > self.target:
+            reason = "shrink"
+        if reason is None and self._closed:
+            reason = "closed"
+        if reason is None:
+            try:
+                if not await self._reset(container):
+                    reason = "reset_failed"
+            except (DockerAPIError, OSError) as e:
+                logger.warning(f"Sandbox pool {self.language}: reset of {container.name} failed: {e}")
+                reason = "reset_failed"
+        if reason is None:
+            self.pending -= 1
+            await self._add_idle(container)
+            return
+        try:
+            await self._remove(container, reason)
+        finally:
+            self.pending -= 1
+            async with self._available:
+                self._available.notify()
+        self._replenish()
+
+    # ----------------------------------------------------------------------
+    # Acquire / run
+    # ----------------------------------------------------------------------
+
+    async def acquire(self) -> WarmContainer:
+        """Take an idle container, creating one if the pool has room, else wait."""
+        self.waiting += 1
+        self._peak = max(self._peak, self.busy + self.waiting)
+        try:
+            async with self._available:
+                waited = False
+                while True:
+                    if self.idle:
+                        container = self.idle.pop()  # most recently used first
+                        self.busy += 1
+                        self.stats["waits" if waited else "hits"] += 1
+                        break
+                    if self.size < self.settings.max_size:
+                        self.pending += 1
+                        container = None
+                        self.stats["misses"] += 1
+                        break
+                    waited = True
+                    await self._available.wait()
+        finally:
+            self.waiting -= 1
+
+        if container is None:
+            try:
+                container = await self._create()
+            except Exception:
+                async with self._available:
+                    self._available.notify()
+                raise
+            finally:
+                self.pending -= 1
+            self.busy += 1
+        # Demand just outran the idle set; raise the target ahead of the next resize pass
+        if not self.idle and self.target < self.settings.max_size:
+            self.target += 1
+        self._replenish()
+        return container
+
+    async def run(
+        self,
+        code: str,
+        files: Optional[Dict[str, str]],
+        timeout: float,
+        max_output_bytes: int,
+        tainted: bool = False,
+    ) -> RunOutcome:
+        """Run code in a warm container. ``tainted`` retires the container afterwards."""
+        container = await self.acquire()
+        container.uses += 1
+        self.stats["runs"] += 1
+        outcome = RunOutcome(exit_code=None, pooled=True, container=container.name)
+        violation = "flagged_code" if tainted else None
+        try:
+            write_sandbox_files(container.code_dir, code, files)
+            exit_code, output = await asyncio.wait_for(
+                self.client.exec_run(container.id, self.command, user=self.user, max_bytes=max_output_bytes),
+                timeout,
+            )
+            outcome.exit_code = exit_code
+            outcome.stdout, outcome.stderr = output.stdout, output.stderr
+            if output.truncated:
+                outcome.output_truncated = True
+                violation = "output_limit"
+            elif exit_code == KILLED_EXIT_CODE:
+                violation = "killed"
+        except asyncio.TimeoutError:
+            outcome.timed_out = True
+            violation = "timeout"
+        except BaseException:
+            violation = "error"
+            raise
+        finally:
+            self.busy -= 1
+            self.pending += 1
+            self._spawn(self._recycle(container, violation))
+        return outcome
+
+    # ----------------------------------------------------------------------
+    # Sizing
+    # ----------------------------------------------------------------------
+
+    async def resize(self):
+        """One maintenance pass: update the demand estimate, then grow or shrink."""
+        s = self.settings
+        self._demand = s.smoothing * self._peak + (1 - s.smoothing) * self._demand
+        self._peak = self.busy + self.waiting
+        # One spare above expected concurrency so a new request rarely misses;
+        # the small offset lets the EWMA tail decay to zero
+        expected = math.ceil(self._demand - 0.05)
+        self.target = max(s.min_size, min(s.max_size, expected + 1 if expected > 0 else 0))
+
+        now = time.monotonic()
+        surplus = []
+        async with self._available:
+            while self.idle and self.size > self.target and now - self.idle[0].idle_since >= s.idle_seconds:
+                surplus.append(self.idle.popleft())
+        for container in surplus:
+            await self._remove(container, "shrink")
+        self._replenish()
+
+    async def close(self):
+        # Background creates and resets see _closed and remove their containers
+        self._closed = True
+        await asyncio.gather(*list(self._background), return_exceptions=True)
+        async with self._available:
+            idle, self.idle = list(self.idle), deque()
+        for container in idle:
+            await self._remove(container, "closed")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "image": self.image,
+            "idle": len(self.idle),
+            "busy": self.busy,
+            "pending": self.pending,
+            "waiting": self.waiting,
+            "target": self.target,
+            "demand": round(self._demand, 2),
+            **self.stats,
+        }
+
+
+class SandboxPool:
+    """Language pools plus the maintenance task that resizes them."""
+
+    def __init__(self, pools: Dict[str, LanguagePool], settings: PoolSettings):
+        self.pools = pools
+        self.settings = settings
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Warm every language to its minimum size and start resizing."""
+        if self._task is not None:
+            return
+        for pool in self.pools.values():
+            pool._replenish()
+        self._task = asyncio.create_task(self._maintain())
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.settings.interval_seconds)
+            for pool in self.pools.values():
+                try:
+                    await pool.resize()
+                except Exception as e:
+                    logger.warning(f"Sandbox pool {pool.language}: resize failed: {e}")
+
+    async def run(self, language: str, code: str, files: Optional[Dict[str, str]],
+                  timeout: float, max_output_bytes: int, tainted: bool = False) -> RunOutcome:
+        self.start()
+        return await self.pools[language].run(code, files, timeout, max_output_bytes, tainted)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for pool in self.pools.values():
+            await pool.close()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "settings": {
+                "min_size": self.settings.min_size,
+                "max_size": self.settings.max_size,
+                "max_uses": self.settings.max_uses,
+                "interval_seconds": self.settings.interval_seconds,
+                "idle_seconds": self.settings.idle_seconds,
+            },
+            "languages": {name: pool.status() for name, pool in self.pools.items()},
+        }
+
+
+async def run_container(
+    client: AsyncDockerClient,
+    name: str,
+    image: str,
+    body: Dict[str, Any],
+    timeout: float,
+    max_output_bytes: int,
+) -> RunOutcome:
+    """Run a one-shot container to completion and remove it (the unpooled path)."""
+    await client.ensure_image(image)
+    container_id = await client.create_container(name, body)
+    outcome = RunOutcome(exit_code=None, container=name)
+    try:
+        await client.start_container(container_id)
+        try:
+            outcome.exit_code = await asyncio.wait_for(client.wait_container(container_id), timeout)
+        except asyncio.TimeoutError:
+            outcome.timed_out = True
+            return outcome
+        output = await client.container_logs(container_id, max_output_bytes)
+        outcome.stdout, outcome.stderr = output.stdout, output.stderr
+        outcome.output_truncated = output.truncated
+        return outcome
+    finally:
+        await client.remove_container(container_id)
@@ -748,6 +748,8 @@ def create_diagnosis_router():
     from fastapi import APIRouter, HTTPException
     from pydantic import BaseModel
 
+    from hydra_tools.service_bus import provides
+
     router = APIRouter(prefix="/diagnosis", tags=["diagnosis"])
     engine = SelfDiagnosisEngine()
 
@@ -845,6 +847,7 @@ def create_diagnosis_router():
         }
 
     @router.get("/inference")
+    @provides("/diagnosis/inference")
     async def diagnosis_inference():
         """Get inference-specific diagnostics."""
         import httpx
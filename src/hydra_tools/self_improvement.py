@@ -981,6 +981,8 @@ def create_self_improvement_router():
     from fastapi import APIRouter, HTTPException
     from pydantic import BaseModel
 
+    from .service_bus import provides
+
     router = APIRouter(prefix="/self-improvement", tags=["self-improvement"])
     engine = SelfImprovementEngine()
 
@@ -1007,6 +1009,7 @@ def create_self_improvement_router():
         return engine.benchmarks.get_baseline()
 
     @router.get("/benchmarks/latest")
+    @provides("/self-improvement/benchmarks/latest")
     async def get_latest_benchmarks():
         """Get latest benchmark results from history."""
         from .benchmark_suite import get_latest_benchmark_results
@@ -0,0 +1,488 @@
+"""
+Semantic Router - Learned model-tier selection from prompt embeddings
+
+Embeds prompts with nomic-embed-text (the same Ollama setup the discovery
+archive uses) and picks a tier with a nearest-centroid classifier trained
+offline from human feedback and preference-learning interactions. The
+classifier is a (tiers x dims) matrix, so a decision on a cached embedding
+is one small matrix-vector product.
+
+Modes (HYDRA_SEMANTIC_ROUTER_MODE):
+- off: the heuristic RouteClassifier decides, nothing is embedded
+- shadow: the heuristic decides; the learned decision is computed in the
+  background and only compared, so routing latency is unchanged. At most
+  HYDRA_SEMANTIC_ROUTER_SHADOW_CONCURRENCY comparisons that need an Ollama
+  embedding run at once; further ones are dropped and counted
+- active: the learned decision is returned, falling back to the heuristic
+  when no model is loaded or the prompt cannot be embedded. A caller that
+  passes prefer_quality or prefer_speed gets the heuristic decision, which
+  honours them
+
+The model file is written by scripts/train-semantic-router.py and can be
+swapped at runtime with POST /routing/semantic/reload.
+
+Usage:
+    router = get_semantic_router()
+    decision = await router.route("Explain the CAP theorem trade-offs")
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter as TallyCounter
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+from prometheus_client import Counter
+
+from hydra_tools.discovery_archive import EMBED_MODEL, OLLAMA_URL
+from hydra_tools.routellm import ModelTier, RouteClassifier, RoutingDecision
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DATA_DIR = Path(os.getenv("HYDRA_DATA_DIR", "/data"))
+MODEL_PATH = Path(os.getenv("HYDRA_SEMANTIC_ROUTER_MODEL", str(DATA_DIR / "semantic_router.npz")))
+ROUTER_MODE = os.getenv("HYDRA_SEMANTIC_ROUTER_MODE", "shadow")
+EMBEDDING_CACHE_SIZE = int(os.getenv("HYDRA_SEMANTIC_ROUTER_CACHE", "4096"))
+SHADOW_CONCURRENCY = int(os.getenv("HYDRA_SEMANTIC_ROUTER_SHADOW_CONCURRENCY", "4"))
+MODES = ("off", "shadow", "active")
+
+# Softmax temperature applied to cosine scores when reporting confidence
+TEMPERATURE = 0.05
+
+# Training weight per human_feedback rating: good outcomes pull a tier's
+# centroid toward the prompt, bad ones push it away
+RATING_WEIGHTS = {"excellent": 2.0, "good": 1.0, "acceptable": 0.0, "poor": -1.0, "rejected": -2.0}
+INTERACTION_WEIGHTS = {"positive": 1.0, "neutral": 0.25, None: 0.25, "edit": -0.5,
+                       "negative": -1.0, "regenerate": -1.0}
+
+DECISIONS = Counter(
+    "hydra_semantic_router_decisions_total",
+    "Semantic router decisions by mode and agreement with the heuristic router",
+    ["mode", "agreement"],
+)
+
+
+# =============================================================================
+# Embeddings
+# =============================================================================
+
+class PromptEmbedder:
+    """nomic-embed-text embeddings over one pooled client, with an LRU cache."""
+
+    def __init__(self, ollama_url: str = OLLAMA_URL, model: str = EMBED_MODEL,
+                 cache_size: int = EMBEDDING_CACHE_SIZE):
+        self.ollama_url = ollama_url
+        self.model = model
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def cached(self, text: str) -> Optional[np.ndarray]:
+        key = self._key(text)
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+        return vector
+
+    def _remember(self, text: str, vector: np.ndarray):
+        self._cache[self._key(text)] = vector
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def embed_many(self, texts: Sequence[str], batch_size: int = 32) -> List[np.ndarray]:
+        """Unit-length embeddings for ``texts``; only uncached texts are sent."""
+        vectors = {text: self.cached(text) for text in texts}
+        missing = [text for text, vector in vectors.items() if vector is None]
+        if self._client is None and missing:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            response = await self._client.post(
+                f"{self.ollama_url}/api/embed",
+                json={"model": self.model, "input": [text[:8000] for text in batch]},
+            )
+            response.raise_for_status()
+            for text, embedding in zip(batch, response.json()["embeddings"]):
+                vector = np.asarray(embedding, dtype=np.float32)
+                vectors[text] = vector / (np.linalg.norm(vector) or 1.0)
+                self._remember(text, vectors[text])
+        return [vectors[text] for text in texts]
+
+    async def embed(self, text: str) -> np.ndarray:
+        vector = self.cached(text)
+        if vector is None:
+            vector = (await self.embed_many([text]))[0]
+        return vector
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# =============================================================================
+# Classifier
+# =============================================================================
+
+@dataclass
+class SemanticRouteModel:
+    """Nearest-centroid classifier over unit-length prompt embeddings."""
+    labels: List[str]  # ModelTier values, one per centroid row
+    centroids: np.ndarray  # (len(labels), dims), rows unit length
+    embed_model: str = EMBED_MODEL
+    temperature: float = TEMPERATURE
+    trained_at: str = ""
+    samples: Dict[str, int] = field(default_factory=dict)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def dimensions(self) -> int:
+        return self.centroids.shape[1]
+
+    def scores(self, vector: np.ndarray) -> np.ndarray:
+        return self.centroids @ vector
+
+    def predict(self, vector: np.ndarray) -> Tuple[str, float]:
+        """(tier value, softmax confidence) for one embedding."""
+        scores = self.scores(vector)
+        best = int(np.argmax(scores))
+        weights = np.exp((scores - scores[best]) / self.temperature)
+        return self.labels[best], float(1.0 / weights.sum())
+
+    def predict_many(self, vectors: np.ndarray) -> List[str]:
+        return [self.labels[i] for i in np.argmax(vectors @ self.centroids.T, axis=1)]
+
+    def save(self, path: Path):
+        """Write atomically, so a running router never loads a partial file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "labels": self.labels, "embed_model": self.embed_model, "temperature": self.temperature,
+            "trained_at": self.trained_at, "samples": self.samples, "metrics": self.metrics,
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, centroids=self.centroids, meta=np.array(json.dumps(meta)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SemanticRouteModel":
+        with np.load(Path(path)) as data:
+            meta = json.loads(str(data["meta"]))
+            centroids = data["centroids"].astype(np.float32)
+        unknown = set(meta["labels"]) - {tier.value for tier in ModelTier}
+        if unknown or len(meta["labels"]) != centroids.shape[0]:
+            raise ValueError(f"Invalid semantic router model {path}: labels {meta['labels']}")
+        return cls(centroids=centroids, **meta)
+
+
+def train_centroids(vectors: np.ndarray, labels: Sequence[str], weights: Sequence[float],
+                    **meta) -> SemanticRouteModel:
+    """
+    Weighted class centroids. Negative weights (bad outcomes on that tier)
+    subtract from the centroid; tiers whose net weight is not positive get
+    no centroid and are never predicted.
+    """
+    labels = np.asarray(labels)
+    weights = np.asarray(weights, dtype=np.float32)
+    kept, rows = [], []
+    for tier in ModelTier:
+        mask = labels == tier.value
+        if weights[mask].clip(min=0).sum() <= 0:
+            continue
+        centroid = (vectors[mask] * weights[mask, None]).sum(axis=0)
+        norm = np.linalg.norm(centroid)
+        if norm > 0:
+            kept.append(tier.value)
+            rows.append(centroid / norm)
+    if not rows:
+        raise ValueError("No positively rated examples to train on")
+    samples = dict(TallyCounter(labels.tolist()))
+    return SemanticRouteModel(labels=kept, centroids=np.vstack(rows).astype(np.float32),
+                              trained_at=datetime.utcnow().isoformat() + "Z", samples=samples, **meta)
+
+
+# =============================================================================
+# Training Data
+# =============================================================================
+
+@dataclass
+class TrainingExample:
+    """A prompt, the tier that served it, and how well that went."""
+    prompt: str
+    tier: str
+    weight: float
+    source: str
+
+
+def tier_for_model(model: Optional[str]) -> Optional[str]:
+    """Tier a served model belongs to, or None for models outside the local tiers."""
+    if not model:
+        return None
+    name = model.lower()
+    for tier, tier_model in RouteClassifier.MODELS.items():
+        if name == tier_model:
+            return tier.value
+    if "coder" in name or "codellama" in name or "codestral" in name:
+        return ModelTier.CODE.value
+    if "70b" in name or "miqu" in name or "tabby" in name:
+        return ModelTier.QUALITY.value
+    if any(size in name for size in ("3b", "7b", "8b", "mistral")):
+        return ModelTier.FAST.value
+    return None
+
+
+def load_feedback_examples(db_path: Path) -> List[TrainingExample]:
+    """Rated generations from the human_feedback database."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute(
+            "SELECT prompt_used, model_used, rating FROM generation_feedback "
+            "WHERE prompt_used IS NOT NULL AND prompt_used != '' AND model_used IS NOT NULL"
+        ).fetchall()
+    finally:
+        conn.close()
+    examples = []
+    for prompt, model, rating in rows:
+        tier, weight = tier_for_model(model), RATING_WEIGHTS.get(rating, 0.0)
+        if tier and weight:
+            examples.append(TrainingExample(prompt, tier, weight, "human_feedback"))
+    return examples
+
+
+def load_interaction_examples(path: Path) -> List[TrainingExample]:
+    """
+    preference_learning interactions, one JSON object per line. Interactions
+    only store a prompt hash, so lines without ``metadata.prompt`` are skipped.
+    """
+    examples = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            prompt = (record.get("metadata") or {}).get("prompt")
+            tier = tier_for_model(record.get("model"))
+            weight = INTERACTION_WEIGHTS.get(record.get("feedback"), 0.0)
+            if prompt and tier and weight:
+                examples.append(TrainingExample(prompt, tier, weight, "preference_learning"))
+    return examples
+
+
+def evaluate(model: SemanticRouteModel, vectors: np.ndarray, examples: Sequence[TrainingExample],
+             baseline: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """
+    Routing accuracy on held-out examples. Positively rated examples count as
+    correct when the predicted tier matches; negatively rated ones when it
+    avoids the tier that did badly. ``baseline`` scores another router's
+    tiers on the same examples.
+    """
+    def score(predicted: Sequence[str]) -> Tuple[float, float]:
+        hits = [(p == e.tier) == (e.weight > 0) for p, e in zip(predicted, examples)]
+        good = [h for h, e in zip(hits, examples) if e.weight > 0]
+        return (sum(good) / len(good) if good else 0.0), (sum(hits) / len(hits) if hits else 0.0)
+
+    metrics = {}
+    metrics["accuracy"], metrics["outcome_accuracy"] = score(model.predict_many(vectors))
+    if baseline is not None:
+        metrics["baseline_accuracy"], metrics["baseline_outcome_accuracy"] = score(baseline)
+    metrics["examples"] = len(examples)
+    return metrics
+
+
+# =============================================================================
+# Runtime Router
+# =============================================================================
+
+class SemanticRouter:
+    """Routes with the learned model in active mode, compares against it in shadow mode."""
+
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        mode: str = ROUTER_MODE,
+        embedder: Optional[PromptEmbedder] = None,
+        fallback: Optional[RouteClassifier] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown semantic router mode: {mode}")
+        self.model_path = Path(model_path)
+        self.mode = mode
+        self.embedder = embedder or PromptEmbedder()
+        self.fallback = fallback or RouteClassifier()
+        self.model: Optional[SemanticRouteModel] = None
+        self._shadow_tasks: set = set()
+        self.comparisons: TallyCounter = TallyCounter()  # (heuristic tier, learned tier) -> count
+        self.disagreements: deque = deque(maxlen=50)
+        self.stats = {
+            "decisions": 0, "learned": 0, "fallbacks": 0, "embed_errors": 0,
+            "preferences": 0, "shadow_dropped": 0,
+        }
+        if self.model_path.exists():
+            try:
+                self.reload()
+            except Exception as e:
+                logger.warning(f"Semantic router model not loaded: {e}")
+
+    def reload(self) -> SemanticRouteModel:
+        """Load the model file and swap it in; in-flight decisions keep the old one."""
+        model = SemanticRouteModel.load(self.model_path)
+        self.swap(model)
+        return model
+
+    def swap(self, model: SemanticRouteModel):
+        if model.embed_model != self.embedder.model:
+            raise ValueError(f"Model trained on {model.embed_model}, router embeds with {self.embedder.model}")
+        self.model = model
+        self.comparisons.clear()
+        self.disagreements.clear()
+        logger.info(f"Semantic router model loaded: {model.labels}, trained {model.trained_at}")
+
+    def set_mode(self, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"Unknown semantic router mode: {mode}")
+        self.mode = mode
+
+    def decide(self, vector: np.ndarray) -> RoutingDecision:
+        """The learned decision for an embedded prompt."""
+        model = self.model
+        tier, confidence = model.predict(vector)
+        tier = ModelTier(tier)
+        return RoutingDecision(
+            model=RouteClassifier.MODELS[tier],
+            tier=tier,
+            confidence=confidence,
+            reason=f"Nearest {tier.value} centroid ({confidence:.2f})",
+        )
+
+    async def route(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> RoutingDecision:
+        """Route like RouteClassifier.route, using the learned model when active."""
+        heuristic = self.fallback.route(prompt, system_prompt=system_prompt, **kwargs)
+        self.stats["decisions"] += 1
+        if self.mode == "off" or self.model is None:
+            return heuristic
+
+        text = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if self.mode == "shadow":
+            self._shadow(text, heuristic)
+            return heuristic
+
+        if kwargs.get("prefer_quality") or kwargs.get("prefer_speed"):
+            # The learned model has no notion of the caller's preference; the heuristic applies it
+            self.stats["preferences"] += 1
+            return heuristic
+
+        learned = await self._learned(text, heuristic)
+        if learned is None:
+            self.stats["fallbacks"] += 1
+            return heuristic
+        self.stats["learned"] += 1
+        return learned
+
+    def _shadow(self, text: str, heuristic: RoutingDecision):
+        """Compare in the background, dropping the comparison when Ollama is already busy with ours."""
+        vector = self.embedder.cached(text)
+        if vector is not None:
+            if vector.shape[0] == self.model.dimensions:
+                self._compare(text, heuristic, self.decide(vector))
+            return
+        if len(self._shadow_tasks) >= SHADOW_CONCURRENCY:
+            self.stats["shadow_dropped"] += 1
+            return
+        task = asyncio.create_task(self._learned(text, heuristic))
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    async def _learned(self, text: str, heuristic: RoutingDecision) -> Optional[RoutingDecision]:
+        try:
+            vector = await self.embedder.embed(text)
+        except Exception as e:
+            self.stats["embed_errors"] += 1
+            logger.debug(f"Semantic router embedding failed: {e}")
+            return None
+        if self.model is None or vector.shape[0] != self.model.dimensions:
+            return None
+        learned = self.decide(vector)
+        self._compare(text, heuristic, learned)
+        return learned
+
+    def _compare(self, text: str, heuristic: RoutingDecision, learned: RoutingDecision):
+        agree = heuristic.tier == learned.tier
+        self.comparisons[(heuristic.tier.value, learned.tier.value)] += 1
+        DECISIONS.labels(mode=self.mode, agreement="agree" if agree else "disagree").inc()
+        if not agree:
+            self.disagreements.append({
+                "prompt": text[:120],
+                "heuristic": heuristic.tier.value,
+                "learned": learned.tier.value,
+                "confidence": round(learned.confidence, 3),
+                "at": time.time(),
+            })
+
+    def get_stats(self) -> dict:
+        compared = sum(self.comparisons.values())
+        agreed = sum(n for (h, l), n in self.comparisons.items() if h == l)
+        model = self.model
+        return {
+            "mode": self.mode,
+            "model": None if model is None else {
+                "path": str(self.model_path),
+                "labels": model.labels,
+                "dimensions": model.dimensions,
+                "trained_at": model.trained_at,
+                "samples": model.samples,
+                "metrics": model.metrics,
+            },
+            **self.stats,
+            "compared": compared,
+            "agreement_rate": round(agreed / compared, 4) if compared else None,
+            "confusion": {f"{h}->{l}": n for (h, l), n in sorted(self.comparisons.items())},
+            "recent_disagreements": list(self.disagreements)[-10:],
+            "embedding_cache": len(self.embedder._cache),
+        }
+
+    async def close(self):
+        for task in list(self._shadow_tasks):
+            task.cancel()
+        await self.embedder.close()
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_semantic_router: Optional[SemanticRouter] = None
+
+
+def get_semantic_router() -> SemanticRouter:
+    """Get or create the semantic router."""
+    global _semantic_router
+    if _semantic_router is None:
+        _semantic_router = SemanticRouter()
+    return _semantic_router
+
+
+async def close_semantic_router():
+    """Close the embedding client and cancel pending shadow comparisons."""
+    global _semantic_router
+    if _semantic_router is not None:
+        await _semantic_router.close()
+        _semantic_router = None
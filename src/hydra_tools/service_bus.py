@@ -0,0 +1,189 @@
+"""
+Hydra Service Bus - In-process calls between hydra_tools modules
+
+Modules that serve state other modules read (health, container health,
+diagnosis, resources, ...) mark the route handler with ``@provides(path)``.
+Callers ask the bus instead of making an HTTP request back to the API:
+
+    bus = get_service_bus()
+    containers = await bus.query("/container-health/")
+
+When the caller runs inside the API process (the app attaches its router
+registry at startup) and ``base_url`` points at this host, the bus loads the
+router serving ``path`` if needed and awaits the handler directly - no JSON
+round trip, auth middleware or socket. Otherwise, or for paths nobody
+provides, it falls back to an HTTP GET carrying the API key. Either way the result is the
+JSON-compatible value the endpoint would have returned.
+
+Calls are counted per path and transport (local, loopback, remote) so the
+remaining loopback HTTP traffic is visible at /service-bus/stats and in
+Prometheus.
+"""
+
+import inspect
+import logging
+import os
+from collections import Counter as TallyCounter
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.params import Param
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8700")
+API_KEY = os.getenv("HYDRA_API_KEY", "hydra-dev-key")
+LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+BUS_CALLS = Counter(
+    "hydra_service_bus_calls_total",
+    "Service bus queries by path and transport",
+    ["path", "transport"],
+)
+
+PERCEIVE_LATENCY = Histogram(
+    "hydra_perceive_seconds",
+    "Duration of a perceive phase gathering system state",
+    ["loop"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30],
+)
+
+
+class ServiceError(Exception):
+    """A provider or remote endpoint answered with an error status."""
+
+    def __init__(self, path: str, status_code: int, detail: Any = None):
+        super().__init__(f"{path} returned {status_code}: {detail}")
+        self.path = path
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ServiceBus:
+    """Registry of in-process query handlers with an HTTP fallback."""
+
+    def __init__(self, base_url: str = API_BASE_URL, timeout: float = 30.0, api_key: str = API_KEY):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.api_key = api_key
+        self._providers: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._defaults: Dict[str, Dict[str, Any]] = {}
+        self._registry = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.calls: TallyCounter = TallyCounter()  # (transport, path) -> count
+
+    # =========================================================================
+    # Registration
+    # =========================================================================
+
+    def register(self, path: str, func: Callable[..., Awaitable[Any]]):
+        """Serve GET ``path`` in-process with ``func`` (keyword query parameters)."""
+        defaults = {}
+        for name, parameter in inspect.signature(func).parameters.items():
+            # FastAPI Query(...) defaults only make sense inside a request
+            if isinstance(parameter.default, Param):
+                defaults[name] = parameter.default.default
+        self._providers[path] = func
+        self._defaults[path] = defaults
+
+    def attach(self, registry):
+        """Called by the API at startup: callers in this process can go in-process."""
+        self._registry = registry
+
+    def detach(self):
+        self._registry = None
+
+    def is_local(self, base_url: Optional[str] = None) -> bool:
+        host = urlsplit(base_url or self.base_url).hostname or ""
+        return self._registry is not None and host in LOOPBACK_HOSTS
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    async def query(self, path: str, base_url: Optional[str] = None, **params) -> Any:
+        """GET ``path`` with query ``params``, in-process when possible."""
+        if self.is_local(base_url):
+            provider = await self._provider(path)
+            if provider is not None:
+                self._count("local", path)
+                try:
+                    result = await provider(**{**self._defaults[path], **params})
+                except HTTPException as e:
+                    raise ServiceError(path, e.status_code, e.detail) from e
+                return jsonable_encoder(result)
+        return await self._http_get(path, base_url, params)
+
+    async def _provider(self, path: str) -> Optional[Callable[..., Awaitable[Any]]]:
+        if path not in self._providers:
+            # Same lazy loading a request for this path would trigger
+            pending = self._registry.pending_for(path)
+            if pending:
+                await self._registry.ensure_loaded(pending, trigger=f"service {path}")
+        return self._providers.get(path)
+
+    async def _http_get(self, path: str, base_url: Optional[str], params: Dict[str, Any]) -> Any:
+        base = (base_url or self.base_url).rstrip("/")
+        transport = "loopback" if (urlsplit(base).hostname or "") in LOOPBACK_HOSTS else "remote"
+        self._count(transport, path)
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        # The HTTP fallback goes through the auth middleware the in-process path skips
+        resp = await self._client.get(f"{base}{path}", params=params or None, headers={"X-API-Key": self.api_key})
+        if resp.status_code != 200:
+            raise ServiceError(path, resp.status_code, resp.text[:200])
+        return resp.json()
+
+    def _count(self, transport: str, path: str):
+        self.calls[(transport, path)] += 1
+        BUS_CALLS.labels(path=path, transport=transport).inc()
+
+    def get_stats(self) -> Dict[str, Any]:
+        by_transport: Dict[str, Dict[str, int]] = {"local": {}, "loopback": {}, "remote": {}}
+        for (transport, path), count in sorted(self.calls.items()):
+            by_transport[transport][path] = count
+        return {
+            "attached": self._registry is not None,
+            "providers": sorted(self._providers),
+            "totals": {transport: sum(paths.values()) for transport, paths in by_transport.items()},
+            **by_transport,
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_service_bus: Optional[ServiceBus] = None
+
+
+def get_service_bus() -> ServiceBus:
+    """Get or create the service bus."""
+    global _service_bus
+    if _service_bus is None:
+        _service_bus = ServiceBus()
+    return _service_bus
+
+
+def provides(path: str):
+    """Decorator registering a route handler as the in-process provider of ``path``."""
+    def decorator(func):
+        get_service_bus().register(path, func)
+        return func
+    return decorator
+
+
+async def close_service_bus():
+    """Close the HTTP fallback client; registered providers stay."""
+    if _service_bus is not None:
+        _service_bus.detach()
+        await _service_bus.close()
@@ -0,0 +1,204 @@
+"""
+Hydra Similarity - Shared vector similarity kernel
+
+Cosine similarity used to be written out as a Python loop in every module
+that compared embeddings, scoring one pair at a time. This module is the one
+implementation they share:
+
+- cosine(): a single pair, for call sites that compare one embedding
+  against one reference
+- cosine_many(): one query against many vectors in a single product
+- top_k(): best k per row of a score matrix without a full sort, with an
+  optional second key deciding ties
+- VectorStore: pre-normalized vectors, so cosine is a dot product, stored as
+  float32 or, for larger in-memory sets, float16 or int8 with a per-row
+  scale. Batch search scores a block of rows at a time, so quantized storage
+  never expands into a full float32 copy.
+
+Inputs may be lists or arrays. Empty vectors, zero vectors and mismatched
+lengths score 0.0, as the loops they replace did.
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+# Rows scored per block when searching a VectorStore
+SEARCH_BLOCK_ROWS = 16384
+
+
+def normalize(vectors: Union[VectorLike, Sequence[VectorLike]]) -> np.ndarray:
+    """float32 copy scaled to unit length along the last axis; zero vectors stay zero."""
+    array = np.array(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    np.divide(array, norms, out=array, where=norms > 0)
+    return array
+
+
+def cosine(a: Optional[VectorLike], b: Optional[VectorLike]) -> float:
+    """Cosine similarity of two vectors, computed in float64."""
+    if a is None or b is None or len(a) == 0 or len(a) != len(b):
+        return 0.0
+    x = np.asarray(a, dtype=np.float64)
+    y = np.asarray(b, dtype=np.float64)
+    norm = np.linalg.norm(x) * np.linalg.norm(y)
+    if norm == 0:
+        return 0.0
+    return float(x @ y / norm)
+
+
+def cosine_many(query: Optional[VectorLike], vectors: Iterable[Optional[VectorLike]]) -> np.ndarray:
+    """
+    Cosine similarity of ``query`` against each of ``vectors``.
+
+    ``vectors`` may be a 2-D array or a list whose entries can be missing or
+    of another length; those score 0.0.
+    """
+    if not (isinstance(vectors, np.ndarray) and vectors.ndim == 2):
+        vectors = list(vectors)
+    scores = np.zeros(len(vectors), dtype=np.float32)
+    if query is None or len(query) == 0:
+        return scores
+    dim = len(query)
+    if isinstance(vectors, np.ndarray):
+        if vectors.shape[1] == dim:
+            scores[:] = normalize(vectors) @ normalize(query)
+        return scores
+    rows = [i for i, v in enumerate(vectors) if v is not None and len(v) == dim]
+    if rows:
+        scores[rows] = normalize([vectors[i] for i in rows]) @ normalize(query)
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int, tiebreak: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and values of the ``k`` largest scores along the last axis,
+    best first.
+
+    Without ``tiebreak``, equal scores keep no particular order. With it
+    (same shape as ``scores``, any sortable dtype), the higher ``tiebreak``
+    ranks first among equal scores, including at the k-th place.
+    """
+    scores = np.asarray(scores)
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        empty = scores[..., :0]
+        return empty.astype(np.int64), empty
+    if tiebreak is not None:
+        return _top_k_tied(scores, k, np.broadcast_to(np.asarray(tiebreak), scores.shape))
+    if k < scores.shape[-1]:
+        indices = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        indices = np.broadcast_to(np.arange(scores.shape[-1]), scores.shape).copy()
+    values = np.take_along_axis(scores, indices, axis=-1)
+    order = np.argsort(-values, axis=-1, kind="stable")
+    return np.take_along_axis(indices, order, axis=-1), np.take_along_axis(values, order, axis=-1)
+
+
+def _top_k_tied(scores: np.ndarray, k: int, tiebreak: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n = scores.shape[-1]
+    rows, ties = scores.reshape(-1, n), tiebreak.reshape(-1, n)
+    indices = np.empty((len(rows), k), dtype=np.int64)
+    for i, (row, tie) in enumerate(zip(rows, ties)):
+        candidates = np.arange(n)
+        if k < n:
+            # Keep everything tied with the k-th score; the second key picks among them
+            kth = np.partition(row, n - k)[n - k]
+            candidates = np.flatnonzero(row >= kth)
+        order = np.lexsort((tie[candidates], row[candidates]))[::-1][:k]
+        indices[i] = candidates[order]
+    indices = indices.reshape(scores.shape[:-1] + (k,))
+    return indices, np.take_along_axis(scores, indices, axis=-1)
+
+
+class VectorStore:
+    """
+    Growable matrix of unit-length vectors for batch cosine search.
+
+    ``dtype`` is "float32", "float16" (half the memory) or "int8" (a quarter,
+    plus one float32 scale per row). On 768-dim embeddings the cosine is off
+    by at most about 4e-5 with float16 and 1.5e-3 with int8: enough to
+    reorder near-ties, not clearly separated results.
+    """
+
+    DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+    def __init__(self, dim: int, dtype: str = "float32", capacity: int = 1024):
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unknown vector dtype {dtype!r}; use one of {', '.join(self.DTYPES)}")
+        self.dim = dim
+        self.dtype = dtype
+        self._data = np.zeros((max(capacity, 1), dim), dtype=self.DTYPES[dtype])
+        self._scales = np.ones(max(capacity, 1), dtype=np.float32) if dtype == "int8" else None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the filled rows."""
+        per_row = self._data.itemsize * self.dim + (4 if self._scales is not None else 0)
+        return self.size * per_row
+
+    def add(self, vectors: Union[VectorLike, Sequence[VectorLike]]) -> range:
+        """Normalize and append one vector or a batch; returns their row numbers."""
+        unit = normalize(vectors).reshape(-1, self.dim)
+        start, end = self.size, self.size + len(unit)
+        if end > len(self._data):
+            capacity = max(end, 2 * len(self._data))
+            grown = np.zeros((capacity, self.dim), dtype=self._data.dtype)
+            grown[:start] = self._data[:start]
+            self._data = grown
+            if self._scales is not None:
+                scales = np.ones(capacity, dtype=np.float32)
+                scales[:start] = self._scales[:start]
+                self._scales = scales
+        self._data[start:end], scales = self._encode(unit)
+        if self._scales is not None:
+            self._scales[start:end] = scales
+        self.size = end
+        return range(start, end)
+
+    def _encode(self, unit: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self.dtype != "int8":
+            return unit, None
+        peak = np.abs(unit).max(axis=1)
+        scales = np.where(peak > 0, peak / 127, 1.0).astype(np.float32)
+        return np.rint(unit / scales[:, None]).astype(np.int8), scales
+
+    def vectors(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Rows ``start:stop`` decoded to float32."""
+        stop = self.size if stop is None else min(stop, self.size)
+        block = self._data[start:stop].astype(np.float32, copy=self.dtype != "float32")
+        if self._scales is not None:
+            block *= self._scales[start:stop, None]
+        return block
+
+    def scores(self, queries: Union[VectorLike, Sequence[VectorLike]]) -> np.ndarray:
+        """Cosine of every query (rows) against every stored vector (columns)."""
+        q = normalize(queries).reshape(-1, self.dim)
+        out = np.empty((len(q), self.size), dtype=np.float32)
+        for start in range(0, self.size, SEARCH_BLOCK_ROWS):
+            stop = min(start + SEARCH_BLOCK_ROWS, self.size)
+            out[:, start:stop] = q @ self.vectors(start, stop).T
+        return out
+
+    def search(self, queries: Union[VectorLike, Sequence[VectorLike]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best ``k`` rows per query, best first, as (rows, scores) arrays of
+        shape (queries, k). Only one block of scores is held at a time.
+        """
+        q = normalize(queries).reshape(-1, self.dim)
+        best_rows = np.empty((len(q), 0), dtype=np.int64)
+        best_scores = np.empty((len(q), 0), dtype=np.float32)
+        for start in range(0, self.size, SEARCH_BLOCK_ROWS):
+            stop = min(start + SEARCH_BLOCK_ROWS, self.size)
+            rows, scores = top_k(q @ self.vectors(start, stop).T, k)
+            merged_rows = np.concatenate([best_rows, rows + start], axis=1)
+            merged_scores = np.concatenate([best_scores, scores], axis=1)
+            keep, best_scores = top_k(merged_scores, k)
+            best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+        return best_rows, best_scores
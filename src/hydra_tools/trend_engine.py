@@ -0,0 +1,242 @@
+"""
+Hydra Trend Engine - Streaming keyword matching and heavy-hitter counting
+
+Building blocks for detecting trends in an unbounded stream of text (news
+entries) in constant memory:
+
+- KeywordAutomaton: an Aho-Corasick automaton compiled once from a keyword
+  list, finding every keyword occurring in a text in one pass instead of one
+  substring scan per keyword.
+- DecayingHeavyHitters: a count-min sketch with conservative update whose
+  counts decay exponentially with a configurable half-life, plus the top-k
+  keys by decayed count. Memory is fixed by the sketch width/depth and k,
+  however many distinct keys the stream contains.
+
+Decay is applied lazily: increments are scaled up by 2^(t / half_life)
+instead of every counter being scaled down over time, and the table is
+renormalized when the scale grows large. Hashing is stable across processes
+(blake2b), so snapshots taken with to_state() restore with from_state().
+"""
+
+import base64
+import heapq
+import zlib
+from array import array
+from collections import deque
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Renormalize the sketch once increments are weighted by more than this
+MAX_SCALE = 2.0 ** 32
+# Half-lives past the epoch at which the scale stops growing: 2.0 ** 1024
+# overflows, and by then every count has decayed to nothing anyway
+MAX_HALF_LIVES = 1000.0
+
+
+# =============================================================================
+# Keyword Automaton
+# =============================================================================
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords, compiled to a full
+    transition table so each input character costs one dict lookup.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({k for k in keywords if k})
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state] = outputs[state] + (keyword,)
+
+        # Breadth-first: each state's transitions extend those of its fail state
+        fail = [0] * len(goto)
+        self._delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self._delta[state] = {**self._delta[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0)
+                queue.append(child)
+        self._outputs = outputs
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(end index, keyword) for every keyword occurrence in text."""
+        delta, outputs, state = self._delta, self._outputs, 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            for keyword in outputs[state]:
+                yield index, keyword
+
+    def matches(self, text: str) -> Set[str]:
+        """Keywords occurring anywhere in text."""
+        return {keyword for _, keyword in self.finditer(text)}
+
+    def contains_any(self, text: str) -> bool:
+        delta, outputs, state = self._delta, self._outputs, 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                return True
+        return False
+
+
+# =============================================================================
+# Decaying Heavy Hitters
+# =============================================================================
+
+def _pack(values: array) -> str:
+    return base64.b64encode(zlib.compress(values.tobytes())).decode()
+
+
+def _unpack(data: str, typecode: str) -> array:
+    values = array(typecode)
+    values.frombytes(zlib.decompress(base64.b64decode(data)))
+    return values
+
+
+class DecayingHeavyHitters:
+    """
+    Time-decayed counts for a stream of keys: a count-min sketch (conservative
+    update) estimates any key's count, and the ``capacity`` keys with the
+    highest estimates are tracked exactly as candidates for "trending".
+    """
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        width: int = 4096,
+        depth: int = 4,
+        half_life_seconds: float = 12 * 3600,
+        now: float = 0.0,
+    ):
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life_seconds
+        self.epoch = now
+        self._table = array("d", bytes(8 * width * depth))
+        self._top: Dict[str, float] = {}  # key -> count in epoch units
+        self._heap: List[Tuple[float, str]] = []
+
+    def _scale(self, now: float) -> float:
+        return 2.0 ** min((now - self.epoch) / self.half_life, MAX_HALF_LIVES)
+
+    def _cells(self, key: str) -> List[int]:
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def _renormalize(self, now: float):
+        scale = self._scale(now)
+        self._table = array("d", (value / scale for value in self._table))
+        self._top = {key: value / scale for key, value in self._top.items()}
+        self._heap = [(value, key) for key, value in self._top.items()]
+        heapq.heapify(self._heap)
+        self.epoch = now
+
+    def add(self, key: str, count: float = 1.0, now: float = 0.0) -> Tuple[float, float, Optional[str]]:
+        """
+        Count ``key`` at time ``now``. Returns its decayed estimate before and
+        after, and the key evicted from the top-k to make room, if any.
+        """
+        scale = self._scale(now)
+        if scale > MAX_SCALE:
+            self._renormalize(now)
+            scale = 1.0
+
+        table = self._table
+        cells = self._cells(key)
+        before = min(table[cell] for cell in cells)
+        after = before + count * scale
+        for cell in cells:
+            if table[cell] < after:
+                table[cell] = after
+
+        evicted = None
+        if key in self._top or len(self._top) < self.capacity:
+            self._track(key, after)
+        else:
+            floor_key, floor_value = self._minimum()
+            if after > floor_value:
+                del self._top[floor_key]
+                evicted = floor_key
+                self._track(key, after)
+        return before / scale, after / scale, evicted
+
+    def _track(self, key: str, value: float):
+        self._top[key] = value
+        heapq.heappush(self._heap, (value, key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(v, k) for k, v in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def _minimum(self) -> Tuple[str, float]:
+        # Heap entries go stale as tracked counts grow; skip those
+        while self._heap[0][1] not in self._top or self._top[self._heap[0][1]] != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        value, key = self._heap[0]
+        return key, value
+
+    def discard(self, key: str):
+        """Stop tracking a key (its sketch counts remain)."""
+        self._top.pop(key, None)
+
+    def estimate(self, key: str, now: float) -> float:
+        """Decayed count estimate for any key (never an underestimate)."""
+        value = self._top.get(key)
+        if value is None:
+            value = min(self._table[cell] for cell in self._cells(key))
+        return value / self._scale(now)
+
+    def top(self, n: Optional[int] = None, now: float = 0.0) -> List[Tuple[str, float]]:
+        """Tracked keys by decayed count, highest first."""
+        scale = self._scale(now)
+        ranked = sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+        return [(key, value / scale) for key, value in ranked[:n]]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._top
+
+    def __len__(self) -> int:
+        return len(self._top)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Compact, JSON-serializable snapshot."""
+        return {
+            "capacity": self.capacity,
+            "width": self.width,
+            "depth": self.depth,
+            "half_life_seconds": self.half_life,
+            "epoch": self.epoch,
+            "table": _pack(self._table),
+            "top": self._top,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "DecayingHeavyHitters":
+        sketch = cls(
+            capacity=state["capacity"],
+            width=state["width"],
+            depth=state["depth"],
+            half_life_seconds=state["half_life_seconds"],
+            now=state["epoch"],
+        )
+        sketch._table = _unpack(state["table"], "d")
+        for key, value in state["top"].items():
+            sketch._track(key, value)
+        return sketch
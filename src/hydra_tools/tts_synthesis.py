@@ -2,12 +2,22 @@
 TTS Synthesis Module for Empire of Broken Queens
 
 Provides voice synthesis using Kokoro TTS with character-specific profiles.
+
+Synthesized audio is stored in a content-addressed on-disk cache keyed by
+(voice, settings, text hash), so rebuilding a chapter only pays for lines
+whose text or voice settings actually changed.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 logger = logging.getLogger(__name__)
@@ -19,6 +29,172 @@ VOICE_PROFILES_PATH = CONFIG_DIR / "empire_voice_profiles.json"
 # Default Kokoro URL
 DEFAULT_KOKORO_URL = "http://192.168.1.244:8880"
 
+# Audio cache configuration
+TTS_CACHE_DIR = Path(os.getenv(
+    "TTS_CACHE_DIR",
+    str(Path(os.getenv("HYDRA_DATA_DIR", "/data")) / "tts_cache")
+))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+
+
+class TTSAudioCache:
+    """Content-addressed on-disk cache for synthesized audio.
+
+    Entries are keyed by a hash of the voice, the synthesis settings and the
+    text, and stored as ``<cache_dir>/<key[:2]>/<key>.audio``. The total size
+    is bounded; least recently used entries are evicted first. Recency is
+    persisted through file mtimes so it survives restarts.
+    """
+
+    SUFFIX = ".audio"
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or TTS_CACHE_DIR)
+        self.max_bytes = TTS_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(voice: str, settings: Dict[str, Any], text: str) -> str:
+        """Build the cache key for a synthesis request."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        material = json.dumps(
+            {"voice": voice, "settings": settings, "text": text_hash},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.SUFFIX}"
+
+    def _ensure_index(self) -> "OrderedDict[str, int]":
+        """Scan the cache directory once, ordering entries oldest-first."""
+        if self._index is None:
+            entries = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob(f"*/*{self.SUFFIX}"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._ensure_index()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for ``key`` or None, marking it recently used.
+
+        Only the index lookup holds the lock; the file is read outside it so
+        concurrent hits do not serialize on disk I/O.
+        """
+        with self._lock:
+            if key not in self._ensure_index():
+                self.misses += 1
+                return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+                self.misses += 1
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store audio for ``key`` and evict old entries beyond the size bound.
+
+        Raises OSError if the cache directory is not writable.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            index = self._ensure_index()
+            if key in index:
+                self._total_bytes -= index.pop(key)
+            index[key] = len(data)
+            self._total_bytes += len(data)
+            victims = self._evict_locked(keep=key)
+        for victim in victims:
+            try:
+                self._path(victim).unlink()
+            except OSError:
+                pass
+
+    def _evict_locked(self, keep: Optional[str] = None) -> List[str]:
+        """Drop LRU entries from the index; returns keys whose files to delete."""
+        index = self._index
+        victims = []
+        while self._total_bytes > self.max_bytes and index:
+            key, size = next(iter(index.items()))
+            if key == keep and len(index) == 1:
+                break
+            index.pop(key)
+            self._total_bytes -= size
+            self.evictions += 1
+            victims.append(key)
+        return victims
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._ensure_index()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(index),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+def _cache_get(cache: TTSAudioCache, key: str) -> Optional[bytes]:
+    """Cache lookup that treats disk errors as a miss."""
+    try:
+        return cache.get(key)
+    except OSError as e:
+        logger.warning(f"TTS cache read failed: {e}")
+        return None
+
+
+def _cache_put(cache: TTSAudioCache, key: str, audio: bytes) -> None:
+    """Cache store that logs and ignores disk errors."""
+    try:
+        cache.put(key, audio)
+    except OSError as e:
+        logger.warning(f"TTS cache write failed: {e}")
+
+
+def _write_audio(output_path: str, audio: bytes) -> None:
+    """Write audio to ``output_path``, creating parent directories."""
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(audio)
+
 
 class VoiceProfileManager:
     """Manages voice profiles for characters."""
@@ -84,10 +260,12 @@ class TTSSynthesizer:
     def __init__(
         self,
         kokoro_url: Optional[str] = None,
-        profile_manager: Optional[VoiceProfileManager] = None
+        profile_manager: Optional[VoiceProfileManager] = None,
+        cache: Optional[TTSAudioCache] = None
     ):
         self.kokoro_url = kokoro_url or DEFAULT_KOKORO_URL
         self.profile_manager = profile_manager or VoiceProfileManager()
+        self.cache = cache if cache is not None else get_tts_cache()
         self.client = httpx.Client(timeout=60.0)
 
     def synthesize(
@@ -116,6 +294,15 @@ class TTSSynthesizer:
             "voice": settings["voice_id"],
             "speed": settings["speed"]
         }
+        cache_key = TTSAudioCache.make_key(
+            settings["voice_id"], {"speed": settings["speed"]}, text
+        )
+
+        cached = _cache_get(self.cache, cache_key)
+        if cached is not None:
+            if output_path:
+                _write_audio(output_path, cached)
+            return cached
 
         try:
             response = self.client.post(
@@ -129,11 +316,10 @@ class TTSSynthesizer:
                     f"Synthesized {len(audio_data)} bytes for "
                     f"{settings['display_name']} ({emotion})"
                 )
+                _cache_put(self.cache, cache_key, audio_data)
 
                 if output_path:
-                    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                    with open(output_path, "wb") as f:
-                        f.write(audio_data)
+                    _write_audio(output_path, audio_data)
                     logger.info(f"Saved audio to {output_path}")
 
                 return audio_data
@@ -187,6 +373,248 @@ class TTSSynthesizer:
         return []
 
 
+class TTSService:
+    """Async TTS service layer over Kokoro.
+
+    Every line is resolved to a content-addressed cache key before synthesis.
+    Batches are deduplicated by key, identical in-flight requests share one
+    HTTP call, and network synthesis runs with bounded concurrency.
+    """
+
+    def __init__(
+        self,
+        kokoro_url: Optional[str] = None,
+        profile_manager: Optional[VoiceProfileManager] = None,
+        cache: Optional[TTSAudioCache] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        self.kokoro_url = kokoro_url or DEFAULT_KOKORO_URL
+        self.profile_manager = profile_manager or VoiceProfileManager()
+        self.cache = cache if cache is not None else get_tts_cache()
+        self.max_concurrency = max_concurrency or TTS_MAX_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, "asyncio.Task[Optional[bytes]]"] = {}
+        self._stats = {
+            "lines_requested": 0,
+            "lines_deduplicated": 0,
+            "lines_unchanged": 0,
+            "cache_hits": 0,
+            "synthesized": 0,
+            "failed": 0,
+            "synthesis_seconds": 0.0,
+        }
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=60.0)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def prepare(self, line: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve a dialogue line into a synthesis request with its cache key.
+
+        A line either names an explicit ``voice_id`` (with optional ``speed``,
+        ``model`` and ``response_format``) or a ``character`` and ``emotion``
+        that are resolved through the voice profiles.
+        """
+        text = line.get("text", "")
+        if line.get("voice_id"):
+            voice = line["voice_id"]
+            speed = float(line.get("speed", 1.0))
+        else:
+            profile = self.profile_manager.get_voice_settings(
+                line.get("character", "narrator"), line.get("emotion", "neutral")
+            )
+            voice = profile["voice_id"]
+            speed = float(line.get("speed", profile["speed"]))
+
+        settings: Dict[str, Any] = {"speed": speed}
+        for option in ("model", "response_format"):
+            if line.get(option):
+                settings[option] = line[option]
+
+        return {
+            "text": text,
+            "voice": voice,
+            "settings": settings,
+            "key": TTSAudioCache.make_key(voice, settings, text),
+            "output_path": line.get("output_path"),
+        }
+
+    async def _fetch(self, request: Dict[str, Any]) -> Optional[bytes]:
+        payload = {"input": request["text"], "voice": request["voice"], **request["settings"]}
+        async with self._semaphore:
+            start = time.monotonic()
+            try:
+                response = await self._get_client().post(
+                    f"{self.kokoro_url}/v1/audio/speech",
+                    json=payload
+                )
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+                return None
+            finally:
+                self._stats["synthesis_seconds"] += time.monotonic() - start
+
+        if response.status_code != 200:
+            logger.error(f"TTS failed: {response.status_code} - {response.text}")
+            return None
+        return response.content
+
+    async def synthesize_request(self, request: Dict[str, Any]) -> Tuple[Optional[bytes], str]:
+        """Synthesize a prepared request.
+
+        Returns ``(audio, status)`` where status is "cached", "generated"
+        or "failed".
+        """
+        key = request["key"]
+        cached = await asyncio.to_thread(_cache_get, self.cache, key)
+        if cached is not None:
+            self._stats["cache_hits"] += 1
+            return cached, "cached"
+
+        # Single-flight: concurrent callers for the same key share one task
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize_uncached(request))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        audio = await asyncio.shield(task)
+        return audio, "generated" if audio else "failed"
+
+    async def _synthesize_uncached(self, request: Dict[str, Any]) -> Optional[bytes]:
+        audio = await self._fetch(request)
+        if audio:
+            # A cache write failure must not discard audio we already have
+            await asyncio.to_thread(_cache_put, self.cache, request["key"], audio)
+            self._stats["synthesized"] += 1
+        else:
+            self._stats["failed"] += 1
+        return audio
+
+    async def synthesize(
+        self,
+        text: str,
+        character_name: str,
+        emotion: str = "neutral",
+        output_path: Optional[str] = None
+    ) -> Optional[bytes]:
+        """Synthesize speech for a character, using the audio cache."""
+        request = self.prepare({"text": text, "character": character_name, "emotion": emotion})
+        self._stats["lines_requested"] += 1
+        audio, _ = await self.synthesize_request(request)
+        if audio and output_path:
+            await asyncio.to_thread(_write_audio, output_path, audio)
+        return audio
+
+    async def synthesize_batch(
+        self,
+        lines: List[Dict[str, Any]],
+        previous_keys: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Synthesize a batch of dialogue lines.
+
+        Lines with identical cache keys are synthesized once. When
+        ``previous_keys`` maps output paths to the cache key they were last
+        written with, lines whose output file still exists with the same key
+        are reported as "unchanged" and not touched at all.
+
+        Returns one result dict per input line, in order.
+        """
+        previous_keys = previous_keys or {}
+        requests = [self.prepare(line) for line in lines]
+        self._stats["lines_requested"] += len(requests)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for i, request in enumerate(requests):
+            output_path = request["output_path"]
+            if not request["text"]:
+                results[i] = {"index": i, "status": "failed", "error": "Empty text",
+                              "output_path": output_path}
+                continue
+            if (output_path and previous_keys.get(output_path) == request["key"]
+                    and Path(output_path).exists()):
+                self._stats["lines_unchanged"] += 1
+                results[i] = {"index": i, "status": "unchanged", "cache_key": request["key"],
+                              "output_path": output_path}
+                continue
+            if request["key"] in pending:
+                self._stats["lines_deduplicated"] += 1
+            pending.setdefault(request["key"], request)
+
+        outcomes = await asyncio.gather(
+            *(self.synthesize_request(request) for request in pending.values())
+        )
+        by_key = dict(zip(pending.keys(), outcomes))
+
+        for i, request in enumerate(requests):
+            if results[i] is not None:
+                continue
+            audio, status = by_key[request["key"]]
+            output_path = request["output_path"]
+            result: Dict[str, Any] = {
+                "index": i,
+                "status": status,
+                "cache_key": request["key"],
+                "output_path": output_path,
+            }
+            if audio is None:
+                result["error"] = "Synthesis failed"
+            elif output_path:
+                try:
+                    await asyncio.to_thread(_write_audio, output_path, audio)
+                except OSError as e:
+                    result.update(status="failed", error=str(e))
+            results[i] = result
+
+        return results
+
+    async def get_available_voices(self) -> list[str]:
+        """Get list of available Kokoro voices."""
+        try:
+            response = await self._get_client().get(f"{self.kokoro_url}/v1/audio/voices")
+            if response.status_code == 200:
+                return response.json().get("voices", [])
+        except Exception as e:
+            logger.error(f"Error getting voices: {e}")
+        return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "synthesis_seconds": round(self._stats["synthesis_seconds"], 3),
+            "max_concurrency": self.max_concurrency,
+            "cache": self.cache.stats(),
+        }
+
+
+# Global instances
+_tts_cache: Optional[TTSAudioCache] = None
+_tts_service: Optional[TTSService] = None
+
+
+def get_tts_cache() -> TTSAudioCache:
+    """Get or create the shared TTS audio cache."""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSAudioCache()
+    return _tts_cache
+
+
+def get_tts_service() -> TTSService:
+    """Get or create the shared TTS service."""
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TTSService()
+    return _tts_service
+
+
 # FastAPI router
 def create_tts_router():
     """Create FastAPI router for TTS endpoints."""
@@ -195,7 +623,7 @@ def create_tts_router():
     from pydantic import BaseModel
 
     router = APIRouter(prefix="/tts", tags=["tts"])
-    synthesizer = TTSSynthesizer()
+    service = get_tts_service()
 
     class SynthesizeRequest(BaseModel):
         text: str
@@ -209,16 +637,16 @@ def create_tts_router():
     @router.get("/voices")
     async def list_voices():
         """List available Kokoro voices."""
-        voices = synthesizer.get_available_voices()
+        voices = await service.get_available_voices()
         return {"voices": voices}
 
     @router.get("/characters")
     async def list_characters():
         """List configured character voice profiles."""
-        characters = synthesizer.profile_manager.list_characters()
+        characters = service.profile_manager.list_characters()
         profiles = []
         for char in characters:
-            profile = synthesizer.profile_manager.get_character_profile(char)
+            profile = service.profile_manager.get_character_profile(char)
             profiles.append({
                 "name": char,
                 "display_name": profile.get("display_name", char),
@@ -230,7 +658,7 @@ def create_tts_router():
     @router.post("/synthesize")
     async def synthesize_speech(request: SynthesizeRequest):
         """Synthesize speech and return audio."""
-        audio = synthesizer.synthesize(
+        audio = await service.synthesize(
             text=request.text,
             character_name=request.character,
             emotion=request.emotion
@@ -249,18 +677,32 @@ def create_tts_router():
 
     @router.post("/batch")
     async def synthesize_batch(request: DialogueBatchRequest):
-        """Synthesize a batch of dialogues."""
-        results = []
+        """Synthesize a batch of dialogues.
+
+        Repeated lines are synthesized once and previously generated audio is
+        served from the cache. Output files are named by cache key.
+        """
+        lines = []
         for dialogue in request.dialogues:
-            output_path = synthesizer.synthesize_dialogue(
-                dialogue,
-                request.output_dir
+            line = dict(dialogue)
+            line.setdefault("character", "narrator")
+            line.setdefault("emotion", "neutral")
+            key = service.prepare(line)["key"]
+            line["output_path"] = str(
+                Path(request.output_dir) / f"{line['character']}_{line['emotion']}_{key[:16]}.wav"
             )
+            lines.append(line)
+
+        batch = await service.synthesize_batch(lines)
+        results = []
+        for dialogue, result in zip(request.dialogues, batch):
+            success = result["status"] in ("cached", "generated")
             results.append({
                 "character": dialogue.get("character"),
                 "emotion": dialogue.get("emotion"),
-                "success": output_path is not None,
-                "output_path": output_path
+                "success": success,
+                "status": result["status"],
+                "output_path": result["output_path"] if success else None
             })
 
         success_count = sum(1 for r in results if r["success"])
@@ -271,4 +713,9 @@ def create_tts_router():
             "results": results
         }
 
+    @router.get("/cache/stats")
+    async def cache_stats():
+        """TTS cache and synthesis statistics."""
+        return service.get_stats()
+
     return router
@@ -73,9 +73,6 @@ def load_saved_credentials() -> None:
         logger.error(f"Failed to load saved credentials: {e}")
 
 
-# Load saved credentials on module import
-load_saved_credentials()
-
 
 # =============================================================================
 # Data Models
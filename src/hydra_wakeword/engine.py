@@ -0,0 +1,520 @@
+"""
+Wake word capture and inference engine.
+
+Audio capture and model inference run off the asyncio event loop:
+
+- Each audio stream owns a single-producer/single-consumer ring buffer of
+  fixed-size PCM frames. Blocking sources (local microphone, WAV replay) are
+  read by a dedicated capture thread; push sources (PCM streamed over
+  WebSocket from satellite rooms) are fed directly by the receiving handler.
+- One inference worker thread drains one frame per stream per tick and
+  scores all of them in a single predictor call.
+- Detections are handed to a callback, which the service uses to hop back
+  onto the event loop.
+
+Per-stream counters report captured, dropped and processed frames along with
+capture-to-score latency.
+"""
+
+import logging
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("hydra-wakeword.engine")
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 1280  # 80ms at 16kHz
+BYTES_PER_SAMPLE = 2  # int16 PCM
+
+
+class FrameRingBuffer:
+    """Lock-free single-producer/single-consumer ring buffer of PCM frames.
+
+    The producer only advances ``_write`` and the consumer only advances
+    ``_read``; each index is published after the slot it guards has been
+    written, so no lock is needed between one capture thread and the
+    inference worker. When the buffer is full new frames are dropped and
+    counted rather than blocking the producer.
+    """
+
+    def __init__(self, capacity: int, frame_samples: int = FRAME_SAMPLES):
+        self.capacity = capacity
+        self.frame_samples = frame_samples
+        self._frames = np.zeros((capacity, frame_samples), dtype=np.int16)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._write = 0
+        self._read = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    def push(self, frame: np.ndarray, timestamp: float) -> bool:
+        """Append a frame. Returns False (and counts a drop) when full."""
+        if self._write - self._read >= self.capacity:
+            self.dropped += 1
+            return False
+        slot = self._write % self.capacity
+        n = min(len(frame), self.frame_samples)
+        self._frames[slot, :n] = frame[:n]
+        if n < self.frame_samples:
+            self._frames[slot, n:] = 0
+        self._timestamps[slot] = timestamp
+        self._write += 1
+        return True
+
+    def pop(self) -> Optional[Tuple[np.ndarray, float]]:
+        """Remove the oldest frame, returning (frame, capture_timestamp)."""
+        if self._read == self._write:
+            return None
+        slot = self._read % self.capacity
+        frame = self._frames[slot].copy()
+        timestamp = float(self._timestamps[slot])
+        self._read += 1
+        return frame, timestamp
+
+
+# =============================================================================
+# Audio Sources
+# =============================================================================
+
+class AudioSource(ABC):
+    """Blocking audio source read by a capture thread.
+
+    Sources produce 16kHz mono int16 PCM. ``read`` returns None at end of
+    stream.
+    """
+
+    kind = "source"
+
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def read(self, frame_samples: int) -> Optional[bytes]:
+        """Block until ``frame_samples`` samples are read; None at end of stream."""
+
+    def close(self) -> None:
+        pass
+
+
+class MicrophoneSource(AudioSource):
+    """Local microphone via PyAudio."""
+
+    kind = "microphone"
+
+    def __init__(self, device_index: Optional[int] = None):
+        self.device_index = device_index
+        self._audio = None
+        self._stream = None
+
+    def open(self) -> None:
+        import pyaudio
+
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=SAMPLE_RATE,
+            input=True,
+            frames_per_buffer=FRAME_SAMPLES,
+            input_device_index=self.device_index
+        )
+
+    def read(self, frame_samples: int) -> Optional[bytes]:
+        return self._stream.read(frame_samples, exception_on_overflow=False)
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+
+
+class WavFileSource(AudioSource):
+    """Replay a 16kHz mono 16-bit WAV file, for testing and diagnostics."""
+
+    kind = "wav"
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False):
+        self.path = Path(path)
+        self.realtime = realtime
+        self.loop = loop
+        self._wav: Optional[wave.Wave_read] = None
+        self._next_frame_at = 0.0
+
+    def open(self) -> None:
+        self._wav = wave.open(str(self.path), "rb")
+        if (self._wav.getframerate() != SAMPLE_RATE or self._wav.getnchannels() != 1
+                or self._wav.getsampwidth() != BYTES_PER_SAMPLE):
+            self._wav.close()
+            self._wav = None
+            raise ValueError(f"{self.path}: expected 16kHz mono 16-bit PCM")
+        self._next_frame_at = time.monotonic()
+
+    def read(self, frame_samples: int) -> Optional[bytes]:
+        data = self._wav.readframes(frame_samples)
+        if not data and self.loop:
+            self._wav.rewind()
+            data = self._wav.readframes(frame_samples)
+        if not data:
+            return None
+        if self.realtime:
+            self._next_frame_at += frame_samples / SAMPLE_RATE
+            delay = self._next_frame_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+# =============================================================================
+# Streams
+# =============================================================================
+
+@dataclass
+class StreamStats:
+    """Counters for one audio stream."""
+    frames_captured: int = 0
+    frames_processed: int = 0
+    detections: int = 0
+    last_score: float = 0.0
+
+
+class AudioStream:
+    """One audio input: a ring buffer plus either a capture thread or push feed."""
+
+    def __init__(
+        self,
+        stream_id: str,
+        source: Optional[AudioSource] = None,
+        ring_capacity: int = 64,
+        frame_samples: int = FRAME_SAMPLES
+    ):
+        self.stream_id = stream_id
+        self.source = source
+        self.kind = source.kind if source else "push"
+        self.frame_samples = frame_samples
+        self.ring = FrameRingBuffer(ring_capacity, frame_samples)
+        self.stats = StreamStats()
+        self.started_at: Optional[datetime] = None
+        self.ended = False
+        self.error: Optional[str] = None
+        self._latencies: deque = deque(maxlen=500)
+        self._pending = bytearray()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.last_detection_at = 0.0
+
+    def start(self) -> None:
+        self._running = True
+        self.started_at = datetime.now()
+        if self.source is not None:
+            self._thread = threading.Thread(
+                target=self._capture_loop,
+                name=f"wakeword-capture-{self.stream_id}",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _capture_loop(self) -> None:
+        try:
+            self.source.open()
+            while self._running:
+                data = self.source.read(self.frame_samples)
+                if data is None:
+                    break
+                self._push_frame(np.frombuffer(data, dtype=np.int16))
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Capture error on stream {self.stream_id}: {e}")
+        finally:
+            try:
+                self.source.close()
+            except Exception as e:
+                logger.debug(f"Error closing source {self.stream_id}: {e}")
+            self.ended = True
+
+    def _push_frame(self, frame: np.ndarray) -> None:
+        self.stats.frames_captured += 1
+        self.ring.push(frame, time.monotonic())
+
+    def feed(self, pcm: bytes) -> int:
+        """Feed raw int16 PCM (push streams). Returns complete frames queued."""
+        self._pending.extend(pcm)
+        frame_bytes = self.frame_samples * BYTES_PER_SAMPLE
+        count = 0
+        while len(self._pending) >= frame_bytes:
+            chunk = bytes(self._pending[:frame_bytes])
+            del self._pending[:frame_bytes]
+            self._push_frame(np.frombuffer(chunk, dtype=np.int16))
+            count += 1
+        return count
+
+    def record_processed(self, latency_s: float, score: float) -> None:
+        self.stats.frames_processed += 1
+        self.stats.last_score = score
+        self._latencies.append(latency_s)
+
+    @property
+    def drained(self) -> bool:
+        return self.ended and len(self.ring) == 0
+
+    def get_stats(self) -> Dict:
+        latencies = sorted(self._latencies)
+        if latencies:
+            latency = {
+                "avg_ms": round(1000 * sum(latencies) / len(latencies), 2),
+                "p95_ms": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2),
+                "max_ms": round(1000 * latencies[-1], 2),
+            }
+        else:
+            latency = {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "stream_id": self.stream_id,
+            "kind": self.kind,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "ended": self.ended,
+            "error": self.error,
+            "frames_captured": self.stats.frames_captured,
+            "frames_dropped": self.ring.dropped,
+            "frames_processed": self.stats.frames_processed,
+            "buffered_frames": len(self.ring),
+            "detections": self.stats.detections,
+            "last_score": round(self.stats.last_score, 4),
+            "latency": latency,
+        }
+
+
+# =============================================================================
+# Predictors
+# =============================================================================
+
+class WakeWordPredictor(ABC):
+    """Scores the pending frame of every stream once per inference tick."""
+
+    def add_stream(self, stream_id: str) -> None:
+        """Prepare per-stream state; called before the stream is registered."""
+
+    @abstractmethod
+    def predict_batch(self, frames: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        """Return ``{stream_id: {model_name: confidence}}``."""
+
+    def remove_stream(self, stream_id: str) -> None:
+        pass
+
+
+class OpenWakeWordPredictor(WakeWordPredictor):
+    """openWakeWord predictor.
+
+    openWakeWord's streaming API keeps feature buffers inside the ``Model``
+    instance, so each stream gets its own model, built in ``add_stream`` on the
+    caller's thread. ``predict_batch`` is a serial loop over those models on
+    the inference thread, not a single batched model call.
+    """
+
+    def __init__(self, wakeword_model: str, inference_framework: str = "onnx"):
+        from openwakeword import Model
+
+        self._model_cls = Model
+        self.wakeword_model = wakeword_model
+        self.inference_framework = inference_framework
+        self._models: Dict[str, object] = {}
+
+    def add_stream(self, stream_id: str) -> None:
+        if stream_id not in self._models:
+            self._models[stream_id] = self._model_cls(
+                wakeword_models=[self.wakeword_model],
+                inference_framework=self.inference_framework
+            )
+
+    def predict_batch(self, frames: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        scores = {}
+        for stream_id, frame in frames.items():
+            model = self._models.get(stream_id)
+            if model is None:
+                # Stream was removed after its frame was popped
+                continue
+            scores[stream_id] = dict(model.predict(frame))
+        return scores
+
+    def remove_stream(self, stream_id: str) -> None:
+        self._models.pop(stream_id, None)
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+@dataclass
+class DetectionEvent:
+    """A wake word detection on one stream."""
+    stream_id: str
+    model: str
+    confidence: float
+    timestamp: datetime
+    latency_ms: float
+
+
+class WakeWordEngine:
+    """Runs capture threads and a batched inference worker across streams."""
+
+    def __init__(
+        self,
+        predictor: WakeWordPredictor,
+        threshold: float = 0.5,
+        cooldown_seconds: float = 2.0,
+        on_detection: Optional[Callable[[DetectionEvent], None]] = None,
+        idle_sleep: float = 0.005
+    ):
+        self.predictor = predictor
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.on_detection = on_detection
+        self.idle_sleep = idle_sleep
+        self._streams: Dict[str, AudioStream] = {}
+        self._streams_lock = threading.Lock()
+        self._running = False
+        self._worker: Optional[threading.Thread] = None
+        self.batches = 0
+        self.inference_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def add_stream(self, stream: AudioStream) -> AudioStream:
+        with self._streams_lock:
+            if stream.stream_id in self._streams:
+                raise ValueError(f"Stream already exists: {stream.stream_id}")
+        # Model setup can be slow, so keep it out of the lock the inference
+        # thread takes every tick
+        self.predictor.add_stream(stream.stream_id)
+        with self._streams_lock:
+            if stream.stream_id in self._streams:
+                raise ValueError(f"Stream already exists: {stream.stream_id}")
+            self._streams[stream.stream_id] = stream
+        stream.start()
+        logger.info(f"Added {stream.kind} stream {stream.stream_id}")
+        return stream
+
+    def remove_stream(self, stream_id: str) -> Optional[AudioStream]:
+        with self._streams_lock:
+            stream = self._streams.pop(stream_id, None)
+        if stream is not None:
+            stream.stop()
+            self.predictor.remove_stream(stream_id)
+            logger.info(f"Removed stream {stream_id}")
+        return stream
+
+    def get_stream(self, stream_id: str) -> Optional[AudioStream]:
+        return self._streams.get(stream_id)
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._worker = threading.Thread(
+            target=self._inference_loop, name="wakeword-inference", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._running = False
+        for stream_id in list(self._streams):
+            self.remove_stream(stream_id)
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+
+    def process_once(self) -> int:
+        """Score at most one pending frame per stream. Returns frames scored."""
+        with self._streams_lock:
+            streams = list(self._streams.values())
+
+        frames: Dict[str, np.ndarray] = {}
+        captured_at: Dict[str, float] = {}
+        for stream in streams:
+            item = stream.ring.pop()
+            if item is not None:
+                frames[stream.stream_id], captured_at[stream.stream_id] = item
+        if not frames:
+            return 0
+
+        start = time.monotonic()
+        predictions = self.predictor.predict_batch(frames)
+        now = time.monotonic()
+        self.batches += 1
+        self.inference_seconds += now - start
+
+        for stream_id, scores in predictions.items():
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                continue
+            latency = now - captured_at[stream_id]
+            best_model, best_score = max(scores.items(), key=lambda kv: kv[1], default=("", 0.0))
+            stream.record_processed(latency, float(best_score))
+
+            if best_score < self.threshold:
+                continue
+            if now - stream.last_detection_at < self.cooldown_seconds:
+                continue
+            stream.last_detection_at = now
+            stream.stats.detections += 1
+            event = DetectionEvent(
+                stream_id=stream_id,
+                model=best_model,
+                confidence=float(best_score),
+                timestamp=datetime.now(),
+                latency_ms=round(latency * 1000, 2)
+            )
+            if self.on_detection is not None:
+                try:
+                    self.on_detection(event)
+                except Exception as e:
+                    logger.error(f"Detection callback failed: {e}")
+        return len(frames)
+
+    def _inference_loop(self) -> None:
+        while self._running:
+            try:
+                if self.process_once() == 0:
+                    time.sleep(self.idle_sleep)
+            except Exception as e:
+                logger.error(f"Inference error: {e}")
+                time.sleep(self.idle_sleep)
+
+    def get_stats(self) -> Dict:
+        with self._streams_lock:
+            streams = list(self._streams.values())
+        return {
+            "running": self._running,
+            "batches": self.batches,
+            "avg_batch_ms": round(1000 * self.inference_seconds / self.batches, 3) if self.batches else 0.0,
+            "streams": [stream.get_stats() for stream in streams],
+        }
+
+    def stream_ids(self) -> List[str]:
+        return list(self._streams)
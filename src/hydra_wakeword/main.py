@@ -9,13 +9,22 @@ API Endpoints:
     GET  /status          - Detection status
     POST /start           - Start listening
     POST /stop            - Stop listening
+    GET  /streams         - Per-stream capture/inference statistics
+    POST /streams/wav     - Add a WAV replay source
+    DELETE /streams/{id}  - Remove an audio stream
     WS   /ws/events       - WebSocket for wake events
+    WS   /ws/audio/{id}   - Stream 16kHz mono int16 PCM from a satellite room
+
+Audio capture and inference run in dedicated threads (see engine.py), so the
+event loop only handles HTTP, WebSocket traffic and detection dispatch.
 
 Configuration via environment:
     WAKE_WORD_MODEL: Wake word model name (default: "hey_jarvis")
     DETECTION_THRESHOLD: Confidence threshold 0-1 (default: 0.5)
     VOICE_API_URL: Voice interface URL to notify (default: http://192.168.1.244:8850)
     AUDIO_DEVICE: Audio input device index (default: -1 for default)
+    LOCAL_MICROPHONE: Capture from the local microphone (default: true)
+    RING_BUFFER_FRAMES: Per-stream ring buffer capacity in 80ms frames (default: 64)
 """
 
 import os
@@ -45,6 +54,8 @@ class Config:
     VOICE_API_URL = os.environ.get("VOICE_API_URL", "http://192.168.1.244:8850")
     AUDIO_DEVICE = int(os.environ.get("AUDIO_DEVICE", "-1"))
     COOLDOWN_SECONDS = float(os.environ.get("COOLDOWN_SECONDS", "2.0"))
+    LOCAL_MICROPHONE = os.environ.get("LOCAL_MICROPHONE", "true").lower() == "true"
+    RING_BUFFER_FRAMES = int(os.environ.get("RING_BUFFER_FRAMES", "64"))
 
 
 class DetectionStatus(BaseModel):
@@ -61,6 +72,16 @@ class WakeEvent(BaseModel):
     timestamp: datetime
     confidence: float
     model: str
+    stream: str = "local"
+    latency_ms: Optional[float] = None
+
+
+class WavSourceRequest(BaseModel):
+    """Request to replay a WAV file as an audio stream."""
+    stream_id: str
+    path: str
+    realtime: bool = True
+    loop: bool = False
 
 
 # Global state
@@ -71,7 +92,7 @@ detection_status = DetectionStatus(
 )
 websocket_clients: Set[WebSocket] = set()
 detection_task: Optional[asyncio.Task] = None
-last_detection_time: Optional[datetime] = None
+engine = None  # WakeWordEngine when audio dependencies are available
 
 
 @asynccontextmanager
@@ -144,106 +165,103 @@ async def broadcast_event(event: WakeEvent):
     websocket_clients.difference_update(disconnected)
 
 
-async def detection_loop():
-    """
-    Main wake word detection loop.
+def load_engine_module():
+    """Import engine.py as a package module or, in the container, top-level."""
+    if __package__:
+        from . import engine as engine_module
+    else:
+        import engine as engine_module
+    return engine_module
 
-    Uses openWakeWord for detection. Falls back to simulated
-    detection if audio dependencies not available.
-    """
-    global detection_status, last_detection_time
 
+def create_engine(on_detection):
+    """Create the capture/inference engine.
+
+    Returns None when numpy or openWakeWord are not installed, in which case
+    the service runs in simulation mode.
+    """
     try:
-        # Try to import audio dependencies
-        import numpy as np
+        engine_module = load_engine_module()
+        predictor = engine_module.OpenWakeWordPredictor(Config.WAKE_WORD_MODEL)
+    except ImportError as e:
+        logger.warning(f"Audio dependencies not available: {e}")
+        logger.info("Running in simulation mode (no actual detection)")
+        return None
+
+    wake_engine = engine_module.WakeWordEngine(
+        predictor,
+        threshold=Config.DETECTION_THRESHOLD,
+        cooldown_seconds=Config.COOLDOWN_SECONDS,
+        on_detection=on_detection
+    )
 
+    if Config.LOCAL_MICROPHONE:
         try:
-            from openwakeword import Model
-            import pyaudio
-
-            # Initialize PyAudio
-            audio = pyaudio.PyAudio()
-
-            # Get audio device
+            import pyaudio  # noqa: F401
             device_index = Config.AUDIO_DEVICE if Config.AUDIO_DEVICE >= 0 else None
+            wake_engine.add_stream(engine_module.AudioStream(
+                "local",
+                engine_module.MicrophoneSource(device_index),
+                ring_capacity=Config.RING_BUFFER_FRAMES
+            ))
+        except ImportError as e:
+            logger.warning(f"Local microphone unavailable ({e}); accepting remote streams only")
 
-            # Initialize wake word model
-            oww_model = Model(
-                wakeword_models=[Config.WAKE_WORD_MODEL],
-                inference_framework='onnx'
-            )
-
-            # Audio stream parameters
-            CHUNK = 1280  # 80ms at 16kHz
-            FORMAT = pyaudio.paInt16
-            CHANNELS = 1
-            RATE = 16000
-
-            stream = audio.open(
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=RATE,
-                input=True,
-                frames_per_buffer=CHUNK,
-                input_device_index=device_index
-            )
-
-            logger.info("Audio stream opened, listening for wake word...")
-
-            while detection_status.listening:
-                # Read audio chunk
-                audio_data = stream.read(CHUNK, exception_on_overflow=False)
-                audio_array = np.frombuffer(audio_data, dtype=np.int16)
-
-                # Run wake word detection
-                predictions = oww_model.predict(audio_array)
-
-                # Check for wake word
-                for model_name, confidence in predictions.items():
-                    if confidence >= Config.DETECTION_THRESHOLD:
-                        # Check cooldown
-                        now = datetime.now()
-                        if last_detection_time:
-                            elapsed = (now - last_detection_time).total_seconds()
-                            if elapsed < Config.COOLDOWN_SECONDS:
-                                continue
+    return wake_engine
 
-                        # Wake word detected!
-                        last_detection_time = now
-                        detection_status.last_detection = now
-                        detection_status.total_detections += 1
 
-                        logger.info(f"Wake word detected! Confidence: {confidence:.3f}")
+async def detection_loop():
+    """
+    Dispatch wake word detections on the event loop.
 
-                        event = WakeEvent(
-                            timestamp=now,
-                            confidence=confidence,
-                            model=model_name
-                        )
+    Capture and inference run in engine threads; detections are handed over
+    through an asyncio queue and fanned out to the voice API and WebSocket
+    clients here.
+    """
+    global engine
 
-                        # Notify voice API and broadcast to clients
-                        await notify_voice_api(event)
-                        await broadcast_event(event)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
 
-                await asyncio.sleep(0.01)  # Small yield
+    def on_detection(detection):
+        loop.call_soon_threadsafe(events.put_nowait, detection)
 
-            # Cleanup
-            stream.stop_stream()
-            stream.close()
-            audio.terminate()
+    engine = create_engine(on_detection)
+    if engine is None:
+        # Simulation mode - just keep running
+        while detection_status.listening:
+            await asyncio.sleep(1.0)
+        return
 
-        except ImportError as e:
-            logger.warning(f"Audio dependencies not available: {e}")
-            logger.info("Running in simulation mode (no actual detection)")
+    engine.start()
+    logger.info("Wake word engine started, listening for wake word...")
 
-            # Simulation mode - just keep running
-            while detection_status.listening:
-                await asyncio.sleep(1.0)
+    try:
+        while detection_status.listening:
+            detection = await events.get()
+
+            detection_status.last_detection = detection.timestamp
+            detection_status.total_detections += 1
+            logger.info(
+                f"Wake word detected on {detection.stream_id}! "
+                f"Confidence: {detection.confidence:.3f} ({detection.latency_ms}ms)"
+            )
 
+            event = WakeEvent(
+                timestamp=detection.timestamp,
+                confidence=detection.confidence,
+                model=detection.model,
+                stream=detection.stream_id,
+                latency_ms=detection.latency_ms
+            )
+            await asyncio.gather(notify_voice_api(event), broadcast_event(event))
     except Exception as e:
         logger.error(f"Detection loop error: {e}")
         detection_status.listening = False
         raise
+    finally:
+        await asyncio.to_thread(engine.stop)
+        engine = None
 
 
 async def start_detection():
@@ -278,6 +296,13 @@ async def stop_detection():
     logger.info("Wake word detection stopped")
 
 
+def require_engine():
+    """Return the running engine or raise 503."""
+    if engine is None:
+        raise HTTPException(status_code=503, detail="Wake word engine not running")
+    return engine
+
+
 # API Endpoints
 
 @app.get("/health")
@@ -311,6 +336,42 @@ async def stop():
     return {"status": "stopped"}
 
 
+@app.get("/streams")
+async def list_streams():
+    """Per-stream capture, drop and latency statistics."""
+    if engine is None:
+        return {"running": False, "streams": []}
+    return engine.get_stats()
+
+
+@app.post("/streams/wav")
+async def add_wav_stream(request: WavSourceRequest):
+    """Replay a 16kHz mono WAV file through the detection engine."""
+    wake_engine = require_engine()
+    engine_module = load_engine_module()
+    if not os.path.exists(request.path):
+        raise HTTPException(status_code=404, detail=f"File not found: {request.path}")
+    try:
+        await asyncio.to_thread(wake_engine.add_stream, engine_module.AudioStream(
+            request.stream_id,
+            engine_module.WavFileSource(request.path, realtime=request.realtime, loop=request.loop),
+            ring_capacity=Config.RING_BUFFER_FRAMES
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": "added", "stream_id": request.stream_id}
+
+
+@app.delete("/streams/{stream_id}")
+async def remove_stream(stream_id: str):
+    """Remove an audio stream."""
+    wake_engine = require_engine()
+    stream = await asyncio.to_thread(wake_engine.remove_stream, stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Stream not found: {stream_id}")
+    return {"status": "removed", "stream": stream.get_stats()}
+
+
 @app.post("/test")
 async def test_detection():
     """Simulate a wake word detection for testing."""
@@ -365,6 +426,36 @@ async def websocket_events(websocket: WebSocket):
         logger.info(f"WebSocket client disconnected. Total: {len(websocket_clients)}")
 
 
+@app.websocket("/ws/audio/{stream_id}")
+async def websocket_audio(websocket: WebSocket, stream_id: str):
+    """Receive 16kHz mono int16 PCM from a satellite and run detection on it."""
+    await websocket.accept()
+    # Keep the engine this stream joins; the global may be replaced on restart
+    wake_engine = engine
+    if wake_engine is None:
+        await websocket.close(code=1013, reason="Wake word engine not running")
+        return
+
+    engine_module = load_engine_module()
+    try:
+        stream = await asyncio.to_thread(
+            wake_engine.add_stream,
+            engine_module.AudioStream(stream_id, ring_capacity=Config.RING_BUFFER_FRAMES)
+        )
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    try:
+        while True:
+            pcm = await websocket.receive_bytes()
+            stream.feed(pcm)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await asyncio.to_thread(wake_engine.remove_stream, stream_id)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8860)
@@ -0,0 +1,175 @@
+"""
+In-process fake of the Docker Engine API endpoints used by the sandbox.
+
+Served to AsyncDockerClient through httpx.ASGITransport. Containers are
+records; a command whose last argument is a file under the /sandbox bind
+mount is actually run on the host with the file read from the bind source
+(``python`` maps to the current interpreter), anything else (idle loops,
+reset scripts) is only recorded. ``latency`` adds a delay per operation to
+stand in for a real daemon.
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from hydra_tools.sandbox_pool import DOCKER_API_VERSION
+
+
+def frame(stream: int, payload: bytes) -> bytes:
+    """One multiplexed stream frame."""
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+class FakeDocker:
+    """State and ASGI app of the fake daemon."""
+
+    def __init__(self, images: Optional[List[str]] = None, latency: Optional[Dict[str, float]] = None):
+        self.images = set(images or [])
+        self.latency = latency or {}
+        self.containers: Dict[str, Dict[str, Any]] = {}
+        self.execs: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+        self.pulls: List[str] = []
+        routes = [
+            Route("/images/{name:path}/json", self.inspect_image, methods=["GET"]),
+            Route("/images/create", self.pull_image, methods=["POST"]),
+            Route("/containers/create", self.create_container, methods=["POST"]),
+            Route("/containers/{id}/start", self.start_container, methods=["POST"]),
+            Route("/containers/{id}/wait", self.wait_container, methods=["POST"]),
+            Route("/containers/{id}/logs", self.container_logs, methods=["GET"]),
+            Route("/containers/{id}/exec", self.create_exec, methods=["POST"]),
+            Route("/containers/{id}", self.remove_container, methods=["DELETE"]),
+            Route("/exec/{id}/start", self.start_exec, methods=["POST"]),
+            Route("/exec/{id}/json", self.inspect_exec, methods=["GET"]),
+        ]
+        self.app = Starlette(routes=[Mount(f"/{DOCKER_API_VERSION}", routes=routes)])
+
+    def transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.app)
+
+    async def _delay(self, op: str):
+        self.calls.append(op)
+        if self.latency.get(op):
+            await asyncio.sleep(self.latency[op])
+
+    def _container(self, request: Request) -> Dict[str, Any]:
+        return self.containers.get(request.path_params["id"])
+
+    @staticmethod
+    def _missing():
+        return JSONResponse({"message": "No such container"}, status_code=404)
+
+    async def _run(self, container: Dict[str, Any], cmd: List[str]):
+        """Run a sandbox command on the host; returns (exit code, stdout, stderr)."""
+        if not cmd or not cmd[-1].startswith("/sandbox/"):
+            return 0, b"", b""
+        source, target, _ = container["body"]["HostConfig"]["Binds"][0].split(":")
+        argv = [sys.executable if cmd[0] == "python" else cmd[0]] + cmd[1:-1]
+        argv.append(source + cmd[-1][len(target):])
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        container["procs"].add(proc)
+        try:
+            stdout, stderr = await proc.communicate()
+        finally:
+            container["procs"].discard(proc)
+            if proc.returncode is None:
+                proc.kill()
+        return proc.returncode, stdout, stderr
+
+    async def inspect_image(self, request: Request):
+        await self._delay("inspect_image")
+        if request.path_params["name"] not in self.images:
+            return JSONResponse({"message": "No such image"}, status_code=404)
+        return JSONResponse({"Id": request.path_params["name"]})
+
+    async def pull_image(self, request: Request):
+        await self._delay("pull_image")
+        image = f"{request.query_params['fromImage']}:{request.query_params['tag']}"
+        self.images.add(image)
+        self.pulls.append(image)
+        return Response(json.dumps({"status": "Downloaded"}).encode())
+
+    async def create_container(self, request: Request):
+        await self._delay("create")
+        body = await request.json()
+        if body["Image"] not in self.images:
+            return JSONResponse({"message": "No such image"}, status_code=404)
+        container_id = uuid.uuid4().hex
+        self.containers[container_id] = {
+            "name": request.query_params.get("name"), "body": body, "running": False,
+            "result": None, "execs": [], "procs": set(),
+        }
+        return JSONResponse({"Id": container_id}, status_code=201)
+
+    async def start_container(self, request: Request):
+        await self._delay("start")
+        container = self._container(request)
+        if container is None:
+            return self._missing()
+        container["running"] = True
+        container["task"] = asyncio.create_task(self._run(container, container["body"]["Cmd"]))
+        return Response(status_code=204)
+
+    async def wait_container(self, request: Request):
+        await self._delay("wait")
+        container = self._container(request)
+        if container is None:
+            return self._missing()
+        container["result"] = await container["task"]
+        container["running"] = False
+        return JSONResponse({"StatusCode": container["result"][0]})
+
+    async def container_logs(self, request: Request):
+        await self._delay("logs")
+        container = self._container(request)
+        if container is None:
+            return self._missing()
+        _, stdout, stderr = container["result"]
+        return Response(frame(1, stdout) + frame(2, stderr), media_type="application/vnd.docker.multiplexed-stream")
+
+    async def remove_container(self, request: Request):
+        await self._delay("remove")
+        container = self.containers.pop(request.path_params["id"], None)
+        if container is None:
+            return self._missing()
+        for proc in list(container["procs"]):
+            proc.kill()
+        if container.get("task"):
+            container["task"].cancel()
+        return Response(status_code=204)
+
+    async def create_exec(self, request: Request):
+        await self._delay("exec_create")
+        container = self._container(request)
+        if container is None:
+            return self._missing()
+        if not container["running"]:
+            return JSONResponse({"message": "Container is not running"}, status_code=409)
+        body = await request.json()
+        exec_id = uuid.uuid4().hex
+        container["execs"].append(body["Cmd"])
+        self.execs[exec_id] = {"container": container, "body": body, "exit_code": None}
+        return JSONResponse({"Id": exec_id}, status_code=201)
+
+    async def start_exec(self, request: Request):
+        await self._delay("exec_start")
+        exec_ = self.execs[request.path_params["id"]]
+        exit_code, stdout, stderr = await self._run(exec_["container"], exec_["body"]["Cmd"])
+        exec_["exit_code"] = exit_code
+        return Response(frame(1, stdout) + frame(2, stderr), media_type="application/vnd.docker.raw-stream")
+
+    async def inspect_exec(self, request: Request):
+        await self._delay("exec_inspect")
+        exec_ = self.execs[request.path_params["id"]]
+        return JSONResponse({"ExitCode": exec_["exit_code"], "Running": False})
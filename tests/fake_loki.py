@@ -0,0 +1,133 @@
+"""
+Local stand-in for the Loki HTTP API used by logs_api.
+
+Serves labels, label values, ``query_range`` (backward only) and the
+``tail`` websocket from in-memory streams, over a real socket via uvicorn
+so both httpx and websockets clients can reach it. Queries understand the
+subset of LogQL that LokiClient.build_query emits: ``=~`` label matchers
+and ``|~`` line filters.
+"""
+
+import asyncio
+import json
+import re
+from typing import ContextManager, Dict, Iterator, List, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket
+
+from tests.fake_server import serve_app
+
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_MATCHER = re.compile(r'(\w+)=~(' + _STRING + ')')
+_LINE_FILTER = re.compile(r'\|~\s*(' + _STRING + ')')
+
+
+def parse_query(query: str):
+    """Label matchers and line filters of a LogQL query, as compiled regexes."""
+    selector, _, pipeline = query.partition("}")
+    matchers = {name: re.compile(json.loads(value)) for name, value in _MATCHER.findall(selector)}
+    filters = [re.compile(json.loads(value)) for value in _LINE_FILTER.findall(pipeline)]
+    return matchers, filters
+
+
+class FakeLoki:
+    """In-memory log streams plus the ASGI app serving them."""
+
+    def __init__(self):
+        self.streams: List[Tuple[Dict[str, str], List[Tuple[int, str]]]] = []
+        self.calls: List[Tuple[str, Dict[str, str]]] = []
+        self.fail_labels = False
+        self.app = Starlette(routes=[
+            Route("/ready", self.ready),
+            Route("/loki/api/v1/labels", self.labels),
+            Route("/loki/api/v1/label/{name}/values", self.label_values),
+            Route("/loki/api/v1/query_range", self.query_range),
+            WebSocketRoute("/loki/api/v1/tail", self.tail),
+        ])
+
+    def push(self, labels: Dict[str, str], timestamp_ns: int, line: str):
+        """Append a line to the stream with these labels (timestamps must not decrease)."""
+        for stream_labels, values in self.streams:
+            if stream_labels == labels:
+                values.append((timestamp_ns, line))
+                return
+        self.streams.append((dict(labels), [(timestamp_ns, line)]))
+
+    def count(self, endpoint: str) -> int:
+        return sum(1 for name, _ in self.calls if name == endpoint)
+
+    def _select(self, query: str, start: int, end: int) -> Iterator[Tuple[int, int, int, str]]:
+        """(stream index, position in stream, timestamp, line) of matching entries."""
+        matchers, filters = parse_query(query)
+        for stream, (labels, values) in enumerate(list(self.streams)):
+            if not all(name in labels and pattern.fullmatch(labels[name]) for name, pattern in matchers.items()):
+                continue
+            for position, (timestamp_ns, line) in enumerate(list(values)):
+                if start <= timestamp_ns < end and all(f.search(line) for f in filters):
+                    yield stream, position, timestamp_ns, line
+
+    async def ready(self, request: Request):
+        return PlainTextResponse("ready\n")
+
+    async def labels(self, request: Request):
+        self.calls.append(("labels", {}))
+        names = sorted({name for labels, _ in self.streams for name in labels})
+        return JSONResponse({"status": "success", "data": names})
+
+    async def label_values(self, request: Request):
+        name = request.path_params["name"]
+        self.calls.append(("label_values", {"name": name}))
+        if self.fail_labels:
+            return JSONResponse({"status": "error"}, status_code=500)
+        values = sorted({labels[name] for labels, _ in self.streams if name in labels})
+        return JSONResponse({"status": "success", "data": values})
+
+    async def query_range(self, request: Request):
+        params = dict(request.query_params)
+        self.calls.append(("query_range", params))
+        assert params["direction"] == "backward"
+        selected = sorted(
+            self._select(params["query"], int(params["start"]), int(params["end"])),
+            key=lambda e: (e[2], e[0], e[1]), reverse=True,
+        )[:int(params["limit"])]
+        result: Dict[int, dict] = {}
+        for stream, _, timestamp_ns, line in selected:
+            result.setdefault(stream, {"stream": self.streams[stream][0], "values": []})["values"].append(
+                [str(timestamp_ns), line]
+            )
+        return JSONResponse({"status": "success", "data": {"resultType": "streams", "result": list(result.values())}})
+
+    async def tail(self, websocket: WebSocket):
+        params = dict(websocket.query_params)
+        self.calls.append(("tail", params))
+        await websocket.accept()
+        start = int(params["start"])
+        sent: Dict[int, int] = {}  # stream index -> values already considered
+        while True:
+            lengths = [len(values) for _, values in self.streams]
+            new = [
+                entry for entry in self._select(params["query"], start, 2**63)
+                if entry[0] < len(lengths) and sent.get(entry[0], 0) <= entry[1] < lengths[entry[0]]
+            ]
+            sent = dict(enumerate(lengths))
+            if new:
+                streams: Dict[int, dict] = {}
+                for stream, _, timestamp_ns, line in sorted(new, key=lambda e: (e[2], e[0])):
+                    streams.setdefault(stream, {"stream": self.streams[stream][0], "values": []})["values"].append(
+                        [str(timestamp_ns), line]
+                    )
+                await websocket.send_text(json.dumps({"streams": list(streams.values())}))
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout=0.02)
+            except asyncio.TimeoutError:
+                continue
+            if message["type"] == "websocket.disconnect":
+                return
+
+    def serve(self) -> ContextManager[str]:
+        """Run on a free localhost port; yields the base URL."""
+        return serve_app(self.app)
@@ -0,0 +1,143 @@
+"""
+Local stand-in for the Prometheus HTTP API used by prometheus_query.
+
+Serves instant queries (GET or form POST), range queries and targets from
+in-memory series, over a real socket via uvicorn. Queries understand the
+subset of PromQL the shared client and its callers emit: selectors with
+``=`` matchers, ``scalar(...)``, and batches of
+``label_replace(q, "label", "i", "", "")`` joined with ``or``. Range queries
+for an expression registered with ``add_history`` return its series sampled
+at each step instead. Each request waits ``delay`` seconds so concurrent
+callers overlap.
+"""
+
+import asyncio
+import re
+import time
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from tests.fake_server import serve_app
+
+_SELECTOR = re.compile(r'^([a-zA-Z_:][\w:]*)(?:\{(.*)\})?$')
+_MATCHER = re.compile(r'(\w+)="([^"]*)"')
+_LABEL_REPLACE = re.compile(r'^label_replace\((.*), "(\w+)", "([^"]*)", "", ""\)$')
+_SCALAR = re.compile(r'^scalar\((.*)\)$')
+
+
+class QueryError(Exception):
+    pass
+
+
+class FakePrometheus:
+    """In-memory series plus the ASGI app serving them."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.series: List[Tuple[Dict[str, str], float]] = []
+        self.histories: Dict[str, List[Tuple[Dict[str, str], Callable[[float], Optional[float]]]]] = {}
+        self.targets: List[Dict] = []
+        self.calls: List[Tuple[str, str]] = []  # (endpoint, query)
+        self.app = Starlette(routes=[
+            Route("/api/v1/query", self.query, methods=["GET", "POST"]),
+            Route("/api/v1/query_range", self.query_range, methods=["GET", "POST"]),
+            Route("/api/v1/targets", self.list_targets),
+        ])
+
+    def add(self, name: str, value: float, **labels: str):
+        self.series.append(({"__name__": name, **labels}, value))
+
+    def add_history(self, expr: str, values: Callable[[float], Optional[float]], **labels: str):
+        """Serve ``values(t)`` (None for a missing sample) for range queries of ``expr``."""
+        self.histories.setdefault(expr, []).append((labels, values))
+
+    def count(self, endpoint: str = "query") -> int:
+        return sum(1 for name, _ in self.calls if name == endpoint)
+
+    def queries(self) -> List[str]:
+        return [query for name, query in self.calls if name == "query"]
+
+    def evaluate(self, expr: str):
+        """(resultType, result) for the supported PromQL subset."""
+        expr = expr.strip()
+        if " or " in expr:
+            combined, seen = [], set()
+            for part in expr.split(" or "):
+                kind, result = self.evaluate(part)
+                if kind != "vector":
+                    raise QueryError(f"operator 'or' expects instant vectors, got {kind}")
+                for item in result:
+                    key = tuple(sorted(item["metric"].items()))
+                    if key not in seen:
+                        seen.add(key)
+                        combined.append(item)
+            return "vector", combined
+        match = _LABEL_REPLACE.match(expr)
+        if match:
+            kind, result = self.evaluate(match.group(1))
+            if kind != "vector":
+                raise QueryError(f"expected type instant vector in call to function label_replace, got {kind}")
+            label, value = match.group(2), match.group(3)
+            return "vector", [{**item, "metric": {**item["metric"], label: value}} for item in result]
+        match = _SCALAR.match(expr)
+        if match:
+            _, result = self.evaluate(match.group(1))
+            value = float(result[0]["value"][1]) if len(result) == 1 else float("nan")
+            return "scalar", [time.time(), str(value)]
+        match = _SELECTOR.match(expr)
+        if not match:
+            raise QueryError(f"parse error: unexpected input in {expr!r}")
+        name, matchers = match.group(1), dict(_MATCHER.findall(match.group(2) or ""))
+        return "vector", [
+            {"metric": labels, "value": [time.time(), str(value)]}
+            for labels, value in self.series
+            if labels["__name__"] == name and all(labels.get(k) == v for k, v in matchers.items())
+        ]
+
+    async def _params(self, request: Request) -> Dict[str, str]:
+        params = dict(request.query_params)
+        if request.method == "POST":
+            params.update(dict(await request.form()))
+        return params
+
+    async def query(self, request: Request):
+        params = await self._params(request)
+        self.calls.append(("query", params["query"]))
+        await asyncio.sleep(self.delay)
+        try:
+            kind, result = self.evaluate(params["query"])
+        except QueryError as e:
+            return JSONResponse({"status": "error", "errorType": "bad_data", "error": str(e)}, status_code=400)
+        return JSONResponse({"status": "success", "data": {"resultType": kind, "result": result}})
+
+    async def query_range(self, request: Request):
+        params = await self._params(request)
+        self.calls.append(("query_range", params["query"]))
+        await asyncio.sleep(self.delay)
+        start, end, step = float(params["start"]), float(params["end"]), float(params["step"])
+        stamps = [start + i * step for i in range(int((end - start) // step) + 1)]
+        if params["query"] in self.histories:
+            matrix = [
+                {"metric": labels, "values": [[t, str(v)] for t in stamps if (v := values(t)) is not None]}
+                for labels, values in self.histories[params["query"]]
+            ]
+            return JSONResponse({"status": "success", "data": {"resultType": "matrix", "result": matrix}})
+        try:
+            _, result = self.evaluate(params["query"])
+        except QueryError as e:
+            return JSONResponse({"status": "error", "errorType": "bad_data", "error": str(e)}, status_code=400)
+        matrix = [{"metric": item["metric"], "values": [[t, item["value"][1]] for t in stamps]} for item in result]
+        return JSONResponse({"status": "success", "data": {"resultType": "matrix", "result": matrix}})
+
+    async def list_targets(self, request: Request):
+        self.calls.append(("targets", ""))
+        await asyncio.sleep(self.delay)
+        return JSONResponse({"status": "success", "data": {"activeTargets": self.targets, "droppedTargets": []}})
+
+    def serve(self) -> ContextManager[str]:
+        """Run on a free localhost port; yields the base URL."""
+        return serve_app(self.app)
@@ -0,0 +1,37 @@
+"""
+Run an ASGI app in a background uvicorn thread for tests that need a real
+socket (websockets, clients that open their own connections).
+
+Used by the fake Loki and Prometheus servers.
+"""
+
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import uvicorn
+
+STARTUP_TIMEOUT = 5.0
+
+
+@contextmanager
+def serve_app(app, startup_timeout: float = STARTUP_TIMEOUT) -> Iterator[str]:
+    """Serve ``app`` on a free localhost port; yields the base URL."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while not server.started:
+            if not thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"Test server did not start within {startup_timeout}s")
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        sock.close()
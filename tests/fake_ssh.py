@@ -0,0 +1,68 @@
+"""
+Stand-in for the ``ssh`` binary, used by the CLI tests.
+
+Installed on PATH as ``ssh``. Understands the options the CLI passes:
+with ``ControlMaster=auto`` a command either reuses the control socket at
+``ControlPath`` (recorded as ``mux``) or pays the handshake delay and
+creates it (recorded as ``connect``); ``-O exit`` removes it. The remote
+command is run locally through ``sh -c``. Each invocation appends one line
+to the file in FAKE_SSH_LOG; FAKE_SSH_HANDSHAKE sets the delay in seconds.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import time
+
+
+def parse(argv):
+    options, control, rest = {}, None, []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "-o":
+            key, _, value = argv[i + 1].partition("=")
+            options[key] = value
+            i += 2
+        elif arg == "-O":
+            control = argv[i + 1]
+            i += 2
+        else:
+            rest = argv[i:]
+            break
+    return options, control, rest
+
+
+def log(event, destination):
+    with open(os.environ["FAKE_SSH_LOG"], "a") as f:
+        f.write(f"{event} {destination}\n")
+
+
+def main():
+    options, control, rest = parse(sys.argv[1:])
+    destination, command = rest[0], " ".join(rest[1:])
+    socket = None
+    if "ControlPath" in options:
+        socket = options["ControlPath"].replace("%C", hashlib.sha1(destination.encode()).hexdigest())
+
+    if control == "exit":
+        log("exit", destination)
+        if socket and os.path.exists(socket):
+            os.unlink(socket)
+            return 0
+        return 255
+
+    if socket and os.path.exists(socket):
+        log("mux", destination)
+    else:
+        time.sleep(float(os.getenv("FAKE_SSH_HANDSHAKE", "0")))
+        log("connect", destination)
+        if socket and options.get("ControlMaster") == "auto":
+            open(socket, "w").close()
+
+    return subprocess.run(["sh", "-c", command or "true"]).returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
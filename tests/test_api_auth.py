@@ -1,10 +1,9 @@
 """
 Tests for API Authentication endpoints and middleware.
 
-Note: These tests use a single client fixture that doesn't require authentication.
-The authentication middleware reads environment variables at import time, making
-it difficult to test auth-enabled scenarios with mocking. For full auth testing,
-use integration tests against a running API with HYDRA_API_KEY configured.
+Note: Most tests use a single client fixture that doesn't require authentication.
+The middleware re-reads HYDRA_API_KEY/HYDRA_API_KEYS when they change, so
+auth-enabled scenarios are covered by setting them with monkeypatch.
 """
 
 import pytest
@@ -119,3 +118,40 @@ class TestHealthEndpointAuthInfo:
         response = client.get("/health")
         data = response.json()
         assert isinstance(data["auth_enabled"], bool)
+
+
+class TestAuthMiddleware:
+    """Tests for the API key middleware with keys configured."""
+
+    @pytest.fixture
+    def auth_client(self, client, monkeypatch):
+        monkeypatch.setenv("HYDRA_API_KEY", "primary-key")
+        monkeypatch.setenv("HYDRA_API_KEYS", "second-key, third-key")
+        return client
+
+    def test_missing_key_rejected(self, auth_client):
+        """Protected paths without a key get 401."""
+        response = auth_client.get("/routing/tiers")
+        assert response.status_code == 401
+        assert response.json()["error"] == "Missing API key"
+
+    def test_invalid_key_rejected(self, auth_client):
+        """Unknown keys get 403."""
+        response = auth_client.get("/routing/tiers", headers={"X-API-Key": "primary-ke"})
+        assert response.status_code == 403
+
+    def test_valid_keys_accepted(self, auth_client):
+        """Header and query parameter keys both authenticate, for every configured key."""
+        assert auth_client.get("/routing/tiers", headers={"X-API-Key": "primary-key"}).status_code == 200
+        assert auth_client.get("/routing/tiers", params={"api_key": "third-key"}).status_code == 200
+
+    def test_exempt_paths_skip_auth(self, auth_client):
+        """Exempt paths and prefixes work without a key."""
+        assert auth_client.get("/health").status_code == 200
+        assert auth_client.get("/auth/status").json()["authenticated"] is False
+
+    def test_key_changes_take_effect(self, auth_client, monkeypatch):
+        """Rotating the configured keys is picked up without a restart."""
+        monkeypatch.setenv("HYDRA_API_KEY", "rotated-key")
+        assert auth_client.get("/routing/tiers", headers={"X-API-Key": "primary-key"}).status_code == 403
+        assert auth_client.get("/routing/tiers", headers={"X-API-Key": "rotated-key"}).status_code == 200
@@ -4,7 +4,12 @@ Tests for API Prometheus Metrics.
 Tests the /metrics endpoint and metric recording functions.
 """
 
+import asyncio
+import time
+
 import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 
 
@@ -114,3 +119,53 @@ class TestMetricsNoAuth:
         response = client.get("/metrics")
         # Should not get 401 or 403
         assert response.status_code == 200
+
+
+class TestRequestMetricsMiddleware:
+    """Tests for request metrics labels and timing."""
+
+    @pytest.fixture
+    def recorded(self, monkeypatch):
+        import hydra_tools.api as api
+
+        calls = []
+        monkeypatch.setattr(api, "record_http_request", lambda *args: calls.append(args))
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: str):
+            return {"item_id": item_id}
+
+        @app.get("/stream")
+        async def stream():
+            async def generate():
+                for i in range(3):
+                    await asyncio.sleep(0.05)
+                    yield f"data: {i}\n\n"
+
+            return StreamingResponse(generate(), media_type="text/event-stream")
+
+        app.add_middleware(api.RequestMetricsMiddleware)
+        return TestClient(app), calls
+
+    def test_route_template_label(self, recorded):
+        """Requests are labelled by route template, unmatched ones by a single label."""
+        client, calls = recorded
+        response = client.get("/items/abc-123")
+        client.get("/no/such/path")
+
+        assert response.headers["X-Request-ID"]
+        assert calls[0][:3] == ("GET", "/items/{item_id}", 200)
+        assert calls[1][:3] == ("GET", "unmatched", 404)
+
+    def test_streaming_timed_to_last_byte(self, recorded):
+        """Streaming responses are timed until the final chunk, not the headers."""
+        client, calls = recorded
+        start = time.perf_counter()
+        response = client.get("/stream")
+        elapsed = time.perf_counter() - start
+
+        assert response.text.count("data:") == 3
+        method, endpoint, status, duration = calls[0]
+        assert (endpoint, status) == ("/stream", 200)
+        assert 0.15 <= duration <= elapsed
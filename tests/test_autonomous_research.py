@@ -0,0 +1,214 @@
+"""
+Tests for streaming, concurrent and resumable research job execution.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from hydra_tools.autonomous_research import (
+    MAX_ANALYZED_ITEMS,
+    AutonomousResearchPipeline,
+    JobStatus,
+    Stage,
+    run_stages,
+)
+
+SEARXNG = "http://searxng.test"
+LLM = "http://llm.test"
+
+
+class StubSources:
+    """SearXNG, GitHub and an OpenAI-compatible LLM with fixed latencies."""
+
+    def __init__(self, delay=0.0, results_per_query=3):
+        self.delay = delay
+        self.results_per_query = results_per_query
+        self.log = []  # (kind, detail, monotonic start)
+        self.active = {}
+        self.peak = {}
+        self.fail_synthesis = False
+        self.slow_queries = {}  # query -> extra seconds
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            return await self._respond(request)
+        finally:
+            self.active[host] -= 1
+
+    async def _respond(self, request):
+        start = time.monotonic()
+        await asyncio.sleep(self.delay)
+        if request.url.path == "/search":
+            query = request.url.params["q"]
+            self.log.append(("search", query, start))
+            await asyncio.sleep(self.slow_queries.get(query, 0))
+            results = [{"title": f"{query} result {i}", "url": f"http://pages.test/{query}/{i}",
+                        "content": f"about {query} {i}"} for i in range(self.results_per_query)]
+            return httpx.Response(200, json={"results": results})
+        if request.url.host == "api.github.com":
+            self.log.append(("github", request.url.params["q"], start))
+            return httpx.Response(200, json={"items": [{"full_name": "org/repo", "html_url": "http://gh/repo",
+                                                        "description": "a repo"}]})
+        if request.url.host == "pages.test":
+            self.log.append(("page", request.url.path, start))
+            return httpx.Response(200, text=f"<p>full text of {request.url.path}</p>")
+        if request.url.path == "/v1/chat/completions":
+            prompt = json.loads(request.content)["messages"][0]["content"]
+            if prompt.startswith("Synthesize"):
+                self.log.append(("synthesize", "", start))
+                if self.fail_synthesis:
+                    return httpx.Response(500)
+                content = {"key_insights": ["insight"], "action_items": ["act"]}
+            else:
+                title = prompt.split("Title: ", 1)[1].split("\n", 1)[0]
+                self.log.append(("analyze", title, start))
+                content = {"relevance_score": 0.8, "key_points": [title]}
+            return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(content)}}]})
+        return httpx.Response(404)
+
+    def count(self, kind):
+        return sum(1 for entry in self.log if entry[0] == kind)
+
+
+@pytest.fixture
+def stubs():
+    return StubSources()
+
+
+def make_pipeline(tmp_path, stubs, **overrides):
+    pipeline = AutonomousResearchPipeline(storage_path=str(tmp_path), llm_url=LLM, searxng_url=SEARXNG, **overrides)
+    pipeline._http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(stubs.handler))
+    return pipeline
+
+
+def web_job(pipeline, queries, **kwargs):
+    sources = [{"source_type": "web_search", "query": q, "max_results": 10} for q in queries]
+    return pipeline.create_job(name="test", topic="inference", sources=sources, **kwargs)
+
+
+class TestRunStages:
+    """Tests for the streaming stage executor."""
+
+    async def test_downstream_starts_before_upstream_finishes(self):
+        events = []
+
+        async def produce(delay):
+            await asyncio.sleep(delay)
+            events.append(("produced", delay))
+            return [delay]
+
+        async def consume(value):
+            events.append(("consumed", value))
+            return [value * 10]
+
+        results = await run_stages([Stage("produce", produce, 2), Stage("consume", consume)], [0.01, 0.05])
+        assert sorted(results) == [0.1, 0.5]
+        assert events.index(("consumed", 0.01)) < events.index(("produced", 0.05))
+
+    async def test_failed_input_is_dropped(self):
+        async def maybe_fail(value):
+            if value == 2:
+                raise RuntimeError("boom")
+            return [value]
+
+        assert sorted(await run_stages([Stage("a", maybe_fail, 3)], [1, 2, 3])) == [1, 3]
+
+
+class TestExecuteJob:
+    """Tests for research jobs run as a stage DAG."""
+
+    async def test_findings_in_source_order_and_capped(self, tmp_path, stubs):
+        stubs.results_per_query = 8
+        pipeline = make_pipeline(tmp_path, stubs)
+        job = web_job(pipeline, ["alpha", "beta", "gamma"])
+
+        await pipeline.execute_job(job.job_id)
+
+        assert job.status == JobStatus.COMPLETED and job.progress_percent == 100
+        assert job.items_found == 24
+        assert len(job.findings) == stubs.count("analyze") == MAX_ANALYZED_ITEMS
+        orders = [(f["title"].split()[0], int(f["title"].split()[-1])) for f in job.findings]
+        assert orders == sorted(orders, key=lambda o: (["alpha", "beta", "gamma"].index(o[0]), o[1]))
+        assert job.key_insights == ["insight"] and job.report_path
+        assert not pipeline._checkpoint_path(job.job_id).exists()
+
+    async def test_concurrent_and_streaming(self, tmp_path, stubs):
+        stubs.delay = 0.05
+        stubs.slow_queries = {"slow": 0.3}
+        pipeline = make_pipeline(tmp_path, stubs, per_host_concurrency=4)
+        job = web_job(pipeline, ["a", "b", "c", "slow"])
+
+        start = time.perf_counter()
+        await pipeline.execute_job(job.job_id)
+        elapsed = time.perf_counter() - start
+
+        # Sequentially: 4 searches + 12 analyses + 1 synthesis, plus the slow search
+        assert elapsed < (17 * stubs.delay + 0.3) / 2
+        slow_search_done = next(t for kind, q, t in stubs.log if q == "slow") + stubs.delay + 0.3
+        analyses = [t for kind, _, t in stubs.log if kind == "analyze"]
+        assert sum(t < slow_search_done for t in analyses) >= pipeline.analyze_concurrency
+        assert stubs.peak["llm.test"] == pipeline.analyze_concurrency
+        assert [f["title"] for f in job.findings][-3:] == [f"slow result {i}" for i in range(3)]
+
+    async def test_per_host_limit(self, tmp_path, stubs):
+        stubs.delay = 0.02
+        pipeline = make_pipeline(tmp_path, stubs, per_host_concurrency=2, collect_concurrency=6)
+        job = web_job(pipeline, [f"q{i}" for i in range(6)], fetch_full_content=True)
+
+        await pipeline.execute_job(job.job_id)
+        assert stubs.peak["searxng.test"] == 2
+        assert stubs.peak["pages.test"] == 2
+        assert stubs.count("page") == 18
+        assert all(f["content"].startswith("full text") for f in job.findings)
+
+    async def test_failed_job_resumes_from_checkpoint(self, tmp_path, stubs, monkeypatch):
+        pipeline = make_pipeline(tmp_path, stubs)
+        job = web_job(pipeline, ["alpha", "beta"])
+
+        async def broken_report(job):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(pipeline, "_generate_report", broken_report)
+        await pipeline.execute_job(job.job_id)
+        assert job.status == JobStatus.FAILED and job.error == "disk full"
+        calls = {kind: stubs.count(kind) for kind in ("search", "analyze", "synthesize")}
+        monkeypatch.undo()
+
+        # A restarted process sees the same checkpoint
+        restarted = make_pipeline(tmp_path, stubs)
+        await restarted.execute_job(job.job_id)
+        resumed = restarted.get_job(job.job_id)
+        assert resumed.status == JobStatus.COMPLETED
+        assert {kind: stubs.count(kind) for kind in calls} == calls
+        assert resumed.resumed_steps == 2 + 6 + 1
+        assert len(resumed.findings) == 6
+        assert not restarted._checkpoint_path(job.job_id).exists()
+
+    async def test_failed_steps_are_retried(self, tmp_path, stubs):
+        stubs.fail_synthesis = True
+        pipeline = make_pipeline(tmp_path, stubs)
+        job = web_job(pipeline, ["alpha"])
+        await pipeline.execute_job(job.job_id)
+        assert job.status == JobStatus.COMPLETED and job.key_insights == []
+
+        stubs.fail_synthesis = False
+        await pipeline.execute_job(job.job_id)
+        assert stubs.count("synthesize") == 2 and job.key_insights == ["insight"]
+        assert job.resumed_steps == 0
+
+    def test_interrupted_job_can_be_rerun(self, tmp_path, stubs):
+        pipeline = make_pipeline(tmp_path, stubs)
+        job = web_job(pipeline, ["alpha"])
+        job.status = JobStatus.RUNNING
+        pipeline._save_jobs()
+
+        reloaded = make_pipeline(tmp_path, stubs).get_job(job.job_id)
+        assert reloaded.status == JobStatus.PAUSED
+        assert reloaded.current_phase == "Interrupted"
@@ -0,0 +1,167 @@
+"""
+Tests for concurrent CLI probes and SSH connection multiplexing, run
+against a fake ``ssh`` on PATH and stub HTTP services on localhost.
+"""
+
+import argparse
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from hydra_cli import main
+
+HANDSHAKE = 0.3
+SERVICE_DELAY = 0.3
+
+FAKE_NODES = {
+    "node-a": {"ip": "127.0.0.1", "user": "alpha", "role": "Test A"},
+    "node-b": {"ip": "127.0.0.1", "user": "beta", "role": "Test B"},
+    "node-c": {"ip": "127.0.0.1", "user": "gamma", "role": "Test C"},
+}
+
+
+class StubService(BaseHTTPRequestHandler):
+    """Answers every GET after a delay, keeping the connection alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        time.sleep(SERVICE_DELAY)
+        status = 503 if self.path == "/down" else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_services(monkeypatch):
+    """Two stub HTTP servers with four HTTP services and one TCP-only service."""
+    servers = []
+    for _ in range(2):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubService)
+        server.connections = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    first, second = (s.server_address[1] for s in servers)
+    monkeypatch.setattr(main, "NODES", FAKE_NODES)
+    monkeypatch.setattr(main, "SERVICES", {
+        "api": {"port": first, "node": "node-a", "health": "/health"},
+        "ui": {"port": first, "node": "node-a", "health": "/"},
+        "store": {"port": second, "node": "node-b", "health": "/health"},
+        "broken": {"port": second, "node": "node-c", "health": "/down"},
+        "db": {"port": first, "node": "node-c", "health": None},
+    })
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fake_ssh(tmp_path, monkeypatch):
+    """Put the fake ssh first on PATH; returns a reader for its log."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = Path(__file__).parent / "fake_ssh.py"
+    wrapper = bin_dir / "ssh"
+    wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+    wrapper.chmod(0o755)
+    log = tmp_path / "ssh.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+    monkeypatch.setenv("FAKE_SSH_LOG", str(log))
+    monkeypatch.setenv("FAKE_SSH_HANDSHAKE", str(HANDSHAKE))
+    monkeypatch.setattr(main, "NODES", FAKE_NODES)
+    monkeypatch.setattr(main, "ssh_mux", main.SSHMultiplexer(control_dir=str(tmp_path / "ctl")))
+    return lambda: log.read_text().splitlines()
+
+
+@pytest.fixture
+def output(monkeypatch):
+    buffer = StringIO()
+    monkeypatch.setattr(main, "console", Console(file=buffer, width=120, color_system=None))
+    return buffer
+
+
+class TestSSHMultiplexing:
+    """Tests for the persistent control connection per node."""
+
+    def test_one_handshake_per_node(self, fake_ssh):
+        for _ in range(3):
+            assert main.ssh_command("node-a", "echo hello") == "hello\n"
+        main.ssh_command("node-b", "echo hi")
+
+        assert fake_ssh() == ["connect alpha@127.0.0.1", "mux alpha@127.0.0.1", "mux alpha@127.0.0.1",
+                              "connect beta@127.0.0.1"]
+
+    def test_masters_closed_at_exit(self, fake_ssh, tmp_path):
+        main.ssh_command("node-a", "true")
+        main.ssh_command("node-b", "true")
+        main.ssh_mux.close()
+
+        assert sorted(fake_ssh()[2:]) == ["exit alpha@127.0.0.1", "exit beta@127.0.0.1"]
+        assert list((tmp_path / "ctl").iterdir()) == []
+
+    def test_persist_reuses_across_runs(self, fake_ssh, tmp_path):
+        """With a persist duration a later run rides the earlier run's master."""
+        first_run = main.SSHMultiplexer(control_dir=str(tmp_path / "ctl"), persist="10m")
+        assert "ControlPersist=10m" in first_run.options("node-a")
+        main.ssh_mux = first_run
+        main.ssh_command("node-a", "true")
+        first_run.close()
+
+        main.ssh_mux = main.SSHMultiplexer(control_dir=str(tmp_path / "ctl"), persist="10m")
+        main.ssh_command("node-a", "true")
+
+        assert fake_ssh() == ["connect alpha@127.0.0.1", "mux alpha@127.0.0.1"]
+
+
+class TestConcurrentProbes:
+    """Tests for probing nodes and services in parallel."""
+
+    def test_shared_client_reuses_connections(self, stub_services):
+        with main.probe_client() as client:
+            for _ in range(3):
+                assert main.check_service_health("api", client=client)[0]
+        assert len(stub_services[0].connections) == 1
+
+    def test_status_probes_run_concurrently(self, fake_ssh, stub_services, output):
+        start = time.perf_counter()
+        main.cmd_status(argparse.Namespace(watch=False, interval=0))
+        elapsed = time.perf_counter() - start
+
+        # Sequentially: 3 handshakes + 4 slow services = 2.1s
+        assert elapsed < 1.5
+        text = output.getvalue()
+        assert text.count("Online") == 3
+        assert "HTTP 503" in text
+        assert "checking" not in text.splitlines()[-3]
+
+    def test_watch_refreshes_with_mux(self, fake_ssh, stub_services, output, monkeypatch):
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 3:
+                raise KeyboardInterrupt
+
+        monkeypatch.setattr(main, "time", types.SimpleNamespace(perf_counter=time.perf_counter, sleep=sleep))
+        main.cmd_status(argparse.Namespace(watch=True, interval=2.0))
+
+        log = fake_ssh()
+        assert sleeps == [2.0, 2.0, 2.0]
+        assert log.count("connect alpha@127.0.0.1") == 1
+        assert log.count("mux alpha@127.0.0.1") == 2
+        assert "Refreshed 3x, last round took" in output.getvalue()
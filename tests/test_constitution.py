@@ -0,0 +1,127 @@
+"""
+Tests for the constitutional enforcer.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from hydra_tools.constitution import (
+    CompiledConstitution,
+    ConstitutionalEnforcer,
+    EnforcementLevel,
+)
+
+REPO_CONSTITUTION = Path(__file__).parent.parent / "CONSTITUTION.yaml"
+
+
+@pytest.fixture
+def constitution_file(tmp_path, monkeypatch):
+    """The repo constitution with its audit log redirected into tmp_path."""
+    monkeypatch.setenv("HYDRA_CONSTITUTION_RELOAD_SECONDS", "0")
+    data = yaml.safe_load(REPO_CONSTITUTION.read_text())
+    data["audit"]["log_location"] = str(tmp_path / "audit.log")
+    path = tmp_path / "CONSTITUTION.yaml"
+    path.write_text(yaml.safe_dump(data))
+    return path
+
+
+@pytest.fixture
+def enforcer(constitution_file):
+    enforcer = ConstitutionalEnforcer(str(constitution_file))
+    yield enforcer
+    enforcer.audit_writer.close()
+
+
+class TestDecisions:
+    """Tests for compiled decisions."""
+
+    @pytest.mark.parametrize("operation_type,target,details,constraint_id", [
+        ("database_delete", "postgres-database", {"backup_created": True}, "DATA-001"),
+        ("database_delete", "redis", {}, "DATA-003"),
+        ("database_delete", "redis", {"backup_created": True}, None),
+        ("table_drop", "users", {}, "DATA-002"),
+        ("firewall_modify", "wan", {"rule": "allow_all"}, "SEC-003"),
+        ("firewall_modify", "wan", {"rule": "allow 443"}, None),
+        ("file_modify", "CONSTITUTION.yaml", None, "AUTO-001"),
+        ("file_modify", "README.md", None, None),
+        ("git_commit", "repo", {"diff": "adds SECRET_KEY"}, "GIT-002"),
+        ("git_force_push", "main", None, "GIT-001"),
+    ])
+    def test_constraints(self, enforcer, operation_type, target, details, constraint_id):
+        """Each constraint blocks exactly the operations it describes."""
+        check = enforcer.check_operation(operation_type, target, details)
+        assert check.constraint_id == constraint_id
+        assert check.allowed == (constraint_id is None)
+
+    def test_supervised_and_autonomous_fallthrough(self, enforcer):
+        """Unconstrained operations are classified as supervised, autonomous or default."""
+        assert enforcer.check_operation("service_restart", "comfyui").message == "Supervised operation: audit_log"
+        assert enforcer.check_operation("git_commit", "repo", {"diff": "docs"}).message == "Autonomous operation allowed"
+        unknown = enforcer.check_operation("sandbox_execute", "code:python")
+        assert unknown.allowed and unknown.enforcement_level == EnforcementLevel.AUDIT_ONLY
+
+    def test_target_only_decisions_cached(self, enforcer):
+        """Operations whose constraints ignore details are answered from the cache."""
+        for _ in range(3):
+            enforcer.check_operation("file_delete", "notes.md")
+        assert enforcer.compiled.cache_info()["hits"] == 2
+
+    def test_unmatchable_constraints_flagged(self):
+        """Constraints the enforcer cannot match, and malformed ones, are reported at load."""
+        compiled = CompiledConstitution({
+            "immutable_constraints": {
+                "security": [
+                    {"id": "SEC-001", "rule": "Never disable auth", "enforcement": "hard_block"},
+                    {"id": "SEC-999", "rule": "Something new"},
+                    {"id": "SEC-001", "rule": "Duplicate"},
+                    {"id": "SEC-002", "enforcement": "sometimes"},
+                ],
+                "broken": "not a list",
+            },
+        })
+        issues = "\n".join(compiled.issues)
+        assert "SEC-999: no matcher" in issues
+        assert "Duplicate constraint id SEC-001" in issues
+        assert "unknown enforcement 'sometimes'" in issues
+        assert "'broken' is not a list" in issues
+        # The bad enforcement value falls back to the strictest level
+        assert compiled.decide("secret_expose", "logs").enforcement_level == EnforcementLevel.HARD_BLOCK
+
+
+class TestHotReload:
+    """Tests for picking up constitution edits."""
+
+    def test_edit_applies_without_restart(self, enforcer, constitution_file):
+        """Adding an autonomous operation takes effect on the next check and is audited."""
+        data = yaml.safe_load(constitution_file.read_text())
+        data["autonomous_operations"]["allowed"].append("model_download")
+        constitution_file.write_text(yaml.safe_dump(data))
+
+        check = enforcer.check_operation("model_download", "qwen")
+        assert check.message == "Autonomous operation allowed"
+        assert enforcer.reloads == 1
+        assert enforcer.get_audit_log(operation_type="constitution_reload")
+
+    def test_broken_edit_keeps_current_rules(self, enforcer, constitution_file):
+        """A file that fails to parse does not weaken enforcement."""
+        constitution_file.write_text("immutable_constraints: [unclosed")
+
+        assert not enforcer.check_operation("git_force_push", "main").allowed
+        assert enforcer.reloads == 0
+
+
+class TestAuditWriter:
+    """Tests for the background audit log writer."""
+
+    def test_entries_written_in_order(self, enforcer):
+        """Queued entries reach the file, in order, once flushed."""
+        for i in range(50):
+            enforcer.log_action("sandbox_execute", f"code:{i}", details={"i": i})
+        assert enforcer.audit_writer.flush()
+
+        lines = [json.loads(line) for line in enforcer.audit_file.read_text().splitlines()]
+        assert [line["details"]["i"] for line in lines] == list(range(50))
+        assert enforcer.audit_writer.stats()["batches"] < 50
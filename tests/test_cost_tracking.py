@@ -0,0 +1,184 @@
+"""
+Tests for batched cost-tracking ingestion and rollup-backed summaries.
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from hydra_tools import cost_tracking
+from hydra_tools.cost_tracking import CostTracker, _plan_range
+
+MODELS = ["claude-sonnet-4", "gpt-4o-mini", "tabby", "qwen2.5-7b"]
+AGENTS = [None, "research", "coder"]
+
+
+def populate(tracker, count, start, span, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        tracker.record_usage(
+            model=rng.choice(MODELS),
+            input_tokens=rng.randrange(10, 5000),
+            output_tokens=rng.randrange(10, 2000),
+            agent=rng.choice(AGENTS),
+            timestamp=start + timedelta(seconds=rng.uniform(0, span.total_seconds())),
+        )
+
+
+def raw_totals(db_path, start, end):
+    """The summary computed straight from raw rows, as before rollups."""
+    conn = sqlite3.connect(str(db_path))
+    where = "WHERE timestamp >= ? AND timestamp < ?"
+    bounds = (start.isoformat(), end.isoformat())
+    cost, requests = conn.execute(f"SELECT SUM(cost_usd), COUNT(*) FROM token_usage {where}", bounds).fetchone()
+    by_model = dict(conn.execute(f"SELECT model, SUM(cost_usd) FROM token_usage {where} GROUP BY model", bounds))
+    by_agent = dict(conn.execute(
+        f"SELECT agent, SUM(cost_usd) FROM token_usage {where} AND agent IS NOT NULL GROUP BY agent", bounds
+    ))
+    conn.close()
+    return cost or 0, requests, by_model, by_agent
+
+
+def assert_matches(summary, expected):
+    cost, requests, by_model, by_agent = expected
+    assert summary.request_count == requests
+    assert summary.total_cost_usd == pytest.approx(cost)
+    assert summary.by_model == pytest.approx(by_model)
+    assert summary.by_agent == pytest.approx(by_agent)
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = CostTracker(db_path=str(tmp_path / "costs.db"))
+    yield tracker
+    tracker._conn.close()
+
+
+class TestRollupSummaries:
+    """Tests that rollup-backed summaries match the raw rows."""
+
+    def test_plan_uses_coarsest_aligned_rollup(self):
+        start = datetime(2026, 3, 1, 22, 59, 30)
+        plan = [(table, lo, hi) for table, _, lo, hi in _plan_range(start, datetime(2026, 3, 3, 1, 2))]
+        assert plan == [
+            ("token_usage", start, datetime(2026, 3, 1, 23, 0)),
+            ("usage_hour", datetime(2026, 3, 1, 23), datetime(2026, 3, 2)),
+            ("usage_day", datetime(2026, 3, 2), datetime(2026, 3, 3)),
+            ("usage_hour", datetime(2026, 3, 3), datetime(2026, 3, 3, 1)),
+            ("usage_minute", datetime(2026, 3, 3, 1), datetime(2026, 3, 3, 1, 2)),
+        ]
+
+    @pytest.mark.parametrize("period,start", [
+        ("day", datetime(2026, 3, 10)),
+        ("day", datetime(2026, 3, 10, 7, 13, 27)),
+        ("week", datetime(2026, 3, 9)),
+        ("month", datetime(2026, 3, 1)),
+    ])
+    def test_summary_matches_raw_rows(self, tracker, period, start):
+        populate(tracker, 3000, datetime(2026, 2, 25), timedelta(days=40))
+        summary = tracker.get_summary(period, start_date=start)
+        assert_matches(summary, raw_totals(tracker.db_path, summary.start_date, summary.end_date))
+        assert summary.request_count > 0
+
+    def test_existing_database_backfilled(self, tmp_path):
+        first = CostTracker(db_path=str(tmp_path / "costs.db"))
+        populate(first, 500, datetime(2026, 3, 10), timedelta(days=2))
+        first.flush()
+        with first._conn:
+            for table in ("usage_day", "usage_hour", "usage_minute"):
+                first._conn.execute(f"DROP TABLE {table}")
+        first._conn.close()
+
+        reopened = CostTracker(db_path=str(tmp_path / "costs.db"))
+        summary = reopened.get_summary("day", datetime(2026, 3, 10))
+        assert_matches(summary, raw_totals(reopened.db_path, summary.start_date, summary.end_date))
+        reopened._conn.close()
+
+    def test_compaction_keeps_old_summaries(self, tracker):
+        populate(tracker, 400, datetime(2026, 1, 5), timedelta(days=1))
+        before = tracker.get_summary("day", datetime(2026, 1, 5))
+
+        removed = tracker.compact(now=datetime(2026, 6, 1))
+
+        assert removed >= 400
+        assert tracker.get_recent_usage() == []
+        after = tracker.get_summary("day", datetime(2026, 1, 5))
+        assert after.request_count == before.request_count == 400
+        assert after.total_cost_usd == pytest.approx(before.total_cost_usd)
+
+
+class TestBatchedIngestion:
+    """Tests for buffering and background flushing."""
+
+    def test_records_buffered_until_flush(self, tracker):
+        populate(tracker, 200, datetime(2026, 3, 10), timedelta(hours=1))
+        assert sqlite3.connect(str(tracker.db_path)).execute("SELECT COUNT(*) FROM token_usage").fetchone() == (0,)
+
+        assert tracker.flush() == 200
+        assert tracker.stats["flushes"] == 1
+        assert tracker._conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert len(tracker.get_recent_usage(limit=500)) == 200
+
+    def test_reads_include_buffered_records(self, tracker):
+        tracker.record_usage("gpt-4o", 1000, 1000, agent="research")
+        assert tracker.get_summary("day").by_agent == {"research": pytest.approx(0.0125)}
+
+    async def test_background_flush(self, tracker, monkeypatch):
+        monkeypatch.setattr(cost_tracking, "FLUSH_INTERVAL", 0.05)
+        tracker.record_usage("tabby", 10, 100)
+        await asyncio.sleep(0.3)
+
+        assert tracker.stats["flushed"] == 1
+        await tracker.close()
+
+    async def test_full_batch_wakes_flusher(self, tracker, monkeypatch):
+        monkeypatch.setattr(cost_tracking, "FLUSH_INTERVAL", 60)
+        monkeypatch.setattr(cost_tracking, "FLUSH_BATCH", 50)
+        populate(tracker, 120, datetime.utcnow(), timedelta(minutes=1))
+        await asyncio.sleep(0.2)
+
+        assert tracker.stats["flushed"] >= 100
+        await tracker.close()
+        count = sqlite3.connect(str(tracker.db_path)).execute("SELECT COUNT(*) FROM token_usage").fetchone()
+        assert count == (120,)
+
+    def test_failed_flush_keeps_records(self, tracker):
+        populate(tracker, 10, datetime(2026, 3, 10), timedelta(hours=1))
+        with tracker._conn:
+            tracker._conn.execute("DROP TABLE usage_hour")
+        with pytest.raises(sqlite3.Error):
+            tracker.flush()
+        assert len(tracker._buffer) == 10
+        assert tracker._conn.execute("SELECT COUNT(*) FROM token_usage").fetchone() == (0,)
+
+    def test_failed_inline_flush_does_not_fail_recording(self, tracker, monkeypatch):
+        monkeypatch.setattr(cost_tracking, "BUFFER_MAX", 5)
+        with tracker._conn:
+            tracker._conn.execute("DROP TABLE usage_hour")
+        populate(tracker, 8, datetime(2026, 3, 10), timedelta(hours=1))
+
+        assert tracker.stats["inline_flushes"] == 4
+        assert len(tracker._buffer) == 8
+        # Reads still answer from what is on disk
+        assert tracker.get_recent_usage() == []
+
+    async def test_endpoints_read_off_the_event_loop(self, tracker, monkeypatch):
+        monkeypatch.setattr(cost_tracking, "_cost_tracker", tracker)
+        flush_threads = []
+        flush = tracker.flush
+        monkeypatch.setattr(tracker, "flush", lambda: flush_threads.append(threading.get_ident()) or flush())
+        app = FastAPI()
+        app.include_router(cost_tracking.create_cost_tracking_router())
+        tracker.record_usage("gpt-4o", 1000, 1000, agent="research")
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            summary = (await client.get("/costs/summary/day")).json()
+            dashboard = (await client.get("/costs/dashboard")).json()
+        assert summary["request_count"] == dashboard["today"]["requests"] == 1
+        assert flush_threads and threading.get_ident() not in flush_threads
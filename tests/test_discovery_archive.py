@@ -0,0 +1,177 @@
+"""
+Tests for the discovery archive search index.
+"""
+
+import hashlib
+import json
+import random
+
+import pytest
+
+from hydra_tools.discovery_archive import (
+    ArchiveRequest,
+    DiscoveryArchive,
+    DiscoveryEmbedding,
+    DiscoveryType,
+)
+
+WORDS = ["inference", "tabbyapi", "cache", "latency", "gpu", "memory", "router", "queue", "vllm", "context"]
+
+
+class FakeEmbedder(DiscoveryEmbedding):
+    """Deterministic 16-dim embeddings derived from the text, no Ollama."""
+
+    def __init__(self, dim=16):
+        super().__init__()
+        self.dim = dim
+        self.calls = 0
+
+    async def embed(self, text):
+        self.calls += 1
+        rng = random.Random(hashlib.sha256(text.encode()).digest())
+        return [rng.uniform(-1, 1) for _ in range(self.dim)]
+
+
+def make_archive(path, dim=16):
+    archive = DiscoveryArchive(str(path))
+    archive.embedder = FakeEmbedder(dim)
+    return archive
+
+
+async def populate(archive, count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        words = rng.sample(WORDS, 3)
+        await archive.archive(ArchiveRequest(
+            type=rng.choice(["improvement", "pattern", "failure"]),
+            title=f"{words[0].title()} fix {i}",
+            description=f"Changed {words[1]} handling for {words[2]}",
+            tags=rng.sample(WORDS, 2),
+        ))
+
+
+async def brute_force(archive, query, discovery_type=None, limit=10):
+    """The search as it was before the index: scan every file."""
+    dt = DiscoveryType(discovery_type) if discovery_type else None
+    query_embedding = await archive.embedder.embed(query)
+    results = []
+    for d in archive.list_all(dt):
+        q = query.lower()
+        score = 0.5 * (q in d.title.lower()) + 0.3 * (q in d.description.lower())
+        score += 0.2 * any(q in tag.lower() for tag in d.tags)
+        if query_embedding and d.embedding:
+            score += archive.embedder.cosine_similarity(query_embedding, d.embedding) * 0.5
+        if score > 0.1:
+            results.append((d.id, round(score, 3)))
+    results.sort(key=lambda r: r[1], reverse=True)
+    return results[:limit]
+
+
+class TestIndexedSearch:
+    """Tests that the index ranks like the file scan it replaces."""
+
+    @pytest.mark.parametrize("query,discovery_type", [
+        ("cache", None),
+        ("Latency", "pattern"),
+        ("fix 1", None),
+        ("gpu", "failure"),
+        ("nothing matches this", None),
+    ])
+    async def test_matches_file_scan(self, tmp_path, query, discovery_type):
+        archive = make_archive(tmp_path)
+        await populate(archive, 120)
+
+        results = await archive.search(query, discovery_type, limit=10)
+        expected = await brute_force(archive, query, discovery_type, limit=10)
+
+        assert [r["score"] for r in results] == [score for _, score in expected]
+        assert {r["id"] for r in results} <= {d.id for d in archive.list_all()}
+        assert all("embedding" in r for r in results)
+
+    async def test_ties_go_to_newest(self, tmp_path):
+        """Without embeddings every title match ties; the newest ones are returned."""
+        archive = make_archive(tmp_path)
+
+        async def no_embedding(text):
+            return None
+
+        archive.embedder.embed = no_embedding
+        for i in range(300):
+            await archive.archive(ArchiveRequest(type="pattern", title=f"tabby thing {i:03d}", description=""))
+
+        results = await archive.search("tabby", limit=10)
+        assert [r["title"] for r in results] == [f"tabby thing {i:03d}" for i in range(299, 289, -1)]
+
+    async def test_tag_filter(self, tmp_path):
+        """Only discoveries carrying every requested tag are returned."""
+        archive = make_archive(tmp_path)
+        await populate(archive, 80)
+
+        results = await archive.search("fix", tags=["GPU", "cache"], limit=50)
+        assert results
+        assert all({"gpu", "cache"} <= set(r["tags"]) for r in results)
+
+    async def test_archive_updates_loaded_index(self, tmp_path):
+        archive = make_archive(tmp_path)
+        await populate(archive, 10)
+        assert len(archive.index) == 10
+
+        await archive.archive(ArchiveRequest(type="pattern", title="Speculative decoding", description="Draft model"))
+        results = await archive.search("speculative")
+        assert results[0]["title"] == "Speculative decoding"
+        assert archive.get_stats()["recent"][0]["title"] == "Speculative decoding"
+
+
+class TestIndexPersistence:
+    """Tests for loading, reconciling and rebuilding the on-disk index."""
+
+    async def test_reload_uses_manifest_and_matrix(self, tmp_path):
+        archive = make_archive(tmp_path)
+        await populate(archive, 30)
+        before = await archive.search("queue")
+
+        reloaded = make_archive(tmp_path)
+        assert reloaded.index.rows == 30
+        assert [r["id"] for r in await reloaded.search("queue")] == [r["id"] for r in before]
+
+    async def test_reconciles_with_files_on_disk(self, tmp_path):
+        """Files added or deleted behind the index's back are picked up on load."""
+        archive = make_archive(tmp_path)
+        await populate(archive, 5)
+        removed = archive.list_all()[0]
+        (tmp_path / removed.type.value / f"{removed.id}.json").unlink()
+        (tmp_path / "pattern" / "manual01.json").write_text(json.dumps({
+            "id": "manual01", "type": "pattern", "title": "Hand written", "description": "Added by hand",
+            "created_at": "2026-01-01T00:00:00Z", "tags": ["manual"],
+        }))
+
+        reloaded = make_archive(tmp_path)
+        assert len(reloaded.index) == 5
+        assert removed.id not in reloaded.index.positions
+        assert (await reloaded.search("hand written"))[0]["id"] == "manual01"
+
+    async def test_rebuild_after_corruption(self, tmp_path):
+        """A truncated manifest line and a partial matrix row do not break loading."""
+        archive = make_archive(tmp_path)
+        await populate(archive, 5)
+        with open(archive.index.manifest_file, "a") as f:
+            f.write('{"id": "half')
+        with open(archive.index.matrix_file, "ab") as f:
+            f.write(b"\0" * 10)
+
+        reloaded = make_archive(tmp_path)
+        assert len(reloaded.index) == 5
+        assert reloaded.index.rows == 5
+
+        (tmp_path / ".index" / "meta.json").write_text("{}")
+        rebuilt = make_archive(tmp_path)
+        assert len(rebuilt.index) == 5
+
+    async def test_dimension_change_falls_back_to_keywords(self, tmp_path):
+        archive = make_archive(tmp_path, dim=16)
+        await populate(archive, 3)
+        archive.embedder = FakeEmbedder(dim=8)
+        await archive.archive(ArchiveRequest(type="pattern", title="Other model", description="8 dims"))
+
+        assert archive.index.rows == 3
+        assert (await archive.search("other model"))[0]["title"] == "Other model"
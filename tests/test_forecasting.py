@@ -0,0 +1,251 @@
+"""
+Tests for in-process forecasting: ring buffers, vectorized linear and Holt
+fits, backtests on the recorded fixture, and predictive maintenance served
+from ingested range data.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hydra_tools import prometheus_query
+from hydra_tools.forecasting import SeriesBuffer, backtest, fit_forecast, fit_holt, fit_linear
+from hydra_tools.predictive_maintenance import FORECAST_GROUPS, PredictionSeverity, PredictiveMaintenanceEngine
+from tests.fake_prometheus import FakePrometheus
+
+FIXTURE = Path(__file__).parent / "fixtures" / "forecasting" / "cluster-36h.json"
+NOW = 1_790_006_400.0  # multiple of the 60s grid
+GROUPS = {group.name: group for group in FORECAST_GROUPS}
+
+
+def buffer_from(values: np.ndarray, step: float = 60.0) -> SeriesBuffer:
+    buffer = SeriesBuffer(values.shape[1], step)
+    times = np.arange(values.shape[1]) * step
+    buffer.extend((row, {"row": str(row)}, times, values[row]) for row in range(len(values)))
+    return buffer
+
+
+def load_fixture():
+    data = json.loads(FIXTURE.read_text())
+    return data["step"], {
+        name: np.array([[np.nan if v is None else v for v in s["values"]] for s in series], dtype=float)
+        for name, series in data["groups"].items()
+    }
+
+
+class TestSeriesBuffer:
+    """Tests for the per-group ring buffer."""
+
+    def test_ring_keeps_latest_window(self):
+        buffer = SeriesBuffer(capacity=5, step=60)
+        buffer.extend([("a", {}, [i * 60 for i in range(8)], list(range(8)))])
+        times, values = buffer.window()
+        assert times.tolist() == [180, 240, 300, 360, 420] and values.tolist() == [[3, 4, 5, 6, 7]]
+
+        # A gap clears the slots it skips; late samples inside the window land in place
+        buffer.extend([("a", {}, [600], [10]), ("b", {}, [480, 540], [1, 2])])
+        times, values = buffer.window()
+        assert times[-1] == 600
+        assert np.isnan(values[0, 2:4]).all() and values[0].tolist()[:2] == [6, 7] and values[0, 4] == 10
+        assert values[1].tolist()[2:4] == [1, 2]
+
+    def test_rows_grow_and_compact(self):
+        buffer = SeriesBuffer(capacity=4, step=60, initial_rows=2)
+        buffer.extend((f"s{i}", {"i": str(i)}, [0, 60], [i, i]) for i in range(40))
+        assert len(buffer) == 40 and buffer.window()[1][39].tolist()[-2:] == [39, 39]
+
+        buffer.extend((f"s{i}", {"i": str(i)}, [240, 300], [i, i]) for i in range(0, 40, 2))
+        assert buffer.compact() == 20
+        assert [labels["i"] for labels in buffer.labels] == [str(i) for i in range(0, 40, 2)]
+        assert buffer.window()[1][-1].tolist()[-1] == 38
+
+    def test_prometheus_matrix(self):
+        buffer = SeriesBuffer(capacity=10, step=60)
+        result = [{"metric": {"gpu": "0"}, "values": [[NOW - 60, "41.5"], [NOW, "42"]]}]
+        buffer.extend_matrix(result, tag=1)
+        buffer.extend_matrix(result, tag=0)
+        assert len(buffer) == 2 and buffer.labels[0] == {"gpu": "0"}
+        assert buffer.window()[1][:, -1].tolist() == [42, 42]
+
+
+class TestFits:
+    """Tests for the vectorized fits against reference implementations."""
+
+    def test_linear_matches_polyfit_with_gaps(self):
+        rng = np.random.default_rng(1)
+        values = rng.normal(0, 1, (50, 120)).cumsum(axis=1)
+        values[rng.random(values.shape) < 0.1] = np.nan
+        times = np.arange(120) * 60.0
+        fit = fit_linear(times, values)
+        for row in (0, 17, 49):
+            mask = ~np.isnan(values[row])
+            slope, intercept = np.polyfit(times[mask], values[row][mask], 1)
+            assert fit.slope[row] == pytest.approx(slope)
+            assert fit.level[row] == pytest.approx(intercept + slope * times[-1])
+
+    def test_trend_predictions_and_time_to_threshold(self):
+        ramp = 40 + 0.05 * np.arange(360)  # 3 %/hour at 60s steps
+        forecast = fit_forecast(buffer_from(np.vstack([ramp, np.full(360, 60.0)])))
+        for method in ("linear", "holt"):
+            assert forecast.predict(3600, method)[0] == pytest.approx(ramp[-1] + 3, abs=0.05)
+            hours = forecast.time_to(90, method) / 3600
+            assert hours[0] == pytest.approx((90 - ramp[-1]) / 3, rel=0.01) and hours[1] == np.inf
+        assert forecast.latest.tolist() == pytest.approx([ramp[-1], 60.0])  # stored as float32
+
+    def test_rate_fits_recent_window(self):
+        # Flat for 20 minutes, then climbing 1 °C/min: only the last 10 minutes count
+        values = np.concatenate([np.full(20, 60.0), 60 + np.arange(1, 11)])[None]
+        forecast = fit_forecast(buffer_from(values), rate_seconds=600)
+        assert forecast.rate[0] * 60 == pytest.approx(1.0)
+        assert forecast.slope("linear")[0] * 60 < 0.5
+        assert fit_forecast(buffer_from(values)).rate is None
+
+    def test_damped_trend_levels_off(self):
+        forecast = fit_forecast(buffer_from((40 + 0.05 * np.arange(360))[None]), damping=0.9)
+        # Total remaining rise is trend * 0.9 / 0.1, so 90% is never reached
+        level, ceiling = forecast.holt.level[0], forecast.holt.level[0] + 9 * forecast.holt.trend[0]
+        assert forecast.predict(86400)[0] == pytest.approx(ceiling)
+        assert forecast.time_to(90)[0] == np.inf
+        assert forecast.time_to((level + ceiling) / 2)[0] / 60 == pytest.approx(np.log(0.5) / np.log(0.9))
+
+    def test_seasonal_holt_winters(self):
+        t = np.arange(480)
+        values = (50 + 10 * np.sin(2 * np.pi * t / 60) + 0.01 * t)[None]
+        plain = fit_holt(values[:, :420])
+        seasonal = fit_holt(values[:, :420], season=60)
+        horizon = values[0, 420:450]
+
+        def forecast(fit, steps):
+            seasonal_part = fit.seasonal[0, (fit.season_phase + steps - 1) % 60] if fit.seasonal is not None else 0
+            return fit.level[0] + fit.trend[0] * steps + seasonal_part
+
+        plain_error = np.mean([abs(forecast(plain, h) - horizon[h - 1]) for h in range(1, 31)])
+        seasonal_error = np.mean([abs(forecast(seasonal, h) - horizon[h - 1]) for h in range(1, 31)])
+        assert seasonal_error < 1 < plain_error
+
+    def test_anomaly_scores_spike(self):
+        rng = np.random.default_rng(7)
+        values = 60 + rng.normal(0, 0.5, (3, 120))
+        values[1, -1] += 10
+        values[2, -1] = np.nan
+        anomaly = fit_forecast(buffer_from(values)).anomaly
+        assert anomaly[0] < 4 < 10 < anomaly[1] and anomaly[2] == 0
+
+
+class TestBacktest:
+    """Tests for rolling-origin backtests on the recorded fixture."""
+
+    def test_configured_methods_beat_predict_linear(self):
+        step, groups = load_fixture()
+        for name in ("disk", "vram", "thermal", "memory"):
+            group = GROUPS[name]
+            report = backtest(groups[name], step, group.window_seconds, group.horizon_seconds,
+                              stride=10, beta=group.beta, damping=group.damping)
+            assert report["origins"] > 0 and report["series"] == len(groups[name])
+            assert report[group.method]["mae"] <= report["linear"]["mae"], name
+
+    def test_trend_beats_naive_on_trending_series(self):
+        step, groups = load_fixture()
+        report = backtest(groups["memory"], step, 3600, 3600, stride=10)
+        assert report["linear"]["mae"] < report["naive"]["mae"]
+
+
+@pytest.fixture
+async def prometheus(monkeypatch):
+    monkeypatch.setattr(prometheus_query, "_prometheus_clients", {})
+    fake = FakePrometheus(delay=0)
+    disk, vram_nvidia, vram_dcgm, temp_nvidia, temp_dcgm, memory, score = (
+        query for group in FORECAST_GROUPS for query in group.queries
+    )
+    # Root disk fills at 1%/h from 80%, scratch stays flat
+    fake.add_history(disk, lambda t: 80 + (t - NOW) / 3600, instance="a:9100", mountpoint="/")
+    fake.add_history(disk, lambda t: 30.0, instance="b:9100", mountpoint="/scratch")
+    fake.add_history(vram_nvidia, lambda t: 50.0, instance="b:9835", gpu="0")
+    fake.add_history(vram_dcgm, lambda t: 70 + 25 * (t >= NOW - 1800), instance="a:9835", gpu="0")
+    fake.add_history(temp_nvidia, lambda t: 60.0 if t < NOW else None, instance="b:9835", gpu="0")
+    fake.add_history(temp_dcgm, lambda t: 70 + 0.2 * (t - NOW) / 60, instance="a:9835", gpu="1")
+    fake.add_history(memory, lambda t: 45.0, instance="a:9100")
+    fake.add_history(score, lambda t: 87.5)
+    with fake.serve() as url:
+        fake.url = url
+        yield fake
+    await prometheus_query.close_prometheus_client()
+
+
+class TestPredictiveEngine:
+    """Tests for predictive maintenance served from in-process forecasts."""
+
+    async def test_report_from_ingested_history(self, prometheus):
+        engine = PredictiveMaintenanceEngine(prometheus_url=prometheus.url)
+        await engine.refresh(now=NOW)
+        requests = prometheus.count("query_range")
+        assert requests == 7  # one range query per expression
+
+        report = await engine.get_full_health_report()
+        assert prometheus.count("query_range") == requests  # served from memory
+        assert report.overall_score == 87.5
+
+        root, scratch = sorted(report.disk_predictions, key=lambda p: p.mountpoint)
+        assert root.current_value == pytest.approx(80) and root.predicted_value == pytest.approx(100)
+        assert root.time_to_full_hours == pytest.approx(20, abs=0.1)
+        assert root.severity == PredictionSeverity.CRITICAL
+        assert scratch.time_to_full_hours is None and scratch.severity == PredictionSeverity.HEALTHY
+
+        vram = {p.node: p for p in report.vram_predictions}
+        assert vram["a:9835"].current_value == 95 and vram["a:9835"].severity == PredictionSeverity.CRITICAL
+        assert vram["b:9835"].severity == PredictionSeverity.HEALTHY
+
+        thermal = {p.node: p for p in report.thermal_predictions}
+        assert thermal["a:9835"].temp_change_rate == pytest.approx(0.2, abs=0.01)
+        # Damped trend: above the current 70°C, short of the straight-line 72°C
+        assert 71 < thermal["a:9835"].predicted_value < 72
+        assert thermal["b:9835"].current_value == 60  # last sample before the scrape gap
+        assert report.status == PredictionSeverity.CRITICAL
+        assert "[CRITICAL] Run emergency disk cleanup immediately" in report.recommendations
+        await engine.close()
+
+    async def test_incremental_refresh(self, prometheus):
+        engine = PredictiveMaintenanceEngine(prometheus_url=prometheus.url)
+        await engine.refresh(now=NOW)
+        await engine.refresh(now=NOW + 120)
+        disk = engine.forecaster.buffers["disk"]
+        assert disk.latest_slot * 60 == NOW + 120 and len(disk) == 2
+
+        # Only the new slots (plus late-sample overlap) are requested
+        assert len(engine.forecaster.buffers["thermal"]) == 2
+        root = next(p for p in await engine.get_disk_predictions() if p.mountpoint == "/")
+        assert root.current_value == pytest.approx(80 + 2 / 60, abs=0.01)
+        assert engine.forecaster.get_stats()["refreshes"] == 2
+        await engine.close()
+
+    async def test_first_request_starts_refresh_loop(self, prometheus):
+        engine = PredictiveMaintenanceEngine(prometheus_url=prometheus.url)
+        assert len(await engine.get_memory_predictions()) == 1
+        assert engine._refresher is not None and not engine._refresher.done()
+        await engine.get_thermal_predictions()
+        assert engine.forecaster.get_stats()["refreshes"] == 1
+        await engine.close()
+        assert engine._refresher is None
+
+    async def test_thousands_of_series(self, prometheus):
+        engine = PredictiveMaintenanceEngine(prometheus_url=prometheus.url)
+        rng = np.random.default_rng(3)
+        values = 55 + rng.normal(0, 1, (4000, 30)).cumsum(axis=1)
+        buffer = engine.forecaster.buffers["thermal"]
+        times = NOW - 60 * np.arange(29, -1, -1)
+        buffer.extend(((i,), {"gpu": str(i % 8), "instance": f"n{i // 8}"}, times, values[i]) for i in range(4000))
+        engine.forecaster.fit()
+        engine.rebuild()
+        engine._last_refresh = time.monotonic()
+        engine._ready.set()
+
+        report = await engine.get_full_health_report()
+        assert len(report.thermal_predictions) == 4000
+        hottest = int(np.argmax(values[:, -1]))
+        assert max(p.current_value for p in report.thermal_predictions) == pytest.approx(values[hottest, -1], abs=0.01)
+        anomalies = await engine.get_anomalies(threshold=0)
+        assert len(anomalies) == 4000 and anomalies[0].anomaly_score >= anomalies[-1].anomaly_score
+        await engine.close()
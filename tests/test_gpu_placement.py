@@ -0,0 +1,213 @@
+"""
+Tests for GPU placement: per-GPU reservations, best-fit decreasing packing
+with priority aging, and the autonomous scheduler starting several tasks per
+tick.
+"""
+
+import asyncio
+
+import pytest
+
+from hydra_tools import autonomous_queue
+from hydra_tools.autonomous_queue import (
+    AutonomousScheduler,
+    ClusterResources,
+    GPUStatus,
+    NodeStatus,
+    WorkItemCreate,
+    WorkPriority,
+    WorkType,
+)
+from hydra_tools.gpu_placement import PlacementEngine, TaskDemand
+
+NOW = 1_800_000_000.0
+
+
+def cluster(gpus, online=True):
+    """ClusterResources from {(node, index): (free_gb, total_gb, util)}."""
+    nodes = {}
+    for (node, index), (free, total, util) in gpus.items():
+        nodes.setdefault(node, []).append(GPUStatus(
+            node=node, gpu_index=index, gpu_name="GPU", utilization_percent=util,
+            vram_used_gb=total - free, vram_total_gb=total, vram_free_gb=free,
+            temperature_f=120, power_watts=100, available_for_work=True,
+        ))
+    return ClusterResources(
+        timestamp="", total_gpus=len(gpus), available_gpus=len(gpus), total_vram_gb=0, free_vram_gb=0,
+        cluster_gpu_util=0, can_accept_inference=True, can_accept_image_gen=True,
+        nodes=[NodeStatus(name=name, ip="", online=online, capabilities=[], gpus=node_gpus,
+                          total_vram_gb=0, free_vram_gb=0, avg_gpu_util=0)
+               for name, node_gpus in nodes.items()],
+    )
+
+
+def task(task_id, vram=8, priority="normal", waited=0, util=20, node="hydra-compute", gpu=True):
+    return TaskDemand(task_id=task_id, work_type="asset_generation", priority=priority,
+                      submitted_at=NOW - waited, requires_gpu=gpu, vram_gb=vram if gpu else 0,
+                      util_percent=util if gpu else 0, node_affinity=[node] if node else [])
+
+
+@pytest.fixture
+def engine():
+    thresholds = {"gpu_util_max": 50, "vram_free_min_gb": 4}
+    engine = PlacementEngine(thresholds, aging_seconds=1800, starvation_seconds=3600, clock=lambda: NOW)
+    engine.observe(cluster({("hydra-compute", 0): (10, 16, 0), ("hydra-compute", 1): (16, 16, 0),
+                            ("hydra-ai", 0): (20, 32, 10)}))
+    return engine
+
+
+def targets(placements):
+    return {p.task.task_id: p.reservation.target for p in placements}
+
+
+class TestPacking:
+    """Tests for best-fit decreasing placement within one tick."""
+
+    def test_several_tasks_per_tick_best_fit(self, engine):
+        placed = engine.place([task(1, vram=4), task(2, vram=8), task(3, vram=8), task(4, vram=12)], slots=10)
+        # Largest first: 12 GB only fits GPU 1, the first 8 GB fits GPU 0 tightest,
+        # the second fits nowhere and 4 GB takes GPU 1's remainder
+        assert [p.task.task_id for p in placed] == [4, 2, 1]
+        assert targets(placed) == {4: "hydra-compute/gpu1", 2: "hydra-compute/gpu0", 1: "hydra-compute/gpu1"}
+
+        stats = {(g["node"], g["gpu_index"]): g for g in engine.get_stats()["gpus"]}
+        assert stats[("hydra-compute", 0)]["effective_free_gb"] == 2
+        assert stats[("hydra-compute", 1)]["effective_free_gb"] == 0
+        assert engine.place([task(3, vram=8)], slots=10) == []
+
+    def test_slots_and_affinity(self, engine):
+        placed = engine.place([task(1, vram=4), task(2, vram=4), task(3, vram=4, node="hydra-ai")], slots=2)
+        assert len(placed) == 2
+        assert targets(engine.place([task(3, vram=4, node="hydra-ai")], slots=5)) == {3: "hydra-ai/gpu0"}
+
+    def test_utilization_reserved(self, engine):
+        placed = engine.place([task(i, vram=4, util=25) for i in range(1, 6)], slots=10)
+        # Two 25% tasks reach the 50% limit on each GPU; the fifth waits
+        assert [p.reservation.gpu_index for p in placed] == [0, 0, 1, 1]
+        assert engine.place([task(6, vram=4, util=40, node="hydra-ai")], slots=1)
+        # Reservations count towards the utilization limit before the metrics show them
+        assert engine.place([task(7, vram=4, util=25, node="hydra-ai")], slots=1) == []
+
+    def test_non_gpu_work(self, engine):
+        placed = engine.place([task(1, gpu=False, node="hydra-storage"), task(2, gpu=False, node=None)], slots=5)
+        assert targets(placed) == {1: "hydra-storage", 2: "any"}
+
+
+class TestReservations:
+    """Tests for reservations against observed usage."""
+
+    def test_reservation_counts_until_usage_shows(self, engine):
+        engine.place([task(1, vram=4)], slots=1)
+        # Metrics still show the GPU as it was; the claim is still subtracted
+        engine.observe(cluster({("hydra-compute", 0): (10, 16, 0), ("hydra-compute", 1): (16, 16, 0)}))
+        gpu = engine.gpus[("hydra-compute", 0)]
+        assert gpu.effective_free_gb == 6 and gpu.drift_gb == -4
+        assert targets(engine.place([task(2, vram=8)], slots=1)) == {2: "hydra-compute/gpu1"}
+
+        # Task 1 turns out to use 7 GB: the observed value wins and drift shows it
+        engine.release(2)
+        engine.observe(cluster({("hydra-compute", 0): (3, 16, 30), ("hydra-compute", 1): (16, 16, 0)}))
+        assert gpu.effective_free_gb == 3 and gpu.drift_gb == 3
+        assert targets(engine.place([task(3, vram=4, util=10)], slots=1)) == {3: "hydra-compute/gpu1"}
+
+    def test_release_frees_capacity(self, engine):
+        engine.place([task(1, vram=12)], slots=1)
+        assert not engine.place([task(2, vram=12)], slots=1)
+        assert engine.release(1).target == "hydra-compute/gpu1"
+        assert engine.release(1) is None
+        assert targets(engine.place([task(2, vram=12)], slots=1)) == {2: "hydra-compute/gpu1"}
+        assert engine.get_stats()["released"] == 1
+
+    def test_missing_gpu_keeps_reservation(self, engine):
+        engine.place([task(1, vram=12)], slots=1)
+        engine.observe(cluster({("hydra-compute", 0): (10, 16, 0)}))
+        gpu = engine.gpus[("hydra-compute", 1)]
+        assert not gpu.online and 1 in gpu.reservations
+        placed = engine.place([task(2, vram=4, util=10), task(3, vram=4, util=10)], slots=5)
+        assert set(targets(placed).values()) == {"hydra-compute/gpu0"}
+
+
+class TestPriorityAndAging:
+    """Tests for ranking and starvation protection."""
+
+    def test_aging_promotes_old_low_priority(self, engine):
+        engine.observe(cluster({("hydra-compute", 0): (8, 16, 0)}))
+        old_low = task(1, vram=4, priority="low", waited=3 * 1800)
+        new_high = task(2, vram=4, priority="high")
+        new_normal = task(3, vram=4)
+        assert [p.task.task_id for p in engine.place([new_normal, new_high, old_low], slots=1)] == [1]
+        assert [p.task.task_id for p in engine.place([new_normal, new_high], slots=1)] == [2]
+
+    def test_aging_stops_below_urgent(self, engine):
+        engine.observe(cluster({("hydra-compute", 0): (8, 16, 0)}))
+        ancient = task(1, vram=4, priority="low", waited=24 * 3600)
+        urgent = task(2, vram=4, priority="urgent")
+        assert engine.effective_priority(ancient, NOW) == engine.effective_priority(task(3, priority="high"), NOW)
+        assert [p.task.task_id for p in engine.place([ancient, urgent], slots=1)] == [2]
+
+    def test_starving_task_holds_gpu(self, engine):
+        engine.observe(cluster({("hydra-compute", 0): (16, 16, 0), ("hydra-compute", 1): (16, 16, 0)}))
+        engine.place([task(1, vram=10), task(2, vram=10)], slots=2)
+
+        big = task(3, vram=12, priority="low", waited=2 * 3600)
+        small = [task(4, vram=4), task(5, vram=4)]
+        # Big has aged to urgent but cannot fit; it holds one GPU so only the other is backfilled
+        placed = engine.place([big, *small], slots=5)
+        assert len(placed) == 1 and len(engine.get_stats()["held_gpus"]) == 1
+        held = engine.get_stats()["held_gpus"][0]
+        assert placed[0].reservation.target != held
+
+        engine.release(1)
+        engine.release(2)
+        assert targets(engine.place([big], slots=1))[3] in ("hydra-compute/gpu0", "hydra-compute/gpu1")
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(autonomous_queue, "DB_PATH", tmp_path / "queue.db")
+    autonomous_queue.init_db()
+
+
+class TestScheduler:
+    """Tests for the scheduler's use of placement."""
+
+    async def test_starts_several_and_releases(self, queue_db, monkeypatch):
+        resources = cluster({("hydra-compute", 0): (16, 16, 0), ("hydra-compute", 1): (16, 16, 0)})
+
+        async def get_cluster_resources(force_refresh=False):
+            return resources
+
+        gate = asyncio.Event()
+        processed = []
+
+        async def process_work_item(item_id):
+            processed.append(item_id)
+            await gate.wait()
+
+        monkeypatch.setattr(autonomous_queue.resource_monitor, "get_cluster_resources", get_cluster_resources)
+        monkeypatch.setattr(autonomous_queue, "process_work_item", process_work_item)
+
+        for title, work_type in (("chapter", WorkType.CHAPTER_GENERATION), ("assets", WorkType.ASSET_GENERATION),
+                                 ("research", WorkType.RESEARCH), ("cleanup", WorkType.MAINTENANCE)):
+            await autonomous_queue.add_to_queue(WorkItemCreate(
+                work_type=work_type, title=title, priority=WorkPriority.NORMAL, notify_discord=False,
+            ))
+
+        scheduler = AutonomousScheduler()
+        picked = await scheduler._pick_tasks(slots=10)
+        # The two 8 GB tasks pack onto one GPU, leaving the other for research
+        assert {row["title"]: p.reservation.target for row, p in picked} == {
+            "chapter": "hydra-compute/gpu0", "assets": "hydra-compute/gpu0",
+            "research": "hydra-compute/gpu1", "cleanup": "hydra-storage",
+        }
+
+        for row, _ in picked:
+            scheduler._current_tasks[row["id"]] = asyncio.create_task(scheduler._process_task_safely(row["id"]))
+        await asyncio.sleep(0)
+        assert len(scheduler.status["placements"]) == 4
+        # Already-running rows are not placed again
+        assert [row["title"] for row, _ in await scheduler._pick_tasks(slots=10)] == []
+
+        gate.set()
+        await asyncio.gather(*scheduler._current_tasks.values())
+        assert scheduler.status["placements"] == {} and scheduler._tasks_processed == 4
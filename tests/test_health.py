@@ -243,3 +243,184 @@ class TestHealthAggregator:
 
             # Should be called twice with force_refresh
             assert mock_check.call_count == 2
+
+
+class TestProbePolicy:
+    """Tests for adaptive probe intervals."""
+
+    def test_stable_service_backs_off(self):
+        """Repeated identical results stretch the interval up to the max."""
+        from hydra_health.checks import ServiceCheck
+        from hydra_health.prober import ProbePolicy, ProbeState
+
+        policy = ProbePolicy(base_interval=10, min_interval=2, max_interval=40,
+                             stable_checks_before_backoff=1)
+        state = ProbeState(service=ServiceCheck("svc", "http://x", "n"), interval=10)
+        state.result = MagicMock()
+        state.stable_checks = 1
+
+        intervals = []
+        for _ in range(6):
+            state.interval = policy.next_interval(state, status_changed=False)
+            intervals.append(state.interval)
+
+        assert intervals == sorted(intervals)
+        assert intervals[-1] == 40
+
+    def test_status_change_probes_fast(self):
+        """A status change drops the interval to the minimum."""
+        from hydra_health.checks import ServiceCheck
+        from hydra_health.prober import ProbePolicy, ProbeState
+
+        policy = ProbePolicy(min_interval=2)
+        state = ProbeState(service=ServiceCheck("svc", "http://x", "n"), interval=90)
+        state.result = MagicMock()
+
+        assert policy.next_interval(state, status_changed=True) == 2
+
+
+class TestBackgroundProbing:
+    """Tests for background probing through the aggregator."""
+
+    @staticmethod
+    def make_services():
+        from hydra_health.checks import ServiceCheck
+
+        return [
+            ServiceCheck("Fast", "http://fast", "node-a", "inference"),
+            ServiceCheck("Slow", "http://slow", "node-b", "database", critical=False),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reads_are_served_from_store(self):
+        """Reads never call check_all_services once the prober is running."""
+        import asyncio
+        from hydra_health.checks import CheckResult, CheckStatus
+        from hydra_health.server import HealthAggregator
+
+        calls = []
+
+        async def probe(service, client):
+            calls.append(service.name)
+            return CheckResult(service=service.name, status=CheckStatus.HEALTHY, latency_ms=1)
+
+        aggregator = HealthAggregator(services=self.make_services())
+        with patch("hydra_health.server.check_all_services") as mock_check, \
+                patch("hydra_health.prober.check_service", probe):
+            await aggregator.start_background()
+            try:
+                await aggregator.prober.refresh_all()
+                probes_before = len(calls)
+                for _ in range(100):
+                    health = await aggregator.get_health()
+                await asyncio.sleep(0)
+            finally:
+                await aggregator.stop_background()
+
+        mock_check.assert_not_called()
+        assert len(calls) == probes_before
+        assert health.summary.total == 2
+        assert health.nodes["node-b"]["healthy"] == 1
+        assert all(s.interval_seconds is not None for s in health.services)
+
+    @pytest.mark.asyncio
+    async def test_slow_service_does_not_delay_others(self):
+        """A fast service's result is published while a slow probe is pending."""
+        import asyncio
+        from hydra_health.checks import CheckResult, CheckStatus
+        from hydra_health.server import HealthAggregator
+
+        release = asyncio.Event()
+
+        async def probe(service, client):
+            if service.name == "Slow":
+                await release.wait()
+            return CheckResult(service=service.name, status=CheckStatus.HEALTHY, latency_ms=1)
+
+        aggregator = HealthAggregator(services=self.make_services())
+        with patch("hydra_health.prober.check_service", probe):
+            await aggregator.start_background()
+            try:
+                for _ in range(50):
+                    fast = await aggregator.get_service("Fast")
+                    if fast.status == CheckStatus.HEALTHY:
+                        break
+                    await asyncio.sleep(0.01)
+                health = await aggregator.get_health()
+                statuses = {s.service: s.status for s in health.services}
+                assert statuses == {"Fast": CheckStatus.HEALTHY, "Slow": CheckStatus.UNKNOWN}
+                assert health.summary.total == 2
+                assert health.summary.status == CheckStatus.UNKNOWN
+                release.set()
+                await aggregator.prober.refresh("Slow")
+                health = await aggregator.get_health()
+                assert health.summary.status == CheckStatus.HEALTHY
+            finally:
+                release.set()
+                await aggregator.stop_background()
+
+    @pytest.mark.asyncio
+    async def test_unprobed_services_are_unknown(self):
+        """Every configured service is in the view before its first probe."""
+        from hydra_health.checks import CheckStatus
+        from hydra_health.server import HealthAggregator
+
+        aggregator = HealthAggregator(services=self.make_services())
+        aggregator._rebuild()
+
+        assert aggregator._cache.summary.total == 2
+        assert aggregator._cache.summary.status == CheckStatus.UNKNOWN
+        slow = await aggregator.get_service("slow")
+        assert slow is not None and slow.status == CheckStatus.UNKNOWN
+
+    @pytest.mark.asyncio
+    async def test_stop_right_after_probe_completes(self):
+        """Stopping immediately after a probe wakes the loop does not hang."""
+        import asyncio
+        from hydra_health.checks import CheckResult, CheckStatus
+        from hydra_health.prober import HealthProber
+
+        async def probe(service, client):
+            return CheckResult(service=service.name, status=CheckStatus.HEALTHY, latency_ms=1)
+
+        for _ in range(20):
+            prober = HealthProber(services=self.make_services(), probe=probe, client=MagicMock())
+            await prober.start()
+            await prober.refresh("Fast")
+            await asyncio.wait_for(prober.stop(), timeout=2)
+            assert not prober.running
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_single_flight(self):
+        """Concurrent refreshes of one service share a single probe."""
+        import asyncio
+        from hydra_health.checks import CheckResult, CheckStatus
+        from hydra_health.prober import HealthProber
+
+        calls = []
+
+        async def probe(service, client):
+            calls.append(service.name)
+            await asyncio.sleep(0.01)
+            return CheckResult(service=service.name, status=CheckStatus.HEALTHY, latency_ms=1)
+
+        prober = HealthProber(services=self.make_services(), probe=probe, client=MagicMock())
+        await asyncio.gather(*(prober.refresh("Fast") for _ in range(20)))
+
+        assert calls == ["Fast"]
+
+    @pytest.mark.asyncio
+    async def test_stale_view_returned_while_revalidating(self):
+        """Without the prober, an expired view is served while one refresh runs."""
+        import asyncio
+        from hydra_health.server import HealthAggregator
+
+        aggregator = HealthAggregator(cache_ttl=0)
+        with patch("hydra_health.server.check_all_services") as mock_check:
+            mock_check.return_value = []
+            first = await aggregator.get_health()
+            results = await asyncio.gather(*(aggregator.get_health() for _ in range(10)))
+            await asyncio.sleep(0)
+
+            assert all(r is first for r in results)
+            assert mock_check.call_count == 2
@@ -0,0 +1,257 @@
+"""
+Tests for the Home Assistant state mirror, its resync and client broadcasts,
+against a local fake Home Assistant WebSocket server.
+"""
+
+import asyncio
+import json
+from itertools import count
+
+import httpx
+import pytest
+import websockets
+from fastapi import FastAPI
+
+from hydra_tools import home_automation
+from hydra_tools.home_automation import ClientChannel, EntityStateTracker, HomeStateMirror
+
+TOKEN = "test-token"
+_clock = count(1)
+
+
+def ha_state(entity_id, state, **attributes):
+    stamp = f"2026-01-01T00:00:{next(_clock):06.3f}+00:00"
+    return {"entity_id": entity_id, "state": state, "attributes": attributes,
+            "last_changed": stamp, "last_updated": stamp}
+
+
+class FakeHomeAssistant:
+    """The parts of HA's WebSocket API the tracker uses."""
+
+    def __init__(self):
+        self.states = {s["entity_id"]: s for s in [
+            ha_state("light.kitchen_ceiling", "off", friendly_name="Kitchen Ceiling"),
+            ha_state("light.desk", "on", friendly_name="Desk Lamp"),
+            ha_state("sensor.office_temperature", "21.5"),
+            ha_state("switch.coffee", "off", friendly_name="Coffee Maker"),
+            ha_state("scene.movie", "scening", friendly_name="Movie"),
+        ]}
+        self.areas = [{"area_id": "office", "name": "Study"}]
+        self.devices = [{"id": "dev-desk", "area_id": "office"}]
+        self.entities = [{"entity_id": "light.desk", "device_id": "dev-desk", "area_id": None},
+                         {"entity_id": "switch.coffee", "device_id": None, "area_id": "kitchen"}]
+        self.connections = []
+        self.subscriptions = {}
+        self.requests = []
+
+    async def handler(self, ws):
+        self.connections.append(ws)
+        await ws.send(json.dumps({"type": "auth_required"}))
+        auth = json.loads(await ws.recv())
+        if auth.get("access_token") != TOKEN:
+            await ws.send(json.dumps({"type": "auth_invalid"}))
+            return
+        await ws.send(json.dumps({"type": "auth_ok"}))
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                self.requests.append(msg["type"])
+                result = {
+                    "get_states": lambda: list(self.states.values()),
+                    "config/area_registry/list": lambda: self.areas,
+                    "config/device_registry/list": lambda: self.devices,
+                    "config/entity_registry/list": lambda: self.entities,
+                }.get(msg["type"], lambda: None)()
+                if msg["type"] == "subscribe_events":
+                    self.subscriptions[ws] = msg["id"]
+                await ws.send(json.dumps({"id": msg["id"], "type": "result", "success": True, "result": result}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.subscriptions.pop(ws, None)
+
+    async def set_state(self, entity_id, state, notify=True, **attributes):
+        old = self.states.get(entity_id)
+        new = ha_state(entity_id, state, **attributes) if state is not None else None
+        if new:
+            self.states[entity_id] = new
+        else:
+            self.states.pop(entity_id, None)
+        if notify:
+            for ws, sub_id in list(self.subscriptions.items()):
+                await ws.send(json.dumps({"id": sub_id, "type": "event", "event": {
+                    "event_type": "state_changed",
+                    "data": {"entity_id": entity_id, "old_state": old, "new_state": new},
+                }}))
+
+    async def drop(self):
+        for ws in self.connections:
+            await ws.close()
+
+
+@pytest.fixture
+async def fake_ha():
+    ha = FakeHomeAssistant()
+    async with websockets.serve(ha.handler, "127.0.0.1", 0) as server:
+        ha.url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        yield ha
+
+
+@pytest.fixture
+async def tracker(fake_ha):
+    tracker = EntityStateTracker(url=fake_ha.url, token=TOKEN)
+    assert await tracker.start()
+    yield tracker
+    await tracker.stop()
+
+
+class FakeClient:
+    """A WebSocket client endpoint recording what it is sent."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.messages = []
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.messages.append(json.loads(text))
+
+    def updates(self):
+        return {m["entity_id"]: m.get("state", {}).get("state") if m["type"] == "state_changed" else None
+                for m in self.messages if m["type"] in ("state_changed", "state_removed")}
+
+
+async def eventually(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+class TestHomeStateMirror:
+    """Tests for the indexed in-memory mirror."""
+
+    def test_indexes_and_views(self):
+        ha = FakeHomeAssistant()
+        mirror = HomeStateMirror()
+        mirror.load_registries(ha.areas, ha.devices, ha.entities)
+        mirror.seed(list(ha.states.values()))
+
+        assert mirror.entities(area_id="office") == ["light.desk", "sensor.office_temperature"]
+        assert mirror.entities(device_id="dev-desk") == ["light.desk"]
+        assert mirror.entities(area_id="kitchen", domain="light") == ["light.kitchen_ceiling"]
+        rooms = {r.id: r for r in mirror.rooms()}
+        assert rooms["office"].name == "Study" and rooms["office"].temp == 21.5 and rooms["office"].lights_on
+        assert rooms["kitchen"].devices == 2 and not rooms["kitchen"].lights_on
+        assert [d.entity_id for d in mirror.devices("kitchen")] == ["light.kitchen_ceiling", "switch.coffee"]
+        assert [s.name for s in mirror.scenes()] == ["Movie"]
+
+    def test_apply_and_diff_from_snapshot(self):
+        ha = FakeHomeAssistant()
+        mirror = HomeStateMirror()
+        mirror.seed(list(ha.states.values()))
+
+        old = ha.states["light.desk"]
+        newer = ha_state("light.desk", "off")
+        assert mirror.apply({"entity_id": "light.desk", "new_state": newer}) == "changed"
+        assert mirror.apply({"entity_id": "light.desk", "new_state": old}) is None  # stale
+        assert mirror.apply({"entity_id": "scene.movie", "new_state": None}) == "removed"
+        assert mirror.entities(domain="scene") == []
+
+        snapshot = list(ha.states.values())
+        snapshot.append(ha_state("light.hall", "on"))
+        changed, removed = mirror.seed(snapshot)
+        assert sorted(changed) == ["light.desk", "light.hall", "scene.movie"] and removed == []
+        assert mirror.seed(snapshot) == ([], [])
+
+
+class TestEntityStateTracker:
+    """Tests for seeding, live events and reconnect resync over WebSocket."""
+
+    async def test_seeds_and_applies_events(self, fake_ha, tracker):
+        assert tracker.mirror.get_stats()["entities"] == 5
+        assert tracker.mirror.entities(area_id="office", domain="light") == ["light.desk"]
+        assert fake_ha.requests.count("get_states") == 1
+
+        await fake_ha.set_state("light.kitchen_ceiling", "on")
+        await eventually(lambda: tracker.get_state("light.kitchen_ceiling")["state"] == "on")
+        assert {r.id: r.lights_on for r in tracker.mirror.rooms()}["kitchen"] is True
+        assert fake_ha.requests.count("get_states") == 1
+
+    async def test_reconnect_resyncs_from_snapshot(self, fake_ha, tracker):
+        client = FakeClient()
+        tracker.add_client(client)
+        await fake_ha.drop()
+        await fake_ha.set_state("light.desk", "off", notify=False)
+        await fake_ha.set_state("scene.movie", None, notify=False)
+
+        await eventually(lambda: tracker.get_status()["resyncs"] == 1)
+        await eventually(lambda: len(client.messages) == 2)
+        assert client.updates() == {"light.desk": "off", "scene.movie": None}
+        assert tracker.get_status()["connected"]
+
+        await fake_ha.set_state("switch.coffee", "on")
+        await eventually(lambda: client.updates().get("switch.coffee") == "on")
+
+
+class TestClientBroadcast:
+    """Tests for coalesced, concurrent, backpressured client updates."""
+
+    async def test_bursts_are_coalesced(self):
+        client = FakeClient()
+        channel = ClientChannel(client, initial={"type": "initial_state"}, coalesce_seconds=0.02)
+        for brightness in range(50):
+            channel.push("light.desk", {"state": "on", "attributes": {"brightness": brightness}})
+        channel.push("light.hall", {"state": "off"})
+        await eventually(lambda: len(client.messages) == 3)
+        await asyncio.sleep(0.05)
+
+        assert [m["type"] for m in client.messages] == ["initial_state", "state_changed", "state_changed"]
+        assert client.messages[1]["state"]["attributes"]["brightness"] == 49
+        assert channel.stats == {"sent": 3, "coalesced": 49}
+        await channel.close()
+
+    async def test_slow_client_does_not_delay_others(self, fake_ha, tracker):
+        stuck = FakeClient(delay=10)
+        fast = FakeClient()
+        tracker.add_client(stuck)
+        tracker.add_client(fast)
+        tracker._channels[stuck].send_timeout = 0.1
+
+        await fake_ha.set_state("light.desk", "off")
+        await eventually(lambda: "light.desk" in fast.updates())
+        await eventually(lambda: tracker.get_status()["clients_dropped"] == 1)
+        assert tracker.get_status()["connected_clients"] == 1
+
+
+class TestReadEndpoints:
+    """Tests for read endpoints served from the mirror."""
+
+    async def test_reads_do_not_hit_rest_api(self, fake_ha, tracker, monkeypatch):
+        rest_calls = []
+        rest = home_automation.HomeAssistantClient(url=fake_ha.url, token=TOKEN)
+        rest._client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: rest_calls.append(request.url.path) or httpx.Response(200, json={"result": "ok"})
+        ))
+        monkeypatch.setattr(home_automation, "_entity_tracker", tracker)
+        monkeypatch.setattr(home_automation, "_ha_client", rest)
+
+        app = FastAPI()
+        app.include_router(home_automation.create_home_automation_router())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            rooms = (await http.get("/home/rooms")).json()["rooms"]
+            devices = (await http.get("/home/devices", params={"room_id": "office"})).json()["devices"]
+            status = (await http.get("/home/status")).json()
+            entity = (await http.get("/home/entity/switch.coffee")).json()
+            missing = await http.get("/home/entity/light.nowhere")
+            assert rest_calls == []
+
+            lights = (await http.post("/home/room/kitchen/lights/on")).json()["controlled"]
+
+        assert {r["id"] for r in rooms} == {"office", "kitchen"}
+        assert [d["entity_id"] for d in devices] == ["light.desk"]
+        assert status["source"] == "websocket" and status["entities"] == 5
+        assert entity["state"] == "off" and missing.status_code == 404
+        assert [light["entity_id"] for light in lights] == ["light.kitchen_ceiling"]
+        assert rest_calls == ["/api/services/light/turn_on"]
+        await rest.close()
@@ -0,0 +1,160 @@
+"""
+Tests for the API load testing harness.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from hydra_tools.load_testing import (
+    LoadEndpoint,
+    LoadTestRunner,
+    StubBackends,
+    compare_reports,
+    fake_embedding,
+    load_baseline,
+    parse_mix,
+    save_baseline,
+    stub_transport_installed,
+)
+from hydra_tools.semantic_cache import CacheConfig, SemanticCache
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    @app.post("/echo")
+    async def echo(payload: dict):
+        await asyncio.sleep(0.002)
+        return payload
+
+    @app.get("/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    @app.get("/events")
+    async def events():
+        async def generate():
+            yield "event: connected\ndata: {}\n\n"
+            while True:
+                await asyncio.sleep(0.05)
+                yield ": keepalive\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    return app
+
+
+ENDPOINTS = {
+    "fast": LoadEndpoint("fast", "GET", "/fast"),
+    "echo": LoadEndpoint("echo", "POST", "/echo", body=lambda n: {"n": n}),
+    "broken": LoadEndpoint("broken", "GET", "/broken"),
+    "events": LoadEndpoint("events", "GET", "/events", stream=True),
+}
+
+
+async def run(mix, **kwargs):
+    runner = LoadTestRunner(
+        make_app(), mix, duration=0.3, warmup=0.05, concurrency=4, endpoints=ENDPOINTS, **kwargs
+    )
+    return await runner.run()
+
+
+class TestLoadTestRunner:
+    """Tests for driving an ASGI app."""
+
+    @pytest.mark.asyncio
+    async def test_closed_loop_reports_per_endpoint_stats(self):
+        """Every endpoint in the mix is exercised and summarized."""
+        report = await run({"fast": 3, "echo": 1, "events": 1})
+
+        assert report.mode == "closed-loop"
+        assert set(report.endpoints) == {"fast", "echo", "events"}
+        assert report.total.requests == sum(s.requests for s in report.endpoints.values())
+        assert report.endpoints["fast"].status_codes == {"200": report.endpoints["fast"].requests}
+        assert report.endpoints["events"].requests > 0
+        assert report.total.p50_ms <= report.total.p99_ms <= report.total.max_ms
+        assert report.loop_lag_ms["max_ms"] >= 0
+        assert report.error_rate == 0
+
+    @pytest.mark.asyncio
+    async def test_open_loop_counts_server_errors(self):
+        """Open-loop runs follow the target rate; 5xx responses count as errors."""
+        report = await run({"fast": 1, "broken": 1}, rps=200)
+
+        assert report.mode == "open-loop"
+        assert 30 <= report.total.requests <= 70
+        assert report.endpoints["broken"].errors == report.endpoints["broken"].requests
+        assert report.endpoints["fast"].errors == 0
+
+    def test_unknown_endpoint_rejected(self):
+        """Mixes may only name known endpoints."""
+        with pytest.raises(ValueError):
+            parse_mix("cache_lookup=2,nope=1")
+        assert parse_mix("cache_lookup=2,events_stream") == {"cache_lookup": 2.0, "events_stream": 1.0}
+
+
+class TestBaselines:
+    """Tests for saving and diffing runs."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_and_regression_detection(self, tmp_path):
+        """A saved baseline reloads intact and slower runs are flagged."""
+        report = await run({"fast": 1})
+        save_baseline(report, "main", tmp_path)
+        baseline = load_baseline("main", tmp_path)
+        assert baseline.total == report.total
+
+        assert not any(row["regressed"] for row in compare_reports(baseline, baseline))
+
+        slower = load_baseline("main", tmp_path)
+        slower.endpoints["fast"].p99_ms = baseline.endpoints["fast"].p99_ms + 50
+        slower.total.throughput_rps = baseline.total.throughput_rps / 2
+        regressed = {(r["scope"], r["metric"]) for r in compare_reports(baseline, slower) if r["regressed"]}
+        assert regressed == {("fast", "p99_ms"), ("overall", "throughput_rps")}
+
+    def test_baseline_name_validated(self, tmp_path):
+        """Baseline names cannot escape the baseline directory."""
+        with pytest.raises(ValueError):
+            load_baseline("../etc/passwd", tmp_path)
+
+
+class TestStubBackends:
+    """Tests for the in-memory backend stand-ins."""
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_runs_against_stub_qdrant_and_ollama(self):
+        """The real semantic cache stores and hits through the stub transport."""
+        backends = StubBackends()
+        with stub_transport_installed(backends):
+            cache = SemanticCache(CacheConfig(collection_name="loadtest"))
+            assert await cache.store("Restart the ComfyUI container", "done", "qwen")
+            hit = await cache.lookup("Restart the ComfyUI container", "qwen")
+            miss = await cache.lookup("Completely unrelated words here", "qwen")
+            await cache.close()
+
+        assert hit is not None and hit[0] == "done"
+        assert miss is None
+        assert backends.requests["qdrant"] >= 3
+        assert backends.requests["ollama"] == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_backends_fail_fast(self):
+        """Unstubbed services answer 503 instead of timing out."""
+        with stub_transport_installed(StubBackends()):
+            async with httpx.AsyncClient() as client:
+                response = await client.get("http://192.168.1.244:5432/")
+        assert response.status_code == 503
+
+    def test_fake_embedding_is_deterministic_and_normalized(self):
+        """Same text, same unit vector."""
+        vector = fake_embedding("hello world")
+        assert vector == fake_embedding("hello world")
+        assert abs(sum(v * v for v in vector) - 1.0) < 1e-9
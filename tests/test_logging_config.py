@@ -0,0 +1,154 @@
+"""
+Tests for the structured logging pipeline.
+"""
+
+import asyncio
+import io
+import json
+import logging
+
+import pytest
+
+from hydra_tools.logging_config import (
+    ContextQueueHandler,
+    JSONFormatter,
+    LogContext,
+    LogPipeline,
+    LogSampler,
+    _PipelineStats,
+    request_id_ctx,
+)
+
+
+@pytest.fixture
+def pipeline():
+    """A pipeline writing JSON to a StringIO, attached to a private logger."""
+    stream = io.StringIO()
+    pipeline = LogPipeline(JSONFormatter(), [stream], queue_size=100)
+    logger = logging.getLogger("hydra_tools.tests.logging")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(pipeline.handler)
+    pipeline.start()
+
+    def lines():
+        pipeline.stop()
+        logger.removeHandler(pipeline.handler)
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield logger, pipeline, lines
+    pipeline.stop()
+    logger.removeHandler(pipeline.handler)
+
+
+def make_record(name="hydra_tools.x", level=logging.INFO, msg="hello"):
+    return logging.LogRecord(name, level, __file__, 1, msg, (), None)
+
+
+class TestLogPipeline:
+    """Tests for the queue handler and writer thread."""
+
+    def test_records_written_as_json(self, pipeline):
+        """Messages, extras, request IDs and exceptions all reach the output."""
+        logger, _, lines = pipeline
+        token = request_id_ctx.set("req-1")
+        try:
+            logger.info("hello %s", "world", extra={"status_code": 200})
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            request_id_ctx.reset(token)
+
+        first, second = lines()
+        assert first["message"] == "hello world"
+        assert first["request_id"] == "req-1"
+        assert first["extra"] == {"status_code": 200}
+        assert first["timestamp"].endswith("Z")
+        assert second["level"] == "ERROR"
+        assert "ValueError: boom" in second["exception"]
+
+    def test_message_rendered_when_logged(self, pipeline):
+        """Mutating an argument after logging does not change the output."""
+        logger, _, lines = pipeline
+        items = ["a"]
+        logger.info("items: %s", items)
+        items.append("b")
+
+        assert lines()[0]["message"] == "items: ['a']"
+
+    @pytest.mark.asyncio
+    async def test_log_context_is_per_task(self, pipeline):
+        """Concurrent tasks only see their own LogContext fields."""
+        logger, _, lines = pipeline
+
+        async def handle(user):
+            with LogContext(user=user):
+                await asyncio.sleep(0.01)
+                with LogContext(step="inner"):
+                    logger.info("working")
+
+        await asyncio.gather(handle("alice"), handle("bob"))
+        extras = sorted((line["extra"]["user"], line["extra"]["step"]) for line in lines())
+        assert extras == [("alice", "inner"), ("bob", "inner")]
+
+
+class TestDropPolicy:
+    """Tests for the bounded buffer."""
+
+    def test_drop_newest_counts_drops(self):
+        """A full buffer discards incoming records and counts them by level."""
+        stats = _PipelineStats()
+        handler = ContextQueueHandler(stats, capacity=2, drop_policy="drop_newest")
+        for msg in ("a", "b", "c"):
+            handler.handle(make_record(msg=msg, level=logging.WARNING))
+
+        assert [r.msg for r in handler.buffer] == ["a", "b"]
+        assert stats.dropped == 1
+        assert stats.dropped_by_level == {"WARNING": 1}
+
+    def test_drop_oldest_keeps_latest(self):
+        """drop_oldest evicts the oldest buffered record instead."""
+        stats = _PipelineStats()
+        handler = ContextQueueHandler(stats, capacity=2, drop_policy="drop_oldest")
+        for msg in ("a", "b", "c"):
+            handler.handle(make_record(msg=msg))
+
+        assert [r.msg for r in handler.buffer] == ["b", "c"]
+        assert stats.dropped == 1
+
+    def test_drops_reported_in_output(self):
+        """The writer logs a warning saying how many records were dropped."""
+        stream = io.StringIO()
+        pipeline = LogPipeline(JSONFormatter(), [stream], queue_size=1)
+        for msg in ("kept", "dropped"):
+            pipeline.handler.handle(make_record(msg=msg))
+        pipeline.start()
+        pipeline.stop()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["message"] for line in lines][0] == "kept"
+        assert "dropped 1 records" in lines[1]["message"]
+        assert pipeline.get_stats()["dropped"] == 1
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            ContextQueueHandler(_PipelineStats(), drop_policy="drop_everything")
+
+
+class TestLogSampler:
+    """Tests for per-logger sampling."""
+
+    def test_samples_debug_for_logger_and_children(self):
+        """One in N debug records is kept; other loggers and levels are untouched."""
+        sampler = LogSampler.from_env("hydra_tools.noisy=0.1")
+
+        kept = sum(sampler.keep(make_record("hydra_tools.noisy.sub", logging.DEBUG)) for _ in range(100))
+        assert kept == 10
+        assert all(sampler.keep(make_record("hydra_tools.noisy", logging.INFO)) for _ in range(10))
+        assert all(sampler.keep(make_record("hydra_tools.quiet", logging.DEBUG)) for _ in range(10))
+
+    def test_invalid_rate_rejected(self):
+        with pytest.raises(ValueError):
+            LogSampler({"hydra_tools": 0})
@@ -0,0 +1,239 @@
+"""
+Tests for the Loki log query engine, run against a local Loki stand-in.
+"""
+
+import asyncio
+import json
+import random
+import time
+from contextlib import aclosing
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from hydra_tools import logs_api
+from hydra_tools.logs_api import LokiClient, merge_streams, parse_log_level, tail_stream
+
+from tests.fake_loki import FakeLoki
+
+MINUTE = 60 * 10**9
+SERVICES = ["tabbyapi", "litellm", "qdrant"]
+
+
+@pytest.fixture
+def loki():
+    fake = FakeLoki()
+    with fake.serve() as url:
+        fake.url = url
+        yield fake
+
+
+@pytest.fixture
+async def client(loki):
+    client = LokiClient(url=loki.url)
+    yield client
+    await client.close()
+
+
+def populate(loki, count, span_ns=30 * MINUTE, seed=0):
+    """``count`` lines spread over the last ``span_ns``, with plenty of shared timestamps."""
+    rng = random.Random(seed)
+    now = time.time_ns()
+    timestamps = sorted(now - rng.randrange(MINUTE // 10, span_ns) // 1000 * 1000 for _ in range(count // 3))
+    lines = []
+    for i in range(count):
+        lines.append((rng.choice(SERVICES), timestamps[i * len(timestamps) // count], f"line {i}"))
+    for service, timestamp_ns, line in sorted(lines, key=lambda l: l[1]):
+        loki.push({"container": service, "job": "docker"}, timestamp_ns, line)
+    return lines
+
+
+class TestLevelParsing:
+    """Tests for the single-pass level extractor."""
+
+    @pytest.mark.parametrize("line,level", [
+        ("2026-01-01 ERROR failed to connect", "ERROR"),
+        ('{"level":"warning","msg":"slow"}', "WARN"),
+        ("level=debug msg=tick", "DEBUG"),
+        ("[ERR] out of memory", "ERROR"),
+        ("INFO retrying after error", "INFO"),
+        ("writing to stderr", "INFO"),
+        ("FATAL: cannot start", "ERROR"),
+        ("nothing to see", "INFO"),
+    ])
+    def test_first_level_word_wins(self, line, level):
+        assert parse_log_level(line) == level
+
+    def test_merge_keeps_same_timestamp_order_stable(self):
+        streams = [
+            {"stream": {"container": "b"}, "values": [["5", "b5"], ["3", "b3"]]},
+            {"stream": {"container": "a"}, "values": [["5", "a5"], ["4", "a4"]]},
+        ]
+        merged = [line for _, _, line, _ in merge_streams(streams)]
+        assert merged == ["b5", "a5", "a4", "b3"]
+        assert merged == [line for _, _, line, _ in merge_streams(list(reversed(streams)))]
+
+
+class TestQueryPaging:
+    """Tests for windowed, cursor-paged queries."""
+
+    async def test_merged_newest_first(self, loki, client):
+        lines = populate(loki, 60)
+        result = await client.query_logs(hours=1, limit=100)
+
+        assert result.total == 60
+        assert sorted(log.message for log in result.logs) == sorted(line for _, _, line in lines)
+        stamps = [log.timestamp for log in result.logs]
+        assert stamps == sorted(stamps, reverse=True)
+        assert result.next_cursor is None
+        assert {log.service for log in result.logs} == set(SERVICES)
+
+    async def test_dense_page_needs_one_window(self, loki, client):
+        now = time.time_ns()
+        for i in range(300):
+            loki.push({"container": SERVICES[i % 3], "job": "docker"}, now - (300 - i) * 10**9, f"line {i}")
+        result = await client.query_logs(hours=24, limit=50)
+
+        assert [log.message for log in result.logs] == [f"line {i}" for i in range(299, 249, -1)]
+        assert result.next_cursor
+        assert loki.count("query_range") == 1
+
+    async def test_page_ending_mid_timestamp_fetches_whole_timestamp(self, loki, client):
+        now = time.time_ns()
+        for i in range(6):
+            loki.push({"container": SERVICES[i % 3], "job": "docker"}, now - MINUTE, f"same {i}")
+
+        first = await client.query_logs(hours=1, limit=4)
+        second = await client.query_logs(hours=1, limit=4, cursor=first.next_cursor)
+
+        assert sorted(log.message for log in first.logs + second.logs) == [f"same {i}" for i in range(6)]
+        assert second.next_cursor is None
+
+    async def test_cursor_pages_cover_range_exactly(self, loki, client, monkeypatch):
+        """Walking every page returns each line once, even when pages end mid-timestamp."""
+        monkeypatch.setattr(logs_api, "FIRST_WINDOW_SECONDS", 60)
+        lines = populate(loki, 157)
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            result = await client.query_logs(hours=1, limit=10, cursor=cursor)
+            seen.extend(result.logs)
+            pages += 1
+            cursor = result.next_cursor
+            if not cursor:
+                break
+
+        assert sorted(log.message for log in seen) == sorted(line for _, _, line in lines)
+        assert len(seen) == len(lines)
+        stamps = [log.timestamp for log in seen]
+        assert stamps == sorted(stamps, reverse=True)
+        assert pages == 16
+
+    async def test_sparse_range_walks_older_windows(self, loki, client):
+        now = time.time_ns()
+        loki.push({"container": "qdrant", "job": "docker"}, now - 7 * 60 * MINUTE, "too old")
+        loki.push({"container": "qdrant", "job": "docker"}, now - 5 * 60 * MINUTE, "old but in range")
+
+        result = await client.query_logs(hours=6, limit=10)
+
+        assert [log.message for log in result.logs] == ["old but in range"]
+        assert 1 < loki.count("query_range") <= 6
+
+    async def test_filters(self, loki, client):
+        now = time.time_ns()
+        for i, line in enumerate(["ERROR boom", "level=err disk", "wrote to stderr", "WARN slow", "INFO ok"]):
+            loki.push({"container": "hydra-tools-api", "job": "docker"}, now - (10 - i) * MINUTE, line)
+        loki.push({"container": "qdrant", "job": "docker"}, now - MINUTE, "ERROR elsewhere")
+
+        result = await client.query_logs(service="tools", level="error", hours=1)
+        assert [log.message for log in result.logs] == ["level=err disk", "ERROR boom"]
+        assert {log.level for log in result.logs} == {"ERROR"}
+
+        result = await client.query_logs(search="slow|ok", hours=1)
+        assert [log.message for log in result.logs] == ["INFO ok", "WARN slow"]
+
+    async def test_invalid_cursor_rejected(self, loki, client, monkeypatch):
+        with pytest.raises(ValueError):
+            await client.query_logs(cursor="garbage")
+
+        monkeypatch.setattr(logs_api, "_loki_client", client)
+        app = FastAPI()
+        app.include_router(logs_api.create_logs_router())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            response = await http.get("/logs/query", params={"cursor": "1.0.0"})
+        assert response.status_code == 400
+
+
+class TestLabelCache:
+    """Tests for the short-lived label and service list cache."""
+
+    async def test_services_fetched_once_per_ttl(self, loki):
+        populate(loki, 9)
+        client = LokiClient(url=loki.url, label_ttl=0.2)
+        try:
+            results = await asyncio.gather(*(client.get_services() for _ in range(5)))
+            assert all(r == sorted(SERVICES) for r in results)
+            await client.get_services()
+            assert loki.count("label_values") == 2
+
+            await asyncio.sleep(0.25)
+            await client.get_services()
+            assert loki.count("label_values") == 4
+        finally:
+            await client.close()
+
+    async def test_failures_not_cached(self, loki, client):
+        populate(loki, 9)
+        loki.fail_labels = True
+        assert await client.get_services() == []
+        loki.fail_labels = False
+        assert await client.get_services() == sorted(SERVICES)
+
+
+class TestTail:
+    """Tests for following logs over the tail API."""
+
+    async def test_tail_history_then_new_lines(self, loki, client):
+        loki.push({"container": "litellm"}, time.time_ns() - 2 * 10**9, "before")
+        loki.push({"container": "qdrant"}, time.time_ns() - 2 * 10**9, "other service")
+
+        async def writer():
+            await asyncio.sleep(0.1)
+            for i in range(2):
+                loki.push({"container": "litellm"}, time.time_ns(), f"after {i}")
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(writer())
+        received = []
+        async with aclosing(client.tail(service="litellm", since_seconds=10)) as entries:
+            async for entry in entries:
+                received.append(entry.message)
+                if len(received) == 3:
+                    break
+        await task
+        assert received == ["before", "after 0", "after 1"]
+
+    @pytest.mark.parametrize("fmt", ["sse", "ndjson"])
+    async def test_stream_formats(self, loki, client, fmt):
+        async def writer():
+            await asyncio.sleep(0.2)
+            loki.push({"container": "litellm"}, time.time_ns(), "ERROR late")
+
+        task = asyncio.create_task(writer())
+        chunks = []
+        async with aclosing(tail_stream(client, fmt, keepalive=0.05, service="litellm")) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if "late" in chunk:
+                    break
+        await task
+
+        if fmt == "sse":
+            assert chunks[0] == ": keepalive\n\n"
+            assert chunks[-1].startswith("event: log\ndata: ")
+            entry = json.loads(chunks[-1].split("data: ", 1)[1])
+        else:
+            assert len(chunks) == 1
+            entry = json.loads(chunks[0])
+        assert (entry["level"], entry["service"], entry["message"]) == ("ERROR", "litellm", "ERROR late")
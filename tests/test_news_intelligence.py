@@ -0,0 +1,174 @@
+"""
+Tests for streaming trend detection in news intelligence.
+"""
+
+import json
+import random
+import re
+from datetime import datetime
+
+import pytest
+
+from hydra_tools import news_intelligence
+from hydra_tools.news_intelligence import HYDRA_FOCUS_AREAS, TECH_INDICATORS, NewsIntelligenceEngine
+from hydra_tools.trend_engine import DecayingHeavyHitters, KeywordAutomaton
+
+HOUR = 3600.0
+VOCABULARY = ["said", "nvidia", "ships", "new", "gpu", "for", "local", "inference", "the", "market",
+              "open", "weights", "model", "speculative", "decoding", "again", "weather", "report"]
+
+
+def naive_topics(text):
+    """_extract_topics as it was: every n-gram checked against every indicator."""
+    words = re.findall(r'\b[a-z]{3,}\b', text.lower())
+    bigrams = [f"{words[i]} {words[i+1]}" for i in range(len(words) - 1)]
+    trigrams = [f"{words[i]} {words[i+1]} {words[i+2]}" for i in range(len(words) - 2)]
+    return [p for p in bigrams + trigrams if any(ind in p for ind in TECH_INDICATORS)]
+
+
+def naive_relevance(topic):
+    score = 0.0
+    for focus in HYDRA_FOCUS_AREAS:
+        if focus in topic or topic in focus:
+            score += 0.3
+        elif any(word in topic for word in focus.split()):
+            score += 0.1
+    return min(score, 1.0)
+
+
+@pytest.fixture
+def state_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_intelligence, "TREND_SNAPSHOT_FILE", tmp_path / "trend_snapshot.json.gz")
+    monkeypatch.setattr(news_intelligence, "TRENDING_FILE", tmp_path / "trending_topics.json")
+    monkeypatch.setattr(news_intelligence, "SUGGESTIONS_FILE", tmp_path / "research_suggestions.json")
+    return tmp_path
+
+
+def entry(i, title, feed="Feed A"):
+    return {"id": i, "title": title, "content_preview": "", "feed_title": feed}
+
+
+class TestKeywordAutomaton:
+    """Tests for the compiled keyword matcher."""
+
+    def test_matches_like_substring_scans(self):
+        automaton = KeywordAutomaton(["he", "she", "his", "hers", "ai", "said"])
+        assert automaton.matches("ushers") == {"she", "he", "hers"}
+        rng = random.Random(3)
+        for _ in range(200):
+            text = "".join(rng.choice("aehirsdu ") for _ in range(30))
+            assert automaton.matches(text) == {k for k in automaton.keywords if k in text}
+            assert automaton.contains_any(text) == any(k in text for k in automaton.keywords)
+
+    def test_extract_topics_and_relevance_unchanged(self, state_files):
+        engine = NewsIntelligenceEngine()
+        rng = random.Random(5)
+        for _ in range(100):
+            text = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(0, 25)))
+            assert engine._extract_topics(text) == naive_topics(text)
+        for topic in ["speculative decoding", "local inference engine", "language models", "gpu market"]:
+            assert engine._calculate_relevance(topic) == pytest.approx(naive_relevance(topic))
+
+
+class TestDecayingHeavyHitters:
+    """Tests for decayed counts and the bounded top-k."""
+
+    def test_counts_halve_every_half_life(self):
+        sketch = DecayingHeavyHitters(capacity=10, width=256, half_life_seconds=HOUR)
+        sketch.add("gpu prices", 8, now=0)
+        assert sketch.estimate("gpu prices", now=0) == pytest.approx(8)
+        assert sketch.estimate("gpu prices", now=2 * HOUR) == pytest.approx(2)
+        before, after, _ = sketch.add("gpu prices", 1, now=2 * HOUR)
+        assert (before, after) == (pytest.approx(2), pytest.approx(3))
+        # Renormalizing keeps estimates
+        sketch.add("other", 1, now=40 * HOUR)
+        assert sketch.epoch == 40 * HOUR
+        assert sketch.estimate("gpu prices", now=42 * HOUR) == pytest.approx(12 * 2 ** -42, rel=1e-6)
+
+    def test_long_idle_gap_decays_to_zero(self):
+        sketch = DecayingHeavyHitters(capacity=10, width=256, half_life_seconds=HOUR)
+        sketch.add("stale", 5, now=0)
+        # 2000 half-lives later: 2 ** 2000 would overflow a float
+        assert sketch.top(now=2000 * HOUR) == [("stale", pytest.approx(0.0))]
+        assert sketch.estimate("stale", now=2000 * HOUR) == pytest.approx(0.0)
+        before, after, _ = sketch.add("fresh", 2, now=2000 * HOUR)
+        assert (before, after) == (pytest.approx(0.0), pytest.approx(2))
+        assert sketch.epoch == 2000 * HOUR
+
+    def test_top_k_finds_heavy_hitters_in_bounded_memory(self):
+        rng = random.Random(11)
+        sketch = DecayingHeavyHitters(capacity=20, width=1024, depth=4, half_life_seconds=24 * HOUR)
+        truth = {}
+        heavy = [f"heavy {i}" for i in range(10)]
+        for step in range(30000):
+            key = rng.choice(heavy) if rng.random() < 0.3 else f"tail {rng.randrange(20000)}"
+            truth[key] = truth.get(key, 0) + 1
+            sketch.add(key, 1, now=step)
+            assert len(sketch) <= 20
+        top = {key for key, _ in sketch.top(10, now=30000)}
+        assert top == set(heavy)
+        for key in heavy:
+            assert truth[key] * 0.75 <= sketch.estimate(key, now=30000) <= truth[key] * 1.05
+        assert len(sketch._heap) <= 4 * sketch.capacity + 1
+
+    def test_evicted_topics_can_return(self):
+        sketch = DecayingHeavyHitters(capacity=2, width=256, half_life_seconds=HOUR)
+        sketch.add("a", 5)
+        sketch.add("b", 3)
+        assert sketch.add("c", 1)[2] is None and "c" not in sketch
+        for _ in range(3):
+            _, _, evicted = sketch.add("c", 1)
+        assert evicted == "b" and "c" in sketch
+
+    def test_snapshot_round_trip(self):
+        sketch = DecayingHeavyHitters(capacity=5, width=512, half_life_seconds=HOUR, now=100)
+        for i in range(50):
+            sketch.add(f"k{i % 7}", 1, now=100 + i)
+        state = json.loads(json.dumps(sketch.to_state()))
+        restored = DecayingHeavyHitters.from_state(state)
+        assert restored.top(now=200) == pytest.approx(sketch.top(now=200))
+        assert restored.estimate("k6", 200) == pytest.approx(sketch.estimate("k6", 200))
+
+
+class TestIncrementalAnalysis:
+    """Tests for analyze_news_entries on the trend engine."""
+
+    async def test_entries_counted_once(self, state_files):
+        engine = NewsIntelligenceEngine()
+        batch = [entry(1, "Nvidia ships new GPU"), entry(2, "Nvidia ships new GPU", "Feed B"),
+                 entry(3, "Weather report")]
+
+        first = await engine.analyze_news_entries(batch)
+        assert first["analyzed_entries"] == 3 and first["new_trending"] == 4
+        trending = engine.trending_topics["nvidia ships"]
+        assert trending.mentions == 2 and sorted(trending.sources) == ["Feed A", "Feed B"]
+        assert trending.sample_headlines == ["Nvidia ships new GPU"]
+
+        again = await engine.analyze_news_entries(batch + [entry(4, "Nvidia ships faster GPU")])
+        assert again["analyzed_entries"] == 1 and again["skipped_entries"] == 3
+        assert engine.trending_topics["nvidia ships"].mentions == 3
+        assert "ships faster gpu" not in engine.trending_topics
+
+    async def test_snapshot_persists_and_restores(self, state_files):
+        engine = NewsIntelligenceEngine()
+        await engine.analyze_news_entries([entry(i, "Speculative decoding speeds local inference") for i in range(4)])
+        engine.save_snapshot(force=True)
+
+        restored = NewsIntelligenceEngine()
+        assert set(restored.trending_topics) == set(engine.trending_topics)
+        assert restored.trending_topics["local inference"].score == pytest.approx(4, rel=1e-3)
+        assert restored.trending_topics["local inference"].relevance_score == pytest.approx(0.3)
+        assert (await restored.analyze_news_entries([entry(0, "Local inference")]))["skipped_entries"] == 1
+        assert (state_files / "trend_snapshot.json.gz").stat().st_size < 60_000
+
+    async def test_migrates_trending_file(self, state_files):
+        now = datetime.utcnow().isoformat()
+        (state_files / "trending_topics.json").write_text(json.dumps({"topics": [{
+            "topic": "local inference", "mentions": 6, "first_seen": now, "last_seen": now,
+            "sources": ["Feed A"], "relevance_score": 0.4, "sample_headlines": ["Local inference wins"],
+        }]}))
+        engine = NewsIntelligenceEngine()
+        assert engine.trending_topics["local inference"].score == pytest.approx(6, rel=1e-3)
+        suggestions = await engine.generate_research_suggestions()
+        assert [s.source_topic for s in suggestions] == ["local inference"]
+        assert (state_files / "trend_snapshot.json.gz").exists()
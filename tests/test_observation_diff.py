@@ -0,0 +1,188 @@
+"""
+Tests for observation diffing and reasoning skips in the cognitive loop.
+"""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from hydra_tools import cognitive_core
+from hydra_tools.cognitive_core import CognitiveCore, SystemObservation
+from hydra_tools.observation_diff import (
+    Change,
+    ChangeDetector,
+    SignificanceThresholds,
+    canonicalize,
+    diff,
+    grade,
+    observation_hash,
+)
+
+
+def observation(unhealthy=(), queue=2, latency=120.0, status="healthy", goals=None, at=None, **extra):
+    return SystemObservation(
+        timestamp=at or datetime(2026, 1, 1),
+        cluster_health={"status": status, "timestamp": (at or datetime(2026, 1, 1)).isoformat()},
+        container_health={"total": 10, "healthy": 10 - len(unhealthy), "unhealthy": list(unhealthy)},
+        inference_health={"latency_ms": latency, "last_check": str(at)},
+        resource_status={"nodes": [{"name": "hydra-ai", "gpu_util": 40.0, "uptime": 1000}], **extra},
+        recent_events=[],
+        pending_tasks=[{"id": i} for i in range(queue)],
+        goals=goals or {"uptime": "99.9%"},
+        memory_context=[],
+    )
+
+
+def graded(old, new, thresholds=None):
+    changes = diff(canonicalize(old), canonicalize(new))
+    return {c.path: grade(c, thresholds or SignificanceThresholds()) for c in changes}
+
+
+class TestCanonicalDiff:
+    """Tests for the canonical form and change grading."""
+
+    def test_volatile_fields_and_jitter_do_not_change_hash(self):
+        first = observation(unhealthy=["a", "b"], latency=121.0)
+        later = observation(unhealthy=["b", "a"], latency=123.4, at=datetime(2026, 1, 1) + timedelta(minutes=5))
+        later.resource_status["nodes"][0]["uptime"] = 1300
+        later.memory_context = ["different retrieval"]
+        assert observation_hash(canonicalize(first)) == observation_hash(canonicalize(later))
+
+    def test_container_changes(self):
+        assert graded(observation(), observation(unhealthy=["qdrant"]))["container_health.unhealthy"] == "significant"
+        recovered = graded(observation(unhealthy=["qdrant"]), observation())
+        assert recovered == {
+            "container_health.healthy": "minor",
+            "container_health.unhealthy": "minor",
+        }
+
+    def test_queue_depth_threshold(self):
+        assert graded(observation(queue=2), observation(queue=4)) == {"pending_tasks.depth": "ignore"}
+        assert graded(observation(queue=2), observation(queue=7)) == {"pending_tasks.depth": "significant"}
+        lenient = SignificanceThresholds(queue_depth_delta=10)
+        assert graded(observation(queue=2), observation(queue=7), lenient) == {"pending_tasks.depth": "ignore"}
+
+    def test_numbers_status_and_goals(self):
+        assert graded(observation(latency=120), observation(latency=150)) == {"inference_health.latency_ms": "ignore"}
+        assert graded(observation(latency=120), observation(latency=400)) == {"inference_health.latency_ms": "minor"}
+        assert graded(observation(), observation(status="degraded")) == {"cluster_health.status": "significant"}
+        assert graded(observation(), observation(goals={"uptime": "99.99%"})) == {"goals.uptime": "significant"}
+
+    def test_records_matched_by_name_and_errors(self):
+        old, new = observation(), observation()
+        new.resource_status["nodes"][0]["gpu_util"] = 95.0
+        assert graded(old, new) == {"resource_status.nodes.hydra-ai.gpu_util": "minor"}
+        assert graded(old, observation(error="timeout")) == {"resource_status.error": "significant"}
+        assert graded(observation(error="timeout"), old) == {"resource_status.error": "minor"}
+
+    def test_field_level_overrides(self):
+        thresholds = SignificanceThresholds()
+        thresholds.update({"field_levels": {"cluster_health": "ignore", "inference_health.latency_ms": "significant"}})
+        assert grade(Change("cluster_health.status", "healthy", "degraded"), thresholds) == "ignore"
+        assert grade(Change("inference_health.latency_ms", 120, 121), thresholds) == "significant"
+        with pytest.raises(ValueError):
+            thresholds.update({"field_levels": {"goals": "urgent"}})
+        with pytest.raises(ValueError):
+            thresholds.update({"no_such_threshold": 1})
+
+
+class FakeLLM:
+    """CognitiveLLMClient stand-in recording which model reasoned."""
+
+    fallback_model = "qwen2.5-7b"
+
+    def __init__(self):
+        self.models = []
+        self.fail = False
+
+    async def reason(self, observation, model=None):
+        self.models.append(model)
+        if self.fail:
+            return {"analysis": "Reasoning error", "actions": [], "error": "down"}
+        return {
+            "analysis": f"seen {sorted(observation.container_health['unhealthy'])}",
+            "action_needed": bool(observation.container_health["unhealthy"]),
+            "actions": [{"type": "restart"}] if observation.container_health["unhealthy"] else [],
+            "learning": "noted",
+        }
+
+
+@pytest.fixture
+def core(monkeypatch):
+    monkeypatch.setattr(cognitive_core, "CheckpointManager", lambda: None)
+    core = CognitiveCore(model="midnight-miqu-70b")
+    core.llm = FakeLLM()
+    core.change_detector = ChangeDetector(enabled=True)
+    return core
+
+
+class TestReasoningSkips:
+    """Tests for choosing between full, cheap, cached and skipped reasoning."""
+
+    async def test_outcomes(self, core):
+        first = await core.reason(observation())
+        unchanged = await core.reason(observation(latency=125, at=datetime(2026, 1, 2)))
+        minor = await core.reason(observation(latency=400))
+        broken = await core.reason(observation(latency=400, unhealthy=["qdrant"]))
+        recovered = await core.reason(observation(latency=400))
+
+        assert core.llm.models == ["midnight-miqu-70b", "qwen2.5-7b", "midnight-miqu-70b"]
+        assert first["learning"] == "noted"
+        assert unchanged["skipped"] and unchanged["actions"] == []
+        assert minor["analysis"] == "seen []"
+        assert broken["actions"] == [{"type": "restart"}]
+        # Back to the state the cheap model already reasoned about
+        assert recovered["cached"] and recovered["analysis"] == "seen []" and recovered["learning"] == ""
+
+        stats = core.change_detector.get_stats()
+        assert (stats["full"], stats["cheap"], stats["cached"], stats["skipped"]) == (2, 1, 1, 1)
+        outcomes = [d["change_detection"]["outcome"] for d in core._decision_history]
+        assert outcomes == ["full", "skip", "cheap", "full", "cached"]
+
+    async def test_gpu_seconds_saved(self, core, monkeypatch):
+        clock = iter([0.0, 40.0, 100.0, 110.0])
+        monkeypatch.setattr(cognitive_core.time, "perf_counter", lambda: next(clock))
+        await core.reason(observation())  # 40 s on the 70B model
+        await core.reason(observation())  # skipped
+        await core.reason(observation(latency=400))  # 10 s on the fallback
+        stats = core.change_detector.get_stats()
+        assert stats["gpu_seconds_saved"] == 40 + 30
+        assert stats["avg_reasoning_seconds"] == {"midnight-miqu-70b": 40.0, "qwen2.5-7b": 10.0}
+
+    async def test_full_reasoning_forced_when_stale(self, core):
+        core.change_detector.thresholds.max_skipped_cycles = 2
+        for _ in range(4):
+            await core.reason(observation())
+        assert core.llm.models == ["midnight-miqu-70b", "midnight-miqu-70b"]
+
+        await core.reason(observation(), force=True)
+        assert len(core.llm.models) == 3
+
+    async def test_failed_reasoning_is_retried(self, core):
+        core.llm.fail = True
+        await core.reason(observation())
+        core.llm.fail = False
+        await core.reason(observation())
+        await core.reason(observation())
+        assert core.llm.models == ["midnight-miqu-70b"] * 2
+        assert core.change_detector.get_stats()["cached_decisions"] == 1
+
+    async def test_disabled_always_reasons(self, core):
+        core.change_detector.enabled = False
+        await core.reason(observation())
+        await core.reason(observation())
+        assert len(core.llm.models) == 2
+
+    async def test_change_detection_api(self, core, monkeypatch):
+        monkeypatch.setattr(cognitive_core, "_cognitive_core", core)
+        app = FastAPI()
+        app.include_router(cognitive_core.create_cognitive_router())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            response = await http.put("/cognitive/change-detection", json={"queue_depth_delta": 20})
+            assert response.json()["thresholds"]["queue_depth_delta"] == 20
+            response = await http.put("/cognitive/change-detection", json={"max_skips": 3})
+            assert response.status_code == 400
+            response = await http.put("/cognitive/change-detection", json={"enabled": False})
+            assert response.json()["enabled"] is False
@@ -0,0 +1,162 @@
+"""
+Tests for the shared Prometheus query layer: per-query caching, single-flight
+coalescing and batched instant queries, against a local fake Prometheus.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from hydra_tools import prometheus_query
+from hydra_tools.autonomous_queue import ClusterResourceMonitor
+from hydra_tools.monitoring import PrometheusQueryTool
+from hydra_tools.prometheus_query import BATCH_LABEL, PrometheusClient, PrometheusQueryError
+from tests.fake_prometheus import FakePrometheus
+
+DCGM = "192.168.1.250:9835"
+NVIDIA = "192.168.1.203:9835"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def prometheus():
+    fake = FakePrometheus()
+    fake.add("gpu_temp", 61, gpu="0", instance="a")
+    fake.add("gpu_temp", 70, gpu="1", instance="a")
+    fake.add("gpu_util", 35, gpu="0", instance="a")
+    with fake.serve() as url:
+        fake.url = url
+        yield fake
+
+
+@pytest.fixture
+async def client(prometheus):
+    client = PrometheusClient(prometheus.url, ttl=15, clock=Clock())
+    yield client
+    await client.close()
+
+
+def values(result):
+    return sorted((tuple(sorted(item["metric"].items())), item["value"][1]) for item in result)
+
+
+class TestCacheAndCoalescing:
+    """Tests for answering repeated queries without new requests."""
+
+    async def test_concurrent_duplicates_send_one_request(self, prometheus, client):
+        results = await asyncio.gather(*(client.query("gpu_temp") for _ in range(20)))
+        assert prometheus.count() == 1
+        assert all(values(r) == values(results[0]) for r in results) and len(results[0]) == 2
+        assert client.get_stats()["by_kind"]["query"] == {"request": 1, "coalesced": 19}
+
+    async def test_cached_for_ttl(self, prometheus, client):
+        await client.query("gpu_temp")
+        client._clock.now += 10
+        await client.query("gpu_temp")
+        assert prometheus.count() == 1
+        assert client.get_stats()["cache_hit_rate"] == 0.5
+
+        client._clock.now += 6
+        await client.query("gpu_temp")
+        await client.query("gpu_temp", ttl=0)
+        await client.query("gpu_temp", ttl=0)
+        assert prometheus.count() == 4
+
+    async def test_errors_raise_and_are_not_cached(self, prometheus, client):
+        for _ in range(2):
+            with pytest.raises(PrometheusQueryError) as error:
+                await client.query("gpu_temp{")
+            assert error.value.error_type == "bad_data"
+        assert prometheus.count() == 2
+
+    async def test_unreachable_fails_batch_once(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        client = PrometheusClient(f"http://127.0.0.1:{port}", timeout=1)
+        results = await asyncio.gather(*(client.query(q) for q in ("a", "b", "c")), return_exceptions=True)
+        assert all(isinstance(r, PrometheusQueryError) for r in results)
+        assert client.requests == {"query_batch": 1}
+        await client.close()
+
+
+class TestBatching:
+    """Tests for combining instant queries into one request."""
+
+    async def test_distinct_queries_share_one_request(self, prometheus, client):
+        queries = ["gpu_temp", 'gpu_util{gpu="0"}', "missing_metric"]
+        batched = await asyncio.gather(*(client.query(q) for q in queries))
+        assert prometheus.count() == 1 and "label_replace" in prometheus.queries()[0]
+
+        separate = PrometheusClient(prometheus.url, batch_max=1)
+        for query, result in zip(queries, batched):
+            assert values(result) == values(await separate.query(query))
+            assert all(BATCH_LABEL not in item["metric"] for item in result)
+        await separate.close()
+        assert client.get_stats()["batched_queries"] == 3
+
+    async def test_non_vector_queries_fall_back(self, prometheus, client):
+        scalar, vector = await asyncio.gather(client.query("scalar(gpu_util)"), client.query("gpu_temp"))
+        assert scalar[1] == "35.0" and len(vector) == 2
+        assert prometheus.count() == 3  # rejected batch, then one each
+
+        client.invalidate()
+        await asyncio.gather(client.query("scalar(gpu_util)"), client.query("gpu_temp"))
+        assert prometheus.queries()[3:] == ["scalar(gpu_util)", "gpu_temp"]
+
+
+class TestRangeAndTargets:
+    """Tests for range queries and scrape targets."""
+
+    async def test_range_windows_align_within_interval(self, prometheus, client):
+        first = await client.query_range("gpu_temp", 1_000_000_001 - 3600, 1_000_000_001, step="1m")
+        second = await client.query_range("gpu_temp", 1_000_000_003 - 3600, 1_000_000_003, step="1m")
+        assert prometheus.count("query_range") == 1 and first == second
+        assert first[0]["values"][-1][0] == 999_999_990
+
+    async def test_targets_cached(self, prometheus, client):
+        prometheus.targets = [{"labels": {"job": "node"}, "health": "up"}]
+        assert await client.targets() == await client.targets() == prometheus.targets
+        assert prometheus.count("targets") == 1
+
+
+class TestSharedCallers:
+    """Tests for callers that used to query Prometheus independently."""
+
+    async def test_scheduler_and_tools_share_requests(self, prometheus, monkeypatch):
+        for gpu, util in (("0", 20), ("1", 80)):
+            for name, value in (("DCGM_FI_DEV_GPU_UTIL", util), ("DCGM_FI_DEV_FB_USED", 8192),
+                                ("DCGM_FI_DEV_FB_FREE", 16384), ("DCGM_FI_DEV_GPU_TEMP", 60),
+                                ("DCGM_FI_DEV_POWER_USAGE", 300)):
+                prometheus.add(name, value, instance=DCGM, gpu=gpu)
+        prometheus.add("nvidia_gpu_utilization_percent", 5, instance=NVIDIA, gpu="0")
+        monkeypatch.setattr(prometheus_query, "_prometheus_clients", {})
+
+        monitor = ClusterResourceMonitor(prometheus_url=prometheus.url)
+        tool = PrometheusQueryTool(prometheus.url)
+        dashboard, scheduler, agent = await asyncio.gather(
+            monitor.get_cluster_resources(force_refresh=True),
+            monitor.get_cluster_resources(force_refresh=True),
+            tool.query(f'DCGM_FI_DEV_GPU_UTIL{{instance="{DCGM}",gpu="1"}}'),
+        )
+
+        # 20 distinct queries from two scans and the agent tool: one request
+        assert prometheus.count() == 1
+        stats = prometheus_query.get_prometheus_client(prometheus.url).get_stats()
+        assert stats["by_kind"]["query"] == {"request": 20, "coalesced": 21}
+        ai = next(n for n in dashboard.nodes if n.name == "hydra-ai")
+        assert [g.utilization_percent for g in ai.gpus] == [20, 80] and ai.free_vram_gb == 32
+        assert dashboard.nodes == scheduler.nodes and agent[0].value == 80
+
+        await monitor.get_cluster_resources(force_refresh=True)
+        assert prometheus.count() == 1
+        await prometheus_query.close_prometheus_client()
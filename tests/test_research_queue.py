@@ -0,0 +1,277 @@
+"""
+Tests for incremental research processing: conditional fetches, analysis
+reuse by content hash, host politeness and the queue journal.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from hydra_tools import research_queue
+from hydra_tools.research_queue import (
+    HostLimiter,
+    ResearchQueue,
+    ResearchQueueConfig,
+    ResearchStatus,
+    SourceType,
+)
+
+
+class FakeWeb:
+    """Pages with ETags, plus an OpenAI-compatible LLM counting its calls."""
+
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+        self.llm_calls = 0
+        self.active = {}
+        self.peak = {}
+        self.delay = 0.0
+
+    def set_page(self, url, body):
+        self.pages[url] = body
+
+    def etag(self, url):
+        return '"%x"' % (hash(self.pages[url]) & 0xFFFFFFFF)
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            await asyncio.sleep(self.delay)
+            if request.url.path.endswith("/chat/completions"):
+                self.llm_calls += 1
+                prompt = json.loads(request.content)["messages"][0]["content"]
+                title = "Analysis %d" % self.llm_calls
+                content = json.dumps({"title": title, "summary": prompt[-60:], "tags": ["t"]})
+                return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+            url = str(request.url)
+            self.requests.append((url, request.headers.get("if-none-match")))
+            if url not in self.pages:
+                return httpx.Response(404)
+            if request.headers.get("if-none-match") == self.etag(url):
+                return httpx.Response(304)
+            return httpx.Response(200, text=self.pages[url], headers={"etag": self.etag(url)})
+        finally:
+            self.active[host] -= 1
+
+
+@pytest.fixture
+def web():
+    return FakeWeb()
+
+
+def make_queue(tmp_path, web, **overrides):
+    config = ResearchQueueConfig(
+        llm_url="http://llm.local/v1",
+        data_dir=str(tmp_path),
+        auto_store_to_knowledge=False,
+        per_host_interval=0.0,
+        **overrides,
+    )
+    queue = ResearchQueue(config)
+    queue._client = httpx.AsyncClient(transport=httpx.MockTransport(web.handler))
+    return queue
+
+
+def queue_batch(queue, urls):
+    return [queue.add(url, SourceType.URL).id for url in urls]
+
+
+class TestIncrementalProcessing:
+    """Tests for skipping unchanged fetches and analyses."""
+
+    async def test_rerun_of_unchanged_batch_needs_no_llm_calls(self, tmp_path, web):
+        urls = [f"http://site{i % 3}.test/page{i}" for i in range(9)]
+        for url in urls:
+            web.set_page(url, f"<title>{url}</title><p>content of {url}</p>")
+        queue = make_queue(tmp_path, web)
+
+        first_run = queue_batch(queue, urls)
+        await queue.process_queue()
+        assert web.llm_calls == 9
+        assert all(i.status == ResearchStatus.COMPLETED for i in queue.queue.values())
+
+        # Overnight re-run: everything re-queued, one page changed
+        web.set_page(urls[4], "<p>rewritten</p>")
+        rerun = queue_batch(queue, urls)
+        await queue.process_queue()
+
+        assert web.llm_calls == 10
+        assert queue.stats["not_modified"] == 8
+        assert queue.stats["analyses_reused"] == 8
+        items = [queue.get(item_id) for item_id in rerun]
+        assert [i.analysis_reused for i in items] == [i != 4 for i in range(9)]
+        assert items[0].title == queue.get(first_run[0]).title
+        assert items[4].title == "Analysis 10"
+        assert all(i.status == ResearchStatus.COMPLETED for i in items)
+
+    async def test_same_content_at_different_urls_analyzed_once(self, tmp_path, web):
+        web.set_page("http://a.test/mirror", "<p>same text</p>")
+        web.set_page("http://b.test/original", "<p>same text</p>")
+        queue = make_queue(tmp_path, web)
+
+        ids = queue_batch(queue, ["http://a.test/mirror", "http://b.test/original"])
+        await queue.process_queue()
+
+        assert web.llm_calls == 1
+        first, second = (queue.get(i) for i in ids)
+        assert first.content_hash == second.content_hash
+        assert (first.summary, first.title) == (second.summary, second.title)
+
+    async def test_topic_is_part_of_the_content_key(self, tmp_path, web):
+        queue = make_queue(tmp_path, web)
+        for topic in ("inference", "agents", "inference"):
+            queue.add("shared notes", SourceType.TEXT, topic=topic)
+        await queue.process_queue()
+        assert web.llm_calls == 2
+
+    async def test_analyses_survive_restart_and_removal(self, tmp_path, web):
+        web.set_page("http://a.test/x", "<p>body</p>")
+        queue = make_queue(tmp_path, web)
+        (item_id,) = queue_batch(queue, ["http://a.test/x"])
+        await queue.process_queue()
+        queue.remove(item_id)
+        await queue.close()
+
+        reopened = make_queue(tmp_path, web)
+        queue_batch(reopened, ["http://a.test/x"])
+        await reopened.process_queue()
+        assert web.llm_calls == 1
+        assert web.requests[-1] == ("http://a.test/x", web.etag("http://a.test/x"))
+        assert reopened.stats == {"fetches": 1, "not_modified": 1, "analyses": 0, "analyses_reused": 1}
+
+    async def test_failed_analysis_is_not_cached(self, tmp_path, web, monkeypatch):
+        queue = make_queue(tmp_path, web)
+        item = queue.add("some text", SourceType.TEXT)
+        calls = []
+
+        async def broken(item):
+            calls.append(item.id)
+            raise RuntimeError("LLM down")
+
+        monkeypatch.setattr(queue, "_analyze_content", broken)
+        await queue.process_item(item.id)
+        assert item.status == ResearchStatus.FAILED
+        monkeypatch.undo()
+
+        retry = queue.add("some text", SourceType.TEXT)
+        await queue._process_many([retry])
+        assert retry.status == ResearchStatus.COMPLETED and not retry.analysis_reused
+        assert web.llm_calls == 1
+
+
+class TestPoliteness:
+    """Tests for concurrent processing under per-host limits."""
+
+    async def test_per_host_concurrency_and_overall_overlap(self, tmp_path, web):
+        web.delay = 0.05
+        urls = [f"http://host{i % 2}.test/p{i}" for i in range(8)]
+        for url in urls:
+            web.set_page(url, url)
+        queue = make_queue(tmp_path, web, max_concurrent=8, per_host_concurrency=2)
+        queue_batch(queue, urls)
+
+        start = time.perf_counter()
+        await queue.process_queue()
+        elapsed = time.perf_counter() - start
+
+        assert web.peak["host0.test"] == web.peak["host1.test"] == 2
+        # 4 pages per host, two at a time, plus one LLM round per item in parallel
+        assert elapsed < 8 * 2 * web.delay
+
+    async def test_requests_to_a_host_are_spaced(self):
+        limiter = HostLimiter(concurrency=4, interval=0.05)
+        starts = []
+
+        async def request(url):
+            async with limiter.slot(url):
+                starts.append((url, time.monotonic()))
+
+        await asyncio.gather(*(request("http://a.test/") for _ in range(3)), request("http://b.test/"))
+        a_times = [t for url, t in starts if "a.test" in url]
+        assert all(later - earlier >= 0.045 for earlier, later in zip(a_times, a_times[1:]))
+        b_time = next(t for url, t in starts if "b.test" in url)
+        assert b_time - a_times[0] < 0.04
+
+
+class TestJournal:
+    """Tests for append-only queue persistence."""
+
+    async def test_replay_restores_queue(self, tmp_path, web):
+        queue = make_queue(tmp_path, web)
+        keep = queue.add("keep me", SourceType.TEXT, topic="t")
+        drop = queue.add("drop me", SourceType.TEXT)
+        await queue.process_item(keep.id)
+        queue.remove(drop.id)
+
+        reopened = make_queue(tmp_path, web)
+        assert list(reopened.queue) == [keep.id]
+        restored = reopened.get(keep.id)
+        assert restored.status == ResearchStatus.COMPLETED
+        assert (restored.summary, restored.topic, restored.content_hash) == (keep.summary, "t", keep.content_hash)
+
+    def test_changes_only_append(self, tmp_path, web):
+        queue = make_queue(tmp_path, web)
+        journal = tmp_path / "queue.jsonl"
+        queue.add("first", SourceType.TEXT)
+        before = journal.read_bytes()
+        second = queue.add("second", SourceType.TEXT)
+        queue.remove(second.id)
+
+        after = journal.read_bytes()
+        assert after.startswith(before)
+        assert [json.loads(line)["op"] for line in after.splitlines()] == ["put", "put", "delete"]
+
+    def test_compaction(self, tmp_path, web, monkeypatch):
+        monkeypatch.setattr(research_queue, "JOURNAL_COMPACT_MIN", 10)
+        queue = make_queue(tmp_path, web)
+        for i in range(12):
+            queue.remove(queue.add(f"item {i}", SourceType.TEXT).id)
+        kept = queue.add("kept", SourceType.TEXT)
+
+        lines = (tmp_path / "queue.jsonl").read_text().splitlines()
+        assert len(lines) < 10
+        assert list(make_queue(tmp_path, web).queue) == [kept.id]
+
+    def test_interrupted_items_requeued_and_torn_write_skipped(self, tmp_path, web):
+        queue = make_queue(tmp_path, web)
+        item = queue.add("text", SourceType.TEXT)
+        item.status = ResearchStatus.ANALYZING
+        queue._journal(item, "status")
+        with open(tmp_path / "queue.jsonl", "a") as f:
+            f.write('{"op": "put", "item": {"id": "tor')
+
+        reopened = make_queue(tmp_path, web)
+        assert reopened.get(item.id).status == ResearchStatus.QUEUED
+
+    def test_malformed_records_skipped(self, tmp_path, web):
+        queue = make_queue(tmp_path, web)
+        item = queue.add("text", SourceType.TEXT)
+        bad = [
+            {"item": {"id": "noop"}},
+            {"op": "put", "item": {"source": "no id"}},
+            {"op": "put", "item": {"id": "badenum", "source": "x", "source_type": "fax"}},
+            {"op": "put", "item": {"id": "extra", "source": "x", "source_type": "text", "colour": "red"}},
+            {"op": "update", "id": item.id, "fields": {"status": "exploded"}},
+        ]
+        with open(tmp_path / "queue.jsonl", "a") as f:
+            f.writelines(json.dumps(record) + "\n" for record in bad)
+
+        reopened = make_queue(tmp_path, web)
+        assert list(reopened.queue) == [item.id]
+        assert reopened.get(item.id).status == ResearchStatus.QUEUED
+
+    def test_legacy_snapshot_migrated(self, tmp_path, web):
+        legacy = {"abc12345": {"id": "abc12345", "source": "old text", "source_type": "text",
+                               "priority": "high", "status": "completed", "summary": "done"}}
+        (tmp_path / "queue.json").write_text(json.dumps(legacy))
+
+        queue = make_queue(tmp_path, web)
+        assert queue.get("abc12345").summary == "done"
+        assert (tmp_path / "queue.jsonl").exists()
+        assert make_queue(tmp_path, web).get("abc12345").priority.value == "high"
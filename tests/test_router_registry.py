@@ -0,0 +1,151 @@
+"""
+Tests for lazy router loading and the startup profile.
+"""
+
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from hydra_tools.router_registry import (
+    LazyRouterMiddleware,
+    LazyRouterRegistry,
+    RouterSpec,
+    StartupProfile,
+)
+
+
+@pytest.fixture
+def fake_modules(monkeypatch):
+    """Install fake hydra_tools feature modules and record what was imported/started."""
+    events = []
+
+    def make_module(name, prefix, path="/status"):
+        module = types.ModuleType(f"hydra_tools.{name}")
+
+        def create_router():
+            router = APIRouter(prefix=prefix)
+
+            @router.get(path)
+            async def handler():
+                return {"module": name}
+
+            return router
+
+        def init_db():
+            events.append(f"init {name}")
+
+        module.create_router = create_router
+        module.init_db = init_db
+        monkeypatch.setitem(sys.modules, f"hydra_tools.{name}", module)
+        return module
+
+    # "catchall" claims /alpha/{anything}; declared after alpha so alpha wins
+    make_module("fake_alpha", "/alpha")
+    make_module("fake_catchall", "/alpha", path="/{item}")
+    make_module("fake_beta", "/beta")
+    return events
+
+
+def make_app(registry):
+    app = FastAPI()
+    registry.mount(app)
+    app.add_middleware(LazyRouterMiddleware, registry=registry, openapi_url=app.openapi_url)
+
+    @app.get("/direct")
+    async def direct():
+        return {"ok": True}
+
+    return app
+
+
+SPECS = [
+    RouterSpec("alpha", "fake_alpha", "create_router", ("/alpha",), startup="init_db"),
+    RouterSpec("catchall", "fake_catchall", "create_router", ("/alpha",)),
+    RouterSpec("beta", "fake_beta", "create_router", ("/beta",), startup="init_db"),
+]
+
+
+class TestLazyRouterRegistry:
+    """Tests for on-demand router loading."""
+
+    def test_router_loads_on_first_matching_request(self, fake_modules):
+        """Nothing loads at startup; a request loads only the routers it needs."""
+        registry = LazyRouterRegistry(SPECS, enabled=None, disabled=set())
+        client = TestClient(make_app(registry))
+
+        assert client.get("/direct").status_code == 200
+        assert registry.status()["loaded"] == []
+
+        response = client.get("/beta/status")
+        assert response.json() == {"module": "fake_beta"}
+        assert registry.status()["loaded"] == ["beta"]
+        assert fake_modules == ["init fake_beta"]
+
+    def test_declaration_order_preserved(self, fake_modules):
+        """Routes declared earlier win even if a later router loaded first."""
+        registry = LazyRouterRegistry(SPECS, enabled=None, disabled=set())
+        app = make_app(registry)
+        registry.load(["catchall"])
+        client = TestClient(app)
+
+        # Loads alpha, which must slot in ahead of the already-loaded catchall
+        assert client.get("/alpha/status").json() == {"module": "fake_alpha"}
+        assert client.get("/alpha/other").json() == {"module": "fake_catchall"}
+
+    def test_disabled_router_never_loads(self, fake_modules):
+        """Denylisted routers stay unmounted and their paths 404."""
+        registry = LazyRouterRegistry(SPECS, enabled=None, disabled={"beta"})
+        client = TestClient(make_app(registry))
+
+        assert client.get("/beta/status").status_code == 404
+        assert registry.status()["disabled"] == ["beta"]
+        assert fake_modules == []
+
+    def test_allowlist_from_env(self, fake_modules, monkeypatch):
+        """HYDRA_ROUTERS_ENABLED limits loading to the listed routers."""
+        monkeypatch.setenv("HYDRA_ROUTERS_ENABLED", "alpha")
+        registry = LazyRouterRegistry(SPECS)
+        assert registry.status()["disabled"] == ["catchall", "beta"]
+
+    def test_openapi_loads_everything(self, fake_modules):
+        """The schema request mounts all enabled routers so the docs are complete."""
+        registry = LazyRouterRegistry(SPECS, enabled=None, disabled=set())
+        client = TestClient(make_app(registry))
+
+        paths = client.get("/openapi.json").json()["paths"]
+        assert {"/alpha/status", "/beta/status", "/direct"} <= set(paths)
+        assert registry.status()["pending"] == []
+
+    @pytest.mark.asyncio
+    async def test_preload_all_and_profile(self, fake_modules):
+        """Preloading imports at startup and every import lands in the profile."""
+        profile = StartupProfile()
+        registry = LazyRouterRegistry(SPECS, enabled=None, disabled=set(), profile=profile)
+        make_app(registry)
+
+        await registry.preload({"all"})
+
+        report = registry.report()
+        assert report["routers"]["loaded"] == ["alpha", "catchall", "beta"]
+        assert {e["name"] for e in report["imports"] if e["kind"] == "module"} == {
+            "fake_alpha", "fake_catchall", "fake_beta",
+        }
+        assert all(e["trigger"] == "preload" for e in report["imports"])
+
+    @pytest.mark.asyncio
+    async def test_failed_import_leaves_router_pending(self, fake_modules):
+        """A broken feature module does not take the request path down with it."""
+        spec = RouterSpec("missing", "fake_does_not_exist", "create_router", ("/missing",))
+        registry = LazyRouterRegistry(SPECS + [spec], enabled=None, disabled=set())
+        make_app(registry)
+
+        await registry.ensure_loaded([spec], trigger="test")
+        assert "missing" in registry.status()["pending"]
+
+    def test_duplicate_names_rejected(self):
+        """Router names must be unique."""
+        with pytest.raises(ValueError):
+            LazyRouterRegistry(SPECS + [SPECS[0]], enabled=None, disabled=set())
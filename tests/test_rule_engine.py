@@ -0,0 +1,236 @@
+"""
+Tests for compiled trigger rule conditions and incremental rule evaluation.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import yaml
+from fastapi import FastAPI
+
+from hydra_tools import autonomous_controller
+from hydra_tools.autonomous_controller import AutonomousController, SystemState
+from hydra_tools.rule_engine import RuleEngine, RuleSyntaxError, compile_condition, render_message
+
+
+@dataclass
+class Rule:
+    id: str
+    condition: str
+    message: str = ""
+
+
+def state(containers=(), down=(), metrics=None, score=None, at=datetime(2026, 3, 1, 4, 0)):
+    return SystemState(
+        timestamp=at,
+        containers={"containers": [
+            {"name": name, "status": status, "consecutive_failures": failures}
+            for name, status, failures in containers
+        ]},
+        prometheus_targets={"down": list(down)},
+        metrics=metrics or {},
+        benchmarks={"latest": {"overall_score": score}} if score is not None else {"latest": None},
+        memory_stats={},
+        pending_tasks=[],
+        recent_events=[],
+    )
+
+
+class FakeScheduler:
+    def get_queue(self):
+        return []
+
+
+class TestCompiler:
+    """Tests for the condition expression language."""
+
+    @pytest.mark.parametrize("condition, facts, expected", [
+        ("gpu_temp_celsius > 80", {"gpu_temp_celsius": 85}, True),
+        ("gpu_temp_celsius > 80", {"gpu_temp_celsius": 75}, False),
+        ("gpu_temp_celsius > 80", {}, False),
+        ("not gpu_temp_celsius > 80", {}, True),
+        ("metrics.tokens_per_second < 20 or x == 'a'", {"metrics": {"tokens_per_second": 12}}, True),
+        ("len(down) > 0 and pending < 10", {"down": ["loki"], "pending": 3}, True),
+        ("'loki' in down", {"down": ["loki"]}, True),
+        ("'loki' in down", {}, False),
+        ("60 < temp <= 80", {"temp": 80}, True),
+        ("score < previous - 5", {"score": 80, "previous": 90}, True),
+        ("score < previous - 5", {"score": 80}, False),
+        ("max(a, b) > 5 and abs(c) == 2", {"a": 1, "b": 7, "c": -2}, True),
+        ("flag == true", {"flag": True}, True),
+        ("value == null", {}, False),
+        ("value != null", {"value": 0}, True),
+    ])
+    def test_expressions(self, condition, facts, expected):
+        assert compile_condition(condition)(facts) is expected
+
+    def test_dependencies(self):
+        compiled = compile_condition("metrics.tokens_per_second < min(floor, 20) or len(down) > 0")
+        assert compiled.dependencies == {"metrics.tokens_per_second", "floor", "down"}
+        assert compile_condition("cron: 0 4 * * *").dependencies == {"clock"}
+
+    @pytest.mark.parametrize("condition", [
+        "__import__('os').system('id')",
+        "x.__class__",
+        "[c for c in containers]",
+        "lambda: 1",
+        "temp >",
+        "cron: 0 4 * *",
+        "cron: 61 * * * *",
+    ])
+    def test_rejected(self, condition):
+        with pytest.raises(RuleSyntaxError):
+            compile_condition(condition)
+
+    def test_cron(self):
+        weekly = compile_condition("cron: 0 3 * * 0")
+        every_15 = compile_condition("cron: */15 9-17 * * 1-5")
+        assert weekly({"clock": {"minute": 0, "hour": 3, "weekday": 0}})
+        assert not weekly({"clock": {"minute": 0, "hour": 3, "weekday": 1}})
+        assert every_15({"clock": {"minute": 45, "hour": 17, "weekday": 5}})
+        assert not every_15({"clock": {"minute": 40, "hour": 12, "weekday": 3}})
+        assert not weekly({})
+
+    def test_legacy_conditions_and_messages(self):
+        assert compile_condition("prometheus_target.up == 0")({"targets_down": ["loki"]})
+        assert not compile_condition("task_completed_successfully")({})
+        assert render_message("Down: {down}, GPU {m.temp}C", {"down": ["a", "b"], "m": {"temp": 81}}) == \
+            "Down: a, b, GPU 81C"
+
+
+class TestRuleEngine:
+    """Tests for indexing rules by their facts and reusing unchanged results."""
+
+    def test_only_rules_with_changed_facts_run(self):
+        rules = [Rule("hot", "temp > 80", "GPU {temp}C"), Rule("slow", "latency > 3000"), Rule("down", "len(down) > 0")]
+        engine = RuleEngine()
+        engine.compile(rules)
+
+        facts = {"temp": 70, "latency": 100, "down": []}
+        assert engine.evaluate(rules, facts) == {"hot": (False, ""), "slow": (False, ""), "down": (False, "")}
+        assert engine.stats["evaluated"] == 3
+
+        results = engine.evaluate(rules, {**facts, "temp": 85})
+        assert results["hot"] == (True, "GPU 85C")
+        assert engine.stats["evaluated"] == 4 and engine.stats["reused"] == 2
+        assert engine.timings["hot"].evaluations == 2 and engine.timings["slow"].evaluations == 1
+
+    def test_rules_left_out_stay_stale(self):
+        rules = [Rule("hot", "temp > 80"), Rule("slow", "latency > 3000")]
+        engine = RuleEngine()
+        engine.compile(rules)
+        engine.evaluate(rules, {"temp": 70, "latency": 100})
+        # "hot" is cooling down while the temperature changes
+        engine.evaluate(rules[1:], {"temp": 90, "latency": 100})
+        assert engine.evaluate(rules, {"temp": 90, "latency": 100})["hot"][0] is True
+
+    def test_recompile_changed_and_invalid(self):
+        rules = [Rule("hot", "temp > 80")]
+        engine = RuleEngine()
+        engine.compile(rules)
+        assert engine.evaluate(rules, {"temp": 75})["hot"][0] is False
+
+        rules[0].condition = "temp > 70"
+        engine.compile(rules)
+        assert engine.evaluate(rules, {"temp": 75})["hot"][0] is True
+
+        rules[0].condition = "temp >>> 70"
+        engine.compile(rules)
+        assert engine.evaluate(rules, {"temp": 75}) == {}
+        assert "hot" in engine.get_stats()["errors"]
+
+    def test_dropped_rules_release_their_paths(self):
+        engine = RuleEngine()
+        engine.compile([Rule("gpu", "gpu.temp > 80 and gpu.util > 90"), Rule("disk", "disk.used > 90")])
+        engine.compile([Rule("gpu", "gpu.temp > 85")])
+        assert engine._paths_by_root == {"gpu": {"gpu.temp"}}
+        assert set(engine._by_path) == {"gpu.temp"}
+        engine.compile([])
+        assert engine._paths_by_root == {} and engine._by_path == {}
+
+    def test_many_rules_cost_only_what_changed(self):
+        rules = [Rule(f"r{i}", f"metric_{i} > 50") for i in range(500)]
+        engine = RuleEngine()
+        engine.compile(rules)
+        facts = {f"metric_{i}": 0 for i in range(500)}
+        engine.evaluate(rules, facts)
+        engine.evaluate(rules, {**facts, "metric_7": 99})
+        assert engine.stats["evaluated"] == 501
+
+
+class TestControllerRules:
+    """Tests for the controller deciding with compiled rules."""
+
+    @pytest.fixture
+    def controller(self, tmp_path):
+        controller = AutonomousController(rules_file=str(tmp_path / "rules.yaml"))
+        controller._scheduler = FakeScheduler()
+        return controller
+
+    async def test_default_rules(self, controller):
+        current = state(
+            containers=[("qdrant", "unhealthy", 4), ("loki", "unhealthy", 1), ("redis", "healthy", 0)],
+            down=["loki"],
+            metrics={"gpu_temp_celsius": 84, "avg_inference_latency_ms": 900},
+            score=75,
+        )
+        actions = {a.trigger_id: a.reason for a in await controller.decide(current)}
+        assert actions == {
+            "health-001": "Containers unhealthy: loki, qdrant",
+            "health-002": "Services down: loki",
+            "health-003": "Containers failing repeatedly: qdrant",
+            "metric-003": "GPU temperature 84C exceeds threshold",
+            "bench-002": "Benchmark score 75% below threshold",
+            "learn-002": "Scheduled trigger at 04:00",
+        }
+
+    def test_restart_needed_at_threshold(self, monkeypatch):
+        monkeypatch.setattr(autonomous_controller, "RESTART_AFTER_FAILURES", 3)
+        current = state(containers=[("qdrant", "unhealthy", 3), ("loki", "unhealthy", 2), ("redis", "healthy", 5)])
+        assert current.facts()["restart_needed_containers"] == ["qdrant"]
+
+    async def test_benchmark_regression(self, controller):
+        await controller.decide(state(score=92, at=datetime(2026, 3, 1, 12)))
+        assert "bench-001" not in {a.trigger_id for a in await controller.decide(state(score=90))}
+        actions = {a.trigger_id: a.reason for a in await controller.decide(state(score=84))}
+        assert actions["bench-001"] == "Benchmark score fell from 90% to 84%"
+
+    async def test_cooldown(self, controller):
+        hot = state(metrics={"gpu_temp_celsius": 84}, at=datetime(2026, 3, 1, 12))
+        controller.rules[5].last_triggered = datetime.utcnow() - timedelta(minutes=1)
+        assert controller.rules[5].id == "metric-003"
+        assert await controller.decide(hot) == []
+
+    def test_legacy_rules_file(self, tmp_path):
+        path = tmp_path / "legacy.yaml"
+        rule = autonomous_controller.DEFAULT_TRIGGER_RULES[0].to_dict()
+        rule.update(condition="container.status == 'unhealthy' for > 5 minutes")
+        del rule["message"]
+        path.write_text(yaml.dump({"version": "1.0", "rules": [rule]}))
+
+        controller = AutonomousController(rules_file=str(path))
+        assert controller.rules[0].message == "Containers unhealthy: {unhealthy_containers}"
+        assert controller.engine.dependencies("health-001") == ["unhealthy_containers"]
+
+    async def test_update_rule_api(self, controller, monkeypatch):
+        monkeypatch.setattr(autonomous_controller, "_controller", controller)
+        app = FastAPI()
+        app.include_router(autonomous_controller.create_autonomous_router())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            response = await http.put("/autonomous/rules/metric-003", json={"condition": "gpu_temp_celsius > 70"})
+            assert response.status_code == 200 and response.json()["condition"] == "gpu_temp_celsius > 70"
+            response = await http.put("/autonomous/rules/metric-003", json={"condition": "gpu_temp_celsius >"})
+            assert response.status_code == 400
+            response = await http.put("/autonomous/rules/nope", json={"message": "x"})
+            assert response.status_code == 404
+
+            rules = {r["id"]: r for r in (await http.get("/autonomous/rules")).json()["rules"]}
+            assert rules["metric-003"]["condition"] == "gpu_temp_celsius > 70"
+            assert rules["metric-003"]["depends_on"] == ["gpu_temp_celsius"]
+
+        saved = yaml.safe_load(open(controller.rules_file))
+        assert next(r for r in saved["rules"] if r["id"] == "metric-003")["condition"] == "gpu_temp_celsius > 70"
+        actions = await controller.decide(state(metrics={"gpu_temp_celsius": 75}, at=datetime(2026, 3, 1, 12)))
+        assert [a.trigger_id for a in actions] == ["metric-003"]
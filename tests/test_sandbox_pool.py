@@ -0,0 +1,192 @@
+"""
+Tests for the warm sandbox container pool, run against a fake Docker Engine API.
+"""
+
+import asyncio
+
+import pytest
+
+from hydra_tools.sandbox import ExecutionStatus, SandboxConfig, SandboxManager
+from hydra_tools.sandbox_pool import RESET_COMMAND, AsyncDockerClient, StreamDemuxer
+
+from tests.fake_docker import FakeDocker, frame
+
+IMAGES = list(SandboxManager.IMAGES.values())
+
+
+@pytest.fixture
+def fake_docker():
+    return FakeDocker(images=IMAGES)
+
+
+@pytest.fixture
+async def manager(tmp_path, fake_docker, monkeypatch):
+    """A sandbox manager wired to the fake daemon, with resizing left to the tests."""
+    monkeypatch.setenv("HYDRA_SANDBOX_POOL_MIN", "1")
+    monkeypatch.setenv("HYDRA_SANDBOX_POOL_MAX", "2")
+    monkeypatch.setenv("HYDRA_SANDBOX_POOL_MAX_USES", "3")
+    monkeypatch.setenv("HYDRA_SANDBOX_POOL_INTERVAL", "3600")
+    monkeypatch.setenv("HYDRA_SANDBOX_POOL_IDLE_SECONDS", "0")
+    manager = SandboxManager(data_dir=str(tmp_path), host_data_dir=str(tmp_path))
+    manager._get_enforcer = lambda: None
+    manager._docker = AsyncDockerClient(transport=fake_docker.transport())
+    yield manager
+    await manager.close()
+
+
+async def settle(manager):
+    """Wait for background creates, resets and removals to finish."""
+    pools = manager.get_pool().pools.values()
+    while any(pool._background for pool in pools):
+        await asyncio.sleep(0.01)
+
+
+def python_pool(manager):
+    return manager.get_pool().pools["python"]
+
+
+class TestPooledExecution:
+    """Tests for running code in warm containers."""
+
+    async def test_hello_world_reuses_reset_container(self, manager, fake_docker):
+        """Consecutive runs share one warm container, which is reset in between."""
+        first = await manager.execute_async("print('hello')")
+        await settle(manager)
+        second = await manager.execute_async("print('again')")
+
+        assert first.status == ExecutionStatus.SUCCESS
+        assert first.stdout == "hello\n"
+        assert second.stdout == "again\n"
+        assert first.resource_usage["pooled"]
+        assert first.resource_usage["container"] == second.resource_usage["container"]
+
+        await settle(manager)
+        container = next(c for c in fake_docker.containers.values()
+                         if c["name"] == first.resource_usage["container"])
+        assert container["execs"].count(RESET_COMMAND) == 2
+        assert container["body"]["HostConfig"]["NetworkMode"] == "none"
+        assert container["body"]["NetworkDisabled"] is True
+        assert list((manager.data_dir / "pool" / container["name"]).iterdir()) == []
+        assert python_pool(manager).stats["hits"] >= 1
+
+    async def test_failure_reports_exit_code_and_stderr(self, manager):
+        result = await manager.execute_async("import sys; sys.exit('bad input')")
+        assert result.status == ExecutionStatus.FAILED
+        assert result.exit_code == 1
+        assert "bad input" in result.stderr
+
+    async def test_extra_files_visible_to_code(self, manager):
+        result = await manager.execute_async(
+            "print(open(__file__.replace('code', 'data.txt')).read())",
+            files={"data.txt": "payload"},
+        )
+        assert result.stdout == "payload\n"
+
+    async def test_invalid_filename_rejected(self, manager):
+        result = await manager.execute_async("print(1)", files={"../escape": "x"})
+        assert result.status == ExecutionStatus.ERROR
+        assert "Invalid sandbox filename" in result.error_message
+
+    async def test_incompatible_config_runs_cold(self, manager, fake_docker):
+        """Container-level settings the pool was not created with get a one-shot container."""
+        result = await manager.execute_async("print('cold')", config=SandboxConfig(memory_limit="512m"))
+        assert result.stdout == "cold\n"
+        assert not result.resource_usage["pooled"]
+        assert not any(c["name"].startswith("hydra-sandbox-") for c in fake_docker.containers.values())
+
+
+class TestRecycling:
+    """Tests for retiring containers after violations and repeated use."""
+
+    async def test_timeout_retires_container(self, manager, fake_docker):
+        config = SandboxConfig(timeout_seconds=0.2)
+        result = await manager.execute_async("import time; time.sleep(5)", config=config)
+        await settle(manager)
+
+        assert result.status == ExecutionStatus.TIMEOUT
+        assert result.resource_usage["container"] not in {c["name"] for c in fake_docker.containers.values()}
+        assert python_pool(manager).stats["recycled"]["timeout"] == 1
+
+    async def test_output_limit_retires_container(self, manager):
+        config = SandboxConfig(max_output_bytes=1000)
+        result = await manager.execute_async("print('x' * 5000)", config=config)
+        await settle(manager)
+
+        assert result.status == ExecutionStatus.KILLED
+        assert len(result.stdout) == 1000
+        assert python_pool(manager).stats["recycled"]["output_limit"] == 1
+
+    async def test_flagged_code_retires_container(self, manager):
+        await manager.execute_async("import socket\nprint('hi')")
+        await settle(manager)
+        assert python_pool(manager).stats["recycled"]["flagged_code"] == 1
+
+    async def test_recycled_after_max_uses(self, manager):
+        names = []
+        for i in range(4):
+            result = await manager.execute_async(f"print({i})")
+            names.append(result.resource_usage["container"])
+            await settle(manager)
+
+        assert len(set(names[:3])) == 1
+        assert names[3] != names[0]
+        assert python_pool(manager).stats["recycled"]["max_uses"] == 1
+
+
+class TestSizing:
+    """Tests for demand-driven pool sizing."""
+
+    async def test_grows_under_concurrency_and_shrinks_when_idle(self, manager):
+        config = SandboxConfig(timeout_seconds=10)
+        results = await asyncio.gather(*(
+            manager.execute_async("import time; time.sleep(0.2); print('ok')", config=config)
+            for _ in range(4)
+        ))
+        await settle(manager)
+        pool = python_pool(manager)
+
+        assert all(r.stdout == "ok\n" for r in results)
+        assert len({r.resource_usage["container"] for r in results}) == 2  # capped at max_size
+        assert pool.stats["waits"] >= 2
+        assert pool.target == 2
+
+        # No demand over several passes: the estimate decays back to min_size
+        for _ in range(20):
+            await pool.resize()
+        await settle(manager)
+        assert pool.target == 1
+        assert len(pool.idle) == 1
+
+    async def test_missing_image_pulled_once(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HYDRA_SANDBOX_POOL_INTERVAL", "3600")
+        fake = FakeDocker(images=[])
+        manager = SandboxManager(data_dir=str(tmp_path), host_data_dir=str(tmp_path))
+        manager._get_enforcer = lambda: None
+        manager._docker = AsyncDockerClient(transport=fake.transport())
+        try:
+            for _ in range(2):
+                result = await manager.execute_async("print('hi')")
+                assert result.stdout == "hi\n"
+            await settle(manager)
+        finally:
+            await manager.close()
+        assert fake.pulls.count("python:3.11-slim") == 1
+        assert not fake.containers
+
+
+class TestStreamDemuxer:
+    """Tests for splitting Docker's multiplexed output."""
+
+    def test_frames_split_across_chunks(self):
+        data = frame(1, b"out") + frame(2, b"err") + frame(1, b"more")
+        demuxer = StreamDemuxer(max_bytes=100)
+        for i in range(0, len(data), 5):
+            demuxer.feed(data[i:i + 5])
+        output = demuxer.output()
+        assert (output.stdout, output.stderr, output.truncated) == (b"outmore", b"err", False)
+
+    def test_stops_at_limit(self):
+        demuxer = StreamDemuxer(max_bytes=4)
+        assert not demuxer.feed(frame(1, b"abcdef") + frame(1, b"gh"))
+        assert demuxer.output().stdout == b"abcd"
+        assert demuxer.output().truncated
@@ -0,0 +1,238 @@
+"""
+Tests for the embedding-based semantic router.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+
+from hydra_tools import human_feedback, routellm, semantic_router
+from hydra_tools.load_testing import fake_embedding
+from hydra_tools.routellm import ModelTier
+from hydra_tools.semantic_router import (
+    PromptEmbedder,
+    SemanticRouteModel,
+    SemanticRouter,
+    TrainingExample,
+    evaluate,
+    load_feedback_examples,
+    load_interaction_examples,
+    tier_for_model,
+    train_centroids,
+)
+
+TOPICS = {
+    "fast": ["hello there friend", "what time is it", "translate hello to spanish", "good morning"],
+    "quality": ["analyze the philosophy of consciousness", "compare economic theories in depth",
+                "evaluate the ethics of consciousness research", "analyze economic philosophy trends"],
+    "code": ["fix this python function bug", "write a python class for parsing",
+             "debug the javascript function", "refactor this python function"],
+}
+
+
+class FakeOllama:
+    """Ollama /api/embed over bag-of-words embeddings, counting requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.fail = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.fail:
+            return httpx.Response(500)
+        inputs = json.loads(request.content)["input"]
+        return httpx.Response(200, json={"embeddings": [fake_embedding(text) for text in inputs]})
+
+
+@pytest.fixture
+def ollama():
+    return FakeOllama()
+
+
+@pytest.fixture
+def embedder(ollama):
+    embedder = PromptEmbedder(ollama_url="http://ollama")
+    embedder._client = httpx.AsyncClient(transport=httpx.MockTransport(ollama.handler))
+    return embedder
+
+
+def examples():
+    return [TrainingExample(prompt, tier, 1.0, "test") for tier, prompts in TOPICS.items() for prompt in prompts]
+
+
+async def trained_model(embedder):
+    data = examples()
+    vectors = np.vstack(await embedder.embed_many([e.prompt for e in data]))
+    return train_centroids(vectors, [e.tier for e in data], [e.weight for e in data])
+
+
+class TestTraining:
+    """Tests for the offline nearest-centroid trainer."""
+
+    async def test_centroids_separate_topics(self, embedder):
+        model = await trained_model(embedder)
+        probes = ["analyze consciousness philosophy", "python function bug", "hello good morning"]
+        vectors = np.vstack(await embedder.embed_many(probes))
+
+        assert model.predict_many(vectors) == ["quality", "code", "fast"]
+        tier, confidence = model.predict(vectors[1])
+        assert tier == "code" and 0.5 < confidence <= 1.0
+
+    async def test_bad_outcomes_push_centroid_away(self, embedder):
+        data = examples() + [TrainingExample("analyze python function performance", "quality", -2.0, "test")]
+        vectors = np.vstack(await embedder.embed_many([e.prompt for e in data]))
+        model = train_centroids(vectors, [e.tier for e in data], [e.weight for e in data])
+        probe = (await embedder.embed_many(["analyze python function performance"]))[0]
+        assert model.predict(probe)[0] != "quality"
+
+        metrics = evaluate(model, vectors, data, baseline=["fast"] * len(data))
+        assert metrics["accuracy"] > metrics["baseline_accuracy"]
+        assert metrics["examples"] == len(data)
+
+    def test_save_is_atomic_and_validated(self, tmp_path):
+        model = SemanticRouteModel(labels=["fast", "code"], centroids=np.eye(2, 4, dtype=np.float32))
+        model.save(tmp_path / "router.npz")
+        loaded = SemanticRouteModel.load(tmp_path / "router.npz")
+        assert loaded.labels == ["fast", "code"]
+        np.testing.assert_array_equal(loaded.centroids, model.centroids)
+        assert [p.name for p in tmp_path.iterdir()] == ["router.npz"]
+
+        SemanticRouteModel(labels=["huge"], centroids=np.ones((1, 4))).save(tmp_path / "bad.npz")
+        with pytest.raises(ValueError):
+            SemanticRouteModel.load(tmp_path / "bad.npz")
+
+    @pytest.mark.parametrize("model,tier", [
+        ("qwen2.5-7b", "fast"), ("midnight-miqu-70b", "quality"), ("qwen2.5-coder-7b", "code"),
+        ("llama-3.1-8b", "fast"), ("tabby-primary", "quality"), ("NoobAI-XL", None), (None, None),
+    ])
+    def test_tier_for_model(self, model, tier):
+        assert tier_for_model(model) == tier
+
+    def test_load_feedback_and_interactions(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(human_feedback, "DB_PATH", tmp_path / "feedback.db")
+        human_feedback.init_db()
+        conn = human_feedback.get_db()
+        rows = [("g1", "excellent", "qwen2.5-coder-7b", "fix this bug"), ("g2", "poor", "midnight-miqu-70b", "hi"),
+                ("g3", "acceptable", "qwen2.5-7b", "ok"), ("g4", "good", "NoobAI-XL", "a castle"),
+                ("g5", "good", "qwen2.5-7b", None)]
+        conn.executemany(
+            "INSERT INTO generation_feedback (generation_id, generation_type, rating, model_used, prompt_used, "
+            "created_at) VALUES (?, 'text', ?, ?, ?, '2026-01-01')", rows,
+        )
+        conn.commit()
+        conn.close()
+
+        loaded = load_feedback_examples(tmp_path / "feedback.db")
+        assert [(e.prompt, e.tier, e.weight) for e in loaded] == [("fix this bug", "code", 2.0), ("hi", "quality", -1.0)]
+
+        path = tmp_path / "interactions.jsonl"
+        path.write_text("\n".join(json.dumps(r) for r in [
+            {"model": "qwen2.5-7b", "feedback": "positive", "metadata": {"prompt": "hello"}},
+            {"model": "qwen2.5-7b", "feedback": "regenerate", "metadata": {"prompt": "prove it"}},
+            {"model": "qwen2.5-7b", "feedback": "positive", "prompt_hash": "abc", "metadata": {}},
+        ]) + "\n")
+        assert [(e.prompt, e.weight) for e in load_interaction_examples(path)] == [("hello", 1.0), ("prove it", -1.0)]
+
+
+class TestRuntimeRouter:
+    """Tests for shadow/active routing and hot swapping."""
+
+    @pytest.fixture
+    async def router(self, tmp_path, embedder):
+        (await trained_model(embedder)).save(tmp_path / "router.npz")
+        router = SemanticRouter(model_path=tmp_path / "router.npz", mode="active", embedder=embedder)
+        yield router
+        await router.close()
+
+    async def test_active_mode_uses_learned_tier(self, router):
+        decision = await router.route("compare economic philosophy")
+        assert decision.tier == ModelTier.QUALITY
+        assert decision.model == "midnight-miqu-70b"
+        assert decision.reason.startswith("Nearest quality centroid")
+        assert router.stats["learned"] == 1
+
+    async def test_shadow_mode_returns_heuristic_and_compares(self, router):
+        router.set_mode("shadow")
+        prompt = "compare economic philosophy"
+        decision = await router.route(prompt)
+        assert decision == router.fallback.route(prompt)
+
+        await asyncio.gather(*router._shadow_tasks)
+        stats = router.get_stats()
+        assert stats["compared"] == 1
+        assert stats["confusion"] == {f"{decision.tier.value}->quality": 1}
+
+    async def test_embedding_failure_falls_back(self, router, ollama):
+        ollama.fail = True
+        decision = await router.route("something never embedded")
+        assert decision == router.fallback.route("something never embedded")
+        assert router.stats == {"decisions": 1, "learned": 0, "fallbacks": 1, "embed_errors": 1,
+                                "preferences": 0, "shadow_dropped": 0}
+
+    async def test_shadow_comparisons_are_bounded(self, router, ollama, monkeypatch):
+        monkeypatch.setattr(semantic_router, "SHADOW_CONCURRENCY", 2)
+        router.set_mode("shadow")
+        requests = ollama.requests
+        for i in range(5):
+            await router.route(f"uncached prompt {i}")
+        assert len(router._shadow_tasks) == 2 and router.stats["shadow_dropped"] == 3
+
+        await asyncio.gather(*router._shadow_tasks)
+        assert ollama.requests - requests == 2
+        # A cached prompt is compared inline, without a task or a request
+        await router.route("uncached prompt 0")
+        assert not router._shadow_tasks and router.get_stats()["compared"] == 3
+
+    async def test_caller_preference_keeps_heuristic(self, router):
+        prompt = "hello there friend"
+        decision = await router.route(prompt, prefer_quality=True)
+        assert decision == router.fallback.route(prompt, prefer_quality=True)
+        assert router.stats["preferences"] == 1 and router.stats["learned"] == 0
+
+    async def test_cached_decision_under_a_millisecond(self, router, ollama):
+        await router.route("debug the python class")
+        requests = ollama.requests
+
+        latencies = []
+        for _ in range(200):
+            start = time.perf_counter()
+            await router.route("debug the python class")
+            latencies.append(time.perf_counter() - start)
+        assert ollama.requests == requests
+        assert statistics.median(latencies) < 0.001
+
+    async def test_hot_swap_over_api(self, router, tmp_path, monkeypatch):
+        monkeypatch.setattr(semantic_router, "_semantic_router", router)
+        app = FastAPI()
+        app.include_router(routellm.create_routing_router())
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            before = (await http.post("/routing/semantic/route", json={"prompt": "hello there"})).json()
+            assert before["tier"] == "fast" and before["mode"] == "active"
+
+            dims = router.model.dimensions
+            SemanticRouteModel(labels=["code"], centroids=np.ones((1, dims), dtype=np.float32) / dims ** 0.5,
+                               ).save(tmp_path / "router.npz")
+            response = await http.post("/routing/semantic/reload")
+            assert response.json()["labels"] == ["code"]
+
+            after = (await http.post("/routing/semantic/route", json={"prompt": "hello there"})).json()
+            assert after["tier"] == "code"
+
+            assert (await http.put("/routing/semantic/mode", json={"mode": "loud"})).status_code == 400
+            assert (await http.put("/routing/semantic/mode", json={"mode": "off"})).json() == {"mode": "off"}
+            stats = (await http.get("/routing/semantic/stats")).json()
+            assert stats["mode"] == "off" and stats["model"]["labels"] == ["code"]
+
+    def test_missing_model_routes_heuristically(self, tmp_path):
+        router = SemanticRouter(model_path=tmp_path / "absent.npz", mode="active")
+        assert router.model is None
+        decision = asyncio.run(router.route("Hello!"))
+        assert decision.tier == ModelTier.FAST
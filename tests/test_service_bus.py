@@ -0,0 +1,247 @@
+"""
+Tests for the in-process service bus and the concurrent perceive phases
+built on it.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from hydra_tools import cognitive_core, service_bus
+from hydra_tools.autonomous_controller import AutonomousController
+from hydra_tools.router_registry import RouterSpec
+from hydra_tools.service_bus import ServiceBus, ServiceError
+
+DELAY = 0.05
+
+
+class Reading(BaseModel):
+    name: str
+    value: float
+
+
+class FakeRegistry:
+    """Stands in for the API's LazyRouterRegistry; loading registers a provider."""
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.loaded = []
+        self.spec = RouterSpec("sensors", "sensors", "create_router", ("/sensors",))
+
+    def pending_for(self, path):
+        return [self.spec] if path.startswith("/sensors") and not self.loaded else []
+
+    async def ensure_loaded(self, specs, trigger):
+        self.loaded.append((specs[0].name, trigger))
+
+        async def sensor_reading():
+            return Reading(name="inlet", value=21.5)
+
+        self.bus.register("/sensors/reading", sensor_reading)
+
+
+class FakeAPI:
+    """HTTP side of the bus: records requests and answers like the endpoints would."""
+
+    def __init__(self):
+        self.requests = []
+        self.api_keys = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        self.api_keys.append(request.headers.get("X-API-Key"))
+        if request.url.path == "/missing":
+            return httpx.Response(404, json={"detail": "Not Found"})
+        return httpx.Response(200, json={"via": "http", "params": dict(request.url.params)})
+
+
+@pytest.fixture
+def api():
+    return FakeAPI()
+
+
+@pytest.fixture
+def bus(api, monkeypatch):
+    bus = ServiceBus(base_url="http://localhost:8700")
+    bus._client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    monkeypatch.setattr(service_bus, "_service_bus", bus)
+
+    async def gpus(refresh: bool = Query(False), limit: int = 4):
+        return {"via": "local", "refresh": refresh, "limit": limit}
+
+    async def locked():
+        raise HTTPException(status_code=503, detail="busy")
+
+    bus.register("/hardware/gpus", gpus)
+    bus.register("/locked", locked)
+    return bus
+
+
+class TestServiceBus:
+    """Tests for choosing between in-process calls and HTTP."""
+
+    async def test_unattached_bus_uses_http(self, bus, api):
+        result = await bus.query("/hardware/gpus", refresh=True)
+        assert result == {"via": "http", "params": {"refresh": "true"}}
+        assert api.requests == ["http://localhost:8700/hardware/gpus?refresh=true"]
+        assert bus.get_stats()["totals"] == {"local": 0, "loopback": 1, "remote": 0}
+
+    async def test_attached_bus_calls_provider_with_defaults(self, bus, api):
+        bus.attach(FakeRegistry(bus))
+        assert await bus.query("/hardware/gpus") == {"via": "local", "refresh": False, "limit": 4}
+        assert await bus.query("/hardware/gpus", refresh=True) == {"via": "local", "refresh": True, "limit": 4}
+        assert api.requests == []
+        assert bus.get_stats()["local"] == {"/hardware/gpus": 2}
+
+    async def test_remote_base_and_unprovided_paths_use_http(self, bus, api):
+        bus.attach(FakeRegistry(bus))
+        await bus.query("/hardware/gpus", base_url="http://192.168.1.244:8700")
+        await bus.query("/memory/recent", limit=10)
+        assert api.requests == [
+            "http://192.168.1.244:8700/hardware/gpus",
+            "http://localhost:8700/memory/recent?limit=10",
+        ]
+        assert api.api_keys == [bus.api_key] * 2
+        assert bus.get_stats()["totals"] == {"local": 0, "loopback": 1, "remote": 1}
+
+    async def test_errors_raise_service_error(self, bus):
+        with pytest.raises(ServiceError) as http_error:
+            await bus.query("/missing")
+        assert http_error.value.status_code == 404
+
+        bus.attach(FakeRegistry(bus))
+        with pytest.raises(ServiceError) as local_error:
+            await bus.query("/locked")
+        assert (local_error.value.status_code, local_error.value.detail) == (503, "busy")
+
+    async def test_lazy_router_loaded_and_result_encoded(self, bus, api):
+        registry = FakeRegistry(bus)
+        bus.attach(registry)
+        assert await bus.query("/sensors/reading") == {"name": "inlet", "value": 21.5}
+        await bus.query("/sensors/reading")
+        assert registry.loaded == [("sensors", "service /sensors/reading")]
+        assert api.requests == []
+
+    async def test_close_detaches_and_keeps_providers(self, bus):
+        bus.attach(FakeRegistry(bus))
+        await service_bus.close_service_bus()
+        assert not bus.is_local()
+        assert "/hardware/gpus" in bus.get_stats()["providers"]
+
+
+def register_slow_providers(bus, calls):
+    """Providers for every path the perceive phases read, each taking DELAY."""
+
+    def slow(path, value):
+        async def provider(**params):
+            calls.append(path)
+            await asyncio.sleep(DELAY)
+            return value
+        return provider
+
+    for path, value in {
+        "/health": {"status": "healthy"},
+        "/container-health/": {"summary": {"total": 3, "healthy": 2},
+                               "containers": [{"name": "qdrant", "status": "unhealthy"}]},
+        "/diagnosis/inference": {"latency_ms": 120, "tokens_per_second": 42},
+        "/autonomous/resources": {"gpu_utilization": 0.5},
+        "/autonomous/queue": [{"id": "w1", "status": "pending"}],
+        "/hardware/gpus": {"gpus": [{"temp_celsius": 70, "vram_used_gb": 10},
+                                    {"temp_celsius": 65, "vram_used_gb": 6}]},
+        "/self-improvement/benchmarks/latest": {"score": 0.9},
+    }.items():
+        bus.register(path, slow(path, value))
+
+
+class FakeMemory:
+    async def get_stats(self):
+        await asyncio.sleep(DELAY)
+        return {"episodes": 2}
+
+    async def get_recent_episodes(self, limit=10):
+        await asyncio.sleep(DELAY)
+        return []
+
+    async def retrieve_context(self, query, limit=5):
+        await asyncio.sleep(DELAY)
+        return ["remember qdrant"]
+
+
+class FakeScheduler:
+    def get_queue(self):
+        return [{"task": "benchmark"}]
+
+
+class TestConcurrentPerceive:
+    """Tests for both control loops gathering state in one round trip."""
+
+    async def test_autonomous_controller(self, bus, api, tmp_path, monkeypatch):
+        calls = []
+        register_slow_providers(bus, calls)
+        bus.attach(FakeRegistry(bus))
+        controller = AutonomousController(rules_file=str(tmp_path / "rules.yaml"))
+        controller._memory = FakeMemory()
+        controller._scheduler = FakeScheduler()
+
+        async def targets():
+            await asyncio.sleep(DELAY)
+            return [{"health": "up"}, {"health": "down", "labels": {"job": "loki"}}]
+
+        monkeypatch.setattr(controller, "_prometheus_targets", targets)
+
+        start = time.perf_counter()
+        state = await controller.perceive()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 3 * DELAY
+        assert api.requests == []
+        assert state.containers["summary"]["total"] == 3
+        assert state.prometheus_targets == {"total": 2, "up": 1, "down": ["loki"]}
+        assert state.metrics == {"avg_inference_latency_ms": 120, "tokens_per_second": 42,
+                                 "gpu_temp_celsius": 70, "gpu_vram_used_gb": 16}
+        assert state.benchmarks == {"score": 0.9}
+        assert state.pending_tasks == [{"task": "benchmark"}]
+        assert controller._stats["last_perceive_ms"] is not None
+
+    async def test_cognitive_core(self, bus, api, monkeypatch):
+        calls = []
+        register_slow_providers(bus, calls)
+        bus.attach(FakeRegistry(bus))
+        monkeypatch.setattr(cognitive_core, "CheckpointManager", lambda: None)
+        core = cognitive_core.CognitiveCore(api_base="http://localhost:8700")
+        core.memory = FakeMemory()
+
+        start = time.perf_counter()
+        observation = await core.perceive()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 3 * DELAY
+        # /memory/recent has no provider and is the only HTTP request left
+        assert [url.split("?")[0] for url in api.requests] == ["http://localhost:8700/memory/recent"]
+        assert observation.cluster_health == {"status": "healthy"}
+        assert observation.container_health == {"total": 3, "healthy": 2, "unhealthy": ["qdrant"]}
+        assert observation.pending_tasks == [{"id": "w1", "status": "pending"}]
+        assert observation.memory_context == ["remember qdrant"]
+
+    async def test_failing_source_does_not_fail_perceive(self, bus, tmp_path, monkeypatch):
+        bus.attach(FakeRegistry(bus))
+
+        async def broken(**params):
+            raise RuntimeError("docker socket gone")
+
+        bus.register("/container-health/", broken)
+        controller = AutonomousController(rules_file=str(tmp_path / "rules.yaml"))
+        controller._memory = FakeMemory()
+        controller._scheduler = FakeScheduler()
+
+        async def no_targets():
+            raise httpx.ConnectError("prometheus down")
+
+        monkeypatch.setattr(controller, "_prometheus_targets", no_targets)
+        state = await controller.perceive()
+        assert state.containers == {"error": "docker socket gone"}
+        assert state.prometheus_targets == {"error": "prometheus down"}
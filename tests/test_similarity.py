@@ -0,0 +1,171 @@
+"""
+Tests for the shared similarity kernel and the call sites that use it.
+"""
+
+import json
+from datetime import datetime
+
+import httpx
+import numpy as np
+import pytest
+
+from hydra_tools import similarity
+from hydra_tools.asset_quality import AssetQualityScorer
+from hydra_tools.load_testing import fake_embedding
+from hydra_tools.memory_architecture import MemoryEntry, MemoryPriority, MemoryTier
+from hydra_tools.reranker import Reranker, RerankerConfig
+from hydra_tools.similarity import VectorStore, cosine, cosine_many, normalize, top_k
+
+
+def loop_cosine(a, b):
+    """The pure-Python version the call sites used to carry."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(x * x for x in b) ** 0.5
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((500, 32)).astype(np.float32), rng.standard_normal((4, 32)).astype(np.float32)
+
+
+class TestKernel:
+    """Tests for the pair, batch and top-k functions."""
+
+    def test_cosine_matches_loop(self):
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            a, b = rng.standard_normal(16).tolist(), rng.standard_normal(16).tolist()
+            assert cosine(a, b) == pytest.approx(loop_cosine(a, b), abs=1e-12)
+
+    def test_degenerate_inputs_score_zero(self):
+        assert cosine([], []) == 0.0
+        assert cosine(None, [1.0]) == 0.0
+        assert cosine([0.0, 0.0], [1.0, 1.0]) == 0.0
+        assert cosine([1.0, 2.0], [1.0]) == 0.0
+
+    def test_cosine_many_skips_bad_rows(self):
+        scores = cosine_many([1.0, 0.0], [[2.0, 0.0], None, [0.0, 3.0], [1.0], [0.0, 0.0], [-1.0, 0.0]])
+        assert scores.tolist() == pytest.approx([1.0, 0.0, 0.0, 0.0, 0.0, -1.0])
+        assert cosine_many(None, [[1.0]]).tolist() == [0.0]
+        assert cosine_many([1.0, 0.0], np.zeros((3, 4))).tolist() == [0.0, 0.0, 0.0]
+
+    def test_cosine_many_matrix(self, vectors):
+        matrix, queries = vectors
+        expected = [loop_cosine(queries[0].tolist(), row.tolist()) for row in matrix]
+        assert cosine_many(queries[0], matrix) == pytest.approx(expected, abs=1e-5)
+
+    def test_normalize_keeps_zero_rows(self):
+        unit = normalize([[3.0, 4.0], [0.0, 0.0]])
+        assert unit.dtype == np.float32
+        assert unit.tolist() == [[pytest.approx(0.6), pytest.approx(0.8)], [0.0, 0.0]]
+
+    def test_top_k(self):
+        rows, values = top_k(np.array([[0.1, 0.9, 0.5, 0.7], [0.3, 0.2, 0.8, 0.1]]), 2)
+        assert rows.tolist() == [[1, 3], [2, 0]]
+        assert values.ravel().tolist() == pytest.approx([0.9, 0.7, 0.8, 0.3])
+        rows, values = top_k(np.array([0.2, 0.4]), 5)
+        assert rows.tolist() == [1, 0]
+        assert top_k(np.array([0.2, 0.4]), 0)[0].shape == (0,)
+
+    def test_top_k_tiebreak(self):
+        scores = np.array([[0.5, 0.9, 0.5, 0.5, 0.1], [0.3, 0.3, 0.3, 0.3, 0.3]])
+        newest = np.array(["2026-01-02", "2026-01-01", "2026-01-05", "2026-01-03", "2026-01-09"])
+        rows, values = top_k(scores, 3, tiebreak=newest)
+        assert rows.tolist() == [[1, 2, 3], [4, 2, 3]]
+        assert values.ravel().tolist() == pytest.approx([0.9, 0.5, 0.5, 0.3, 0.3, 0.3])
+        rows, _ = top_k(scores[0], 10, tiebreak=np.arange(5))
+        assert rows.tolist() == [1, 3, 2, 0, 4]
+
+
+class TestVectorStore:
+    """Tests for pre-normalized and quantized storage."""
+
+    @pytest.mark.parametrize("dtype,tolerance", [("float32", 1e-6), ("float16", 2e-3), ("int8", 2e-2)])
+    def test_scores_match_exact(self, vectors, dtype, tolerance):
+        matrix, queries = vectors
+        store = VectorStore(32, dtype=dtype, capacity=8)
+        assert list(store.add(matrix[:3])) == [0, 1, 2]
+        store.add(matrix[3])
+        store.add(matrix[4:])
+        assert len(store) == 500
+
+        exact = normalize(queries) @ normalize(matrix).T
+        assert np.abs(store.scores(queries) - exact).max() < tolerance
+
+        rows, scores = store.search(queries, 10)
+        exact_rows, _ = top_k(exact, 10)
+        recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(rows.tolist(), exact_rows.tolist())])
+        assert recall >= 0.9
+        assert np.all(np.diff(scores, axis=1) <= 0)
+
+    def test_search_merges_blocks(self, vectors, monkeypatch):
+        matrix, queries = vectors
+        store = VectorStore(32)
+        store.add(matrix)
+        expected = store.search(queries, 7)
+        monkeypatch.setattr(similarity, "SEARCH_BLOCK_ROWS", 64)
+        rows, scores = store.search(queries, 7)
+        assert rows.tolist() == expected[0].tolist()
+        assert scores == pytest.approx(expected[1])
+
+    def test_memory_per_dtype(self, vectors):
+        matrix, _ = vectors
+        sizes = {}
+        for dtype in VectorStore.DTYPES:
+            store = VectorStore(32, dtype=dtype)
+            store.add(matrix)
+            sizes[dtype] = store.nbytes
+        assert sizes == {"float32": 500 * 128, "float16": 500 * 64, "int8": 500 * (32 + 4)}
+
+    def test_empty_and_invalid(self):
+        store = VectorStore(4)
+        rows, scores = store.search([[1.0, 0, 0, 0]], 3)
+        assert rows.shape == (1, 0) and scores.shape == (1, 0)
+        with pytest.raises(ValueError, match="Unknown vector dtype"):
+            VectorStore(4, dtype="int4")
+
+
+class TestCallSites:
+    """Tests for modules scoring through the kernel."""
+
+    async def test_reranker_scores_batch(self):
+        texts = {"query": "python bug fix", "a": "fix python bug", "b": "bake bread", "c": "broken"}
+
+        def handler(request):
+            prompt = json.loads(request.content)["prompt"]
+            if prompt == "broken":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"embedding": fake_embedding(prompt, dim=64)})
+
+        reranker = Reranker(RerankerConfig(embedding_url="http://ollama/api/embeddings"))
+        reranker._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        docs = [{"content": texts[k], "id": k} for k in ("b", "c", "a")]
+        ranked = await reranker.rerank_embedding(texts["query"], docs, top_k=3)
+        await reranker._client.aclose()
+
+        assert [d["id"] for d in ranked][0] == "a"
+        scores = {d["id"]: d["rerank_score"] for d in ranked}
+        expected = loop_cosine(fake_embedding(texts["query"], 64), fake_embedding(texts["a"], 64))
+        assert scores["a"] == pytest.approx(expected, abs=1e-6)
+        assert scores["c"] == 0.0 and isinstance(scores["a"], float)
+
+    def test_asset_and_memory_scores(self):
+        a, b = fake_embedding("red dragon portrait", 64), fake_embedding("red dragon sketch", 64)
+        scorer = AssetQualityScorer()
+        style = scorer.score_style({"embedding": a}, reference_embedding=b)
+        assert style.details["style_similarity"] == round(loop_cosine(a, b), 3)
+
+        now = datetime.utcnow()
+        entry = MemoryEntry(id="m", tier=MemoryTier.SEMANTIC, content="x", created_at=now, updated_at=now,
+                            priority=MemoryPriority.LOW, embedding=b)
+        with_query = entry.compute_relevance(a)
+        entry.embedding = [0.0] * 64
+        # A zero embedding falls back to neutral similarity, as before
+        assert with_query - entry.compute_relevance(a) == pytest.approx(0.5 * ((loop_cosine(a, b) + 1) / 2 - 0.5))
@@ -0,0 +1,169 @@
+"""
+Tests for TTS synthesis caching and batch synthesis.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from hydra_tools.tts_synthesis import (
+    TTSAudioCache,
+    TTSService,
+    VoiceProfileManager,
+)
+
+
+class FakeKokoro:
+    """Local Kokoro stand-in that records every synthesis request."""
+
+    def __init__(self):
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.requests.append(payload)
+        audio = f"RIFF:{payload['voice']}:{payload['speed']}:{payload['input']}".encode()
+        return httpx.Response(200, content=audio)
+
+
+@pytest.fixture
+def kokoro():
+    return FakeKokoro()
+
+
+@pytest.fixture
+def service(tmp_path, kokoro):
+    profiles = VoiceProfileManager(profiles_path=tmp_path / "missing.json")
+    svc = TTSService(
+        kokoro_url="http://kokoro.test",
+        profile_manager=profiles,
+        cache=TTSAudioCache(cache_dir=tmp_path / "cache", max_bytes=1024 * 1024),
+        max_concurrency=2,
+    )
+    svc._client = httpx.AsyncClient(transport=httpx.MockTransport(kokoro.handler))
+    return svc
+
+
+class TestTTSAudioCache:
+    """Tests for the content-addressed audio cache."""
+
+    def test_key_depends_on_voice_settings_and_text(self):
+        """Any change to voice, settings or text changes the key."""
+        base = TTSAudioCache.make_key("af_sarah", {"speed": 1.0}, "Hello")
+        assert base == TTSAudioCache.make_key("af_sarah", {"speed": 1.0}, "Hello")
+        assert base != TTSAudioCache.make_key("af_bella", {"speed": 1.0}, "Hello")
+        assert base != TTSAudioCache.make_key("af_sarah", {"speed": 1.1}, "Hello")
+        assert base != TTSAudioCache.make_key("af_sarah", {"speed": 1.0}, "Hello!")
+
+    def test_put_get_roundtrip_survives_reload(self, tmp_path):
+        """Entries persist on disk across cache instances."""
+        cache = TTSAudioCache(cache_dir=tmp_path, max_bytes=1000)
+        cache.put("ab" * 32, b"audio")
+        assert cache.get("ab" * 32) == b"audio"
+
+        reloaded = TTSAudioCache(cache_dir=tmp_path, max_bytes=1000)
+        assert reloaded.get("ab" * 32) == b"audio"
+        assert reloaded.get("cd" * 32) is None
+
+    def test_lru_eviction_respects_size_bound(self, tmp_path):
+        """Least recently used entries are evicted first."""
+        cache = TTSAudioCache(cache_dir=tmp_path, max_bytes=25)
+        cache.put("aa" * 32, b"x" * 10)
+        cache.put("bb" * 32, b"x" * 10)
+        cache.get("aa" * 32)  # make "aa" most recently used
+        cache.put("cc" * 32, b"x" * 10)
+
+        assert cache.contains("aa" * 32)
+        assert not cache.contains("bb" * 32)
+        assert cache.contains("cc" * 32)
+        assert cache.stats()["total_bytes"] <= 25
+        assert cache.evictions == 1
+
+    def test_missing_file_is_dropped_from_index(self, tmp_path):
+        """An entry whose file vanished is treated as a miss and forgotten."""
+        cache = TTSAudioCache(cache_dir=tmp_path, max_bytes=1000)
+        cache.put("ab" * 32, b"audio")
+        cache._path("ab" * 32).unlink()
+
+        assert cache.get("ab" * 32) is None
+        assert not cache.contains("ab" * 32)
+        assert cache.stats()["total_bytes"] == 0
+
+
+class TestTTSServiceBatch:
+    """Tests for batch synthesis."""
+
+    @pytest.mark.asyncio
+    async def test_batch_deduplicates_repeated_lines(self, service, kokoro, tmp_path):
+        """Identical lines in a batch are synthesized once."""
+        lines = [
+            {"text": "Kneel.", "voice_id": "af_bella", "output_path": str(tmp_path / f"{i}.wav")}
+            for i in range(5)
+        ]
+        results = await service.synthesize_batch(lines)
+
+        assert len(kokoro.requests) == 1
+        assert all(r["status"] == "generated" for r in results)
+        assert all((tmp_path / f"{i}.wav").exists() for i in range(5))
+        assert service.get_stats()["lines_deduplicated"] == 4
+
+    @pytest.mark.asyncio
+    async def test_rebuild_with_one_edited_line_synthesizes_only_that_line(
+        self, service, kokoro, tmp_path
+    ):
+        """A rebuild only pays for lines whose text changed."""
+        texts = ["The crown is mine.", "Then take it.", "Guards!"]
+        lines = [
+            {"text": t, "character": "narrator", "output_path": str(tmp_path / f"{i}.wav")}
+            for i, t in enumerate(texts)
+        ]
+        first = await service.synthesize_batch(lines)
+        assert len(kokoro.requests) == 3
+        previous_keys = {r["output_path"]: r["cache_key"] for r in first}
+
+        lines[1]["text"] = "Then come and take it."
+        second = await service.synthesize_batch(lines, previous_keys=previous_keys)
+
+        assert len(kokoro.requests) == 4
+        assert kokoro.requests[-1]["input"] == "Then come and take it."
+        assert [r["status"] for r in second] == ["unchanged", "generated", "unchanged"]
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_without_manifest(self, service, kokoro, tmp_path):
+        """Previously synthesized audio is served from the cache."""
+        line = {"text": "Again.", "voice_id": "af_sarah", "output_path": str(tmp_path / "a.wav")}
+        await service.synthesize_batch([line])
+        line["output_path"] = str(tmp_path / "b.wav")
+        results = await service.synthesize_batch([line])
+
+        assert len(kokoro.requests) == 1
+        assert results[0]["status"] == "cached"
+        assert (tmp_path / "b.wav").read_bytes() == (tmp_path / "a.wav").read_bytes()
+
+    @pytest.mark.asyncio
+    async def test_failed_synthesis_is_not_cached(self, service, tmp_path):
+        """Backend errors are reported and do not poison the cache."""
+        service._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(500, text="boom"))
+        )
+        results = await service.synthesize_batch(
+            [{"text": "Fail", "voice_id": "af_sarah", "output_path": str(tmp_path / "f.wav")}]
+        )
+
+        assert results[0]["status"] == "failed"
+        assert service.cache.stats()["entries"] == 0
+        assert not (tmp_path / "f.wav").exists()
+
+    @pytest.mark.asyncio
+    async def test_cache_write_failure_still_returns_audio(self, service, kokoro, tmp_path):
+        """An unwritable cache directory does not fail the batch."""
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        service.cache = TTSAudioCache(cache_dir=blocker, max_bytes=1024)
+        results = await service.synthesize_batch(
+            [{"text": "Still here", "voice_id": "af_sarah", "output_path": str(tmp_path / "s.wav")}]
+        )
+
+        assert results[0]["status"] == "generated"
+        assert (tmp_path / "s.wav").read_bytes().endswith(b"Still here")
@@ -0,0 +1,184 @@
+"""
+Tests for the wake word capture/inference engine.
+"""
+
+import time
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hydra_wakeword.engine import (
+    FRAME_SAMPLES,
+    AudioStream,
+    FrameRingBuffer,
+    WakeWordEngine,
+    WakeWordPredictor,
+    WavFileSource,
+)
+
+
+class EnergyPredictor(WakeWordPredictor):
+    """Scores frames by peak amplitude and records batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.streams = set()
+
+    def add_stream(self, stream_id):
+        self.streams.add(stream_id)
+
+    def remove_stream(self, stream_id):
+        self.streams.discard(stream_id)
+
+    def predict_batch(self, frames):
+        self.batch_sizes.append(len(frames))
+        return {
+            stream_id: {"hey_test": float(np.abs(frame).max()) / 32767.0}
+            for stream_id, frame in frames.items()
+        }
+
+
+def write_wav(path, frames):
+    """Write int16 frames to a 16kHz mono WAV file."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(np.concatenate(frames).astype(np.int16).tobytes())
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestFrameRingBuffer:
+    """Tests for the SPSC ring buffer."""
+
+    def test_fifo_order_and_padding(self):
+        """Frames come out in order; short frames are zero padded."""
+        ring = FrameRingBuffer(capacity=4, frame_samples=4)
+        ring.push(np.array([1, 2, 3, 4], dtype=np.int16), 1.0)
+        ring.push(np.array([5, 6], dtype=np.int16), 2.0)
+
+        frame, ts = ring.pop()
+        assert frame.tolist() == [1, 2, 3, 4] and ts == 1.0
+        frame, ts = ring.pop()
+        assert frame.tolist() == [5, 6, 0, 0] and ts == 2.0
+        assert ring.pop() is None
+
+    def test_full_buffer_drops_and_counts(self):
+        """A full buffer drops new frames instead of blocking."""
+        ring = FrameRingBuffer(capacity=2, frame_samples=2)
+        for i in range(5):
+            ring.push(np.array([i, i], dtype=np.int16), float(i))
+
+        assert len(ring) == 2
+        assert ring.dropped == 3
+        assert ring.pop()[0].tolist() == [0, 0]
+
+
+class TestWakeWordEngine:
+    """Tests for batched inference across streams."""
+
+    def test_batches_one_frame_per_stream(self):
+        """Pending frames from several streams are scored in one call."""
+        predictor = EnergyPredictor()
+        engine = WakeWordEngine(predictor, threshold=0.5)
+        quiet = np.zeros(FRAME_SAMPLES, dtype=np.int16).tobytes()
+        for name in ("kitchen", "office", "bedroom"):
+            engine.add_stream(AudioStream(name)).feed(quiet * 2)
+
+        assert engine.process_once() == 3
+        assert engine.process_once() == 3
+        assert engine.process_once() == 0
+        assert predictor.batch_sizes == [3, 3]
+
+        stats = {s["stream_id"]: s for s in engine.get_stats()["streams"]}
+        assert stats["office"]["frames_processed"] == 2
+        assert stats["office"]["frames_dropped"] == 0
+
+    def test_push_stream_detection_with_cooldown(self):
+        """Loud frames trigger one detection per cooldown window."""
+        events = []
+        engine = WakeWordEngine(
+            EnergyPredictor(), threshold=0.5, cooldown_seconds=60, on_detection=events.append
+        )
+        stream = engine.add_stream(AudioStream("satellite"))
+        loud = np.full(FRAME_SAMPLES, 30000, dtype=np.int16).tobytes()
+        # Feed in uneven chunks to exercise frame reassembly
+        payload = loud * 3
+        stream.feed(payload[:1000])
+        stream.feed(payload[1000:])
+
+        while engine.process_once():
+            pass
+
+        assert len(events) == 1
+        assert events[0].stream_id == "satellite"
+        assert events[0].confidence > 0.9
+        assert stream.get_stats()["detections"] == 1
+
+    def test_wav_replay_through_worker_threads(self, tmp_path):
+        """A WAV source is captured and scored entirely off the caller's thread."""
+        quiet = np.zeros(FRAME_SAMPLES, dtype=np.int16)
+        loud = np.full(FRAME_SAMPLES, 28000, dtype=np.int16)
+        wav_path = tmp_path / "wake.wav"
+        write_wav(wav_path, [quiet] * 5 + [loud] + [quiet] * 5)
+
+        events = []
+        engine = WakeWordEngine(EnergyPredictor(), threshold=0.5, on_detection=events.append)
+        engine.start()
+        try:
+            stream = engine.add_stream(
+                AudioStream("replay", WavFileSource(str(wav_path), realtime=False))
+            )
+            assert wait_for(lambda: stream.drained and stream.stats.frames_processed == 11)
+        finally:
+            engine.stop()
+
+        stats = stream.get_stats()
+        assert stats["frames_captured"] == 11
+        assert stats["ended"] is True
+        assert stats["latency"]["max_ms"] >= 0
+        assert [e.stream_id for e in events] == ["replay"]
+
+    def test_wav_source_rejects_wrong_format(self, tmp_path):
+        """Non 16kHz WAV files are rejected on open."""
+        wav_path = tmp_path / "bad.wav"
+        with wave.open(str(wav_path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(b"\x00\x00" * 100)
+
+        with pytest.raises(ValueError):
+            WavFileSource(str(wav_path)).open()
+
+    def test_duplicate_stream_rejected(self):
+        """Stream ids must be unique."""
+        engine = WakeWordEngine(EnergyPredictor())
+        engine.add_stream(AudioStream("a"))
+        with pytest.raises(ValueError):
+            engine.add_stream(AudioStream("a"))
+
+    def test_predictor_sees_stream_lifecycle(self):
+        """Predictor state is set up before a stream runs and dropped on removal."""
+        predictor = EnergyPredictor()
+        engine = WakeWordEngine(predictor)
+        engine.add_stream(AudioStream("a"))
+        assert predictor.streams == {"a"}
+
+        engine.remove_stream("a")
+        assert predictor.streams == set()
+
+    def test_predictor_is_abstract(self):
+        """Predictors must implement predict_batch."""
+        with pytest.raises(TypeError):
+            WakeWordPredictor()